@@ -108,6 +108,7 @@ from .endpoints import (
     stock_ai_analysis,  # 股票AI分析结果
     stock_data_collection,  # 个股多维度数据收集
     sector_analysis,  # 板块行情分析（dc_index + dc_daily + moneyflow_ind_dc + limit_cpt）
+    technical_snapshot,  # 全市场技术指标快照（夜间面板计算 + 指标状态筛选）
 )
 
 # 创建主路由
@@ -184,6 +185,7 @@ router.include_router(dc_index.router, prefix="/dc-index", tags=["东方财富
 router.include_router(dc_daily.router, prefix="/dc-daily", tags=["东方财富概念板块行情"])  # 东方财富概念板块行情API
 router.include_router(sector_analysis.router, prefix="/sector-analysis", tags=["板块行情分析"])  # 板块行情聚合视图
 router.include_router(trade_cal.router, prefix="/trade-cal", tags=["交易日历"])  # 交易日历API
+router.include_router(technical_snapshot.router, prefix="/technical-snapshot", tags=["技术指标快照"])  # 全市场技术指标快照API
 router.include_router(stk_shock.router, prefix="/stk-shock", tags=["个股异常波动"])  # 个股异常波动API
 router.include_router(stk_alert.router, prefix="/stk-alert", tags=["交易所重点提示证券"])  # 交易所重点提示证券API
 router.include_router(stk_high_shock.router, prefix="/stk-high-shock", tags=["个股严重异常波动"])  # 个股严重异常波动API
@@ -6,6 +6,7 @@ Celery 任务管理 API
 2. 取消任务 (POST /celery/task/{task_id}/revoke)
 3. 任务历史记录 CRUD
 4. 清理僵尸任务
+5. 队列深度与延迟指标 (GET /celery/queues/metrics)
 
 时间处理:
 - 数据库存储本地时间
@@ -327,6 +328,7 @@ async def get_task_history_list(
     offset: int = 0,
     status: Optional[str] = None,
     task_type: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -337,6 +339,7 @@ async def get_task_history_list(
         offset: 偏移量
         status: 按状态筛选
         task_type: 按任务类型筛选
+        cursor: 游标分页，上一页返回的 next_cursor（优先于 offset）
 
     Returns:
         任务历史列表和统计信息
@@ -349,7 +352,8 @@ async def get_task_history_list(
         limit=limit,
         offset=offset,
         status=status,
-        task_type=task_type
+        task_type=task_type,
+        cursor=cursor
     )
 
     return ApiResponse.success(data=result)
@@ -503,3 +507,24 @@ async def get_task_statistics(
     )
 
     return ApiResponse.success(data=stats)
+
+
+# ==================== 队列指标 ====================
+
+@router.get("/queues/metrics")
+@handle_api_errors
+async def get_queue_metrics(
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    获取各 Celery 队列的积压深度、排队延迟与执行耗时
+
+    用于按队列（sync-io / compute / llm / notify / default）独立评估 Worker 并发配置。
+
+    Returns:
+        {队列: {depth, pool, concurrency, started, completed, failed, wait_seconds, run_seconds}}
+    """
+    from app.monitoring import celery_queue_metrics
+
+    metrics = await asyncio.to_thread(celery_queue_metrics.get_queue_metrics)
+    return ApiResponse.success(data=metrics)
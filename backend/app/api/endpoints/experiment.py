@@ -46,7 +46,7 @@ class BatchCreateRequest(BaseModel):
 class BatchStartRequest(BaseModel):
     """启动批次请求"""
 
-    max_workers: Optional[int] = Field(None, description="最大并行Worker数")
+    max_workers: Optional[int] = Field(None, description="最大并行训练进程数（默认 CPU 核数）")
 
 
 # ==================== 批次管理 ====================
@@ -37,15 +37,16 @@ async def list_flash(
     page_size: int = Query(50, ge=1, le=200),
     sort_by: Optional[str] = Query(None, description="排序字段：publish_time / source / created_at"),
     sort_order: str = Query('desc'),
+    cursor: Optional[str] = Query(None, description="游标分页：上一页返回的 next_cursor（优先于 page）"),
 ):
-    """分页查询财经快讯。"""
+    """分页查询财经快讯（total 在大结果集上为估算值，见 total_is_estimate）。"""
     from app.services.news_anns import NewsFlashSyncService
     svc = NewsFlashSyncService()
     result = await svc.list_flash(
         source=source, start_time=start_time, end_time=end_time,
         ts_code=ts_code, keyword=keyword, tag=tag,
         page=page, page_size=page_size,
-        sort_by=sort_by, sort_order=sort_order,
+        sort_by=sort_by, sort_order=sort_order, cursor=cursor,
     )
     return ApiResponse.success(data=result)
 
@@ -38,8 +38,9 @@ async def list_announcements(
     page_size: int = Query(50, ge=1, le=200),
     sort_by: Optional[str] = Query(None, description="排序字段：ann_date / ts_code / anno_type / created_at"),
     sort_order: str = Query('desc', description="asc / desc"),
+    cursor: Optional[str] = Query(None, description="游标分页：上一页返回的 next_cursor（优先于 page）"),
 ):
-    """分页查询公司公告列表（admin 浏览页用）。"""
+    """分页查询公司公告列表（admin 浏览页用；total 在大结果集上为估算值，见 total_is_estimate）。"""
     from app.services.news_anns import StockAnnsSyncService
     svc = StockAnnsSyncService()
     start_fmt = start_date.strftime('%Y-%m-%d') if start_date else None
@@ -48,7 +49,7 @@ async def list_announcements(
         ts_code=ts_code, start_date=start_fmt, end_date=end_fmt,
         anno_type=anno_type, keyword=keyword,
         page=page, page_size=page_size,
-        sort_by=sort_by, sort_order=sort_order,
+        sort_by=sort_by, sort_order=sort_order, cursor=cursor,
     )
     return ApiResponse.success(data=result)
 
@@ -38,6 +38,7 @@ from app.schemas.strategy import (
     ValidateCodeRequest,
     ValidationResult,
 )
+from app.services.strategy_loader import StrategyDynamicLoader
 
 # 导入 Core 的代码验证模块
 core_path = Path(__file__).parent.parent.parent.parent.parent / "core"
@@ -439,6 +440,7 @@ async def update_strategy(
 
     # 6. 更新数据库
     repo.update(strategy_id, update_data)
+    StrategyDynamicLoader.invalidate_cache(strategy_id)
 
     logger.success(f"更新策略成功: strategy_id={strategy_id}")
 
@@ -499,6 +501,7 @@ async def delete_strategy(
 
     # 4. 删除数据库记录
     repo.delete(strategy_id)
+    StrategyDynamicLoader.invalidate_cache(strategy_id)
 
     logger.warning(
         f"删除策略: strategy_id={strategy_id}, name={existing_strategy['name']}, "
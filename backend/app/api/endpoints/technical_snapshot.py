@@ -0,0 +1,79 @@
+"""
+全市场技术指标快照 API 端点
+
+读取夜间 tasks.recompute_technical_snapshot 写入的 stock_technical_snapshot，
+支持单只股票 O(1) 查询与按指标状态的全市场筛选。
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.error_handler import handle_api_errors
+from app.core.dependencies import get_current_active_user
+from app.models.api_response import ApiResponse
+from app.models.user import User
+from app.services.technical_snapshot import TechnicalSnapshotService
+
+router = APIRouter()
+
+
+@router.get("/screen")
+@handle_api_errors
+async def screen_by_technical_state(
+    trade_date: Optional[str] = Query(None, description="交易日，格式：YYYY-MM-DD（默认快照最新交易日）"),
+    d_cross: Optional[int] = Query(None, description="日线 MACD 交叉：2 金叉 / 1 DIF>DEA / -1 DIF<DEA / -2 死叉"),
+    w_cross: Optional[int] = Query(None, description="周线 MACD 交叉（编码同上）"),
+    m_cross: Optional[int] = Query(None, description="月线 MACD 交叉（编码同上）"),
+    d_zero_axis: Optional[int] = Query(None, description="日线零轴：1 上方 / 0 附近 / -1 下方"),
+    w_zero_axis: Optional[int] = Query(None, description="周线零轴（编码同上）"),
+    m_zero_axis: Optional[int] = Query(None, description="月线零轴（编码同上）"),
+    d_divergence: Optional[int] = Query(None, description="日线背离：1 底背离 / -1 顶背离"),
+    ma_arrangement: Optional[int] = Query(None, description="均线排列：1 多头 / 0 交织 / -1 空头"),
+    rsi14_min: Optional[float] = Query(None, description="RSI14 下限"),
+    rsi14_max: Optional[float] = Query(None, description="RSI14 上限"),
+    vol_ratio_min: Optional[float] = Query(None, description="5 日量比下限"),
+    sort_by: str = Query("ts_code", description="排序字段（快照任意列，可加 ' desc'）"),
+    page: int = Query(1, description="页码", ge=1),
+    page_size: int = Query(100, description="每页记录数", ge=1, le=1000),
+    _: User = Depends(get_current_active_user),
+):
+    """
+    按指标状态筛选全市场股票
+
+    示例：周线 MACD 当根金叉 → `?w_cross=2`；日线底背离且 RSI14 < 30 → `?d_divergence=1&rsi14_max=30`
+    """
+    state_params = {
+        'd_cross': d_cross, 'w_cross': w_cross, 'm_cross': m_cross,
+        'd_zero_axis': d_zero_axis, 'w_zero_axis': w_zero_axis, 'm_zero_axis': m_zero_axis,
+        'd_divergence': d_divergence, 'ma_arrangement': ma_arrangement,
+    }
+    states = {k: v for k, v in state_params.items() if v is not None}
+    ranges = {}
+    if rsi14_min is not None or rsi14_max is not None:
+        ranges['rsi14'] = (rsi14_min, rsi14_max)
+    if vol_ratio_min is not None:
+        ranges['vol_ratio5'] = (vol_ratio_min, None)
+
+    service = TechnicalSnapshotService()
+    result = await service.screen(
+        states=states,
+        ranges=ranges,
+        trade_date=trade_date,
+        order_by=sort_by,
+        limit=page_size,
+        offset=(page - 1) * page_size,
+    )
+    return ApiResponse.success(data=result)
+
+
+@router.get("/{ts_code}")
+@handle_api_errors
+async def get_technical_snapshot(
+    ts_code: str,
+    _: User = Depends(get_current_active_user),
+):
+    """获取单只股票最新技术指标快照"""
+    service = TechnicalSnapshotService()
+    snapshot = await service.get_snapshot(ts_code)
+    return ApiResponse.success(data=snapshot)
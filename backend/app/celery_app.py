@@ -5,15 +5,19 @@ Celery 应用配置
 
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Queue
 from loguru import logger
 
+from app.celery_registry import LazyTaskRegistry, setup_lazy_registry
 from app.core.config import settings
+from app.scheduler.task_metadata import DEFAULT_TASK_QUEUE, TASK_QUEUES
 
 # 创建 Celery 应用实例
 celery_app = Celery(
     "stock_analysis",
     broker=f"{settings.REDIS_URL}",  # 使用 Redis 作为消息队列
-    backend=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/1"  # 使用 Redis DB 1 存储结果
+    backend=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/1",  # 使用 Redis DB 1 存储结果
+    tasks=LazyTaskRegistry(),  # 任务模块在首次查找时导入
 )
 
 # Celery 配置
@@ -43,424 +47,16 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,  # 每次只预取1个任务（防止长任务阻塞）
     task_track_started=True,  # 任务开始时在 result backend 记录 STARTED 状态，避免轮询时误判为僵尸任务
 
-    # 任务默认队列（所有任务都使用 default 队列）
-    task_default_queue='default',
+    # 任务队列（按资源类型划分，见 task_metadata.TASK_QUEUES；路由规则见 celery_registry.route_task）
+    task_queues=[Queue(name, routing_key=name) for name in TASK_QUEUES],
+    task_default_queue=DEFAULT_TASK_QUEUE,
     task_default_exchange='default',
-    task_default_routing_key='default',
+    task_default_routing_key=DEFAULT_TASK_QUEUE,
 )
 
-# 手动导入任务（确保任务被注册）
-# 自动发现在某些情况下可能不工作，所以我们显式导入
-try:
-    from app.tasks import backtest_tasks
-    logger.info(f"✅ 已加载回测任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载回测任务模块失败: {e}")
-
-try:
-    from app.tasks import ai_strategy_tasks
-    logger.info(f"✅ 已加载AI策略生成任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载AI策略生成任务模块失败: {e}")
-
-try:
-    from app.tasks import batch_ai_analysis_tasks
-    logger.info(f"✅ 已加载批量AI分析任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载批量AI分析任务模块失败: {e}")
-
-try:
-    from app.tasks import sentiment_tasks
-    logger.info(f"✅ 已加载市场情绪任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载市场情绪任务模块失败: {e}")
-
-try:
-    from app.tasks import sentiment_ai_analysis_task
-    logger.info(f"✅ 已加载情绪AI分析任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载情绪AI分析任务模块失败: {e}")
-
-try:
-    from app.tasks import premarket_tasks
-    logger.info(f"✅ 已加载盘前预期管理任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载盘前任务模块失败: {e}")
-
-try:
-    from app.tasks import sync_tasks
-    logger.info(f"✅ 已加载数据同步任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载数据同步任务模块失败: {e}")
-
-try:
-    from app.tasks import extended_sync_tasks
-    logger.info(f"✅ 已加载扩展数据同步任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载扩展数据同步任务模块失败: {e}")
-
-try:
-    from app.tasks import notification_tasks
-    logger.info(f"✅ 已加载通知发送任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载通知发送任务模块失败: {e}")
-
-try:
-    from app.tasks import moneyflow_hsgt_tasks
-    logger.info(f"✅ 已加载沪深港通资金流向任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载沪深港通资金流向任务模块失败: {e}")
-
-try:
-    from app.tasks import moneyflow_mkt_dc_tasks
-    logger.info(f"✅ 已加载大盘资金流向任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载大盘资金流向任务模块失败: {e}")
-
-try:
-    from app.tasks import moneyflow_ind_dc_tasks
-    logger.info(f"✅ 已加载板块资金流向任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载板块资金流向任务模块失败: {e}")
-
-try:
-    from app.tasks import moneyflow_stock_dc_tasks
-    logger.info(f"✅ 已加载个股资金流向（DC）任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载个股资金流向（DC）任务模块失败: {e}")
-
-try:
-    from app.tasks import moneyflow_tasks
-    logger.info(f"✅ 已加载个股资金流向（Tushare）任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载个股资金流向（Tushare）任务模块失败: {e}")
-
-try:
-    from app.tasks import margin_tasks
-    logger.info(f"✅ 已加载融资融券交易汇总任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载融资融券交易汇总任务模块失败: {e}")
-
-try:
-    from app.tasks import slb_len_tasks
-    logger.info(f"✅ 已加载转融资交易汇总任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载转融资交易汇总任务模块失败: {e}")
-
-try:
-    from app.tasks import margin_detail_tasks
-    logger.info(f"✅ 已加载融资融券交易明细任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载融资融券交易明细任务模块失败: {e}")
-
-try:
-    from app.tasks import daily_basic_tasks
-    logger.info(f"✅ 已加载每日指标任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载每日指标任务模块失败: {e}")
-
-try:
-    from app.tasks import top_list_tasks
-    logger.info(f"✅ 已加载龙虎榜每日明细任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载龙虎榜每日明细任务模块失败: {e}")
-
-try:
-    from app.tasks import top_inst_tasks
-    logger.info(f"✅ 已加载龙虎榜机构明细任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载龙虎榜机构明细任务模块失败: {e}")
-
-try:
-    from app.tasks import limit_list_tasks
-    logger.info(f"✅ 已加载涨跌停列表任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载涨跌停列表任务模块失败: {e}")
-
-try:
-    from app.tasks import limit_step_tasks
-    logger.info(f"✅ 已加载连板天梯任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载连板天梯任务模块失败: {e}")
-
-try:
-    from app.tasks import limit_cpt_tasks
-    logger.info(f"✅ 已加载最强板块统计任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载最强板块统计任务模块失败: {e}")
-
-try:
-    from app.tasks import report_rc_tasks
-    logger.info(f"✅ 已加载卖方盈利预测数据任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载卖方盈利预测数据任务模块失败: {e}")
-
-try:
-    from app.tasks import news_anns_tasks
-    logger.info(f"✅ 已加载公司公告任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载公司公告任务模块失败: {e}")
-
-try:
-    from app.tasks import cyq_perf_tasks
-    logger.info(f"✅ 已加载每日筹码及胜率任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载每日筹码及胜率任务模块失败: {e}")
-
-try:
-    from app.tasks import cyq_chips_tasks
-    logger.info(f"✅ 已加载每日筹码分布任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载每日筹码分布任务模块失败: {e}")
-
-try:
-    from app.tasks import ccass_hold_tasks
-    logger.info(f"✅ 已加载中央结算系统持股汇总任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载中央结算系统持股汇总任务模块失败: {e}")
-
-try:
-    from app.tasks import hk_hold_tasks
-    logger.info(f"✅ 已加载沪深港股通持股明细任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载沪深港股通持股明细任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_auction_o_tasks
-    logger.info(f"✅ 已加载股票开盘集合竞价任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载股票开盘集合竞价任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_auction_c_tasks
-    logger.info(f"✅ 已加载股票收盘集合竞价任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载股票收盘集合竞价任务模块失败: {e}")
-
-try:
-    from app.tasks import ccass_hold_detail_tasks
-    logger.info(f"✅ 已加载中央结算系统持股明细任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载中央结算系统持股明细任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_nineturn_tasks
-    logger.info(f"✅ 已加载神奇九转指标任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载神奇九转指标任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_ah_comparison_tasks
-    logger.info(f"✅ 已加载AH股比价任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载AH股比价任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_surv_tasks
-    logger.info(f"✅ 已加载机构调研表任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载机构调研表任务模块失败: {e}")
-
-try:
-    from app.tasks import broker_recommend_tasks
-    logger.info(f"✅ 已加载券商每月荐股任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载券商每月荐股任务模块失败: {e}")
-
-try:
-    from app.tasks import dc_member_tasks
-    logger.info(f"✅ 已加载东方财富板块成分任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载东方财富板块成分任务模块失败: {e}")
-
-try:
-    from app.tasks import dc_index_tasks
-    logger.info(f"✅ 已加载东方财富板块数据任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载东方财富板块数据任务模块失败: {e}")
-
-try:
-    from app.tasks import dc_daily_tasks
-    logger.info(f"✅ 已加载东方财富概念板块行情任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载东方财富概念板块行情任务模块失败: {e}")
-
-try:
-    from app.tasks import suspend_tasks
-    logger.info(f"✅ 已加载每日停复牌信息任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载每日停复牌信息任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_limit_d_tasks
-    logger.info(f"✅ 已加载每日涨跌停价格任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载每日涨跌停价格任务模块失败: {e}")
-
-try:
-    from app.tasks import adj_factor_tasks
-    logger.info(f"✅ 已加载复权因子任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载复权因子任务模块失败: {e}")
-
-try:
-    from app.tasks import hsgt_top10_tasks
-    logger.info(f"✅ 已加载沪深股通十大成交股任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载沪深股通十大成交股任务模块失败: {e}")
-
-try:
-    from app.tasks import ggt_top10_tasks
-    logger.info(f"✅ 已加载港股通十大成交股任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载港股通十大成交股任务模块失败: {e}")
-
-try:
-    from app.tasks import ggt_daily_tasks
-    logger.info(f"✅ 已加载港股通每日成交统计任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载港股通每日成交统计任务模块失败: {e}")
-
-try:
-    from app.tasks import ggt_monthly_tasks
-    logger.info(f"✅ 已加载港股通每月成交统计任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载港股通每月成交统计任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_shock_tasks
-    logger.info(f"✅ 已加载个股异常波动任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载个股异常波动任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_alert_tasks
-    logger.info(f"✅ 已加载交易所重点提示证券任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载交易所重点提示证券任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_high_shock_tasks
-    logger.info(f"✅ 已加载个股严重异常波动任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载个股严重异常波动任务模块失败: {e}")
-
-try:
-    from app.tasks import pledge_stat_tasks
-    logger.info(f"✅ 已加载股权质押统计任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载股权质押统计任务模块失败: {e}")
-
-try:
-    from app.tasks import repurchase_tasks
-    logger.info(f"✅ 已加载股票回购任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载股票回购任务模块失败: {e}")
-
-try:
-    from app.tasks import forecast_tasks
-    logger.info(f"✅ 已加载业绩预告任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载业绩预告任务模块失败: {e}")
-
-try:
-    from app.tasks import express_tasks
-    logger.info(f"✅ 已加载业绩快报任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载业绩快报任务模块失败: {e}")
-
-try:
-    from app.tasks import dividend_tasks
-    logger.info(f"✅ 已加载分红送股任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载分红送股任务模块失败: {e}")
-
-try:
-    from app.tasks import share_float_tasks
-    logger.info(f"✅ 已加载限售股解禁任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载限售股解禁任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_holdernumber_tasks
-    logger.info(f"✅ 已加载股东人数任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载股东人数任务模块失败: {e}")
-
-try:
-    from app.tasks import block_trade_tasks
-    logger.info(f"✅ 已加载大宗交易任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载大宗交易任务模块失败: {e}")
-
-try:
-    from app.tasks import stk_holdertrade_tasks
-    logger.info(f"✅ 已加载股东增减持任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载股东增减持任务模块失败: {e}")
-
-try:
-    from app.tasks import income_tasks
-    logger.info(f"✅ 已加载利润表数据任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载利润表数据任务模块失败: {e}")
-
-try:
-    from app.tasks import balancesheet_tasks
-    logger.info(f"✅ 已加载资产负债表数据任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载资产负债表数据任务模块失败: {e}")
-
-try:
-    from app.tasks import cashflow_tasks
-    logger.info(f"✅ 已加载现金流量表数据任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载现金流量表数据任务模块失败: {e}")
-
-try:
-    from app.tasks import fina_indicator_tasks
-    logger.info(f"✅ 已加载财务指标数据任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载财务指标数据任务模块失败: {e}")
-
-try:
-    from app.tasks import fina_audit_tasks
-    logger.info(f"✅ 已加载财务审计意见任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载财务审计意见任务模块失败: {e}")
-
-try:
-    from app.tasks import fina_mainbz_tasks
-    logger.info(f"✅ 已加载主营业务构成任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载主营业务构成任务模块失败: {e}")
-
-try:
-    from app.tasks import disclosure_date_tasks
-    logger.info(f"✅ 已加载财报披露计划任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载财报披露计划任务模块失败: {e}")
-
-try:
-    from app.tasks import stock_st_tasks
-    logger.info(f"✅ 已加载ST股票列表任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载ST股票列表任务模块失败: {e}")
-
-try:
-    from app.tasks import trade_cal_tasks
-    logger.info(f"✅ 已加载交易日历任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载交易日历任务模块失败: {e}")
-
-try:
-    from app.tasks import value_metrics_tasks
-    logger.info(f"✅ 已加载价值度量任务模块")
-except Exception as e:
-    logger.error(f"❌ 加载价值度量任务模块失败: {e}")
-
-# 自动发现任务模块（作为备用）
-celery_app.autodiscover_tasks(['app.tasks'])
+# 任务延迟注册：按源码索引在首次派发时导入任务模块，路由由 task_metadata 声明
+# （CELERY_EAGER_TASK_IMPORTS=1 时恢复启动时全部导入）
+setup_lazy_registry(celery_app)
 
 # 注册Celery信号处理器（自动更新任务历史）
 try:
@@ -469,6 +65,12 @@ try:
 except Exception as e:
     logger.error(f"❌ 注册Celery信号处理器失败: {e}")
 
+# 注册队列指标采集（排队延迟 / 执行耗时）
+try:
+    import app.monitoring.celery_queue_metrics
+except Exception as e:
+    logger.error(f"❌ 注册Celery队列指标采集失败: {e}")
+
 # ==========================================
 # Celery Beat 定时任务调度配置
 # ==========================================
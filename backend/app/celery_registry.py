@@ -0,0 +1,245 @@
+"""
+Celery 任务延迟注册
+- 任务名 → 定义模块的索引由 app/tasks 源码静态解析得到（不执行导入），
+  启动时不再逐个导入约 70 个任务模块
+- 任务模块在首次派发（Worker 收到消息 / 代码查找任务）时才导入
+- 任务路由（队列）由 scheduler/task_metadata.py 中的元数据声明
+
+设置环境变量 CELERY_EAGER_TASK_IMPORTS=1 可恢复启动时导入全部任务模块
+（便于 `celery inspect registered` 等需要完整注册表的场景）。
+"""
+
+import ast
+import importlib
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from celery.app.registry import TaskRegistry
+from celery.app.trace import build_tracer
+from celery.exceptions import NotRegistered
+from celery.worker.consumer import Consumer
+from loguru import logger
+
+from app.scheduler.task_metadata import DEFAULT_TASK_QUEUE, TASK_MAPPING, get_task_queue
+
+TASKS_PACKAGE = "app.tasks"
+TASKS_DIR = Path(__file__).resolve().parent / "tasks"
+
+# 创建任务且可带 name= 参数的调用（装饰器与任务工厂）
+_TASK_FACTORIES = {"task", "shared_task", "make_incremental_task", "make_full_history_task"}
+
+
+def eager_imports_enabled() -> bool:
+    return os.getenv("CELERY_EAGER_TASK_IMPORTS", "").lower() in ("1", "true", "yes")
+
+
+# ==================== 任务索引 ====================
+
+
+def _scan_module(path: Path) -> Dict[str, str]:
+    """解析单个任务模块源码中显式声明的任务名"""
+    module = f"{TASKS_PACKAGE}.{path.stem}"
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError) as e:
+        logger.warning(f"解析任务模块 {module} 失败: {e}")
+        return {}
+
+    names = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        func_name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+        if func_name not in _TASK_FACTORIES:
+            continue
+        for keyword in node.keywords:
+            if (
+                keyword.arg == "name"
+                and isinstance(keyword.value, ast.Constant)
+                and isinstance(keyword.value.value, str)
+            ):
+                names[keyword.value.value] = module
+    return names
+
+
+@lru_cache(maxsize=1)
+def task_module_index() -> Dict[str, str]:
+    """
+    任务名 → 定义模块
+
+    未显式指定 name 的任务使用 Celery 默认命名 `app.tasks.<模块>.<函数>`，
+    由 resolve_task_module 按前缀解析，无需出现在索引中。
+    """
+    index: Dict[str, str] = {}
+    for path in sorted(TASKS_DIR.glob("*.py")):
+        if path.stem.startswith("_"):
+            continue
+        index.update(_scan_module(path))
+
+    # 元数据可用 module 字段显式声明任务所在模块（优先于源码解析）
+    for name, meta in declared_tasks().items():
+        if meta.get("module"):
+            index[name] = meta["module"]
+    return index
+
+
+@lru_cache(maxsize=1)
+def declared_tasks() -> Dict[str, Dict[str, Any]]:
+    """
+    task_metadata 中声明的任务：任务名 → {'module', 'queue'}
+    """
+    declared = {}
+    for meta in TASK_MAPPING.values():
+        declared[meta["task"]] = {
+            "module": meta.get("module"),
+            "queue": get_task_queue(meta["task"], meta),
+        }
+    return declared
+
+
+def resolve_task_module(name: str) -> Optional[str]:
+    """查找任务名所在的模块（未知任务返回 None）"""
+    module = task_module_index().get(name)
+    if module:
+        return module
+    if name.startswith(f"{TASKS_PACKAGE}."):
+        module = name.rsplit(".", 1)[0]
+        if (TASKS_DIR / f"{module.rsplit('.', 1)[-1]}.py").exists():
+            return module
+    return None
+
+
+def import_all_task_modules():
+    """导入全部任务模块（CELERY_EAGER_TASK_IMPORTS 模式）"""
+    for path in sorted(TASKS_DIR.glob("*.py")):
+        if path.stem.startswith("_"):
+            continue
+        module = f"{TASKS_PACKAGE}.{path.stem}"
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.error(f"❌ 加载任务模块 {module} 失败: {e}")
+
+
+# ==================== 路由 ====================
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery 路由：按 task_metadata 声明的队列投递（queue 字段 / TASK_QUEUE_ROUTES / 分类）
+
+    解析为默认队列的任务返回 None，交由 task_default_queue 处理；
+    调用方显式传入的 queue 选项优先于路由结果。
+    """
+    declared = declared_tasks().get(name)
+    queue = declared["queue"] if declared else get_task_queue(name)
+    if queue and queue != DEFAULT_TASK_QUEUE:
+        return {"queue": queue}
+    return None
+
+
+# ==================== 延迟注册表 ====================
+
+
+class LazyTaskRegistry(TaskRegistry):
+    """
+    首次查找时导入任务模块的注册表
+
+    Worker 子进程通过 fast_trace_task 直接读取 `tasks[name].__trace__`，
+    因此在 Worker 中导入模块后需要为新注册的任务构建执行器。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._import_lock = threading.RLock()
+        self._app = None
+        self._hostname: Optional[str] = None
+
+    def enable_tracing(self, app, hostname: str):
+        """Worker 启动后调用：此后延迟导入的任务会立即构建执行器（子进程经 fork 继承）"""
+        self._app = app
+        self._hostname = hostname
+
+    def __missing__(self, key):
+        module = resolve_task_module(key)
+        if module is None:
+            raise NotRegistered(key)
+
+        with self._import_lock:
+            if not dict.__contains__(self, key):
+                try:
+                    importlib.import_module(module)
+                except Exception as e:
+                    # 与原先启动时导入失败一致：记录错误，任务视为未注册
+                    logger.error(f"❌ 加载任务模块 {module} 失败: {e}")
+                    raise NotRegistered(key) from e
+                logger.info(f"按需加载任务模块 {module}（任务 {key}）")
+                self._build_tracers()
+            if not dict.__contains__(self, key):
+                raise NotRegistered(key)
+            return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except NotRegistered:
+            return default
+
+    def _build_tracers(self):
+        if self._app is None:
+            return
+        for name, task in list(self.items()):
+            if task.__trace__ is None:
+                task.__trace__ = build_tracer(
+                    name, task, self._app.loader, self._hostname, app=self._app
+                )
+
+
+class LazyStrategies(dict):
+    """Consumer 的任务策略表：收到未注册任务的消息时按需导入并创建策略"""
+
+    def __init__(self, consumer):
+        super().__init__()
+        self.consumer = consumer
+
+    def __missing__(self, key):
+        app = self.consumer.app
+        task = app.tasks[key]  # 未知任务抛出 NotRegistered（KeyError 子类）
+        strategy = task.start_strategy(app, self.consumer)
+        if task.__trace__ is None:
+            task.__trace__ = build_tracer(
+                key, task, app.loader, self.consumer.hostname, app=app
+            )
+        self[key] = strategy
+        return strategy
+
+
+class LazyConsumer(Consumer):
+    """使用 LazyStrategies 的 Worker Consumer"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.strategies = LazyStrategies(self)
+
+
+def setup_lazy_registry(celery_app):
+    """配置 Celery 应用：延迟注册、元数据路由与 Worker 钩子"""
+    from celery.signals import worker_init
+
+    celery_app.conf.task_routes = (route_task,)
+
+    if eager_imports_enabled():
+        import_all_task_modules()
+        return
+
+    celery_app.conf.worker_consumer = "app.celery_registry:LazyConsumer"
+
+    @worker_init.connect(weak=False)
+    def _enable_tracing(sender=None, **kwargs):
+        registry = celery_app.tasks
+        if isinstance(registry, LazyTaskRegistry):
+            registry.enable_tracing(celery_app, sender.hostname)
@@ -241,6 +241,25 @@ def worker_process_init_handler(**kwargs):
         logger.warning(f"重置 DatabaseManager 单例失败（无害）: {e}")
 
 
+@signals.worker_init.connect
+def worker_init_handler(sender=None, **kwargs):
+    """
+    threads 池 Worker（sync-io / llm / notify 队列）启动时切换异步引擎为 NullPool。
+
+    多个线程各自创建事件循环运行任务，连接池中的 asyncpg 连接绑定到创建它的循环，
+    被其他线程复用会报 "attached to a different loop"；不复用连接即可在线程间安全共享引擎。
+    """
+    pool_cls = getattr(sender, 'pool_cls', None)
+    if 'thread' not in getattr(pool_cls, '__module__', str(pool_cls)):
+        return
+    try:
+        from app.core.database import reset_async_engine
+        reset_async_engine(null_pool=True)
+        logger.info("✅ threads 池 Worker 已切换异步引擎为 NullPool")
+    except Exception as e:
+        logger.warning(f"切换异步引擎失败: {e}")
+
+
 @signals.task_revoked.connect
 def task_revoked_handler(sender=None, **kwargs):
     """
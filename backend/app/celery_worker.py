@@ -0,0 +1,61 @@
+"""
+按队列启动 Celery Worker
+
+每个队列（见 task_metadata.TASK_QUEUES）使用独立的 Worker 进程，池类型与并发数取自队列定义，
+可用环境变量覆盖（队列名中的 - 替换为 _）：
+    CELERY_SYNC_IO_CONCURRENCY=16
+    CELERY_COMPUTE_POOL=prefork
+
+用法:
+    python -m app.celery_worker sync-io
+    python -m app.celery_worker compute --loglevel=debug   # 其余参数原样传给 celery worker
+"""
+
+import os
+import sys
+from typing import List
+
+from app.scheduler.task_metadata import TASK_QUEUES
+
+
+def _env(queue: str, option: str):
+    return os.getenv(f"CELERY_{queue.upper().replace('-', '_')}_{option}")
+
+
+def build_worker_argv(queue: str, extra_args: List[str] = ()) -> List[str]:
+    """
+    生成指定队列 Worker 的 celery 命令行
+
+    Raises:
+        ValueError: 队列未在 TASK_QUEUES 中定义
+    """
+    if queue not in TASK_QUEUES:
+        raise ValueError(f"未知队列 '{queue}'，可选: {', '.join(TASK_QUEUES)}")
+
+    config = TASK_QUEUES[queue]
+    pool = _env(queue, "POOL") or config["pool"]
+    concurrency = int(_env(queue, "CONCURRENCY") or config["concurrency"]) or os.cpu_count() or 1
+    prefetch = int(_env(queue, "PREFETCH_MULTIPLIER") or config["prefetch_multiplier"])
+
+    return [
+        "celery", "-A", "app.celery_app", "worker",
+        "--queues", queue,
+        "--pool", pool,
+        "--concurrency", str(concurrency),
+        "--prefetch-multiplier", str(prefetch),
+        "--hostname", f"{queue}@%h",
+        "--loglevel", "info",
+        *extra_args,
+    ]
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    argv = build_worker_argv(sys.argv[1], sys.argv[2:])
+    os.execvp(argv[0], argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ Redis 缓存管理器
 
 import json
 import hashlib
-from typing import Any, Optional, Callable
+from typing import Any, Callable, Dict, List, Optional
 from functools import wraps
 from redis import asyncio as aioredis
 from redis.exceptions import RedisError
@@ -120,6 +120,20 @@ class CacheManager:
             logger.warning(f"Cache delete error for key {key}: {e}")
             return False
 
+    async def delete_many(self, keys: List[str]) -> int:
+        """批量删除缓存键（一次 DEL 往返），返回删除数量"""
+        if not keys:
+            return 0
+        redis = await self._get_redis()
+        if redis is None:
+            return 0
+
+        try:
+            return await redis.delete(*keys)
+        except RedisError as e:
+            logger.warning(f"Cache delete_many error ({len(keys)} keys): {e}")
+            return 0
+
     async def delete_pattern(self, pattern: str) -> int:
         """
         删除匹配模式的所有缓存键
@@ -168,6 +182,172 @@ class CacheManager:
         await self.set(key, value, ttl)
         return value
 
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        批量获取缓存值（一次 MGET 往返）
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            与 keys 对齐的值列表，不存在或解析失败的位置为 None
+        """
+        if not keys:
+            return []
+        redis = await self._get_redis()
+        if redis is None:
+            return [None] * len(keys)
+
+        try:
+            values = await redis.mget(keys)
+        except RedisError as e:
+            logger.warning(f"Cache mget error ({len(keys)} keys): {e}")
+            return [None] * len(keys)
+        return [self._loads(v) for v in values]
+
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        批量设置缓存值（一次 pipeline，逐键 SETEX）
+
+        Args:
+            mapping: {缓存键: 值}
+            ttl: 过期时间（秒），None 表示使用默认值
+
+        Returns:
+            是否设置成功
+        """
+        if not mapping:
+            return True
+        redis = await self._get_redis()
+        if redis is None:
+            return False
+
+        ttl = settings.CACHE_DEFAULT_TTL if ttl is None else ttl
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.setex(key, ttl, json.dumps(value, default=str, ensure_ascii=False))
+            await pipe.execute()
+            return True
+        except (RedisError, TypeError) as e:
+            logger.warning(f"Cache set_many error ({len(mapping)} keys): {e}")
+            return False
+
+    async def hash_get_many(self, key: str, fields: List[str]) -> List[Optional[Any]]:
+        """批量读取 Hash 字段（一次 HMGET 往返），返回与 fields 对齐的值列表"""
+        if not fields:
+            return []
+        redis = await self._get_redis()
+        if redis is None:
+            return [None] * len(fields)
+
+        try:
+            values = await redis.hmget(key, fields)
+        except RedisError as e:
+            logger.warning(f"Cache hmget error for key {key}: {e}")
+            return [None] * len(fields)
+        return [self._loads(v) for v in values]
+
+    async def hash_replace(self, key: str, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        整体替换 Hash（写临时键后 RENAME，读方不会看到半份数据）
+
+        Args:
+            key: Hash 键
+            mapping: {字段: 值}
+            ttl: 过期时间（秒），None 表示使用默认值
+        """
+        if not mapping:
+            return False
+        redis = await self._get_redis()
+        if redis is None:
+            return False
+
+        ttl = settings.CACHE_DEFAULT_TTL if ttl is None else ttl
+        tmp_key = f"{key}:tmp"
+        try:
+            encoded = {f: json.dumps(v, default=str, ensure_ascii=False) for f, v in mapping.items()}
+            pipe = redis.pipeline(transaction=True)
+            pipe.delete(tmp_key)
+            pipe.hset(tmp_key, mapping=encoded)
+            pipe.expire(tmp_key, ttl)
+            pipe.rename(tmp_key, key)
+            await pipe.execute()
+            return True
+        except (RedisError, TypeError) as e:
+            logger.warning(f"Cache hash_replace error for key {key}: {e}")
+            return False
+
+    async def hash_set_many(self, key: str, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """批量写入 Hash 字段并刷新过期时间（一次 pipeline：HSET + EXPIRE）"""
+        if not mapping:
+            return True
+        redis = await self._get_redis()
+        if redis is None:
+            return False
+
+        ttl = settings.CACHE_DEFAULT_TTL if ttl is None else ttl
+        try:
+            encoded = {f: json.dumps(v, default=str, ensure_ascii=False) for f, v in mapping.items()}
+            pipe = redis.pipeline(transaction=False)
+            pipe.hset(key, mapping=encoded)
+            pipe.expire(key, ttl)
+            await pipe.execute()
+            return True
+        except (RedisError, TypeError) as e:
+            logger.warning(f"Cache hash_set_many error for key {key}: {e}")
+            return False
+
+    async def hash_delete(self, key: str, fields: List[str]) -> int:
+        """删除 Hash 字段，返回删除数量"""
+        if not fields:
+            return 0
+        redis = await self._get_redis()
+        if redis is None:
+            return 0
+
+        try:
+            return await redis.hdel(key, *fields)
+        except RedisError as e:
+            logger.warning(f"Cache hdel error for key {key}: {e}")
+            return 0
+
+    async def publish(self, channel: str, message: Any) -> int:
+        """发布消息（JSON 序列化），返回收到消息的订阅者数量"""
+        redis = await self._get_redis()
+        if redis is None:
+            return 0
+
+        try:
+            return await redis.publish(channel, json.dumps(message, default=str, ensure_ascii=False))
+        except (RedisError, TypeError) as e:
+            logger.warning(f"Cache publish error for channel {channel}: {e}")
+            return 0
+
+    async def subscribe(self, channel: str):
+        """
+        订阅频道
+
+        Returns:
+            已订阅的 PubSub 对象；Redis 不可用时返回 None
+        """
+        redis = await self._get_redis()
+        if redis is None:
+            return None
+
+        pubsub = redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(channel)
+        return pubsub
+
+    @staticmethod
+    def _loads(value: Optional[str]) -> Optional[Any]:
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except (TypeError, json.JSONDecodeError):
+            return None
+
     async def exists(self, key: str) -> bool:
         """
         检查缓存键是否存在
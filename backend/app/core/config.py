@@ -83,6 +83,28 @@ class Settings(BaseSettings):
     # 数据源配置
     DEFAULT_DATA_SOURCE: str = os.getenv("DATA_SOURCE", "akshare")
 
+    # 实时行情微批写入：满 N 条或距首条缓冲超过 T 毫秒即写库
+    REALTIME_QUOTE_FLUSH_ROWS: int = int(os.getenv("REALTIME_QUOTE_FLUSH_ROWS", "500"))
+    REALTIME_QUOTE_FLUSH_INTERVAL_MS: int = int(os.getenv("REALTIME_QUOTE_FLUSH_INTERVAL_MS", "500"))
+
+    # 用户策略沙箱进程池（选股策略评分在独立进程中执行）
+    STRATEGY_SANDBOX_ENABLED: bool = os.getenv("STRATEGY_SANDBOX_ENABLED", "true").lower() == "true"
+    STRATEGY_SANDBOX_WORKERS: int = int(os.getenv("STRATEGY_SANDBOX_WORKERS", "0"))  # 0 = min(4, CPU 核数)
+    STRATEGY_SANDBOX_MAX_CALLS: int = int(os.getenv("STRATEGY_SANDBOX_MAX_CALLS", "200"))  # 每进程调用次数后回收
+    STRATEGY_SANDBOX_CPU_SECONDS: int = int(os.getenv("STRATEGY_SANDBOX_CPU_SECONDS", "30"))
+    STRATEGY_SANDBOX_MEMORY_MB: int = int(os.getenv("STRATEGY_SANDBOX_MEMORY_MB", "1024"))
+    STRATEGY_SANDBOX_WALL_SECONDS: int = int(os.getenv("STRATEGY_SANDBOX_WALL_SECONDS", "60"))
+
+    # 已编译策略类缓存（按 code_hash 常驻，避免每次加载重复 exec 策略代码）
+    STRATEGY_CLASS_CACHE_SIZE: int = int(os.getenv("STRATEGY_CLASS_CACHE_SIZE", "128"))
+
+    # 同步覆盖索引：按 trade_date 行数 + 交易日历规划切片，只拉取缺失 / 可疑分区
+    SYNC_COVERAGE_ENABLED: bool = os.getenv("SYNC_COVERAGE_ENABLED", "true").lower() == "true"
+    # 行数低于邻近交易日中位数 × 该比例视为可疑（部分入库）
+    SYNC_COVERAGE_SUSPECT_RATIO: float = float(os.getenv("SYNC_COVERAGE_SUSPECT_RATIO", "0.5"))
+    # 规划区间末尾的最近 N 个交易日总是重新拉取（上游修订近期数据）
+    SYNC_COVERAGE_RECENT_DAYS: int = int(os.getenv("SYNC_COVERAGE_RECENT_DAYS", "5"))
+
     # Redis配置
     REDIS_HOST: str = os.getenv("REDIS_HOST", "redis")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
@@ -99,6 +121,8 @@ class Settings(BaseSettings):
     CACHE_MARKET_STATUS_TTL: int = int(os.getenv("CACHE_MARKET_STATUS_TTL", "60"))  # 1分钟
     CACHE_QUOTE_TRADING_TTL: int = int(os.getenv("CACHE_QUOTE_TRADING_TTL", "60"))  # 行情（交易时段）
     CACHE_QUOTE_NON_TRADING_TTL: int = int(os.getenv("CACHE_QUOTE_NON_TRADING_TTL", "3600"))  # 行情（非交易时段）
+    CACHE_QUOTE_L1_TTL: int = int(os.getenv("CACHE_QUOTE_L1_TTL", "5"))  # 行情进程内 L1（交易时段）
+    CACHE_QUOTE_L1_MAX_ENTRIES: int = int(os.getenv("CACHE_QUOTE_L1_MAX_ENTRIES", "20000"))  # L1 容量（每个 worker）
     CACHE_ANALYSIS_TTL: int = int(os.getenv("CACHE_ANALYSIS_TTL", "1800"))  # 分析结果 30 分钟
     CACHE_HOT_TTL: int = int(os.getenv("CACHE_HOT_TTL", "120"))  # 热点数据 2 分钟
     CACHE_REALTIME_TTL: int = int(os.getenv("CACHE_REALTIME_TTL", "30"))  # 实时数据 30 秒
@@ -270,6 +294,9 @@ class _CacheTTLView:
     @property
     def quote_non_trading(self) -> int: return self._s.CACHE_QUOTE_NON_TRADING_TTL
 
+    @property
+    def quote_l1(self) -> int: return self._s.CACHE_QUOTE_L1_TTL
+
     @property
     def analysis(self) -> int: return self._s.CACHE_ANALYSIS_TTL
 
@@ -11,6 +11,7 @@
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from typing import Generator
 from contextlib import asynccontextmanager
@@ -61,22 +62,30 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
-def reset_async_engine():
+def reset_async_engine(null_pool: bool = False):
     """
     在 Celery fork pool worker 中重新初始化异步引擎。
 
     fork 出的子进程继承了父进程的 async_engine，但该引擎绑定到父进程
     的事件循环，在子进程中使用会触发 "attached to a different loop" 错误。
     此函数在子进程创建新事件循环后立即调用，确保引擎绑定到正确的循环。
+
+    Args:
+        null_pool: 不复用连接（threads 池 Worker 使用：多个线程各自运行事件循环，
+                   共享的连接池会把连接交给其他循环）
     """
     global async_engine, AsyncSessionLocal
 
+    pool_kwargs = (
+        {"poolclass": NullPool}
+        if null_pool
+        else {"pool_size": _POOL_SIZE, "max_overflow": _MAX_OVERFLOW}
+    )
     async_engine = create_async_engine(
         settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://"),
         pool_pre_ping=True,
-        pool_size=_POOL_SIZE,
-        max_overflow=_MAX_OVERFLOW,
         echo=settings.is_development,
+        **pool_kwargs,
     )
 
     AsyncSessionLocal = async_sessionmaker(
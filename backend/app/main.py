@@ -3,6 +3,8 @@ Stock Analysis Backend API
 主应用入口
 """
 
+import asyncio
+
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
@@ -13,7 +15,7 @@ from app.api.exception_handlers import register_exception_handlers
 from app.core.config import settings
 from app.core.logging_config import get_logger, setup_logging
 from app.middleware.logging import LoggingMiddleware
-from app.middleware.metrics import metrics_middleware
+from app.middleware.metrics import metrics_middleware, update_celery_queue_metrics
 from app.middleware.rate_limiter import limiter, rate_limit_exceeded_handler
 
 # 初始化日志系统
@@ -96,6 +98,10 @@ async def shutdown_event():
     """应用关闭事件"""
     logger.info(f"👋 {settings.PROJECT_NAME} 关闭中...")
 
+    # 关闭策略沙箱进程池（未使用时为空操作）
+    from app.services.strategy_sandbox import shutdown_sandbox_pool
+    shutdown_sandbox_pool()
+
 
 @app.get("/")
 async def root():
@@ -264,6 +270,12 @@ async def health_check():
 @app.get("/metrics")
 async def metrics():
     """Prometheus 指标端点"""
+    try:
+        from app.monitoring.celery_queue_metrics import get_queue_metrics
+
+        update_celery_queue_metrics(await asyncio.to_thread(get_queue_metrics))
+    except Exception as e:
+        logger.warning(f"采集 Celery 队列指标失败: {e}")
     return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
@@ -119,6 +119,47 @@ feature_calculation_tasks_total = Counter(
     ['status']  # success, failed
 )
 
+# 实时行情微批写入：每次 flush 的耗时与行数
+realtime_quote_flush_seconds = Histogram(
+    'realtime_quote_flush_seconds',
+    'Realtime quote micro-batch flush duration in seconds',
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+)
+
+realtime_quote_flush_rows = Histogram(
+    'realtime_quote_flush_rows',
+    'Number of realtime quotes written per micro-batch flush',
+    buckets=[1, 10, 50, 100, 250, 500, 1000, 2500, 5000]
+)
+
+realtime_quote_flush_failures_total = Counter(
+    'realtime_quote_flush_failures_total',
+    'Total number of failed realtime quote micro-batch flushes'
+)
+
+# ========== Celery 队列指标 ==========
+
+# 队列积压消息数
+celery_queue_depth = Gauge(
+    'celery_queue_depth',
+    'Number of messages waiting in the Celery queue',
+    ['queue']
+)
+
+# 排队延迟（发布到开始执行）
+celery_queue_wait_seconds = Gauge(
+    'celery_queue_wait_seconds',
+    'Celery task queue wait time in seconds (recent samples)',
+    ['queue', 'stat']  # p50, p95, max, avg
+)
+
+# 任务执行耗时
+celery_queue_run_seconds = Gauge(
+    'celery_queue_run_seconds',
+    'Celery task run time in seconds (recent samples)',
+    ['queue', 'stat']  # p50, p95, max, avg
+)
+
 
 class MetricsMiddleware(BaseHTTPMiddleware):
     """
@@ -274,3 +315,36 @@ def record_feature_calculation_task(status: str):
         status: 任务状态（'success' 或 'failed'）
     """
     feature_calculation_tasks_total.labels(status=status).inc()
+
+
+def record_realtime_quote_flush(rows: int, duration: float, success: bool = True):
+    """
+    记录实时行情微批写入
+
+    Args:
+        rows: 本次写入行数
+        duration: 写入耗时（秒）
+        success: 是否写入成功
+    """
+    if not success:
+        realtime_quote_flush_failures_total.inc()
+        return
+    realtime_quote_flush_seconds.observe(duration)
+    realtime_quote_flush_rows.observe(rows)
+
+
+def update_celery_queue_metrics(queue_metrics: dict):
+    """
+    更新 Celery 队列指标
+
+    Args:
+        queue_metrics: celery_queue_metrics.get_queue_metrics() 的返回值
+    """
+    for queue, data in queue_metrics.items():
+        celery_queue_depth.labels(queue=queue).set(data['depth'])
+        for stat, value in data['wait_seconds'].items():
+            if value is not None:
+                celery_queue_wait_seconds.labels(queue=queue, stat=stat).set(value)
+        for stat, value in data['run_seconds'].items():
+            if value is not None:
+                celery_queue_run_seconds.labels(queue=queue, stat=stat).set(value)
@@ -0,0 +1,168 @@
+"""
+Celery 队列指标
+- 发布任务时在消息头写入 sent_at，Worker 开始执行时据此计算排队延迟
+- 排队延迟 / 执行耗时按队列写入 Redis（汇总所有 Worker 进程），保留最近样本用于分位数
+- 队列深度直接读取 Redis broker 中的队列列表长度
+
+用于按队列独立评估并发配置：深度持续增长或排队延迟高说明该队列 Worker 不足。
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import redis
+from celery import signals
+from loguru import logger
+
+from app.core.config import settings
+from app.scheduler.task_metadata import DEFAULT_TASK_QUEUE, TASK_QUEUES
+
+KEY_PREFIX = "celery:queue_metrics"
+SAMPLE_SIZE = 500  # 每个队列保留的最近样本数
+SENT_AT_HEADER = "sent_at"
+
+_redis_client: Optional[redis.Redis] = None
+# 本进程内正在执行的任务：task_id -> (队列, 开始时间)
+_running: Dict[str, tuple] = {}
+
+
+def _get_redis() -> redis.Redis:
+    """Broker 所在 Redis（队列深度与指标写在同一实例）"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            settings.REDIS_URL, socket_connect_timeout=2, socket_timeout=2
+        )
+    return _redis_client
+
+
+def _key(queue: str, kind: str) -> str:
+    return f"{KEY_PREFIX}:{queue}:{kind}"
+
+
+def record_task_timing(
+    queue: str,
+    wait_seconds: Optional[float] = None,
+    run_seconds: Optional[float] = None,
+    failed: bool = False,
+):
+    """记录一次任务的排队延迟 / 执行耗时（单次 pipeline 往返）"""
+    pipe = _get_redis().pipeline(transaction=False)
+    totals = _key(queue, "totals")
+    if wait_seconds is not None:
+        pipe.lpush(_key(queue, "wait"), round(wait_seconds, 4))
+        pipe.ltrim(_key(queue, "wait"), 0, SAMPLE_SIZE - 1)
+        pipe.hincrby(totals, "started", 1)
+        pipe.hincrbyfloat(totals, "wait_sum", wait_seconds)
+    if run_seconds is not None:
+        pipe.lpush(_key(queue, "run"), round(run_seconds, 4))
+        pipe.ltrim(_key(queue, "run"), 0, SAMPLE_SIZE - 1)
+        pipe.hincrby(totals, "completed", 1)
+        pipe.hincrbyfloat(totals, "run_sum", run_seconds)
+    if failed:
+        pipe.hincrby(totals, "failed", 1)
+    pipe.execute()
+
+
+def _percentile(samples: List[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _summarize(samples: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "p50": _percentile(samples, 0.5),
+        "p95": _percentile(samples, 0.95),
+        "max": max(samples) if samples else None,
+    }
+
+
+def get_queue_metrics(queues: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    读取各队列的深度、排队延迟与执行耗时
+
+    Returns:
+        {队列: {'depth', 'pool', 'concurrency', 'started', 'completed', 'failed',
+                'wait_seconds': {'p50', 'p95', 'max', 'avg'}, 'run_seconds': {...}}}
+    """
+    queues = list(queues or TASK_QUEUES)
+    pipe = _get_redis().pipeline(transaction=False)
+    for queue in queues:
+        pipe.llen(queue)
+        pipe.hgetall(_key(queue, "totals"))
+        pipe.lrange(_key(queue, "wait"), 0, -1)
+        pipe.lrange(_key(queue, "run"), 0, -1)
+    replies = pipe.execute()
+
+    metrics = {}
+    for i, queue in enumerate(queues):
+        depth, totals, waits, runs = replies[4 * i: 4 * i + 4]
+        totals = {k.decode() if isinstance(k, bytes) else k: float(v) for k, v in totals.items()}
+        waits = [float(v) for v in waits]
+        runs = [float(v) for v in runs]
+        started = int(totals.get("started", 0))
+        completed = int(totals.get("completed", 0))
+        config = TASK_QUEUES.get(queue, {})
+
+        wait_stats = _summarize(waits)
+        wait_stats["avg"] = totals["wait_sum"] / started if started else None
+        run_stats = _summarize(runs)
+        run_stats["avg"] = totals["run_sum"] / completed if completed else None
+
+        metrics[queue] = {
+            "depth": int(depth),
+            "pool": config.get("pool"),
+            "concurrency": config.get("concurrency"),
+            "started": started,
+            "completed": completed,
+            "failed": int(totals.get("failed", 0)),
+            "wait_seconds": wait_stats,
+            "run_seconds": run_stats,
+        }
+    return metrics
+
+
+def reset_queue_metrics(queues: Optional[Iterable[str]] = None):
+    """清空累计指标（调整并发配置后重新观测时使用）"""
+    keys = [_key(q, kind) for q in (queues or TASK_QUEUES) for kind in ("totals", "wait", "run")]
+    _get_redis().delete(*keys)
+
+
+# ==================== Celery 信号 ====================
+
+
+@signals.before_task_publish.connect
+def _stamp_sent_at(headers=None, **kwargs):
+    """发布时记录时间戳（协议 v2 自定义消息头，Worker 端可从 task.request 读取）"""
+    if headers is not None:
+        headers.setdefault(SENT_AT_HEADER, time.time())
+
+
+@signals.task_prerun.connect
+def _on_task_prerun(task_id=None, task=None, **kwargs):
+    try:
+        request = task.request
+        queue = (request.delivery_info or {}).get("routing_key") or DEFAULT_TASK_QUEUE
+        now = time.time()
+        _running[task_id] = (queue, now)
+        sent_at = getattr(request, SENT_AT_HEADER, None)
+        if sent_at is not None:
+            record_task_timing(queue, wait_seconds=max(0.0, now - float(sent_at)))
+    except Exception as e:
+        # 指标采集失败不影响任务执行
+        logger.debug(f"记录队列排队延迟失败: {e}")
+
+
+@signals.task_postrun.connect
+def _on_task_postrun(task_id=None, state=None, **kwargs):
+    started = _running.pop(task_id, None)
+    if started is None:
+        return
+    queue, started_at = started
+    try:
+        record_task_timing(queue, run_seconds=time.time() - started_at, failed=state == "FAILURE")
+    except Exception as e:
+        logger.debug(f"记录队列执行耗时失败: {e}")
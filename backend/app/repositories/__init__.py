@@ -21,6 +21,7 @@ from .hk_hold_repository import HkHoldRepository
 from .block_trade_repository import BlockTradeRepository
 from .sync_log_repository import SyncLogRepository
 from .sync_history_repository import SyncHistoryRepository
+from .sync_coverage_repository import SyncCoverageRepository
 from .config_repository import ConfigRepository
 from .celery_task_history_repository import CeleryTaskHistoryRepository
 from .scheduled_task_repository import ScheduledTaskRepository
@@ -116,6 +117,7 @@ __all__ = [
     "ConfigRepository",
     "SyncLogRepository",
     "SyncHistoryRepository",
+    "SyncCoverageRepository",
     # 任务管理
     "CeleryTaskHistoryRepository",
     "ScheduledTaskRepository",
@@ -3,8 +3,15 @@ Base Repository
 提供数据访问层的基础功能
 """
 
+import base64
+import hashlib
+import json
 import re
-from typing import Any, List, Optional, Tuple
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 from psycopg2 import DatabaseError as PsycopgDatabaseError
@@ -25,6 +32,15 @@ class BaseRepository:
     # 无界查询的硬上限：防止误用 find_all/get_by_date_range 拉取整张表
     DEFAULT_MAX_LIMIT: int = 10000
 
+    # 估算行数低于该阈值时直接精确 COUNT（小结果集精确计数代价很低）
+    APPROX_COUNT_THRESHOLD: int = 100000
+    # 计数缓存有效期（秒）；同步写入后通过 invalidate_count_cache 主动失效
+    COUNT_CACHE_TTL: float = 300.0
+
+    # 进程内计数缓存：(table, where, params) -> (count, is_estimate, expires_at)
+    _count_cache: Dict[Tuple, Tuple[int, bool, float]] = {}
+    _count_cache_lock = threading.Lock()
+
     def __init__(self, db: Optional[DatabaseManager] = None):
         """
         初始化 Repository
@@ -294,6 +310,251 @@ class BaseRepository:
         result = self.execute_query(query, params)
         return result[0][0] if result else 0
 
+    # ==================== 近似计数 ====================
+
+    def approximate_count(
+        self,
+        table: str,
+        where: Optional[str] = None,
+        params: Optional[Tuple] = None,
+        use_cache: bool = True,
+    ) -> Tuple[int, bool]:
+        """
+        近似统计记录数（列表页总数使用，避免大表全表 COUNT）
+
+        先取规划器估算行数（EXPLAIN，不扫描数据）；估算值低于
+        APPROX_COUNT_THRESHOLD 时改为精确 COUNT。结果按 (表, 条件, 参数)
+        缓存 COUNT_CACHE_TTL 秒，同步写入后由 invalidate_count_cache 失效。
+
+        Args:
+            table: 表名
+            where: WHERE 子句（不含 WHERE 关键字，使用参数化查询）
+            params: 参数
+
+        Returns:
+            (记录数, 是否为估算值)
+        """
+        table = self._validate_identifier(table, "table")
+        cache_key = (table, where or "", tuple(params or ()))
+
+        if use_cache:
+            with self._count_cache_lock:
+                cached = self._count_cache.get(cache_key)
+            if cached and cached[2] > time.monotonic():
+                return cached[0], cached[1]
+
+        query = f"SELECT 1 FROM {table}"
+        if where:
+            query += f" WHERE {where}"
+
+        estimate = self._planner_row_estimate(query, params)
+        if estimate is None or estimate < self.APPROX_COUNT_THRESHOLD:
+            result = (self.count(table, where, params), False)
+        else:
+            result = (estimate, True)
+
+        with self._count_cache_lock:
+            self._count_cache[cache_key] = (*result, time.monotonic() + self.COUNT_CACHE_TTL)
+        return result
+
+    def _planner_row_estimate(self, query: str, params: Optional[Tuple] = None) -> Optional[int]:
+        """读取 EXPLAIN 的顶层 Plan Rows；失败返回 None（调用方回退精确计数）"""
+        try:
+            rows = self.execute_query(f"EXPLAIN (FORMAT JSON) {query}", params)
+            plan = rows[0][0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except (QueryError, LookupError, TypeError, ValueError) as e:
+            logger.debug(f"规划器行数估算失败，回退精确计数: {e}")
+            return None
+
+    @classmethod
+    def invalidate_count_cache(cls, table: Optional[str] = None):
+        """
+        失效计数缓存（同步任务写入数据后调用）
+
+        Args:
+            table: 表名；None 表示清空全部
+        """
+        with cls._count_cache_lock:
+            if table is None:
+                cls._count_cache.clear()
+            else:
+                for key in [k for k in cls._count_cache if k[0] == table]:
+                    del cls._count_cache[key]
+
+    # ==================== 游标（Keyset）分页 ====================
+
+    @staticmethod
+    def _parse_order_by(order_by: str) -> List[Tuple[str, str]]:
+        """解析 "trade_date DESC, ts_code" 为 [(列名, 方向)]"""
+        keys = []
+        for part in order_by.split(","):
+            tokens = part.split()
+            if not tokens or len(tokens) > 2:
+                raise QueryError(
+                    "无效的排序子句", error_code="INVALID_ORDER_BY", order_by=order_by
+                )
+            column = BaseRepository._validate_identifier(tokens[0], "order_by column")
+            direction = tokens[1].upper() if len(tokens) == 2 else "ASC"
+            if direction not in ("ASC", "DESC"):
+                raise QueryError(
+                    "无效的排序方向", error_code="INVALID_ORDER_BY", order_by=order_by
+                )
+            keys.append((column, direction))
+        return keys
+
+    @staticmethod
+    def _cursor_signature(keys: List[Tuple[str, str]]) -> str:
+        return hashlib.md5(repr(keys).encode()).hexdigest()[:8]
+
+    @classmethod
+    def encode_cursor(cls, order_by: str, values: Tuple) -> str:
+        """
+        将排序键取值编码为不透明游标（URL 安全）
+
+        游标内带排序规则签名，换了排序方式的旧游标会被拒绝。
+        """
+
+        def _encode(value):
+            if isinstance(value, datetime):
+                return {"$dt": value.isoformat()}
+            if isinstance(value, date):
+                return {"$d": value.isoformat()}
+            if isinstance(value, Decimal):
+                return {"$dec": str(value)}
+            return value
+
+        payload = {
+            "s": cls._cursor_signature(cls._parse_order_by(order_by)),
+            "v": [_encode(v) for v in values],
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode_cursor(cls, order_by: str, cursor: str) -> Tuple:
+        """
+        解析游标为排序键取值
+
+        Raises:
+            ValueError: 游标格式错误或与当前排序规则不匹配（由 API 层转 400）
+        """
+
+        def _decode(value):
+            if isinstance(value, dict):
+                if "$dt" in value:
+                    return datetime.fromisoformat(value["$dt"])
+                if "$d" in value:
+                    return date.fromisoformat(value["$d"])
+                if "$dec" in value:
+                    return Decimal(value["$dec"])
+            return value
+
+        keys = cls._parse_order_by(order_by)
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            values = tuple(_decode(v) for v in payload["v"])
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"无效的分页游标: {e}")
+        if payload.get("s") != cls._cursor_signature(keys) or len(values) != len(keys):
+            raise ValueError("分页游标与当前排序方式不匹配，请从第一页重新查询")
+        return values
+
+    @staticmethod
+    def _keyset_condition(keys: List[Tuple[str, str]], values: Tuple) -> Tuple[str, List[Any]]:
+        """
+        构造"位于游标之后"的条件
+
+        排序方向一致时使用行值比较 (a, b) < (%s, %s)，可直接利用复合索引；
+        方向混合时展开为 a < x OR (a = x AND b > y) ...
+        """
+        directions = {direction for _, direction in keys}
+        if len(directions) == 1:
+            op = "<" if directions == {"DESC"} else ">"
+            columns = ", ".join(column for column, _ in keys)
+            placeholders = ", ".join(["%s"] * len(keys))
+            return f"({columns}) {op} ({placeholders})", list(values)
+
+        clauses, params = [], []
+        for i, (column, direction) in enumerate(keys):
+            op = "<" if direction == "DESC" else ">"
+            parts = [f"{c} = %s" for c, _ in keys[:i]] + [f"{column} {op} %s"]
+            clauses.append("(" + " AND ".join(parts) + ")")
+            params.extend(values[:i])
+            params.append(values[i])
+        return "(" + " OR ".join(clauses) + ")", params
+
+    def find_page(
+        self,
+        table: str,
+        order_by: str,
+        where: Optional[str] = None,
+        params: Optional[Tuple] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+    ) -> Tuple[List[Tuple], Optional[str]]:
+        """
+        游标（Keyset）分页查询
+
+        以表的自然排序键（如 "trade_date DESC, ts_code"、"created_at DESC, id DESC"）
+        定位下一页，深分页不再扫描并丢弃前面的行。排序键组合必须唯一，
+        否则相同键值的行可能跨页丢失。
+
+        Args:
+            table: 表名
+            order_by: 排序键（逗号分隔，支持 ASC/DESC）
+            where: WHERE 子句（不含 WHERE 关键字，使用参数化查询）
+            params: 参数
+            limit: 每页数量（受 DEFAULT_MAX_LIMIT 约束）
+            cursor: 上一页返回的 next_cursor；None 表示第一页
+            columns: 需要返回的列名白名单；默认 None 返回所有列（SELECT *）
+
+        Returns:
+            (记录列表, 下一页游标)；没有更多数据时游标为 None
+
+        Raises:
+            ValueError: limit 非法或游标无效
+        """
+        table = self._validate_identifier(table, "table")
+        keys = self._parse_order_by(order_by)
+        effective_limit = self._enforce_limit(limit)
+
+        if columns:
+            col_clause = ", ".join(self._validate_identifier(c, "column") for c in columns)
+        else:
+            col_clause = "*"
+        # 排序键追加在末尾，用于生成下一页游标，返回前剥离
+        key_clause = ", ".join(column for column, _ in keys)
+
+        conditions = [where] if where else []
+        query_params = list(params or ())
+        if cursor:
+            condition, condition_params = self._keyset_condition(
+                keys, self.decode_cursor(order_by, cursor)
+            )
+            conditions.append(condition)
+            query_params.extend(condition_params)
+
+        query = f"SELECT {col_clause}, {key_clause} FROM {table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(f"({c})" for c in conditions)
+        query += " ORDER BY " + ", ".join(f"{c} {d}" for c, d in keys)
+        query += f" LIMIT {effective_limit + 1}"
+
+        rows = self.execute_query(query, tuple(query_params))
+        has_more = len(rows) > effective_limit
+        rows = rows[:effective_limit]
+
+        n_keys = len(keys)
+        next_cursor = (
+            self.encode_cursor(order_by, tuple(rows[-1][-n_keys:])) if has_more and rows else None
+        )
+        return [tuple(row[:-n_keys]) for row in rows], next_cursor
+
     def exists(self, table: str, where: str, params: Optional[Tuple] = None) -> bool:
         """
         检查记录是否存在
@@ -392,3 +392,31 @@ class BatchRepository(BaseRepository):
         """
 
         return self.execute_update(query, (batch_id,))
+
+    def add_batch_counters(self, batch_id: int, completed: int = 0, failed: int = 0) -> int:
+        """
+        一次性累加批次的完成/失败计数（批量结果写入时使用）
+
+        Args:
+            batch_id: 批次ID
+            completed: 新增完成数
+            failed: 新增失败数
+
+        Returns:
+            受影响的行数
+
+        Examples:
+            >>> repo = BatchRepository()
+            >>> repo.add_batch_counters(1, completed=30, failed=2)
+        """
+        if not completed and not failed:
+            return 0
+
+        query = """
+            UPDATE experiment_batches
+            SET completed_experiments = completed_experiments + %s,
+                failed_experiments = failed_experiments + %s
+            WHERE id = %s
+        """
+
+        return self.execute_update(query, (completed, failed, batch_id))
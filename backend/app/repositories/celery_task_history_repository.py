@@ -4,7 +4,7 @@ Celery 任务历史 Repository
 负责 celery_task_history 表的数据访问操作。
 """
 
-from typing import Dict, List, Optional, Sequence, Union
+from typing import Any, Dict, List, Optional, Sequence, Union
 from datetime import datetime
 import json
 from loguru import logger
@@ -25,6 +25,13 @@ class CeleryTaskHistoryRepository(BaseRepository):
 
     TABLE_NAME = "celery_task_history"
 
+    # 列表查询列（与 _row_to_dict 的列顺序一致）
+    LIST_COLUMNS = [
+        "id", "celery_task_id", "task_name", "display_name", "task_type", "user_id",
+        "status", "progress", "created_at", "started_at", "completed_at", "duration_ms",
+        "result", "error", "worker", "params", "metadata",
+    ]
+
     def __init__(self, db=None):
         super().__init__(db)
         logger.debug("✓ CeleryTaskHistoryRepository initialized")
@@ -185,6 +192,65 @@ class CeleryTaskHistoryRepository(BaseRepository):
                 reason=str(e)
             )
 
+    def get_history_page(
+        self,
+        user_id: int,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        task_type: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        游标分页获取任务历史（按 created_at DESC, id DESC 定位下一页）
+
+        Args:
+            user_id: 用户ID
+            limit: 返回数量限制
+            cursor: 上一页返回的 next_cursor；None 表示第一页
+            status: 按状态筛选（可选）
+            task_type: 按任务类型筛选（可选）
+
+        Returns:
+            {'tasks', 'next_cursor', 'total', 'total_is_estimate'}
+
+        Examples:
+            >>> repo = CeleryTaskHistoryRepository()
+            >>> page = repo.get_history_page(user_id=1, limit=20)
+            >>> next_page = repo.get_history_page(user_id=1, limit=20, cursor=page['next_cursor'])
+        """
+        where_clauses = ["user_id = %s"]
+        query_params: List[Any] = [user_id]
+
+        if status:
+            where_clauses.append("status = %s")
+            query_params.append(status)
+
+        if task_type:
+            where_clauses.append("task_type = %s")
+            query_params.append(task_type)
+
+        where_sql = " AND ".join(where_clauses)
+
+        rows, next_cursor = self.find_page(
+            self.TABLE_NAME,
+            "created_at DESC, id DESC",
+            where=where_sql,
+            params=tuple(query_params),
+            limit=limit,
+            cursor=cursor,
+            columns=self.LIST_COLUMNS,
+        )
+        total, total_is_estimate = self.approximate_count(
+            self.TABLE_NAME, where_sql, tuple(query_params)
+        )
+
+        return {
+            'tasks': [self._row_to_dict(row) for row in rows],
+            'next_cursor': next_cursor,
+            'total': total,
+            'total_is_estimate': total_is_estimate,
+        }
+
     def get_statistics(
         self,
         user_id: Optional[int] = None,
@@ -380,6 +446,7 @@ class CeleryTaskHistoryRepository(BaseRepository):
             )
 
             new_id = result[0][0] if result else None
+            self.invalidate_count_cache(self.TABLE_NAME)
 
             logger.info(f"创建任务历史记录: {celery_task_id} - {display_name}")
 
@@ -343,6 +343,136 @@ class ExperimentRepository(BaseRepository):
 
         return self.execute_update(query, params)
 
+    def bulk_update_status(self, experiment_ids: List[int], status: str) -> int:
+        """
+        批量更新实验状态
+
+        Args:
+            experiment_ids: 实验 ID 列表
+            status: 新状态
+
+        Returns:
+            受影响的行数
+        """
+        if not experiment_ids:
+            return 0
+
+        query = """
+            UPDATE experiments
+            SET status = %s
+            WHERE id = ANY(%s)
+        """
+        return self.execute_update(query, (status, list(experiment_ids)))
+
+    def bulk_update_train_results(self, results: List[Dict[str, Any]]) -> int:
+        """
+        批量写入训练结果（并行批次实验合并写入）
+
+        Args:
+            results: 训练结果列表，每个包含 experiment_id, status, model_id, train_metrics,
+                feature_importance, model_path, train_started_at, train_completed_at,
+                train_duration_seconds
+
+        Returns:
+            受影响的行数
+        """
+        if not results:
+            return 0
+
+        import json
+
+        query = """
+            UPDATE experiments
+            SET status = %s,
+                model_id = %s,
+                train_metrics = %s,
+                feature_importance = %s,
+                model_path = %s,
+                train_started_at = %s,
+                train_completed_at = %s,
+                train_duration_seconds = %s,
+                total_duration_seconds = %s
+            WHERE id = %s
+        """
+        values = [
+            (
+                r["status"],
+                r["model_id"],
+                json.dumps(r["train_metrics"]) if r.get("train_metrics") else None,
+                json.dumps(r["feature_importance"]) if r.get("feature_importance") else None,
+                str(r["model_path"]),
+                r["train_started_at"],
+                r["train_completed_at"],
+                r["train_duration_seconds"],
+                r["train_duration_seconds"],
+                r["experiment_id"],
+            )
+            for r in results
+        ]
+        return self.execute_batch(query, values)
+
+    def bulk_update_backtest_results(self, results: List[Dict[str, Any]]) -> int:
+        """
+        批量写入回测结果并将实验标记为完成
+
+        Args:
+            results: 回测结果列表，每个包含 experiment_id, backtest_metrics,
+                backtest_started_at, backtest_completed_at, backtest_duration_seconds,
+                total_duration_seconds
+
+        Returns:
+            受影响的行数
+        """
+        if not results:
+            return 0
+
+        import json
+
+        query = """
+            UPDATE experiments
+            SET status = 'completed',
+                backtest_status = 'completed',
+                backtest_metrics = %s,
+                backtest_started_at = %s,
+                backtest_completed_at = %s,
+                backtest_duration_seconds = %s,
+                total_duration_seconds = %s
+            WHERE id = %s
+        """
+        values = [
+            (
+                json.dumps(r["backtest_metrics"]) if r.get("backtest_metrics") else None,
+                r["backtest_started_at"],
+                r["backtest_completed_at"],
+                r["backtest_duration_seconds"],
+                r["total_duration_seconds"],
+                r["experiment_id"],
+            )
+            for r in results
+        ]
+        return self.execute_batch(query, values)
+
+    def bulk_mark_failed(self, failures: List[tuple]) -> int:
+        """
+        批量标记实验失败
+
+        Args:
+            failures: (experiment_id, error_message) 列表
+
+        Returns:
+            受影响的行数
+        """
+        if not failures:
+            return 0
+
+        query = """
+            UPDATE experiments
+            SET status = 'failed',
+                error_message = %s
+            WHERE id = %s
+        """
+        return self.execute_batch(query, [(message, exp_id) for exp_id, message in failures])
+
     def filter_experiments_by_metrics(
         self,
         batch_id: int,
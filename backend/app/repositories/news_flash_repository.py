@@ -10,7 +10,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 from loguru import logger
@@ -69,6 +69,12 @@ class NewsFlashRepository(BaseRepository):
 
     SORTABLE_COLUMNS = {'publish_time', 'source', 'created_at'}
 
+    LIST_COLUMNS = [
+        'id', 'publish_time', 'source', 'title', 'summary', 'url', 'tags', 'related_ts_codes',
+        'created_at', 'sentiment_score', 'sentiment_impact', 'sentiment_tags', 'scoring_reason',
+        'score_model', 'scored_at',
+    ]
+
     # -------------------------------------------------
     # 写入
     # -------------------------------------------------
@@ -161,6 +167,7 @@ class NewsFlashRepository(BaseRepository):
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
         count = self.execute_batch(query, inserts)
+        self.invalidate_count_cache(self.TABLE_NAME)
         logger.info(f"[news_flash] 新增 {count} 条（输入 {len(df)}，已存在 {len(df) - len(inserts)}）")
         return count
 
@@ -216,6 +223,47 @@ class NewsFlashRepository(BaseRepository):
         rows = self.execute_query(query, tuple(params + [int(page_size), offset]))
         return [self._row_to_dict(r) for r in rows]
 
+    def query_page_by_filters(
+        self,
+        source: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        ts_code: Optional[str] = None,
+        keyword: Optional[str] = None,
+        tag: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 50,
+        sort_by: Optional[str] = None,
+        sort_order: str = 'desc',
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """前端列表页游标分页查询（排序键 + id 定位下一页，深分页不扫描前序行）。"""
+        conditions, params = self._build_conditions(source, start_time, end_time, ts_code, keyword, tag)
+        order = 'DESC' if sort_order.lower() != 'asc' else 'ASC'
+        sort_col = sort_by if sort_by in self.SORTABLE_COLUMNS else 'publish_time'
+        rows, next_cursor = self.find_page(
+            self.TABLE_NAME,
+            f"{sort_col} {order}, id DESC",
+            where=" AND ".join(conditions) or None,
+            params=tuple(params),
+            limit=int(page_size),
+            cursor=cursor,
+            columns=self.LIST_COLUMNS,
+        )
+        return [self._row_to_dict(r) for r in rows], next_cursor
+
+    def approximate_count_by_filters(
+        self,
+        source: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        ts_code: Optional[str] = None,
+        keyword: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> Tuple[int, bool]:
+        """列表页总数：大结果集取规划器估算，返回 (总数, 是否估算)。"""
+        conditions, params = self._build_conditions(source, start_time, end_time, ts_code, keyword, tag)
+        return self.approximate_count(self.TABLE_NAME, " AND ".join(conditions) or None, tuple(params))
+
     def count_by_filters(
         self,
         source: Optional[str] = None,
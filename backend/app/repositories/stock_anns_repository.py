@@ -7,7 +7,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 from loguru import logger
@@ -39,6 +39,17 @@ class StockAnnsRepository(BaseRepository):
     TABLE_NAME = "stock_anns"
 
     SORTABLE_COLUMNS = {'ann_date', 'ts_code', 'anno_type', 'created_at'}
+    # 游标分页只能按 NOT NULL 列排序（见 query_page_by_filters）
+    KEYSET_SORTABLE_COLUMNS = {'ann_date', 'ts_code'}
+
+    # find_page 只接受列名：has_content 位取 content_fetched_at
+    # （迁移 118：正文抓取成功才写入该列，NULL 表示未抓取），_row_to_dict 按 bool 读取
+    PAGE_COLUMNS = [
+        'ts_code', 'ann_date', 'title', 'anno_type', 'stock_name', 'url', 'source',
+        'content_fetched_at', 'content_fetched_at',
+        'event_tags', 'sentiment_score', 'sentiment_impact', 'scoring_reason', 'score_model', 'scored_at',
+        'created_at',
+    ]
 
     # -------------------------------------------------
     # 写入
@@ -92,6 +103,7 @@ class StockAnnsRepository(BaseRepository):
         """
 
         count = self.execute_batch(query, rows)
+        self.invalidate_count_cache(self.TABLE_NAME)
         logger.info(f"[stock_anns] upsert {count} 条")
         return count
 
@@ -192,6 +204,51 @@ class StockAnnsRepository(BaseRepository):
         rows = self.execute_query(query, tuple(params + [int(page_size), offset]))
         return [self._row_to_dict(r, include_created=True) for r in rows]
 
+    def query_page_by_filters(
+        self,
+        ts_code: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        anno_type: Optional[str] = None,
+        keyword: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 50,
+        sort_by: Optional[str] = None,
+        sort_order: str = 'desc',
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """游标分页查询（admin 前端列表页用）：排序列 + 主键 (ann_date, ts_code, title) 定位下一页。
+
+        只支持 KEYSET_SORTABLE_COLUMNS 中的 NOT NULL 列；anno_type / created_at 可为空，
+        行值比较遇到 NULL 会跨页丢行，按这两列排序时由调用方改走 query_by_filters。
+        """
+        conditions, params = self._build_conditions(ts_code, start_date, end_date, anno_type, keyword)
+
+        order = 'DESC' if sort_order.lower() != 'asc' else 'ASC'
+        sort_col = sort_by if sort_by in self.KEYSET_SORTABLE_COLUMNS else 'ann_date'
+        tiebreak = [c for c in ('ann_date', 'ts_code', 'title') if c != sort_col]
+        rows, next_cursor = self.find_page(
+            self.TABLE_NAME,
+            ", ".join([f"{sort_col} {order}"] + tiebreak),
+            where=" AND ".join(conditions) or None,
+            params=tuple(params),
+            limit=int(page_size),
+            cursor=cursor,
+            columns=self.PAGE_COLUMNS,
+        )
+        return [self._row_to_dict(r, include_created=True) for r in rows], next_cursor
+
+    def approximate_count_by_filters(
+        self,
+        ts_code: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        anno_type: Optional[str] = None,
+        keyword: Optional[str] = None,
+    ) -> Tuple[int, bool]:
+        """列表页总数：大结果集取规划器估算，返回 (总数, 是否估算)。"""
+        conditions, params = self._build_conditions(ts_code, start_date, end_date, anno_type, keyword)
+        return self.approximate_count(self.TABLE_NAME, " AND ".join(conditions) or None, tuple(params))
+
     def count_by_filters(
         self,
         ts_code: Optional[str] = None,
@@ -7,6 +7,7 @@ from typing import List, Optional
 
 import pandas as pd
 from loguru import logger
+from src.utils.dtype_policy import FULL_PRECISION_COLUMNS, get_float_dtype
 
 from app.core.exceptions import DataQueryError
 
@@ -17,6 +18,10 @@ class StockDailyRepository(BaseRepository):
     """股票日线数据访问层"""
 
     TABLE_NAME = "stock_daily"
+    NUMERIC_COLUMNS = [
+        'open', 'high', 'low', 'close', 'volume', 'amount',
+        'amplitude', 'pct_change', 'change', 'turnover',
+    ]
 
     def __init__(self, db=None):
         super().__init__(db)
@@ -77,23 +82,10 @@ class StockDailyRepository(BaseRepository):
                         query, conn, params=params, index_col='date', parse_dates=['date']
                     )
 
-                # 确保数值列是正确的类型
-                numeric_columns = [
-                    'open',
-                    'high',
-                    'low',
-                    'close',
-                    'volume',
-                    'amount',
-                    'amplitude',
-                    'pct_change',
-                    'change',
-                    'turnover',
-                ]
-                for col in numeric_columns:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-
+                # 数值列（可能为 Decimal）转换为 float64：结果直接用于展示 / JSON / 提示词，
+                # 不套用 ML 路径的 float32 策略
+                numeric_cols = [c for c in self.NUMERIC_COLUMNS if c in df.columns]
+                df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce').astype('float64')
                 return df
 
             finally:
@@ -336,3 +328,71 @@ class StockDailyRepository(BaseRepository):
                 continue
 
         return result
+
+    def get_market_panel(
+        self,
+        start_date: str,
+        end_date: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> dict:
+        """
+        一次查询拉取全市场日线，按字段透视为宽表面板
+
+        Args:
+            start_date: 开始日期，格式：YYYY-MM-DD
+            end_date: 结束日期，格式：YYYY-MM-DD（可选）
+            fields: 需要的字段（默认 open/high/low/close/volume）
+
+        Returns:
+            {field: DataFrame(index=date, columns=code)} 字典（价格类为 dtype 策略的浮点类型，
+            volume / amount 保持 float64），无数据时返回空字典
+
+        Raises:
+            DataQueryError: 数据查询失败
+
+        Examples:
+            >>> repo = StockDailyRepository()
+            >>> panels = repo.get_market_panel('2023-01-01')
+            >>> close = panels['close']  # 行=交易日，列=股票代码
+        """
+        fields = fields or ['open', 'high', 'low', 'close', 'volume']
+        allowed = {'open', 'high', 'low', 'close', 'volume', 'amount', 'pct_change', 'turnover'}
+        for f in fields:
+            if f not in allowed:
+                raise ValueError(f"不支持的面板字段: {f}")
+
+        query = f"SELECT code, date, {', '.join(fields)} FROM stock_daily WHERE date >= %s"
+        params = [start_date]
+        if end_date:
+            query += " AND date <= %s"
+            params.append(end_date)
+
+        try:
+            import warnings
+
+            conn = self.db.get_connection()
+            try:
+                with warnings.catch_warnings():
+                    warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
+                    df = pd.read_sql_query(query, conn, params=params, parse_dates=['date'])
+            finally:
+                self.db.release_connection(conn)
+        except Exception as e:
+            logger.error(f"查询全市场日线面板失败: {e}")
+            raise DataQueryError(
+                "查询全市场日线面板失败",
+                error_code="STOCK_DAILY_PANEL_QUERY_FAILED",
+                start_date=start_date,
+                end_date=end_date,
+                reason=str(e),
+            )
+
+        if df.empty:
+            return {}
+
+        float_dtype = get_float_dtype()
+        panels = {}
+        for f in fields:
+            dtype = 'float64' if f in FULL_PRECISION_COLUMNS else float_dtype
+            panels[f] = df.pivot(index='date', columns='code', values=f).astype(dtype).sort_index()
+        return panels
@@ -138,6 +138,50 @@ class StrategyRepository(BaseRepository):
         finally:
             self.db.release_connection(conn)
 
+    def get_by_ids(self, strategy_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        批量获取策略详情（一次 WHERE id = ANY 查询，包含完整代码）
+
+        Args:
+            strategy_ids: 策略 ID 列表
+
+        Returns:
+            {策略 ID: 策略详情字典}，不存在的 ID 不出现在结果中
+        """
+        if not strategy_ids:
+            return {}
+
+        query = """
+            SELECT
+                s.id, s.name, s.display_name, s.code, s.code_hash, s.class_name,
+                s.source_type, s.strategy_type, s.description, s.category, s.tags,
+                s.default_params, s.validation_status, s.validation_errors,
+                s.validation_warnings, s.risk_level, s.is_enabled,
+                s.publish_status, s.publish_requested_at, s.publish_reviewed_at,
+                s.publish_reviewed_by, s.publish_reject_reason,
+                s.usage_count, s.backtest_count, s.avg_sharpe_ratio, s.avg_annual_return,
+                s.version, s.parent_strategy_id, s.created_by,
+                s.created_at, s.updated_at, s.last_used_at,
+                s.user_id, u.username
+            FROM strategies s
+            LEFT JOIN users u ON s.user_id = u.id
+            WHERE s.id = ANY(%s)
+        """
+
+        conn = self.db.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, (list(dict.fromkeys(strategy_ids)),))
+            rows = cursor.fetchall()
+            result = {}
+            for row in rows:
+                record = self._row_to_dict(cursor, row)
+                result[record['id']] = record
+            cursor.close()
+            return result
+        finally:
+            self.db.release_connection(conn)
+
     def get_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """
         根据名称获取策略
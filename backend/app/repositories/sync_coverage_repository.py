@@ -0,0 +1,91 @@
+"""
+同步覆盖索引 Repository
+
+为 Tushare 同步规划提供两类轻量统计：
+- 业务表按日期列的 GROUP BY 行数（trade_date → 行数）
+- sync_history 中成功同步过的日期区间（用于确认「当天确实无数据」）
+"""
+
+from typing import Dict, List, Tuple
+
+from app.repositories.base_repository import BaseRepository
+
+
+class SyncCoverageRepository(BaseRepository):
+    TABLE_NAME = "sync_history"
+
+    def __init__(self, db=None):
+        super().__init__(db)
+
+    @staticmethod
+    def _fmt_date(value) -> str:
+        """DATE / VARCHAR(8) / TIMESTAMP 统一为 YYYYMMDD"""
+        return str(value).replace('-', '')[:8]
+
+    def get_date_counts(
+        self,
+        table_name: str,
+        date_column: str,
+        start_date: str,
+        end_date: str,
+    ) -> Dict[str, int]:
+        """
+        按日期统计业务表行数。
+
+        Args:
+            table_name: 业务表名（如 'moneyflow'）
+            date_column: 日期列名（如 'trade_date'）
+            start_date: 起始日期 YYYYMMDD（含）
+            end_date: 截止日期 YYYYMMDD（含）
+
+        Returns:
+            {YYYYMMDD: 行数}，无数据的日期不出现在结果中
+        """
+        table_name = self._validate_identifier(table_name, "表名")
+        date_column = self._validate_identifier(date_column, "列名")
+        rows = self.execute_query(
+            f"""
+            SELECT {date_column}, COUNT(*)
+            FROM {table_name}
+            WHERE {date_column} >= %s AND {date_column} <= %s
+            GROUP BY {date_column}
+            """,
+            (start_date, end_date),
+        )
+        counts: Dict[str, int] = {}
+        for value, count in rows:
+            if value is None:
+                continue
+            key = self._fmt_date(value)
+            counts[key] = counts.get(key, 0) + int(count)
+        return counts
+
+    def get_confirmed_ranges(
+        self,
+        table_key: str,
+        start_date: str,
+        end_date: str,
+    ) -> List[Tuple[str, str]]:
+        """
+        获取与 [start_date, end_date] 相交的成功同步区间。
+
+        区间为 (data_start_date, data_end_date)：请求起点到实际数据最大日期，
+        区间内严格早于 data_end_date 的日期在同步时已收盘，可视为已确认。
+
+        Returns:
+            [(start YYYYMMDD, end YYYYMMDD), ...]
+        """
+        rows = self.execute_query(
+            """
+            SELECT data_start_date, data_end_date
+            FROM sync_history
+            WHERE table_key = %s
+              AND status = 'success'
+              AND data_start_date IS NOT NULL
+              AND data_end_date IS NOT NULL
+              AND data_start_date <= %s
+              AND data_end_date >= %s
+            """,
+            (table_key, end_date, start_date),
+        )
+        return [(r[0], r[1]) for r in rows if r[0] and r[1]]
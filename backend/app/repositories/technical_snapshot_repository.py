@@ -0,0 +1,192 @@
+"""全市场技术指标快照 Repository
+
+管理 stock_technical_snapshot 表（事实型，主键 (ts_code, trade_date)）。
+计算逻辑由 TechnicalSnapshotService 完成，本 Repository 只负责数据库读写。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from psycopg2.extras import execute_values
+
+from app.repositories.base_repository import BaseRepository
+
+
+class TechnicalSnapshotRepository(BaseRepository):
+    """stock_technical_snapshot 表 Repository"""
+
+    TABLE_NAME = "stock_technical_snapshot"
+
+    COLUMNS = (
+        "ts_code", "trade_date", "close",
+        "ma5", "ma10", "ma20", "ma60", "ma120", "ma_arrangement",
+        "rsi7", "rsi14", "rsi21",
+        "boll_upper", "boll_middle", "boll_lower", "boll_percent_b", "boll_bandwidth",
+        "d_dif", "d_dea", "d_macd_bar", "d_cross", "d_zero_axis", "d_divergence",
+        "w_dif", "w_dea", "w_macd_bar", "w_cross", "w_zero_axis",
+        "m_dif", "m_dea", "m_macd_bar", "m_cross", "m_zero_axis",
+        "atr14", "atr_pct", "vol_ratio5",
+        "high_20d", "low_20d", "percentile_20d",
+    )
+
+    # 允许作为筛选条件的状态列（SMALLINT 编码）与数值列
+    STATE_COLUMNS = frozenset({
+        "ma_arrangement",
+        "d_cross", "d_zero_axis", "d_divergence",
+        "w_cross", "w_zero_axis",
+        "m_cross", "m_zero_axis",
+    })
+    RANGE_COLUMNS = frozenset({
+        "rsi7", "rsi14", "rsi21", "boll_percent_b", "boll_bandwidth",
+        "atr_pct", "vol_ratio5", "percentile_20d",
+    })
+
+    def bulk_upsert(self, rows: List[Tuple], page_size: int = 2000) -> int:
+        """批量 UPSERT 快照行（元组顺序与 COLUMNS 一致），一次事务提交。"""
+        if not rows:
+            return 0
+        cols = list(self.COLUMNS)
+        update_set = ",".join(
+            f"{c} = EXCLUDED.{c}" for c in cols if c not in ("ts_code", "trade_date")
+        )
+        query = f"""
+            INSERT INTO {self.TABLE_NAME} ({",".join(cols)})
+            VALUES %s
+            ON CONFLICT (ts_code, trade_date) DO UPDATE SET
+                {update_set},
+                computed_at = NOW()
+        """
+        conn = self.db.get_connection()
+        try:
+            cursor = conn.cursor()
+            execute_values(cursor, query, rows, page_size=page_size)
+            conn.commit()
+            cursor.close()
+            return len(rows)
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"[technical_snapshot] 批量 upsert 失败: {e}")
+            raise
+        finally:
+            self.db.release_connection(conn)
+
+    def get_latest_trade_date(self) -> Optional[str]:
+        """快照表最新交易日（YYYY-MM-DD），空表返回 None。"""
+        rows = self.execute_query(f"SELECT MAX(trade_date) FROM {self.TABLE_NAME}")
+        if rows and rows[0][0]:
+            return str(rows[0][0])
+        return None
+
+    def get_latest_by_ts_code(self, ts_code: str) -> Optional[Dict[str, Any]]:
+        """取单只股票最新一行快照（主键索引倒序扫描，O(1)）。"""
+        cols = ",".join(self.COLUMNS)
+        rows = self.execute_query(
+            f"""
+            SELECT {cols} FROM {self.TABLE_NAME}
+            WHERE ts_code = %s
+            ORDER BY trade_date DESC
+            LIMIT 1
+            """,
+            (ts_code,),
+        )
+        return self._row_to_dict(rows[0]) if rows else None
+
+    def get_by_ts_codes(
+        self, ts_codes: List[str], trade_date: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """按 ts_code 批量取指定交易日（默认最新交易日）的快照，返回 {ts_code: row_dict}。"""
+        if not ts_codes:
+            return {}
+        trade_date = trade_date or self.get_latest_trade_date()
+        if not trade_date:
+            return {}
+        cols = ",".join(self.COLUMNS)
+        rows = self.execute_query(
+            f"SELECT {cols} FROM {self.TABLE_NAME} WHERE trade_date = %s AND ts_code = ANY(%s)",
+            (trade_date, list(ts_codes)),
+        )
+        return {row[0]: self._row_to_dict(row) for row in rows}
+
+    def screen(
+        self,
+        states: Optional[Dict[str, int]] = None,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        trade_date: Optional[str] = None,
+        order_by: str = "ts_code",
+        limit: int = 200,
+        offset: int = 0,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        """按指标状态筛选全市场股票。
+
+        Args:
+            states: {状态列: 编码}，如 {'w_cross': 2} 表示周线当根金叉
+            ranges: {数值列: (下限, 上限)}，任一端为 None 表示不限
+            trade_date: 交易日（默认快照最新交易日）
+            order_by: 排序列（限 COLUMNS 内）
+            limit: 返回条数上限
+            offset: 偏移量
+
+        Returns:
+            (记录列表, 总数, 实际使用的交易日)
+        """
+        trade_date = trade_date or self.get_latest_trade_date()
+        if not trade_date:
+            return [], 0, None
+
+        conditions = ["trade_date = %s"]
+        params: List[Any] = [trade_date]
+        for col, code in (states or {}).items():
+            if col not in self.STATE_COLUMNS:
+                raise ValueError(f"不支持的状态筛选列: {col}")
+            conditions.append(f"{col} = %s")
+            params.append(int(code))
+        for col, (low, high) in (ranges or {}).items():
+            if col not in self.RANGE_COLUMNS:
+                raise ValueError(f"不支持的区间筛选列: {col}")
+            if low is not None:
+                conditions.append(f"{col} >= %s")
+                params.append(low)
+            if high is not None:
+                conditions.append(f"{col} <= %s")
+                params.append(high)
+
+        order_col, _, direction = order_by.partition(" ")
+        if order_col not in self.COLUMNS:
+            raise ValueError(f"不支持的排序列: {order_col}")
+        direction = "DESC" if direction.strip().upper() == "DESC" else "ASC"
+
+        where_clause = " AND ".join(conditions)
+        effective_limit = self._enforce_limit(limit)
+        cols = ",".join(self.COLUMNS)
+        rows = self.execute_query(
+            f"""
+            SELECT {cols} FROM {self.TABLE_NAME}
+            WHERE {where_clause}
+            ORDER BY {order_col} {direction} NULLS LAST
+            LIMIT {effective_limit} OFFSET {int(offset)}
+            """,
+            tuple(params),
+        )
+        total_rows = self.execute_query(
+            f"SELECT COUNT(*) FROM {self.TABLE_NAME} WHERE {where_clause}", tuple(params)
+        )
+        total = int(total_rows[0][0]) if total_rows else 0
+        return [self._row_to_dict(r) for r in rows], total, trade_date
+
+    def delete_before(self, trade_date: str) -> int:
+        """删除早于指定交易日的快照（保留窗口外的历史清理）。"""
+        return self.execute_update(
+            f"DELETE FROM {self.TABLE_NAME} WHERE trade_date < %s", (trade_date,)
+        )
+
+    def _row_to_dict(self, row: Tuple) -> Dict[str, Any]:
+        item = {col: row[idx] for idx, col in enumerate(self.COLUMNS)}
+        trade_date = item.get("trade_date")
+        if hasattr(trade_date, "strftime"):
+            item["trade_date"] = trade_date.strftime("%Y-%m-%d")
+        for col, val in item.items():
+            if col not in ("ts_code", "trade_date") and val is not None:
+                item[col] = float(val) if col not in self.STATE_COLUMNS else int(val)
+        return item
@@ -2,6 +2,9 @@
 交易日历 Repository
 
 负责 trade_cal 和 trading_calendar 表的数据访问操作。
+
+SSE 交易日查询优先使用进程内交易日历索引（src.data.trading_calendar），
+索引未加载或日期超出其覆盖范围时回退 SQL 查询。
 """
 
 from typing import Dict, List, Optional
@@ -11,6 +14,7 @@ import pandas as pd
 
 from app.repositories.base_repository import BaseRepository
 from app.core.exceptions import QueryError, DatabaseError
+from src.data.trading_calendar import TradingCalendarIndex, get_trading_calendar
 
 
 class TradingCalendarRepository(BaseRepository):
@@ -30,10 +34,30 @@ class TradingCalendarRepository(BaseRepository):
     # 默认使用 Tushare 标准表
     TABLE_NAME = "trade_cal"
 
-    def __init__(self, db=None):
+    # 内存索引的数据来源交易所
+    INDEX_EXCHANGE = 'SSE'
+
+    def __init__(self, db=None, calendar: Optional[TradingCalendarIndex] = None):
         super().__init__(db)
+        self._calendar = calendar
         logger.debug("✓ TradingCalendarRepository initialized")
 
+    def _index_for(self, exchange: str, *dates: str) -> Optional[TradingCalendarIndex]:
+        """返回可用于回答查询的交易日历索引（交易所匹配且所有日期均在覆盖范围内）"""
+        if exchange != self.INDEX_EXCHANGE:
+            return None
+        calendar = self._calendar or get_trading_calendar()
+        if not all(calendar.covers(d) for d in dates):
+            return None
+        # 索引回退加载了自定义表 trading_calendar 时不用于回答 trade_cal 查询
+        if calendar.source == 'trading_calendar':
+            return None
+        return calendar
+
+    @staticmethod
+    def _fmt(value: Optional[date]) -> Optional[str]:
+        return value.strftime("%Y%m%d") if value else None
+
     # ==================== 查询操作 ====================
 
     def get_latest_trading_day(
@@ -59,6 +83,10 @@ class TradingCalendarRepository(BaseRepository):
         if reference_date is None:
             reference_date = datetime.now().strftime("%Y%m%d")
 
+        calendar = self._index_for(exchange, reference_date)
+        if calendar is not None:
+            return self._fmt(calendar.latest_trading_day(reference_date))
+
         query = """
             SELECT cal_date
             FROM trade_cal
@@ -103,6 +131,12 @@ class TradingCalendarRepository(BaseRepository):
             >>> next_day = repo.get_next_trading_day('20260318')
             >>> print(next_day)  # '20260319'
         """
+        calendar = self._index_for(exchange, reference_date)
+        if calendar is not None:
+            next_day = calendar.next_trading_day(reference_date)
+            if next_day is not None:
+                return self._fmt(next_day)
+
         query = """
             SELECT cal_date
             FROM trade_cal
@@ -147,6 +181,10 @@ class TradingCalendarRepository(BaseRepository):
             >>> is_trading = repo.is_trading_day('20260318')
             >>> print(is_trading)  # True
         """
+        calendar = self._index_for(exchange, check_date)
+        if calendar is not None:
+            return calendar.is_trading_day(check_date)
+
         query = """
             SELECT is_open
             FROM trade_cal
@@ -190,6 +228,10 @@ class TradingCalendarRepository(BaseRepository):
             >>> days = repo.get_trading_days_between('20260301', '20260331')
             >>> len(days)  # 20
         """
+        calendar = self._index_for(exchange, start_date, end_date)
+        if calendar is not None:
+            return [self._fmt(d) for d in calendar.trading_days_between(start_date, end_date)]
+
         query = """
             SELECT cal_date
             FROM trade_cal
@@ -237,6 +279,10 @@ class TradingCalendarRepository(BaseRepository):
         if reference_date is None:
             reference_date = datetime.now().strftime("%Y%m%d")
 
+        calendar = self._index_for(exchange, reference_date)
+        if calendar is not None:
+            return [self._fmt(d) for d in calendar.recent_n(n, reference_date)]
+
         query = """
             SELECT cal_date
             FROM trade_cal
@@ -10,11 +10,33 @@
 - cron_parser.py: Cron表达式解析器
 """
 
-from .database_scheduler import DatabaseScheduler
-from .task_executor import TaskExecutor
-from .task_metadata import TASK_MAPPING, TASK_CATEGORIES, METADATA_FIELDS
-from .task_metadata_service import TaskMetadataService
-from .cron_parser import CronParser
+import importlib
+
+# 导出名称 → 所在子模块，首次访问时导入（PEP 562）：
+# Celery 路由与 Worker 只需读取 task_metadata，不应连带加载调度器和数据库仓储
+_LAZY_IMPORTS = {
+    'DatabaseScheduler': '.database_scheduler',
+    'TaskExecutor': '.task_executor',
+    'TASK_MAPPING': '.task_metadata',
+    'TASK_CATEGORIES': '.task_metadata',
+    'METADATA_FIELDS': '.task_metadata',
+    'TaskMetadataService': '.task_metadata_service',
+    'CronParser': '.cron_parser',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     # 核心类
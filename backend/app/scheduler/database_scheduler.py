@@ -4,7 +4,8 @@
 
 核心功能：
 - 从scheduled_tasks表读取任务配置
-- 每30秒自动同步数据库配置变更
+- 订阅定时任务变更事件（schedule_events），单个任务的修改立即生效
+- 每10分钟全量对账一次，兜底丢失的事件
 - 支持启用/禁用任务
 - 支持修改Cron表达式
 - 支持任务参数配置
@@ -14,32 +15,48 @@ from celery.beat import Scheduler, ScheduleEntry
 from datetime import datetime
 from loguru import logger
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from .task_metadata_service import TaskMetadataService
 from .cron_parser import CronParser
+from .schedule_events import ACTION_DELETE, get_schedule_change_bus
 from app.repositories import ScheduledTaskRepository
 
 
 class DatabaseScheduler(Scheduler):
     """从数据库读取定时任务配置的调度器"""
 
-    def __init__(self, *args, **kwargs):
-        """初始化调度器"""
+    # 全量对账间隔（秒）：变更事件是主路径，对账只兜底丢失的事件
+    reconcile_interval = 600
+    # 检查变更事件的最长间隔（秒），决定配置修改的生效延迟
+    event_poll_interval = 1.0
+
+    def __init__(self, *args, change_bus=None, **kwargs):
+        """
+        初始化调度器
+
+        Args:
+            change_bus: 变更事件总线（默认 Redis pub/sub，测试可注入 InMemoryScheduleChangeBus）
+        """
         self.last_sync = None
-        self.sync_interval = 30  # 每30秒从数据库同步一次
         self._db_schedule = {}  # 数据库中的定时任务
         self.metadata_service = TaskMetadataService()
         self.cron_parser = CronParser()
         self.task_repo = ScheduledTaskRepository()
+        self.change_bus = change_bus
         super().__init__(*args, **kwargs)
         logger.info("🔧 DatabaseScheduler 已初始化")
 
     def setup_schedule(self):
         """初始化时加载数据库中的定时任务"""
         logger.info("📋 正在从数据库加载定时任务配置...")
+        if self.change_bus is None:
+            self.change_bus = get_schedule_change_bus()
+        # 先订阅再全量加载，避免加载期间的变更丢失
+        self._poll_changes()
         self._db_schedule = self.load_schedule_from_db()
         self.merge_inplace(self._db_schedule)
+        self.last_sync = datetime.now()
         logger.info(f"✅ 定时任务加载完成，共 {len(self._db_schedule)} 个任务")
 
     def load_schedule_from_db(self) -> Dict[str, Dict[str, Any]]:
@@ -62,49 +79,60 @@ class DatabaseScheduler(Scheduler):
 
             schedule = {}
             for task_dict in enabled_tasks:
-                task_name = task_dict['task_name']
-                module = task_dict['module']
-                cron_expr = task_dict['cron_expression']
-                params = task_dict['params']
-
-                try:
-                    # 解析Cron表达式
-                    schedule_entry = self.cron_parser.parse(cron_expr)
-                    if not schedule_entry:
-                        logger.warning(f"⚠️  跳过任务 {task_name}: Cron表达式解析失败")
-                        continue
-
-                    # 从元数据服务获取Celery任务名称
-                    celery_task = self.metadata_service.get_celery_task_name(module)
-                    if not celery_task:
-                        logger.warning(f"⚠️  跳过任务 {task_name}: 模块 '{module}' 没有对应的Celery任务")
-                        continue
-
-                    # 解析任务参数
-                    task_params = self._parse_task_params(params, task_name)
-
-                    # 构建任务配置
-                    schedule[f'db-{task_name}'] = {
-                        'task': celery_task,
-                        'schedule': schedule_entry,
-                        'kwargs': task_params,
-                        'options': {
-                            'expires': 3600,  # 1小时后过期
-                        }
-                    }
-
-                    logger.debug(f"  ✓ 加载任务: {task_name} -> {celery_task} ({cron_expr})")
-
-                except Exception as e:
-                    logger.error(f"❌ 解析任务 {task_name} 失败: {e}")
-                    continue
-
+                entry = self._build_entry(task_dict)
+                if entry:
+                    schedule[f"db-{task_dict['task_name']}"] = entry
             return schedule
 
         except Exception as e:
             logger.error(f"❌ 从数据库加载定时任务失败: {e}")
             return {}
 
+    def _build_entry(self, task_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        由 scheduled_tasks 行构建调度配置
+
+        Returns:
+            调度配置；Cron 无法解析或模块没有对应的 Celery 任务时返回 None
+        """
+        task_name = task_dict['task_name']
+        module = task_dict['module']
+        cron_expr = task_dict['cron_expression']
+
+        try:
+            # 解析Cron表达式
+            schedule_entry = self.cron_parser.parse(cron_expr)
+            if not schedule_entry:
+                logger.warning(f"⚠️  跳过任务 {task_name}: Cron表达式解析失败")
+                return None
+
+            # 从元数据服务获取Celery任务名称与投递队列
+            celery_task = self.metadata_service.get_celery_task_name(module)
+            if not celery_task:
+                logger.warning(f"⚠️  跳过任务 {task_name}: 模块 '{module}' 没有对应的Celery任务")
+                return None
+            queue = self.metadata_service.get_task_queue(module)
+
+            # 解析任务参数
+            task_params = self._parse_task_params(task_dict['params'], task_name)
+
+            logger.debug(f"  ✓ 加载任务: {task_name} -> {celery_task} [{queue}] ({cron_expr})")
+
+            # 构建任务配置
+            return {
+                'task': celery_task,
+                'schedule': schedule_entry,
+                'kwargs': task_params,
+                'options': {
+                    'expires': 3600,  # 1小时后过期
+                    'queue': queue,
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"❌ 解析任务 {task_name} 失败: {e}")
+            return None
+
     def _parse_task_params(self, params: Any, task_name: str) -> Dict[str, Any]:
         """
         解析任务参数
@@ -129,15 +157,15 @@ class DatabaseScheduler(Scheduler):
 
     def tick(self, **kwargs):
         """
-        每次心跳时检查是否需要从数据库重新加载
+        每次心跳时应用变更事件，并按对账间隔全量同步
 
-        这个方法会在每次调度循环时被调用（通常是每几秒一次）
-        我们设置了30秒的同步间隔，避免频繁查询数据库
+        返回的休眠时间不超过 event_poll_interval，保证变更事件及时被处理。
         """
-        # 每30秒从数据库同步一次配置
+        self._poll_changes()
+
         now = datetime.now()
-        if not self.last_sync or (now - self.last_sync).total_seconds() > self.sync_interval:
-            logger.debug("⟳ 同步数据库定时任务配置...")
+        if not self.last_sync or (now - self.last_sync).total_seconds() > self.reconcile_interval:
+            logger.debug("⟳ 全量对账数据库定时任务配置...")
 
             # 加载最新的数据库配置
             new_schedule = self.load_schedule_from_db()
@@ -148,7 +176,56 @@ class DatabaseScheduler(Scheduler):
 
             self.last_sync = now
 
-        return super().tick(**kwargs)
+        return min(super().tick(**kwargs), self.event_poll_interval)
+
+    def _poll_changes(self):
+        """取出并应用所有待处理的变更事件"""
+        if self.change_bus is None:
+            return
+        try:
+            events = self.change_bus.poll()
+        except Exception as e:
+            logger.warning(f"⚠️  读取定时任务变更事件失败（依赖全量对账）: {e}")
+            return
+
+        for event in events:
+            task_name = event.get('task_name')
+            if task_name:
+                self.apply_change(task_name, event.get('action'))
+
+    def apply_change(self, task_name: str, action: Optional[str] = None):
+        """
+        应用单个任务的配置变更
+
+        重新读取该任务的数据库行：不存在、已禁用或配置无效时移除调度，否则新增/更新。
+
+        Args:
+            task_name: 任务名称
+            action: 事件类型（delete 时不查询数据库直接移除）
+        """
+        key = f'db-{task_name}'
+        entry = None
+        if action != ACTION_DELETE:
+            try:
+                task_dict = self.task_repo.get_by_task_name(task_name)
+            except Exception as e:
+                logger.error(f"❌ 读取任务 {task_name} 失败，等待全量对账: {e}")
+                return
+            if task_dict and task_dict.get('enabled'):
+                entry = self._build_entry(task_dict)
+
+        if entry is None:
+            if self._db_schedule.pop(key, None) is not None or key in self.schedule:
+                self.schedule.pop(key, None)
+                self._heap = None
+                logger.info(f"  ➖ 移除任务: {key}")
+            return
+
+        if self._db_schedule.get(key) == entry:
+            return
+        logger.info(f"  {'🔧 修改' if key in self._db_schedule else '➕ 新增'}任务: {key}")
+        self._db_schedule[key] = entry
+        self._upsert_entry(key, entry)
 
     def _handle_schedule_change(self, new_schedule: Dict[str, Dict[str, Any]]):
         """
@@ -208,9 +285,15 @@ class DatabaseScheduler(Scheduler):
 
         # 添加或更新任务
         for task_name, entry in schedule.items():
-            if task_name in self.schedule:
-                # 更新现有任务
-                self.schedule[task_name].update(ScheduleEntry(**entry))
-            else:
-                # 添加新任务
-                self.schedule[task_name] = ScheduleEntry(**entry, name=task_name, app=self.app)
+            self._upsert_entry(task_name, entry)
+
+    def _upsert_entry(self, task_name: str, entry: Dict[str, Any]):
+        """新增或更新单个调度条目"""
+        if task_name in self.schedule:
+            # 更新现有任务
+            self.schedule[task_name].update(ScheduleEntry(**entry))
+        else:
+            # 添加新任务
+            self.schedule[task_name] = ScheduleEntry(**entry, name=task_name, app=self.app)
+        # 条目原地更新时 Celery 检测不到 Cron 变化，强制下次 tick 重建调度堆
+        self._heap = None
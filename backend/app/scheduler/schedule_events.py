@@ -0,0 +1,135 @@
+"""
+定时任务配置变更通知
+定时任务接口修改配置后发布变更事件，Celery Beat（DatabaseScheduler）订阅后立即应用单个任务的差异，
+不必等待周期性全量对账
+
+事件格式（JSON）：
+    {"action": "upsert" | "delete", "task_name": "..."}
+
+实现：
+- RedisScheduleChangeBus: Redis pub/sub（生产环境，API 与 Beat 跨进程）
+- InMemoryScheduleChangeBus: 进程内队列（测试 / 单进程本地调试）
+
+发布是尽力而为的：消息丢失（如 Beat 未运行）时由 DatabaseScheduler 的全量对账兜底。
+"""
+
+import json
+import queue
+from typing import Any, Dict, List, Optional
+
+import redis
+from loguru import logger
+
+from app.core.config import settings
+
+SCHEDULE_CHANNEL = "scheduler:schedule_changes"
+
+ACTION_UPSERT = "upsert"
+ACTION_DELETE = "delete"
+
+
+class InMemoryScheduleChangeBus:
+    """进程内变更总线"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+
+    def publish(self, event: Dict[str, Any]):
+        self._queue.put(dict(event))
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """非阻塞取出所有待处理事件"""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        pass
+
+
+class RedisScheduleChangeBus:
+    """基于 Redis pub/sub 的变更总线"""
+
+    def __init__(self, client: Optional[redis.Redis] = None, channel: str = SCHEDULE_CHANNEL):
+        self.client = client or redis.Redis.from_url(
+            settings.REDIS_URL, socket_connect_timeout=2, socket_timeout=2
+        )
+        self.channel = channel
+        self._pubsub = None
+
+    def publish(self, event: Dict[str, Any]):
+        self.client.publish(self.channel, json.dumps(event, ensure_ascii=False))
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        非阻塞取出所有待处理事件（首次调用时订阅）
+
+        连接异常时丢弃订阅并抛出，下次调用重新订阅；期间的事件由全量对账兜底。
+        """
+        if self._pubsub is None:
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(self.channel)
+
+        events = []
+        try:
+            while True:
+                message = self._pubsub.get_message(timeout=0)
+                if message is None:
+                    break
+                if message.get("type") != "message":
+                    continue
+                try:
+                    events.append(json.loads(message["data"]))
+                except (TypeError, ValueError):
+                    logger.warning(f"忽略无法解析的定时任务变更事件: {message['data']!r}")
+        except redis.RedisError:
+            self.close()
+            raise
+        return events
+
+    def close(self):
+        if self._pubsub is not None:
+            try:
+                self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+
+
+_default_bus = None
+
+
+def get_schedule_change_bus():
+    """默认变更总线（Redis）"""
+    global _default_bus
+    if _default_bus is None:
+        _default_bus = RedisScheduleChangeBus()
+    return _default_bus
+
+
+def set_schedule_change_bus(bus):
+    """替换默认变更总线（测试或单进程运行时注入 InMemoryScheduleChangeBus）"""
+    global _default_bus
+    _default_bus = bus
+
+
+def publish_schedule_change(task_name: str, action: str = ACTION_UPSERT) -> bool:
+    """
+    发布单个任务的配置变更
+
+    Args:
+        task_name: 任务名称（scheduled_tasks.task_name）
+        action: upsert（新建/修改/启停）或 delete
+
+    Returns:
+        是否发布成功（失败不影响接口本身，Beat 会在下次全量对账时同步）
+    """
+    try:
+        get_schedule_change_bus().publish({"action": action, "task_name": task_name})
+        return True
+    except Exception as e:
+        logger.warning(f"发布定时任务变更事件失败（将由全量对账同步）: {task_name} {action}: {e}")
+        return False
@@ -12,6 +12,7 @@ from typing import Dict, Any, Optional
 from loguru import logger
 
 from app.celery_app import celery_app
+from .task_metadata import get_task_queue
 from .task_metadata_service import TaskMetadataService
 
 
@@ -63,6 +64,7 @@ class TaskExecutor:
 
         celery_task_name = task_config['task']
         friendly_name = task_config.get('name', task_name)
+        queue = get_task_queue(celery_task_name, task_config)
 
         # 合并默认参数和用户参数，并过滤元数据字段
         final_params = self.metadata_service.merge_task_params(module, params)
@@ -70,6 +72,7 @@ class TaskExecutor:
         # 日志输出
         logger.info(f"🚀 手动执行任务: {friendly_name}")
         logger.info(f"   Celery任务: {celery_task_name}")
+        logger.info(f"   队列: {queue}")
         logger.info(f"   参数: {final_params}")
 
         if params:
@@ -83,7 +86,7 @@ class TaskExecutor:
             task = celery_app.send_task(
                 celery_task_name,
                 kwargs=final_params,
-                queue='default'
+                queue=queue
             )
 
             logger.info(f"✅ 任务已提交: {friendly_name} (ID: {task.id})")
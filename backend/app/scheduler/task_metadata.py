@@ -9,7 +9,8 @@
 """
 
 from datetime import datetime
-from typing import Dict, Any
+from fnmatch import fnmatchcase
+from typing import Dict, Any, Optional
 
 
 # ============================================
@@ -24,6 +25,7 @@ from typing import Dict, Any
 #         'category': '任务分类',                 # 任务所属分类
 #         'display_order': 100,                  # 显示排序号（数字越小越靠前）
 #         'default_params': {...},               # 默认参数（可选）
+#         'queue': 'sync-io',                    # 投递队列（可选，默认按 TASK_QUEUE_ROUTES / 分类推断）
 #     }
 # }
 
@@ -134,6 +136,16 @@ TASK_MAPPING: Dict[str, Dict[str, Any]] = {
         'default_params': {}
     },
 
+    'tasks.rebuild_daily_bar_cache': {
+        'task': 'tasks.rebuild_daily_bar_cache',
+        'name': '本地日线缓存重建',
+        'description': '从 stock_daily（含复权因子、每日指标）重建回测/训练使用的本地 Parquet 日线缓存（按月分区）。日常由日线增量同步自动刷新，首次部署或校验不一致时手动执行；verify=true 时逐分区与数据库比对校验和',
+        'category': '行情数据',
+        'display_order': 208,
+        'points_consumption': 0,
+        'default_params': {'verify': True}
+    },
+
     'tasks.sync_daily_full_history': {
         'task': 'tasks.sync_daily_full_history',
         'name': '日线数据全量历史同步',
@@ -746,7 +758,8 @@ TASK_MAPPING: Dict[str, Dict[str, Any]] = {
         'name': '情绪AI分析',
         'description': '市场情绪AI分析（18:00）- 基于17:30数据生成盘后分析报告',
         'category': '市场情绪',
-        'display_order': 610
+        'display_order': 610,
+        'queue': 'llm'
     },
     'sentiment.manual_sync': {
         'task': 'sentiment.manual_sync',
@@ -787,7 +800,8 @@ TASK_MAPPING: Dict[str, Dict[str, Any]] = {
         'name': '盘前数据同步',
         'description': '同步盘前所需的各项数据',
         'category': '盘前分析',
-        'display_order': 710
+        'display_order': 710,
+        'queue': 'sync-io'
     },
     'premarket.generate_analysis': {
         'task': 'premarket.generate_analysis_only',
@@ -1137,6 +1151,17 @@ TASK_MAPPING: Dict[str, Dict[str, Any]] = {
         'display_order': 1011,
         'points_consumption': 0,
         'default_params': {'source': 'beat'}
+    },
+
+    # 全市场技术指标快照（面板向量化计算，供 AI 收集器 O(1) 读取与指标状态筛选）
+    'tasks.recompute_technical_snapshot': {
+        'task': 'tasks.recompute_technical_snapshot',
+        'name': '技术指标快照（全市场）',
+        'description': '日终一次拉取全市场约 3 年日线，向量化计算 MA / RSI / 布林 / 日周月 MACD（交叉、零轴、背离）/ ATR / 量比，写入 stock_technical_snapshot。days 参数可回补最近 N 个交易日。',
+        'category': '行情数据',
+        'display_order': 290,
+        'points_consumption': 0,
+        'default_params': {'days': 1, 'source': 'beat'}
     }
 }
 
@@ -1170,5 +1195,105 @@ METADATA_FIELDS = {
     'priority',           # 任务优先级
     'points_consumption', # Tushare积分消耗
     'retry_count',        # 重试次数
-    'timeout'             # 超时时间
+    'timeout',            # 超时时间
+    'queue',              # 投递队列
 }
+
+
+# ============================================
+# 任务队列定义
+# ============================================
+# 按资源类型划分队列，每个队列由独立的 Worker 消费（见 app/celery_worker.py）：
+#   pool: Worker 并发池类型（prefork 适合 CPU 密集；threads 适合等待网络的 I/O / LLM 调用）
+#   concurrency: 并发数（0 表示 CPU 核数）
+#   prefetch_multiplier: 每个并发槽位预取的消息数
+DEFAULT_TASK_QUEUE = 'default'
+
+TASK_QUEUES: Dict[str, Dict[str, Any]] = {
+    'default': {
+        'description': '未归类任务',
+        'pool': 'prefork',
+        'concurrency': 2,
+        'prefetch_multiplier': 1,
+    },
+    'sync-io': {
+        'description': 'Tushare 等外部数据同步（I/O 密集，收盘同步不与分析任务争抢槽位）',
+        'pool': 'threads',
+        'concurrency': 8,
+        'prefetch_multiplier': 1,
+    },
+    'compute': {
+        'description': '回测、指标/因子重算、质量检查（CPU 密集）',
+        'pool': 'prefork',
+        'concurrency': 0,
+        'prefetch_multiplier': 1,
+    },
+    'llm': {
+        'description': 'LLM 分析与策略生成（长时间等待模型响应）',
+        'pool': 'threads',
+        'concurrency': 8,
+        'prefetch_multiplier': 1,
+    },
+    'notify': {
+        'description': '邮件 / Telegram 通知',
+        'pool': 'threads',
+        'concurrency': 4,
+        'prefetch_multiplier': 4,
+    },
+}
+
+# 按 Celery 任务名匹配队列（fnmatch 通配，按顺序匹配第一条），
+# 覆盖未登记在 TASK_MAPPING 中的任务（回测、AI 策略生成、单股同步等）
+TASK_QUEUE_ROUTES = [
+    ('app.tasks.backtest_tasks.*', 'compute'),
+    ('tasks.recompute_*', 'compute'),
+    ('app.tasks.quality_tasks.*', 'compute'),
+    ('app.tasks.ai_strategy_tasks.*', 'llm'),
+    ('tasks.batch_ai_analysis', 'llm'),
+    ('app.tasks.notification_tasks.*', 'notify'),
+    ('tasks.sync_*', 'sync-io'),
+    ('sync.*', 'sync-io'),
+    ('extended.*', 'sync-io'),
+    ('sentiment.*', 'sync-io'),
+]
+
+# 任务分类的默认队列（任务名未命中 TASK_QUEUE_ROUTES 时使用）
+CATEGORY_QUEUES = {
+    '基础数据': 'sync-io',
+    '行情数据': 'sync-io',
+    '扩展数据': 'sync-io',
+    '资金流向': 'sync-io',
+    '两融及转融通': 'sync-io',
+    '特色数据': 'sync-io',
+    '参考数据': 'sync-io',
+    '打板专题': 'sync-io',
+    '新闻公告': 'sync-io',
+    '市场情绪': 'sync-io',
+    '财务数据': 'sync-io',
+    '盘前分析': 'llm',
+    '质量监控': 'compute',
+    '报告通知': 'notify',
+}
+
+
+def get_task_queue(task_name: str, task_config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    解析任务的投递队列
+
+    优先级：元数据 queue 字段 > TASK_QUEUE_ROUTES > 分类默认队列 > default
+
+    Args:
+        task_name: Celery 任务名
+        task_config: TASK_MAPPING 中的任务配置（可选）
+
+    Returns:
+        队列名称
+    """
+    if task_config and task_config.get('queue'):
+        return task_config['queue']
+    for pattern, queue in TASK_QUEUE_ROUTES:
+        if fnmatchcase(task_name, pattern):
+            return queue
+    if task_config:
+        return CATEGORY_QUEUES.get(task_config.get('category'), DEFAULT_TASK_QUEUE)
+    return DEFAULT_TASK_QUEUE
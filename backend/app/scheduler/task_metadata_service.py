@@ -11,7 +11,7 @@
 from typing import Dict, Any, Optional, List
 from loguru import logger
 
-from .task_metadata import TASK_MAPPING, TASK_CATEGORIES, METADATA_FIELDS
+from .task_metadata import TASK_MAPPING, TASK_CATEGORIES, METADATA_FIELDS, get_task_queue
 
 
 class TaskMetadataService:
@@ -63,6 +63,19 @@ class TaskMetadataService:
         config = self.get_task_config(module)
         return config['task'] if config else None
 
+    def get_task_queue(self, module: str) -> str:
+        """
+        获取任务投递队列
+
+        Args:
+            module: 模块名称
+
+        Returns:
+            队列名称（未登记的模块返回默认队列）
+        """
+        config = self.get_task_config(module) or {}
+        return get_task_queue(config.get('task', module), config or None)
+
     def get_friendly_name(self, module: str, default: str = '') -> str:
         """
         获取任务友好名称
@@ -200,3 +200,4 @@ class BacktestExecutionParams(BaseModel):
     strict_mode: bool = True
     strategy_params: Optional[Dict[str, Any]] = None
     exit_strategy_ids: Optional[List[int]] = None
+    price_adjust: Optional[str] = None  # 复权方式：None 不复权（默认）/ qfq 前复权 / hfq 后复权
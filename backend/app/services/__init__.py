@@ -3,44 +3,54 @@ Services层
 业务逻辑服务
 """
 
-# 数据下载服务（已废弃）
-from .data_service import DataDownloadService
+import importlib
 
-# 股票数据服务（新架构）
-from .stock import (
-    StockListService,
-    DailyDataService,
-    BatchDownloadService,
-    DataValidationService,
-)
+# 导出名称 → 所在子模块。首次访问时才导入（PEP 562），
+# 避免 `from app.services import X` 或导入任意 app.services.* 子模块时加载全部服务
+_LAZY_IMPORTS = {
+    # 数据下载服务（已废弃）
+    "DataDownloadService": ".data_service",
+    # 股票数据服务（新架构）
+    "StockListService": ".stock",
+    "DailyDataService": ".stock",
+    "BatchDownloadService": ".stock",
+    "DataValidationService": ".stock",
+    # 资金流向服务
+    "MoneyflowService": ".moneyflow_service",
+    "MoneyflowHsgtService": ".moneyflow_hsgt_service",
+    "MoneyflowMktDcService": ".moneyflow_mkt_dc_service",
+    "MoneyflowIndDcService": ".moneyflow_ind_dc_service",
+    "MoneyflowStockDcService": ".moneyflow_stock_dc_service",
+    # 融资融券服务
+    "MarginService": ".margin_service",
+    "MarginDetailService": ".margin_detail_service",
+    # 扩展数据服务
+    "DailyBasicService": ".daily_basic_service",
+    "BlockTradeService": ".block_trade_service",
+    "HkHoldService": ".hk_hold_service",
+    # 定时任务管理服务（模块化）
+    "CronService": ".scheduler",
+    "TaskConfigService": ".scheduler",
+    "TaskHistoryService": ".scheduler",
+    "TaskExecutionService": ".scheduler",
+    "ScheduledTaskService": ".scheduler",  # 聚合门面
+    # 任务历史记录辅助服务
+    "TaskHistoryHelper": ".task_history_helper",
+}
 
-# 资金流向服务
-from .moneyflow_service import MoneyflowService
-from .moneyflow_hsgt_service import MoneyflowHsgtService
-from .moneyflow_mkt_dc_service import MoneyflowMktDcService
-from .moneyflow_ind_dc_service import MoneyflowIndDcService
-from .moneyflow_stock_dc_service import MoneyflowStockDcService
 
-# 融资融券服务
-from .margin_service import MarginService
-from .margin_detail_service import MarginDetailService
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-# 扩展数据服务
-from .daily_basic_service import DailyBasicService
-from .block_trade_service import BlockTradeService
-from .hk_hold_service import HkHoldService
 
-# 定时任务管理服务（模块化）
-from .scheduler import (
-    CronService,
-    TaskConfigService,
-    TaskHistoryService,
-    TaskExecutionService,
-    ScheduledTaskService,  # 聚合门面（CronService + TaskConfigService + TaskHistoryService + TaskExecutionService）
-)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-# 任务历史记录辅助服务
-from .task_history_helper import TaskHistoryHelper
 
 __all__ = [
     # 数据下载服务（已废弃，保留向后兼容）
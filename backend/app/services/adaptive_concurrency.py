@@ -0,0 +1,209 @@
+"""
+自适应并发同步工具
+
+为 Tushare 批量同步提供三件套：
+  - AdaptiveConcurrencyController: AIMD 并发控制器。延迟与错误率健康时每轮 +1，
+    遇到频率限制错误时按比例减半，避免固定并发要么跑不满、要么持续触发限流
+  - run_adaptive_queue: 连续有界工作队列。任一任务完成立即补位，不再按波次 gather
+    等待最慢的一只股票 / 一个片段
+  - ProgressBuffer: Redis 续继进度缓冲，按条数 / 时间批量通过 pipeline 写入 SADD，
+    替代每完成一项一次往返
+
+TushareSyncBase 的全量 / 增量同步统一使用这些工具，所有基于它的扩展同步服务自动生效。
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from loguru import logger
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """判断异常是否为 Tushare 频率限制（异常类型或限速消息）"""
+    # 延迟导入：src.providers 导入较重，只在出错路径上需要
+    try:
+        from src.providers.tushare.config import TushareErrorMessages
+        from src.providers.tushare.exceptions import TushareRateLimitError
+    except ImportError:
+        return '每分钟最多访问' in str(exc) or '每小时最多访问' in str(exc)
+    if isinstance(exc, TushareRateLimitError):
+        return True
+    return TushareErrorMessages.is_rate_limit_error(str(exc))
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD（加性增、乘性减）并发控制器
+
+    每完成 limit 个请求评估一轮（约等于一个"往返"）：
+      - 本轮出现频率限制：limit *= decrease_factor（立即生效，同一轮内只减一次）
+      - 错误率超过 error_rate_threshold 或中位延迟超过基线 latency_tolerance 倍：保持
+      - 否则：limit += increase_step
+
+    延迟基线取历轮中位延迟的最小值；客户端限速（max_requests_per_minute）导致的排队
+    会体现为延迟上升，此时不再加并发。
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        increase_step: int = 1,
+        decrease_factor: float = 0.5,
+        error_rate_threshold: float = 0.2,
+        latency_tolerance: float = 2.0,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit if max_limit is not None else initial)
+        self._limit = min(max(initial, self.min_limit), self.max_limit)
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.error_rate_threshold = error_rate_threshold
+        self.latency_tolerance = latency_tolerance
+
+        self.baseline_latency: Optional[float] = None
+        self._latencies = []
+        self._errors = 0
+        self._rate_limited = False
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def record(self, latency: float, error: bool = False, rate_limited: bool = False):
+        """记录一次请求结果，满一轮后调整并发"""
+        if rate_limited:
+            if not self._rate_limited:
+                self._rate_limited = True
+                self._decrease()
+            # 限速发生后开启新一轮，避免同一批在途请求连续减半
+            self._reset_round()
+            return
+
+        self._latencies.append(latency)
+        if error:
+            self._errors += 1
+        if len(self._latencies) >= self._limit:
+            self._evaluate()
+
+    def _evaluate(self):
+        samples = sorted(self._latencies)
+        median = samples[len(samples) // 2]
+        error_rate = self._errors / len(samples)
+
+        if self.baseline_latency is None or median < self.baseline_latency:
+            self.baseline_latency = median
+        latency_ok = median <= self.baseline_latency * self.latency_tolerance
+
+        if error_rate <= self.error_rate_threshold and latency_ok and self._limit < self.max_limit:
+            self._limit = min(self.max_limit, self._limit + self.increase_step)
+            self.increases += 1
+        self._rate_limited = False
+        self._reset_round()
+
+    def _decrease(self):
+        new_limit = max(self.min_limit, int(self._limit * self.decrease_factor))
+        if new_limit < self._limit:
+            logger.warning(f"[自适应并发] 触发频率限制，并发 {self._limit} -> {new_limit}")
+            self._limit = new_limit
+            self.decreases += 1
+
+    def _reset_round(self):
+        self._latencies = []
+        self._errors = 0
+
+
+class ProgressBuffer:
+    """
+    Redis 续继进度缓冲（Set）
+
+    add() 只写本地缓冲，满 batch_size 条或距上次写入超过 flush_interval 秒时，
+    通过一次 pipeline 批量 SADD。调用方需在结束（含异常）时 flush()，
+    未落盘的项在下次续继时会被重新同步（upsert 幂等）。
+    """
+
+    def __init__(self, redis_client, key: str, batch_size: int = 100, flush_interval: float = 5.0):
+        self.redis_client = redis_client
+        self.key = key
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def add(self, member: str):
+        self._pending.append(member)
+        if (len(self._pending) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        members, self._pending = self._pending, []
+        pipe = self.redis_client.pipeline(transaction=False)
+        for start in range(0, len(members), self.batch_size):
+            pipe.sadd(self.key, *members[start: start + self.batch_size])
+        pipe.execute()
+
+
+async def run_adaptive_queue(
+    items: Iterable[Any],
+    handler: Callable[[Any], Awaitable[Any]],
+    controller: AdaptiveConcurrencyController,
+    on_result: Callable[[Any, bool, Any], None],
+    max_rate_limit_retries: int = 2,
+) -> None:
+    """
+    连续有界工作队列：在途任务数始终不超过 controller.limit，任一完成立即补位
+
+    Args:
+        items:                 待处理项（股票代码 / 日期片段等）
+        handler:               异步处理函数，返回值透传给 on_result；抛异常视为失败
+        controller:            并发控制器（根据每项的耗时与错误调整 limit）
+        on_result:             完成回调 on_result(item, ok, result_or_error)，
+                               ok=False 时第三个参数为异常
+        max_rate_limit_retries: 频率限制失败的项重新入队次数，用尽后按失败回调
+    """
+    pending = deque(items)
+    attempts = {}
+    running = {}
+
+    async def _timed(item):
+        started = time.monotonic()
+        try:
+            return True, await handler(item), time.monotonic() - started
+        except Exception as e:
+            return False, e, time.monotonic() - started
+
+    try:
+        while pending or running:
+            while pending and len(running) < controller.limit:
+                item = pending.popleft()
+                running[asyncio.ensure_future(_timed(item))] = item
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                item = running.pop(future)
+                ok, value, latency = future.result()
+                if ok:
+                    controller.record(latency)
+                    on_result(item, True, value)
+                    continue
+
+                rate_limited = is_rate_limit_error(value)
+                controller.record(latency, error=True, rate_limited=rate_limited)
+                key = repr(item)
+                if rate_limited and attempts.get(key, 0) < max_rate_limit_retries:
+                    attempts[key] = attempts.get(key, 0) + 1
+                    pending.append(item)
+                    continue
+                on_result(item, False, value)
+    finally:
+        for future in running:
+            future.cancel()
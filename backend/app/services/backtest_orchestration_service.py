@@ -39,7 +39,9 @@ if str(core_path) not in sys.path:
 # 导入 Core 模块
 from src.backtest import BacktestEngine
 from src.backtest.performance_analyzer import PerformanceAnalyzer
+from src.data.price_adjuster import PriceAdjuster
 from src.data_pipeline.feature_engineer import FeatureEngineer
+from src.utils.dtype_policy import pivot_panel
 
 
 class BacktestOrchestrationService:
@@ -103,7 +105,8 @@ class BacktestOrchestrationService:
             market_data = self._load_market_data(
                 params.stock_pool,
                 params.start_date,
-                params.end_date
+                params.end_date,
+                price_adjust=params.price_adjust
             )
 
             # 3. 准备价格数据
@@ -221,39 +224,74 @@ class BacktestOrchestrationService:
         self,
         stock_pool: List[str],
         start_date: str,
-        end_date: str
+        end_date: str,
+        price_adjust: Optional[str] = None
     ) -> pd.DataFrame:
-        """加载市场数据"""
-        market_data = pd.DataFrame()
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d").date()
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
+        """
+        加载市场数据
 
+        一次取回股票池全部日线（优先本地日线缓存），按 price_adjust 对 OHLC 做复权
+        （默认不复权，与原有回测口径一致），价格面板与特征计算使用同一份数据。
+        批量查询失败时退回逐只 load_daily_data（该路径不含复权因子，按不复权处理），
+        单只股票失败只记录警告并跳过。
+        """
         query_manager = self.data_adapter.query_manager
         if query_manager is None:
             raise ValueError("数据库连接不可用")
 
+        columns = ['open', 'high', 'low', 'close', 'volume', 'amount',
+                   'amplitude', 'pct_change', 'change', 'turnover', 'adj_factor']
+        try:
+            market_data = query_manager.load_market_daily(
+                start_date=start_date,
+                end_date=end_date,
+                codes=list(stock_pool),
+                columns=columns,
+            )
+        except Exception as e:
+            logger.warning(f"[回测编排] 批量加载市场数据失败，改为逐只加载: {e}")
+            market_data = self._load_market_data_per_stock(query_manager, stock_pool, start_date, end_date)
+            if price_adjust and not market_data.empty:
+                logger.warning(
+                    f"[回测编排] 逐只加载路径不含复权因子，复权方式 {price_adjust} 未生效，使用不复权价格"
+                )
+
+        if market_data.empty:
+            raise ValueError(f"未找到股票池的历史数据")
+
+        market_data = PriceAdjuster.adjust_long(market_data, adjust=price_adjust)
+        market_data = market_data.drop(columns=['adj_factor'], errors='ignore')
+
+        logger.info(
+            f"[回测编排] 加载市场数据完成: {len(market_data)} 条记录, "
+            f"{market_data['code'].nunique()} 只股票, 复权方式={price_adjust or '不复权'}"
+        )
+        return market_data
+
+    @staticmethod
+    def _load_market_data_per_stock(
+        query_manager,
+        stock_pool: List[str],
+        start_date: str,
+        end_date: str
+    ) -> pd.DataFrame:
+        """逐只股票加载日线（批量查询失败时的回退路径），单只失败只记录警告"""
+        frames = []
         for code in stock_pool:
             try:
                 code_data = query_manager.load_daily_data(
                     stock_code=code,
-                    start_date=start_dt.strftime("%Y-%m-%d"),
-                    end_date=end_dt.strftime("%Y-%m-%d")
+                    start_date=start_date,
+                    end_date=end_date
                 )
                 if not code_data.empty:
-                    # 确保DatetimeIndex转为date列
                     if isinstance(code_data.index, pd.DatetimeIndex):
                         code_data = code_data.reset_index()
-
                     code_data['code'] = code
-                    market_data = pd.concat([market_data, code_data], ignore_index=True)
+                    frames.append(code_data)
             except Exception as e:
                 logger.warning(f"加载股票 {code} 数据失败: {e}")
-
-        if market_data.empty:
-            raise ValueError(f"未找到股票池的历史数据")
-
-        logger.info(f"[回测编排] 加载市场数据完成: {len(market_data)} 条记录")
-        return market_data
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
     def _prepare_prices(self, market_data: pd.DataFrame) -> pd.DataFrame:
         """准备价格数据"""
@@ -267,12 +305,10 @@ class BacktestOrchestrationService:
         market_data = market_data.drop_duplicates(subset=['trade_date', 'code'], keep='last')
 
         # Pivot to wide format: index=dates, columns=stock codes
+        # code 为 category（见 dtype 策略），pivot_panel 将列还原为普通字符串索引
         ohlcv_dfs = {
-            'open': market_data.pivot(index='trade_date', columns='code', values='open').sort_index(),
-            'high': market_data.pivot(index='trade_date', columns='code', values='high').sort_index(),
-            'low': market_data.pivot(index='trade_date', columns='code', values='low').sort_index(),
-            'close': market_data.pivot(index='trade_date', columns='code', values='close').sort_index(),
-            'volume': market_data.pivot(index='trade_date', columns='code', values='volume').sort_index()
+            field: pivot_panel(market_data, field, index='trade_date')
+            for field in ('open', 'high', 'low', 'close', 'volume')
         }
 
         # 合并成多层列结构的 DataFrame
@@ -187,6 +187,19 @@ class BatchManager:
             counter_type
         )
 
+    async def add_batch_counters(self, batch_id: int, completed: int = 0, failed: int = 0):
+        """
+        批量累加批次计数器（并行执行器合并写入）
+
+        Args:
+            batch_id: 批次ID
+            completed: 新增完成数
+            failed: 新增失败数
+        """
+        await asyncio.to_thread(
+            self.batch_repo.add_batch_counters, batch_id, completed=completed, failed=failed
+        )
+
     async def get_batch_info(self, batch_id: int) -> Optional[Dict]:
         """
         获取批次详细信息
@@ -324,21 +324,48 @@ class CeleryTaskHistoryService:
         limit: int = 50,
         offset: int = 0,
         status: Optional[str] = None,
-        task_type: Optional[str] = None
+        task_type: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         获取任务列表和统计信息（组合查询）
 
+        首页（offset=0）与带 cursor 的请求走游标分页并返回 next_cursor，
+        offset>0 保留原 OFFSET 分页。
+
         Args:
             user_id: 用户ID
             limit: 返回数量限制
             offset: 偏移量
             status: 按状态筛选（可选）
             task_type: 按任务类型筛选（可选）
+            cursor: 上一页返回的 next_cursor（可选，优先于 offset）
 
         Returns:
             包含任务列表、总数和统计信息的字典
         """
+        if cursor or not offset:
+            page_future = asyncio.to_thread(
+                self.task_history_repo.get_history_page,
+                user_id,
+                limit,
+                cursor,
+                status,
+                task_type
+            )
+            stats_future = self.get_statistics(user_id)
+            page, stats = await asyncio.gather(page_future, stats_future)
+
+            return {
+                'tasks': [self.format_task_dict(task) for task in page['tasks']],
+                'total': page['total'],
+                'total_is_estimate': page['total_is_estimate'],
+                'next_cursor': page['next_cursor'],
+                'limit': limit,
+                'offset': offset,
+                'statistics': stats
+            }
+
         # 并发查询任务列表和统计信息
         tasks_future = self.get_recent_history(
             user_id, limit, offset, status, task_type
@@ -351,6 +378,8 @@ class CeleryTaskHistoryService:
         return {
             'tasks': tasks,
             'total': total,
+            'total_is_estimate': False,
+            'next_cursor': None,
             'limit': limit,
             'offset': offset,
             'statistics': stats
@@ -9,13 +9,13 @@ import pickle
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import pandas as pd
 from loguru import logger
 
 # 导入 core 模块（已通过 setup.py 安装为可导入包）
-from src.data_pipeline import get_full_training_data
+from src.data_pipeline import PipelineConfig, get_full_training_data
 from src.models.model_trainer import ModelTrainer
 
 from app.core.exceptions import BackendError, CalculationError, DataQueryError
@@ -47,6 +47,7 @@ class CoreTrainingService:
         save_training_history: bool = True,
         evaluate_on: str = "test",  # 'train', 'valid', 'test'
         use_async: bool = True,  # 是否使用异步训练
+        prepared_data: Optional[Tuple] = None,
     ) -> Dict[str, Any]:
         """
         统一的训练流程
@@ -75,6 +76,8 @@ class CoreTrainingService:
             save_training_history: 是否保存训练历史（GRU损失曲线）
             evaluate_on: 在哪个数据集上评估 ('train', 'valid', 'test')
             use_async: 是否使用异步训练（手动训练=True，自动实验=False）
+            prepared_data: 预计算的 (X_train, y_train, X_valid, y_valid, X_test, y_test, scaler)，
+                由批量实验的共享特征产物提供；为 None 时按 config 重新获取数据
 
         Returns:
             训练结果字典:
@@ -103,34 +106,18 @@ class CoreTrainingService:
             # ======== 步骤1: 数据准备 ========
             logger.info(f"[CoreTraining] 获取训练数据...")
 
-            # 使用统一的数据获取接口
-            if use_async:
-                result = await asyncio.to_thread(
-                    get_full_training_data,
-                    symbol=config["symbol"],
-                    start_date=config["start_date"],
-                    end_date=config["end_date"],
-                    target_period=config.get("target_period", 5),
-                    train_ratio=config.get("train_ratio", 0.7),
-                    valid_ratio=config.get("valid_ratio", 0.15),
-                    scale_features=config.get("scale_features", True),
-                    balance_samples=config.get("balance_samples", False),
-                    scaler_type=config.get("scaler_type", "robust"),
-                )
+            # 批量实验可传入共享的预计算数据，跳过重复的特征计算
+            if prepared_data is not None:
+                X_train, y_train, X_valid, y_valid, X_test, y_test, scaler = prepared_data
             else:
-                result = get_full_training_data(
-                    symbol=config["symbol"],
-                    start_date=config["start_date"],
-                    end_date=config["end_date"],
-                    target_period=config.get("target_period", 5),
-                    train_ratio=config.get("train_ratio", 0.7),
-                    valid_ratio=config.get("valid_ratio", 0.15),
-                    scale_features=config.get("scale_features", True),
-                    balance_samples=config.get("balance_samples", False),
-                    scaler_type=config.get("scaler_type", "robust"),
-                )
+                # 使用统一的数据获取接口
+                if use_async:
+                    result = await asyncio.to_thread(self.load_training_data, config)
+                else:
+                    result = self.load_training_data(config)
 
-            X_train, y_train, X_valid, y_valid, X_test, y_test, pipeline = result
+                X_train, y_train, X_valid, y_valid, X_test, y_test, pipeline = result
+                scaler = pipeline.get_scaler()
 
             logger.info(
                 f"[CoreTraining] 数据准备完成: train={len(X_train)}, valid={len(X_valid)}, test={len(X_test)}"
@@ -289,7 +276,7 @@ class CoreTrainingService:
             # ======== 步骤7: 保存Scaler ========
             scaler_path = self.models_dir / f"{model_id}_scaler.pkl"
             with open(scaler_path, "wb") as f:
-                pickle.dump(pipeline.get_scaler(), f)
+                pickle.dump(scaler, f)
             logger.info(f"[CoreTraining] ✅ Scaler已保存: {scaler_path}")
 
             # ======== 步骤8: 保存特征数据（可选） ========
@@ -385,6 +372,29 @@ class CoreTrainingService:
                 reason=str(e),
             )
 
+    @staticmethod
+    def load_training_data(config: Dict[str, Any]) -> Tuple:
+        """
+        按训练配置获取模型就绪数据
+
+        Returns:
+            (X_train, y_train, X_valid, y_valid, X_test, y_test, pipeline)
+        """
+        pipeline_config = PipelineConfig(
+            target_period=config.get("target_period", 5),
+            train_ratio=config.get("train_ratio", 0.7),
+            valid_ratio=config.get("valid_ratio", 0.15),
+            scale_features=config.get("scale_features", True),
+            balance_samples=config.get("balance_samples", False),
+            scaler_type=config.get("scaler_type", "robust"),
+        )
+        return get_full_training_data(
+            symbol=config["symbol"],
+            start_date=config["start_date"],
+            end_date=config["end_date"],
+            config=pipeline_config,
+        )
+
     def _validate_and_fix_params(self, config: Dict[str, Any]) -> None:
         """
         验证并自动修正训练参数，防止使用过时或危险的参数
@@ -0,0 +1,288 @@
+"""
+批量实验并行执行器
+- 进程池（默认按 CPU 核数）执行 CPU 密集的模型训练，绕开事件循环与 GIL
+- 同一 (股票, 日期区间, 特征配置) 的特征/标签每个批次只计算一次，
+  落盘为 .npy 后由各训练进程以 mmap 只读方式共享
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# 决定特征/标签内容的配置项（与 CoreTrainingService.load_training_data 的默认值一致）
+FEATURE_CONFIG_DEFAULTS = {
+    "target_period": 5,
+    "train_ratio": 0.7,
+    "valid_ratio": 0.15,
+    "scale_features": True,
+    "balance_samples": False,
+    "scaler_type": "robust",
+}
+
+SPLITS = ("train", "valid", "test")
+
+
+def feature_artifact_key(config: Dict[str, Any]) -> str:
+    """计算特征产物键：股票集合 + 日期区间 + 特征配置相同的实验共享同一份数据"""
+    symbol = config["symbol"]
+    key = {
+        "symbol": sorted(symbol) if isinstance(symbol, (list, tuple)) else symbol,
+        "start_date": str(config["start_date"]),
+        "end_date": str(config["end_date"]),
+    }
+    for name, default in FEATURE_CONFIG_DEFAULTS.items():
+        key[name] = config.get(name, default)
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class FeatureArtifact:
+    """
+    共享特征产物
+
+    目录结构：
+        X_{split}.npy / y_{split}.npy  特征矩阵与标签（np.load mmap 只读映射）
+        meta.pkl                        列名、索引、标签名与 scaler
+    """
+
+    META_FILE = "meta.pkl"
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    @property
+    def exists(self) -> bool:
+        return (self.path / self.META_FILE).exists()
+
+    @classmethod
+    def write(cls, path, data: Tuple) -> "FeatureArtifact":
+        """
+        写入产物（先写临时目录再原子改名，并发构建时以先完成者为准）
+
+        Args:
+            path: 产物目录
+            data: (X_train, y_train, X_valid, y_valid, X_test, y_test, scaler)
+        """
+        path = Path(path)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=path.parent))
+        meta: Dict[str, Any] = {"columns": {}, "index": {}, "y_name": {}, "scaler": data[6]}
+
+        for i, split in enumerate(SPLITS):
+            X, y = data[2 * i], data[2 * i + 1]
+            np.save(tmp / f"X_{split}.npy", np.ascontiguousarray(X.to_numpy()))
+            np.save(tmp / f"y_{split}.npy", np.ascontiguousarray(y.to_numpy()))
+            meta["columns"][split] = list(X.columns)
+            meta["index"][split] = X.index
+            meta["y_name"][split] = y.name
+
+        with open(tmp / cls.META_FILE, "wb") as f:
+            pickle.dump(meta, f)
+
+        try:
+            os.rename(tmp, path)
+        except OSError:
+            # 目标已存在（其他进程先完成）
+            shutil.rmtree(tmp, ignore_errors=True)
+        return cls(path)
+
+    def load(self, mmap: bool = True) -> Tuple:
+        """
+        读取产物
+
+        Returns:
+            (X_train, y_train, X_valid, y_valid, X_test, y_test, scaler)，
+            mmap=True 时 DataFrame 直接引用只读映射，不复制数据
+        """
+        with open(self.path / self.META_FILE, "rb") as f:
+            meta = pickle.load(f)
+
+        mmap_mode = "r" if mmap else None
+        result = []
+        for split in SPLITS:
+            X = np.load(self.path / f"X_{split}.npy", mmap_mode=mmap_mode)
+            y = np.load(self.path / f"y_{split}.npy", mmap_mode=mmap_mode)
+            index = meta["index"][split]
+            result.append(pd.DataFrame(X, index=index, columns=meta["columns"][split], copy=False))
+            result.append(pd.Series(y, index=index, name=meta["y_name"][split], copy=False))
+        result.append(meta["scaler"])
+        return tuple(result)
+
+
+# ==================== 进程池任务（需为模块级函数以便 pickle） ====================
+
+
+def _init_worker(threads_per_worker: int):
+    """限制每个训练进程的数值库线程数，避免 N 进程 × M 线程超额订阅"""
+    threads = str(threads_per_worker)
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[name] = threads
+
+
+def build_feature_artifact(config: Dict[str, Any], path: str) -> str:
+    """计算并落盘特征产物（已存在则直接返回）"""
+    from app.services.core_training import CoreTrainingService
+
+    artifact = FeatureArtifact(path)
+    if not artifact.exists:
+        X_train, y_train, X_valid, y_valid, X_test, y_test, pipeline = (
+            CoreTrainingService.load_training_data(config)
+        )
+        FeatureArtifact.write(
+            path, (X_train, y_train, X_valid, y_valid, X_test, y_test, pipeline.get_scaler())
+        )
+    return str(path)
+
+
+def train_experiment(
+    exp_id: int,
+    config: Dict[str, Any],
+    model_id: str,
+    artifact_path: Optional[str],
+    models_dir: str,
+) -> Dict[str, Any]:
+    """
+    在训练进程中执行单个实验的训练
+
+    异常在进程内转换为 error 字段返回，避免自定义异常跨进程反序列化失败。
+    """
+    started_at = datetime.now()
+    try:
+        from app.services.core_training import CoreTrainingService
+
+        prepared = FeatureArtifact(artifact_path).load() if artifact_path else None
+        service = CoreTrainingService(models_dir=models_dir)
+        result = asyncio.run(
+            service.train_model(
+                config=config,
+                model_id=model_id,
+                save_features=True,
+                save_training_history=True,
+                use_async=False,
+                prepared_data=prepared,
+            )
+        )
+    except Exception as e:
+        return {"exp_id": exp_id, "error": str(e), "train_started_at": started_at}
+
+    return {
+        "exp_id": exp_id,
+        "model_id": result["model_id"],
+        "model_path": result["model_path"],
+        "metrics": result["metrics"],
+        "feature_importance": result.get("feature_importance") or {},
+        "train_started_at": started_at,
+        "train_completed_at": datetime.now(),
+    }
+
+
+class ExperimentExecutor:
+    """
+    批量实验进程池执行器
+
+    用法：
+        async with ExperimentExecutor(max_workers=32) as executor:
+            result = await executor.train(exp_id, config, model_id)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        models_dir: str = "/data/models/ml_models",
+        artifacts_root: Optional[str] = None,
+    ):
+        """
+        Args:
+            max_workers: 训练进程数（默认 CPU 核数）
+            models_dir: 模型输出目录
+            artifacts_root: 共享特征产物的父目录（默认系统临时目录）
+        """
+        cpu_count = os.cpu_count() or 1
+        self.max_workers = max(1, max_workers or cpu_count)
+        self.threads_per_worker = max(1, cpu_count // self.max_workers)
+        self.models_dir = str(models_dir)
+        self.artifacts_root = artifacts_root
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._artifacts_dir: Optional[Path] = None
+        self._artifacts: Dict[str, asyncio.Future] = {}
+
+    def start(self):
+        """启动进程池（spawn，避免 fork 继承事件循环与数据库连接）"""
+        if self._pool is not None:
+            return
+        self._artifacts_dir = Path(tempfile.mkdtemp(prefix="exp_features_", dir=self.artifacts_root))
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker,),
+        )
+        logger.info(
+            f"实验执行器启动: {self.max_workers} 进程 × {self.threads_per_worker} 线程, "
+            f"特征产物目录 {self._artifacts_dir}"
+        )
+
+    def shutdown(self):
+        """关闭进程池并清理本批次的特征产物"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+        if self._artifacts_dir is not None:
+            shutil.rmtree(self._artifacts_dir, ignore_errors=True)
+            self._artifacts_dir = None
+        self._artifacts.clear()
+
+    async def __aenter__(self) -> "ExperimentExecutor":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.to_thread(self.shutdown)
+
+    def _run(self, fn, *args) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    async def feature_artifact(self, config: Dict[str, Any]) -> Optional[str]:
+        """
+        获取配置对应的共享特征产物路径（同键只在进程池中构建一次）
+
+        构建失败返回 None，由训练进程按配置自行取数。
+        """
+        key = feature_artifact_key(config)
+        future = self._artifacts.get(key)
+        if future is None:
+            future = self._run(build_feature_artifact, config, str(self._artifacts_dir / key))
+            self._artifacts[key] = future
+        try:
+            return await asyncio.shield(future)
+        except Exception as e:
+            logger.warning(f"特征产物 {key} 构建失败，实验将单独取数: {e}")
+            return None
+
+    def prepare(self, configs: Iterable[Dict[str, Any]]):
+        """为所有不同的特征键提前提交构建任务（与训练并行）"""
+        for config in configs:
+            key = feature_artifact_key(config)
+            if key not in self._artifacts:
+                self._artifacts[key] = self._run(
+                    build_feature_artifact, config, str(self._artifacts_dir / key)
+                )
+
+    async def train(self, exp_id: int, config: Dict[str, Any], model_id: str) -> Dict[str, Any]:
+        """等待共享特征就绪后在进程池中训练单个实验"""
+        artifact_path = await self.feature_artifact(config)
+        return await self._run(
+            train_experiment, exp_id, config, model_id, artifact_path, self.models_dir
+        )
@@ -5,7 +5,9 @@
 
 import asyncio
 import json
+import time
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Optional
 
 from loguru import logger
@@ -13,19 +15,111 @@ from loguru import logger
 from app.core.exceptions import BackendError, DatabaseError
 from app.repositories.experiment_repository import ExperimentRepository
 from app.services.backtest_service import BacktestService
-from app.services.core_training import CoreTrainingService
+from app.services.experiment_executor import ExperimentExecutor
 from app.services.training_task_manager import TrainingTaskManager
 
+# 结果合并写入：累计条数或间隔秒数任一达到即落库
+RESULT_FLUSH_SIZE = 32
+RESULT_FLUSH_INTERVAL = 10.0
+
+# 回测在主进程事件循环中执行，与原 Worker 默认并发数一致
+BACKTEST_CONCURRENCY = 4
+
+
+class ExperimentResultBuffer:
+    """
+    批次实验结果写缓冲
+
+    训练结果、回测结果、失败记录、批次计数器与模型元数据在内存中累积，
+    按条数/时间间隔合并为少量批量 SQL 和一次元数据文件写入。
+    刷新顺序固定为 训练 → 回测 → 失败，保证同一实验的状态最终正确。
+    """
+
+    def __init__(
+        self,
+        batch_id: int,
+        experiment_repo: ExperimentRepository,
+        task_manager: TrainingTaskManager,
+        flush_size: int = RESULT_FLUSH_SIZE,
+        flush_interval: float = RESULT_FLUSH_INTERVAL,
+    ):
+        self.batch_id = batch_id
+        self.experiment_repo = experiment_repo
+        self.task_manager = task_manager
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self._train_rows: List[Dict] = []
+        self._backtest_rows: List[Dict] = []
+        self._failures: List[tuple] = []
+        self._models: Dict[str, Dict] = {}
+        self._completed = 0
+        self._failed = 0
+        self._last_flush = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def add_train_result(self, row: Dict, model_entry: Dict, completed: bool):
+        self._train_rows.append(row)
+        self._models[row["model_id"]] = model_entry
+        if completed:
+            self._completed += 1
+
+    def add_backtest_result(self, row: Dict):
+        self._backtest_rows.append(row)
+        self._completed += 1
+
+    def add_failure(self, exp_id: int, error_message: str):
+        self._failures.append((exp_id, error_message))
+        self._failed += 1
+
+    def _pending(self) -> int:
+        return len(self._train_rows) + len(self._backtest_rows) + len(self._failures)
+
+    async def maybe_flush(self):
+        """达到条数或时间阈值时刷新"""
+        if (
+            self._pending() >= self.flush_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(self):
+        """将缓冲内容批量写入数据库与元数据文件"""
+        async with self._lock:
+            train_rows, self._train_rows = self._train_rows, []
+            backtest_rows, self._backtest_rows = self._backtest_rows, []
+            failures, self._failures = self._failures, []
+            models, self._models = self._models, {}
+            completed, failed = self._completed, self._failed
+            self._completed = self._failed = 0
+            self._last_flush = time.monotonic()
+
+            if models:
+                await asyncio.to_thread(self.task_manager.register_models, models)
+            if train_rows:
+                await asyncio.to_thread(self.experiment_repo.bulk_update_train_results, train_rows)
+            if backtest_rows:
+                await asyncio.to_thread(
+                    self.experiment_repo.bulk_update_backtest_results, backtest_rows
+                )
+            if failures:
+                await asyncio.to_thread(self.experiment_repo.bulk_mark_failed, failures)
+            if completed or failed:
+                from app.services.batch_manager import BatchManager
+
+                await BatchManager().add_batch_counters(
+                    self.batch_id, completed=completed, failed=failed
+                )
+
 
 class ExperimentRunner:
     """
     实验运行器
 
     职责：
-    - 执行批次实验
-    - Worker 管理和调度
-    - 单个实验的训练和回测
-    - 实验状态更新
+    - 执行批次实验（训练在进程池中并行，回测在事件循环中并发）
+    - 同批次共享特征产物
+    - 实验结果合并写入
     """
 
     def __init__(self, db=None):
@@ -49,10 +143,10 @@ class ExperimentRunner:
 
         Args:
             batch_id: 批次ID
-            max_workers: 最大并行Worker数
+            max_workers: 最大并行训练进程数（默认 CPU 核数）
             auto_backtest: 是否自动回测
         """
-        logger.info(f"🚀 开始批次 {batch_id}，Worker数: {max_workers or 4}")
+        logger.info(f"🚀 开始批次 {batch_id}，训练进程数: {max_workers or '自动'}")
 
         # 更新批次状态
         await self._update_batch_status(batch_id, "running", started_at=datetime.now())
@@ -66,34 +160,33 @@ class ExperimentRunner:
                 await self._update_batch_status(batch_id, "completed")
                 return
 
-            # 创建任务队列
-            queue = asyncio.Queue()
-            for exp in experiments:
-                await queue.put(exp)
-
-            # 创建Worker池
-            workers = []
-            num_workers = min(max_workers or 4, len(experiments))
-
-            for worker_id in range(num_workers):
-                task = asyncio.create_task(
-                    self._experiment_worker(
-                        worker_id=worker_id,
-                        batch_id=batch_id,
-                        queue=queue,
-                        auto_backtest=auto_backtest,
-                    )
-                )
-                workers.append(task)
+            configs = {
+                exp[0]: exp[3] if isinstance(exp[3], dict) else json.loads(exp[3])
+                for exp in experiments
+            }
+            executor = ExperimentExecutor(max_workers=min(max_workers or 0, len(configs)) or None)
+            buffer = ExperimentResultBuffer(
+                batch_id, self.experiment_repo, TrainingTaskManager(Path(executor.models_dir))
+            )
+            backtest_slots = asyncio.Semaphore(BACKTEST_CONCURRENCY)
 
-            # 等待所有实验完成
-            await queue.join()
+            await asyncio.to_thread(
+                self.experiment_repo.bulk_update_status, list(configs), "training"
+            )
 
-            # 停止所有Worker
-            for task in workers:
-                task.cancel()
+            async with executor:
+                # 所有不同的特征键先行提交构建，训练任务按键等待各自的产物
+                executor.prepare(configs.values())
+                await asyncio.gather(
+                    *(
+                        self._run_experiment(
+                            executor, buffer, backtest_slots, exp_id, config, auto_backtest
+                        )
+                        for exp_id, config in configs.items()
+                    )
+                )
 
-            await asyncio.gather(*workers, return_exceptions=True)
+            await buffer.flush()
 
             # 计算排名
             from app.services.batch_manager import BatchManager
@@ -120,193 +213,106 @@ class ExperimentRunner:
                 reason=str(e),
             )
 
-    async def _experiment_worker(
-        self, worker_id: int, batch_id: int, queue: asyncio.Queue, auto_backtest: bool
-    ):
-        """
-        实验执行Worker
-
-        Args:
-            worker_id: Worker ID
-            batch_id: 批次ID
-            queue: 任务队列
-            auto_backtest: 是否自动回测
-        """
-        logger.info(f"🔧 Worker-{worker_id} 启动")
-
-        while True:
-            try:
-                # 从队列获取实验
-                experiment = await queue.get()
-
-                exp_id = experiment[0]
-                exp_config = (
-                    experiment[3] if isinstance(experiment[3], dict) else json.loads(experiment[3])
-                )
-
-                logger.info(f"[Worker-{worker_id}] 🔬 开始实验 {exp_id}")
-
-                # 执行实验
-                await self._run_single_experiment(
-                    exp_id=exp_id,
-                    config=exp_config,
-                    auto_backtest=auto_backtest,
-                    worker_id=worker_id,
-                )
-
-                # 更新批次计数器
-                await self._increment_batch_counter(batch_id, "completed")
-
-            except asyncio.CancelledError:
-                logger.info(f"🛑 Worker-{worker_id} 停止")
-                break
-            except (DatabaseError, BackendError) as e:
-                # 已知业务异常
-                logger.error(f"[Worker-{worker_id}] ❌ 实验失败 (业务异常): {e}")
-                await self._mark_experiment_failed(exp_id, str(e))
-                await self._increment_batch_counter(batch_id, "failed")
-            except Exception as e:
-                # 未预期错误
-                logger.error(f"[Worker-{worker_id}] ❌ 实验失败 (未预期错误): {e}")
-                await self._mark_experiment_failed(exp_id, str(e))
-                await self._increment_batch_counter(batch_id, "failed")
-            finally:
-                queue.task_done()
-
-    async def _run_single_experiment(
-        self, exp_id: int, config: Dict, auto_backtest: bool, worker_id: int
+    async def _run_experiment(
+        self,
+        executor: ExperimentExecutor,
+        buffer: ExperimentResultBuffer,
+        backtest_slots: asyncio.Semaphore,
+        exp_id: int,
+        config: Dict,
+        auto_backtest: bool,
     ):
         """
-        执行单个实验
+        执行单个实验：进程池训练 → （可选）回测，结果写入缓冲
 
         Args:
+            executor: 进程池执行器
+            buffer: 结果写缓冲
+            backtest_slots: 回测并发信号量
             exp_id: 实验ID
             config: 实验配置
             auto_backtest: 是否自动回测
-            worker_id: Worker ID
         """
-        start_time = datetime.now()
+        model_id = (
+            f"{config['symbol']}_{config.get('model_type')}_E{exp_id}_"
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        )
 
         try:
-            # 1. 更新状态为训练中
-            await self._update_experiment_status(exp_id, "training", train_started_at=start_time)
-
-            # 2. 训练模型
-            logger.info(f"[Worker-{worker_id}] 🏋️  训练模型...")
-            model_id, train_metrics, feature_importance, model_path = await self._train_model_async(
-                config
-            )
-
-            train_end_time = datetime.now()
-            train_duration = (train_end_time - start_time).total_seconds()
-
-            # 3. 保存训练结果
-            await self._update_experiment_train_result(
-                exp_id=exp_id,
-                model_id=model_id,
-                train_metrics=train_metrics,
-                feature_importance=feature_importance,
-                model_path=model_path,
-                train_completed_at=train_end_time,
-                train_duration=int(train_duration),
-            )
-
-            logger.info(f"[Worker-{worker_id}] ✅ 训练完成: {model_id}")
-
-            # 4. 自动回测（可选）
-            if auto_backtest:
-                await self._update_experiment_status(
-                    exp_id, "backtesting", backtest_started_at=datetime.now()
-                )
-
-                logger.info(f"[Worker-{worker_id}] 📊 回测中...")
-                backtest_result = await self._run_backtest_async(model_id, config)
-
-                backtest_end_time = datetime.now()
-                backtest_duration = (backtest_end_time - train_end_time).total_seconds()
-
-                # 5. 保存回测结果
-                await self._update_experiment_backtest_result(
-                    exp_id=exp_id,
-                    backtest_metrics=backtest_result,
-                    backtest_completed_at=backtest_end_time,
-                    backtest_duration=int(backtest_duration),
-                )
-
-                logger.info(f"[Worker-{worker_id}] ✅ 回测完成")
-
-            # 6. 标记实验完成
-            total_duration = (datetime.now() - start_time).total_seconds()
-            await self._update_experiment_status(
-                exp_id, "completed", total_duration_seconds=int(total_duration)
-            )
-
-        except (DatabaseError, BackendError):
-            # 已知业务异常向上传播
-            raise
+            result = await executor.train(exp_id, config, model_id)
         except Exception as e:
-            logger.error(f"[Worker-{worker_id}] 实验 {exp_id} 失败: {e}")
-            await self._mark_experiment_failed(exp_id, str(e))
-            raise BackendError(
-                f"实验执行失败: {exp_id}",
-                error_code="EXPERIMENT_EXECUTION_FAILED",
-                exp_id=exp_id,
-                worker_id=worker_id,
-                reason=str(e),
-            )
-
-    async def _train_model_async(self, config: Dict) -> tuple:
-        """
-        异步训练模型
-
-        Args:
-            config: 训练配置
-
-        Returns:
-            (model_id, metrics, feature_importance, model_path)
-        """
-
-        async def _train():
-            # 使用 CoreTrainingService 统一训练流程
-            core_service = CoreTrainingService()
-
-            # CoreTrainingService.train_model() 是异步方法，接受 config 字典作为第一个参数
-            result = await core_service.train_model(
-                config=config,
-                save_features=True,
-                save_training_history=True,
-                use_async=False,  # 在 worker 线程中运行，不需要再次异步
-            )
-
-            model_id = f"{config['symbol']}_{config.get('model_type')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            metrics = result["metrics"]
-            feature_importance = result.get("feature_importance", {})
-            model_path = result["model_path"]
-
-            # 注册模型到TrainingTaskManager
-            task_manager = TrainingTaskManager()
-            task_manager.tasks[model_id] = {
+            # 进程池异常（如训练进程崩溃）
+            result = {"exp_id": exp_id, "error": str(e)}
+
+        if "error" in result:
+            logger.error(f"❌ 实验 {exp_id} 训练失败: {result['error']}")
+            buffer.add_failure(exp_id, result["error"])
+            await buffer.maybe_flush()
+            return
+
+        started_at = result["train_started_at"]
+        train_end_time = result["train_completed_at"]
+        train_duration = int((train_end_time - started_at).total_seconds())
+        logger.info(f"✅ 实验 {exp_id} 训练完成: {model_id}")
+
+        buffer.add_train_result(
+            {
+                "experiment_id": exp_id,
+                "status": "backtesting" if auto_backtest else "completed",
+                "model_id": model_id,
+                "train_metrics": result["metrics"],
+                "feature_importance": result["feature_importance"],
+                "model_path": result["model_path"],
+                "train_started_at": started_at,
+                "train_completed_at": train_end_time,
+                "train_duration_seconds": train_duration,
+            },
+            {
                 "task_id": model_id,
                 "status": "completed",
-                "model_path": model_path,
+                "model_path": result["model_path"],
                 "config": {
                     "model_type": config["model_type"],
                     "target_period": config["target_period"],
                     "symbol": config["symbol"],
                     "scaler_type": config.get("scaler_type", "robust"),
                 },
-                "metrics": metrics,
-                "feature_importance": feature_importance,
-                "created_at": datetime.now().isoformat(),
-                "completed_at": datetime.now().isoformat(),
-            }
-            task_manager._save_metadata()
-            logger.info(f"✅ 模型已注册到TrainingTaskManager: {model_id}")
+                "metrics": result["metrics"],
+                "feature_importance": result["feature_importance"],
+                "created_at": started_at.isoformat(),
+                "completed_at": train_end_time.isoformat(),
+            },
+            completed=not auto_backtest,
+        )
 
-            return model_id, metrics, feature_importance, model_path
+        if auto_backtest:
+            async with backtest_slots:
+                backtest_start = datetime.now()
+                try:
+                    backtest_metrics = await self._run_backtest_async(model_id, config)
+                except Exception as e:
+                    logger.error(f"❌ 实验 {exp_id} 回测失败: {e}")
+                    buffer.add_failure(exp_id, str(e))
+                    await buffer.maybe_flush()
+                    return
+
+            backtest_end_time = datetime.now()
+            buffer.add_backtest_result(
+                {
+                    "experiment_id": exp_id,
+                    "backtest_metrics": backtest_metrics,
+                    "backtest_started_at": backtest_start,
+                    "backtest_completed_at": backtest_end_time,
+                    "backtest_duration_seconds": int(
+                        (backtest_end_time - backtest_start).total_seconds()
+                    ),
+                    "total_duration_seconds": int(
+                        (backtest_end_time - started_at).total_seconds()
+                    ),
+                }
+            )
 
-        # _train 是异步函数，直接 await 执行
-        return await _train()
+        await buffer.maybe_flush()
 
     async def _run_backtest_async(self, model_id: str, config: Dict) -> Dict:
         """
@@ -346,63 +352,3 @@ class ExperimentRunner:
             result.append((exp['id'], exp['batch_id'], exp['experiment_name'], exp['config']))
 
         return result
-
-    async def _update_experiment_status(self, exp_id: int, status: str, **kwargs):
-        """更新实验状态"""
-        await asyncio.to_thread(
-            self.experiment_repo.update_experiment_status, exp_id, status, **kwargs
-        )
-
-    async def _update_experiment_train_result(
-        self,
-        exp_id: int,
-        model_id: str,
-        train_metrics: Dict,
-        feature_importance: Dict,
-        model_path: str,
-        train_completed_at: datetime,
-        train_duration: int,
-    ):
-        """更新实验训练结果（使用 Repository）"""
-        await asyncio.to_thread(
-            self.experiment_repo.update_train_result,
-            exp_id,
-            model_id,
-            train_metrics,
-            feature_importance,
-            model_path,
-            train_completed_at,
-            train_duration,
-        )
-
-    async def _update_experiment_backtest_result(
-        self,
-        exp_id: int,
-        backtest_metrics: Dict,
-        backtest_completed_at: datetime,
-        backtest_duration: int,
-    ):
-        """更新实验回测结果（使用 Repository）"""
-        await asyncio.to_thread(
-            self.experiment_repo.update_backtest_result,
-            exp_id,
-            backtest_metrics,
-            backtest_completed_at,
-            backtest_duration,
-        )
-
-    async def _mark_experiment_failed(self, exp_id: int, error_message: str):
-        """标记实验失败"""
-        await asyncio.to_thread(
-            self.experiment_repo.update_experiment_status,
-            exp_id,
-            "failed",
-            error_message=error_message,
-        )
-
-    async def _increment_batch_counter(self, batch_id: int, counter_type: str):
-        """增加批次计数器"""
-        from app.services.batch_manager import BatchManager
-
-        batch_manager = BatchManager()
-        await batch_manager.increment_batch_counter(batch_id, counter_type)
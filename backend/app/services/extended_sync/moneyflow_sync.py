@@ -82,6 +82,11 @@ class MoneyflowSyncService(BaseSyncService):
             self.MAX_OFFSET = TushareSyncBase.MAX_OFFSET
         if not hasattr(self, '_generate_segments'):
             self._generate_segments = TushareSyncBase._generate_segments.__get__(self)
+        if not hasattr(self, 'COVERAGE_DATE_COLUMN'):
+            self.COVERAGE_DATE_COLUMN = TushareSyncBase.COVERAGE_DATE_COLUMN
+        for name in ('_load_coverage_index', '_incremental_refresh_from'):
+            if not hasattr(self, name):
+                setattr(self, name, getattr(TushareSyncBase, name).__get__(self))
 
         return await TushareSyncBase.run_incremental_sync(
             self,
@@ -10,7 +10,6 @@ from typing import Any, Dict, Optional, Union
 
 import numpy as np
 from loguru import logger
-from src.data_pipeline import DataPipeline
 
 from app.core.exceptions import BackendError, DataNotFoundError, DataQueryError
 from app.repositories.experiment_repository import ExperimentRepository
@@ -337,7 +336,8 @@ class ModelPredictor:
         Returns:
             (X, y, dates): 特征、标签、日期
         """
-        # 导入配置类
+        # 延迟导入（core 数据管道导入耗时数秒，API 启动时不加载）
+        from src.data_pipeline import DataPipeline
         from src.data_pipeline.pipeline_config import PipelineConfig
 
         # 创建数据管道
@@ -186,30 +186,44 @@ class NewsFlashSyncService:
         page_size: int = 50,
         sort_by: Optional[str] = None,
         sort_order: str = 'desc',
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
-        items, total, sources = await asyncio.gather(
-            asyncio.to_thread(
-                self.repo.query_by_filters,
-                source=source, start_time=start_time, end_time=end_time,
-                ts_code=ts_code, keyword=keyword, tag=tag,
-                page=page, page_size=page_size,
+        """分页列表：首页与带 cursor 的请求走游标分页，page>1 保留 OFFSET 兼容旧前端。"""
+        filters = dict(
+            source=source, start_time=start_time, end_time=end_time,
+            ts_code=ts_code, keyword=keyword, tag=tag,
+        )
+        if cursor or int(page) == 1:
+            page_call = asyncio.to_thread(
+                self.repo.query_page_by_filters, **filters,
+                cursor=cursor, page_size=page_size,
                 sort_by=sort_by, sort_order=sort_order,
-            ),
-            asyncio.to_thread(
-                self.repo.count_by_filters,
-                source=source, start_time=start_time, end_time=end_time,
-                ts_code=ts_code, keyword=keyword, tag=tag,
-            ),
+            )
+        else:
+            page_call = asyncio.to_thread(
+                self._query_offset_page, filters, page, page_size, sort_by, sort_order,
+            )
+        (items, next_cursor), (total, total_is_estimate), sources = await asyncio.gather(
+            page_call,
+            asyncio.to_thread(self.repo.approximate_count_by_filters, **filters),
             asyncio.to_thread(self.repo.get_distinct_sources),
         )
         return {
             'items': items,
             'total': total,
+            'total_is_estimate': total_is_estimate,
+            'next_cursor': next_cursor,
             'sources': sources,
             'page': int(page),
             'page_size': int(page_size),
         }
 
+    def _query_offset_page(self, filters, page, page_size, sort_by, sort_order):
+        items = self.repo.query_by_filters(
+            **filters, page=page, page_size=page_size, sort_by=sort_by, sort_order=sort_order,
+        )
+        return items, None
+
     async def get_recent_by_stock(self, ts_code: str, days: int = 7, limit: int = 50):
         """CIO Tool / 个股专家使用：该股最近 N 天快讯。"""
         return await asyncio.to_thread(self.repo.query_by_stock, ts_code, int(days), int(limit))
@@ -297,31 +297,50 @@ class StockAnnsSyncService:
         page_size: int = 50,
         sort_by: Optional[str] = None,
         sort_order: str = 'desc',
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """分页查询（前端公告浏览页用）。"""
-        items, total, anno_types = await asyncio.gather(
-            asyncio.to_thread(
-                self.anns_repo.query_by_filters,
-                ts_code=ts_code, start_date=start_date, end_date=end_date,
-                anno_type=anno_type, keyword=keyword,
-                page=page, page_size=page_size,
+        """分页查询（前端公告浏览页用）：首页与带 cursor 的请求走游标分页，page>1 保留 OFFSET。
+
+        按可空列（anno_type / created_at）排序时不支持游标，始终走 OFFSET。
+        """
+        filters = dict(
+            ts_code=ts_code, start_date=start_date, end_date=end_date,
+            anno_type=anno_type, keyword=keyword,
+        )
+        keyset_ok = sort_by not in (
+            StockAnnsRepository.SORTABLE_COLUMNS - StockAnnsRepository.KEYSET_SORTABLE_COLUMNS
+        )
+        if keyset_ok and (cursor or int(page) == 1):
+            page_call = asyncio.to_thread(
+                self.anns_repo.query_page_by_filters, **filters,
+                cursor=cursor, page_size=page_size,
                 sort_by=sort_by, sort_order=sort_order,
-            ),
-            asyncio.to_thread(
-                self.anns_repo.count_by_filters,
-                ts_code=ts_code, start_date=start_date, end_date=end_date,
-                anno_type=anno_type, keyword=keyword,
-            ),
+            )
+        else:
+            page_call = asyncio.to_thread(
+                self._query_offset_page, filters, page, page_size, sort_by, sort_order,
+            )
+        (items, next_cursor), (total, total_is_estimate), anno_types = await asyncio.gather(
+            page_call,
+            asyncio.to_thread(self.anns_repo.approximate_count_by_filters, **filters),
             asyncio.to_thread(self.anns_repo.get_distinct_anno_types, 90, 200),
         )
         return {
             'items': items,
             'total': total,
+            'total_is_estimate': total_is_estimate,
+            'next_cursor': next_cursor,
             'anno_types': anno_types,
             'page': int(page),
             'page_size': int(page_size),
         }
 
+    def _query_offset_page(self, filters, page, page_size, sort_by, sort_order):
+        items = self.anns_repo.query_by_filters(
+            **filters, page=page, page_size=page_size, sort_by=sort_by, sort_order=sort_order,
+        )
+        return items, None
+
     async def get_recent_by_stock(self, ts_code: str, days: int = 30, limit: int = 50) -> List[Dict]:
         """CIO Tool / 个股专家使用：最近 N 天的公告列表。"""
         return await asyncio.to_thread(self.anns_repo.query_by_stock, ts_code, int(days), int(limit))
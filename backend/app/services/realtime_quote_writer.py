@@ -0,0 +1,193 @@
+"""
+实时行情微批写入器
+
+数据源每返回一条实时行情就回调一次。逐条 save_realtime_quote_single 意味着每只股票
+一次连接池借还 + 一条 INSERT + 一次提交（全市场约 5000 次提交）。
+
+RealtimeQuoteWriter 在回调中只写本地缓冲，满 batch_size 条或缓冲中最早一条等待超过
+flush_interval_ms 毫秒时，通过一条多行 upsert 写库（save_realtime_quote_batch）：
+  - 后台定时线程保证数据源停顿 / 变慢时缓冲也会按时落库（增量保存语义不变）
+  - close() 写出剩余缓冲；超时、异常路径同样调用，已获取的行情不会丢失
+  - 批量写入失败时可退回逐条写入（save_single），隔离个别脏数据
+  - 每次写库后调用 on_flush（如发布到行情缓存），并记录耗时 / 行数指标
+
+使用方式：
+    writer = RealtimeQuoteWriter(
+        save_batch=lambda quotes: db.save_realtime_quote_batch(quotes, source),
+        save_single=lambda quote: db.save_realtime_quote_single(quote, source),
+    )
+    with writer:
+        provider.get_realtime_quotes(save_callback=writer.add)
+    writer.saved_count
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.middleware.metrics import record_realtime_quote_flush
+
+
+class RealtimeQuoteWriter:
+    """
+    实时行情微批写入器（线程安全）
+
+    add() 可在数据源线程中调用；flush() / close() 可在任意线程调用，
+    写库操作串行执行，保证同一股票的先后顺序。
+    """
+
+    def __init__(
+        self,
+        save_batch: Callable[[List[dict]], int],
+        batch_size: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        save_single: Optional[Callable[[dict], int]] = None,
+        on_flush: Optional[Callable[[List[dict]], None]] = None,
+    ):
+        """
+        Args:
+            save_batch: 批量写库函数，返回写入行数
+            batch_size: 满多少条写一次（默认 REALTIME_QUOTE_FLUSH_ROWS）
+            flush_interval_ms: 缓冲最长等待毫秒数（默认 REALTIME_QUOTE_FLUSH_INTERVAL_MS）
+            save_single: 批量写入失败时的逐条写库函数（None 表示不退回，整批计为失败）
+            on_flush: 写库成功后的回调，参数为本批行情
+        """
+        self.save_batch = save_batch
+        self.save_single = save_single
+        self.on_flush = on_flush
+        self.batch_size = max(1, batch_size or settings.REALTIME_QUOTE_FLUSH_ROWS)
+        interval_ms = flush_interval_ms if flush_interval_ms is not None else settings.REALTIME_QUOTE_FLUSH_INTERVAL_MS
+        self.flush_interval = max(0.001, interval_ms / 1000)
+
+        self._buffer: List[dict] = []
+        self._first_buffered_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._timer: Optional[threading.Thread] = None
+
+        self.saved_count = 0
+        self.failed_count = 0
+        self.flush_count = 0
+        self.max_batch_rows = 0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    # ==================== 生命周期 ====================
+
+    def start(self) -> 'RealtimeQuoteWriter':
+        """启动定时 flush 线程（可重复调用）"""
+        if self._timer is None:
+            self._timer = threading.Thread(target=self._run_timer, name="realtime-quote-writer", daemon=True)
+            self._timer.start()
+        return self
+
+    def close(self) -> int:
+        """停止定时线程并写出剩余缓冲；之后的 add() 立即逐批写库。返回累计写入行数"""
+        self._closed = True
+        self._wake.set()
+        if self._timer is not None and self._timer is not threading.current_thread():
+            self._timer.join()
+        self.flush()
+        return self.saved_count
+
+    def __enter__(self) -> 'RealtimeQuoteWriter':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ==================== 写入 ====================
+
+    def add(self, quote: dict) -> None:
+        """缓冲一条行情（数据源 save_callback）"""
+        with self._lock:
+            if not self._buffer:
+                self._first_buffered_at = time.monotonic()
+            self._buffer.append(quote)
+            full = len(self._buffer) >= self.batch_size or self._closed
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """立即写出缓冲，返回本次写入行数"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+                self._first_buffered_at = None
+            if not batch:
+                return 0
+            return self._write(batch)
+
+    def _run_timer(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval / 2)
+            if self._closed:
+                break
+            with self._lock:
+                due = (self._first_buffered_at is not None
+                       and time.monotonic() - self._first_buffered_at >= self.flush_interval)
+            if due:
+                try:
+                    self.flush()
+                except Exception as e:  # 定时线程不能退出
+                    logger.warning(f"实时行情定时写入失败: {e}")
+
+    def _write(self, batch: List[dict]) -> int:
+        started = time.monotonic()
+        try:
+            saved = self.save_batch(batch)
+        except Exception as e:
+            record_realtime_quote_flush(len(batch), time.monotonic() - started, success=False)
+            if self.save_single is None:
+                self.failed_count += len(batch)
+                logger.warning(f"实时行情批量写入失败（{len(batch)} 条）: {e}")
+                return 0
+            logger.warning(f"实时行情批量写入失败（{len(batch)} 条），改为逐条写入: {e}")
+            batch, saved = self._write_one_by_one(batch)
+            if not batch:
+                return 0
+
+        duration = time.monotonic() - started
+        self.saved_count += saved
+        self.flush_count += 1
+        self.max_batch_rows = max(self.max_batch_rows, len(batch))
+        self.max_flush_seconds = max(self.max_flush_seconds, duration)
+        self.total_flush_seconds += duration
+        record_realtime_quote_flush(len(batch), duration, success=True)
+
+        if self.on_flush is not None:
+            try:
+                self.on_flush(batch)
+            except Exception as e:
+                logger.warning(f"实时行情 flush 回调失败: {e}")
+        return saved
+
+    def _write_one_by_one(self, batch: List[dict]):
+        """逐条写入，返回 (成功的行情, 成功条数)"""
+        written = []
+        for quote in batch:
+            try:
+                self.save_single(quote)
+                written.append(quote)
+            except Exception as e:
+                self.failed_count += 1
+                logger.warning(f"增量保存 {quote.get('code', 'Unknown')} 失败: {e}")
+        return written, len(written)
+
+    # ==================== 统计 ====================
+
+    def stats(self) -> Dict:
+        """写入统计（行数 / 批次 / flush 延迟）"""
+        return {
+            "saved": self.saved_count,
+            "failed": self.failed_count,
+            "flushes": self.flush_count,
+            "max_batch_rows": self.max_batch_rows,
+            "avg_flush_ms": round(self.total_flush_seconds / self.flush_count * 1000, 2) if self.flush_count else 0.0,
+            "max_flush_ms": round(self.max_flush_seconds * 1000, 2),
+        }
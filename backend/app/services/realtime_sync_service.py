@@ -3,13 +3,14 @@
 负责实时行情数据的同步
 """
 
+import asyncio
 from datetime import datetime
 from typing import Dict, List, Optional
 
 from loguru import logger
 
-from app.core.exceptions import DatabaseError
 from app.services.base_sync_service import BaseSyncService
+from app.services.realtime_quote_writer import RealtimeQuoteWriter
 
 
 class RealtimeSyncService(BaseSyncService):
@@ -133,33 +134,26 @@ class RealtimeSyncService(BaseSyncService):
             if realtime_source.lower() == "akshare":
                 logger.warning("AkShare全量实时行情获取需要3-5分钟，请耐心等待...")
 
-        # 增量保存计数器
-        saved_count = 0
-
-        # 定义保存回调函数，每获取一条数据就立即保存
-        def save_callback(quote: dict):
-            nonlocal saved_count
-            try:
-                self.data_service.db.save_realtime_quote_single(quote, realtime_source)
-                saved_count += 1
-            except DatabaseError as e:
-                # 数据库错误记录但不中断
-                error_msg = e.message if hasattr(e, 'message') else str(e)
-                logger.warning(f"增量保存 {quote.get('code', 'Unknown')} 失败 (数据库错误): {error_msg}")
-            except Exception as e:
-                # 其他错误记录但不中断（保证增量保存的容错性）
-                logger.warning(f"增量保存 {quote.get('code', 'Unknown')} 失败: {e}")
-
-        # 获取实时行情（使用增量保存回调）
+        # 增量保存：回调只写缓冲，按条数 / 时间微批写库，每批写库后发布到行情缓存
+        db = self.data_service.db
+        writer = RealtimeQuoteWriter(
+            save_batch=lambda quotes: db.save_realtime_quote_batch(quotes, realtime_source),
+            save_single=lambda quote: db.save_realtime_quote_single(quote, realtime_source),
+            on_flush=self._quote_cache_publisher(),
+        )
+
+        # 获取实时行情（使用增量保存回调）；超时 / 异常时同样写出剩余缓冲
+        writer.start()
         try:
             response = await self.run_in_thread(
                 provider.get_realtime_quotes,
                 codes=codes_to_update,
-                save_callback=save_callback,
+                save_callback=writer.add,
                 timeout=timeout
             )
         except TimeoutError as e:
             # 超时时，部分数据已经通过回调保存
+            saved_count = await self.run_in_thread(writer.close)
             error_msg = str(e)
 
             if realtime_source.lower() == "akshare":
@@ -187,6 +181,7 @@ class RealtimeSyncService(BaseSyncService):
 
             # 如果有部分数据保存成功，返回部分成功响应
             if saved_count > 0:
+                await self._publish_quote_snapshot()
                 return {
                     "total": saved_count,
                     "requested": len(codes_to_update) if codes_to_update else "all",
@@ -200,6 +195,12 @@ class RealtimeSyncService(BaseSyncService):
             else:
                 raise TimeoutError(error_msg)
 
+        except Exception:
+            await self.run_in_thread(writer.close)
+            raise
+
+        saved_count = await self.run_in_thread(writer.close)
+
         # 检查响应状态并提取数据
         df = self.check_and_extract_data(response, "获取实时行情")
 
@@ -208,6 +209,8 @@ class RealtimeSyncService(BaseSyncService):
 
         # 数据已通过回调增量保存，这里只记录日志
         self.log_success(f"实时行情更新完成: {saved_count} 只股票（增量保存）")
+        logger.info(f"实时行情微批写入统计: {writer.stats()}")
+        await self._publish_quote_snapshot()
 
         return {
             "total": saved_count,
@@ -216,3 +219,24 @@ class RealtimeSyncService(BaseSyncService):
             "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "incremental_save": True,
         }
+
+    @staticmethod
+    def _quote_cache_publisher():
+        """返回 flush 回调：在当前事件循环中把刚写库的一批行情发布到行情缓存（不等待结果）"""
+        from app.services.stock_quote_cache import stock_quote_cache
+
+        loop = asyncio.get_running_loop()
+
+        def publish(quotes):
+            asyncio.run_coroutine_threadsafe(stock_quote_cache.publish_quotes(list(quotes)), loop)
+
+        return publish
+
+    async def _publish_quote_snapshot(self) -> None:
+        """每个同步周期发布一次全市场行情快照，API worker 据此直接读行情（失败不影响同步结果）"""
+        from app.services.stock_quote_cache import stock_quote_cache
+
+        try:
+            await stock_quote_cache.publish_snapshot()
+        except Exception as e:
+            logger.warning(f"发布行情快照失败: {e}")
@@ -5,6 +5,7 @@
 - 任务配置的 CRUD 操作
 - 任务启用/禁用
 - 任务配置验证
+- 配置变更后发布变更事件，Celery Beat 立即生效
 """
 
 import asyncio
@@ -13,6 +14,7 @@ from loguru import logger
 
 from app.repositories import ScheduledTaskRepository
 from app.core.exceptions import QueryError, DatabaseError, ValidationError
+from app.scheduler.schedule_events import ACTION_DELETE, publish_schedule_change
 from .cron_service import CronService
 
 
@@ -216,6 +218,7 @@ class TaskConfigService:
                 task['next_run_at'] = next_run_at
 
             logger.info(f"✓ 创建定时任务: {task_name} (ID: {task['id']})")
+            await asyncio.to_thread(publish_schedule_change, task_name)
 
             # 格式化时间字段
             task['last_run_at'] = self.cron_service.format_datetime(task.get('last_run_at'))
@@ -356,6 +359,7 @@ class TaskConfigService:
             )
 
             logger.info(f"✓ 更新定时任务: {task_id}")
+            await asyncio.to_thread(publish_schedule_change, task['task_name'])
 
             # 返回更新后的任务
             return await self.get_task_by_id(task_id)
@@ -408,6 +412,7 @@ class TaskConfigService:
             )
 
             logger.info(f"✓ 切换定时任务状态: {task_id} -> {new_enabled}")
+            await asyncio.to_thread(publish_schedule_change, task['task_name'])
 
             # 返回更新后的任务
             return await self.get_task_by_id(task_id)
@@ -459,6 +464,7 @@ class TaskConfigService:
                 task['task_name']
             )
 
+            await asyncio.to_thread(publish_schedule_change, task['task_name'], ACTION_DELETE)
             logger.info(f"✓ 删除定时任��: {task_id}")
             return count
 
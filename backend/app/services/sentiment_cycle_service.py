@@ -12,6 +12,7 @@ from loguru import logger
 # 导入Core模块
 sys.path.insert(0, '/app/core')
 from src.database.connection_pool_manager import ConnectionPoolManager
+from src.data.trading_calendar import get_trading_calendar
 from src.sentiment.sentiment_analyzer import SentimentAnalyzer
 from src.sentiment.hot_money_classifier import HotMoneyClassifier
 from src.sentiment.cycle_calculator import SentimentCycleCalculator
@@ -489,6 +490,11 @@ class SentimentCycleService:
         Returns:
             bool: 是否为交易日
         """
+        # 优先使用进程内交易日历索引，未覆盖的日期再查询数据库
+        calendar = get_trading_calendar()
+        if calendar.covers(date):
+            return calendar.is_trading_day(date)
+
         try:
             conn = self.pool_manager.get_connection()
             cursor = conn.cursor()
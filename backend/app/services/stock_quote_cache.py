@@ -1,11 +1,23 @@
 """
 股票行情缓存服务
 
-从 stock_realtime 表读取价格/涨跌幅，从 stock_basic 表读取名称，
-存入 Redis。交易时间 TTL=60s，非交易时间 TTL=3600s。
+从 stock_realtime 表读取价格/涨跌幅，从 stock_basic 表读取名称。两级缓存：
+
+  L1  进程内 TTL 缓存（每个 worker 一份，有容量上限），命中时不访问 Redis
+  L2  Redis：
+        - 全市场快照 Hash（stock:quote:snapshot），每个实时行情同步周期由同步任务整体发布一次，
+          所有 API worker 可直接读取任意股票，无需查询 PostgreSQL
+        - 单只股票键（stock:quote:{ts_code}），快照缺失时由数据库回填
+
+读取顺序：L1 -> 快照 HMGET -> 单键 MGET -> 数据库（回填用 pipeline SETEX），
+每一级都是一次批量往返。交易时间 TTL=60s，非交易时间 TTL=3600s。
+失效 / 快照发布通过 Redis pub/sub 广播，各 worker 清理自己的 L1。
 缓存不可用时降级为直接查数据库，不影响主流程。
 """
 import asyncio
+import threading
+import time as _time
+from collections import OrderedDict
 from datetime import time, datetime
 from typing import Dict, List, Optional
 
@@ -19,6 +31,10 @@ from app.repositories.base_repository import BaseRepository
 
 # Redis key 前缀
 KEY_PREFIX = "stock:quote"
+# 全市场快照 Hash（field=ts_code, value=行情 JSON）
+SNAPSHOT_KEY = f"{KEY_PREFIX}:snapshot"
+# L1 失效广播频道
+INVALIDATE_CHANNEL = "stock:quote:invalidate"
 
 
 def is_trading_hours() -> bool:
@@ -36,6 +52,11 @@ def quote_ttl() -> int:
     return settings.cache_ttl.quote_trading if is_trading_hours() else settings.cache_ttl.quote_non_trading
 
 
+def quote_l1_ttl() -> float:
+    """L1 TTL：交易时间取较短的 CACHE_QUOTE_L1_TTL，非交易时间与 Redis 一致（行情不变，靠广播失效）"""
+    return settings.cache_ttl.quote_l1 if is_trading_hours() else settings.cache_ttl.quote_non_trading
+
+
 class _QuoteRepository(BaseRepository):
     """内部用：从数据库批量查询行情快照"""
 
@@ -58,57 +79,66 @@ class _QuoteRepository(BaseRepository):
             return {}
 
         placeholders = ','.join(['%s'] * len(ts_codes))
-
-        # stock_realtime 用纯代码（去后缀）关联，stock_basic 用 ts_code 关联
-        query = f"""
-            SELECT
-                sb.ts_code,
-                sb.name,
-                sr.latest_price,
-                sr.pct_change,
-                sr.change_amount,
-                sr.open,
-                sr.high,
-                sr.low,
-                sr.pre_close,
-                sr.volume,
-                sr.amount,
-                sr.turnover,
-                sr.amplitude,
-                sr.trade_time
-            FROM stock_basic sb
-            LEFT JOIN stock_realtime sr
-                ON sr.code = split_part(sb.ts_code, '.', 1)
-            WHERE sb.ts_code IN ({placeholders})
-        """
-
         try:
-            rows = self.execute_query(query, tuple(ts_codes))
-            result = {}
-            for row in rows:
-                ts_code = row[0]
-                result[ts_code] = {
-                    "name":          row[1] or "",
-                    "latest_price":  float(row[2])  if row[2]  is not None else None,
-                    "pct_change":    float(row[3])  if row[3]  is not None else None,
-                    "change_amount": float(row[4])  if row[4]  is not None else None,
-                    "open":          float(row[5])  if row[5]  is not None else None,
-                    "high":          float(row[6])  if row[6]  is not None else None,
-                    "low":           float(row[7])  if row[7]  is not None else None,
-                    "pre_close":     float(row[8])  if row[8]  is not None else None,
-                    "volume":        int(row[9])     if row[9]  is not None else None,
-                    "amount":        float(row[10]) if row[10] is not None else None,
-                    "turnover":      float(row[11]) if row[11] is not None else None,
-                    "amplitude":     float(row[12]) if row[12] is not None else None,
-                    "trade_time":    str(row[13])   if row[13] is not None else None,
-                    # 兼容旧字段名
-                    "price":         float(row[2])  if row[2]  is not None else None,
-                }
-            return result
+            rows = self.execute_query(
+                self._QUOTE_SQL + f" WHERE sb.ts_code IN ({placeholders})", tuple(ts_codes)
+            )
+            return {row[0]: self._row_to_quote(row) for row in rows}
         except Exception as e:
             logger.error(f"_QuoteRepository.get_quotes 失败: {e}")
             return {}
 
+    def get_all_quotes(self) -> Dict[str, dict]:
+        """全市场行情快照（一次查询，字段同 get_quotes）"""
+        try:
+            rows = self.execute_query(self._QUOTE_SQL)
+            return {row[0]: self._row_to_quote(row) for row in rows}
+        except Exception as e:
+            logger.error(f"_QuoteRepository.get_all_quotes 失败: {e}")
+            return {}
+
+    # stock_realtime 用纯代码（去后缀）关联，stock_basic 用 ts_code 关联
+    _QUOTE_SQL = """
+        SELECT
+            sb.ts_code,
+            sb.name,
+            sr.latest_price,
+            sr.pct_change,
+            sr.change_amount,
+            sr.open,
+            sr.high,
+            sr.low,
+            sr.pre_close,
+            sr.volume,
+            sr.amount,
+            sr.turnover,
+            sr.amplitude,
+            sr.trade_time
+        FROM stock_basic sb
+        LEFT JOIN stock_realtime sr
+            ON sr.code = split_part(sb.ts_code, '.', 1)
+    """
+
+    @staticmethod
+    def _row_to_quote(row) -> dict:
+        return {
+            "name":          row[1] or "",
+            "latest_price":  float(row[2])  if row[2]  is not None else None,
+            "pct_change":    float(row[3])  if row[3]  is not None else None,
+            "change_amount": float(row[4])  if row[4]  is not None else None,
+            "open":          float(row[5])  if row[5]  is not None else None,
+            "high":          float(row[6])  if row[6]  is not None else None,
+            "low":           float(row[7])  if row[7]  is not None else None,
+            "pre_close":     float(row[8])  if row[8]  is not None else None,
+            "volume":        int(row[9])     if row[9]  is not None else None,
+            "amount":        float(row[10]) if row[10] is not None else None,
+            "turnover":      float(row[11]) if row[11] is not None else None,
+            "amplitude":     float(row[12]) if row[12] is not None else None,
+            "trade_time":    str(row[13])   if row[13] is not None else None,
+            # 兼容旧字段名
+            "price":         float(row[2])  if row[2]  is not None else None,
+        }
+
     def resolve_ts_codes(self, pure_codes: List[str]) -> Dict[str, str]:
         """
         将纯股票代码批量补全为完整 ts_code。
@@ -136,6 +166,65 @@ class _QuoteRepository(BaseRepository):
             return {}
 
 
+class _L1QuoteCache:
+    """
+    进程内 L1 行情缓存（LRU + TTL，线程安全）
+
+    每个 API worker 一份，容量受 CACHE_QUOTE_L1_MAX_ENTRIES 限制。
+    generation 在 clear() 时递增：清空前发起的回源结果不会再写回 L1，避免旧数据复活。
+    """
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max(0, int(max_entries))
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_many(self, codes: List[str]) -> Dict[str, dict]:
+        """返回未过期的命中项（副本，调用方可自由修改）"""
+        now = _time.monotonic()
+        hits: Dict[str, dict] = {}
+        with self._lock:
+            for code in codes:
+                entry = self._data.get(code)
+                if entry is None:
+                    continue
+                expires_at, quote = entry
+                if expires_at <= now:
+                    del self._data[code]
+                    continue
+                self._data.move_to_end(code)
+                hits[code] = dict(quote)
+        return hits
+
+    def put_many(self, quotes: Dict[str, dict], ttl: float, generation: Optional[int] = None) -> None:
+        """写入行情；generation 与当前不一致（期间发生过 clear）时丢弃"""
+        if not quotes or self._max_entries == 0 or ttl <= 0:
+            return
+        expires_at = _time.monotonic() + ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            for code, quote in quotes.items():
+                self._data[code] = (expires_at, dict(quote))
+                self._data.move_to_end(code)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+    def invalidate(self, codes: List[str]) -> None:
+        with self._lock:
+            for code in codes:
+                self._data.pop(code, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+
 class StockQuoteCache:
     """
     股票行情缓存服务（单例，对外暴露 get_quotes_batch）
@@ -145,14 +234,19 @@ class StockQuoteCache:
 
         quotes = await stock_quote_cache.get_quotes_batch(['000001.SZ', '600519.SH'])
         # quotes = { '000001.SZ': { name, price, pct_change }, ... }
+
+    实时行情同步每个周期调用一次 publish_snapshot()，发布全市场快照。
     """
 
     def __init__(self):
         self._repo = _QuoteRepository()
+        self._l1 = _L1QuoteCache(settings.CACHE_QUOTE_L1_MAX_ENTRIES)
+        self._listener_task: Optional[asyncio.Task] = None
+        self._code_map: Dict[str, str] = {}
 
     async def get_quotes_batch(self, ts_codes: List[str]) -> Dict[str, dict]:
         """
-        批量获取股票行情，优先走 Redis 缓存，未命中则查数据库并回填缓存。
+        批量获取股票行情：L1 -> Redis 快照 -> Redis 单键 -> 数据库（回填 Redis）。
 
         Args:
             ts_codes: ts_code 列表（去重后处理）
@@ -165,38 +259,50 @@ class StockQuoteCache:
         if not unique_codes:
             return {}
 
-        result: Dict[str, dict] = {}
-        miss: List[str] = []
+        self._ensure_listener()
+        generation = self._l1.generation
+
+        # 1. 进程内 L1
+        result: Dict[str, dict] = self._l1.get_many(unique_codes)
+        miss = [code for code in unique_codes if code not in result]
+        if not miss:
+            return result
+
+        fetched: Dict[str, dict] = {}
 
-        # 1. 并发读 Redis
-        cache_results = await asyncio.gather(
-            *[cache.get(f"{KEY_PREFIX}:{code}") for code in unique_codes],
-            return_exceptions=True
-        )
+        # 2. 全市场快照（一次 HMGET）
+        snapshot_values = await cache.hash_get_many(SNAPSHOT_KEY, miss)
+        for code, cached in zip(miss, snapshot_values):
+            if cached is not None:
+                fetched[code] = cached
+        miss = [code for code in miss if code not in fetched]
 
-        for code, cached in zip(unique_codes, cache_results):
-            if isinstance(cached, Exception) or cached is None:
-                miss.append(code)
-            else:
-                result[code] = cached
+        # 3. 单键缓存（一次 MGET）
+        if miss:
+            cached_values = await cache.get_many([f"{KEY_PREFIX}:{code}" for code in miss])
+            for code, cached in zip(miss, cached_values):
+                if cached is not None:
+                    fetched[code] = cached
+            miss = [code for code in miss if code not in fetched]
 
-        # 2. 未命中部分查数据库
+        # 4. 未命中部分查数据库
         if miss:
             db_data = await asyncio.to_thread(self._repo.get_quotes, miss)
 
             ttl = quote_ttl()
-            write_tasks = []
+            backfill = {}
             for code in miss:
                 quote = db_data.get(code, {"name": "", "price": None, "pct_change": None})
-                result[code] = quote
-                write_tasks.append(cache.set(f"{KEY_PREFIX}:{code}", quote, ttl))
+                fetched[code] = quote
+                backfill[f"{KEY_PREFIX}:{code}"] = quote
 
-            # 异步回填缓存，不阻塞返回
-            if write_tasks:
-                asyncio.create_task(_write_cache_background(write_tasks))
+            # 异步回填缓存（一次 pipeline），不阻塞返回
+            asyncio.create_task(_write_cache_background(backfill, ttl))
 
             logger.debug(f"StockQuoteCache miss {len(miss)} 条，TTL={ttl}s")
 
+        self._l1.put_many(fetched, quote_l1_ttl(), generation)
+        result.update(fetched)
         return result
 
     async def resolve_ts_code(self, user_input: str) -> Optional[str]:
@@ -245,7 +351,7 @@ class StockQuoteCache:
 
     def get_quotes_sync(self, ts_codes: List[str]) -> Dict[str, dict]:
         """
-        批量获取股票行情（同步版本，不走 Redis，直接查数据库）。
+        批量获取股票行情（同步版本，不走 Redis：L1 命中直接返回，其余查数据库）。
 
         用于 Service 在同步上下文中注入股票名称（如被 `asyncio.to_thread` 包围的同步方法，
         或已在后台线程中执行的任务）。调用方应自行决定是否用 `asyncio.to_thread` 包裹。
@@ -255,22 +361,168 @@ class StockQuoteCache:
         unique_codes = list(dict.fromkeys(ts_codes))
         if not unique_codes:
             return {}
-        return self._repo.get_quotes(unique_codes)
+        generation = self._l1.generation
+        result = self._l1.get_many(unique_codes)
+        miss = [code for code in unique_codes if code not in result]
+        if miss:
+            db_data = self._repo.get_quotes(miss)
+            self._l1.put_many(db_data, quote_l1_ttl(), generation)
+            result.update(db_data)
+        return result
 
-    async def invalidate(self, ts_codes: List[str]) -> None:
-        """主动失效指定股票的缓存（行情更新后调用）"""
-        for code in ts_codes:
-            await cache.delete(f"{KEY_PREFIX}:{code}")
+    async def publish_snapshot(self) -> int:
+        """
+        发布全市场行情快照（实时行情同步每个周期调用一次）。
 
-    async def invalidate_all(self) -> int:
-        """清空所有股票行情缓存"""
-        return await cache.delete_pattern(f"{KEY_PREFIX}:*")
+        一次查询读取全部行情，整体替换 Redis 快照 Hash，并广播让各 worker 清空 L1。
 
+        Returns:
+            快照中的股票数量；数据库无数据或 Redis 不可用时返回 0
+        """
+        quotes = await asyncio.to_thread(self._repo.get_all_quotes)
+        if not quotes:
+            return 0
+        if not await cache.hash_replace(SNAPSHOT_KEY, quotes, quote_ttl()):
+            return 0
+        self._l1.clear()
+        await cache.publish(INVALIDATE_CHANNEL, {"action": "snapshot"})
+        logger.debug(f"StockQuoteCache 发布行情快照 {len(quotes)} 条")
+        return len(quotes)
+
+    async def publish_quotes(self, quotes: List[dict]) -> int:
+        """
+        发布一批刚写库的实时行情（实时行情微批写入每次 flush 后调用）。
+
+        quotes 为数据源原始字段（纯代码 code），补全 ts_code 后写入快照 Hash，
+        并广播让各 worker 的 L1 丢弃这些股票，同步周期内即可读到最新行情。
+
+        Returns:
+            写入快照的股票数量
+        """
+        codes = list(dict.fromkeys(q.get('code') for q in quotes if q.get('code')))
+        if not codes:
+            return 0
+        code_map = await self._resolve_codes(codes)
+        entries = {
+            code_map[q['code']]: _provider_quote_to_cache(q)
+            for q in quotes if q.get('code') in code_map
+        }
+        if not entries:
+            return 0
+        if not await cache.hash_set_many(SNAPSHOT_KEY, entries, quote_ttl()):
+            return 0
+        ts_codes = list(entries)
+        self._l1.invalidate(ts_codes)
+        await cache.publish(INVALIDATE_CHANNEL, {"action": "invalidate", "codes": ts_codes})
+        return len(entries)
+
+    async def _resolve_codes(self, pure_codes: List[str]) -> Dict[str, str]:
+        """纯代码 -> ts_code（进程内记忆，交易所后缀极少变化）"""
+        missing = [c for c in pure_codes if c not in self._code_map]
+        if missing:
+            self._code_map.update(await asyncio.to_thread(self._repo.resolve_ts_codes, missing))
+        return {c: self._code_map[c] for c in pure_codes if c in self._code_map}
+
+    async def invalidate(self, ts_codes: List[str]) -> None:
+        """主动失效指定股票的缓存（行情更新后调用），并广播到所有 worker"""
+        codes = list(dict.fromkeys(ts_codes))
+        if not codes:
+            return
+        self._l1.invalidate(codes)
+        await cache.delete_many([f"{KEY_PREFIX}:{code}" for code in codes])
+        await cache.hash_delete(SNAPSHOT_KEY, codes)
+        await cache.publish(INVALIDATE_CHANNEL, {"action": "invalidate", "codes": codes})
 
-async def _write_cache_background(tasks):
+    async def invalidate_all(self) -> int:
+        """清空所有股票行情缓存（含快照），并广播到所有 worker"""
+        self._l1.clear()
+        deleted = await cache.delete_pattern(f"{KEY_PREFIX}:*")
+        await cache.publish(INVALIDATE_CHANNEL, {"action": "clear"})
+        return deleted
+
+    # ==================== 失效广播 ====================
+
+    def _handle_message(self, message: dict) -> None:
+        """处理失效广播（本 worker 发出的消息也会收到，重复清理无副作用）"""
+        action = message.get("action") if isinstance(message, dict) else None
+        if action == "invalidate":
+            self._l1.invalidate(message.get("codes") or [])
+        elif action in ("clear", "snapshot"):
+            self._l1.clear()
+
+    def _ensure_listener(self) -> None:
+        """在当前事件循环中懒启动失效订阅任务（每个 worker 一个）"""
+        if not settings.REDIS_ENABLED:
+            return
+        task = self._listener_task
+        loop = asyncio.get_running_loop()
+        # 同一事件循环内只启动一次（_listen 自行重连，正常结束说明 Redis 不可用）
+        if task is not None and task.get_loop() is loop:
+            return
+        self._listener_task = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """订阅失效频道；连接断开后清空 L1（期间可能漏掉消息）并重连"""
+        while True:
+            pubsub = None
+            try:
+                pubsub = await cache.subscribe(INVALIDATE_CHANNEL)
+                if pubsub is None:
+                    return  # Redis 不可用，L1 仅靠 TTL 过期
+                async for raw in pubsub.listen():
+                    if raw.get("type") == "message":
+                        self._handle_message(cache._loads(raw.get("data")))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"StockQuoteCache 失效订阅中断，5 秒后重连: {e}")
+                self._l1.clear()
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+
+def _to_number(value, cast=float):
+    """数据源数值（可能为字符串 / NaN / '-'）转换为 JSON 可序列化的数字，无效时为 None"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if number != number or number in (float('inf'), float('-inf')):
+        return None
+    return cast(number)
+
+
+def _provider_quote_to_cache(quote: dict) -> dict:
+    """数据源实时行情 -> 缓存行情格式（字段同 _QuoteRepository.get_quotes）"""
+    latest_price = _to_number(quote.get('latest_price'))
+    return {
+        "name":          quote.get('name') or "",
+        "latest_price":  latest_price,
+        "pct_change":    _to_number(quote.get('pct_change')),
+        "change_amount": _to_number(quote.get('change_amount')),
+        "open":          _to_number(quote.get('open')),
+        "high":          _to_number(quote.get('high')),
+        "low":           _to_number(quote.get('low')),
+        "pre_close":     _to_number(quote.get('pre_close')),
+        "volume":        _to_number(quote.get('volume'), int),
+        "amount":        _to_number(quote.get('amount')),
+        "turnover":      _to_number(quote.get('turnover')),
+        "amplitude":     _to_number(quote.get('amplitude')),
+        "trade_time":    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        # 兼容旧字段名
+        "price":         latest_price,
+    }
+
+
+async def _write_cache_background(mapping: Dict[str, dict], ttl: int):
     """后台批量写缓存，捕获异常不影响主流程"""
     try:
-        await asyncio.gather(*tasks, return_exceptions=True)
+        await cache.set_many(mapping, ttl)
     except Exception as e:
         logger.warning(f"StockQuoteCache 后台写缓存失败: {e}")
 
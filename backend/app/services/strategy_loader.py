@@ -7,6 +7,7 @@
 功能:
 - 从数据库记录动态加载策略实例
 - 代码哈希验证（SHA-256）
+- 已编译策略类进程内 LRU 缓存（按 code_hash 复用，策略更新后失效）
 - 安全的命名空间隔离
 - 支持自定义配置参数覆盖
 - 选股策略执行：构建全市场价格 DataFrame，调用 calculate_scores()，返回 top-N 股票代码
@@ -14,13 +15,16 @@
 import sys
 import asyncio
 import hashlib
-import inspect
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 from loguru import logger
 
 
+from app.core.config import settings
+
 # 添加 core 路径
 if Path("/app/core").exists():
     core_path = Path("/app/core")
@@ -31,12 +35,76 @@ if str(core_path) not in sys.path:
     sys.path.insert(0, str(core_path))
 
 
+class _CompiledStrategyCache:
+    """
+    已编译策略类的进程内 LRU 缓存
+
+    键为 (code_hash, strategy_type, class_name)，值保存源码、编译后的代码对象和策略类。
+    命中时还要求源码完全一致，code_hash 与代码不同步（旧版本哈希）时按未命中处理，
+    不会返回过期的类。策略更新 / 删除后按策略 ID 失效。
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[str, str, str], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple[str, str, str], code: str) -> Optional[type]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != code:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: Tuple[str, str, str], code: str, code_obj, strategy_class: type,
+            strategy_id: Optional[int]) -> None:
+        with self._lock:
+            self._entries[key] = (code, code_obj, strategy_class, strategy_id)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, strategy_id: int) -> int:
+        """删除某个策略的全部缓存项，返回删除数量"""
+        with self._lock:
+            keys = [k for k, entry in self._entries.items() if entry[3] == strategy_id]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+_class_cache = _CompiledStrategyCache(settings.STRATEGY_CLASS_CACHE_SIZE)
+
+
 class StrategyDynamicLoader:
     """
     策略动态加载器
 
     从数据库记录中动态加载策略，支持入场策略和离场策略。
-    使用 exec() 执行策略代码并实例化策略类。
+    使用 exec() 执行策略代码并实例化策略类，编译结果按 code_hash 缓存在进程内。
     """
 
     @staticmethod
@@ -64,8 +132,64 @@ class StrategyDynamicLoader:
         Raises:
             ValueError: 代码哈希不匹配、策略类未找到等
         """
-        # 1. 验证代码哈希
+        strategy_type = strategy_record['strategy_type']
+        strategy_class = StrategyDynamicLoader._get_strategy_class(strategy_record)
+
+        # 合并配置（默认参数 + 自定义配置）
+        default_params = strategy_record.get('default_params', {})
+
+        # 处理JSON字符串格式的参数
+        if isinstance(default_params, str):
+            import json
+            try:
+                default_params = json.loads(default_params) if default_params else {}
+            except json.JSONDecodeError:
+                logger.warning(f"解析default_params失败: {default_params}")
+                default_params = {}
+
+        # 自定义配置覆盖默认参数
+        final_config = default_params.copy() if default_params else {}
+        if custom_config:
+            final_config.update(custom_config)
+
+        # 实例化策略
+        try:
+            if strategy_type in ['entry', 'stock_selection']:
+                # 入场策略：需要 name 和 config 参数
+                strategy = strategy_class(
+                    name=strategy_record['name'],
+                    config=final_config
+                )
+            elif strategy_type == 'exit':
+                # 离场策略：直接传参数
+                strategy = strategy_class(**final_config)
+            else:
+                raise ValueError(f"未知策略类型: {strategy_type}")
+
+            logger.info(
+                f"✓ 成功加载策略: {strategy_record['display_name']} "
+                f"(ID={strategy_record['id']}, Type={strategy_type})"
+            )
+
+            return strategy
+
+        except Exception as e:
+            logger.error(f"实例化策略失败: {e}", exc_info=True)
+            raise ValueError(f"策略实例化失败: {str(e)}")
+
+    @staticmethod
+    def _get_strategy_class(strategy_record: Dict) -> type:
+        """获取策略类：命中缓存直接返回，否则编译执行策略代码并写入缓存"""
         code = strategy_record['code']
+        strategy_type = strategy_record['strategy_type']
+        class_name = strategy_record['class_name']
+        key = (strategy_record.get('code_hash') or '', strategy_type, class_name)
+
+        strategy_class = _class_cache.get(key, code)
+        if strategy_class is not None:
+            return strategy_class
+
+        # 1. 验证代码哈希
         expected_hash = strategy_record['code_hash']
         actual_hash = hashlib.sha256(code.encode()).hexdigest()[:16]
 
@@ -75,7 +199,29 @@ class StrategyDynamicLoader:
                 f"代码哈希不匹配: expected={expected_hash}, actual={actual_hash}"
             )
 
-        # 2. 准备命名空间（隔离执行环境，预导入常用模块）
+        # 2. 准备命名空间
+        namespace = StrategyDynamicLoader._build_namespace(strategy_type)
+
+        # 3. 编译并执行代码
+        try:
+            code_obj = compile(code, f"<strategy:{strategy_record.get('id')}>", 'exec')
+            exec(code_obj, namespace)
+        except Exception as e:
+            logger.error(f"执行策略代码失败: {e}", exc_info=True)
+            raise ValueError(f"策略代码执行失败: {str(e)}")
+
+        # 4. 获取策略类
+        strategy_class = namespace.get(class_name)
+
+        if not strategy_class:
+            raise ValueError(f"策略类未找到: {class_name}")
+
+        _class_cache.put(key, code, code_obj, strategy_class, strategy_record.get('id'))
+        return strategy_class
+
+    @staticmethod
+    def _build_namespace(strategy_type: str) -> Dict[str, Any]:
+        """准备策略代码执行的命名空间（隔离执行环境，预导入常用模块）"""
         import pandas as pd
         import numpy as np
         import types
@@ -115,9 +261,7 @@ class StrategyDynamicLoader:
             'List': __import__('typing').List,
         }
 
-        # 3. 根据策略类型导入依赖
-        strategy_type = strategy_record['strategy_type']
-
+        # 根据策略类型导入依赖
         if strategy_type == 'entry' or strategy_type == 'stock_selection':
             # 入场策略/选股策略
             from src.strategies.base_strategy import BaseStrategy
@@ -143,61 +287,20 @@ class StrategyDynamicLoader:
         else:
             raise ValueError(f"不支持的策略类型: {strategy_type}")
 
-        # 4. 执行代码
-        try:
-            exec(code, namespace)
-        except Exception as e:
-            logger.error(f"执行策略代码失败: {e}", exc_info=True)
-            raise ValueError(f"策略代码执行失败: {str(e)}")
-
-        # 5. 获取策略类
-        class_name = strategy_record['class_name']
-        strategy_class = namespace.get(class_name)
-
-        if not strategy_class:
-            raise ValueError(f"策略类未找到: {class_name}")
-
-        # 6. 合并配置（默认参数 + 自定义配置）
-        default_params = strategy_record.get('default_params', {})
-
-        # 处理JSON字符串格式的参数
-        if isinstance(default_params, str):
-            import json
-            try:
-                default_params = json.loads(default_params) if default_params else {}
-            except json.JSONDecodeError:
-                logger.warning(f"解析default_params失败: {default_params}")
-                default_params = {}
+        return namespace
 
-        # 自定义配置覆盖默认参数
-        final_config = default_params.copy() if default_params else {}
-        if custom_config:
-            final_config.update(custom_config)
-
-        # 7. 实例化策略
-        try:
-            if strategy_type in ['entry', 'stock_selection']:
-                # 入场策略：需要 name 和 config 参数
-                strategy = strategy_class(
-                    name=strategy_record['name'],
-                    config=final_config
-                )
-            elif strategy_type == 'exit':
-                # 离场策略：直接传参数
-                strategy = strategy_class(**final_config)
-            else:
-                raise ValueError(f"未知策略类型: {strategy_type}")
-
-            logger.info(
-                f"✓ 成功加载策略: {strategy_record['display_name']} "
-                f"(ID={strategy_record['id']}, Type={strategy_type})"
-            )
-
-            return strategy
+    @staticmethod
+    def invalidate_cache(strategy_id: int) -> int:
+        """策略更新 / 删除后使其已编译类失效，返回删除的缓存项数量"""
+        removed = _class_cache.invalidate(strategy_id)
+        if removed:
+            logger.debug(f"策略类缓存已失效: strategy_id={strategy_id}, 删除 {removed} 项")
+        return removed
 
-        except Exception as e:
-            logger.error(f"实例化策略失败: {e}", exc_info=True)
-            raise ValueError(f"策略实例化失败: {str(e)}")
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        """已编译策略类缓存的命中统计"""
+        return _class_cache.stats()
 
     @staticmethod
     def load_exit_manager(exit_strategy_ids: List[int], repo):
@@ -218,10 +321,12 @@ class StrategyDynamicLoader:
 
         exit_strategies = []
 
+        # 一次 WHERE id = ANY 查询取回全部离场策略记录
+        records = repo.get_by_ids(exit_strategy_ids)
+
         for exit_id in exit_strategy_ids:
             try:
-                # 从数据库读取策略记录
-                exit_record = repo.get_by_id(exit_id)
+                exit_record = records.get(exit_id)
 
                 if not exit_record:
                     logger.warning(f"离场策略不存在: ID={exit_id}")
@@ -270,7 +375,7 @@ class StrategyDynamicLoader:
         1. 加载策略实例
         2. 从 stock_daily 获取近 lookback_days 天收盘价和成交量
         3. 系统层数据清洗（过滤非交易日、补齐停牌 NaN、剔除覆盖率不足的股票）
-        4. 调用 strategy.calculate_scores(prices, features, {})
+        4. 调用 strategy.calculate_scores(prices, features, {})（默认在沙箱进程池中执行）
            - prices : 收盘价矩阵（index=交易日, columns=ts_code）
            - features: 成交量矩阵（同结构），供策略计算量价因子
         5. 过滤评分 <= 0 的股票，按评分降序返回
@@ -298,7 +403,12 @@ class StrategyDynamicLoader:
                 f"实际类型: {strategy_record.get('strategy_type')}"
             )
 
-        strategy = StrategyDynamicLoader.load_strategy(strategy_record)
+        from app.core.config import settings
+        from app.services.strategy_sandbox import accepts_fundamentals, run_scores_in_sandbox
+
+        # 沙箱模式下策略代码只在沙箱进程中编译执行，API 进程不 exec 用户代码
+        sandboxed = settings.STRATEGY_SANDBOX_ENABLED
+        strategy = None if sandboxed else StrategyDynamicLoader.load_strategy(strategy_record)
 
         # 计算日期范围（多取 10 天缓冲以覆盖非交易日）
         end_date = datetime.now().strftime("%Y%m%d")
@@ -385,25 +495,10 @@ class StrategyDynamicLoader:
             import pandas as _pd
             fundamentals = _pd.DataFrame()
 
-        # 签名检测：区分新老策略接口。老策略 (prices, features, date) 3 参数，
-        # 新策略 (prices, features, date, fundamentals) 4 参数。
-        try:
-            sig = inspect.signature(strategy.calculate_scores)
-            n_positional = sum(
-                1 for p in sig.parameters.values()
-                if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD,
-                              inspect.Parameter.POSITIONAL_ONLY)
-            )
-            accepts_fundamentals = (
-                n_positional >= 4
-                or any(p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values())
-                or 'fundamentals' in sig.parameters
-            )
-        except (TypeError, ValueError):
-            accepts_fundamentals = False
-
         try:
-            if accepts_fundamentals:
+            if sandboxed:
+                scores = await run_scores_in_sandbox(strategy_record, prices, features, fundamentals)
+            elif accepts_fundamentals(strategy):
                 scores = await asyncio.to_thread(
                     strategy.calculate_scores, prices, features, {}, fundamentals
                 )
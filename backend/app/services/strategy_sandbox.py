@@ -0,0 +1,132 @@
+"""
+用户策略沙箱执行
+
+选股策略的 calculate_scores 由 core 的 SandboxWorkerPool 在独立进程中执行：
+- 策略代码只在沙箱进程中 exec，按代码哈希常驻，重复评分无编译开销
+- 价格 / 成交量面板经共享内存传入
+- CPU / 内存 / 墙钟限制为真实的进程级限制，超限只影响该沙箱进程
+
+进程池按 API 进程懒创建（首次使用时预启动全部沙箱进程），应用关闭时 shutdown。
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import threading
+from typing import Any, Dict, Optional
+
+import pandas as pd
+from loguru import logger
+
+from app.core.config import settings
+
+_pool = None
+_pool_lock = threading.Lock()
+
+LOADER = "app.services.strategy_sandbox:load_strategy"
+SCORE_ENTRY = "app.services.strategy_sandbox:score_stock_selection"
+
+
+def get_sandbox_pool():
+    """进程内共享的沙箱进程池（懒创建）"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                from src.strategies.security.sandbox_pool import SandboxLimits, SandboxWorkerPool
+
+                _pool = SandboxWorkerPool(
+                    workers=settings.STRATEGY_SANDBOX_WORKERS or None,
+                    max_calls_per_worker=settings.STRATEGY_SANDBOX_MAX_CALLS,
+                    limits=SandboxLimits(
+                        max_cpu_time=settings.STRATEGY_SANDBOX_CPU_SECONDS,
+                        max_memory_mb=settings.STRATEGY_SANDBOX_MEMORY_MB,
+                        max_wall_time=settings.STRATEGY_SANDBOX_WALL_SECONDS,
+                    ),
+                    preload=("numpy", "pandas", "app.services.strategy_sandbox"),
+                ).start()
+    return _pool
+
+
+def shutdown_sandbox_pool() -> None:
+    """关闭沙箱进程池（应用关闭时调用）"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def strategy_cache_key(strategy_record: Dict[str, Any]) -> str:
+    """沙箱内策略缓存键：代码哈希 + 默认参数（参数变化需重新实例化）"""
+    params = json.dumps(strategy_record.get("default_params") or {}, sort_keys=True, default=str)
+    digest = hashlib.sha256(f"{strategy_record['code']}\0{params}".encode()).hexdigest()[:16]
+    return f"{strategy_record.get('id')}:{digest}"
+
+
+# ==================== 沙箱进程内执行 ====================
+
+def load_strategy(strategy_record: Dict[str, Any]):
+    """沙箱 loader：编译并实例化策略（在沙箱进程中执行）"""
+    from app.services.strategy_loader import StrategyDynamicLoader
+
+    return StrategyDynamicLoader.load_strategy(strategy_record)
+
+
+def accepts_fundamentals(strategy) -> bool:
+    """
+    签名检测：区分新老策略接口。老策略 (prices, features, date) 3 参数，
+    新策略 (prices, features, date, fundamentals) 4 参数。
+    """
+    try:
+        sig = inspect.signature(strategy.calculate_scores)
+    except (TypeError, ValueError):
+        return False
+    n_positional = sum(
+        1 for p in sig.parameters.values()
+        if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                      inspect.Parameter.POSITIONAL_ONLY)
+    )
+    return (
+        n_positional >= 4
+        or any(p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values())
+        or 'fundamentals' in sig.parameters
+    )
+
+
+def score_stock_selection(strategy, prices: pd.DataFrame, features: pd.DataFrame,
+                          fundamentals: Optional[pd.DataFrame] = None):
+    """沙箱 entry：调用 calculate_scores（在沙箱进程中执行）"""
+    if accepts_fundamentals(strategy):
+        return strategy.calculate_scores(prices, features, {}, fundamentals)
+    return strategy.calculate_scores(prices, features, {})
+
+
+# ==================== API 进程调用 ====================
+
+async def run_scores_in_sandbox(
+    strategy_record: Dict[str, Any],
+    prices: pd.DataFrame,
+    features: pd.DataFrame,
+    fundamentals: Optional[pd.DataFrame] = None,
+):
+    """
+    在沙箱进程中执行选股策略评分
+
+    Raises:
+        ResourceLimitError: 超出 CPU / 内存 / 墙钟限制
+        StrategyExecutionError: 策略代码异常
+    """
+    pool = await asyncio.to_thread(get_sandbox_pool)
+    key = strategy_cache_key(strategy_record)
+    logger.debug(f"沙箱执行选股策略: id={strategy_record.get('id')}, key={key}")
+    return await asyncio.to_thread(
+        pool.run,
+        key,
+        LOADER,
+        (strategy_record,),
+        SCORE_ENTRY,
+        (prices, features),
+        {"fundamentals": fundamentals},
+    )
@@ -0,0 +1,178 @@
+"""
+同步覆盖索引与切片规划
+
+按表构建 trade_date → 行数 的覆盖索引，与交易日历比对，
+判断每个切片（月 / 周 / 季 / 日）是否需要重新拉取：
+
+- 切片内无交易日（周末、长假）→ 跳过
+- 交易日行数为 0 → 缺失
+- 行数低于邻近交易日中位数 × suspect_ratio → 可疑（部分入库）
+- sync_history 中成功同步过、且同步时已收盘（早于该次 data_end_date）的交易日 → 已确认，
+  行数为 0 也不再拉取（如港股休市日的北向数据）；确认只豁免缺失，可疑日仍重新拉取
+- 最近若干交易日 / 增量回看窗口内的交易日 → 待刷新，不论行数一律重新拉取
+  （上游会修订近期数据，回看窗口的意义就是覆盖这些修订）
+
+切片内所有交易日均完整时跳过，否则整片重新拉取（upsert 幂等）。
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from app.repositories.sync_coverage_repository import SyncCoverageRepository
+from app.repositories.trading_calendar_repository import TradingCalendarRepository
+
+COMPLETE = 'complete'
+MISSING = 'missing'
+SUSPECT = 'suspect'
+RECENT = 'recent'
+
+# 计算「正常行数」时参考的邻近交易日窗口
+TYPICAL_COUNT_WINDOW = 21
+
+
+@dataclass
+class CoverageIndex:
+    """单表覆盖索引"""
+
+    table_key: str
+    trading_days: List[str]
+    counts: Dict[str, int]
+    confirmed_ranges: List[Tuple[str, str]] = field(default_factory=list)
+    suspect_ratio: float = 0.5
+
+    def __post_init__(self):
+        self.trading_days = sorted(self.trading_days)
+        self._status = self._classify()
+
+    def _classify(self) -> Dict[str, str]:
+        """逐交易日判定覆盖状态"""
+        if not self.trading_days:
+            return {}
+        counts = pd.Series(
+            [self.counts.get(d, 0) for d in self.trading_days],
+            index=self.trading_days,
+            dtype='float64',
+        )
+        # 邻近交易日非零行数中位数（截面规模随年份变化，不能用全局中位数）
+        typical = counts.where(counts > 0).rolling(
+            TYPICAL_COUNT_WINDOW, center=True, min_periods=1
+        ).median()
+
+        status = {}
+        for day, count, normal in zip(self.trading_days, counts.values, typical.values):
+            if count <= 0:
+                status[day] = COMPLETE if self._is_confirmed(day) else MISSING
+            elif pd.notna(normal) and count < normal * self.suspect_ratio:
+                status[day] = SUSPECT
+            else:
+                status[day] = COMPLETE
+        return status
+
+    def _is_confirmed(self, day: str) -> bool:
+        return any(start <= day < end for start, end in self.confirmed_ranges)
+
+    def refresh_recent(self, recent_days: int = 0, refresh_from: Optional[str] = None) -> None:
+        """
+        将末尾 recent_days 个交易日及 refresh_from 起的交易日标记为待刷新。
+
+        Args:
+            recent_days: 末尾交易日个数（0 不标记）
+            refresh_from: 回看窗口起点 YYYYMMDD（None 不标记）
+        """
+        starts = []
+        if recent_days > 0 and self.trading_days:
+            starts.append(self.trading_days[-min(recent_days, len(self.trading_days))])
+        if refresh_from:
+            starts.append(refresh_from)
+        if not starts:
+            return
+        boundary = min(starts)
+        for day in self.trading_days:
+            if day >= boundary:
+                self._status[day] = RECENT
+
+    def status(self, day: str) -> str:
+        """交易日覆盖状态；非交易日视为完整"""
+        return self._status.get(day, COMPLETE)
+
+    def incomplete_days(self, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[str]:
+        """区间内缺失、可疑或待刷新的交易日（升序）"""
+        return [
+            d for d in self.trading_days
+            if (start_date is None or d >= start_date)
+            and (end_date is None or d <= end_date)
+            and self._status[d] != COMPLETE
+        ]
+
+    def is_segment_complete(self, start_date: str, end_date: str) -> bool:
+        return not self.incomplete_days(start_date, end_date)
+
+    def plan(
+        self, segments: Sequence[Tuple[str, str]]
+    ) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """
+        切片规划。
+
+        Returns:
+            (pending, covered)：需要拉取的切片 / 已完整可跳过的切片，均保持原顺序
+        """
+        pending, covered = [], []
+        for segment in segments:
+            (covered if self.is_segment_complete(*segment) else pending).append(segment)
+        return pending, covered
+
+    def summary(self) -> Dict[str, int]:
+        """各状态交易日数量"""
+        result = {COMPLETE: 0, MISSING: 0, SUSPECT: 0, RECENT: 0}
+        for value in self._status.values():
+            result[value] += 1
+        return result
+
+
+def resolve_table_name(upsert_fn) -> Optional[str]:
+    """从 Repository.bulk_upsert 等绑定方法推断业务表名"""
+    owner = getattr(upsert_fn, '__self__', None)
+    return getattr(owner, 'TABLE_NAME', None)
+
+
+def build_coverage_index(
+    table_key: str,
+    table_name: str,
+    date_column: str,
+    start_date: str,
+    end_date: str,
+    suspect_ratio: float = 0.5,
+    coverage_repo: Optional[SyncCoverageRepository] = None,
+    calendar_repo: Optional[TradingCalendarRepository] = None,
+) -> CoverageIndex:
+    """
+    构建覆盖索引（同步调用，调用方通过 asyncio.to_thread 执行）。
+
+    Args:
+        table_key: sync_configs / sync_history 的表键
+        table_name: 业务表名
+        date_column: 日期列名
+        start_date / end_date: 规划区间 YYYYMMDD
+
+    Raises:
+        数据库异常（如表无该日期列）原样抛出，由调用方决定是否退回全量拉取
+    """
+    coverage_repo = coverage_repo or SyncCoverageRepository()
+    calendar_repo = calendar_repo or TradingCalendarRepository()
+
+    trading_days = calendar_repo.get_trading_days_between(start_date, end_date)
+    counts = coverage_repo.get_date_counts(table_name, date_column, start_date, end_date)
+    confirmed = coverage_repo.get_confirmed_ranges(table_key, start_date, end_date)
+
+    index = CoverageIndex(
+        table_key=table_key,
+        trading_days=[str(d).replace('-', '')[:8] for d in trading_days],
+        counts=counts,
+        confirmed_ranges=confirmed,
+        suspect_ratio=suspect_ratio,
+    )
+    logger.debug(f"[coverage:{table_key}] {start_date}~{end_date} {index.summary()}")
+    return index
@@ -0,0 +1,5 @@
+"""全市场技术指标快照模块：夜间面板向量化计算 + O(1) 读取 + 指标状态筛选。"""
+
+from app.services.technical_snapshot.technical_snapshot_service import TechnicalSnapshotService
+
+__all__ = ["TechnicalSnapshotService"]
@@ -0,0 +1,269 @@
+"""全市场面板技术指标（纯计算，无 IO）
+
+所有函数的输入都是宽表面板（index=交易日，columns=ts_code），
+一次 pandas/numpy 向量化运算同时得到全市场每只股票的指标序列，
+替代逐股票调用 MacdAnalysisService / RsiAnalysisService 等服务时的 Python 循环。
+
+口径与单股票分析服务保持一致：
+- MACD：EMA12/EMA26/DEA9，adjust=False，柱体 = (DIF-DEA)*2
+- RSI：简单移动平均涨跌幅（与 RsiAnalysisService._calc_rsi_series 相同）
+- 布林线：20 日均值 ± 2 倍样本标准差
+- 背离：最近 60 根 K 线内，最近一组「间距 ≥ 5、幅度 ≥ 1%」的相邻局部极值
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+# 状态编码（snapshot 表以 SMALLINT 存储，便于索引筛选）
+CROSS_GOLDEN = 2        # 当根 K 线金叉（DIF 上穿 DEA）
+CROSS_ABOVE = 1         # 维持 DIF > DEA
+CROSS_BELOW = -1        # 维持 DIF < DEA
+CROSS_DEATH = -2        # 当根 K 线死叉（DIF 下穿 DEA）
+
+ZERO_AXIS_ABOVE = 1
+ZERO_AXIS_NEAR = 0
+ZERO_AXIS_BELOW = -1
+
+DIVERGENCE_BOTTOM = 1
+DIVERGENCE_NONE = 0
+DIVERGENCE_TOP = -1
+
+# 与 MacdAnalysisService._detect_divergence 保持一致
+DIVERGENCE_WINDOW = 60
+DIVERGENCE_MIN_GAP = 5
+DIVERGENCE_MIN_PCT = 0.01
+
+
+def resample_panel(panels: Dict[str, pd.DataFrame], freq: str) -> Dict[str, pd.DataFrame]:
+    """将日线面板重采样为周线（'W'）/ 月线（'ME'）面板。
+
+    与 MacdAnalysisService._resample_ohlcv 的聚合口径相同；停牌周期整列为 NaN，
+    dropna 按「全市场都没有数据」的行剔除，单只股票的空档保留为 NaN。
+    """
+    agg = {
+        'open': 'first',
+        'high': 'max',
+        'low': 'min',
+        'close': 'last',
+        'volume': 'sum',
+    }
+    out: Dict[str, pd.DataFrame] = {}
+    for field, how in agg.items():
+        if field not in panels:
+            continue
+        resampled = getattr(panels[field].resample(freq), how)()
+        if how == 'sum':
+            # sum 会把全 NaN 的周期变成 0，需要按 close 的缺失位置还原
+            close_last = panels['close'].resample(freq).last()
+            resampled = resampled.where(close_last.notna())
+        out[field] = resampled
+    valid_rows = out['close'].notna().any(axis=1)
+    return {k: v.loc[valid_rows] for k, v in out.items()}
+
+
+def macd_panel(close: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """计算 DIF / DEA / 柱体面板。"""
+    ema12 = close.ewm(span=12, adjust=False).mean()
+    ema26 = close.ewm(span=26, adjust=False).mean()
+    dif = ema12 - ema26
+    dea = dif.ewm(span=9, adjust=False).mean()
+    bar = (dif - dea) * 2
+    # ewm 会把停牌后的值向前延续，只保留有收盘价的位置
+    mask = close.notna()
+    return {'dif': dif.where(mask), 'dea': dea.where(mask), 'bar': bar.where(mask)}
+
+
+def last_valid_row(panel: pd.DataFrame) -> pd.Series:
+    """每列最后一个非空值（股票停牌时取停牌前最后一根）。"""
+    return panel.ffill().iloc[-1] if len(panel) else pd.Series(dtype=float)
+
+
+def cross_state(dif: pd.DataFrame, dea: pd.DataFrame) -> pd.Series:
+    """每只股票最新一根 K 线的交叉状态编码（CROSS_*）。"""
+    diff = (dif - dea)
+    last = _last_two(diff)
+    cur, prev = last['cur'], last['prev']
+    state = pd.Series(np.where(cur > 0, CROSS_ABOVE, CROSS_BELOW), index=cur.index, dtype=float)
+    state[(cur > 0) & (prev <= 0)] = CROSS_GOLDEN
+    state[(cur < 0) & (prev >= 0)] = CROSS_DEATH
+    state[cur.isna() | prev.isna()] = np.nan
+    return state
+
+
+def zero_axis_state(dif: pd.DataFrame, dea: pd.DataFrame) -> pd.Series:
+    """零轴位置编码，阈值口径同 MacdAnalysisService._compute_macd_status。"""
+    last_dif = last_valid_row(dif)
+    last_dea = last_valid_row(dea)
+    threshold = np.maximum(last_dif.abs(), last_dea.abs()) * 0.1 + 0.01
+    state = pd.Series(ZERO_AXIS_NEAR, index=last_dif.index, dtype=float)
+    state[(last_dif > threshold) & (last_dea > threshold)] = ZERO_AXIS_ABOVE
+    state[(last_dif < -threshold) & (last_dea < -threshold)] = ZERO_AXIS_BELOW
+    state[last_dif.isna()] = np.nan
+    return state
+
+
+def divergence_state(close: pd.DataFrame, dif: pd.DataFrame,
+                     zero_axis: pd.Series) -> pd.Series:
+    """MACD 顶/底背离编码（DIVERGENCE_*）。
+
+    逐行扫描最近 60 根 K 线（循环次数固定为 60，与股票数无关），
+    每行对全市场做一次向量化比较，等价于单股票版本从后往前取
+    「最近一组满足间距/幅度约束的相邻极值」再判定。
+    """
+    window = min(DIVERGENCE_WINDOW, len(close))
+    result = pd.Series(DIVERGENCE_NONE, index=close.columns, dtype=float)
+    if window < DIVERGENCE_WINDOW:
+        return result
+
+    c = close.iloc[-window:].to_numpy(dtype=float)
+    d = dif.iloc[-window:].reindex(columns=close.columns).to_numpy(dtype=float)
+    # 数据不足 60 根的股票与单股票服务一致：不判定背离
+    enough = ~np.isnan(c).any(axis=0)
+
+    is_high = _local_extreme(c, np.greater)
+    is_low = _local_extreme(c, np.less)
+
+    top = _scan_latest_pair(c, d, is_high, price_up=True)
+    bottom = _scan_latest_pair(c, d, is_low, price_up=False)
+
+    za = zero_axis.reindex(close.columns).to_numpy(dtype=float)
+    check_top = za != ZERO_AXIS_BELOW
+    check_bottom = za != ZERO_AXIS_ABOVE
+
+    values = np.full(c.shape[1], DIVERGENCE_NONE, dtype=float)
+    values[enough & check_bottom & bottom] = DIVERGENCE_BOTTOM
+    # 单股票版本先判顶背离，命中即返回
+    values[enough & check_top & top] = DIVERGENCE_TOP
+    result[:] = values
+    return result
+
+
+def rsi_panel(close: pd.DataFrame, period: int) -> pd.DataFrame:
+    """RSI 面板（简单移动平均口径）。"""
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(period).mean()
+    loss = (-delta.clip(upper=0)).rolling(period).mean()
+    rs = gain / loss.replace(0, np.nan)
+    rsi = 100 - 100 / (1 + rs)
+    # loss 为 0 时 RSI = 100；gain 也为 NaN 说明窗口不足，保持 NaN
+    return rsi.where(loss != 0, 100.0).where(gain.notna())
+
+
+def boll_panel(close: pd.DataFrame, period: int = 20, std_dev: int = 2) -> Dict[str, pd.DataFrame]:
+    """布林线上/中/下轨、%B 与带宽面板。"""
+    middle = close.rolling(period).mean()
+    std = close.rolling(period).std()
+    upper = middle + std_dev * std
+    lower = middle - std_dev * std
+    width = upper - lower
+    percent_b = ((close - lower) / width.replace(0, np.nan)).fillna(0.5).where(middle.notna())
+    bandwidth = width / middle.replace(0, np.nan) * 100
+    return {
+        'upper': upper,
+        'middle': middle,
+        'lower': lower,
+        'percent_b': percent_b,
+        'bandwidth': bandwidth,
+    }
+
+
+def atr_panel(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame,
+              period: int = 14) -> pd.DataFrame:
+    """ATR 面板（真实波幅简单均值）。"""
+    prev_close = close.shift(1)
+    tr = np.maximum.reduce([
+        (high - low).to_numpy(dtype=float),
+        (high - prev_close).abs().to_numpy(dtype=float),
+        (low - prev_close).abs().to_numpy(dtype=float),
+    ])
+    tr = pd.DataFrame(tr, index=close.index, columns=close.columns)
+    return tr.rolling(period).mean()
+
+
+def ma_arrangement(mas: Dict[int, pd.Series]) -> pd.Series:
+    """均线排列编码：1 多头（5>10>20>60），-1 空头（5<10<20<60），0 交织。"""
+    ma5, ma10, ma20, ma60 = mas[5], mas[10], mas[20], mas[60]
+    bull = (ma5 > ma10) & (ma10 > ma20) & (ma20 > ma60)
+    bear = (ma5 < ma10) & (ma10 < ma20) & (ma20 < ma60)
+    state = pd.Series(0, index=ma5.index, dtype=float)
+    state[bull] = 1
+    state[bear] = -1
+    state[ma60.isna()] = np.nan
+    return state
+
+
+# ----------------------------------------------------------------------
+# 内部工具
+# ----------------------------------------------------------------------
+
+def _last_two(panel: pd.DataFrame) -> Dict[str, pd.Series]:
+    """每列最后两个非空值（处理停牌造成的尾部 NaN）。"""
+    arr = panel.to_numpy(dtype=float)
+    valid = ~np.isnan(arr)
+    n_rows = arr.shape[0]
+    # 每列最后一个有效行号
+    rev_idx = np.argmax(valid[::-1], axis=0)
+    has_any = valid.any(axis=0)
+    last_idx = n_rows - 1 - rev_idx
+    cols = np.arange(arr.shape[1])
+    cur = np.where(has_any, arr[last_idx, cols], np.nan)
+
+    # 屏蔽最后一个有效值后再找一次
+    valid_prev = valid.copy()
+    valid_prev[last_idx[has_any], cols[has_any]] = False
+    rev_idx2 = np.argmax(valid_prev[::-1], axis=0)
+    has_prev = valid_prev.any(axis=0)
+    prev_idx = n_rows - 1 - rev_idx2
+    prev = np.where(has_prev, arr[prev_idx, cols], np.nan)
+    return {
+        'cur': pd.Series(cur, index=panel.columns),
+        'prev': pd.Series(prev, index=panel.columns),
+    }
+
+
+def _local_extreme(c: np.ndarray, op) -> np.ndarray:
+    """局部极值掩码：严格大于（或小于）前后各两根 K 线，首尾两根不判定。"""
+    mask = np.zeros_like(c, dtype=bool)
+    if c.shape[0] < 5:
+        return mask
+    mid = c[2:-2]
+    with np.errstate(invalid='ignore'):
+        mask[2:-2] = (
+            op(mid, c[1:-3]) & op(mid, c[:-4])
+            & op(mid, c[3:-1]) & op(mid, c[4:])
+        )
+    return mask
+
+
+def _scan_latest_pair(c: np.ndarray, d: np.ndarray, is_extreme: np.ndarray,
+                      price_up: bool) -> np.ndarray:
+    """按行扫描极值点，记录每只股票最近一组有效相邻极值的背离判定。"""
+    n_cols = c.shape[1]
+    prev_idx = np.full(n_cols, -1)
+    prev_c = np.full(n_cols, np.nan)
+    prev_d = np.full(n_cols, np.nan)
+    verdict = np.zeros(n_cols, dtype=bool)
+
+    for t in range(c.shape[0]):
+        hit = is_extreme[t]
+        if not hit.any():
+            continue
+        has_prev = hit & (prev_idx >= 0)
+        gap_ok = (t - prev_idx) >= DIVERGENCE_MIN_GAP
+        with np.errstate(invalid='ignore', divide='ignore'):
+            pct_ok = ~((prev_c > 0) & (np.abs(c[t] - prev_c) / prev_c < DIVERGENCE_MIN_PCT))
+            if price_up:
+                diverged = (c[t] > prev_c) & (d[t] < prev_d)
+            else:
+                diverged = (c[t] < prev_c) & (d[t] > prev_d)
+        valid_pair = has_prev & gap_ok & pct_ok
+        verdict = np.where(valid_pair, diverged, verdict)
+
+        prev_idx = np.where(hit, t, prev_idx)
+        prev_c = np.where(hit, c[t], prev_c)
+        prev_d = np.where(hit, d[t], prev_d)
+
+    return verdict
@@ -0,0 +1,228 @@
+"""全市场技术指标快照 Service
+
+夜间一次性拉取全市场约 3 年日线，透视为 (交易日 × 股票) 面板后向量化计算：
+  - 均线 MA5/10/20/60/120 + 排列状态
+  - RSI7/14/21
+  - 布林线（上/中/下轨、%B、带宽）
+  - 日线 / 周线 / 月线 MACD（DIF/DEA/柱体 + 交叉状态 + 零轴位置）、日线背离
+  - ATR14、5 日量比、近 20 日价格区间分位
+结果写入 stock_technical_snapshot（主键 ts_code + trade_date），供：
+  - 单只股票最新指标数值 / 状态编码的 O(1) 查询（/technical-snapshot/{ts_code}）
+  - 全市场指标状态筛选（如「周线 MACD 金叉」「日线底背离 + RSI14 < 30」）
+
+设计原则：
+  计算与单股票分析服务（MacdAnalysisService 等）口径一致，
+  但不生成描述性文字——文字由分析服务基于完整序列生成，快照只存可筛选的数值与状态编码。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from app.repositories.stock_daily_repository import StockDailyRepository
+from app.repositories.technical_snapshot_repository import TechnicalSnapshotRepository
+from app.services.technical_snapshot import panel_indicators as pi
+
+
+# 回看约 3 年日历天：满足月线 MACD（≥35 根月 K）的稳定性，与 technical.py 单股票口径一致
+LOOKBACK_CALENDAR_DAYS = 900
+
+# 快照保留的交易日窗口（日历天）；更早的行在每次全量计算后清理
+RETENTION_CALENDAR_DAYS = 400
+
+# 与 MacdAnalysisService 一致：各级别至少 35 根 K 线才输出 MACD
+MIN_MACD_BARS = 35
+
+MA_PERIODS = (5, 10, 20, 60, 120)
+RSI_PERIODS = (7, 14, 21)
+
+
+def _to_db_value(v: Any) -> Any:
+    """numpy 标量转 Python 原生类型，NaN → None（psycopg2 无法适配 numpy 类型）。"""
+    if v is None:
+        return None
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return v
+    if f != f or f in (float('inf'), float('-inf')):
+        return None
+    return round(f, 4)
+
+
+class TechnicalSnapshotService:
+    """全市场技术指标快照计算与读取
+
+    使用方式：
+      svc = TechnicalSnapshotService()
+      await svc.recompute_latest()                 # 夜间任务：计算最新交易日全市场快照
+      await svc.recompute_latest(days=5)           # 回补最近 5 个交易日
+      await svc.get_snapshot('000001.SZ')          # 单只股票最新快照（O(1)）
+      await svc.screen(states={'w_cross': 2})      # 全市场筛选：周线当根金叉
+    """
+
+    def __init__(self) -> None:
+        self.repo = TechnicalSnapshotRepository()
+        self.daily_repo = StockDailyRepository()
+
+    # ========================================================================
+    # 外部入口（异步）
+    # ========================================================================
+
+    async def recompute_latest(self, days: int = 1,
+                               end_date: Optional[str] = None) -> Dict[str, Any]:
+        """计算并写入最近 N 个交易日的全市场快照。"""
+        return await asyncio.to_thread(self._recompute_sync, days, end_date)
+
+    async def get_snapshot(self, ts_code: str) -> Optional[Dict[str, Any]]:
+        """单只股票最新快照；快照缺失时返回 None，由调用方回退到现场计算。"""
+        if not ts_code:
+            return None
+        return await asyncio.to_thread(self.repo.get_latest_by_ts_code, ts_code)
+
+    async def get_snapshots(self, ts_codes: List[str],
+                            trade_date: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """批量读取指定交易日（默认最新）快照。"""
+        return await asyncio.to_thread(self.repo.get_by_ts_codes, ts_codes, trade_date)
+
+    async def screen(self, **kwargs) -> Dict[str, Any]:
+        """全市场指标状态筛选，参数见 TechnicalSnapshotRepository.screen。"""
+        items, total, trade_date = await asyncio.to_thread(self.repo.screen, **kwargs)
+        return {'items': items, 'total': total, 'trade_date': trade_date}
+
+    # ========================================================================
+    # 计算主流程（同步，在线程中执行）
+    # ========================================================================
+
+    def _recompute_sync(self, days: int, end_date: Optional[str]) -> Dict[str, Any]:
+        started = datetime.now()
+        end_dt = datetime.strptime(end_date, '%Y-%m-%d') if end_date else datetime.now()
+        start_dash = (end_dt - timedelta(days=LOOKBACK_CALENDAR_DAYS)).strftime('%Y-%m-%d')
+        end_dash = end_dt.strftime('%Y-%m-%d')
+
+        panels = self.daily_repo.get_market_panel(start_dash, end_dash)
+        if not panels or panels['close'].empty:
+            logger.warning(f"[technical_snapshot] {start_dash}~{end_dash} 无日线数据，跳过")
+            return {'trade_dates': [], 'rows': 0}
+
+        load_seconds = (datetime.now() - started).total_seconds()
+        trade_dates = list(panels['close'].index[-max(1, days):])
+
+        total_rows = 0
+        for trade_date in trade_dates:
+            sliced = {k: v.loc[:trade_date] for k, v in panels.items()}
+            rows = self.build_rows(sliced)
+            total_rows += self.repo.bulk_upsert(rows)
+
+        retention_cutoff = (end_dt - timedelta(days=RETENTION_CALENDAR_DAYS)).strftime('%Y-%m-%d')
+        purged = self.repo.delete_before(retention_cutoff)
+
+        elapsed = (datetime.now() - started).total_seconds()
+        result = {
+            'trade_dates': [d.strftime('%Y-%m-%d') for d in trade_dates],
+            'stocks': int(panels['close'].shape[1]),
+            'rows': total_rows,
+            'purged': purged,
+            'load_seconds': round(load_seconds, 2),
+            'elapsed_seconds': round(elapsed, 2),
+        }
+        logger.info(f"[technical_snapshot] 全市场快照完成: {result}")
+        return result
+
+    @classmethod
+    def build_rows(cls, panels: Dict[str, pd.DataFrame]) -> List[Tuple]:
+        """基于面板最后一行交易日生成快照元组（顺序同 TechnicalSnapshotRepository.COLUMNS）。"""
+        frame = cls.compute_snapshot_frame(panels)
+        if frame.empty:
+            return []
+        trade_date = panels['close'].index[-1].date()
+        columns = TechnicalSnapshotRepository.COLUMNS[2:]
+        rows = []
+        for ts_code, values in zip(frame.index, frame[list(columns)].to_numpy(dtype=float)):
+            rows.append((ts_code, trade_date, *(_to_db_value(v) for v in values)))
+        return rows
+
+    @classmethod
+    def compute_snapshot_frame(cls, panels: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """面板 → 快照表（index=ts_code，columns=快照列），只保留最后交易日有收盘价的股票。"""
+        close = panels['close']
+        high = panels['high']
+        low = panels['low']
+        volume = panels['volume']
+
+        last_close = close.iloc[-1]
+        active = last_close.notna()
+        if not active.any():
+            return pd.DataFrame()
+
+        out: Dict[str, pd.Series] = {'close': last_close}
+
+        # ---- 均线 ----
+        mas: Dict[int, pd.Series] = {}
+        for n in MA_PERIODS:
+            mas[n] = close.rolling(n).mean().iloc[-1]
+            out[f'ma{n}'] = mas[n]
+        out['ma_arrangement'] = pi.ma_arrangement(mas)
+
+        # ---- RSI ----
+        for n in RSI_PERIODS:
+            out[f'rsi{n}'] = pi.rsi_panel(close, n).iloc[-1]
+
+        # ---- 布林线 ----
+        boll = pi.boll_panel(close)
+        out['boll_upper'] = boll['upper'].iloc[-1]
+        out['boll_middle'] = boll['middle'].iloc[-1]
+        out['boll_lower'] = boll['lower'].iloc[-1]
+        out['boll_percent_b'] = boll['percent_b'].iloc[-1]
+        out['boll_bandwidth'] = boll['bandwidth'].iloc[-1]
+
+        # ---- 多级别 MACD ----
+        levels = {
+            'd': panels,
+            'w': pi.resample_panel(panels, 'W'),
+            'm': pi.resample_panel(panels, 'ME'),
+        }
+        for prefix, level_panels in levels.items():
+            out.update(cls._macd_columns(prefix, level_panels['close'], with_divergence=prefix == 'd'))
+
+        # ---- ATR / 量比 / 20 日区间 ----
+        atr = pi.atr_panel(high, low, close).iloc[-1]
+        out['atr14'] = atr
+        out['atr_pct'] = atr / last_close.replace(0, np.nan) * 100
+
+        vol_ma5_prev = volume.shift(1).rolling(5).mean().iloc[-1]
+        out['vol_ratio5'] = volume.iloc[-1] / vol_ma5_prev.replace(0, np.nan)
+
+        high_20 = high.rolling(20).max().iloc[-1]
+        low_20 = low.rolling(20).min().iloc[-1]
+        price_range = (high_20 - low_20).replace(0, np.nan)
+        out['high_20d'] = high_20
+        out['low_20d'] = low_20
+        out['percentile_20d'] = ((last_close - low_20) / price_range * 100).fillna(50.0).where(high_20.notna())
+
+        frame = pd.DataFrame(out)
+        return frame.loc[active[active].index]
+
+    @staticmethod
+    def _macd_columns(prefix: str, close: pd.DataFrame,
+                      with_divergence: bool) -> Dict[str, pd.Series]:
+        macd = pi.macd_panel(close)
+        # 每只股票在该级别的有效 K 线数不足 35 根时不输出（与单股票服务一致）
+        enough = close.notna().sum() >= MIN_MACD_BARS
+        zero_axis = pi.zero_axis_state(macd['dif'], macd['dea'])
+        cols = {
+            f'{prefix}_dif': pi.last_valid_row(macd['dif']),
+            f'{prefix}_dea': pi.last_valid_row(macd['dea']),
+            f'{prefix}_macd_bar': pi.last_valid_row(macd['bar']),
+            f'{prefix}_cross': pi.cross_state(macd['dif'], macd['dea']),
+            f'{prefix}_zero_axis': zero_axis,
+        }
+        if with_divergence:
+            cols[f'{prefix}_divergence'] = pi.divergence_state(close, macd['dif'], zero_axis)
+        return {k: v.where(enough) for k, v in cols.items()}
@@ -18,6 +18,7 @@ from loguru import logger
 from app.repositories.trading_calendar_repository import TradingCalendarRepository
 from app.repositories.sync_history_repository import SyncHistoryRepository
 from core.src.providers import DataProviderFactory
+from src.data.trading_calendar import get_trading_calendar
 from app.core.config import settings
 
 
@@ -197,6 +198,9 @@ class TradingCalendarService:
                 logger.info(f"✓ 交易日历同步完成 [{exch}]: {records} 条记录")
 
             logger.info(f"✓ 交易日历全部同步完成: {total_records} 条记录")
+            if total_records > 0:
+                # 刷新进程内交易日历索引（其他进程按索引有效期自动重新加载）
+                await asyncio.to_thread(get_trading_calendar().refresh)
             await asyncio.to_thread(
                 self.sync_history_repo.complete,
                 history_id, 'success', total_records, end_date, None,
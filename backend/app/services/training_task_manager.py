@@ -14,7 +14,6 @@ from loguru import logger
 
 from app.core.exceptions import BackendError
 from app.repositories.experiment_repository import ExperimentRepository
-from app.services.core_training import CoreTrainingService
 
 
 class TrainingTaskManager:
@@ -79,6 +78,18 @@ class TrainingTaskManager:
             # 其他未预期错误
             logger.error(f"保存元数据失败: {e}")
 
+    def register_models(self, entries: Dict[str, Dict[str, Any]]):
+        """
+        批量登记已训练完成的模型，只写一次元数据文件
+
+        Args:
+            entries: {model_id: 任务信息}
+        """
+        if not entries:
+            return
+        self.tasks.update(entries)
+        self._save_metadata()
+
     async def create_task(self, config: Dict[str, Any]) -> str:
         """
         创建训练任务
@@ -201,7 +212,9 @@ class TrainingTaskManager:
         task = self.tasks[task_id]
         config = task["config"]
 
-        # 使用 CoreTrainingService 统一训练流程
+        # 使用 CoreTrainingService 统一训练流程（延迟导入：core 训练栈导入耗时数秒，API 启动时不加载）
+        from app.services.core_training import CoreTrainingService
+
         core_service = CoreTrainingService()
 
         # 准备训练配置
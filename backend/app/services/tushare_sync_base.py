@@ -15,7 +15,14 @@ from typing import Callable, Dict, List, Optional, Tuple
 import pandas as pd
 from loguru import logger
 
+from app.services.adaptive_concurrency import (
+    AdaptiveConcurrencyController,
+    ProgressBuffer,
+    run_adaptive_queue,
+)
+from app.core.config import settings
 from app.services.extended_sync.base_sync_service import BaseSyncService
+from app.services.sync_coverage import CoverageIndex, build_coverage_index, resolve_table_name
 
 
 class TushareSyncBase(BaseSyncService):
@@ -27,6 +34,14 @@ class TushareSyncBase(BaseSyncService):
       - run_full_sync     — 全量同步入口（分发到 by_ts_code 或 by_date_range）
       - run_incremental_sync — 增量同步入口（含切片、翻页、sync_history 记录）
 
+    覆盖索引：按日期切片的同步在拉取前构建 trade_date → 行数 的覆盖索引（见 sync_coverage），
+    与交易日历比对后只拉取缺失 / 可疑的切片；业务表名取自 upsert_fn 所属 Repository 的 TABLE_NAME。
+    最近 SYNC_COVERAGE_RECENT_DAYS 个交易日与增量回看窗口（incremental_default_days）内的交易日
+    不参与跳过；单次调用传 ignore_coverage=True 可完全绕过覆盖索引强制重拉。
+
+    并发：传入的 concurrency 为初始并发（超过 MAX_CONCURRENCY 时截断），运行中由 AIMD 控制器在
+    [1, MAX_CONCURRENCY] 内自适应调整（遇频率限制减半）；子类可覆盖 MAX_CONCURRENCY 收紧上限。
+
     子类需提供：
       - TABLE_KEY（用于日志前缀，可选）
       - sync_history_repo（通过 getattr 可选调用，缺失时跳过 sync_history 记录）
@@ -35,6 +50,17 @@ class TushareSyncBase(BaseSyncService):
     # Tushare offset 上限为 100,000（offset=100001 报错），最大允许值为 100,000
     MAX_OFFSET = 100_000
 
+    # 自适应并发上限（初始并发取调用方传入的 concurrency）
+    MAX_CONCURRENCY = 16
+    # 增量 by_ts_code 的初始并发
+    INCREMENTAL_CONCURRENCY = 5
+    # 续继进度批量写入 Redis 的条数
+    PROGRESS_BATCH_SIZE = 100
+    # 每完成多少项上报一次进度
+    PROGRESS_REPORT_EVERY = 50
+    # 覆盖索引使用的日期列；None 关闭规划（如按公告日 / 报告期同步的表）
+    COVERAGE_DATE_COLUMN: Optional[str] = 'trade_date'
+
     # ------------------------------------------------------------------
     # 日期切片工具
     # ------------------------------------------------------------------
@@ -118,6 +144,65 @@ class TushareSyncBase(BaseSyncService):
         else:  # by_month（默认）
             return self._generate_months(start_date, end_date)
 
+    # ------------------------------------------------------------------
+    # 覆盖索引
+    # ------------------------------------------------------------------
+
+    async def _load_coverage_index(
+        self,
+        table_key: str,
+        upsert_fn: Callable,
+        start_date: str,
+        end_date: str,
+        refresh_from: Optional[str] = None,
+        ignore_coverage: bool = False,
+    ) -> Optional[CoverageIndex]:
+        """
+        构建覆盖索引；未启用、ignore_coverage、无法推断表名或查询失败时返回 None（退回完整拉取）。
+
+        末尾 SYNC_COVERAGE_RECENT_DAYS 个交易日及 refresh_from 起的交易日标记为待刷新，总是重新拉取。
+        """
+        table_key = table_key or getattr(self, 'TABLE_KEY', '')
+        table_name = resolve_table_name(upsert_fn)
+        if ignore_coverage:
+            logger.info(f"[{table_key}] ignore_coverage=True，跳过覆盖索引，按完整切片拉取")
+            return None
+        if not (settings.SYNC_COVERAGE_ENABLED and self.COVERAGE_DATE_COLUMN and table_key and table_name):
+            return None
+        try:
+            coverage = await asyncio.to_thread(
+                build_coverage_index,
+                table_key,
+                table_name,
+                self.COVERAGE_DATE_COLUMN,
+                start_date,
+                end_date,
+                settings.SYNC_COVERAGE_SUSPECT_RATIO,
+            )
+        except Exception as e:
+            logger.info(f"[{table_key}] 覆盖索引不可用，按完整切片拉取: {e}")
+            return None
+        coverage.refresh_recent(settings.SYNC_COVERAGE_RECENT_DAYS, refresh_from)
+        return coverage
+
+    async def _incremental_refresh_from(self, table_key: str, lookback_days: Optional[int]) -> Optional[str]:
+        """
+        增量回看窗口起点（今天 - lookback_days）。
+
+        lookback_days 为 None 时读取 sync_configs.incremental_default_days；读取失败或未配置返回 None。
+        """
+        if lookback_days is None:
+            try:
+                from app.repositories.sync_config_repository import SyncConfigRepository
+                cfg = await asyncio.to_thread(SyncConfigRepository().get_by_table_key, table_key)
+            except Exception as e:
+                logger.debug(f"[{table_key}] 读取 incremental_default_days 失败: {e}")
+                return None
+            lookback_days = cfg.get('incremental_default_days') if cfg else None
+        if not lookback_days:
+            return None
+        return (datetime.now() - timedelta(days=int(lookback_days))).strftime('%Y%m%d')
+
     # ------------------------------------------------------------------
     # 全量同步入口
     # ------------------------------------------------------------------
@@ -140,6 +225,7 @@ class TushareSyncBase(BaseSyncService):
         fetch_kwargs: Optional[Dict] = None,
         table_key: str = '',
         date_param: Optional[str] = None,
+        ignore_coverage: bool = False,
     ) -> Dict:
         """
         全量同步入口，根据 strategy 分发到相应实现。
@@ -160,6 +246,7 @@ class TushareSyncBase(BaseSyncService):
             update_state_fn:        Celery update_state 回调，可选
             fetch_kwargs:           传给 fetch_fn 的额外固定参数（如 content_type='I'）
             table_key:              仅用于日志前缀
+            ignore_coverage:        True 时不使用覆盖索引，所有未续继的切片都重新拉取
 
         fetch_fn 调用签名约定：
           - by_ts_code：fetch_fn(ts_code=ts_code, start_date=..., end_date=...,
@@ -216,6 +303,7 @@ class TushareSyncBase(BaseSyncService):
             fetch_kwargs=fetch_kwargs,
             table_key=table_key,
             date_param=date_param,
+            ignore_coverage=ignore_coverage,
         )
 
     # ------------------------------------------------------------------
@@ -295,76 +383,57 @@ class TushareSyncBase(BaseSyncService):
         completed_set = {d.decode() if isinstance(d, bytes) else d for d in completed_set}
         pending = [c for c in all_ts_codes if c not in completed_set]
         skip_count = len(completed_set)
-        success_count = 0
-        error_count = 0
-        total_records = 0
 
         effective_start = start_date or full_history_start
         today = datetime.now().strftime('%Y%m%d')
-        sem = asyncio.Semaphore(max(1, concurrency))
         MAX_OFFSET = self.MAX_OFFSET
 
         logger.info(f"{tag} 策略=by_ts_code api_limit={api_limit} 共 {total} 只 已完成={skip_count}")
 
-        async def sync_one(ts_code: str):
-            async with sem:
-                try:
-                    records = 0
-                    offset = 0
-                    while True:
-                        if offset >= MAX_OFFSET:
-                            logger.warning(f"{tag} {ts_code} offset={offset} 达上限，停止翻页")
-                            break
-                        df = await asyncio.to_thread(
-                            fetch_fn,
-                            ts_code=ts_code,
-                            start_date=effective_start,
-                            end_date=today,
-                            limit=api_limit,
-                            offset=offset,
-                            **fetch_kwargs,
-                        )
-                        if df is None or df.empty:
-                            break
-                        raw_count = len(df)
-                        if clean_fn is not None:
-                            df = clean_fn(df)
-                        if df is not None and not df.empty:
-                            records += await asyncio.to_thread(upsert_fn, df)
-                        if raw_count < api_limit:
-                            break
-                        offset += api_limit
-                        logger.info(f"{tag} {ts_code} 触发分页（原始={raw_count}>={api_limit}），offset={offset}")
-                    return ts_code, True, records, None
-                except Exception as e:
-                    return ts_code, False, 0, str(e)
-
-        BATCH_SIZE = 50
-        for batch_start in range(0, len(pending), BATCH_SIZE):
-            batch = pending[batch_start: batch_start + BATCH_SIZE]
-            results = await asyncio.gather(*[sync_one(c) for c in batch])
-            for ts_code, ok, records, err in results:
-                if ok:
-                    redis_client.sadd(progress_key, ts_code)
-                    success_count += 1
-                    total_records += records
-                else:
-                    error_count += 1
-                    logger.error(f"{tag} {ts_code} 失败（下次续继）: {err}")
-            done = skip_count + success_count
-            if update_state_fn:
-                update_state_fn(state='PROGRESS', meta={
-                    'current': done, 'total': total,
-                    'percent': round(done / total * 100, 1) if total else 0,
-                    'records': total_records, 'errors': error_count,
-                })
-            logger.info(
-                f"{tag} 进度: {done}/{total} "
-                f"({round(done / total * 100, 1) if total else 0}%) "
-                f"入库={total_records} 失败={error_count}"
-            )
+        async def sync_one(ts_code: str) -> int:
+            records = 0
+            offset = 0
+            while True:
+                if offset >= MAX_OFFSET:
+                    logger.warning(f"{tag} {ts_code} offset={offset} 达上限，停止翻页")
+                    break
+                df = await asyncio.to_thread(
+                    fetch_fn,
+                    ts_code=ts_code,
+                    start_date=effective_start,
+                    end_date=today,
+                    limit=api_limit,
+                    offset=offset,
+                    **fetch_kwargs,
+                )
+                if df is None or df.empty:
+                    break
+                raw_count = len(df)
+                if clean_fn is not None:
+                    df = clean_fn(df)
+                if df is not None and not df.empty:
+                    records += await asyncio.to_thread(upsert_fn, df)
+                if raw_count < api_limit:
+                    break
+                offset += api_limit
+                logger.info(f"{tag} {ts_code} 触发分页（原始={raw_count}>={api_limit}），offset={offset}")
+            return records
+
+        success_count, error_count, total_records = await self._run_full_sync_queue(
+            redis_client=redis_client,
+            progress_key=progress_key,
+            items=pending,
+            handler=sync_one,
+            progress_member=lambda ts_code: ts_code,
+            item_label=lambda ts_code: ts_code,
+            concurrency=concurrency,
+            total=total,
+            skip_count=skip_count,
+            update_state_fn=update_state_fn,
+            tag=tag,
+        )
 
-        final_done = len(redis_client.smembers(progress_key))
+        final_done = redis_client.scard(progress_key)
         if final_done >= total:
             redis_client.delete(progress_key)
             logger.info(f"{tag} ✅ 全量同步完成（by_ts_code），进度已清除")
@@ -404,6 +473,7 @@ class TushareSyncBase(BaseSyncService):
         fetch_kwargs: Dict,
         table_key: str,
         date_param: Optional[str] = None,
+        ignore_coverage: bool = False,
     ) -> Dict:
         """按日期切片全量同步（支持 Redis 续继、翻页）"""
         tag = f'[全量{table_key}]' if table_key else f'[全量{strategy}]'
@@ -416,87 +486,93 @@ class TushareSyncBase(BaseSyncService):
         completed_set = {d.decode() if isinstance(d, bytes) else d for d in completed_set}
         pending = [(ms, me) for ms, me in segments if ms not in completed_set]
         skip_count = len(completed_set)
-        success_count = 0
-        error_count = 0
-        total_records = 0
 
-        sem = asyncio.Semaphore(max(1, concurrency))
+        # 覆盖索引已完整的切片直接记入续继进度，不再请求
+        coverage = await self._load_coverage_index(
+            table_key, upsert_fn, effective_start, effective_end, ignore_coverage=ignore_coverage
+        )
+        covered_count = 0
+        if coverage is not None and pending:
+            pending, covered = coverage.plan(pending)
+            covered_count = len(covered)
+            if covered:
+                redis_client.sadd(progress_key, *[ms for ms, _ in covered])
+                skip_count += covered_count
+
         MAX_OFFSET = self.MAX_OFFSET
+        # 本次实际入库数据的最大日期，以及是否有切片因 offset 上限被截断（供 sync_history 使用）
+        loaded = {'max_date': None, 'truncated': False}
 
         logger.info(
             f"{tag} 策略={strategy} api_limit={api_limit} "
-            f"共 {total} 个片段 已完成={skip_count}"
+            f"共 {total} 个片段 已完成={skip_count}（覆盖索引跳过 {covered_count}）"
         )
 
-        async def sync_segment(ms: str, me: str):
-            async with sem:
-                try:
-                    records = 0
-                    offset = 0
-                    while True:
-                        if offset >= MAX_OFFSET:
-                            logger.warning(
-                                f"{tag} {ms}~{me} offset={offset} 达上限 {MAX_OFFSET}，"
-                                f"停止翻页（已入库 {records} 条）"
-                            )
-                            break
-                        if date_param:
-                            date_kwargs = {date_param: ms}
-                        else:
-                            date_kwargs = {'start_date': ms, 'end_date': me}
-                        df = await asyncio.to_thread(
-                            fetch_fn,
-                            **date_kwargs,
-                            limit=api_limit,
-                            offset=offset,
-                            **fetch_kwargs,
-                        )
-                        if df is None or df.empty:
-                            break
-                        raw_count = len(df)
-                        if clean_fn is not None:
-                            df = clean_fn(df)
-                        if df is not None and not df.empty:
-                            records += await asyncio.to_thread(upsert_fn, df)
-                        if raw_count < api_limit:
-                            break
-                        offset += api_limit
-                        logger.info(
-                            f"{tag} {ms}~{me} 触发分页（原始={raw_count}>={api_limit}），offset={offset}"
-                        )
-                    return ms, me, True, records, None
-                except Exception as e:
-                    return ms, me, False, 0, str(e)
-
-        BATCH_SIZE = max(1, concurrency)
-        for batch_start in range(0, len(pending), BATCH_SIZE):
-            batch = pending[batch_start: batch_start + BATCH_SIZE]
-            results = await asyncio.gather(*[sync_segment(ms, me) for ms, me in batch])
-            for ms, me, ok, records, err in results:
-                if ok:
-                    redis_client.sadd(progress_key, ms)
-                    success_count += 1
-                    total_records += records
+        async def sync_segment(segment: Tuple[str, str]) -> int:
+            ms, me = segment
+            records = 0
+            offset = 0
+            while True:
+                if offset >= MAX_OFFSET:
+                    logger.warning(
+                        f"{tag} {ms}~{me} offset={offset} 达上限 {MAX_OFFSET}，"
+                        f"停止翻页（已入库 {records} 条）"
+                    )
+                    loaded['truncated'] = True
+                    break
+                if date_param:
+                    date_kwargs = {date_param: ms}
                 else:
-                    error_count += 1
-                    logger.error(f"{tag} {ms}~{me} 失败（下次续继）: {err}")
-            done = skip_count + success_count
-            if update_state_fn:
-                update_state_fn(state='PROGRESS', meta={
-                    'current': done, 'total': total,
-                    'percent': round(done / total * 100, 1) if total else 0,
-                    'records': total_records, 'errors': error_count,
-                })
-            logger.info(
-                f"{tag} 进度: {done}/{total} "
-                f"({round(done / total * 100, 1) if total else 0}%) "
-                f"入库={total_records} 失败={error_count}"
-            )
+                    date_kwargs = {'start_date': ms, 'end_date': me}
+                df = await asyncio.to_thread(
+                    fetch_fn,
+                    **date_kwargs,
+                    limit=api_limit,
+                    offset=offset,
+                    **fetch_kwargs,
+                )
+                if df is None or df.empty:
+                    break
+                raw_count = len(df)
+                if clean_fn is not None:
+                    df = clean_fn(df)
+                if df is not None and not df.empty:
+                    records += await asyncio.to_thread(upsert_fn, df)
+                    max_date = self._max_data_date(df)
+                    if max_date and (loaded['max_date'] is None or max_date > loaded['max_date']):
+                        loaded['max_date'] = max_date
+                if raw_count < api_limit:
+                    break
+                offset += api_limit
+                logger.info(
+                    f"{tag} {ms}~{me} 触发分页（原始={raw_count}>={api_limit}），offset={offset}"
+                )
+            return records
 
-        final_done = len(redis_client.smembers(progress_key))
+        success_count, error_count, total_records = await self._run_full_sync_queue(
+            redis_client=redis_client,
+            progress_key=progress_key,
+            items=pending,
+            handler=sync_segment,
+            progress_member=lambda segment: segment[0],
+            item_label=lambda segment: f"{segment[0]}~{segment[1]}",
+            concurrency=concurrency,
+            total=total,
+            skip_count=skip_count,
+            update_state_fn=update_state_fn,
+            tag=tag,
+        )
+
+        final_done = redis_client.scard(progress_key)
         if final_done >= total:
             redis_client.delete(progress_key)
             logger.info(f"{tag} ✅ 全量同步完成（{strategy}），进度已清除")
+            if loaded['truncated']:
+                logger.warning(f"{tag} 存在因 offset 上限截断的切片，不写入 sync_history 确认区间")
+            elif loaded['max_date']:
+                await self._record_full_sync_history(
+                    table_key, strategy, effective_start, loaded['max_date'], total_records
+                )
 
         return {
             "status": "success",
@@ -511,6 +587,110 @@ class TushareSyncBase(BaseSyncService):
             ),
         }
 
+    def _max_data_date(self, df: pd.DataFrame) -> Optional[str]:
+        """DataFrame 中覆盖日期列的最大值（YYYYMMDD）；无该列时返回 None"""
+        column = self.COVERAGE_DATE_COLUMN
+        if not column or column not in df.columns:
+            return None
+        dates = df[column].dropna()
+        if dates.empty:
+            return None
+        return dates.astype(str).str.replace('-', '').str[:8].max()
+
+    async def _record_full_sync_history(
+        self, table_key: str, strategy: str, start_date: str, data_end_date: str, records: int = 0
+    ) -> None:
+        """
+        全量按日期切片全部成功后写一条 sync_history（供覆盖索引确认无数据的交易日）。
+
+        data_end_date 为本次实际入库数据的最大日期（与迁移 107 的列语义一致），而非请求区间终点。
+        """
+        sync_history_repo = getattr(self, 'sync_history_repo', None)
+        table_key = table_key or getattr(self, 'TABLE_KEY', '')
+        if sync_history_repo is None or not table_key:
+            return
+        try:
+            history_id = await asyncio.to_thread(
+                sync_history_repo.create, table_key, 'full', strategy, start_date,
+            )
+            await asyncio.to_thread(
+                sync_history_repo.complete, history_id, 'success', records, data_end_date, None,
+            )
+        except Exception as e:
+            logger.warning(f"[{table_key}] 写入全量同步历史失败: {e}")
+
+    # ------------------------------------------------------------------
+    # 自适应并发执行
+    # ------------------------------------------------------------------
+
+    def _make_concurrency_controller(self, concurrency: int) -> AdaptiveConcurrencyController:
+        """以调用方并发为初始值创建 AIMD 控制器（调用方不能突破 MAX_CONCURRENCY 上限）"""
+        max_limit = max(1, self.MAX_CONCURRENCY)
+        return AdaptiveConcurrencyController(
+            initial=min(max(1, concurrency), max_limit),
+            max_limit=max_limit,
+        )
+
+    async def _run_full_sync_queue(
+        self,
+        redis_client,
+        progress_key: str,
+        items: List,
+        handler: Callable,
+        progress_member: Callable,
+        item_label: Callable,
+        concurrency: int,
+        total: int,
+        skip_count: int,
+        update_state_fn: Optional[Callable],
+        tag: str,
+    ) -> Tuple[int, int, int]:
+        """
+        全量同步的公共执行循环：自适应并发工作队列 + 批量续继进度 + 周期性进度上报。
+
+        Returns:
+            (success_count, error_count, total_records)
+        """
+        controller = self._make_concurrency_controller(concurrency)
+        progress = ProgressBuffer(redis_client, progress_key, batch_size=self.PROGRESS_BATCH_SIZE)
+        counters = {'success': 0, 'errors': 0, 'records': 0, 'since_report': 0}
+
+        def report():
+            done = skip_count + counters['success']
+            percent = round(done / total * 100, 1) if total else 0
+            if update_state_fn:
+                update_state_fn(state='PROGRESS', meta={
+                    'current': done, 'total': total,
+                    'percent': percent,
+                    'records': counters['records'], 'errors': counters['errors'],
+                })
+            logger.info(
+                f"{tag} 进度: {done}/{total} ({percent}%) "
+                f"入库={counters['records']} 失败={counters['errors']} 并发={controller.limit}"
+            )
+
+        def on_result(item, ok: bool, value):
+            if ok:
+                progress.add(progress_member(item))
+                counters['success'] += 1
+                counters['records'] += value
+            else:
+                counters['errors'] += 1
+                logger.error(f"{tag} {item_label(item)} 失败（下次续继）: {value}")
+            counters['since_report'] += 1
+            if counters['since_report'] >= self.PROGRESS_REPORT_EVERY:
+                counters['since_report'] = 0
+                progress.flush()
+                report()
+
+        try:
+            await run_adaptive_queue(items, handler, controller, on_result)
+        finally:
+            progress.flush()
+        if counters['since_report']:
+            report()
+        return counters['success'], counters['errors'], counters['records']
+
     # ------------------------------------------------------------------
     # 增量同步
     # ------------------------------------------------------------------
@@ -529,6 +709,8 @@ class TushareSyncBase(BaseSyncService):
         api_limit: int = 6000,
         extra_fetch_kwargs: Optional[Dict] = None,
         date_param: Optional[str] = None,
+        lookback_days: Optional[int] = None,
+        ignore_coverage: bool = False,
     ) -> Dict:
         """
         通用增量同步。
@@ -548,6 +730,9 @@ class TushareSyncBase(BaseSyncService):
             date_param:             日期切片时用的参数名，如 'trade_date'；
                                     None 时切片使用 start_date/end_date，
                                     设为 'trade_date' 时切片使用 trade_date=单日（适用于只接受 trade_date 的接口）
+            lookback_days:          回看天数，窗口内的交易日不被覆盖索引跳过；
+                                    None 时取 sync_configs.incremental_default_days
+            ignore_coverage:        True 时不使用覆盖索引，整个区间重新拉取
 
         Returns:
             {"status", "records", "data_end_date", "message"} 或
@@ -587,49 +772,76 @@ class TushareSyncBase(BaseSyncService):
                     f"[{table_key}] 增量 by_ts_code：共 {len(all_ts_codes)} 只股票，"
                     f"start={start_date} end={end_date or '(不限)'} api_limit={api_limit}"
                 )
-                sem = asyncio.Semaphore(5)
 
                 async def _fetch_one_ts(ts_code: str):
-                    async with sem:
-                        offset = 0
-                        dfs = []
-                        while True:
-                            if offset >= MAX_OFFSET:
-                                logger.warning(
-                                    f"[{table_key}] {ts_code} offset={offset} 达上限，停止翻页"
-                                )
-                                break
-                            df = await asyncio.to_thread(
-                                fetch_fn,
-                                ts_code=ts_code,
-                                start_date=start_date,
-                                end_date=end_date,   # 保持原始值，None 时不传截止日期
-                                limit=api_limit,
-                                offset=offset,
+                    offset = 0
+                    dfs = []
+                    while True:
+                        if offset >= MAX_OFFSET:
+                            logger.warning(
+                                f"[{table_key}] {ts_code} offset={offset} 达上限，停止翻页"
                             )
-                            if df is None or df.empty:
-                                break
-                            raw_count = len(df)
-                            dfs.append(df)
-                            if raw_count < api_limit:
-                                break
-                            offset += api_limit
-                        return dfs
-
-                BATCH_SIZE = 50
-                for batch_start in range(0, len(all_ts_codes), BATCH_SIZE):
-                    batch = all_ts_codes[batch_start: batch_start + BATCH_SIZE]
-                    batch_results = await asyncio.gather(*[_fetch_one_ts(c) for c in batch])
-                    for dfs in batch_results:
-                        all_dfs.extend(dfs)
+                            break
+                        df = await asyncio.to_thread(
+                            fetch_fn,
+                            ts_code=ts_code,
+                            start_date=start_date,
+                            end_date=end_date,   # 保持原始值，None 时不传截止日期
+                            limit=api_limit,
+                            offset=offset,
+                        )
+                        if df is None or df.empty:
+                            break
+                        raw_count = len(df)
+                        dfs.append(df)
+                        if raw_count < api_limit:
+                            break
+                        offset += api_limit
+                    return dfs
+
+                failures = []
+
+                def _collect(ts_code, ok, value):
+                    if ok:
+                        all_dfs.extend(value)
+                    else:
+                        failures.append((ts_code, value))
+
+                await run_adaptive_queue(
+                    all_ts_codes,
+                    _fetch_one_ts,
+                    self._make_concurrency_controller(self.INCREMENTAL_CONCURRENCY),
+                    _collect,
+                )
+                if failures:
+                    # 与原先 gather 语义一致：任一股票失败即整体失败，由 sync_history 记录
+                    ts_code, err = failures[0]
+                    raise RuntimeError(f"{ts_code} 拉取失败（共 {len(failures)} 只失败）: {err}") from err
 
             elif start_date and sync_strategy == 'by_date_range':
-                # 整段请求 + 翻页
-                logger.info(
-                    f"[{table_key}] 增量按时间段 {start_date}~{end_date or '(不限)'}，api_limit={api_limit}"
+                # 整段请求 + 翻页；覆盖索引可用时起点推进到首个缺失 / 可疑交易日
+                fetch_start = start_date
+                coverage = (
+                    await self._load_coverage_index(
+                        table_key, upsert_fn, start_date, effective_end,
+                        refresh_from=await self._incremental_refresh_from(table_key, lookback_days),
+                        ignore_coverage=ignore_coverage,
+                    )
+                    if date_col == self.COVERAGE_DATE_COLUMN else None
                 )
+                if coverage is not None:
+                    incomplete = coverage.incomplete_days(start_date, effective_end)
+                    fetch_start = incomplete[0] if incomplete else None
+                    logger.info(
+                        f"[{table_key}] 覆盖索引 {coverage.summary()}，"
+                        f"拉取起点 {start_date} → {fetch_start or '(已完整，跳过)'}"
+                    )
+                if fetch_start:
+                    logger.info(
+                        f"[{table_key}] 增量按时间段 {fetch_start}~{end_date or '(不限)'}，api_limit={api_limit}"
+                    )
                 offset = 0
-                while True:
+                while fetch_start:
                     if offset >= MAX_OFFSET:
                         logger.warning(
                             f"[{table_key}] offset={offset} 达上限 {MAX_OFFSET}，停止翻页"
@@ -637,7 +849,7 @@ class TushareSyncBase(BaseSyncService):
                         break
                     df = await asyncio.to_thread(
                         fetch_fn,
-                        start_date=start_date,
+                        start_date=fetch_start,
                         end_date=end_date,           # 保持原始值，None 时不传截止日期
                         limit=api_limit,
                         offset=offset,
@@ -657,9 +869,19 @@ class TushareSyncBase(BaseSyncService):
                 # 切片请求 + 每段翻页
                 # 切片必须有终点，使用 effective_end（今日）；但每段的 end_date 由切片算法精确给出
                 segments = self._generate_segments(sync_strategy, start_date, effective_end)
+                covered = []
+                if date_col == self.COVERAGE_DATE_COLUMN:
+                    coverage = await self._load_coverage_index(
+                        table_key, upsert_fn, start_date, effective_end,
+                        refresh_from=await self._incremental_refresh_from(table_key, lookback_days),
+                        ignore_coverage=ignore_coverage,
+                    )
+                    if coverage is not None:
+                        segments, covered = coverage.plan(segments)
                 logger.info(
                     f"[{table_key}] 增量切片 strategy={sync_strategy} "
-                    f"共 {len(segments)} 个片段 api_limit={api_limit}"
+                    f"共 {len(segments) + len(covered)} 个片段（覆盖索引跳过 {len(covered)}）"
+                    f" api_limit={api_limit}"
                 )
                 for ms, me in segments:
                     offset = 0
@@ -5,6 +5,7 @@ Celery异步任务 - 扩展数据同步
 
 from datetime import datetime
 import asyncio
+import threading
 from typing import Optional, Callable, Any
 
 from app.celery_app import celery_app
@@ -33,14 +34,19 @@ def run_async_in_celery(async_func: Callable, *args, **kwargs) -> Any:
     Raises:
         传递异步函数抛出的所有异常
     """
+    # threads 池 Worker：各线程独立运行事件循环，共享的 NullPool 引擎在 Worker 启动时配置，
+    # 这里不能重建全局引擎（会影响其他线程正在使用的会话）
+    in_worker_thread = threading.current_thread() is not threading.main_thread()
+
     # 关闭继承的旧事件循环
-    try:
-        old_loop = asyncio.get_event_loop()
-        if old_loop and not old_loop.is_closed():
-            old_loop.close()
-    except RuntimeError:
-        # 如果没有运行中的循环，忽略错误
-        pass
+    if not in_worker_thread:
+        try:
+            old_loop = asyncio.get_event_loop()
+            if old_loop and not old_loop.is_closed():
+                old_loop.close()
+        except RuntimeError:
+            # 如果没有运行中的循环，忽略错误
+            pass
 
     # 创建新的事件循环并设置为当前循环
     loop = asyncio.new_event_loop()
@@ -48,7 +54,8 @@ def run_async_in_celery(async_func: Callable, *args, **kwargs) -> Any:
 
     try:
         # 重新初始化数据库引擎（绑定到新循环）
-        reset_async_engine()
+        if not in_worker_thread:
+            reset_async_engine()
 
         # 运行异步函数
         return loop.run_until_complete(async_func(*args, **kwargs))
@@ -8,10 +8,11 @@
   - sync_daily_recent_all_task：全市场近 N 日增量
   - sync_daily_full_history_task：全量历史（可中断续继）
 - 新股列表同步
+- 本地日线缓存（core DailyBarCache）增量刷新 / 全量重建
 """
 
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 from celery import Task
 from loguru import logger
@@ -531,8 +532,59 @@ def sync_daily_recent_all_task(
 
     if result.get("status") == "success":
         logger.info(f"日线数据增量同步成功: {result.get('records', 0)} 条")
+        _refresh_daily_bar_cache(start_date)
         return result
     else:
         error_msg = result.get('error', '未知错误')
         logger.warning(f"日线数据增量同步失败: {result}")
         raise Exception(f"同步失败: {error_msg}")
+
+
+# ==================== 本地日线缓存 ====================
+
+# 增量同步默认回看天数：覆盖近 7 个交易日的修订，并保证跨月时上月分区同步刷新
+DAILY_BAR_CACHE_REFRESH_DAYS = 15
+
+
+def _refresh_daily_bar_cache(start_date: Optional[str] = None) -> None:
+    """日线同步成功后刷新 core 本地日线缓存涉及的月分区（失败不影响同步结果）"""
+    try:
+        from src.database.db_manager import get_database
+
+        if not start_date:
+            start_date = (datetime.now() - timedelta(days=DAILY_BAR_CACHE_REFRESH_DAYS)).strftime('%Y-%m-%d')
+        result = get_database().refresh_daily_bar_cache(start_date=start_date)
+        logger.info(f"本地日线缓存已刷新: {result}")
+    except Exception as e:
+        logger.warning(f"本地日线缓存刷新失败（回测将回退数据库读取）: {e}")
+
+
+@celery_app.task(
+    name="tasks.rebuild_daily_bar_cache",
+    bind=True,
+    soft_time_limit=3600,
+    time_limit=4200,
+)
+def rebuild_daily_bar_cache_task(
+    self: Task,
+    start_date: str = None,
+    end_date: str = None,
+    verify: bool = False,
+):
+    """
+    重建 core 本地日线缓存（按月 Parquet 分区）
+
+    Args:
+        start_date: 开始日期（None 表示从 stock_daily 最早日期全量构建）
+        end_date: 结束日期（None 表示最新日期）
+        verify: 重建后是否逐分区与数据库比对校验和
+    """
+    from src.database.db_manager import get_database
+
+    db = get_database()
+    logger.info(f"开始重建本地日线缓存: start_date={start_date} end_date={end_date}")
+    result = db.refresh_daily_bar_cache(start_date=start_date, end_date=end_date)
+    if verify:
+        result['verify'] = db.verify_daily_bar_cache(partitions=result.get('partitions'))
+    logger.info(f"本地日线缓存重建完成: {result}")
+    return result
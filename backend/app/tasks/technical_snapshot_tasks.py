@@ -0,0 +1,31 @@
+"""全市场技术指标快照 Celery 任务
+
+  - tasks.recompute_technical_snapshot : 日终收盘后计算最新交易日全市场快照（可回补最近 N 日）
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from loguru import logger
+
+from app.celery_app import celery_app
+from app.tasks.extended_sync_tasks import run_async_in_celery
+
+
+@celery_app.task(
+    bind=True,
+    name="tasks.recompute_technical_snapshot",
+    max_retries=0,
+    soft_time_limit=1800,
+    time_limit=2100,
+)
+def recompute_technical_snapshot_task(self, days: int = 1, end_date: Optional[str] = None,
+                                      source: str = "manual"):
+    """全市场技术指标快照（一次面板拉取 + 向量化计算，约 5000 只股票 1~2 分钟）。"""
+    from app.services.technical_snapshot import TechnicalSnapshotService
+
+    svc = TechnicalSnapshotService()
+    result = run_async_in_celery(svc.recompute_latest, days=days, end_date=end_date)
+    logger.info(f"[technical_snapshot] source={source} 结果: {result}")
+    return result
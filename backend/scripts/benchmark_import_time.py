@@ -0,0 +1,114 @@
+"""
+启动耗时基准：逐模块统计导入成本
+
+每个模块在独立的子进程中以 `python -X importtime` 导入，解析其累计耗时，
+并列出该模块导入链中自身耗时最高的依赖（定位 pandas / torch 等重型依赖的引入点）。
+
+用法:
+    python scripts/benchmark_import_time.py                       # 默认：Celery 应用、API、全部任务模块与路由模块
+    python scripts/benchmark_import_time.py app.celery_app app.api  # 指定模块
+    python scripts/benchmark_import_time.py --top 20 --json out.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+backend_root = Path(__file__).resolve().parent.parent
+core_root = backend_root.parent / 'core'
+
+# import time: self [us] | cumulative | imported package
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def default_modules():
+    """默认基准集合：Worker / API 入口 + 各任务模块 + 各路由模块"""
+    modules = ['app.celery_app', 'app.api']
+    for package, directory in (('app.tasks', 'app/tasks'), ('app.api.endpoints', 'app/api/endpoints')):
+        for path in sorted((backend_root / directory).glob('*.py')):
+            if path.stem != '__init__':
+                modules.append(f'{package}.{path.stem}')
+    return modules
+
+
+def measure(module, top=5, timeout=300):
+    """
+    在新进程中导入模块并解析 -X importtime 输出
+
+    Returns:
+        {'module', 'ok', 'total_ms', 'error', 'heaviest': [(模块, 自身耗时ms), ...]}
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(backend_root), str(core_root), env.get('PYTHONPATH')]))
+    # 延迟注册模式下基准才能反映真实启动成本
+    env.setdefault('CELERY_EAGER_TASK_IMPORTS', '0')
+
+    try:
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=backend_root, env=env, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {'module': module, 'ok': False, 'total_ms': None, 'error': 'timeout', 'heaviest': []}
+
+    # `import a.b.c` 依次导入 a、a.b、a.b.c（均为顶层条目），累计耗时为三者之和；
+    # 解释器启动时的 site 等导入不计入
+    parents = {'.'.join(module.split('.')[:i]) for i in range(1, module.count('.') + 2)}
+    total_us = None
+    self_times = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        self_times.append((name, int(self_us) / 1000))
+        if len(indent) == 1 and name in parents:
+            total_us = (total_us or 0) + int(cumulative_us)
+
+    error = None
+    if proc.returncode != 0:
+        tail = [l for l in proc.stderr.splitlines() if l and not l.startswith('import time:')]
+        error = tail[-1] if tail else f'exit code {proc.returncode}'
+
+    self_times.sort(key=lambda item: item[1], reverse=True)
+    return {
+        'module': module,
+        'ok': proc.returncode == 0,
+        'total_ms': total_us / 1000 if total_us is not None else None,
+        'error': error,
+        'heaviest': self_times[:top],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='逐模块统计导入耗时')
+    parser.add_argument('modules', nargs='*', help='要测量的模块（默认全部入口/任务/路由模块）')
+    parser.add_argument('--top', type=int, default=5, help='每个模块列出自身耗时最高的依赖数')
+    parser.add_argument('--json', dest='json_path', help='结果另存为 JSON 文件')
+    args = parser.parse_args()
+
+    results = [measure(m, top=args.top) for m in (args.modules or default_modules())]
+    results.sort(key=lambda r: r['total_ms'] if r['total_ms'] is not None else -1, reverse=True)
+
+    print(f"{'模块':<60} {'累计耗时(ms)':>14}")
+    print('-' * 76)
+    for r in results:
+        total = f"{r['total_ms']:.1f}" if r['total_ms'] is not None else '-'
+        print(f"{r['module']:<60} {total:>14}")
+        if r['error']:
+            print(f"    ❌ {r['error']}")
+        for name, ms in r['heaviest']:
+            print(f"    {name:<56} {ms:>10.1f}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已保存: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Celery 任务延迟注册测试
+"""
+
+import sys
+import textwrap
+
+import pytest
+from celery import Celery
+from celery.exceptions import NotRegistered
+
+from app import celery_registry
+from app.celery_registry import (
+    LazyTaskRegistry,
+    declared_tasks,
+    resolve_task_module,
+    route_task,
+    task_module_index,
+)
+
+
+@pytest.fixture
+def lazy_app(tmp_path, monkeypatch):
+    """带临时任务模块的 Celery 应用"""
+    (tmp_path / "lazy_demo_tasks.py").write_text(textwrap.dedent("""
+        from celery import current_app
+
+        @current_app.task(name="demo.add", shared=False)
+        def add(x, y):
+            return x + y
+
+        @current_app.task(name="demo.mul", shared=False)
+        def mul(x, y):
+            return x * y
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(
+        celery_registry, "resolve_task_module",
+        lambda name: "lazy_demo_tasks" if name.startswith("demo.") else None,
+    )
+    app = Celery("lazy_test", tasks=LazyTaskRegistry(), set_as_current=True)
+    app.set_current()
+    yield app
+    sys.modules.pop("lazy_demo_tasks", None)
+
+
+class TestTaskIndex:
+    """测试任务索引"""
+
+    def test_index_covers_factory_and_decorator_tasks(self):
+        """任务工厂与装饰器声明的任务名都能解析到模块"""
+        index = task_module_index()
+        assert index["tasks.sync_dividend"] == "app.tasks.dividend_tasks"
+        assert index["app.tasks.backtest_tasks.run_backtest_async"] == "app.tasks.backtest_tasks"
+
+    def test_default_task_name_resolved_by_prefix(self):
+        """默认命名的任务按模块前缀解析，未知任务返回 None"""
+        assert resolve_task_module("app.tasks.backtest_tasks.some_func") == "app.tasks.backtest_tasks"
+        assert resolve_task_module("app.tasks.no_such_module.func") is None
+        assert resolve_task_module("unknown.task") is None
+
+    def test_metadata_tasks_declared(self):
+        """task_metadata 中的任务都被声明"""
+        assert "sync.stock_list" in declared_tasks()
+
+
+class TestLazyTaskRegistry:
+    """测试延迟注册表"""
+
+    def test_module_imported_on_first_lookup(self, lazy_app):
+        """首次查找时导入模块，同模块的其他任务随之注册"""
+        assert "lazy_demo_tasks" not in sys.modules
+        assert lazy_app.tasks["demo.add"](2, 3) == 5
+        assert "lazy_demo_tasks" in sys.modules
+        assert dict.__contains__(lazy_app.tasks, "demo.mul")
+
+    def test_tracers_built_after_enable_tracing(self, lazy_app):
+        """Worker 启用后，按需导入的任务都带执行器"""
+        lazy_app.tasks.enable_tracing(lazy_app, "worker@test")
+        task = lazy_app.tasks["demo.add"]
+        assert task.__trace__ is not None
+        assert lazy_app.tasks["demo.mul"].__trace__ is not None
+
+    def test_unknown_task(self, lazy_app):
+        """未知任务抛出 NotRegistered，get 返回默认值"""
+        with pytest.raises(NotRegistered):
+            lazy_app.tasks["other.task"]
+        assert lazy_app.tasks.get("other.task") is None
+
+
+class TestRouteTask:
+    """测试元数据路由"""
+
+    def test_route_by_metadata_queue(self, monkeypatch):
+        """声明了队列的任务投递到对应队列，其余走默认队列"""
+        monkeypatch.setattr(celery_registry, "declared_tasks", lambda: {
+            "demo.heavy": {"module": None, "queue": "heavy"},
+            "demo.light": {"module": None, "queue": None},
+        })
+        assert route_task("demo.heavy", (), {}, {}) == {"queue": "heavy"}
+        assert route_task("demo.light", (), {}, {}) is None
+        assert route_task("demo.unknown", (), {}, {}) is None
+
+
+class TestTaskQueues:
+    """测试按资源类型划分的队列"""
+
+    def test_queue_resolution_priority(self):
+        """元数据 queue 字段 > 任务名路由 > 分类默认队列 > default"""
+        from app.scheduler.task_metadata import get_task_queue
+
+        assert get_task_queue("sentiment.ai_analysis_18_00", {"category": "市场情绪", "queue": "llm"}) == "llm"
+        assert get_task_queue("sentiment.daily_sync_17_30", {"category": "市场情绪"}) == "sync-io"
+        assert get_task_queue("tasks.recompute_technical_snapshot", {"category": "行情数据"}) == "compute"
+        assert get_task_queue("app.tasks.quality_tasks.data_integrity_check", {"category": "质量监控"}) == "compute"
+        assert get_task_queue("premarket.full_workflow_8_00", {"category": "盘前分析"}) == "llm"
+        assert get_task_queue("app.tasks.backtest_tasks.run_backtest_async") == "compute"
+        assert get_task_queue("unknown.task") == "default"
+
+    def test_real_routes(self):
+        """Celery 路由使用元数据解析的队列"""
+        assert route_task("tasks.sync_dividend", (), {}, {}) == {"queue": "sync-io"}
+        assert route_task("app.tasks.notification_tasks.send_email_notification", (), {}, {}) == {"queue": "notify"}
+        assert route_task("tasks.batch_ai_analysis", (), {}, {}) == {"queue": "llm"}
+
+    def test_metadata_service_queue(self):
+        """TaskExecutor / DatabaseScheduler 通过 TaskMetadataService 取队列"""
+        from app.scheduler.task_metadata_service import TaskMetadataService
+
+        service = TaskMetadataService()
+        assert service.get_task_queue("stock_list") == "sync-io"
+        assert service.get_task_queue("no_such_module") == "default"
+
+    def test_worker_argv(self, monkeypatch):
+        """Worker 命令行取自队列定义，可用环境变量覆盖"""
+        from app.celery_worker import build_worker_argv
+
+        argv = build_worker_argv("llm")
+        assert argv[argv.index("--pool") + 1] == "threads"
+        assert argv[argv.index("--queues") + 1] == "llm"
+
+        monkeypatch.setenv("CELERY_SYNC_IO_CONCURRENCY", "32")
+        argv = build_worker_argv("sync-io", ["--loglevel=debug"])
+        assert argv[argv.index("--concurrency") + 1] == "32"
+        assert argv[-1] == "--loglevel=debug"
+
+        with pytest.raises(ValueError):
+            build_worker_argv("nope")
@@ -0,0 +1,118 @@
+"""
+DatabaseScheduler 变更事件测试（进程内总线 + 内存仓储）
+"""
+
+import pytest
+from celery import Celery
+
+from app.scheduler import database_scheduler
+from app.scheduler.database_scheduler import DatabaseScheduler
+from app.scheduler.schedule_events import (
+    ACTION_DELETE,
+    InMemoryScheduleChangeBus,
+    publish_schedule_change,
+    set_schedule_change_bus,
+)
+
+
+class FakeScheduledTaskRepository:
+    """内存版 scheduled_tasks 仓储（记录全量查询次数）"""
+
+    rows = {}
+
+    def __init__(self):
+        self.full_loads = 0
+
+    def get_enabled_tasks(self):
+        self.full_loads += 1
+        return [dict(r) for r in self.rows.values() if r['enabled']]
+
+    def get_by_task_name(self, task_name):
+        row = self.rows.get(task_name)
+        return dict(row) if row else None
+
+
+def _row(task_name, cron='0 9 * * 1-5', enabled=True, module='stock_list', params=None):
+    return {'task_name': task_name, 'module': module, 'cron_expression': cron,
+            'enabled': enabled, 'params': params or {}}
+
+
+@pytest.fixture
+def bus():
+    bus = InMemoryScheduleChangeBus()
+    set_schedule_change_bus(bus)
+    yield bus
+    set_schedule_change_bus(None)
+
+
+@pytest.fixture
+def scheduler(bus, monkeypatch):
+    FakeScheduledTaskRepository.rows = {'daily_stock_list': _row('daily_stock_list')}
+    monkeypatch.setattr(database_scheduler, 'ScheduledTaskRepository', FakeScheduledTaskRepository)
+    app = Celery('scheduler_test', set_as_current=False)
+    return DatabaseScheduler(app=app, change_bus=bus)
+
+
+class TestScheduleEvents:
+    """测试变更事件驱动的调度更新"""
+
+    def test_initial_load(self, scheduler):
+        """启动时全量加载并按元数据设置队列"""
+        entry = scheduler.schedule['db-daily_stock_list']
+        assert entry.task == 'sync.stock_list'
+        assert entry.options['queue'] == 'sync-io'
+
+    def test_update_applied_on_next_tick_without_full_reload(self, scheduler):
+        """修改 Cron 后发布事件，下一次 tick 即生效且不触发全量查询"""
+        full_loads = scheduler.task_repo.full_loads
+        FakeScheduledTaskRepository.rows['daily_stock_list'] = _row('daily_stock_list', cron='30 17 * * *')
+        publish_schedule_change('daily_stock_list')
+
+        interval = scheduler.tick()
+
+        schedule = scheduler.schedule['db-daily_stock_list'].schedule
+        assert schedule.hour == {17} and schedule.minute == {30}
+        assert scheduler.task_repo.full_loads == full_loads
+        assert interval <= scheduler.event_poll_interval
+
+    def test_add_disable_and_delete(self, scheduler):
+        """新增、禁用、删除分别新增/移除单个条目"""
+        FakeScheduledTaskRepository.rows['new_stocks'] = _row('new_stocks', module='new_stocks')
+        publish_schedule_change('new_stocks')
+        scheduler.tick()
+        assert 'db-new_stocks' in scheduler.schedule
+
+        FakeScheduledTaskRepository.rows['new_stocks']['enabled'] = False
+        publish_schedule_change('new_stocks')
+        scheduler.tick()
+        assert 'db-new_stocks' not in scheduler.schedule
+
+        publish_schedule_change('daily_stock_list', ACTION_DELETE)
+        scheduler.tick()
+        assert 'db-daily_stock_list' not in scheduler.schedule
+
+    def test_invalid_cron_removes_entry(self, scheduler):
+        """修改为无效配置时移除调度，避免继续按旧配置执行"""
+        FakeScheduledTaskRepository.rows['daily_stock_list']['module'] = 'no_such_module'
+        publish_schedule_change('daily_stock_list')
+        scheduler.tick()
+        assert 'db-daily_stock_list' not in scheduler.schedule
+
+    def test_reconciliation_fallback(self, scheduler):
+        """丢失事件时由全量对账兜底"""
+        FakeScheduledTaskRepository.rows['new_stocks'] = _row('new_stocks', module='new_stocks')
+        scheduler.tick()
+        assert 'db-new_stocks' not in scheduler.schedule
+
+        scheduler.last_sync = None
+        scheduler.tick()
+        assert 'db-new_stocks' in scheduler.schedule
+
+    def test_bus_failure_is_tolerated(self, scheduler):
+        """总线异常不影响调度循环"""
+        class BrokenBus:
+            def poll(self):
+                raise ConnectionError('redis down')
+
+        scheduler.change_bus = BrokenBus()
+        assert scheduler.tick() <= scheduler.event_poll_interval
@@ -0,0 +1,117 @@
+"""
+BaseRepository 游标分页与近似计数单元测试
+
+测试 find_page / encode_cursor / decode_cursor / approximate_count。
+"""
+
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from app.repositories.base_repository import BaseRepository
+
+
+@pytest.fixture
+def repo():
+    """execute_query 被替换为 Mock 的 Repository"""
+    repository = BaseRepository(db=Mock())
+    repository.execute_query = Mock()
+    BaseRepository.invalidate_count_cache()
+    yield repository
+    BaseRepository.invalidate_count_cache()
+
+
+class TestCursor:
+    """测试游标编解码"""
+
+    def test_roundtrip(self):
+        """日期时间与普通值编码后可还原"""
+        values = (datetime(2024, 1, 2, 9, 30), 42)
+        cursor = BaseRepository.encode_cursor("created_at DESC, id DESC", values)
+
+        assert BaseRepository.decode_cursor("created_at DESC, id DESC", cursor) == values
+
+    def test_rejects_cursor_for_other_order(self):
+        """换了排序方式的游标被拒绝"""
+        cursor = BaseRepository.encode_cursor("created_at DESC, id DESC", (datetime(2024, 1, 2), 1))
+
+        with pytest.raises(ValueError):
+            BaseRepository.decode_cursor("created_at ASC, id DESC", cursor)
+        with pytest.raises(ValueError):
+            BaseRepository.decode_cursor("created_at DESC, id DESC", "not-a-cursor")
+
+
+class TestFindPage:
+    """测试游标分页"""
+
+    def test_first_page_returns_cursor(self, repo):
+        """多取一行判断是否有下一页，排序键列不出现在返回结果中"""
+        repo.execute_query.return_value = [
+            ("a", "20240103", "000001.SZ"),
+            ("b", "20240103", "000002.SZ"),
+            ("c", "20240102", "000001.SZ"),
+        ]
+        rows, cursor = repo.find_page(
+            "daily", "trade_date DESC, ts_code DESC", limit=2, columns=["name"]
+        )
+
+        query, params = repo.execute_query.call_args[0]
+        assert "SELECT name, trade_date, ts_code FROM daily" in query
+        assert "LIMIT 3" in query
+        assert rows == [("a",), ("b",)]
+        assert BaseRepository.decode_cursor("trade_date DESC, ts_code DESC", cursor) == (
+            "20240103", "000002.SZ"
+        )
+
+    def test_uniform_direction_uses_row_comparison(self, repo):
+        """同向排序使用行值比较，可命中复合索引"""
+        repo.execute_query.return_value = []
+        cursor = BaseRepository.encode_cursor("trade_date DESC, ts_code DESC", ("20240103", "000002.SZ"))
+        rows, next_cursor = repo.find_page(
+            "daily", "trade_date DESC, ts_code DESC", where="ts_code LIKE %s",
+            params=("0%",), limit=2, cursor=cursor,
+        )
+
+        query, params = repo.execute_query.call_args[0]
+        assert "(ts_code LIKE %s) AND ((trade_date, ts_code) < (%s, %s))" in query
+        assert params == ("0%", "20240103", "000002.SZ")
+        assert rows == [] and next_cursor is None
+
+    def test_mixed_direction_expands_condition(self, repo):
+        """混合方向展开为逐列比较"""
+        repo.execute_query.return_value = []
+        cursor = BaseRepository.encode_cursor("source ASC, id DESC", ("caixin", 10))
+        repo.find_page("news_flash", "source ASC, id DESC", cursor=cursor)
+
+        query, params = repo.execute_query.call_args[0]
+        assert "((source > %s) OR (source = %s AND id < %s))" in query
+        assert params == ("caixin", "caixin", 10)
+
+
+class TestApproximateCount:
+    """测试近似计数"""
+
+    def test_large_estimate_skips_count(self, repo):
+        """估算值超过阈值时直接使用规划器估算"""
+        repo.execute_query.return_value = [([{"Plan": {"Plan Rows": 5000000}}],)]
+
+        assert repo.approximate_count("moneyflow") == (5000000, True)
+        assert repo.execute_query.call_count == 1
+        assert repo.execute_query.call_args[0][0].startswith("EXPLAIN (FORMAT JSON)")
+
+    def test_small_estimate_falls_back_to_exact(self, repo):
+        """估算值较小时精确计数，并缓存结果直到失效"""
+        repo.execute_query.side_effect = [
+            [([{"Plan": {"Plan Rows": 120}}],)],
+            [(118,)],
+            [([{"Plan": {"Plan Rows": 130}}],)],
+            [(125,)],
+        ]
+
+        assert repo.approximate_count("sync_log", "status = %s", ("ok",)) == (118, False)
+        assert repo.approximate_count("sync_log", "status = %s", ("ok",)) == (118, False)
+        assert repo.execute_query.call_count == 2
+
+        BaseRepository.invalidate_count_cache("sync_log")
+        assert repo.approximate_count("sync_log", "status = %s", ("ok",)) == (125, False)
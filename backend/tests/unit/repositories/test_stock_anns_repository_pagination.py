@@ -0,0 +1,59 @@
+"""
+StockAnnsRepository 游标分页单元测试
+
+测试 query_page_by_filters 复用 find_page，且只按 NOT NULL 列做 keyset。
+"""
+
+from datetime import date, datetime
+from unittest.mock import Mock
+
+import pytest
+
+from app.repositories.stock_anns_repository import StockAnnsRepository
+
+
+@pytest.fixture
+def repo():
+    """execute_query 被替换为 Mock 的 Repository"""
+    repository = StockAnnsRepository(db=Mock())
+    repository.execute_query = Mock()
+    return repository
+
+
+def _row(ts_code, ann_date, title, fetched_at=None):
+    return (
+        ts_code, ann_date, title, None, '平安银行', 'http://x', 'eastmoney',
+        fetched_at, fetched_at,
+        [], None, None, None, None, None,
+        datetime(2024, 1, 2, 8, 0),
+    )
+
+
+class TestQueryPageByFilters:
+    """测试公告列表游标分页"""
+
+    def test_uses_find_page_with_primary_key_tiebreak(self, repo):
+        """默认按 ann_date 排序，主键列补齐排序键，has_content 取自 content_fetched_at"""
+        fetched = datetime(2024, 1, 2, 9, 0)
+        repo.execute_query.return_value = [
+            _row('000001.SZ', date(2024, 1, 2), 'A', fetched) + (date(2024, 1, 2), '000001.SZ', 'A'),
+            _row('000002.SZ', date(2024, 1, 2), 'B') + (date(2024, 1, 2), '000002.SZ', 'B'),
+        ]
+
+        items, cursor = repo.query_page_by_filters(page_size=1)
+
+        query, _ = repo.execute_query.call_args[0]
+        assert "ORDER BY ann_date DESC, ts_code ASC, title ASC" in query
+        assert "LIMIT 2" in query
+        assert items[0]['has_content'] is True
+        assert items[0]['created_at'] == '2024-01-02T08:00:00'
+        assert cursor is not None
+
+    def test_nullable_sort_column_falls_back_to_ann_date(self, repo):
+        """anno_type / created_at 可为空，不参与 keyset"""
+        repo.execute_query.return_value = []
+
+        repo.query_page_by_filters(sort_by='anno_type', sort_order='asc')
+
+        query, _ = repo.execute_query.call_args[0]
+        assert "ORDER BY ann_date ASC, ts_code ASC, title ASC" in query
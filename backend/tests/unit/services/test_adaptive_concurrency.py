@@ -0,0 +1,198 @@
+"""
+自适应并发同步测试（AIMD 控制器 / 连续工作队列 / 批量续继进度）
+"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+from app.services.adaptive_concurrency import (
+    AdaptiveConcurrencyController,
+    ProgressBuffer,
+    run_adaptive_queue,
+)
+from app.services.tushare_sync_base import TushareSyncBase
+
+RATE_LIMIT_MSG = "抱歉，您每分钟最多访问该接口500次"
+
+
+class FakeRedis:
+    """记录往返次数的内存 Redis（仅 Set 相关命令）"""
+
+    def __init__(self):
+        self.sets = {}
+        self.round_trips = 0
+
+    def smembers(self, key):
+        self.round_trips += 1
+        return set(self.sets.get(key, set()))
+
+    def scard(self, key):
+        self.round_trips += 1
+        return len(self.sets.get(key, set()))
+
+    def sadd(self, key, *members):
+        self.round_trips += 1
+        self.sets.setdefault(key, set()).update(members)
+
+    def delete(self, key):
+        self.round_trips += 1
+        self.sets.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def sadd(self, key, *members):
+        self.commands.append((key, members))
+
+    def execute(self):
+        self.redis.round_trips += 1
+        for key, members in self.commands:
+            self.redis.sets.setdefault(key, set()).update(members)
+
+
+class TestController:
+    """测试 AIMD 调整规则"""
+
+    def test_additive_increase_when_healthy(self):
+        """每轮延迟稳定、无错误时并发 +1，且不超过上限"""
+        controller = AdaptiveConcurrencyController(initial=2, max_limit=4)
+        for _ in range(20):
+            controller.record(0.1)
+        assert controller.limit == 4
+
+    def test_multiplicative_decrease_on_rate_limit(self):
+        """频率限制时减半，同一批在途请求只减一次"""
+        controller = AdaptiveConcurrencyController(initial=8, max_limit=16)
+        controller.record(0.1, error=True, rate_limited=True)
+        controller.record(0.1, error=True, rate_limited=True)
+        assert controller.limit == 4
+        assert controller.decreases == 1
+
+    def test_hold_when_latency_degrades(self):
+        """中位延迟超过基线容忍倍数时不再加并发"""
+        controller = AdaptiveConcurrencyController(initial=2, max_limit=10)
+        controller.record(0.1)
+        controller.record(0.1)
+        assert controller.limit == 3
+        for _ in range(3):
+            controller.record(1.0)
+        assert controller.limit == 3
+
+    def test_hold_when_error_rate_high(self):
+        controller = AdaptiveConcurrencyController(initial=2, max_limit=10)
+        controller.record(0.1, error=True)
+        controller.record(0.1, error=True)
+        assert controller.limit == 2
+
+
+class TestRunAdaptiveQueue:
+    """测试连续有界工作队列"""
+
+    @pytest.mark.asyncio
+    async def test_in_flight_bounded_and_refilled(self):
+        """在途数不超过 limit，所有项都被处理"""
+        controller = AdaptiveConcurrencyController(initial=3, max_limit=3)
+        state = {'running': 0, 'peak': 0}
+        results = {}
+
+        async def handler(item):
+            state['running'] += 1
+            state['peak'] = max(state['peak'], state['running'])
+            await asyncio.sleep(0.001 * (item % 3))
+            state['running'] -= 1
+            return item * 2
+
+        await run_adaptive_queue(range(20), handler, controller,
+                                 lambda item, ok, value: results.__setitem__(item, value))
+        assert state['peak'] == 3
+        assert results == {i: i * 2 for i in range(20)}
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_items_requeued(self):
+        """限速失败的项重新入队并降并发，其余错误直接回调失败"""
+        controller = AdaptiveConcurrencyController(initial=4, max_limit=4)
+        calls = {}
+        outcomes = {}
+
+        async def handler(item):
+            calls[item] = calls.get(item, 0) + 1
+            if item == 'limited' and calls[item] == 1:
+                raise RuntimeError(RATE_LIMIT_MSG)
+            if item == 'broken':
+                raise ValueError('bad params')
+            return item
+
+        await run_adaptive_queue(['a', 'limited', 'broken', 'b'], handler, controller,
+                                 lambda item, ok, value: outcomes.__setitem__(item, ok))
+        assert outcomes == {'a': True, 'limited': True, 'broken': False, 'b': True}
+        assert calls['limited'] == 2 and calls['broken'] == 1
+        assert controller.decreases == 1
+
+
+class TestProgressBuffer:
+
+    def test_batched_sadd(self):
+        """进度按批通过 pipeline 写入"""
+        redis = FakeRedis()
+        progress = ProgressBuffer(redis, 'p', batch_size=10, flush_interval=3600)
+        for i in range(25):
+            progress.add(str(i))
+        progress.flush()
+        assert redis.sets['p'] == {str(i) for i in range(25)}
+        assert redis.round_trips == 3
+
+
+class DummySync(TushareSyncBase):
+    PROGRESS_REPORT_EVERY = 1000
+
+    def __init__(self):
+        pass
+
+
+class TestFullSync:
+
+    def test_controller_capped_by_max_concurrency(self):
+        """调用方并发超过 MAX_CONCURRENCY 时被截断，不能抬高上限"""
+        controller = DummySync()._make_concurrency_controller(64)
+        assert controller.limit == DummySync.MAX_CONCURRENCY
+        assert controller.max_limit == DummySync.MAX_CONCURRENCY
+
+        controller = DummySync()._make_concurrency_controller(2)
+        assert controller.limit == 2
+        assert controller.max_limit == DummySync.MAX_CONCURRENCY
+
+    @pytest.mark.asyncio
+    async def test_by_month_resume_and_progress_batched(self):
+        """按月全量：跳过已完成片段，进度批量写入，完成后清除"""
+        redis = FakeRedis()
+        redis.sets['progress'] = {'20240101'}
+        fetched = []
+
+        def fetch_fn(start_date, end_date, limit, offset):
+            fetched.append(start_date)
+            return pd.DataFrame({'trade_date': [start_date]})
+
+        result = await DummySync().run_full_sync(
+            redis_client=redis,
+            fetch_fn=fetch_fn,
+            upsert_fn=len,
+            clean_fn=None,
+            progress_key='progress',
+            strategy='by_month',
+            start_date='20240101',
+            end_date='20241231',
+            concurrency=2,
+        )
+        assert result['success'] == 11 and result['skipped'] == 1 and result['records'] == 11
+        assert '20240101' not in fetched
+        assert 'progress' not in redis.sets
+        # smembers + 1 次 pipeline + scard + delete
+        assert redis.round_trips == 4
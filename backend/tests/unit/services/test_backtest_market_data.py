@@ -0,0 +1,74 @@
+"""
+回测编排市场数据加载单元测试
+
+验证：
+- 默认不复权，显式 price_adjust='qfq' 时前复权
+- 批量查询失败时逐只 load_daily_data，单只股票失败不影响其他股票
+"""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from app.services.backtest_orchestration_service import BacktestOrchestrationService
+
+
+def _daily(code, closes, factors):
+    dates = pd.bdate_range('2024-01-01', periods=len(closes))
+    return pd.DataFrame({
+        'code': code, 'date': dates,
+        'open': closes, 'high': closes, 'low': closes, 'close': closes,
+        'volume': 1000.0, 'amount': 1e4,
+        'adj_factor': factors,
+    })
+
+
+def _service(query_manager):
+    service = BacktestOrchestrationService.__new__(BacktestOrchestrationService)
+    service.data_adapter = MagicMock(query_manager=query_manager)
+    return service
+
+
+def test_default_is_unadjusted():
+    qm = MagicMock()
+    qm.load_market_daily.return_value = _daily('000001.SZ', [10.0, 5.0], [1.0, 2.0])
+    service = _service(qm)
+
+    raw = service._load_market_data(['000001.SZ'], '2024-01-01', '2024-01-02')
+    qfq = service._load_market_data(['000001.SZ'], '2024-01-01', '2024-01-02', price_adjust='qfq')
+
+    assert raw['close'].tolist() == [10.0, 5.0]
+    assert qfq['close'].tolist() == [5.0, 5.0]
+    assert 'adj_factor' not in raw.columns
+
+
+def test_batch_failure_falls_back_to_per_stock_daily():
+    good = _daily('600000.SH', [10.0, 11.0], [1.0, 1.0]).drop(columns=['code', 'adj_factor'])
+
+    def load_daily(stock_code, start_date, end_date):
+        if stock_code == '000001.SZ':
+            raise RuntimeError('bad row')
+        return good.set_index('date')
+
+    qm = MagicMock()
+    qm.load_market_daily.side_effect = RuntimeError('batch failed')
+    qm.load_daily_data.side_effect = load_daily
+
+    market_data = _service(qm)._load_market_data(
+        ['000001.SZ', '600000.SH'], '2024-01-01', '2024-01-02'
+    )
+
+    assert market_data['code'].unique().tolist() == ['600000.SH']
+    assert market_data['close'].tolist() == [10.0, 11.0]
+    qm.load_market_daily.assert_called_once()
+    assert qm.load_daily_data.call_count == 2
+
+
+def test_all_stocks_failing_raises():
+    qm = MagicMock()
+    qm.load_market_daily.side_effect = RuntimeError('db down')
+    qm.load_daily_data.side_effect = RuntimeError('db down')
+
+    with pytest.raises(ValueError):
+        _service(qm)._load_market_data(['000001.SZ'], '2024-01-01', '2024-01-02')
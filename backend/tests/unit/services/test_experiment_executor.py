@@ -0,0 +1,101 @@
+"""
+ExperimentExecutor 单元测试
+
+测试 experiment_executor.py / experiment_runner.py 中的：
+- feature_artifact_key：特征产物键只由数据相关配置决定
+- FeatureArtifact：落盘与 mmap 读取
+- ExperimentResultBuffer：结果合并写入
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pandas as pd
+
+from app.services.experiment_executor import FeatureArtifact, feature_artifact_key
+
+
+def _split_data():
+    index = pd.date_range("2024-01-01", periods=10)
+    X = pd.DataFrame(np.arange(30, dtype=float).reshape(10, 3), index=index, columns=["a", "b", "c"])
+    y = pd.Series(np.arange(10, dtype=float), index=index, name="target")
+    return (X[:6], y[:6], X[6:8], y[6:8], X[8:], y[8:], {"scaler": "robust"})
+
+
+class TestFeatureArtifactKey:
+    """测试特征产物键"""
+
+    def test_model_params_do_not_change_key(self):
+        """只有模型超参数不同的实验共享同一份特征"""
+        base = {"symbol": "000001", "start_date": "20200101", "end_date": "20231231"}
+        lgb = {**base, "model_type": "lightgbm", "model_params": {"num_leaves": 15}}
+        gru = {**base, "model_type": "gru", "model_params": {"hidden_size": 64}}
+
+        assert feature_artifact_key(lgb) == feature_artifact_key(gru)
+        assert feature_artifact_key(base) != feature_artifact_key({**base, "target_period": 10})
+
+    def test_defaults_match_explicit_values(self):
+        """缺省配置与显式默认值等价"""
+        base = {"symbol": "000001", "start_date": "20200101", "end_date": "20231231"}
+        assert feature_artifact_key(base) == feature_artifact_key({**base, "scaler_type": "robust"})
+
+
+class TestFeatureArtifact:
+    """测试共享特征产物"""
+
+    def test_roundtrip_mmap(self, tmp_path):
+        """落盘后以 mmap 只读方式读取，内容一致"""
+        data = _split_data()
+        FeatureArtifact.write(tmp_path / "key", data)
+        loaded = FeatureArtifact(tmp_path / "key").load()
+
+        for i in (0, 2, 4):
+            pd.testing.assert_frame_equal(loaded[i], data[i])
+            pd.testing.assert_series_equal(loaded[i + 1], data[i + 1])
+        assert not loaded[0].to_numpy().flags.writeable
+        assert loaded[6] == {"scaler": "robust"}
+
+    def test_existing_artifact_kept(self, tmp_path):
+        """目标目录已存在时保留先完成的产物"""
+        data = _split_data()
+        FeatureArtifact.write(tmp_path / "key", data)
+        artifact = FeatureArtifact.write(tmp_path / "key", data)
+
+        assert artifact.exists
+        assert [p.name for p in tmp_path.iterdir()] == ["key"]
+
+
+class TestExperimentResultBuffer:
+    """测试结果写缓冲"""
+
+    def test_flush_batches_writes(self):
+        """多个实验结果合并为一次批量写入和一次元数据保存"""
+        from app.services.experiment_runner import ExperimentResultBuffer
+
+        repo = Mock()
+        task_manager = Mock()
+        buffer = ExperimentResultBuffer(1, repo, task_manager, flush_size=100)
+        now = datetime.now()
+        for exp_id in (1, 2, 3):
+            buffer.add_train_result(
+                {"experiment_id": exp_id, "model_id": f"m{exp_id}", "train_started_at": now},
+                {"task_id": f"m{exp_id}"},
+                completed=True,
+            )
+        buffer.add_failure(4, "boom")
+
+        with patch("app.services.batch_manager.BatchManager") as manager_cls:
+            manager_cls.return_value.add_batch_counters = AsyncMock()
+            asyncio.run(buffer.maybe_flush())
+            repo.bulk_update_train_results.assert_not_called()
+
+            asyncio.run(buffer.flush())
+
+        assert len(repo.bulk_update_train_results.call_args[0][0]) == 3
+        repo.bulk_mark_failed.assert_called_once_with([(4, "boom")])
+        task_manager.register_models.assert_called_once()
+        manager_cls.return_value.add_batch_counters.assert_awaited_once_with(
+            1, completed=3, failed=1
+        )
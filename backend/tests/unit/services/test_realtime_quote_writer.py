@@ -0,0 +1,107 @@
+"""
+实时行情微批写入器单元测试
+
+验证：
+- 满 batch_size 条写一次、close() 写出剩余缓冲
+- 数据源停顿时定时线程按 flush_interval 落库
+- 批量写入失败退回逐条写入，on_flush 只收到成功的行情
+- 多线程并发 add 不丢数据
+"""
+
+import threading
+import time
+
+from app.services.realtime_quote_writer import RealtimeQuoteWriter
+
+
+def _quotes(n, start=0):
+    return [{"code": f"{i:06d}", "latest_price": float(i)} for i in range(start, start + n)]
+
+
+class RecordingDB:
+    def __init__(self, fail_codes=()):
+        self.batches = []
+        self.singles = []
+        self.fail_codes = set(fail_codes)
+
+    def save_batch(self, quotes):
+        if any(q["code"] in self.fail_codes for q in quotes):
+            raise ValueError("bad row")
+        self.batches.append([q["code"] for q in quotes])
+        return len(quotes)
+
+    def save_single(self, quote):
+        if quote["code"] in self.fail_codes:
+            raise ValueError("bad row")
+        self.singles.append(quote["code"])
+        return 1
+
+
+class TestRealtimeQuoteWriter:
+
+    def test_flush_by_size_and_on_close(self):
+        db = RecordingDB()
+        flushed = []
+        writer = RealtimeQuoteWriter(db.save_batch, batch_size=4, flush_interval_ms=60_000,
+                                     on_flush=lambda batch: flushed.append(len(batch)))
+        with writer:
+            for quote in _quotes(10):
+                writer.add(quote)
+            assert [len(b) for b in db.batches] == [4, 4]
+
+        assert [len(b) for b in db.batches] == [4, 4, 2]
+        assert flushed == [4, 4, 2]
+        assert writer.saved_count == 10
+        stats = writer.stats()
+        assert stats["flushes"] == 3 and stats["max_batch_rows"] == 4
+
+    def test_flush_by_interval_when_source_stalls(self):
+        db = RecordingDB()
+        writer = RealtimeQuoteWriter(db.save_batch, batch_size=1000, flush_interval_ms=20).start()
+        try:
+            for quote in _quotes(3):
+                writer.add(quote)
+            deadline = time.monotonic() + 2
+            while not db.batches and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert db.batches == [["000000", "000001", "000002"]]
+        finally:
+            writer.close()
+
+    def test_add_after_close_is_written_immediately(self):
+        db = RecordingDB()
+        writer = RealtimeQuoteWriter(db.save_batch, batch_size=100, flush_interval_ms=60_000)
+        writer.close()
+        writer.add(_quotes(1)[0])
+        assert db.batches == [["000000"]]
+
+    def test_batch_failure_falls_back_to_single_rows(self):
+        db = RecordingDB(fail_codes={"000001"})
+        flushed = []
+        writer = RealtimeQuoteWriter(db.save_batch, batch_size=3, flush_interval_ms=60_000,
+                                     save_single=db.save_single,
+                                     on_flush=lambda batch: flushed.extend(q["code"] for q in batch))
+        for quote in _quotes(3):
+            writer.add(quote)
+
+        assert db.singles == ["000000", "000002"]
+        assert flushed == ["000000", "000002"]
+        assert writer.saved_count == 2
+        assert writer.failed_count == 1
+
+    def test_concurrent_adds(self):
+        db = RecordingDB()
+        writer = RealtimeQuoteWriter(db.save_batch, batch_size=7, flush_interval_ms=5).start()
+        threads = [
+            threading.Thread(target=lambda s=s: [writer.add(q) for q in _quotes(200, s * 200)])
+            for s in range(4)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        writer.close()
+
+        written = [code for batch in db.batches for code in batch]
+        assert sorted(written) == [f"{i:06d}" for i in range(800)]
+        assert writer.saved_count == 800
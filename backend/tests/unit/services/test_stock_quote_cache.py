@@ -0,0 +1,209 @@
+"""
+两级行情缓存单元测试
+
+验证：
+- 读取顺序 L1 -> 快照 HMGET -> 单键 MGET -> 数据库，每级一次批量往返
+- 数据库回填使用一次 set_many
+- L1 容量上限 / 过期 / clear 后不回写旧数据
+- 失效广播处理
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.services import stock_quote_cache as sqc
+
+
+class FakeCache:
+    """记录往返次数的内存缓存"""
+
+    def __init__(self):
+        self.kv = {}
+        self.hashes = {}
+        self.calls = []
+        self.published = []
+
+    async def hash_get_many(self, key, fields):
+        self.calls.append("hmget")
+        h = self.hashes.get(key, {})
+        return [h.get(f) for f in fields]
+
+    async def get_many(self, keys):
+        self.calls.append("mget")
+        return [self.kv.get(k) for k in keys]
+
+    async def set_many(self, mapping, ttl=None):
+        self.calls.append("set_many")
+        self.kv.update(mapping)
+        return True
+
+    async def hash_replace(self, key, mapping, ttl=None):
+        self.calls.append("hash_replace")
+        self.hashes[key] = dict(mapping)
+        return True
+
+    async def delete_many(self, keys):
+        self.calls.append("delete_many")
+        return sum(self.kv.pop(k, None) is not None for k in keys)
+
+    async def hash_delete(self, key, fields):
+        h = self.hashes.get(key, {})
+        return sum(h.pop(f, None) is not None for f in fields)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        return 1
+
+
+class FakeRepo:
+    def __init__(self, quotes):
+        self.quotes = quotes
+        self.requested = []
+
+    def get_quotes(self, ts_codes):
+        self.requested.append(list(ts_codes))
+        return {c: self.quotes[c] for c in ts_codes if c in self.quotes}
+
+    def get_all_quotes(self):
+        return dict(self.quotes)
+
+
+QUOTES = {
+    "000001.SZ": {"name": "平安银行", "price": 10.0, "pct_change": 1.0},
+    "600519.SH": {"name": "贵州茅台", "price": 1500.0, "pct_change": -0.5},
+    "300750.SZ": {"name": "宁德时代", "price": 200.0, "pct_change": 2.0},
+}
+
+
+@pytest.fixture
+def env():
+    fake = FakeCache()
+    with patch.object(sqc, "cache", fake), \
+            patch.object(sqc.settings, "REDIS_ENABLED", False), \
+            patch.object(sqc, "is_trading_hours", return_value=True):
+        service = sqc.StockQuoteCache()
+        service._repo = FakeRepo(QUOTES)
+        yield service, fake
+
+
+async def _drain():
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+class TestGetQuotesBatch:
+
+    @pytest.mark.asyncio
+    async def test_miss_goes_to_db_once_and_backfills_in_one_pipeline(self, env):
+        service, fake = env
+        result = await service.get_quotes_batch(["000001.SZ", "600519.SH", "000001.SZ", "999999.SZ"])
+        await _drain()
+
+        assert result["000001.SZ"]["price"] == 10.0
+        assert result["999999.SZ"]["price"] is None
+        assert fake.calls == ["hmget", "mget", "set_many"]
+        assert service._repo.requested == [["000001.SZ", "600519.SH", "999999.SZ"]]
+        assert f"{sqc.KEY_PREFIX}:600519.SH" in fake.kv
+
+        # 第二次全部命中 L1，不访问 Redis / 数据库
+        fake.calls.clear()
+        again = await service.get_quotes_batch(["600519.SH", "000001.SZ"])
+        assert again["600519.SH"]["name"] == "贵州茅台"
+        assert fake.calls == []
+        assert len(service._repo.requested) == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_serves_all_codes_without_db(self, env):
+        service, fake = env
+        assert await service.publish_snapshot() == 3
+        assert fake.published == [(sqc.INVALIDATE_CHANNEL, {"action": "snapshot"})]
+
+        fake.calls.clear()
+        result = await service.get_quotes_batch(list(QUOTES))
+        assert result == QUOTES
+        assert fake.calls == ["hmget"]
+        assert service._repo.requested == []
+
+    @pytest.mark.asyncio
+    async def test_invalidate_fans_out(self, env):
+        service, fake = env
+        await service.publish_snapshot()
+        await service.get_quotes_batch(["000001.SZ"])
+
+        await service.invalidate(["000001.SZ"])
+        assert "000001.SZ" not in fake.hashes[sqc.SNAPSHOT_KEY]
+        assert fake.published[-1] == (
+            sqc.INVALIDATE_CHANNEL, {"action": "invalidate", "codes": ["000001.SZ"]}
+        )
+        assert service._l1.get_many(["000001.SZ"]) == {}
+
+
+class TestL1QuoteCache:
+
+    def test_bounded_lru(self):
+        l1 = sqc._L1QuoteCache(max_entries=2)
+        l1.put_many({"a": {"p": 1}, "b": {"p": 2}}, ttl=60)
+        l1.get_many(["a"])  # a 变为最近使用
+        l1.put_many({"c": {"p": 3}}, ttl=60)
+        assert set(l1.get_many(["a", "b", "c"])) == {"a", "c"}
+
+    def test_expiry_and_copies(self):
+        l1 = sqc._L1QuoteCache(max_entries=10)
+        l1.put_many({"a": {"p": 1}}, ttl=60)
+        l1.get_many(["a"])["a"]["p"] = 99
+        assert l1.get_many(["a"])["a"]["p"] == 1
+
+        with patch.object(sqc._time, "monotonic", return_value=sqc._time.monotonic() + 61):
+            assert l1.get_many(["a"]) == {}
+        assert len(l1) == 0
+
+    def test_stale_generation_is_dropped(self):
+        l1 = sqc._L1QuoteCache(max_entries=10)
+        generation = l1.generation
+        l1.clear()
+        l1.put_many({"a": {"p": 1}}, ttl=60, generation=generation)
+        assert l1.get_many(["a"]) == {}
+
+    def test_handle_message(self, env):
+        service, _ = env
+        service._l1.put_many({"a": {"p": 1}, "b": {"p": 2}}, ttl=60)
+        service._handle_message({"action": "invalidate", "codes": ["a"]})
+        assert set(service._l1.get_many(["a", "b"])) == {"b"}
+        service._handle_message({"action": "snapshot"})
+        assert len(service._l1) == 0
+        service._handle_message(None)  # 非法消息忽略
+
+
+class TestPublishQuotes:
+
+    @pytest.mark.asyncio
+    async def test_flushed_batch_is_visible_to_readers(self, env):
+        service, fake = env
+        fake.hset_calls = []
+
+        async def hash_set_many(key, mapping, ttl=None):
+            fake.hset_calls.append(key)
+            fake.hashes.setdefault(key, {}).update(mapping)
+            return True
+
+        fake.hash_set_many = hash_set_many
+        service._repo.resolve_ts_codes = lambda codes: {"000001": "000001.SZ"}
+        service._l1.put_many({"000001.SZ": {"price": 9.0}}, ttl=60)
+
+        count = await service.publish_quotes([
+            {"code": "000001", "name": "平安银行", "latest_price": "10.5", "volume": 100.0,
+             "pct_change": float("nan")},
+            {"code": "999999", "latest_price": 1.0},  # 无法补全 ts_code，忽略
+        ])
+
+        assert count == 1
+        assert fake.hset_calls == [sqc.SNAPSHOT_KEY]
+        assert fake.published[-1] == (
+            sqc.INVALIDATE_CHANNEL, {"action": "invalidate", "codes": ["000001.SZ"]}
+        )
+        result = await service.get_quotes_batch(["000001.SZ"])
+        quote = result["000001.SZ"]
+        assert quote["price"] == quote["latest_price"] == 10.5
+        assert quote["volume"] == 100 and quote["pct_change"] is None
@@ -0,0 +1,100 @@
+"""
+已编译策略类缓存单元测试
+
+验证：
+- 相同 code_hash 只编译执行一次，实例彼此独立
+- 源码与 code_hash 不同步时不复用旧类
+- 按策略 ID 失效 / LRU 容量上限
+- 离场策略通过一次 get_by_ids 批量加载
+"""
+
+import hashlib
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import strategy_loader as sl
+from app.services.strategy_loader import StrategyDynamicLoader
+
+EXIT_CODE = '''
+class HoldExit(BaseExitStrategy):
+    def __init__(self, days=5):
+        self.days = days
+
+    def should_exit(self, *args, **kwargs):
+        return None
+'''
+
+
+def _record(strategy_id, code=EXIT_CODE, code_hash=None, params=None):
+    return {
+        'id': strategy_id,
+        'name': f'exit_{strategy_id}',
+        'display_name': f'离场 {strategy_id}',
+        'class_name': 'HoldExit',
+        'code': code,
+        'code_hash': code_hash or hashlib.sha256(code.encode()).hexdigest()[:16],
+        'strategy_type': 'exit',
+        'default_params': params or {},
+    }
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    cache = sl._CompiledStrategyCache(max_entries=2)
+    with patch.object(sl, '_class_cache', cache):
+        yield cache
+
+
+class TestCompiledStrategyCache:
+
+    def test_same_hash_compiles_once(self, fresh_cache):
+        with patch.object(sl, 'exec', wraps=exec, create=True) as exec_spy:
+            a = StrategyDynamicLoader.load_strategy(_record(1, params={'days': 3}))
+            b = StrategyDynamicLoader.load_strategy(_record(1), custom_config={'days': 7})
+
+        assert exec_spy.call_count == 1
+        assert type(a) is type(b)
+        assert (a.days, b.days) == (3, 7)
+        stats = StrategyDynamicLoader.cache_stats()
+        assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+
+    def test_stale_hash_does_not_reuse_class(self, fresh_cache):
+        first = StrategyDynamicLoader.load_strategy(_record(1, code_hash='legacy'))
+        changed = EXIT_CODE.replace('days=5', 'days=9')
+        second = StrategyDynamicLoader.load_strategy(_record(1, code=changed, code_hash='legacy'))
+
+        assert type(first) is not type(second)
+        assert second.days == 9
+
+    def test_invalidate_and_lru(self, fresh_cache):
+        for strategy_id in (1, 2):
+            StrategyDynamicLoader.load_strategy(
+                _record(strategy_id, code=EXIT_CODE + f'\n# {strategy_id}\n')
+            )
+        assert StrategyDynamicLoader.invalidate_cache(1) == 1
+        assert StrategyDynamicLoader.invalidate_cache(1) == 0
+
+        for strategy_id in (3, 4):
+            StrategyDynamicLoader.load_strategy(
+                _record(strategy_id, code=EXIT_CODE + f'\n# {strategy_id}\n')
+            )
+        stats = fresh_cache.stats()
+        assert stats['size'] == 2 and stats['evictions'] == 1
+
+
+class TestLoadExitManager:
+
+    def test_batch_loads_with_single_query(self):
+        repo = MagicMock()
+        repo.get_by_ids.return_value = {
+            1: _record(1),
+            2: dict(_record(2), strategy_type='entry'),
+        }
+        with patch('src.ml.exit_strategy.CompositeExitManager') as manager_cls:
+            StrategyDynamicLoader.load_exit_manager([1, 2, 3], repo)
+
+        repo.get_by_ids.assert_called_once_with([1, 2, 3])
+        repo.get_by_id.assert_not_called()
+        loaded = manager_cls.call_args.kwargs['exit_strategies']
+        assert len(loaded) == 1 and loaded[0].days == 5
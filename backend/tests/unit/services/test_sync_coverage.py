@@ -0,0 +1,364 @@
+"""
+同步覆盖索引测试（交易日判定 / 切片规划 / 与 TushareSyncBase 的集成）
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app.services import tushare_sync_base
+from app.services.sync_coverage import (
+    COMPLETE,
+    MISSING,
+    RECENT,
+    SUSPECT,
+    CoverageIndex,
+    build_coverage_index,
+)
+from app.services.tushare_sync_base import TushareSyncBase
+
+from tests.unit.services.test_adaptive_concurrency import FakeRedis
+
+JAN_DAYS = ['20240102', '20240103', '20240104', '20240105', '20240108', '20240109']
+FEB_DAYS = ['20240201', '20240202', '20240205']
+
+
+def _index(counts, trading_days=JAN_DAYS + FEB_DAYS, confirmed=()):
+    return CoverageIndex(
+        table_key='moneyflow',
+        trading_days=list(trading_days),
+        counts=counts,
+        confirmed_ranges=list(confirmed),
+    )
+
+
+class TestCoverageIndex:
+
+    def test_missing_and_suspect_days(self):
+        counts = {d: 5000 for d in JAN_DAYS + FEB_DAYS}
+        counts.pop('20240104')
+        counts['20240202'] = 1200
+        index = _index(counts)
+
+        assert index.status('20240103') == COMPLETE
+        assert index.status('20240104') == MISSING
+        assert index.status('20240202') == SUSPECT
+        assert index.status('20240106') == COMPLETE  # 非交易日
+        assert index.incomplete_days() == ['20240104', '20240202']
+        assert index.summary() == {COMPLETE: 7, MISSING: 1, SUSPECT: 1, RECENT: 0}
+
+    def test_typical_count_is_local(self):
+        """截面规模变化时按邻近交易日判断，不误判早期数据"""
+        days = [f"2024{m:02d}{d:02d}" for m in (1, 2, 3, 4) for d in range(1, 21)]
+        counts = {d: (1000 if d < '20240301' else 5000) for d in days}
+        assert _index(counts, trading_days=days).incomplete_days() == []
+
+    def test_confirmed_range_accepts_empty_days(self):
+        """成功同步且已收盘的交易日即使无数据也视为完整；最后一天仍需核对"""
+        counts = {d: 100 for d in JAN_DAYS}
+        counts.pop('20240103')
+        counts.pop('20240109')
+        index = _index(counts, trading_days=JAN_DAYS, confirmed=[('20240101', '20240109')])
+
+        assert index.status('20240103') == COMPLETE
+        assert index.status('20240109') == MISSING
+
+    def test_confirmed_range_does_not_hide_suspect_days(self):
+        """确认区间只豁免缺失日，行数异常偏少的交易日仍需重新拉取"""
+        counts = {d: 5000 for d in JAN_DAYS}
+        counts['20240104'] = 10
+        index = _index(counts, trading_days=JAN_DAYS, confirmed=[('20240101', '20240109')])
+
+        assert index.status('20240104') == SUSPECT
+
+    def test_plan_segments(self):
+        counts = {d: 5000 for d in JAN_DAYS}
+        index = _index(counts)
+        segments = [('20240101', '20240131'), ('20240201', '20240229'), ('20240210', '20240216')]
+
+        pending, covered = index.plan(segments)
+
+        assert pending == [('20240201', '20240229')]
+        assert covered == [('20240101', '20240131'), ('20240210', '20240216')]
+
+    def test_refresh_recent_days(self):
+        """末尾交易日与回看窗口起的交易日即使行数完整也待刷新"""
+        index = _index({d: 5000 for d in JAN_DAYS + FEB_DAYS})
+        index.refresh_recent(recent_days=2)
+
+        assert index.incomplete_days() == ['20240202', '20240205']
+        assert index.status('20240202') == RECENT
+
+        index.refresh_recent(refresh_from='20240108')
+        assert index.incomplete_days()[0] == '20240108'
+
+    def test_build_from_repositories(self):
+        coverage_repo = MagicMock()
+        coverage_repo.get_date_counts.return_value = {'20240102': 10}
+        coverage_repo.get_confirmed_ranges.return_value = []
+        calendar_repo = MagicMock()
+        calendar_repo.get_trading_days_between.return_value = ['20240102', '20240103']
+
+        index = build_coverage_index(
+            'moneyflow', 'moneyflow', 'trade_date', '20240101', '20240103',
+            coverage_repo=coverage_repo, calendar_repo=calendar_repo,
+        )
+
+        coverage_repo.get_date_counts.assert_called_once_with(
+            'moneyflow', 'trade_date', '20240101', '20240103'
+        )
+        assert index.incomplete_days() == ['20240103']
+
+
+class FakeRepo:
+    TABLE_NAME = 'moneyflow'
+
+    def bulk_upsert(self, df):
+        return len(df)
+
+
+class DummySync(TushareSyncBase):
+    TABLE_KEY = 'moneyflow'
+    PROGRESS_REPORT_EVERY = 1000
+
+    def __init__(self):
+        self.sync_history_repo = MagicMock()
+        self.sync_history_repo.create.return_value = 1
+
+
+@pytest.fixture
+def coverage():
+    counts = {d: 5000 for d in JAN_DAYS}
+    index = _index(counts)
+    with patch.object(tushare_sync_base, 'build_coverage_index', return_value=index) as build, \
+            patch.object(tushare_sync_base.settings, 'SYNC_COVERAGE_RECENT_DAYS', 0), \
+            patch('app.repositories.sync_config_repository.SyncConfigRepository') as config_repo:
+        config_repo.return_value.get_by_table_key.return_value = None
+        yield build
+
+
+class TestSyncIntegration:
+
+    @pytest.mark.asyncio
+    async def test_full_sync_skips_covered_segments(self, coverage):
+        redis = FakeRedis()
+        fetched = []
+
+        def fetch_fn(start_date, end_date, limit, offset):
+            fetched.append(start_date)
+            return pd.DataFrame({'trade_date': [start_date]})
+
+        result = await DummySync().run_full_sync(
+            redis_client=redis,
+            fetch_fn=fetch_fn,
+            upsert_fn=FakeRepo().bulk_upsert,
+            clean_fn=None,
+            progress_key='progress',
+            strategy='by_month',
+            start_date='20240101',
+            end_date='20240229',
+            table_key='moneyflow',
+        )
+
+        assert fetched == ['20240201']
+        assert result['skipped'] == 1 and result['success'] == 1
+        assert 'progress' not in redis.sets
+
+    @pytest.mark.asyncio
+    async def test_incremental_date_range_starts_at_first_gap(self, coverage):
+        calls = []
+
+        def fetch_fn(start_date, end_date, limit, offset):
+            calls.append(start_date)
+            return pd.DataFrame({'trade_date': ['20240201']})
+
+        result = await DummySync().run_incremental_sync(
+            fetch_fn=fetch_fn,
+            upsert_fn=FakeRepo().bulk_upsert,
+            clean_fn=None,
+            table_key='moneyflow',
+            date_col='trade_date',
+            sync_strategy='by_date_range',
+            start_date='20240101',
+            end_date='20240205',
+        )
+
+        assert calls == ['20240201']
+        assert result['records'] == 1
+
+    @pytest.mark.asyncio
+    async def test_incremental_slices_nothing_to_fetch(self, coverage):
+        fetch_fn = MagicMock()
+
+        result = await DummySync().run_incremental_sync(
+            fetch_fn=fetch_fn,
+            upsert_fn=FakeRepo().bulk_upsert,
+            clean_fn=None,
+            table_key='moneyflow',
+            date_col='trade_date',
+            sync_strategy='by_month',
+            start_date='20240101',
+            end_date='20240131',
+        )
+
+        fetch_fn.assert_not_called()
+        assert result['records'] == 0
+
+    @pytest.mark.asyncio
+    async def test_other_date_column_not_planned(self, coverage):
+        fetch_fn = MagicMock(return_value=pd.DataFrame())
+
+        await DummySync().run_incremental_sync(
+            fetch_fn=fetch_fn,
+            upsert_fn=FakeRepo().bulk_upsert,
+            clean_fn=None,
+            table_key='moneyflow',
+            date_col='ann_date',
+            sync_strategy='by_month',
+            start_date='20240101',
+            end_date='20240131',
+        )
+
+        coverage.assert_not_called()
+        assert fetch_fn.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_full_sync_refetches_recent_days(self, coverage):
+        redis = FakeRedis()
+        fetched = []
+
+        def fetch_fn(start_date, end_date, limit, offset):
+            fetched.append(start_date)
+            return pd.DataFrame({'trade_date': [start_date]})
+
+        with patch.object(tushare_sync_base.settings, 'SYNC_COVERAGE_RECENT_DAYS', 5):
+            await DummySync().run_full_sync(
+                redis_client=redis,
+                fetch_fn=fetch_fn,
+                upsert_fn=FakeRepo().bulk_upsert,
+                clean_fn=None,
+                progress_key='progress',
+                strategy='by_month',
+                start_date='20240101',
+                end_date='20240229',
+                table_key='moneyflow',
+            )
+
+        # 1 月末尾两个交易日落在最近 5 个交易日内，整月重新拉取
+        assert fetched == ['20240101', '20240201']
+
+    @pytest.mark.asyncio
+    async def test_full_sync_ignore_coverage(self, coverage):
+        fetched = []
+
+        def fetch_fn(start_date, end_date, limit, offset):
+            fetched.append(start_date)
+            return pd.DataFrame({'trade_date': [start_date]})
+
+        await DummySync().run_full_sync(
+            redis_client=FakeRedis(),
+            fetch_fn=fetch_fn,
+            upsert_fn=FakeRepo().bulk_upsert,
+            clean_fn=None,
+            progress_key='progress',
+            strategy='by_month',
+            start_date='20240101',
+            end_date='20240229',
+            table_key='moneyflow',
+            ignore_coverage=True,
+        )
+
+        coverage.assert_not_called()
+        assert sorted(fetched) == ['20240101', '20240201']
+
+    @pytest.mark.asyncio
+    async def test_incremental_lookback_window_not_skipped(self, coverage):
+        calls = []
+
+        def fetch_fn(start_date, end_date, limit, offset):
+            calls.append(start_date)
+            return pd.DataFrame()
+
+        with patch.object(tushare_sync_base, 'datetime') as fake_datetime:
+            fake_datetime.now.return_value = datetime(2024, 1, 12)
+            fake_datetime.strptime = datetime.strptime
+            await DummySync().run_incremental_sync(
+                fetch_fn=fetch_fn,
+                upsert_fn=FakeRepo().bulk_upsert,
+                clean_fn=None,
+                table_key='moneyflow',
+                date_col='trade_date',
+                sync_strategy='by_date_range',
+                start_date='20240101',
+                end_date='20240205',
+                lookback_days=7,
+            )
+
+        # 回看窗口起点 20240105：完整的 20240105 / 20240108 / 20240109 仍重新拉取
+        assert calls == ['20240105']
+
+    @pytest.mark.asyncio
+    async def test_incremental_lookback_from_sync_config(self, coverage):
+        fetch_fn = MagicMock(return_value=pd.DataFrame())
+
+        with patch('app.repositories.sync_config_repository.SyncConfigRepository') as config_repo:
+            config_repo.return_value.get_by_table_key.return_value = {'incremental_default_days': 3650}
+            await DummySync().run_incremental_sync(
+                fetch_fn=fetch_fn,
+                upsert_fn=FakeRepo().bulk_upsert,
+                clean_fn=None,
+                table_key='moneyflow',
+                date_col='trade_date',
+                sync_strategy='by_month',
+                start_date='20240101',
+                end_date='20240131',
+            )
+
+        assert fetch_fn.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_full_sync_history_records_loaded_max_date(self, coverage):
+        sync = DummySync()
+
+        def fetch_fn(start_date, end_date, limit, offset):
+            return pd.DataFrame({'trade_date': ['20240201', '20240202']})
+
+        await sync.run_full_sync(
+            redis_client=FakeRedis(),
+            fetch_fn=fetch_fn,
+            upsert_fn=FakeRepo().bulk_upsert,
+            clean_fn=None,
+            progress_key='progress',
+            strategy='by_month',
+            start_date='20240101',
+            end_date='20240229',
+            table_key='moneyflow',
+        )
+
+        args = sync.sync_history_repo.complete.call_args[0]
+        assert args[1] == 'success' and args[3] == '20240202'
+
+    @pytest.mark.asyncio
+    async def test_full_sync_truncated_segment_not_confirmed(self, coverage):
+        sync = DummySync()
+        sync.MAX_OFFSET = 2
+
+        def fetch_fn(start_date, end_date, limit, offset):
+            return pd.DataFrame({'trade_date': ['20240201'] * limit})
+
+        await sync.run_full_sync(
+            redis_client=FakeRedis(),
+            fetch_fn=fetch_fn,
+            upsert_fn=FakeRepo().bulk_upsert,
+            clean_fn=None,
+            progress_key='progress',
+            strategy='by_month',
+            start_date='20240101',
+            end_date='20240229',
+            table_key='moneyflow',
+            api_limit=2,
+        )
+
+        sync.sync_history_repo.complete.assert_not_called()
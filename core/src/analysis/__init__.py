@@ -3,6 +3,7 @@
 
 包含：
 - 因子有效性分析（IC、分层回测、相关性）
+- 因子截面预处理（去极值、行业市值中性化、标准化）
 - 因子组合优化
 - 策略参数优化（网格搜索、贝叶斯优化、Walk-Forward）
 - 统一因子分析器门面（FactorAnalyzer）⭐ 新增
@@ -12,6 +13,8 @@ from .ic_calculator import ICCalculator
 from .layering_test import LayeringTest
 from .factor_correlation import FactorCorrelation
 from .factor_optimizer import FactorOptimizer
+from .factor_preprocessor import CrossSectionalPreprocessor
+from .factor_report_pipeline import FactorReportPipeline, FactorStack, SharedIntermediates
 from .factor_analyzer import (
     FactorAnalyzer,
     FactorAnalysisReport,
@@ -27,6 +30,14 @@ __all__ = [
     'FactorCorrelation',
     'FactorOptimizer',
 
+    # 因子截面预处理
+    'CrossSectionalPreprocessor',
+
+    # 多因子报告流水线
+    'FactorReportPipeline',
+    'FactorStack',
+    'SharedIntermediates',
+
     # 新增：统一门面
     'FactorAnalyzer',
     'FactorAnalysisReport',
@@ -20,6 +20,7 @@ class FactorAnalysisReport:
 
     # IC分析结果
     ic_result: Optional[ICResult] = None
+    ic_decay: Optional[pd.DataFrame] = None  # 不同前瞻期的IC（index=持有期）
 
     # 分层测试结果
     layering_result: Optional[pd.DataFrame] = None
@@ -45,6 +46,9 @@ class FactorAnalysisReport:
         if self.ic_result:
             result['ic_analysis'] = self.ic_result.to_dict()
 
+        if self.ic_decay is not None:
+            result['ic_decay'] = self.ic_decay.to_dict('index')
+
         if self.layering_result is not None:
             result['layering_test'] = self.layering_result.to_dict()
 
@@ -16,18 +16,19 @@
 
 import time
 import warnings
+from dataclasses import replace
 from typing import Dict, List, Optional, Tuple, Union, Any
 
 import pandas as pd
 
 from src.utils.logger import get_logger
-from src.utils.response import Response, ResponseStatus
+from src.utils.response import Response
 from .ic_calculator import ICCalculator, ICResult
 from .layering_test import LayeringTest
 from .factor_correlation import FactorCorrelation
 from .factor_optimizer import FactorOptimizer, OptimizationResult
+from .factor_report_pipeline import FactorReportPipeline, PipelineResult
 from ._report import FactorAnalysisReport
-from ._batch_worker import _analyze_single_factor_worker_v2
 
 # 导入异常类
 try:
@@ -51,7 +52,6 @@ logger = get_logger(__name__)
 
 # 并行计算支持检测
 try:
-    from utils.parallel_executor import ParallelExecutor
     from config.features import ParallelComputingConfig, get_feature_config
     HAS_PARALLEL_SUPPORT = True
 except ImportError:
@@ -416,60 +416,16 @@ class FactorAnalyzer:
         """
         logger.info(f"对比{len(factor_dict)}个因子...")
 
-        results = []
-
-        for factor_name, factor_df in factor_dict.items():
-            try:
-                response = self.quick_analyze(
-                    factor_df, prices,
-                    factor_name=factor_name,
-                    include_layering=True
-                )
-
-                if not (response.is_success() or response.status.name == 'WARNING'):
-                    logger.warning(f"分析因子{factor_name}失败: {response.error}")
-                    continue
-
-                report = response.data
-
-                row = {'因子名': factor_name}
-
-                if report.ic_result:
-                    row.update({
-                        'IC均值': report.ic_result.mean_ic,
-                        'IC标准差': report.ic_result.std_ic,
-                        'ICIR': report.ic_result.ic_ir,
-                        'IC正值率': report.ic_result.positive_rate,
-                    })
-
-                if report.layering_summary:
-                    row.update({
-                        '是否单调': report.layering_summary.get('是否单调', False),
-                        '收益差距': report.layering_summary.get('收益差距', 0),
-                    })
-
-                row['综合评分'] = report.overall_score or 0
-                results.append(row)
-
-            except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
-                logger.warning(f"分析因子{factor_name}失败(已知异常): {e}")
-            except Exception as e:
-                logger.warning(f"分析因子{factor_name}失败(未预期异常): {e}", exc_info=True)
-
-        comparison_df = pd.DataFrame(results)
-
-        if rank_by == 'ic':
-            comparison_df = comparison_df.sort_values('IC均值', ascending=False)
-        elif rank_by == 'ic_ir':
-            comparison_df = comparison_df.sort_values('ICIR', ascending=False)
-        elif rank_by == 'overall_score':
-            comparison_df = comparison_df.sort_values('综合评分', ascending=False)
+        with_correlation = include_correlation and len(factor_dict) > 1
+        result = self._run_pipeline(factor_dict, prices, keep_stack=with_correlation)
+        comparison_df = self._comparison_frame(result.reports, rank_by)
 
-        if include_correlation and len(factor_dict) > 1:
+        if with_correlation:
             try:
                 corr_matrix = self.correlation_analyzer.calculate_factor_correlation(
                     factor_dict,
-                    aggregate_method='concat'
+                    aggregate_method='concat',
+                    stack=result.stack
                 )
                 logger.info(f"相关性分析完成: {corr_matrix.shape}")
             except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
@@ -504,57 +460,60 @@ class FactorAnalyzer:
         """
         logger.info(f"优化因子组合: {len(factor_dict)}个因子, 方法={optimization_method}")
 
-        ic_series_dict = {}
-        ic_stats_list = []
+        result = self._build_pipeline().run(factor_dict, prices, include_layering=False)
+        for factor_name, error in result.errors.items():
+            logger.warning(f"计算{factor_name}的IC失败: {error}")
+        for factor_name, warn_msgs in result.warnings.items():
+            logger.warning(f"计算{factor_name}的IC失败: {'; '.join(warn_msgs)}")
 
-        for factor_name, factor_df in factor_dict.items():
-            try:
-                ic_response = self.ic_calculator.calculate_ic_stats(factor_df, prices)
-                if ic_response.is_success():
-                    ic_result = ic_response.data
-                    ic_series_dict[factor_name] = ic_result.ic_series
-                    ic_stats_list.append({
-                        '因子名': factor_name,
-                        'IC均值': ic_result.mean_ic,
-                        'IC标准差': ic_result.std_ic,
-                        'ICIR': ic_result.ic_ir
-                    })
-                else:
-                    error_msg = ic_response.error if hasattr(ic_response, 'error') else str(ic_response)
-                    logger.warning(f"计算{factor_name}的IC失败: {error_msg}")
-            except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
-                logger.warning(f"计算{factor_name}的IC失败(已知异常): {e}")
-            except Exception as e:
-                logger.warning(f"计算{factor_name}的IC失败(未预期异常): {e}", exc_info=True)
+        opt_result = self._optimize_from_ic(
+            result.ic_results(), factor_dict, optimization_method, max_weight, min_weight
+        )
+        combined_factor = self.optimizer.combine_factors(factor_dict, opt_result.weights, normalize=True)
 
-        ic_stats_df = pd.DataFrame(ic_stats_list).set_index('因子名')
+        logger.info(f"因子组合完成: ICIR={opt_result.ic_ir:.4f}")
+
+        return opt_result, combined_factor
+
+    def _optimize_from_ic(
+        self,
+        ic_results: Dict[str, ICResult],
+        factor_dict: Dict[str, pd.DataFrame],
+        optimization_method: str,
+        max_weight: float,
+        min_weight: float
+    ) -> OptimizationResult:
+        """由已计算的IC结果求组合权重（不重新计算IC）"""
+        ic_series_dict = {name: ic_result.ic_series for name, ic_result in ic_results.items()}
+        ic_stats_df = pd.DataFrame([
+            {
+                '因子名': name,
+                'IC均值': ic_result.mean_ic,
+                'IC标准差': ic_result.std_ic,
+                'ICIR': ic_result.ic_ir
+            }
+            for name, ic_result in ic_results.items()
+        ]).set_index('因子名')
 
         if optimization_method == 'equal':
             weights = self.optimizer.equal_weight(list(factor_dict.keys()))
-            opt_result = OptimizationResult(weights=weights, objective_value=0, ic_mean=0, ic_ir=0, method='equal')
+            return OptimizationResult(weights=weights, objective_value=0, ic_mean=0, ic_ir=0, method='equal')
         elif optimization_method == 'ic':
             weights = self.optimizer.ic_weight(ic_stats_df)
-            opt_result = OptimizationResult(weights=weights, objective_value=0, ic_mean=0, ic_ir=0, method='ic')
+            return OptimizationResult(weights=weights, objective_value=0, ic_mean=0, ic_ir=0, method='ic')
         elif optimization_method == 'ic_ir':
             weights = self.optimizer.ic_ir_weight(ic_stats_df)
-            opt_result = OptimizationResult(weights=weights, objective_value=0, ic_mean=0, ic_ir=0, method='ic_ir')
+            return OptimizationResult(weights=weights, objective_value=0, ic_mean=0, ic_ir=0, method='ic_ir')
         elif optimization_method == 'max_icir':
-            opt_result = self.optimizer.optimize_max_icir(
+            return self.optimizer.optimize_max_icir(
                 ic_series_dict,
                 method='SLSQP',
                 max_weight=max_weight,
                 min_weight=min_weight
             )
-            weights = opt_result.weights
         else:
             raise ValueError(f"未知的优化方法: {optimization_method}")
 
-        combined_factor = self.optimizer.combine_factors(factor_dict, weights, normalize=True)
-
-        logger.info(f"因子组合完成: ICIR={opt_result.ic_ir:.4f}")
-
-        return opt_result, combined_factor
-
     def generate_full_report(
         self,
         factor_dict: Dict[str, pd.DataFrame],
@@ -563,11 +522,15 @@ class FactorAnalyzer:
         include_layering: bool = True,
         include_correlation: bool = True,
         include_optimization: bool = True,
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        decay_periods: Optional[List[int]] = None
     ) -> Dict[str, Any]:
         """
         生成完整的多因子分析报告（高级用法）
 
+        所有因子经 FactorReportPipeline 一次遍历完成 IC / 分层 / IC衰减，
+        单因子分析、对比、相关性与组合优化均复用同一份结果。
+
         Args:
             factor_dict: 因子字典
             prices: 价格DataFrame
@@ -576,6 +539,7 @@ class FactorAnalyzer:
             include_correlation: 是否包含相关性分析
             include_optimization: 是否包含组合优化
             output_path: 报告输出路径（可选）
+            decay_periods: IC衰减分析的前瞻期列表（可选，结果写入单因子的 ic_decay）
 
         Returns:
             完整报告字典
@@ -594,47 +558,63 @@ class FactorAnalyzer:
             'optimization': None
         }
 
-        # 1. 单因子分析
+        with_correlation = include_correlation and len(factor_dict) > 1
+        try:
+            result = self._run_pipeline(
+                factor_dict, prices,
+                keep_stack=with_correlation,
+                decay_periods=decay_periods
+            )
+        except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
+            logger.warning(f"因子分析失败(已知异常): {e}")
+            result = None
+        except Exception as e:
+            logger.warning(f"因子分析失败(未预期异常): {e}", exc_info=True)
+            result = None
+
+        if result is None:
+            return self._save_report(report, output_path)
+
+        # 1. 单因子分析（按 include_ic / include_layering 裁剪）
         if include_ic or include_layering:
-            for factor_name, factor_df in factor_dict.items():
-                try:
-                    response = self.analyze_factor(
-                        factor_df, prices,
-                        factor_name=factor_name,
-                        include_ic=include_ic,
-                        include_layering=include_layering
-                    )
-                    if response.is_success() or response.status.name == 'WARNING':
-                        factor_report = response.data
-                        report['individual_analysis'][factor_name] = factor_report.to_dict()
-                    else:
-                        logger.warning(f"分析因子{factor_name}失败: {response.error}")
-                except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
-                    logger.warning(f"分析因子{factor_name}失败(已知异常): {e}")
-                except Exception as e:
-                    logger.warning(f"分析因子{factor_name}失败(未预期异常): {e}", exc_info=True)
+            for factor_name, full_report in result.reports.items():
+                factor_report = replace(
+                    full_report,
+                    ic_result=full_report.ic_result if include_ic else None,
+                    ic_decay=full_report.ic_decay if include_ic else None,
+                    layering_result=full_report.layering_result if include_layering else None,
+                    layering_summary=full_report.layering_summary if include_layering else None
+                )
+                if factor_report.ic_result is None and factor_report.layering_result is None:
+                    logger.warning(f"分析因子{factor_name}失败: 所有分析项目均失败")
+                    continue
+                factor_report.overall_score = self._calculate_overall_score(factor_report)
+                factor_report.recommendation = self._generate_recommendation(factor_report)
+                report['individual_analysis'][factor_name] = factor_report.to_dict()
 
         # 2. 因子对比
         try:
-            comparison_df = self.compare_factors(factor_dict, prices, include_correlation=False, rank_by='ic_ir')
+            comparison_df = self._comparison_frame(result.reports, rank_by='ic_ir')
             report['comparison'] = comparison_df.to_dict('records')
         except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
             logger.warning(f"因子对比失败(已知异常): {e}")
         except Exception as e:
             logger.warning(f"因子对比失败(未预期异常): {e}", exc_info=True)
 
-        # 3. 相关性分析
-        if include_correlation and len(factor_dict) > 1:
+        # 3. 相关性分析（复用流水线对齐后的因子立方体及截面秩）
+        if with_correlation:
             try:
                 corr_matrix = self.correlation_analyzer.calculate_factor_correlation(
-                    factor_dict, aggregate_method='concat'
+                    factor_dict, aggregate_method='concat', stack=result.stack
                 )
                 high_corr_pairs = self.correlation_analyzer.find_high_correlation_pairs(corr_matrix, threshold=0.7)
                 report['correlation'] = {
                     'correlation_matrix': corr_matrix.to_dict(),
-                    'high_correlation_pairs': [
+                    'high_correlation_pairs': [] if high_corr_pairs.empty else [
                         {'factor1': f1, 'factor2': f2, 'correlation': float(corr)}
-                        for f1, f2, corr in high_corr_pairs
+                        for f1, f2, corr in high_corr_pairs[['因子1', '因子2', '相关系数']].itertuples(
+                            index=False, name=None
+                        )
                     ]
                 }
             except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
@@ -642,17 +622,22 @@ class FactorAnalyzer:
             except Exception as e:
                 logger.warning(f"相关性分析失败(未预期异常): {e}", exc_info=True)
 
-        # 4. 组合优化
+        # 4. 组合优化（复用已计算的IC序列）
         if include_optimization and len(factor_dict) > 1:
             try:
-                opt_result, _ = self.optimize_factor_portfolio(factor_dict, prices, optimization_method='max_icir')
+                opt_result = self._optimize_from_ic(
+                    result.ic_results(), factor_dict, 'max_icir', max_weight=0.5, min_weight=0.0
+                )
                 report['optimization'] = opt_result.to_dict()
             except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
                 logger.warning(f"组合优化失败(已知异常): {e}")
             except Exception as e:
                 logger.warning(f"组合优化失败(未预期异常): {e}", exc_info=True)
 
-        # 5. 保存报告
+        return self._save_report(report, output_path)
+
+    def _save_report(self, report: Dict[str, Any], output_path: Optional[str]) -> Dict[str, Any]:
+        """保存完整报告（可选）"""
         if output_path:
             import json
             with open(output_path, 'w', encoding='utf-8') as f:
@@ -698,24 +683,9 @@ class FactorAnalyzer:
                 else:
                     logger.warning("并行计算模块未找到，将忽略n_jobs参数")
 
-            use_parallel = (
-                HAS_PARALLEL_SUPPORT and
-                self.parallel_config and
-                self.parallel_config.enable_parallel and
-                self.parallel_config.n_workers > 1 and
-                len(factor_dict) >= 4
-            )
-
-            if use_parallel:
-                logger.debug(
-                    f"使用并行批量分析: {len(factor_dict)}个因子, "
-                    f"{self.parallel_config.n_workers}个worker"
-                )
-                reports = self._batch_analyze_parallel(factor_dict, prices)
-            else:
-                if len(factor_dict) < 4:
-                    logger.debug(f"因子数量较少({len(factor_dict)})，使用串行分析")
-                reports = self._batch_analyze_serial(factor_dict, prices)
+            result = self._run_pipeline(factor_dict, prices)
+            reports = result.reports
+            use_parallel = result.n_blocks > 1 and self._pipeline_jobs() > 1
 
             elapsed_time = time.time() - start_time
             success_count = len(reports)
@@ -739,7 +709,8 @@ class FactorAnalyzer:
                     success_count=success_count,
                     failed_count=failed_count,
                     elapsed_time=f"{elapsed_time:.2f}s",
-                    parallel_mode="并行" if use_parallel else "串行"
+                    parallel_mode="并行" if use_parallel else "串行",
+                    n_blocks=result.n_blocks
                 )
             else:
                 return Response.success(
@@ -748,7 +719,8 @@ class FactorAnalyzer:
                     total_factors=total_count,
                     success_count=success_count,
                     elapsed_time=f"{elapsed_time:.2f}s",
-                    parallel_mode="并行" if use_parallel else "串行"
+                    parallel_mode="并行" if use_parallel else "串行",
+                    n_blocks=result.n_blocks
                 )
 
         except Exception as e:
@@ -759,77 +731,91 @@ class FactorAnalyzer:
                 total_factors=len(factor_dict) if factor_dict else 0
             )
 
-    def _batch_analyze_serial(
-        self,
-        factor_dict: Dict[str, pd.DataFrame],
-        prices: pd.DataFrame
-    ) -> Dict[str, FactorAnalysisReport]:
-        """串行批量分析（内部方法）"""
-        reports = {}
-
-        for factor_name, factor_df in factor_dict.items():
-            try:
-                response = self.quick_analyze(factor_df, prices, factor_name=factor_name)
-                if response.is_success() or response.status == ResponseStatus.WARNING:
-                    reports[factor_name] = response.data
-                else:
-                    logger.warning(f"分析因子{factor_name}失败: {response.error}")
-            except (DataValidationError, InsufficientDataError, FeatureCalculationError) as e:
-                logger.warning(f"分析因子{factor_name}失败(已知异常): {e}")
-            except Exception as e:
-                logger.warning(f"分析因子{factor_name}失败(未预期异常): {e}", exc_info=True)
-
-        return reports
+    def _pipeline_jobs(self) -> int:
+        """流水线分块并行线程数（沿用并行计算配置的 worker 数）"""
+        if (
+            HAS_PARALLEL_SUPPORT and
+            self.parallel_config and
+            self.parallel_config.enable_parallel and
+            self.parallel_config.n_workers > 1
+        ):
+            return self.parallel_config.n_workers
+        return 1
+
+    def _build_pipeline(self, decay_periods: Optional[List[int]] = None) -> FactorReportPipeline:
+        return FactorReportPipeline(
+            forward_periods=self.forward_periods,
+            n_layers=self.n_layers,
+            holding_period=self.holding_period,
+            method=self.method,
+            long_short=self.long_short,
+            decay_periods=decay_periods,
+            n_jobs=self._pipeline_jobs()
+        )
 
-    def _batch_analyze_parallel(
+    def _run_pipeline(
         self,
         factor_dict: Dict[str, pd.DataFrame],
-        prices: pd.DataFrame
-    ) -> Dict[str, FactorAnalysisReport]:
+        prices: pd.DataFrame,
+        keep_stack: bool = False,
+        decay_periods: Optional[List[int]] = None
+    ) -> PipelineResult:
         """
-        并行批量分析
+        批量分析（内部方法）：一次遍历完成全部因子的IC与分层测试，并填充综合评分
 
-        策略：
-        - 按因子分片，每个worker处理若干因子
-        - 子任务禁用并行，避免嵌套并行
-        - 捕获所有异常，返回部分结果
+        空因子记入 result.errors，不出现在 result.reports 中。
         """
-        factor_items = list(factor_dict.items())
+        result = self._build_pipeline(decay_periods).run(factor_dict, prices, keep_stack=keep_stack)
 
-        tasks = [
-            (
-                factor_name, factor_df, prices,
-                self.forward_periods, self.n_layers,
-                self.holding_period, self.method, self.long_short
-            )
-            for factor_name, factor_df in factor_items
-        ]
+        for factor_name, error in result.errors.items():
+            logger.warning(f"分析因子{factor_name}失败: {error}")
+        for factor_name, warn_msgs in result.warnings.items():
+            logger.warning(f"因子{factor_name}分析有{len(warn_msgs)}个警告: {'; '.join(warn_msgs)}")
 
-        executor = ParallelExecutor(self.parallel_config)
+        for report in result.reports.values():
+            report.overall_score = self._calculate_overall_score(report)
+            report.recommendation = self._generate_recommendation(report)
 
-        try:
-            results = executor.map(
-                _analyze_single_factor_worker_v2,
-                tasks,
-                desc="批量因子分析"
-            )
+        return result
 
-            reports = {}
-            failed_count = 0
+    @staticmethod
+    def _comparison_frame(
+        reports: Dict[str, FactorAnalysisReport],
+        rank_by: str = 'ic_ir'
+    ) -> pd.DataFrame:
+        """由分析报告生成因子对比表"""
+        results = []
 
-            for factor_name, report, _error in results:
-                if report is not None:
-                    reports[factor_name] = report
-                else:
-                    failed_count += 1
+        for factor_name, report in reports.items():
+            row = {'因子名': factor_name}
 
-            if failed_count > 0:
-                logger.warning(f"{failed_count}个因子分析失败")
+            if report.ic_result:
+                row.update({
+                    'IC均值': report.ic_result.mean_ic,
+                    'IC标准差': report.ic_result.std_ic,
+                    'ICIR': report.ic_result.ic_ir,
+                    'IC正值率': report.ic_result.positive_rate,
+                })
 
-            return reports
+            if report.layering_summary:
+                row.update({
+                    '是否单调': report.layering_summary.get('是否单调', False),
+                    '收益差距': report.layering_summary.get('收益差距', 0),
+                })
 
-        finally:
-            executor.shutdown()
+            row['综合评分'] = report.overall_score or 0
+            results.append(row)
+
+        comparison_df = pd.DataFrame(results)
+
+        if rank_by == 'ic':
+            comparison_df = comparison_df.sort_values('IC均值', ascending=False)
+        elif rank_by == 'ic_ir':
+            comparison_df = comparison_df.sort_values('ICIR', ascending=False)
+        elif rank_by == 'overall_score':
+            comparison_df = comparison_df.sort_values('综合评分', ascending=False)
+
+        return comparison_df
 
     def _calculate_overall_score(self, report: FactorAnalysisReport) -> float:
         """
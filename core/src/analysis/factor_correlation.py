@@ -14,6 +14,8 @@ from typing import Dict, List, Optional, Union
 from loguru import logger
 import warnings
 
+from .factor_report_pipeline import FactorStack, cross_sectional_rank
+
 # 导入异常类
 try:
     from ..exceptions import (
@@ -63,7 +65,8 @@ class FactorCorrelation:
     def calculate_factor_correlation(
         self,
         factor_dict: Dict[str, pd.DataFrame],
-        aggregate_method: str = 'mean'
+        aggregate_method: str = 'mean',
+        stack: Optional[FactorStack] = None
     ) -> pd.DataFrame:
         """
         计算因子间的相关性矩阵
@@ -73,10 +76,15 @@ class FactorCorrelation:
             aggregate_method: 跨时间聚合方法
                 - 'mean': 先计算每个时间点的相关性,再平均
                 - 'concat': 将所有时间点拼接后计算（适合大样本）
+            stack: 已对齐的因子立方体（可选，如 FactorReportPipeline 的结果）。
+                提供时直接在立方体上计算并复用其截面秩，factor_dict 不再读取
 
         Returns:
             相关性矩阵DataFrame
         """
+        if stack is not None:
+            return self._correlation_from_stack(stack, aggregate_method)
+
         logger.info(f"计算{len(factor_dict)}个因子的相关性...")
 
         factor_names = list(factor_dict.keys())
@@ -131,6 +139,69 @@ class FactorCorrelation:
 
         return corr_matrix
 
+    def _correlation_from_stack(
+        self,
+        stack: FactorStack,
+        aggregate_method: str
+    ) -> pd.DataFrame:
+        """
+        在对齐的因子立方体上计算相关性矩阵
+
+        口径同 calculate_factor_correlation：只使用所有因子均有值的样本；
+        'mean' 方法下每个截面至少10只股票。Spearman 在截面样本与各因子自身
+        有效样本一致时直接复用 stack.ranks，否则在该截面重新排名。
+        """
+        logger.info(f"计算{len(stack.names)}个因子的相关性（复用对齐立方体）...")
+
+        names = stack.names
+        valid = stack.valid
+        complete = valid.all(axis=0)
+
+        if aggregate_method == 'concat':
+            samples = stack.values[:, complete]
+            if self.method == 'spearman':
+                samples = cross_sectional_rank(samples)
+                corr_matrix = pd.DataFrame(samples.T, columns=names).corr(method='pearson')
+            else:
+                corr_matrix = pd.DataFrame(samples.T, columns=names).corr(method=self.method)
+
+        else:  # mean
+            use_ranks = self.method == 'spearman' and stack.ranks is not None
+            # 截面上所有因子的有效样本相同时，预计算的秩即为完整样本上的秩
+            same_support = (valid == complete[None]).all(axis=(0, 2))
+
+            total = np.zeros((len(names), len(names)))
+            count = np.zeros((len(names), len(names)))
+
+            for t in np.nonzero(complete.sum(axis=1) >= 10)[0]:
+                columns = complete[t]
+                if use_ranks and same_support[t]:
+                    samples = stack.ranks[:, t, columns]
+                elif self.method == 'spearman':
+                    samples = cross_sectional_rank(stack.values[:, t, columns])
+                else:
+                    samples = stack.values[:, t, columns]
+
+                if self.method == 'kendall':
+                    date_corr = pd.DataFrame(samples.T).corr(method='kendall').to_numpy()
+                else:
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        date_corr = np.atleast_2d(np.corrcoef(samples))
+
+                observed = ~np.isnan(date_corr)
+                total += np.where(observed, date_corr, 0.0)
+                count += observed
+
+            if not count.any():
+                raise ValueError("所有时间点的相关性计算均失败")
+
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr_matrix = pd.DataFrame(total / count, index=names, columns=names)
+
+        logger.success("相关性矩阵计算完成")
+
+        return corr_matrix
+
     def find_high_correlation_pairs(
         self,
         corr_matrix: pd.DataFrame,
@@ -32,6 +32,8 @@ except ImportError:
         FeatureCalculationError
     )
 
+from .factor_preprocessor import CrossSectionalPreprocessor, cross_sectional_zscore
+
 warnings.filterwarnings('ignore')
 
 
@@ -371,7 +373,8 @@ class FactorOptimizer:
         self,
         factor_dict: Dict[str, pd.DataFrame],
         weights: pd.Series,
-        normalize: bool = True
+        normalize: bool = True,
+        preprocessor: Optional[CrossSectionalPreprocessor] = None
     ) -> pd.DataFrame:
         """
         根据权重组合因子
@@ -380,6 +383,8 @@ class FactorOptimizer:
             factor_dict: 因子DataFrame字典
             weights: 因子权重Series
             normalize: 是否标准化组合因子
+            preprocessor: 截面预处理器（可选）。提供时先对各因子批量做截面预处理再加权，
+                组合因子的标准化也改为逐日期截面 z-score（默认为逐股票时间序列标准化）
 
         Returns:
             组合因子DataFrame
@@ -392,6 +397,10 @@ class FactorOptimizer:
         if len(common_factors) == 0:
             raise ValueError("因子字典和权重没有公共因子")
 
+        if preprocessor is not None:
+            factor_dict = preprocessor.transform_dict({name: factor_dict[name] for name in common_factors})
+            common_factors = [name for name in common_factors if name in factor_dict]
+
         # 计算加权和
         combined_factor = None
 
@@ -406,7 +415,13 @@ class FactorOptimizer:
                 combined_factor = combined_factor.add(factor_df * weight, fill_value=0)
 
         # 标准化（可选）
-        if normalize:
+        if normalize and preprocessor is not None:
+            combined_factor = pd.DataFrame(
+                cross_sectional_zscore(combined_factor.to_numpy(dtype=float)),
+                index=combined_factor.index,
+                columns=combined_factor.columns
+            )
+        elif normalize:
             combined_factor = (combined_factor - combined_factor.mean()) / combined_factor.std()
 
         logger.success(f"因子组合完成，使用{len(common_factors)}个因子")
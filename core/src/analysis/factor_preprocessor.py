@@ -0,0 +1,319 @@
+"""
+因子截面预处理（去极值 / 中性化 / 标准化）
+
+对 (日期 × 股票) 因子矩阵逐日期做截面处理，全部按矩阵向量化计算，不逐日循环：
+
+1. 去极值：MAD（中位数 ± n × 1.4826 × MAD）或分位数截断
+2. 中性化：每个交易日对 行业哑变量 + log(总市值) 回归取残差
+   （批量最小二乘：行业哑变量按 Frisch-Waugh-Lovell 定理化为行业内去均值，
+   剩余的市值暴露在所有日期上一次性求解正规方程）
+3. 标准化：z-score / 百分位排名 / min-max
+
+行业取自 stock_basic.industry，市值取自 daily_basic.total_mv，
+可通过 CrossSectionalPreprocessor.from_database 直接加载。
+
+与 FeatureTransformer.normalize_features（按单只股票时间序列拟合 scaler，用于机器学习特征）
+不同，这里的处理对象是同一交易日的全体股票，供 ICCalculator、FactorOptimizer、
+MultiFactorStrategy 使用。
+
+使用示例：
+    preprocessor = CrossSectionalPreprocessor.from_database(
+        db, '2023-01-01', '2023-12-31', winsorize='mad', standardize='zscore'
+    )
+    clean_factor = preprocessor.transform(factor_df)
+    calculator = ICCalculator(forward_periods=5, preprocessor=preprocessor)
+"""
+
+import warnings
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# MAD 换算为标准差的系数（正态分布下）
+MAD_SCALE = 1.4826
+
+WINSORIZE_METHODS = (None, 'mad', 'quantile')
+STANDARDIZE_METHODS = (None, 'zscore', 'rank', 'minmax')
+
+
+# ==================== 截面算子（最后一维为股票） ====================
+
+def winsorize_mad(values: np.ndarray, n_mad: float = 5.0) -> np.ndarray:
+    """
+    MAD 去极值：截断到 中位数 ± n_mad × 1.4826 × MAD
+
+    MAD 为 0 的截面（超过半数取值相同，如离散因子）不做截断。
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        median = np.nanmedian(values, axis=-1, keepdims=True)
+        mad = np.nanmedian(np.abs(values - median), axis=-1, keepdims=True) * MAD_SCALE
+    width = np.where(mad > 0, n_mad * mad, np.inf)
+    return np.clip(values, median - width, median + width)
+
+
+def winsorize_quantile(values: np.ndarray, lower: float = 0.01, upper: float = 0.99) -> np.ndarray:
+    """分位数去极值：截断到截面 [lower, upper] 分位点"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        low, high = np.nanquantile(values, [lower, upper], axis=-1, keepdims=True)
+    return np.clip(values, low, high)
+
+
+def cross_sectional_zscore(values: np.ndarray) -> np.ndarray:
+    """截面 z-score（样本标准差）；标准差为 0 的截面记为 0"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(values, axis=-1, keepdims=True)
+        std = np.nanstd(values, axis=-1, ddof=1, keepdims=True)
+    centered = values - mean
+    return np.where(std > 0, centered / np.where(std > 0, std, 1.0), np.where(np.isnan(values), np.nan, 0.0))
+
+
+def cross_sectional_pct_rank(values: np.ndarray) -> np.ndarray:
+    """截面百分位排名 (0, 1]（并列取平均，与 Series.rank(pct=True) 一致）"""
+    flat = values.reshape(-1, values.shape[-1])
+    ranked = pd.DataFrame(flat).rank(axis=1, pct=True).to_numpy()
+    return ranked.reshape(values.shape)
+
+
+def cross_sectional_minmax(values: np.ndarray) -> np.ndarray:
+    """截面 min-max 归一化到 [0, 1]；极差为 0 的截面记为 0"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        low = np.nanmin(values, axis=-1, keepdims=True)
+        span = np.nanmax(values, axis=-1, keepdims=True) - low
+    return np.where(span > 0, (values - low) / np.where(span > 0, span, 1.0),
+                    np.where(np.isnan(values), np.nan, 0.0))
+
+
+def _group_demean(x: np.ndarray, weight: np.ndarray, one_hot: np.ndarray) -> np.ndarray:
+    """按分组（行业）去截面均值，只统计 weight=1 的样本；无效样本置 0"""
+    x = x * weight
+    counts = weight @ one_hot
+    means = np.divide(x @ one_hot, counts, out=np.zeros_like(counts), where=counts > 0)
+    return (x - means @ one_hot.T) * weight
+
+
+def neutralize(
+    values: np.ndarray,
+    groups: Optional[np.ndarray] = None,
+    exposures: Optional[np.ndarray] = None,
+    min_samples: int = 10
+) -> np.ndarray:
+    """
+    批量截面回归中性化，返回残差
+
+    每个交易日求解 y = D·a + E·b + ε（D 为分组哑变量，E 为连续暴露），
+    残差 ε 即中性化后的因子。按 Frisch-Waugh-Lovell 定理，先对 y 和 E 做组内去均值，
+    再在所有日期上批量求解 (Ẽ'Ẽ) b = Ẽ'ỹ，结果与逐日 lstsq 一致。
+
+    Args:
+        values: 因子值 (..., T, N)，前置维度可用于同时处理多个因子
+        groups: 股票分组编码 (N,)，-1 表示未知（该股票不参与回归，结果为 NaN）；
+            None 表示只含截距
+        exposures: 连续暴露 (S, T, N)，如 log(总市值)
+        min_samples: 单日最少有效样本数，不足的日期结果为 NaN
+
+    Returns:
+        残差 (..., T, N)，无效位置为 NaN
+    """
+    n_stocks = values.shape[-1]
+    if groups is None:
+        groups = np.zeros(n_stocks, dtype=int)
+    n_groups = int(groups.max()) + 1 if len(groups) and groups.max() >= 0 else 0
+
+    valid = np.isfinite(values) & (groups >= 0)
+    if exposures is not None:
+        valid &= np.isfinite(exposures).all(axis=0)
+    weight = valid.astype(float)
+
+    one_hot = np.zeros((n_stocks, max(n_groups, 1)))
+    known = groups >= 0
+    one_hot[np.flatnonzero(known), groups[known]] = 1.0
+
+    residual = _group_demean(np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0), weight, one_hot)
+
+    if exposures is not None and len(exposures):
+        # (..., S, T, N)：每个因子的有效样本不同，暴露需按各自的样本去均值
+        exposures = np.nan_to_num(exposures, nan=0.0, posinf=0.0, neginf=0.0)
+        demeaned = _group_demean(exposures, weight[..., None, :, :], one_hot)
+        gram = np.einsum('...stn,...rtn->...tsr', demeaned, demeaned)
+        moment = np.einsum('...stn,...tn->...ts', demeaned, residual)
+        beta = np.einsum('...tsr,...tr->...ts', np.linalg.pinv(gram), moment)
+        residual = residual - np.einsum('...stn,...ts->...tn', demeaned, beta)
+
+    residual[~valid] = np.nan
+    residual[valid.sum(axis=-1) < min_samples] = np.nan
+    return residual
+
+
+# ==================== 预处理器 ====================
+
+class CrossSectionalPreprocessor:
+    """
+    因子截面预处理器
+
+    处理顺序：去极值 → 中性化 → 标准化。提供 industry / market_cap 时才做中性化，
+    两者可以只给其一（只给市值时回归含截距）。
+    """
+
+    def __init__(
+        self,
+        winsorize: Optional[str] = 'mad',
+        standardize: Optional[str] = 'zscore',
+        industry: Optional[pd.Series] = None,
+        market_cap: Optional[pd.DataFrame] = None,
+        n_mad: float = 5.0,
+        quantile_limits: Tuple[float, float] = (0.01, 0.99),
+        min_samples: int = 10
+    ):
+        """
+        初始化截面预处理器
+
+        Args:
+            winsorize: 去极值方法 ('mad' / 'quantile' / None)
+            standardize: 标准化方法 ('zscore' / 'rank' / 'minmax' / None)
+            industry: 股票行业Series (index=stock_code)，对应 stock_basic.industry
+            market_cap: 总市值DataFrame (index=date, columns=stock_codes)，对应 daily_basic.total_mv，
+                回归时取对数，非正值视为缺失
+            n_mad: MAD 去极值倍数
+            quantile_limits: 分位数去极值的上下分位点
+            min_samples: 中性化时单日最少有效样本数
+        """
+        if winsorize not in WINSORIZE_METHODS:
+            raise ValueError(f"winsorize必须是{WINSORIZE_METHODS}之一，得到: {winsorize}")
+        if standardize not in STANDARDIZE_METHODS:
+            raise ValueError(f"standardize必须是{STANDARDIZE_METHODS}之一，得到: {standardize}")
+
+        self.winsorize = winsorize
+        self.standardize = standardize
+        self.industry = industry
+        self.market_cap = market_cap
+        self.n_mad = n_mad
+        self.quantile_limits = quantile_limits
+        self.min_samples = min_samples
+
+    @property
+    def neutralizes(self) -> bool:
+        """是否做中性化"""
+        return self.industry is not None or self.market_cap is not None
+
+    @classmethod
+    def from_database(
+        cls,
+        db,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        codes: Optional[list] = None,
+        **kwargs
+    ) -> 'CrossSectionalPreprocessor':
+        """
+        从数据库加载行业和总市值，构建行业 + 市值中性化预处理器
+
+        Args:
+            db: DatabaseManager（需提供 get_stock_industries / load_market_daily）
+            start_date / end_date: 市值数据区间
+            codes: 股票代码列表（None 为全市场）
+            **kwargs: 其余预处理参数
+
+        Returns:
+            CrossSectionalPreprocessor
+        """
+        industry = db.get_stock_industries(codes)
+        daily = db.load_market_daily(start_date, end_date, codes=codes, columns=['total_mv'])
+        market_cap = daily.pivot(index='date', columns='code', values='total_mv')
+        market_cap.columns = market_cap.columns.astype(str)
+        logger.info(
+            f"加载中性化数据: {len(industry)}只股票行业, 市值矩阵{market_cap.shape}"
+        )
+        return cls(industry=industry, market_cap=market_cap, **kwargs)
+
+    def _exposures(self, index: pd.Index, columns: pd.Index) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """对齐到因子矩阵的行业编码 (N,) 与 log市值暴露 (1, T, N)"""
+        groups = None
+        if self.industry is not None:
+            groups, _ = pd.factorize(self.industry.reindex(columns))
+
+        exposures = None
+        if self.market_cap is not None:
+            mv = self.market_cap.reindex(index=index, columns=columns).to_numpy(dtype=float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                exposures = np.where(mv > 0, np.log(mv), np.nan)[None]
+        return groups, exposures
+
+    def process_array(self, values: np.ndarray, index: pd.Index, columns: pd.Index) -> np.ndarray:
+        """
+        处理因子数组 (..., T, N)，index / columns 为最后两维对应的日期和股票
+
+        多个因子共用同一日期 × 股票网格时，堆叠成 (K, T, N) 一次处理。
+        """
+        values = np.asarray(values, dtype=float)
+
+        if self.winsorize == 'mad':
+            values = winsorize_mad(values, self.n_mad)
+        elif self.winsorize == 'quantile':
+            values = winsorize_quantile(values, *self.quantile_limits)
+
+        if self.neutralizes:
+            groups, exposures = self._exposures(index, columns)
+            values = neutralize(values, groups, exposures, self.min_samples)
+
+        if self.standardize == 'zscore':
+            values = cross_sectional_zscore(values)
+        elif self.standardize == 'rank':
+            values = cross_sectional_pct_rank(values)
+        elif self.standardize == 'minmax':
+            values = cross_sectional_minmax(values)
+
+        return values
+
+    def transform(self, factor_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        处理单个因子
+
+        Args:
+            factor_df: 因子DataFrame (index=date, columns=stock_codes)
+
+        Returns:
+            同形状的预处理后因子DataFrame
+        """
+        if factor_df.empty:
+            return factor_df.copy()
+        values = self.process_array(factor_df.to_numpy(dtype=float), factor_df.index, factor_df.columns)
+        return pd.DataFrame(values, index=factor_df.index, columns=factor_df.columns)
+
+    def transform_dict(self, factor_dict: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        批量处理多个因子
+
+        所有因子对齐到日期 / 股票的并集后堆叠为 (K, T, N) 一次计算，
+        返回结果恢复为各因子原始的行列。
+        """
+        factor_dict = {name: df for name, df in factor_dict.items() if not df.empty}
+        if not factor_dict:
+            return {}
+
+        frames = list(factor_dict.values())
+        index = frames[0].index
+        columns = frames[0].columns
+        for df in frames[1:]:
+            if not df.index.equals(index):
+                index = index.union(df.index)
+            if not df.columns.equals(columns):
+                columns = columns.union(df.columns)
+
+        stack = np.stack([
+            df.reindex(index=index, columns=columns).to_numpy(dtype=float) for df in frames
+        ])
+        processed = self.process_array(stack, index, columns)
+
+        return {
+            name: pd.DataFrame(values, index=index, columns=columns).reindex(index=df.index, columns=df.columns)
+            for (name, df), values in zip(factor_dict.items(), processed)
+        }
@@ -0,0 +1,599 @@
+"""
+多因子分析报告流水线
+
+FactorAnalyzer 的批量路径（generate_full_report / batch_analyze / compare_factors）
+共用的计算核心，避免逐因子重复计算前瞻收益、收益秩、IC、分层和相关性：
+
+- SharedIntermediates: 每个股票池只计算一次的中间量
+  （各前瞻期收益矩阵、收益截面秩、有效收益掩码）
+- FactorStack: 对齐到同一股票池的因子立方体（因子 × 日期 × 股票）及其截面秩，
+  同时供 FactorCorrelation 复用
+- FactorReportPipeline: 按因子分块做向量化 IC / IC衰减 / 分层，结果逐因子写入
+  FactorAnalysisReport；分块可在线程池中并行（numpy 运算释放 GIL，无需复制数据）
+
+口径与 ICCalculator.calculate_ic_stats / LayeringTest.perform_layering_test
+逐因子计算一致（见 tests/unit/analysis/test_factor_report_pipeline.py）。
+
+使用示例：
+    pipeline = FactorReportPipeline(forward_periods=5, method='spearman')
+    result = pipeline.run(factor_dict, prices, keep_stack=True)
+    report = result.reports['MOM20']
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+from .ic_calculator import ICResult, summarize_ic_series
+from .layering_test import LayeringTest
+from ._report import FactorAnalysisReport
+
+logger = get_logger(__name__)
+
+# 单个IC / 分层计算所需的最少截面样本数（与 ICCalculator 一致）
+MIN_IC_SAMPLES = 10
+# 计算统计指标所需的最少有效IC期数
+MIN_IC_PERIODS = 10
+
+
+def cross_sectional_rank(values: np.ndarray) -> np.ndarray:
+    """
+    沿最后一维计算截面秩（平均秩，NaN 保持 NaN），支持任意前导维度
+
+    与 pandas.Series.rank() 口径一致，供 Spearman 相关复用。
+    """
+    shape = values.shape
+    flat = values.reshape(-1, shape[-1])
+    ranks = pd.DataFrame(flat).rank(axis=1, method='average').to_numpy(dtype=float)
+    return ranks.reshape(shape)
+
+
+def rowwise_corr(
+    x: np.ndarray,
+    y: np.ndarray,
+    mask: np.ndarray,
+    min_samples: int = MIN_IC_SAMPLES
+) -> np.ndarray:
+    """
+    逐截面（最后一维）掩码 Pearson 相关系数
+
+    Args:
+        x, y: 可广播到同一形状的数组
+        mask: 参与计算的样本掩码
+        min_samples: 最少样本数，不足返回 NaN
+
+    Returns:
+        去掉最后一维的相关系数数组；零方差截面为 NaN
+    """
+    n = mask.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.where(mask, x, 0.0).sum(axis=-1) / n
+        mean_y = np.where(mask, y, 0.0).sum(axis=-1) / n
+        xc = np.where(mask, x - mean_x[..., None], 0.0)
+        yc = np.where(mask, y - mean_y[..., None], 0.0)
+        corr = (xc * yc).sum(axis=-1) / np.sqrt((xc * xc).sum(axis=-1) * (yc * yc).sum(axis=-1))
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[n < min_samples] = np.nan
+    return corr
+
+
+@dataclass
+class SharedIntermediates:
+    """
+    股票池级共享中间量（每个价格矩阵 / 前瞻期只计算一次）
+
+    Attributes:
+        dates: 日期索引（价格矩阵行）
+        stocks: 股票索引（价格矩阵列）
+        forward_returns: {前瞻期: 收益矩阵 (T, N)}，口径 pct_change(h).shift(-h)
+        valid_mask: {前瞻期: 收益非空掩码 (T, N)}
+        return_ranks: {前瞻期: 收益截面秩 (T, N)}，仅 Spearman 需要
+    """
+    dates: pd.Index
+    stocks: pd.Index
+    forward_returns: Dict[int, np.ndarray] = field(default_factory=dict)
+    valid_mask: Dict[int, np.ndarray] = field(default_factory=dict)
+    return_ranks: Dict[int, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_prices(
+        cls,
+        prices: pd.DataFrame,
+        horizons: Iterable[int],
+        rank_horizons: Iterable[int] = ()
+    ) -> 'SharedIntermediates':
+        """
+        由价格矩阵构建共享中间量
+
+        Args:
+            prices: 价格DataFrame (index=date, columns=stock_codes)
+            horizons: 需要的前瞻期集合
+            rank_horizons: 需要截面秩的前瞻期集合
+        """
+        inter = cls(dates=prices.index, stocks=prices.columns)
+        for h in sorted(set(horizons) | set(rank_horizons)):
+            forward = prices.pct_change(h).shift(-h).to_numpy(dtype=float)
+            inter.forward_returns[h] = forward
+            inter.valid_mask[h] = ~np.isnan(forward)
+        for h in sorted(set(rank_horizons)):
+            inter.return_ranks[h] = cross_sectional_rank(inter.forward_returns[h])
+        return inter
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.dates), len(self.stocks)
+
+    def align(self, factor_df: pd.DataFrame) -> np.ndarray:
+        """将因子DataFrame对齐到股票池，返回 (T, N) float 矩阵"""
+        return factor_df.reindex(index=self.dates, columns=self.stocks).to_numpy(dtype=float)
+
+    def row_order(self, factor_df: pd.DataFrame) -> np.ndarray:
+        """因子日期在股票池中的行号（保持因子自身日期顺序，剔除池外日期）"""
+        order = self.dates.get_indexer(factor_df.index)
+        return order[order >= 0]
+
+
+@dataclass
+class FactorStack:
+    """
+    对齐到同一股票池的因子立方体
+
+    Attributes:
+        names: 因子名（第一维顺序）
+        dates / stocks: 日期 / 股票索引
+        values: 因子值 (K, T, N)，缺失为 NaN
+        ranks: 因子截面秩 (K, T, N)（按各因子自身有效样本排名，可选）
+    """
+    names: List[str]
+    dates: pd.Index
+    stocks: pd.Index
+    values: np.ndarray
+    ranks: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_dict(
+        cls,
+        factor_dict: Dict[str, pd.DataFrame],
+        dates: Optional[pd.Index] = None,
+        stocks: Optional[pd.Index] = None,
+        with_ranks: bool = False
+    ) -> 'FactorStack':
+        """
+        由因子字典构建立方体
+
+        Args:
+            factor_dict: {因子名: 因子DataFrame}
+            dates / stocks: 目标索引，默认取所有因子的并集
+            with_ranks: 是否同时计算截面秩
+        """
+        frames = list(factor_dict.values())
+        if dates is None:
+            dates = frames[0].index
+            for frame in frames[1:]:
+                dates = dates.union(frame.index, sort=False)
+        if stocks is None:
+            stocks = frames[0].columns
+            for frame in frames[1:]:
+                stocks = stocks.union(frame.columns, sort=False)
+
+        values = np.stack([
+            frame.reindex(index=dates, columns=stocks).to_numpy(dtype=float)
+            for frame in frames
+        ])
+        ranks = cross_sectional_rank(values) if with_ranks else None
+        return cls(list(factor_dict.keys()), dates, stocks, values, ranks)
+
+    @property
+    def valid(self) -> np.ndarray:
+        return ~np.isnan(self.values)
+
+
+@dataclass
+class PipelineResult:
+    """流水线结果"""
+    reports: Dict[str, FactorAnalysisReport]
+    warnings: Dict[str, List[str]]
+    errors: Dict[str, str]
+    intermediates: SharedIntermediates
+    stack: Optional[FactorStack] = None
+    n_blocks: int = 0
+    elapsed_time: float = 0.0
+
+    def ic_results(self) -> Dict[str, ICResult]:
+        """IC分析成功的因子 {因子名: ICResult}（保持因子顺序）"""
+        return {
+            name: report.ic_result
+            for name, report in self.reports.items()
+            if report.ic_result is not None
+        }
+
+
+@dataclass
+class _BlockOutput:
+    """单个因子块的向量化计算结果（行均为股票池日期）"""
+    names: List[str]
+    ic: Dict[int, np.ndarray] = field(default_factory=dict)   # {h: (B, T)}
+    layer_means: Optional[np.ndarray] = None                   # (B, T, L)
+    layer_present: Optional[np.ndarray] = None                 # (B, T, L)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+class FactorReportPipeline:
+    """
+    多因子分析报告流水线
+
+    一次遍历价格数据完成所有因子的 IC、IC衰减与分层测试：
+    1. 共享中间量按前瞻期计算一次
+    2. 因子按块对齐为 (B, T, N) 立方体，逐块向量化计算
+    3. 统计汇总复用 ICCalculator / LayeringTest 的口径
+
+    综合评分与建议由 FactorAnalyzer 填充。
+    """
+
+    def __init__(
+        self,
+        forward_periods: int = 5,
+        n_layers: int = 5,
+        holding_period: int = 5,
+        method: str = 'spearman',
+        long_short: bool = True,
+        decay_periods: Optional[Sequence[int]] = None,
+        block_size: int = 32,
+        max_block_cells: int = 20_000_000,
+        n_jobs: int = 1
+    ):
+        """
+        初始化流水线
+
+        Args:
+            forward_periods: IC前瞻期
+            n_layers: 分层数
+            holding_period: 分层持有期
+            method: IC方法（'pearson' 或 'spearman'）
+            long_short: 是否计算多空组合
+            decay_periods: IC衰减分析的前瞻期列表（可选）
+            block_size: 每块最多因子数
+            max_block_cells: 每块最多元素数（因子数 × 日期 × 股票），限制内存峰值
+            n_jobs: 并行线程数，1 为串行
+        """
+        if method not in ['pearson', 'spearman']:
+            raise ValueError(f"method必须是'pearson'或'spearman'，得到: {method}")
+        if n_layers < 2:
+            raise ValueError("分层数必须至少为2")
+
+        self.forward_periods = forward_periods
+        self.n_layers = n_layers
+        self.holding_period = holding_period
+        self.method = method
+        self.decay_periods = sorted(set(decay_periods)) if decay_periods else []
+        self.block_size = max(1, block_size)
+        self.max_block_cells = max_block_cells
+        self.n_jobs = max(1, n_jobs)
+
+        self.layering_test = LayeringTest(
+            n_layers=n_layers,
+            holding_period=holding_period,
+            long_short=long_short
+        )
+
+    # ==================== 主流程 ====================
+
+    def run(
+        self,
+        factor_dict: Dict[str, pd.DataFrame],
+        prices: pd.DataFrame,
+        include_ic: bool = True,
+        include_layering: bool = True,
+        keep_stack: bool = False
+    ) -> PipelineResult:
+        """
+        分析全部因子
+
+        Args:
+            factor_dict: {因子名: 因子DataFrame}
+            prices: 价格DataFrame
+            include_ic: 是否计算IC（含IC衰减）
+            include_layering: 是否做分层测试
+            keep_stack: 是否保留对齐后的因子立方体（供相关性分析复用）
+
+        Returns:
+            PipelineResult；空因子或无法对齐的因子记入 errors
+        """
+        start_time = time.time()
+        if prices is None or prices.empty:
+            raise ValueError("价格数据为空")
+
+        ic_horizons = ([self.forward_periods] + self.decay_periods) if include_ic else []
+        ic_horizons = sorted(set(ic_horizons))
+        horizons = set(ic_horizons)
+        if include_layering:
+            horizons.add(self.holding_period)
+        rank_horizons = ic_horizons if self.method == 'spearman' else []
+
+        inter = SharedIntermediates.from_prices(prices, horizons, rank_horizons)
+
+        errors: Dict[str, str] = {}
+        frames: Dict[str, pd.DataFrame] = {}
+        for name, factor_df in factor_dict.items():
+            if isinstance(factor_df, pd.Series):
+                factor_df = factor_df.to_frame(name=name)
+            if factor_df is None or factor_df.empty:
+                errors[name] = "因子数据为空"
+                continue
+            frames[name] = factor_df
+
+        names = list(frames.keys())
+        blocks = self._partition(names, inter.shape)
+        logger.info(
+            f"因子报告流水线: {len(names)}个因子, {len(blocks)}个分块, "
+            f"股票池={inter.shape}, 前瞻期={sorted(horizons)}"
+        )
+
+        stack = None
+        if keep_stack and names:
+            stack = FactorStack(
+                names=names,
+                dates=inter.dates,
+                stocks=inter.stocks,
+                values=np.full((len(names),) + inter.shape, np.nan),
+                ranks=np.full((len(names),) + inter.shape, np.nan) if self.method == 'spearman' else None
+            )
+
+        offsets = np.cumsum([0] + [len(b) for b in blocks])
+        tasks = [
+            (block, frames, inter, ic_horizons, include_layering, stack, offsets[i])
+            for i, block in enumerate(blocks)
+        ]
+        if self.n_jobs > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=self.n_jobs, thread_name_prefix='factor-report') as pool:
+                outputs = list(pool.map(lambda args: self._evaluate_block(*args), tasks))
+        else:
+            outputs = [self._evaluate_block(*args) for args in tasks]
+
+        reports: Dict[str, FactorAnalysisReport] = {}
+        warnings_map: Dict[str, List[str]] = {}
+        for output in outputs:
+            errors.update(output.errors)
+            for b, name in enumerate(output.names):
+                if name in output.errors:
+                    continue
+                order = inter.row_order(frames[name])
+                report, warn_msgs = self._build_report(name, b, output, order, inter, include_layering)
+                reports[name] = report
+                if warn_msgs:
+                    warnings_map[name] = warn_msgs
+
+        if stack is not None and errors:
+            keep = [i for i, name in enumerate(stack.names) if name not in errors]
+            stack = FactorStack(
+                names=[stack.names[i] for i in keep],
+                dates=stack.dates,
+                stocks=stack.stocks,
+                values=stack.values[keep],
+                ranks=stack.ranks[keep] if stack.ranks is not None else None
+            )
+
+        elapsed = time.time() - start_time
+        logger.info(f"因子报告流水线完成: {len(reports)}/{len(factor_dict)}个因子, 耗时{elapsed:.2f}s")
+
+        return PipelineResult(
+            reports=reports,
+            warnings=warnings_map,
+            errors=errors,
+            intermediates=inter,
+            stack=stack,
+            n_blocks=len(blocks),
+            elapsed_time=elapsed
+        )
+
+    def _partition(self, names: List[str], shape: Tuple[int, int]) -> List[List[str]]:
+        """按因子数和元素数上限分块"""
+        cells = max(1, shape[0] * shape[1])
+        size = max(1, min(self.block_size, self.max_block_cells // cells))
+        return [names[i:i + size] for i in range(0, len(names), size)]
+
+    # ==================== 分块计算 ====================
+
+    def _evaluate_block(
+        self,
+        names: List[str],
+        frames: Dict[str, pd.DataFrame],
+        inter: SharedIntermediates,
+        ic_horizons: List[int],
+        include_layering: bool,
+        stack: Optional[FactorStack],
+        offset: int
+    ) -> _BlockOutput:
+        output = _BlockOutput(names=list(names))
+
+        matrices = []
+        for name in names:
+            try:
+                matrices.append(inter.align(frames[name]))
+            except Exception as e:
+                logger.warning(f"因子{name}对齐失败: {e}")
+                output.errors[name] = f"因子对齐失败: {e}"
+                matrices.append(np.full(inter.shape, np.nan))
+
+        values = np.stack(matrices)
+        valid = ~np.isnan(values)
+        ranks = cross_sectional_rank(values) if self.method == 'spearman' else None
+
+        if stack is not None:
+            stack.values[offset:offset + len(names)] = values
+            if ranks is not None:
+                stack.ranks[offset:offset + len(names)] = ranks
+
+        for h in ic_horizons:
+            output.ic[h] = self._block_ic(values, valid, ranks, inter, h)
+
+        if include_layering:
+            output.layer_means, output.layer_present = self._block_layers(values, valid, inter)
+
+        return output
+
+    def _block_ic(
+        self,
+        values: np.ndarray,
+        valid: np.ndarray,
+        ranks: Optional[np.ndarray],
+        inter: SharedIntermediates,
+        horizon: int
+    ) -> np.ndarray:
+        """
+        块内逐日IC (B, T)
+
+        Spearman 复用预先计算的因子秩与收益秩；只有因子与收益有效样本不一致的
+        截面才在配对样本上重新排名。
+        """
+        returns = inter.forward_returns[horizon]
+        returns_valid = inter.valid_mask[horizon]
+        pair = valid & returns_valid
+
+        if self.method == 'pearson':
+            return rowwise_corr(values, returns, pair)
+
+        x = ranks
+        rerank_x = (valid & ~returns_valid).any(axis=-1)
+        if rerank_x.any():
+            x = ranks.copy()
+            x[rerank_x] = cross_sectional_rank(np.where(pair[rerank_x], values[rerank_x], np.nan))
+
+        y = inter.return_ranks[horizon]
+        rerank_y = (returns_valid & ~valid).any(axis=-1)
+        if rerank_y.any():
+            y = np.broadcast_to(y, values.shape).copy()
+            b_idx, t_idx = np.nonzero(rerank_y)
+            y[b_idx, t_idx] = cross_sectional_rank(
+                np.where(pair[b_idx, t_idx], returns[t_idx], np.nan)
+            )
+
+        return rowwise_corr(x, y, pair)
+
+    def _block_layers(
+        self,
+        values: np.ndarray,
+        valid: np.ndarray,
+        inter: SharedIntermediates
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        块内逐日分层收益
+
+        分层口径同 pd.qcut(labels=False, duplicates='drop')：分位点严格递增的截面
+        向量化分层，存在重复分位点或无穷值的截面退回 pd.qcut。
+
+        Returns:
+            (各层平均收益 (B, T, L), 该层非空标记 (B, T, L))
+        """
+        n_layers = self.n_layers
+        returns = inter.forward_returns[self.holding_period]
+        returns_valid = inter.valid_mask[self.holding_period]
+
+        counts = valid.sum(axis=-1)
+        eligible = counts >= n_layers
+        has_inf = np.isinf(values).any(axis=-1)
+        labels = np.full(values.shape, -1, dtype=np.int16)
+
+        quantiles = np.linspace(0, 1, n_layers + 1) * 100.0
+        sorted_values = np.sort(values, axis=-1)  # NaN 排在末尾
+        fast = eligible & ~has_inf
+        fallback = [np.argwhere(eligible & has_inf)]
+
+        for n in np.unique(counts[fast]):
+            b_idx, t_idx = np.nonzero(fast & (counts == n))
+            edges = np.percentile(sorted_values[b_idx, t_idx, :n], quantiles, axis=1, method='linear').T
+            strict = (np.diff(edges, axis=1) > 0).all(axis=1)
+            fallback.append(np.column_stack([b_idx[~strict], t_idx[~strict]]))
+
+            b_idx, t_idx, edges = b_idx[strict], t_idx[strict], edges[strict]
+            if len(b_idx) == 0:
+                continue
+            x = values[b_idx, t_idx]
+            layer = np.zeros(x.shape, dtype=np.int16)
+            for k in range(1, n_layers):
+                layer += x > edges[:, k:k + 1]
+            layer[np.isnan(x)] = -1
+            labels[b_idx, t_idx] = layer
+
+        for b, t in np.concatenate(fallback):
+            row_valid = valid[b, t]
+            try:
+                layer = pd.qcut(values[b, t, row_valid], q=n_layers, labels=False, duplicates='drop')
+            except Exception as e:
+                logger.debug(f"分层失败: {e}")
+                continue
+            labels[b, t, row_valid] = np.where(np.isnan(layer), -1, layer).astype(np.int16)
+
+        filled_returns = np.where(returns_valid, returns, 0.0)
+        means = np.full(values.shape[:2] + (n_layers,), np.nan)
+        present = np.zeros(values.shape[:2] + (n_layers,), dtype=bool)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for i in range(n_layers):
+                in_layer = labels == i
+                present[..., i] = in_layer.any(axis=-1)
+                hit = in_layer & returns_valid
+                means[..., i] = np.where(hit, filled_returns, 0.0).sum(axis=-1) / hit.sum(axis=-1)
+
+        return means, present
+
+    # ==================== 结果汇总 ====================
+
+    def _build_report(
+        self,
+        name: str,
+        b: int,
+        output: _BlockOutput,
+        order: np.ndarray,
+        inter: SharedIntermediates,
+        include_layering: bool
+    ) -> Tuple[FactorAnalysisReport, List[str]]:
+        report = FactorAnalysisReport(factor_name=name)
+        warn_msgs: List[str] = []
+        dates = inter.dates[order]
+
+        if self.forward_periods in output.ic:
+            ic_series = self._ic_series(output.ic[self.forward_periods][b, order], dates)
+            if len(ic_series) >= MIN_IC_PERIODS:
+                report.ic_result = summarize_ic_series(ic_series)
+            else:
+                warn_msgs.append(f"IC分析失败: 有效IC值太少({len(ic_series)})，无法计算统计指标")
+
+            decay_rows = []
+            for h in self.decay_periods:
+                decay_series = self._ic_series(output.ic[h][b, order], dates)
+                if len(decay_series) < MIN_IC_PERIODS:
+                    continue
+                decay_result = summarize_ic_series(decay_series)
+                decay_rows.append({
+                    '持有期': h,
+                    'IC均值': decay_result.mean_ic,
+                    'ICIR': decay_result.ic_ir,
+                    'IC正值率': decay_result.positive_rate
+                })
+            if decay_rows:
+                report.ic_decay = pd.DataFrame(decay_rows).set_index('持有期')
+
+        if include_layering:
+            means = output.layer_means[b, order]
+            present = output.layer_present[b, order]
+            layer_returns = {
+                f'Layer_{i+1}': means[present[:, i], i].tolist()
+                for i in range(self.n_layers)
+            }
+            report.layering_result = self.layering_test.summarize_layer_returns(layer_returns)
+            try:
+                report.layering_summary = self.layering_test.analyze_monotonicity(report.layering_result)
+            except Exception as e:
+                warn_msgs.append(f"分层测试失败: {str(e)}")
+
+        return report, warn_msgs
+
+    @staticmethod
+    def _ic_series(ic_values: np.ndarray, dates: pd.Index) -> pd.Series:
+        keep = ~np.isnan(ic_values)
+        return pd.Series(ic_values[keep], index=dates[keep])
@@ -10,7 +10,7 @@ IC计算器（Information Coefficient）
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Union, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Union, Tuple
 from loguru import logger
 from dataclasses import dataclass
 import warnings
@@ -18,6 +18,9 @@ import time
 
 from src.utils.response import Response, ResponseStatus
 
+if TYPE_CHECKING:
+    from .factor_preprocessor import CrossSectionalPreprocessor
+
 # 导入异常类
 try:
     from ..exceptions import (
@@ -82,6 +85,40 @@ class ICResult:
         )
 
 
+def summarize_ic_series(ic_series: pd.Series) -> ICResult:
+    """
+    由IC时间序列计算统计指标（均值、ICIR、正值率、t检验）
+
+    Args:
+        ic_series: 有效IC时间序列（调用方保证样本数足够）
+
+    Returns:
+        ICResult
+    """
+    mean_ic = ic_series.mean()
+    std_ic = ic_series.std()
+    ic_ir = mean_ic / std_ic if std_ic > 0 else 0.0
+    positive_rate = (ic_series > 0).mean()
+
+    # t统计量和p值
+    n = len(ic_series)
+    t_stat = mean_ic / (std_ic / np.sqrt(n)) if std_ic > 0 else 0.0
+
+    # 简化的p值计算（双侧检验）
+    from scipy import stats
+    p_value = 2 * (1 - stats.t.cdf(abs(t_stat), df=n-1))
+
+    return ICResult(
+        mean_ic=mean_ic,
+        std_ic=std_ic,
+        ic_ir=ic_ir,
+        positive_rate=positive_rate,
+        t_stat=t_stat,
+        p_value=p_value,
+        ic_series=ic_series
+    )
+
+
 # ==================== 模块级辅助函数（用于并行计算） ====================
 
 def _compute_ic_chunk_worker(args):
@@ -185,7 +222,8 @@ class ICCalculator:
         self,
         forward_periods: int = 5,
         method: str = 'pearson',
-        parallel_config: Optional['ParallelComputingConfig'] = None
+        parallel_config: Optional['ParallelComputingConfig'] = None,
+        preprocessor: Optional['CrossSectionalPreprocessor'] = None
     ):
         """
         初始化IC计算器
@@ -196,9 +234,11 @@ class ICCalculator:
                 - pearson: 线性相关
                 - spearman: 秩相关（更稳健，推荐）
             parallel_config: 并行计算配置（可选）
+            preprocessor: 截面预处理器（可选），计算IC前对因子做去极值/中性化/标准化
         """
         self.forward_periods = forward_periods
         self.method = method
+        self.preprocessor = preprocessor
 
         # 并行计算配置
         if HAS_PARALLEL_SUPPORT:
@@ -413,6 +453,9 @@ class ICCalculator:
         """
         logger.info(f"计算IC时间序列: 数据范围={factor_df.index[0]} 到 {factor_df.index[-1]}")
 
+        if self.preprocessor is not None:
+            factor_df = self.preprocessor.transform(factor_df)
+
         # 计算未来收益率
         future_returns = prices_df.pct_change(self.forward_periods).shift(-self.forward_periods)
 
@@ -498,28 +541,8 @@ class ICCalculator:
                 )
 
             # 2. 计算统计指标
-            mean_ic = ic_series.mean()
-            std_ic = ic_series.std()
-            ic_ir = mean_ic / std_ic if std_ic > 0 else 0.0
-            positive_rate = (ic_series > 0).mean()
-
-            # 3. 计算t统计量和p值
-            n = len(ic_series)
-            t_stat = mean_ic / (std_ic / np.sqrt(n)) if std_ic > 0 else 0.0
-
-            # 简化的p值计算（双侧检验）
-            from scipy import stats
-            p_value = 2 * (1 - stats.t.cdf(abs(t_stat), df=n-1))
-
-            result = ICResult(
-                mean_ic=mean_ic,
-                std_ic=std_ic,
-                ic_ir=ic_ir,
-                positive_rate=positive_rate,
-                t_stat=t_stat,
-                p_value=p_value,
-                ic_series=ic_series
-            )
+            result = summarize_ic_series(ic_series)
+            mean_ic, ic_ir = result.mean_ic, result.ic_ir
 
             elapsed_time = time.time() - start_time
 
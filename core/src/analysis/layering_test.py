@@ -166,6 +166,22 @@ class LayeringTest:
 
         logger.info(f"有效期数: {valid_count}/{len(dates)}")
 
+        return self.summarize_layer_returns(layer_returns)
+
+    def summarize_layer_returns(
+        self,
+        layer_returns: Dict[str, List[float]]
+    ) -> pd.DataFrame:
+        """
+        由各层逐期收益汇总分层统计
+
+        Args:
+            layer_returns: {'Layer_1': [逐期平均收益, ...], ...}，按日期顺序排列，
+                只包含该层非空的期
+
+        Returns:
+            分层统计DataFrame（含多空组合行）
+        """
         # 计算统计指标
         results = []
 
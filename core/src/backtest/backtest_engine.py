@@ -433,10 +433,10 @@ class BacktestEngine:
         return self.daily_returns
 
     def get_positions(self) -> List[Dict]:
-        """获取持仓历史"""
+        """获取持仓历史（由持仓事件账本逐日重建）"""
         if self.positions is None:
             raise ValueError("请先运行回测")
-        return self.positions
+        return list(self.positions)
 
     def backtest_ml_strategy(
         self,
@@ -1104,10 +1104,15 @@ class BacktestEngine:
         top_stocks = today_signals.nlargest(top_n).index.tolist()
         bottom_stocks = today_signals.nsmallest(bottom_n).index.tolist()
 
-        # 平多头
-        for stock in portfolio.get_long_stocks_to_sell(top_stocks, date, holding_period, all_dates):
-            if stock in prices.columns and not np.isnan(prices.loc[next_date, stock]):
-                self.executor.execute_sell(portfolio, stock, prices.loc[next_date, stock], next_date)
+        # 平多头（整批计算成交价与成本）
+        to_sell = [s for s in portfolio.get_long_stocks_to_sell(top_stocks, date, holding_period, all_dates)
+                   if s in prices.columns]
+        if to_sell:
+            sell_prices = prices.loc[next_date, to_sell].to_numpy(dtype=float)
+            keep = ~np.isnan(sell_prices)
+            self.executor.execute_sell_batch(
+                portfolio, [s for s, k in zip(to_sell, keep) if k], sell_prices[keep], next_date
+            )
 
         # 平空头
         for stock in portfolio.get_short_stocks_to_cover(bottom_stocks, date, holding_period, all_dates):
@@ -1118,11 +1123,12 @@ class BacktestEngine:
         long_to_open = portfolio.get_stocks_to_buy(top_stocks)
         if long_to_open:
             capital = portfolio.get_cash() / 2 / len(long_to_open)
-            for stock in long_to_open:
-                if stock in prices.columns:
-                    price = prices.loc[next_date, stock]
-                    if not np.isnan(price) and price > 0:
-                        self.executor.execute_buy(portfolio, stock, price, capital, next_date)
+            candidates = [s for s in long_to_open if s in prices.columns]
+            buy_prices = prices.loc[next_date, candidates].to_numpy(dtype=float)
+            keep = ~np.isnan(buy_prices) & (buy_prices > 0)
+            self.executor.execute_buy_batch(
+                portfolio, [s for s, k in zip(candidates, keep) if k], buy_prices[keep], capital, next_date
+            )
 
         # 开空头
         short_to_open = portfolio.get_stocks_to_short(bottom_stocks)
@@ -5,7 +5,7 @@
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Union
 from datetime import datetime
 from loguru import logger
 
@@ -145,6 +145,276 @@ class BacktestExecutor:
 
         return costs['total_cost']
 
+    # ==================== 批量接口（同一调仓日的订单数组） ====================
+
+    def _batch_market_kwargs(
+        self,
+        stock_codes: List[str],
+        reference_prices: np.ndarray,
+        date: datetime = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        批量准备滑点模型所需的市场数据（缺失为 NaN，口径与单笔接口一致）
+
+        参数:
+            stock_codes: 股票代码列表
+            reference_prices: 参考价格数组
+            date: 交易日期
+
+        返回:
+            {'avg_volume', 'volatility', 'bid_price', 'ask_price'} 中可用的数组
+        """
+        kwargs = {}
+        if date is None:
+            return kwargs
+
+        volumes_df = self.market_data_cache.get('volumes')
+        if volumes_df is not None and date in volumes_df.index:
+            avg_volume = volumes_df.loc[:date].tail(20).reindex(columns=stock_codes).mean().to_numpy(dtype=float)
+            avg_volume[avg_volume == 0] = np.nan
+            kwargs['avg_volume'] = avg_volume * reference_prices
+
+        vol_df = self.market_data_cache.get('volatilities')
+        if vol_df is not None and date in vol_df.index:
+            kwargs['volatility'] = vol_df.loc[date].reindex(stock_codes).to_numpy(dtype=float)
+
+        bid_df = self.market_data_cache.get('bid_prices')
+        ask_df = self.market_data_cache.get('ask_prices')
+        if bid_df is not None and ask_df is not None and date in bid_df.index and date in ask_df.index:
+            bid = bid_df.loc[date].reindex(stock_codes).to_numpy(dtype=float)
+            ask = ask_df.loc[date].reindex(stock_codes).to_numpy(dtype=float)
+            has_quote = ~np.isnan(bid) & ~np.isnan(ask)
+            kwargs['bid_price'] = np.where(has_quote, bid, np.nan)
+            kwargs['ask_price'] = np.where(has_quote, ask, np.nan)
+
+        return kwargs
+
+    def calculate_actual_prices_with_slippage(
+        self,
+        stock_codes: List[str],
+        reference_prices,
+        shares,
+        is_buy: Union[bool, np.ndarray],
+        date: datetime = None
+    ) -> np.ndarray:
+        """
+        批量计算实际成交价格（calculate_actual_price_with_slippage 的向量化版本）
+
+        参数:
+            stock_codes: 股票代码列表
+            reference_prices: 参考价格数组
+            shares: 股数数组
+            is_buy: 是否买入（标量或数组）
+            date: 交易日期
+
+        返回:
+            实际成交价格数组
+        """
+        reference_prices = np.asarray(reference_prices, dtype=float)
+        order_sizes = np.asarray(shares, dtype=float) * reference_prices
+        kwargs = self._batch_market_kwargs(stock_codes, reference_prices, date)
+        return self.slippage_model.get_actual_prices(
+            order_sizes=order_sizes,
+            reference_prices=reference_prices,
+            is_buy=is_buy,
+            **kwargs
+        )
+
+    def calculate_trading_costs(
+        self,
+        amounts,
+        is_buy: Union[bool, np.ndarray],
+        stock_codes: List[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        批量计算交易成本（与 TradingCosts.calculate_buy_cost / calculate_sell_cost 口径一致）
+
+        参数:
+            amounts: 交易金额数组
+            is_buy: 是否买入（标量或数组）
+            stock_codes: 股票代码列表（用于判断沪市过户费）
+
+        返回:
+            {'commission', 'transfer_fee', 'stamp_tax', 'other_fee', 'total_cost'} 数组
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        n = len(amounts)
+        is_buy = np.broadcast_to(np.asarray(is_buy, dtype=bool), (n,))
+
+        commission_rate = self.commission_rate or TradingCosts.CommissionRates.DEFAULT
+        min_commission = self.min_commission if self.min_commission is not None else TradingCosts.MIN_COMMISSION
+        stamp_tax_rate = self.stamp_tax_rate or TradingCosts.STAMP_TAX_RATE
+
+        commission = np.maximum(amounts * commission_rate, min_commission)
+        if stock_codes is not None:
+            is_sh = np.char.startswith(np.asarray(stock_codes, dtype=str), '6')
+        else:
+            is_sh = np.zeros(n, dtype=bool)
+        transfer_fee = np.where(is_sh, amounts * TradingCosts.TRANSFER_FEE_RATE, 0.0)
+        stamp_tax = np.where(is_buy, 0.0, amounts * stamp_tax_rate)
+        other_fee = amounts * (TradingCosts.REGULATORY_FEE_RATE + TradingCosts.EXCHANGE_FEE_RATE)
+
+        return {
+            'commission': commission,
+            'transfer_fee': transfer_fee,
+            'stamp_tax': stamp_tax,
+            'other_fee': other_fee,
+            'total_cost': commission + transfer_fee + stamp_tax + other_fee
+        }
+
+    def price_orders(
+        self,
+        stock_codes: List[str],
+        reference_prices,
+        shares,
+        is_buy: Union[bool, np.ndarray],
+        date: datetime = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        一次性估算一批订单的成交价、滑点与交易成本
+
+        参数:
+            stock_codes: 股票代码列表
+            reference_prices: 参考价格数组
+            shares: 股数数组
+            is_buy: 是否买入（标量或数组）
+            date: 交易日期
+
+        返回:
+            {'actual_price', 'amount', 'slippage', 'impact', 'commission', 'stamp_tax', 'total_cost'}
+            其中 slippage 为滑点金额（不利方向为正），impact 为滑点占参考价比例
+        """
+        reference_prices = np.asarray(reference_prices, dtype=float)
+        shares = np.asarray(shares, dtype=float)
+        n = len(shares)
+        side = np.broadcast_to(np.asarray(is_buy, dtype=bool), (n,))
+
+        actual_price = self.calculate_actual_prices_with_slippage(
+            stock_codes, reference_prices, shares, side, date
+        )
+        amount = shares * actual_price
+        costs = self.calculate_trading_costs(amount, side, stock_codes)
+        price_move = np.where(side, actual_price - reference_prices, reference_prices - actual_price)
+
+        return {
+            'actual_price': actual_price,
+            'amount': amount,
+            'slippage': shares * price_move,
+            'impact': np.divide(price_move, reference_prices, out=np.zeros(n), where=reference_prices > 0),
+            'commission': costs['commission'],
+            'stamp_tax': costs['stamp_tax'],
+            'total_cost': costs['total_cost']
+        }
+
+    def execute_buy_batch(
+        self,
+        portfolio: BacktestPortfolio,
+        stock_codes: List[str],
+        buy_prices,
+        capital,
+        date: datetime
+    ) -> List[bool]:
+        """
+        批量执行买入订单（execute_buy 的批量版本）
+
+        成交价与成本一次向量化计算，资金检查按订单顺序依次扣减现金，结果与逐笔调用一致
+
+        参数:
+            portfolio: 组合管理器
+            stock_codes: 股票代码列表
+            buy_prices: 买入价格数组
+            capital: 每只股票的可用资金（标量或数组）
+            date: 交易日期
+
+        返回:
+            各订单是否成功执行
+        """
+        n = len(stock_codes)
+        if n == 0:
+            return []
+        buy_prices = np.asarray(buy_prices, dtype=float)
+        capital = np.broadcast_to(np.asarray(capital, dtype=float), (n,))
+
+        estimated_shares = np.floor(capital / buy_prices / 100) * 100
+        actual_price = self.calculate_actual_prices_with_slippage(
+            stock_codes, buy_prices, estimated_shares, True, date
+        )
+        max_shares = np.floor(capital / actual_price / 100) * 100
+        buy_amount = max_shares * actual_price
+        cost = self.calculate_trading_costs(buy_amount, True, stock_codes)['total_cost']
+        valid = (estimated_shares >= 100) & (max_shares >= 100)
+
+        executed = np.zeros(n, dtype=bool)
+        for i in np.flatnonzero(valid):
+            if portfolio.get_cash() < (buy_amount[i] + cost[i]):
+                continue
+            portfolio.update_cash(-(buy_amount[i] + cost[i]))
+            portfolio.add_long_position(stock_codes[i], int(max_shares[i]), actual_price[i], date)
+            executed[i] = True
+
+        idx = np.flatnonzero(executed)
+        self.cost_analyzer.add_trades(
+            date=date,
+            stock_codes=[stock_codes[i] for i in idx],
+            actions='buy',
+            shares=max_shares[idx],
+            prices=actual_price[idx],
+            commissions=cost[idx],
+            stamp_taxes=0.0,
+            slippages=max_shares[idx] * (actual_price[idx] - buy_prices[idx])
+        )
+        return executed.tolist()
+
+    def execute_sell_batch(
+        self,
+        portfolio: BacktestPortfolio,
+        stock_codes: List[str],
+        sell_prices,
+        date: datetime
+    ) -> List[bool]:
+        """
+        批量执行卖出订单（execute_sell 的批量版本）
+
+        参数:
+            portfolio: 组合管理器
+            stock_codes: 股票代码列表
+            sell_prices: 卖出价格数组
+            date: 交易日期
+
+        返回:
+            各订单是否成功执行
+        """
+        n = len(stock_codes)
+        if n == 0:
+            return []
+        sell_prices = np.asarray(sell_prices, dtype=float)
+        positions = [portfolio.get_long_position(code) for code in stock_codes]
+        held = np.array([pos is not None for pos in positions])
+        shares = np.array([pos['shares'] if pos else 0 for pos in positions], dtype=float)
+
+        actual_price = self.calculate_actual_prices_with_slippage(
+            stock_codes, sell_prices, shares, False, date
+        )
+        sell_amount = shares * actual_price
+        cost = self.calculate_trading_costs(sell_amount, False, stock_codes)['total_cost']
+
+        idx = np.flatnonzero(held)
+        for i in idx:
+            portfolio.update_cash(sell_amount[i] - cost[i])
+            portfolio.remove_long_position(stock_codes[i])
+
+        self.cost_analyzer.add_trades(
+            date=date,
+            stock_codes=[stock_codes[i] for i in idx],
+            actions='sell',
+            shares=shares[idx],
+            prices=actual_price[idx],
+            commissions=cost[idx] * 0.5,
+            stamp_taxes=sell_amount[idx] * self.stamp_tax_rate,
+            slippages=shares[idx] * (sell_prices[idx] - actual_price[idx])
+        )
+        return held.tolist()
+
     def execute_buy(
         self,
         portfolio: BacktestPortfolio,
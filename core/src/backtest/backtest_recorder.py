@@ -1,23 +1,77 @@
 """
 回测数据记录器
 负责记录组合净值曲线、持仓历史、计算收益率
+
+存储结构:
+- 组合净值: 列式存储（每个字段一个列表），不为每天创建字典
+- 持仓历史: PositionLedger 只追加持仓变动事件，按需重建任意日期的持仓
+- 均可通过 to_arrow() / write_parquet() 直接序列化，供存储与 API 分页
 """
 
+import os
 import pandas as pd
-from typing import List, Dict, Any
+import pyarrow as pa
+import pyarrow.parquet as pq
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from datetime import datetime
 
+from .position_ledger import PositionLedger, PositionHistory
+
 
 class BacktestRecorder:
     """回测数据记录器"""
 
+    # write_parquet() 输出的文件名
+    PARQUET_FILES = {
+        'portfolio_value': 'portfolio_value.parquet',
+        'position_events': 'position_events.parquet',
+        'position_books': 'position_books.parquet',
+        'trades': 'trades.parquet',
+        'equity_curve': 'equity_curve.parquet',
+    }
+
     def __init__(self):
         """初始化记录器"""
-        self.portfolio_values: List[Dict[str, Any]] = []
-        self.positions_history: List[Dict[str, Any]] = []
+        self._value_dates: List[Any] = []
+        self._value_columns: Dict[str, List[float]] = {}
+        self.position_ledger = PositionLedger()
         self.trades: List[Dict[str, Any]] = []  # 交易记录
         self.equity_curve: List[Dict[str, Any]] = []  # 净值曲线（简化版）
 
+    def _append_values(self, date: datetime, **values: float):
+        """追加一行组合净值（列式）"""
+        n = len(self._value_dates)
+        for name, value in values.items():
+            column = self._value_columns.get(name)
+            if column is None:
+                # 新出现的字段，之前的行补 NaN
+                column = self._value_columns[name] = [float('nan')] * n
+            column.append(value)
+        for name, column in self._value_columns.items():
+            if len(column) == n:
+                column.append(float('nan'))
+        self._value_dates.append(date)
+
+    @property
+    def portfolio_values(self) -> Tuple[Mapping[str, Any], ...]:
+        """
+        组合净值记录（只读，按需物化为逐日行）
+
+        返回元组与只读映射：存储为列式，对返回值 append / 赋值不会写回记录器，
+        因此直接报错而不是静默丢失；写入请用 record_portfolio_value / record_market_neutral_value
+        """
+        names = list(self._value_columns)
+        return tuple(
+            MappingProxyType({'date': date, **{name: self._value_columns[name][i] for name in names}})
+            for i, date in enumerate(self._value_dates)
+        )
+
+    @property
+    def positions_history(self) -> PositionHistory:
+        """持仓历史（只读视图，元素按需重建；写入请用 record_positions）"""
+        return PositionHistory(self.position_ledger)
+
     def record_portfolio_value(
         self,
         date: datetime,
@@ -34,12 +88,7 @@ class BacktestRecorder:
             holdings: 持仓市值
             total: 总资产
         """
-        self.portfolio_values.append({
-            'date': date,
-            'cash': cash,
-            'holdings': holdings,
-            'total': total
-        })
+        self._append_values(date, cash=cash, holdings=holdings, total=total)
 
     def record_market_neutral_value(
         self,
@@ -63,15 +112,15 @@ class BacktestRecorder:
             short_interest: 融券利息
             total: 总资产
         """
-        self.portfolio_values.append({
-            'date': date,
-            'cash': cash,
-            'long_value': long_value,
-            'short_value': short_value,
-            'short_pnl': short_pnl,
-            'short_interest': short_interest,
-            'total': total
-        })
+        self._append_values(
+            date,
+            cash=cash,
+            long_value=long_value,
+            short_value=short_value,
+            short_pnl=short_pnl,
+            short_interest=short_interest,
+            total=total
+        )
 
     def record_positions(
         self,
@@ -79,16 +128,13 @@ class BacktestRecorder:
         positions: Dict[str, Any]
     ):
         """
-        记录持仓快照
+        记录持仓快照（只追加与上一日相比的变动事件）
 
         参数:
             date: 日期
-            positions: 持仓字典
+            positions: 持仓字典 {账簿: {股票: 持仓}}
         """
-        self.positions_history.append({
-            'date': date,
-            **positions
-        })
+        self.position_ledger.record(date, positions)
 
     def get_portfolio_value_df(self) -> pd.DataFrame:
         """
@@ -97,20 +143,38 @@ class BacktestRecorder:
         返回:
             组合净值DataFrame (index=date)
         """
-        if not self.portfolio_values:
+        if not self._value_dates:
             return pd.DataFrame()
 
-        return pd.DataFrame(self.portfolio_values).set_index('date')
+        df = pd.DataFrame(self._value_columns)
+        df.insert(0, 'date', self._value_dates)
+        return df.set_index('date')
 
-    def get_positions_history(self) -> List[Dict]:
+    def get_positions_history(self) -> PositionHistory:
         """
         获取持仓历史
 
         返回:
-            持仓历史列表
+            持仓历史视图（支持 len / 下标 / 迭代，元素结构与原逐日快照一致）
         """
         return self.positions_history
 
+    def get_positions_at(self, date: datetime) -> Dict[str, Any]:
+        """
+        获取指定日期（记录日）的持仓快照
+
+        参数:
+            date: 日期
+
+        返回:
+            持仓快照字典
+        """
+        try:
+            day = self.position_ledger.dates.index(date)
+        except ValueError:
+            raise KeyError(f"未记录该日期的持仓: {date}")
+        return self.position_ledger.snapshot_at(day)
+
     def calculate_daily_returns(self) -> pd.Series:
         """
         计算每日收益率
@@ -267,9 +331,98 @@ class BacktestRecorder:
 
         return pd.DataFrame(self.trades)
 
+    # ==================== Arrow / Parquet 序列化 ====================
+
+    def to_arrow(self) -> Dict[str, pa.Table]:
+        """
+        转换为 Arrow 表
+
+        返回:
+            {'portfolio_value', 'position_events', 'position_books', 'trades', 'equity_curve'}
+        """
+        portfolio_df = self.get_portfolio_value_df()
+        tables = {
+            'portfolio_value': pa.Table.from_pandas(portfolio_df.reset_index(), preserve_index=False)
+            if not portfolio_df.empty else pa.table({}),
+            'position_events': self.position_ledger.to_arrow(),
+            'position_books': self.position_ledger.books_to_arrow(),
+            'trades': pa.Table.from_pylist(self.trades) if self.trades else pa.table({}),
+            'equity_curve': pa.Table.from_pylist(self.equity_curve) if self.equity_curve else pa.table({}),
+        }
+        return tables
+
+    def write_parquet(self, directory: str) -> Dict[str, str]:
+        """
+        写入 Parquet 文件（每张表一个文件）
+
+        参数:
+            directory: 输出目录
+
+        返回:
+            {表名: 文件路径}
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {}
+        for name, table in self.to_arrow().items():
+            path = os.path.join(directory, self.PARQUET_FILES[name])
+            pq.write_table(table, path, compression='zstd')
+            paths[name] = path
+        return paths
+
+    @classmethod
+    def read_parquet(cls, directory: str) -> 'BacktestRecorder':
+        """
+        从 write_parquet() 的输出恢复记录器
+
+        参数:
+            directory: 目录
+
+        返回:
+            BacktestRecorder 实例
+        """
+        tables = {
+            name: pq.read_table(os.path.join(directory, filename))
+            for name, filename in cls.PARQUET_FILES.items()
+        }
+        recorder = cls()
+
+        portfolio_df = tables['portfolio_value'].to_pandas()
+        if not portfolio_df.empty:
+            recorder._value_dates = list(portfolio_df.pop('date'))
+            recorder._value_columns = {c: portfolio_df[c].tolist() for c in portfolio_df.columns}
+
+        recorder.position_ledger = PositionLedger.from_arrow(
+            tables['position_events'], tables['position_books']
+        )
+        recorder.trades = [
+            {k: v for k, v in row.items() if v is not None}
+            for row in tables['trades'].to_pylist()
+        ]
+        recorder.equity_curve = tables['equity_curve'].to_pylist()
+        return recorder
+
+    @staticmethod
+    def read_page(path: str, offset: int = 0, limit: int = 100,
+                  columns: Optional[List[str]] = None) -> pa.Table:
+        """
+        分页读取 write_parquet() 写出的某张表（供 API 分页，无需加载整表到 Python 对象）
+
+        参数:
+            path: Parquet 文件路径
+            offset: 起始行
+            limit: 行数
+            columns: 需要的列
+
+        返回:
+            Arrow 表切片
+        """
+        table = pq.read_table(path, columns=columns, memory_map=True)
+        return table.slice(offset, limit)
+
     def clear(self):
         """清空所有记录"""
-        self.portfolio_values.clear()
-        self.positions_history.clear()
+        self._value_dates.clear()
+        self._value_columns.clear()
+        self.position_ledger = PositionLedger()
         self.trades.clear()
         self.equity_curve.clear()
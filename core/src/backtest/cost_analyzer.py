@@ -14,6 +14,7 @@ Date: 2026-01-29
 
 import pandas as pd
 import numpy as np
+from array import array
 from typing import Dict, List, Optional
 from datetime import datetime
 import warnings
@@ -80,16 +81,58 @@ class Trade:
 
 
 class TradingCostAnalyzer:
-    """交易成本分析器"""
+    """
+    交易成本分析器
+
+    交易记录按列缓存（每个字段一个数组），批量调仓时可通过 add_trades()
+    一次追加整批订单；trades 属性按需物化为 Trade 对象列表以兼容旧用法。
+    """
+
+    _NUMERIC_COLUMNS = ('shares', 'price', 'commission', 'stamp_tax', 'slippage', 'total_cost')
 
     def __init__(self):
         """初始化成本分析器"""
-        self.trades: List[Trade] = []
+        self._dates: List[datetime] = []
+        self._stock_codes: List[str] = []
+        self._actions: List[str] = []
+        self._columns: Dict[str, array] = {name: array('d') for name in self._NUMERIC_COLUMNS}
         self.metrics = {}
 
+    @property
+    def n_trades(self) -> int:
+        """交易笔数"""
+        return len(self._dates)
+
+    @property
+    def trades(self) -> List[Trade]:
+        """交易记录（按需物化为 Trade 对象列表）"""
+        cols = self._columns
+        return [
+            Trade(
+                date=self._dates[i],
+                stock_code=self._stock_codes[i],
+                action=self._actions[i],
+                shares=int(cols['shares'][i]) if cols['shares'][i].is_integer() else cols['shares'][i],
+                price=cols['price'][i],
+                commission=cols['commission'][i],
+                stamp_tax=cols['stamp_tax'][i],
+                slippage=cols['slippage'][i],
+                total_cost=cols['total_cost'][i]
+            )
+            for i in range(self.n_trades)
+        ]
+
+    def _column(self, name: str) -> np.ndarray:
+        """数值列（零拷贝视图）"""
+        return np.frombuffer(self._columns[name], dtype=np.float64) if self.n_trades else np.empty(0)
+
     def add_trade(self, trade: Trade):
         """添加交易记录"""
-        self.trades.append(trade)
+        self._dates.append(trade.date)
+        self._stock_codes.append(trade.stock_code)
+        self._actions.append(trade.action)
+        for name in self._NUMERIC_COLUMNS:
+            self._columns[name].append(float(getattr(trade, name)))
 
     def add_trade_from_dict(
         self,
@@ -103,27 +146,83 @@ class TradingCostAnalyzer:
         slippage: float = 0.0
     ):
         """从参数创建并添加交易记录"""
-        total_cost = commission + stamp_tax + slippage
-        trade = Trade(
-            date=date,
-            stock_code=stock_code,
-            action=action,
-            shares=shares,
-            price=price,
-            commission=commission,
-            stamp_tax=stamp_tax,
-            slippage=slippage,
-            total_cost=total_cost
-        )
-        self.add_trade(trade)
+        self._dates.append(date)
+        self._stock_codes.append(stock_code)
+        self._actions.append(action)
+        cols = self._columns
+        cols['shares'].append(float(shares))
+        cols['price'].append(float(price))
+        cols['commission'].append(float(commission))
+        cols['stamp_tax'].append(float(stamp_tax))
+        cols['slippage'].append(float(slippage))
+        cols['total_cost'].append(float(commission + stamp_tax + slippage))
+
+    def add_trades(
+        self,
+        date: datetime,
+        stock_codes: List[str],
+        actions,
+        shares,
+        prices,
+        commissions,
+        stamp_taxes=0.0,
+        slippages=0.0
+    ):
+        """
+        批量添加同一交易日的交易记录
+
+        参数:
+            date: 交易日期
+            stock_codes: 股票代码列表
+            actions: 买入/卖出（标量或数组）
+            shares: 股数数组
+            prices: 成交价格数组
+            commissions: 佣金数组
+            stamp_taxes: 印花税（标量或数组）
+            slippages: 滑点成本（标量或数组）
+        """
+        n = len(stock_codes)
+        if n == 0:
+            return
+
+        numeric = {
+            'shares': shares,
+            'price': prices,
+            'commission': commissions,
+            'stamp_tax': stamp_taxes,
+            'slippage': slippages,
+        }
+        numeric = {k: np.broadcast_to(np.asarray(v, dtype=np.float64), (n,)) for k, v in numeric.items()}
+        numeric['total_cost'] = numeric['commission'] + numeric['stamp_tax'] + numeric['slippage']
+
+        self._dates.extend([date] * n)
+        self._stock_codes.extend(stock_codes)
+        self._actions.extend([actions] * n if isinstance(actions, str) else list(actions))
+        for name, values in numeric.items():
+            self._columns[name].extend(values.tolist())
 
     def get_trades_dataframe(self) -> pd.DataFrame:
         """获取交易记录DataFrame"""
-        if not self.trades:
+        if not self.n_trades:
             return pd.DataFrame()
 
-        trades_data = [trade.to_dict() for trade in self.trades]
-        df = pd.DataFrame(trades_data)
+        shares = self._column('shares')
+        price = self._column('price')
+        trade_value = shares * price
+        total_cost = self._column('total_cost')
+        df = pd.DataFrame({
+            'date': self._dates,
+            'stock_code': self._stock_codes,
+            'action': self._actions,
+            'shares': shares,
+            'price': price,
+            'trade_value': trade_value,
+            'commission': self._column('commission'),
+            'stamp_tax': self._column('stamp_tax'),
+            'slippage': self._column('slippage'),
+            'total_cost': total_cost,
+            'cost_ratio': np.divide(total_cost, trade_value, out=np.zeros_like(total_cost), where=trade_value > 0)
+        })
         df = df.set_index('date')
         return df
 
@@ -139,7 +238,7 @@ class TradingCostAnalyzer:
                 'total_cost': 总成本
             }
         """
-        if not self.trades:
+        if not self.n_trades:
             return {
                 'total_commission': 0.0,
                 'total_stamp_tax': 0.0,
@@ -147,16 +246,11 @@ class TradingCostAnalyzer:
                 'total_cost': 0.0
             }
 
-        total_commission = sum(t.commission for t in self.trades)
-        total_stamp_tax = sum(t.stamp_tax for t in self.trades)
-        total_slippage = sum(t.slippage for t in self.trades)
-        total_cost = sum(t.total_cost for t in self.trades)
-
         return {
-            'total_commission': total_commission,
-            'total_stamp_tax': total_stamp_tax,
-            'total_slippage': total_slippage,
-            'total_cost': total_cost
+            'total_commission': float(self._column('commission').sum()),
+            'total_stamp_tax': float(self._column('stamp_tax').sum()),
+            'total_slippage': float(self._column('slippage').sum()),
+            'total_cost': float(self._column('total_cost').sum())
         }
 
     def calculate_turnover_rate(
@@ -174,11 +268,11 @@ class TradingCostAnalyzer:
         返回:
             换手率
         """
-        if not self.trades:
+        if not self.n_trades:
             return 0.0
 
         # 计算总交易额（买入+卖出）
-        total_trade_value = sum(t.trade_value for t in self.trades)
+        total_trade_value = float((self._column('shares') * self._column('price')).sum())
 
         # 平均资产
         avg_portfolio_value = portfolio_values.mean()
@@ -207,31 +301,22 @@ class TradingCostAnalyzer:
         返回:
             各股票的成本统计DataFrame
         """
-        if not self.trades:
+        if not self.n_trades:
             return pd.DataFrame()
 
         # 按股票分组
-        stock_costs = {}
-        for trade in self.trades:
-            if trade.stock_code not in stock_costs:
-                stock_costs[trade.stock_code] = {
-                    'trade_count': 0,
-                    'total_value': 0.0,
-                    'total_cost': 0.0,
-                    'commission': 0.0,
-                    'stamp_tax': 0.0,
-                    'slippage': 0.0
-                }
-
-            stock_costs[trade.stock_code]['trade_count'] += 1
-            stock_costs[trade.stock_code]['total_value'] += trade.trade_value
-            stock_costs[trade.stock_code]['total_cost'] += trade.total_cost
-            stock_costs[trade.stock_code]['commission'] += trade.commission
-            stock_costs[trade.stock_code]['stamp_tax'] += trade.stamp_tax
-            stock_costs[trade.stock_code]['slippage'] += trade.slippage
-
-        # 转换为DataFrame
-        df = pd.DataFrame.from_dict(stock_costs, orient='index')
+        trades_df = pd.DataFrame({
+            'stock_code': self._stock_codes,
+            'total_value': self._column('shares') * self._column('price'),
+            'total_cost': self._column('total_cost'),
+            'commission': self._column('commission'),
+            'stamp_tax': self._column('stamp_tax'),
+            'slippage': self._column('slippage'),
+        })
+        grouped = trades_df.groupby('stock_code', sort=False)
+        df = grouped.sum()
+        df.insert(0, 'trade_count', grouped.size())
+        df.index.name = None
         df['cost_ratio'] = df['total_cost'] / df['total_value']
         df = df.sort_values('total_cost', ascending=False)
 
@@ -244,7 +329,7 @@ class TradingCostAnalyzer:
         返回:
             成本时间序列DataFrame (按日累计)
         """
-        if not self.trades:
+        if not self.n_trades:
             return pd.DataFrame()
 
         # 转换为DataFrame
@@ -282,7 +367,7 @@ class TradingCostAnalyzer:
         返回:
             成本影响指标字典
         """
-        if not self.trades or len(portfolio_values) == 0:
+        if not self.n_trades or len(portfolio_values) == 0:
             return {}
 
         # 总收益
@@ -332,7 +417,7 @@ class TradingCostAnalyzer:
         返回:
             各场景下的收益对比DataFrame
         """
-        if not self.trades or len(portfolio_values) == 0:
+        if not self.n_trades or len(portfolio_values) == 0:
             return pd.DataFrame()
 
         # 计算总成本
@@ -376,7 +461,7 @@ class TradingCostAnalyzer:
         返回:
             完整的成本分析结果
         """
-        if not self.trades:
+        if not self.n_trades:
             logger.warning("没有交易记录，无法进行成本分析")
             return {}
 
@@ -388,9 +473,9 @@ class TradingCostAnalyzer:
         total_turnover = self.calculate_turnover_rate(portfolio_values, period='total')
 
         # 3. 交易统计
-        n_trades = len(self.trades)
-        n_buy_trades = sum(1 for t in self.trades if t.action == 'buy')
-        n_sell_trades = sum(1 for t in self.trades if t.action == 'sell')
+        n_trades = self.n_trades
+        n_buy_trades = self._actions.count('buy')
+        n_sell_trades = self._actions.count('sell')
         avg_cost_per_trade = total_costs['total_cost'] / n_trades if n_trades > 0 else 0
 
         # 4. 成本影响
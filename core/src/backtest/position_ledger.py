@@ -0,0 +1,277 @@
+"""
+持仓事件账本
+只在持仓发生变化时追加事件（列式数组），按需重建任意交易日的持仓快照，
+替代逐日保存完整持仓字典副本的做法
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+# 持仓字典中可能出现的字段（多头: shares/entry_price/entry_date；空头额外含 stock_code/margin_rate/initial_amount）
+POSITION_FIELDS = ('shares', 'entry_price', 'entry_date', 'stock_code', 'margin_rate', 'initial_amount')
+_FIELD_BITS = {name: 1 << i for i, name in enumerate(POSITION_FIELDS)}
+
+ACTION_CLOSE = 0
+ACTION_UPSERT = 1
+
+_NAT = pd.NaT.value
+
+
+class PositionLedger:
+    """
+    追加式持仓事件账本
+
+    record() 接收与 BacktestPortfolio.get_long_only_snapshot() /
+    get_positions_snapshot() 相同结构的快照 {账簿: {股票: 持仓字典}}，
+    与上一日状态比对，只为新开、变动、平仓的持仓追加一条事件。
+    """
+
+    def __init__(self):
+        self.dates: List[Any] = []
+        self._books: List[str] = []
+        self._book_ids: Dict[str, int] = {}
+        self._codes: List[str] = []
+        self._code_ids: Dict[str, int] = {}
+
+        # 事件列
+        self._ev_day = array('i')
+        self._ev_book = array('b')
+        self._ev_code = array('i')
+        self._ev_action = array('b')
+        self._ev_mask = array('b')
+        self._ev_shares = array('d')
+        self._ev_entry_price = array('d')
+        self._ev_entry_date = array('q')
+        self._ev_margin_rate = array('d')
+        self._ev_initial_amount = array('d')
+
+        # 当前状态（用于比对），(book_id, code_id) -> 打包后的持仓
+        self._state: Dict[Tuple[int, int], Tuple] = {}
+        # 每个交易日记录时出现的账簿（快照结构可能随回测类型不同）
+        self._day_books: List[Tuple[int, ...]] = []
+
+    # ==================== 记录 ====================
+
+    def record(self, date: Any, snapshot: Dict[str, Dict[str, Dict[str, Any]]]):
+        """记录一个交易日的持仓快照（只追加差异事件）"""
+        day = len(self.dates)
+        self.dates.append(date)
+        books_today = []
+
+        for book, positions in snapshot.items():
+            book_id = self._intern(book, self._books, self._book_ids)
+            books_today.append(book_id)
+            current = set()
+
+            for code, position in positions.items():
+                code_id = self._intern(code, self._codes, self._code_ids)
+                key = (book_id, code_id)
+                current.add(key)
+                packed = self._pack(position)
+                if self._state.get(key) != packed:
+                    self._state[key] = packed
+                    self._append(day, book_id, code_id, ACTION_UPSERT, packed)
+
+            closed = [k for k in self._state if k[0] == book_id and k not in current]
+            for key in closed:
+                del self._state[key]
+                self._append(day, key[0], key[1], ACTION_CLOSE, (0, 0.0, 0.0, _NAT, 0.0, 0.0))
+
+        self._day_books.append(tuple(books_today))
+
+    @staticmethod
+    def _intern(value: str, values: List[str], ids: Dict[str, int]) -> int:
+        idx = ids.get(value)
+        if idx is None:
+            idx = len(values)
+            values.append(value)
+            ids[value] = idx
+        return idx
+
+    @staticmethod
+    def _pack(position: Dict[str, Any]) -> Tuple:
+        mask = 0
+        for name in position:
+            mask |= _FIELD_BITS.get(name, 0)
+        entry_date = position.get('entry_date')
+        return (
+            mask,
+            float(position.get('shares') or 0.0),
+            float(position.get('entry_price') or 0.0),
+            pd.Timestamp(entry_date).value if entry_date is not None else _NAT,
+            float(position.get('margin_rate') or 0.0),
+            float(position.get('initial_amount') or 0.0),
+        )
+
+    def _append(self, day: int, book_id: int, code_id: int, action: int, packed: Tuple):
+        mask, shares, entry_price, entry_date, margin_rate, initial_amount = packed
+        self._ev_day.append(day)
+        self._ev_book.append(book_id)
+        self._ev_code.append(code_id)
+        self._ev_action.append(action)
+        self._ev_mask.append(mask)
+        self._ev_shares.append(shares)
+        self._ev_entry_price.append(entry_price)
+        self._ev_entry_date.append(entry_date)
+        self._ev_margin_rate.append(margin_rate)
+        self._ev_initial_amount.append(initial_amount)
+
+    # ==================== 重建 ====================
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def n_events(self) -> int:
+        return len(self._ev_day)
+
+    def _unpack(self, i: int, code: str) -> Dict[str, Any]:
+        mask = self._ev_mask[i]
+        position: Dict[str, Any] = {}
+        if mask & _FIELD_BITS['stock_code']:
+            position['stock_code'] = code
+        if mask & _FIELD_BITS['shares']:
+            shares = self._ev_shares[i]
+            position['shares'] = int(shares) if shares.is_integer() else shares
+        if mask & _FIELD_BITS['entry_price']:
+            position['entry_price'] = self._ev_entry_price[i]
+        if mask & _FIELD_BITS['entry_date']:
+            ts = self._ev_entry_date[i]
+            position['entry_date'] = pd.Timestamp(ts) if ts != _NAT else None
+        if mask & _FIELD_BITS['margin_rate']:
+            position['margin_rate'] = self._ev_margin_rate[i]
+        if mask & _FIELD_BITS['initial_amount']:
+            position['initial_amount'] = self._ev_initial_amount[i]
+        return position
+
+    def _apply(self, state: Dict[int, Dict[str, Dict]], i: int):
+        book = state.setdefault(self._ev_book[i], {})
+        code = self._codes[self._ev_code[i]]
+        if self._ev_action[i] == ACTION_CLOSE:
+            book.pop(code, None)
+        else:
+            book[code] = self._unpack(i, code)
+
+    def _materialize(self, day: int, state: Dict[int, Dict[str, Dict]]) -> Dict[str, Any]:
+        snapshot = {'date': self.dates[day]}
+        for book_id in self._day_books[day]:
+            snapshot[self._books[book_id]] = dict(state.get(book_id, {}))
+        return snapshot
+
+    def snapshot_at(self, day: int) -> Dict[str, Any]:
+        """重建第 day 个记录日的持仓快照（结构与原 positions_history 元素一致）"""
+        if day < 0:
+            day += len(self.dates)
+        if not 0 <= day < len(self.dates):
+            raise IndexError(day)
+        state: Dict[int, Dict[str, Dict]] = {}
+        for i in range(len(self._ev_day)):
+            if self._ev_day[i] > day:
+                break
+            self._apply(state, i)
+        return self._materialize(day, state)
+
+    def iter_snapshots(self) -> Iterator[Dict[str, Any]]:
+        """按日期顺序逐日重建快照（单次遍历事件）"""
+        state: Dict[int, Dict[str, Dict]] = {}
+        i, n = 0, len(self._ev_day)
+        for day in range(len(self.dates)):
+            while i < n and self._ev_day[i] <= day:
+                self._apply(state, i)
+                i += 1
+            yield self._materialize(day, state)
+
+    # ==================== 序列化 ====================
+
+    def to_arrow(self) -> pa.Table:
+        """事件表（每行一个持仓变动事件）"""
+        days = pd.Series(self._ev_day, dtype='int32')
+        dates = pd.Series(self.dates, dtype='object')
+        return pa.table({
+            'day': pa.array(self._ev_day, type=pa.int32()),
+            'date': pa.array(pd.to_datetime(dates.iloc[days].values) if len(days) else [],
+                             type=pa.timestamp('ns')),
+            'book': pa.DictionaryArray.from_arrays(
+                pa.array(self._ev_book, type=pa.int8()), pa.array(self._books, type=pa.string())),
+            'code': pa.DictionaryArray.from_arrays(
+                pa.array(self._ev_code, type=pa.int32()), pa.array(self._codes, type=pa.string())),
+            'action': pa.array(self._ev_action, type=pa.int8()),
+            'field_mask': pa.array(self._ev_mask, type=pa.int8()),
+            'shares': pa.array(self._ev_shares, type=pa.float64()),
+            'entry_price': pa.array(self._ev_entry_price, type=pa.float64()),
+            'entry_date': pa.array(self._ev_entry_date, type=pa.int64()).cast(pa.timestamp('ns')),
+            'margin_rate': pa.array(self._ev_margin_rate, type=pa.float64()),
+            'initial_amount': pa.array(self._ev_initial_amount, type=pa.float64()),
+        })
+
+    def books_to_arrow(self) -> pa.Table:
+        """逐日账簿结构（用于反序列化时恢复快照的键）"""
+        return pa.table({
+            'date': pa.array(pd.to_datetime(pd.Series(self.dates, dtype='object')).values
+                             if self.dates else [], type=pa.timestamp('ns')),
+            'books': pa.array([[self._books[b] for b in books] for books in self._day_books],
+                              type=pa.list_(pa.string())),
+        })
+
+    @classmethod
+    def from_arrow(cls, events: pa.Table, books: pa.Table) -> 'PositionLedger':
+        """由 to_arrow() / books_to_arrow() 的结果恢复账本"""
+        ledger = cls()
+        for date, day_books in zip(books.column('date').to_pylist(), books.column('books').to_pylist()):
+            ledger.dates.append(pd.Timestamp(date))
+            ledger._day_books.append(tuple(
+                cls._intern(b, ledger._books, ledger._book_ids) for b in day_books))
+
+        cols = {name: events.column(name).to_pylist() for name in events.column_names}
+        for i in range(events.num_rows):
+            book_id = cls._intern(cols['book'][i], ledger._books, ledger._book_ids)
+            code_id = cls._intern(cols['code'][i], ledger._codes, ledger._code_ids)
+            entry_date = cols['entry_date'][i]
+            packed = (
+                cols['field_mask'][i], cols['shares'][i], cols['entry_price'][i],
+                pd.Timestamp(entry_date).value if entry_date is not None else _NAT,
+                cols['margin_rate'][i], cols['initial_amount'][i],
+            )
+            ledger._append(cols['day'][i], book_id, code_id, cols['action'][i], packed)
+            if cols['action'][i] == ACTION_CLOSE:
+                ledger._state.pop((book_id, code_id), None)
+            else:
+                ledger._state[(book_id, code_id)] = packed
+        return ledger
+
+
+class PositionHistory:
+    """
+    持仓历史只读视图
+
+    兼容原 positions_history 列表的用法（len / 下标 / 迭代 / 布尔判断），
+    元素按需由 PositionLedger 重建，不常驻内存。
+    """
+
+    def __init__(self, ledger: PositionLedger):
+        self._ledger = ledger
+
+    def __len__(self) -> int:
+        return len(self._ledger)
+
+    def __bool__(self) -> bool:
+        return len(self._ledger) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._ledger.iter_snapshots()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._ledger.snapshot_at(i) for i in range(*index.indices(len(self)))]
+        return self._ledger.snapshot_at(index)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """物化为完整列表（仅在确实需要逐日字典时使用）"""
+        return list(self)
+
+    @property
+    def ledger(self) -> Optional[PositionLedger]:
+        return self._ledger
@@ -9,6 +9,11 @@
 3. MarketImpactModel - 市场冲击成本模型（最真实）
 4. BidAskSpreadModel - 买卖价差模型（适合高频）
 
+批量接口:
+    get_actual_prices() / calculate_slippages() 接收同一调仓日的订单数组
+    （金额、价格、方向、日均成交额、波动率等），一次向量化计算全部订单，
+    数组中的 NaN 等价于标量接口中的 None（缺失数据）
+
 Author: Stock Analysis Core Team
 Date: 2026-01-30
 """
@@ -16,9 +21,29 @@ Date: 2026-01-30
 import pandas as pd
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Optional, Dict
+from typing import Optional, Dict, Union
 from loguru import logger
 
+ArrayLike = Union[float, np.ndarray, pd.Series, list, None]
+
+
+def _batch_array(values: ArrayLike, n: int) -> np.ndarray:
+    """将批量参数转为长度为 n 的 float 数组（None 视为缺失 NaN）"""
+    if values is None:
+        return np.full(n, np.nan)
+    arr = np.asarray(values, dtype=float)
+    if arr.ndim == 0:
+        return np.full(n, float(arr))
+    return arr
+
+
+def _batch_side(is_buy: Union[bool, np.ndarray, list], n: int) -> np.ndarray:
+    """将买卖方向转为长度为 n 的 bool 数组"""
+    arr = np.asarray(is_buy, dtype=bool)
+    if arr.ndim == 0:
+        return np.full(n, bool(arr))
+    return arr
+
 
 class SlippageModel(ABC):
     """滑点模型基类"""
@@ -67,6 +92,74 @@ class SlippageModel(ABC):
         """
         pass
 
+    def calculate_slippages(
+        self,
+        order_sizes: ArrayLike,
+        prices: ArrayLike,
+        is_buy: Union[bool, np.ndarray],
+        **kwargs
+    ) -> np.ndarray:
+        """
+        批量计算滑点
+
+        参数:
+            order_sizes: 订单金额数组（元）
+            prices: 参考价格数组
+            is_buy: 是否买入（标量或数组）
+            **kwargs: 其他参数数组（如 avg_volume、volatility，NaN 表示缺失）
+
+        返回:
+            滑点金额数组（元）
+
+        基类实现逐笔调用标量接口，子类覆盖为向量化实现
+        """
+        sizes = np.asarray(order_sizes, dtype=float)
+        n = len(sizes)
+        ref = _batch_array(prices, n)
+        side = _batch_side(is_buy, n)
+        extra = {k: _batch_array(v, n) for k, v in kwargs.items()}
+        return np.array([
+            self.calculate_slippage(
+                sizes[i], ref[i], bool(side[i]),
+                **{k: (None if np.isnan(v[i]) else v[i]) for k, v in extra.items()}
+            )
+            for i in range(n)
+        ], dtype=float)
+
+    def get_actual_prices(
+        self,
+        order_sizes: ArrayLike,
+        reference_prices: ArrayLike,
+        is_buy: Union[bool, np.ndarray],
+        **kwargs
+    ) -> np.ndarray:
+        """
+        批量计算实际成交价格
+
+        参数:
+            order_sizes: 订单金额数组（元）
+            reference_prices: 参考价格数组
+            is_buy: 是否买入（标量或数组）
+            **kwargs: 其他参数数组（NaN 表示缺失）
+
+        返回:
+            实际成交价格数组
+
+        基类实现逐笔调用标量接口，子类覆盖为向量化实现
+        """
+        sizes = np.asarray(order_sizes, dtype=float)
+        n = len(sizes)
+        ref = _batch_array(reference_prices, n)
+        side = _batch_side(is_buy, n)
+        extra = {k: _batch_array(v, n) for k, v in kwargs.items()}
+        return np.array([
+            self.get_actual_price(
+                sizes[i], ref[i], bool(side[i]),
+                **{k: (None if np.isnan(v[i]) else v[i]) for k, v in extra.items()}
+            )
+            for i in range(n)
+        ], dtype=float)
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
@@ -126,6 +219,17 @@ class FixedSlippageModel(SlippageModel):
             # 卖出时价格向下滑点
             return reference_price * (1 - self.slippage_pct)
 
+    def calculate_slippages(self, order_sizes, prices, is_buy, **kwargs) -> np.ndarray:
+        """批量计算滑点金额"""
+        return np.asarray(order_sizes, dtype=float) * self.slippage_pct
+
+    def get_actual_prices(self, order_sizes, reference_prices, is_buy, **kwargs) -> np.ndarray:
+        """批量计算实际成交价格"""
+        n = len(np.asarray(order_sizes))
+        ref = _batch_array(reference_prices, n)
+        side = _batch_side(is_buy, n)
+        return ref * np.where(side, 1 + self.slippage_pct, 1 - self.slippage_pct)
+
     def __repr__(self) -> str:
         return f"FixedSlippageModel(slippage_pct={self.slippage_pct})"
 
@@ -233,6 +337,27 @@ class VolumeBasedSlippageModel(SlippageModel):
         else:
             return reference_price * (1 - slippage_pct)
 
+    def _slippage_pcts(self, order_sizes: np.ndarray, avg_volume: np.ndarray) -> np.ndarray:
+        """批量滑点比例（无成交量数据的订单使用基础滑点）"""
+        has_volume = avg_volume > 0  # NaN 比较为 False
+        participation_rate = np.divide(
+            order_sizes, avg_volume, out=np.zeros_like(order_sizes), where=has_volume
+        )
+        impact = self.base_slippage + self.impact_coefficient * np.sqrt(participation_rate)
+        return np.where(has_volume, np.minimum(impact, self.max_slippage), self.base_slippage)
+
+    def calculate_slippages(self, order_sizes, prices, is_buy, avg_volume=None, **kwargs) -> np.ndarray:
+        """批量计算滑点金额"""
+        sizes = np.asarray(order_sizes, dtype=float)
+        return sizes * self._slippage_pcts(sizes, _batch_array(avg_volume, len(sizes)))
+
+    def get_actual_prices(self, order_sizes, reference_prices, is_buy, avg_volume=None, **kwargs) -> np.ndarray:
+        """批量计算实际成交价格"""
+        sizes = np.asarray(order_sizes, dtype=float)
+        n = len(sizes)
+        pct = self._slippage_pcts(sizes, _batch_array(avg_volume, n))
+        return _batch_array(reference_prices, n) * np.where(_batch_side(is_buy, n), 1 + pct, 1 - pct)
+
     def __repr__(self) -> str:
         return (f"VolumeBasedSlippageModel(base={self.base_slippage}, "
                 f"impact={self.impact_coefficient}, max={self.max_slippage})")
@@ -370,6 +495,40 @@ class MarketImpactModel(SlippageModel):
         else:
             return reference_price * (1 - slippage_pct)
 
+    def _slippage_pcts(
+        self,
+        order_sizes: np.ndarray,
+        avg_volume: np.ndarray,
+        volatility: np.ndarray
+    ) -> np.ndarray:
+        """批量滑点比例（缺失值的默认处理与标量接口一致）"""
+        avg_volume = np.where(avg_volume > 0, avg_volume, order_sizes * 100)
+        volatility = np.where(volatility > 0, volatility, 0.02)
+        participation_rate = np.divide(
+            order_sizes, avg_volume, out=np.zeros_like(order_sizes), where=avg_volume > 0
+        )
+        volume_impact = participation_rate ** self.volume_impact_alpha
+        slippage_pct = self.volatility_weight * volatility * volume_impact * self.urgency_factor
+        return np.minimum(slippage_pct, self.max_slippage)
+
+    def calculate_slippages(
+        self, order_sizes, prices, is_buy, avg_volume=None, volatility=None, **kwargs
+    ) -> np.ndarray:
+        """批量计算滑点金额"""
+        sizes = np.asarray(order_sizes, dtype=float)
+        n = len(sizes)
+        return sizes * self._slippage_pcts(sizes, _batch_array(avg_volume, n), _batch_array(volatility, n))
+
+    def get_actual_prices(
+        self, order_sizes, reference_prices, is_buy, avg_volume=None, volatility=None, **kwargs
+    ) -> np.ndarray:
+        """批量计算实际成交价格"""
+        sizes = np.asarray(order_sizes, dtype=float)
+        n = len(sizes)
+        pct = self._slippage_pcts(sizes, _batch_array(avg_volume, n), _batch_array(volatility, n))
+        pct = np.where(sizes > 0, pct, 0.0)
+        return _batch_array(reference_prices, n) * np.where(_batch_side(is_buy, n), 1 + pct, 1 - pct)
+
     def __repr__(self) -> str:
         return (f"MarketImpactModel(vol_weight={self.volatility_weight}, "
                 f"alpha={self.volume_impact_alpha}, urgency={self.urgency_factor})")
@@ -503,6 +662,44 @@ class BidAskSpreadModel(SlippageModel):
             else:
                 return reference_price * (1 - half_spread)
 
+    def _half_spreads(self, volatility: np.ndarray) -> np.ndarray:
+        """无盘口数据时估算的半价差比例"""
+        volatility = np.where(np.isnan(volatility), 0.02, volatility)
+        return (self.base_spread + volatility * self.spread_volatility_factor) / 2
+
+    def calculate_slippages(
+        self, order_sizes, prices, is_buy, bid_price=None, ask_price=None, volatility=None, **kwargs
+    ) -> np.ndarray:
+        """批量计算滑点金额（有盘口的订单按盘口计算，其余按估算价差）"""
+        sizes = np.asarray(order_sizes, dtype=float)
+        n = len(sizes)
+        ref = _batch_array(prices, n)
+        bid = _batch_array(bid_price, n)
+        ask = _batch_array(ask_price, n)
+        has_quote = ~np.isnan(bid) & ~np.isnan(ask)
+
+        mid = (bid + ask) / 2
+        per_share = np.where(_batch_side(is_buy, n), ask - mid, mid - bid)
+        shares = np.divide(sizes, ref, out=np.zeros_like(sizes), where=ref > 0)
+        quoted = per_share * shares
+        estimated = sizes * self._half_spreads(_batch_array(volatility, n))
+        return np.where(has_quote, quoted, estimated)
+
+    def get_actual_prices(
+        self, order_sizes, reference_prices, is_buy, bid_price=None, ask_price=None, volatility=None, **kwargs
+    ) -> np.ndarray:
+        """批量计算实际成交价格（有盘口的订单按买一/卖一成交）"""
+        n = len(np.asarray(order_sizes))
+        ref = _batch_array(reference_prices, n)
+        bid = _batch_array(bid_price, n)
+        ask = _batch_array(ask_price, n)
+        side = _batch_side(is_buy, n)
+        has_quote = ~np.isnan(bid) & ~np.isnan(ask)
+
+        half_spread = self._half_spreads(_batch_array(volatility, n))
+        estimated = ref * np.where(side, 1 + half_spread, 1 - half_spread)
+        return np.where(has_quote, np.where(side, ask, bid), estimated)
+
     def __repr__(self) -> str:
         return f"BidAskSpreadModel(base_spread={self.base_spread})"
 
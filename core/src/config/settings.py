@@ -110,6 +110,7 @@ class MLSettings(BaseSettings):
     default_valid_ratio: float = Field(default=0.15, description="默认验证集比例")
     cache_features: bool = Field(default=True, description="是否缓存特征")
     feature_version: str = Field(default="v2.0", description="特征版本号")
+    float_dtype: str = Field(default="float32", description="特征 / 收益率 / 行情数值的浮点类型（float32 或 float64）")
 
     model_config = ConfigDict(
         env_prefix="ML_",
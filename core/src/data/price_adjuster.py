@@ -0,0 +1,144 @@
+"""
+复权价格服务 - PriceAdjuster
+
+回测与特征计算统一用这里的函数对原始行情做复权，不再各自 JOIN adj_factor。
+
+原理:
+- Tushare adj_factor 为自上市起的累计复权因子 F(t)
+- 后复权 (hfq): P_hfq(t) = P(t) × F(t)
+- 前复权 (qfq): P_qfq(t) = P(t) × F(t) / F(as_of)，as_of 默认取请求区间最后一天，
+  即「站在区间末尾看到的前复权价格」，不会引入 as_of 之后的除权信息（point-in-time）
+- 成交量 / 成交额等非价格字段不做调整
+- 输入可以是面板（日期 × 股票，复权为一次矩阵乘法）或长表（code, date, adj_factor），
+  原始行情与 adj_factor 由 DataQueryManager.load_market_daily 一次取出
+
+范围:
+- 只提供无状态的复权计算，目前由回测编排（price_adjust 参数）使用
+- 不维护常驻的累计因子矩阵，也不随除权除息按股票失效；特征计算仍读取原始价格
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from ..exceptions import DataValidationError
+except ImportError:
+    from src.exceptions import DataValidationError
+
+
+# 需要复权的价格字段
+PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+ADJUST_NONE = None
+ADJUST_FORWARD = 'qfq'    # 前复权
+ADJUST_BACKWARD = 'hfq'   # 后复权
+SUPPORTED_ADJUST = (ADJUST_NONE, ADJUST_FORWARD, ADJUST_BACKWARD)
+
+
+class PriceAdjuster:
+    """
+    复权计算（无状态）
+
+    使用方式:
+        # 长表（回测编排中的 market_data）
+        market_data = PriceAdjuster.adjust_long(market_data, adjust='qfq')
+
+        # 面板
+        factors = PriceAdjuster.build_factor_matrix(adj_factor_panel)
+        adjusted = PriceAdjuster.adjust_panels(raw_panels, factors, adjust='hfq')
+    """
+
+    @staticmethod
+    def build_factor_matrix(factor_panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        由原始 adj_factor 面板构建累计因子矩阵
+
+        - 停牌 / 缺失日向前填充（因子只在除权日变化）
+        - 区间开头缺失向后填充（因子表同步起点晚于行情时的近似）
+        - 完全没有因子的股票填 1.0（等同不复权）
+        """
+        factors = factor_panel.astype('float64')
+        factors = factors.where(factors > 0)
+        return factors.ffill().bfill().fillna(1.0)
+
+    @staticmethod
+    def adjust_panels(
+        panels: Dict[str, pd.DataFrame],
+        factors: pd.DataFrame,
+        adjust: Optional[str] = ADJUST_FORWARD,
+        as_of: Optional[pd.Timestamp] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        对价格面板做向量化复权
+
+        参数:
+            panels: {字段: DataFrame(index=date, columns=code)}
+            factors: 累计因子矩阵（build_factor_matrix 的输出）
+            adjust: 'qfq' / 'hfq' / None
+            as_of: 前复权基准日（默认面板最后一天）
+
+        返回:
+            复权后的面板字典（非价格字段原样返回）
+        """
+        if adjust not in SUPPORTED_ADJUST:
+            raise DataValidationError(
+                f"不支持的复权方式: {adjust}",
+                error_code="UNSUPPORTED_ADJUST_TYPE",
+                adjust=adjust,
+                supported=[a for a in SUPPORTED_ADJUST if a]
+            )
+        if adjust is ADJUST_NONE or not panels:
+            return dict(panels)
+
+        reference = next(iter(panels.values()))
+        multiplier = factors.reindex(index=reference.index, columns=reference.columns)
+        multiplier = multiplier.ffill().bfill().fillna(1.0)
+
+        if adjust == ADJUST_FORWARD:
+            base_row = multiplier.loc[:as_of].iloc[-1] if as_of is not None else multiplier.iloc[-1]
+            multiplier = multiplier / base_row.replace(0, np.nan)
+            multiplier = multiplier.fillna(1.0)
+
+        return {
+            field: panel * multiplier if field in PRICE_FIELDS else panel
+            for field, panel in panels.items()
+        }
+
+    @staticmethod
+    def adjust_long(
+        df: pd.DataFrame,
+        adjust: Optional[str] = ADJUST_FORWARD,
+        as_of: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """
+        对长表（code, date, 价格字段, adj_factor）做复权，语义与 adjust_panels 一致
+
+        适用于已经按股票加载好的行情（如回测编排中的 market_data），无需先透视。
+        """
+        if adjust not in SUPPORTED_ADJUST:
+            raise DataValidationError(
+                f"不支持的复权方式: {adjust}",
+                error_code="UNSUPPORTED_ADJUST_TYPE",
+                adjust=adjust,
+                supported=[a for a in SUPPORTED_ADJUST if a]
+            )
+        if adjust is ADJUST_NONE or df.empty or 'adj_factor' not in df.columns:
+            return df
+
+        out = df.sort_values(['code', 'date'], kind='mergesort').copy()
+        factor = pd.to_numeric(out['adj_factor'], errors='coerce')
+        factor = factor.where(factor > 0)
+        grouped = factor.groupby(out['code'], observed=True)
+        factor = grouped.ffill().groupby(out['code'], observed=True).bfill().fillna(1.0)
+
+        if adjust == ADJUST_FORWARD:
+            base_source = factor if as_of is None else factor.where(out['date'] <= as_of)
+            base = base_source.groupby(out['code'], observed=True).transform('last')
+            factor = (factor / base).fillna(1.0)
+
+        for field in PRICE_FIELDS:
+            if field in out.columns:
+                out[field] = pd.to_numeric(out[field], errors='coerce') * factor
+        return out
@@ -0,0 +1,367 @@
+"""
+交易日历内存索引
+
+进程内共享的有序交易日数组（一次加载，按 trade_cal 同步刷新），
+以二分查找回答交易日判断、前后推移、区间计数等问题，并提供面向整列日期的向量化版本，
+替代各模块逐次查询数据库的 is_trading_day / get_next_trading_day 等实现。
+
+日期参数均支持 'YYYY-MM-DD' / 'YYYYMMDD' 字符串、date、datetime、pd.Timestamp；
+日历覆盖范围之外的日期按周一至周五判断（与原各实现的回退规则一致）。
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 日历数据最长使用时间（秒），超过后下一次访问时重新加载
+DEFAULT_MAX_AGE = 3600
+# 加载失败后的重试间隔（秒），避免每次调用都访问数据库
+RETRY_INTERVAL = 60
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+DateLike = Any
+
+
+def _default_loader() -> Dict[str, Any]:
+    """默认从数据库加载（延迟导入，避免与 database 模块循环依赖）"""
+    from src.database.db_manager import get_database
+    return get_database().load_trading_calendar()
+
+
+class TradingCalendarIndex:
+    """
+    交易日历索引
+
+    loader 返回 {'dates': 交易日序列, 'start': 日历起始日, 'end': 日历结束日, 'source': 来源表}，
+    start / end 为日历本身的覆盖范围（含非交易日），用于区分"非交易日"与"日历未覆盖"。
+
+    示例:
+        >>> calendar = get_trading_calendar()
+        >>> calendar.is_trading_day('2024-01-02')
+        True
+        >>> calendar.offset('2024-01-05', 3)
+        datetime.date(2024, 1, 10)
+    """
+
+    def __init__(
+        self,
+        loader: Optional[Callable[[], Dict[str, Any]]] = None,
+        max_age: float = DEFAULT_MAX_AGE
+    ):
+        """
+        初始化交易日历索引
+
+        参数:
+            loader: 日历加载函数（默认从数据库加载）
+            max_age: 数据最长使用时间（秒），0 表示不自动刷新
+        """
+        self._loader = loader or _default_loader
+        self.max_age = max_age
+        self._lock = threading.Lock()
+
+        # 整体替换的只读状态: (交易日 datetime64[D] 数组, 序数列表, 覆盖起始序数, 覆盖结束序数)
+        self._state: Optional[Tuple[np.ndarray, List[int], int, int]] = None
+        self.source: Optional[str] = None
+        self._loaded_at = 0.0
+        self._failed_at = 0.0
+
+    # ==================== 加载 ====================
+
+    def set_dates(self, dates: Iterable[DateLike], start: DateLike = None, end: DateLike = None,
+                  source: str = 'manual'):
+        """
+        直接设置交易日（测试或离线场景）
+
+        参数:
+            dates: 交易日序列
+            start: 日历覆盖起始日（默认首个交易日）
+            end: 日历覆盖结束日（默认最后一个交易日）
+            source: 数据来源标识
+        """
+        days = np.unique(self._to_days(dates))
+        ordinals = days.astype(np.int64).tolist()
+        if ordinals:
+            start_ord = self._ordinal(start) if start is not None else ordinals[0]
+            end_ord = self._ordinal(end) if end is not None else ordinals[-1]
+        else:
+            start_ord, end_ord = 1, 0  # 空覆盖范围
+
+        self._state = (days, ordinals, start_ord, end_ord)
+        self.source = source
+        self._loaded_at = time.monotonic()
+        self._failed_at = 0.0
+
+    def load(self, force: bool = False) -> bool:
+        """
+        加载日历（已加载且未过期时直接返回）
+
+        参数:
+            force: 是否强制重新加载
+
+        返回:
+            当前是否有可用的日历数据
+        """
+        now = time.monotonic()
+        if not force:
+            if self._state is not None and (not self.max_age or now - self._loaded_at < self.max_age):
+                return True
+            if self._failed_at and now - self._failed_at < RETRY_INTERVAL:
+                return self._state is not None
+
+        with self._lock:
+            if not force and self._state is not None and now - self._loaded_at < (self.max_age or float('inf')):
+                return True
+            try:
+                data = self._loader()
+                self.set_dates(data['dates'], data.get('start'), data.get('end'), data.get('source', 'database'))
+                logger.info(
+                    f"交易日历索引已加载: {len(self._state[1])} 个交易日 "
+                    f"({self.coverage[0]} ~ {self.coverage[1]}, 来源: {self.source})"
+                )
+            except Exception as e:
+                self._failed_at = time.monotonic()
+                logger.warning(f"加载交易日历失败，{RETRY_INTERVAL}s 内使用现有数据或周末规则: {e}")
+        return self._state is not None
+
+    def refresh(self) -> bool:
+        """强制重新加载（交易日历同步完成后调用）"""
+        return self.load(force=True)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._state is not None
+
+    @property
+    def coverage(self) -> Tuple[Optional[date], Optional[date]]:
+        """日历覆盖范围（含非交易日）"""
+        if self._state is None or self._state[2] > self._state[3]:
+            return None, None
+        return self._from_ordinal(self._state[2]), self._from_ordinal(self._state[3])
+
+    def _ensure(self) -> Optional[Tuple[np.ndarray, List[int], int, int]]:
+        self.load()
+        return self._state
+
+    # ==================== 日期转换 ====================
+
+    @staticmethod
+    def to_date(value: DateLike) -> date:
+        """转换为 date"""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        if isinstance(value, str):
+            value = value.strip()
+            if len(value) == 8 and value.isdigit():
+                return date(int(value[:4]), int(value[4:6]), int(value[6:]))
+            return date.fromisoformat(value[:10])
+        return pd.Timestamp(value).date()
+
+    @classmethod
+    def _ordinal(cls, value: DateLike) -> int:
+        return cls.to_date(value).toordinal() - _EPOCH_ORDINAL
+
+    @staticmethod
+    def _from_ordinal(ordinal: int) -> date:
+        return date.fromordinal(ordinal + _EPOCH_ORDINAL)
+
+    @staticmethod
+    def _to_days(values: Iterable[DateLike]) -> np.ndarray:
+        """批量转换为 datetime64[D] 数组"""
+        if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.datetime64):
+            return values.astype('datetime64[D]')
+        series = pd.Series(values) if isinstance(values, (pd.Series, pd.Index)) else pd.Series(list(values))
+        if series.dtype == object:
+            # 'YYYY-MM-DD' / 'YYYYMMDD' / date 混合输入
+            series = pd.to_datetime(series.astype(str), format='mixed')
+        return pd.to_datetime(series).values.astype('datetime64[D]')
+
+    # ==================== 单点查询 ====================
+
+    def covers(self, value: DateLike) -> bool:
+        """日期是否在日历覆盖范围内"""
+        state = self._ensure()
+        if state is None:
+            return False
+        ordinal = self._ordinal(value)
+        return state[2] <= ordinal <= state[3]
+
+    def is_trading_day(self, value: DateLike) -> bool:
+        """是否为交易日（覆盖范围外按周一至周五判断）"""
+        state = self._ensure()
+        d = self.to_date(value)
+        ordinal = d.toordinal() - _EPOCH_ORDINAL
+        if state is None or not state[2] <= ordinal <= state[3]:
+            return d.weekday() < 5
+        ordinals = state[1]
+        i = bisect_left(ordinals, ordinal)
+        return i < len(ordinals) and ordinals[i] == ordinal
+
+    def next_trading_day(self, value: DateLike, n: int = 1) -> Optional[date]:
+        """之后第 n 个交易日（不含当日），超出日历范围返回 None"""
+        state = self._ensure()
+        if state is None:
+            return None
+        ordinals = state[1]
+        i = bisect_right(ordinals, self._ordinal(value)) + n - 1
+        return self._from_ordinal(ordinals[i]) if 0 <= i < len(ordinals) else None
+
+    def prev_trading_day(self, value: DateLike, n: int = 1) -> Optional[date]:
+        """之前第 n 个交易日（不含当日），超出日历范围返回 None"""
+        state = self._ensure()
+        if state is None:
+            return None
+        ordinals = state[1]
+        i = bisect_left(ordinals, self._ordinal(value)) - n
+        return self._from_ordinal(ordinals[i]) if 0 <= i < len(ordinals) else None
+
+    def latest_trading_day(self, value: DateLike = None) -> Optional[date]:
+        """不晚于指定日期（默认今天）的最近交易日"""
+        state = self._ensure()
+        if state is None:
+            return None
+        ordinals = state[1]
+        i = bisect_right(ordinals, self._ordinal(value if value is not None else date.today())) - 1
+        return self._from_ordinal(ordinals[i]) if i >= 0 else None
+
+    def offset(self, value: DateLike, n: int) -> Optional[date]:
+        """
+        按交易日推移
+
+        n > 0 为之后第 n 个交易日，n < 0 为之前第 |n| 个交易日，
+        n == 0 时交易日返回自身、非交易日返回之后最近的交易日
+        """
+        if n > 0:
+            return self.next_trading_day(value, n)
+        if n < 0:
+            return self.prev_trading_day(value, -n)
+        state = self._ensure()
+        if state is None:
+            return None
+        ordinals = state[1]
+        i = bisect_left(ordinals, self._ordinal(value))
+        return self._from_ordinal(ordinals[i]) if i < len(ordinals) else None
+
+    def count_between(self, start: DateLike, end: DateLike) -> int:
+        """闭区间 [start, end] 内的交易日数量"""
+        state = self._ensure()
+        if state is None:
+            return 0
+        ordinals = state[1]
+        return max(0, bisect_right(ordinals, self._ordinal(end)) - bisect_left(ordinals, self._ordinal(start)))
+
+    def trading_days_between(self, start: DateLike, end: DateLike) -> List[date]:
+        """闭区间 [start, end] 内的交易日列表（升序）"""
+        state = self._ensure()
+        if state is None:
+            return []
+        ordinals = state[1]
+        lo = bisect_left(ordinals, self._ordinal(start))
+        hi = bisect_right(ordinals, self._ordinal(end))
+        return [self._from_ordinal(o) for o in ordinals[lo:hi]]
+
+    def recent_n(self, n: int, reference: DateLike = None) -> List[date]:
+        """不晚于参考日（默认今天）的最近 n 个交易日（倒序）"""
+        state = self._ensure()
+        if state is None or n <= 0:
+            return []
+        ordinals = state[1]
+        hi = bisect_right(ordinals, self._ordinal(reference if reference is not None else date.today()))
+        return [self._from_ordinal(o) for o in reversed(ordinals[max(0, hi - n):hi])]
+
+    # ==================== 向量化查询 ====================
+
+    def is_trading_day_array(self, values: Iterable[DateLike]) -> np.ndarray:
+        """批量判断交易日（覆盖范围外按周一至周五判断）"""
+        days = self._to_days(values)
+        weekday = ((days.astype(np.int64) + 3) % 7) < 5  # 1970-01-01 为周四
+        state = self._ensure()
+        if state is None:
+            return weekday
+        calendar = state[0]
+        pos = np.searchsorted(calendar, days)
+        found = np.zeros(len(days), dtype=bool)
+        in_bounds = pos < len(calendar)
+        found[in_bounds] = calendar[pos[in_bounds]] == days[in_bounds]
+        ordinals = days.astype(np.int64)
+        covered = (ordinals >= state[2]) & (ordinals <= state[3])
+        return np.where(covered, found, weekday)
+
+    def offset_array(self, values: Iterable[DateLike], n: int) -> np.ndarray:
+        """批量按交易日推移（语义同 offset），超出日历范围为 NaT"""
+        days = self._to_days(values)
+        state = self._ensure()
+        result = np.full(len(days), np.datetime64('NaT'), dtype='datetime64[D]')
+        if state is None:
+            return result
+        calendar = state[0]
+        if n > 0:
+            idx = np.searchsorted(calendar, days, side='right') + n - 1
+        elif n < 0:
+            idx = np.searchsorted(calendar, days, side='left') + n
+        else:
+            idx = np.searchsorted(calendar, days, side='left')
+        valid = (idx >= 0) & (idx < len(calendar))
+        result[valid] = calendar[idx[valid]]
+        return result
+
+    def latest_trading_day_array(self, values: Iterable[DateLike]) -> np.ndarray:
+        """批量取不晚于各日期的最近交易日，早于日历起点为 NaT"""
+        days = self._to_days(values)
+        state = self._ensure()
+        result = np.full(len(days), np.datetime64('NaT'), dtype='datetime64[D]')
+        if state is None:
+            return result
+        calendar = state[0]
+        idx = np.searchsorted(calendar, days, side='right') - 1
+        valid = idx >= 0
+        result[valid] = calendar[idx[valid]]
+        return result
+
+    def count_between_array(self, starts: Iterable[DateLike], ends: Iterable[DateLike]) -> np.ndarray:
+        """批量计算闭区间内的交易日数量"""
+        start_days = self._to_days(starts)
+        end_days = self._to_days(ends)
+        state = self._ensure()
+        if state is None:
+            return np.zeros(len(start_days), dtype=np.int64)
+        calendar = state[0]
+        counts = np.searchsorted(calendar, end_days, side='right') - np.searchsorted(calendar, start_days, side='left')
+        return np.maximum(counts, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """索引状态"""
+        start, end = self.coverage
+        return {
+            'loaded': self.is_loaded,
+            'source': self.source,
+            'trading_days': len(self._state[1]) if self._state else 0,
+            'coverage_start': start.isoformat() if start else None,
+            'coverage_end': end.isoformat() if end else None,
+            'age_seconds': round(time.monotonic() - self._loaded_at, 1) if self._state else None,
+        }
+
+
+_calendar: Optional[TradingCalendarIndex] = None
+_calendar_lock = threading.Lock()
+
+
+def get_trading_calendar() -> TradingCalendarIndex:
+    """获取进程内共享的交易日历索引"""
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                _calendar = TradingCalendarIndex()
+    return _calendar
@@ -7,6 +7,7 @@
 - DataCleaner: 数据清洗
 - DataSplitter: 数据分割和预处理
 - FeatureCache: 缓存管理
+- ColumnarFeatureCache: 按特征组的列式缓存
 - DataPipeline: 流程编排器
 
 配置类已迁移到 config.pipeline 模块,但为了向后兼容仍可从此处导入
@@ -17,6 +18,7 @@ from .feature_engineer import FeatureEngineer
 from .data_cleaner import DataCleaner
 from .data_splitter import DataSplitter
 from .feature_cache import FeatureCache
+from .columnar_feature_cache import ColumnarFeatureCache
 
 # 从本地orchestrator模块导入编排器类和辅助函数
 # 解决循环导入：data_pipeline <-> pipeline
@@ -52,6 +54,7 @@ __all__ = [
     'DataCleaner',
     'DataSplitter',
     'FeatureCache',
+    'ColumnarFeatureCache',
     'DataPipeline',
     'create_pipeline',
     'get_full_training_data',
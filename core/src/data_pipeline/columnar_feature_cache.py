@@ -0,0 +1,308 @@
+"""
+列式特征缓存 (ColumnarFeatureCache)
+
+按 (股票, 特征组, 组参数) 分别缓存特征，记录日期覆盖范围：
+- 每组一个目录，数据按 Parquet 分片追加（part-00000.parquet, part-00001.parquet ...），
+  新交易日只追加尾部分片，分片过多时合并
+- 修改某一组的参数只使该组失效，其余组继续复用
+- 按列读取（Parquet 列投影），未使用的特征不加载
+
+目录结构：
+    {cache_dir}/columnar/{symbol}/{group}-{params_hash}/
+        meta.json
+        part-00000.parquet
+        ...
+
+特殊组 'raw' 缓存原始 OHLCV，用于增量计算的预热数据与复权变化检测；
+其 generation 变化（整体重建）时，所有特征组随之重建。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.exceptions import FeatureCacheError
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RAW_GROUP = 'raw'
+META_FILE = 'meta.json'
+
+
+class ColumnarFeatureCache:
+    """
+    列式特征缓存
+
+    职责：
+    - 按 (symbol, group, params) 定位缓存目录
+    - 整组保存 / 尾部追加分片
+    - 按日期范围与列投影加载
+    - 元数据（覆盖范围、列名、分片、raw generation）读写
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = 'data/pipeline_cache',
+        feature_version: str = 'v2.2',
+        compact_parts: int = 8
+    ):
+        """
+        初始化列式特征缓存
+
+        Args:
+            cache_dir: 缓存根目录（与旧版 FeatureCache 共用，数据位于 columnar/ 子目录）
+            feature_version: 特征版本号（参与所有组的参数哈希）
+            compact_parts: 分片数超过该值时合并为单个分片
+        """
+        self.cache_dir = Path(cache_dir) / 'columnar'
+        self.feature_version = feature_version
+        self.compact_parts = compact_parts
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ==================== 路径与元数据 ====================
+
+    def params_hash(self, params: Dict) -> str:
+        """组参数哈希（含特征版本号）"""
+        payload = json.dumps({'version': self.feature_version, 'params': params}, sort_keys=True)
+        return hashlib.md5(payload.encode()).hexdigest()[:12]
+
+    def group_dir(self, symbol: str, group: str, params: Dict) -> Path:
+        """特征组缓存目录"""
+        return self.cache_dir / symbol / f"{group}-{self.params_hash(params)}"
+
+    def read_meta(self, symbol: str, group: str, params: Dict) -> Optional[Dict]:
+        """读取组元数据，不存在或损坏时返回 None"""
+        meta_file = self.group_dir(symbol, group, params) / META_FILE
+        if not meta_file.exists():
+            return None
+        try:
+            with open(meta_file, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"缓存元数据损坏，忽略: {meta_file} ({e})")
+            return None
+        if meta.get('version') != self.feature_version:
+            return None
+        return meta
+
+    def update_coverage(self, symbol: str, group: str, params: Dict, covered_end: str) -> Dict:
+        """仅更新覆盖截止日期（查询过但没有新数据时）"""
+        group_dir = self.group_dir(symbol, group, params)
+        meta = self.read_meta(symbol, group, params)
+        if meta is None:
+            raise FeatureCacheError(f"缓存不存在: {symbol}/{group}")
+        meta['covered_end'] = max(meta['covered_end'], covered_end)
+        self._write_meta(group_dir, meta)
+        return meta
+
+    # ==================== 写入 ====================
+
+    def save(
+        self,
+        symbol: str,
+        group: str,
+        params: Dict,
+        df: pd.DataFrame,
+        covered_start: str,
+        covered_end: str,
+        raw_generation: Optional[str] = None
+    ) -> Dict:
+        """
+        整组保存（覆盖已有分片）
+
+        Args:
+            symbol: 股票代码
+            group: 特征组名（'raw' 为原始数据）
+            params: 组参数
+            df: 该组特征（日期索引）
+            covered_start: 覆盖起始日期 YYYYMMDD
+            covered_end: 覆盖截止日期 YYYYMMDD（可晚于最后一行，表示该区间已查询过）
+            raw_generation: 计算所依据的 raw 缓存代次（raw 组自身会生成新代次）
+
+        Returns:
+            写入后的元数据
+        """
+        group_dir = self.group_dir(symbol, group, params)
+        try:
+            if group_dir.exists():
+                shutil.rmtree(group_dir)
+            group_dir.mkdir(parents=True, exist_ok=True)
+            self._write_part(group_dir, 'part-00000.parquet', df)
+
+            meta = {
+                'version': self.feature_version,
+                'symbol': symbol,
+                'group': group,
+                'params': params,
+                'columns': df.columns.tolist(),
+                'parts': ['part-00000.parquet'],
+                'first_date': self._date_str(df.index[0]) if len(df) else None,
+                'last_date': self._date_str(df.index[-1]) if len(df) else None,
+                'covered_start': covered_start,
+                'covered_end': covered_end,
+                'updated_at': pd.Timestamp.now().isoformat(),
+            }
+            if group == RAW_GROUP:
+                meta['generation'] = uuid.uuid4().hex
+            else:
+                meta['raw_generation'] = raw_generation
+            self._write_meta(group_dir, meta)
+            logger.debug(f"特征组缓存已保存: {symbol}/{group} ({len(df)} 行, {len(df.columns)} 列)")
+            return meta
+
+        except Exception as e:
+            logger.error(f"特征组缓存保存失败: {symbol}/{group}: {e}")
+            raise FeatureCacheError(f"特征组缓存保存失败: {e}")
+
+    def append(
+        self,
+        symbol: str,
+        group: str,
+        params: Dict,
+        tail: pd.DataFrame,
+        covered_end: str,
+        raw_generation: Optional[str] = None
+    ) -> Dict:
+        """
+        追加尾部分片
+
+        tail 可以与已缓存的最后几行重叠（如 label 的最后 N 行需用新数据重算），
+        加载时同一日期以后写入的分片为准。
+
+        Args:
+            tail: 新增（及需覆盖）的行
+            covered_end: 新的覆盖截止日期
+            raw_generation: 特征组追加时所依据的 raw 代次
+        """
+        group_dir = self.group_dir(symbol, group, params)
+        meta = self.read_meta(symbol, group, params)
+        if meta is None:
+            raise FeatureCacheError(f"缓存不存在，无法追加: {symbol}/{group}")
+
+        try:
+            if len(tail):
+                part = f"part-{len(meta['parts']):05d}.parquet"
+                self._write_part(group_dir, part, tail[meta['columns']])
+                meta['parts'].append(part)
+                meta['last_date'] = max(meta['last_date'] or '', self._date_str(tail.index[-1]))
+            meta['covered_end'] = max(meta['covered_end'], covered_end)
+            if group != RAW_GROUP and raw_generation is not None:
+                meta['raw_generation'] = raw_generation
+            meta['updated_at'] = pd.Timestamp.now().isoformat()
+
+            if len(meta['parts']) > self.compact_parts:
+                meta = self._compact(group_dir, meta)
+            else:
+                self._write_meta(group_dir, meta)
+            return meta
+
+        except Exception as e:
+            logger.error(f"特征组缓存追加失败: {symbol}/{group}: {e}")
+            raise FeatureCacheError(f"特征组缓存追加失败: {e}")
+
+    # ==================== 读取 ====================
+
+    def load(
+        self,
+        symbol: str,
+        group: str,
+        params: Dict,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        加载特征组（只读取需要的列）
+
+        Args:
+            start_date / end_date: 日期范围 YYYYMMDD（闭区间），None 表示不限
+            columns: 需要的列（None 表示全部）；不属于本组的列被忽略
+
+        Returns:
+            特征 DataFrame，缓存不存在或读取失败时返回 None
+        """
+        meta = self.read_meta(symbol, group, params)
+        if meta is None:
+            return None
+        return self._load_parts(self.group_dir(symbol, group, params), meta, start_date, end_date, columns)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """
+        清除缓存
+
+        Args:
+            symbol: 股票代码（None则清除所有）
+        """
+        targets = [self.cache_dir / symbol] if symbol else list(self.cache_dir.iterdir())
+        removed = 0
+        for target in targets:
+            if target.is_dir():
+                shutil.rmtree(target)
+                removed += 1
+        logger.info(f"已清除 {removed} 个股票的列式特征缓存")
+
+    # ==================== 内部方法 ====================
+
+    def _load_parts(
+        self,
+        group_dir: Path,
+        meta: Dict,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
+        read_columns = meta['columns'] if columns is None else [c for c in meta['columns'] if c in columns]
+        try:
+            frames = [pd.read_parquet(group_dir / part, columns=read_columns) for part in meta['parts']]
+        except Exception as e:
+            logger.warning(f"特征组缓存读取失败，忽略: {group_dir} ({e})")
+            return None
+
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        if len(frames) > 1:
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+        if start_date:
+            df = df[df.index >= pd.Timestamp(start_date)]
+        if end_date:
+            df = df[df.index <= pd.Timestamp(end_date)]
+        return df
+
+    def _compact(self, group_dir: Path, meta: Dict) -> Dict:
+        """合并分片"""
+        df = self._load_parts(group_dir, meta)
+        if df is None:
+            raise FeatureCacheError(f"合并分片失败: {group_dir}")
+        old_parts = meta['parts']
+        part = f"compact-{uuid.uuid4().hex[:8]}.parquet"
+        self._write_part(group_dir, part, df)
+        meta['parts'] = [part]
+        self._write_meta(group_dir, meta)
+        for old in old_parts:
+            (group_dir / old).unlink(missing_ok=True)
+        logger.debug(f"特征组分片已合并: {group_dir.name} ({len(old_parts)} -> 1)")
+        return meta
+
+    @staticmethod
+    def _write_part(group_dir: Path, name: str, df: pd.DataFrame) -> None:
+        """原子写入分片（先写临时文件再替换）"""
+        tmp = group_dir / f".{name}.{uuid.uuid4().hex[:8]}.tmp"
+        df.to_parquet(tmp, compression='snappy')
+        os.replace(tmp, group_dir / name)
+
+    @staticmethod
+    def _write_meta(group_dir: Path, meta: Dict) -> None:
+        tmp = group_dir / f".{META_FILE}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, group_dir / META_FILE)
+
+    @staticmethod
+    def _date_str(value) -> str:
+        return pd.Timestamp(value).strftime('%Y%m%d')
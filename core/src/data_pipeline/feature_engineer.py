@@ -6,15 +6,23 @@
 
 import pandas as pd
 import numpy as np
-from typing import List, Optional
+from dataclasses import asdict
+from typing import Dict, List, Optional, Sequence
 from src.features.technical_indicators import TechnicalIndicators
 from src.features.alpha_factors import AlphaFactors
 from src.features.feature_transformer import FeatureTransformer
 from src.exceptions import FeatureComputationError
 from src.utils.logger import get_logger
+from src.utils.dtype_policy import downcast_floats
 
 logger = get_logger(__name__)
 
+# 特征组（按 compute_all_features 的计算顺序，拼接后列顺序与一次性计算一致）
+FEATURE_GROUPS = ('technical', 'alpha', 'transform', 'deprice', 'label')
+
+# EMA 递推项的预热倍数：span=N 的 EMA 经过 10N 行后初值影响 < 1e-8
+EMA_WARMUP_FACTOR = 10
+
 
 class FeatureEngineer:
     """
@@ -91,7 +99,7 @@ class FeatureEngineer:
 
             logger.info(f"特征工程完成: {len(df.columns)} 列，{len(df)} 行")
 
-            return df
+            return downcast_floats(df)
 
         except Exception as e:
             logger.error(f"特征计算失败: {e}")
@@ -100,33 +108,18 @@ class FeatureEngineer:
     def _compute_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """计算技术指标"""
         ti = TechnicalIndicators(df)
-
-        # 从配置获取参数（如果有配置）
-        if self.config:
-            ti_config = self.config.technical_indicators
-            ma_periods = ti_config.ma_periods
-            ema_periods = ti_config.ema_periods
-            rsi_periods = ti_config.rsi_periods
-            atr_periods = ti_config.atr_periods
-            cci_periods = ti_config.cci_periods
-        else:
-            # 使用默认硬编码值（向后兼容）
-            ma_periods = [5, 10, 20, 60, 120, 250]
-            ema_periods = [12, 26, 50]
-            rsi_periods = [6, 12, 24]
-            atr_periods = [14, 28]
-            cci_periods = [14, 28]
+        params = self._technical_params()
 
         # 添加常用技术指标
-        ti.add_ma(ma_periods)
-        ti.add_ema(ema_periods)
-        ti.add_rsi(rsi_periods)
+        ti.add_ma(params['ma_periods'])
+        ti.add_ema(params['ema_periods'])
+        ti.add_rsi(params['rsi_periods'])
         ti.add_macd()
         ti.add_kdj()
         ti.add_bollinger_bands()
-        ti.add_atr(atr_periods)
+        ti.add_atr(params['atr_periods'])
         ti.add_obv()
-        ti.add_cci(cci_periods)
+        ti.add_cci(params['cci_periods'])
 
         df = ti.get_dataframe()
 
@@ -144,30 +137,17 @@ class FeatureEngineer:
         # 传递配置给 AlphaFactors
         af = AlphaFactors(df, config=self.config)
 
-        # 从配置获取参数（如果有配置）
-        if self.config:
-            alpha_config = self.config.alpha_factors
-            momentum_periods = alpha_config.momentum_periods
-            reversal_short = alpha_config.reversal_short_periods
-            reversal_long = alpha_config.reversal_long_periods
-            volatility_periods = alpha_config.volatility_periods
-            volume_periods = alpha_config.volume_periods
-            trend_periods = alpha_config.trend_periods
-        else:
-            # 使用默认硬编码值（向后兼容）
-            momentum_periods = [5, 10, 20, 60, 120]
-            reversal_short = [1, 3, 5]
-            reversal_long = [20, 60]
-            volatility_periods = [5, 10, 20, 60]
-            volume_periods = [5, 10, 20]
-            trend_periods = [20, 60]
+        params = self._alpha_params()
 
         # 添加常用Alpha因子（使用关键字参数）
-        af.add_momentum_factors(periods=momentum_periods)
-        af.add_reversal_factors(short_periods=reversal_short, long_periods=reversal_long)
-        af.add_volatility_factors(periods=volatility_periods)
-        af.add_volume_factors(periods=volume_periods)
-        af.add_trend_strength(periods=trend_periods)
+        af.add_momentum_factors(periods=params['momentum_periods'])
+        af.add_reversal_factors(
+            short_periods=params['reversal_short_periods'],
+            long_periods=params['reversal_long_periods']
+        )
+        af.add_volatility_factors(periods=params['volatility_periods'])
+        af.add_volume_factors(periods=params['volume_periods'])
+        af.add_trend_strength(periods=params['trend_periods'])
 
         df = af.get_dataframe()
 
@@ -180,15 +160,8 @@ class FeatureEngineer:
         """应用特征转换"""
         ft = FeatureTransformer(df)
 
-        # 从配置获取参数（如果有配置）
-        if self.config:
-            return_periods = self.config.feature_transform.return_periods
-        else:
-            # 使用默认硬编码值（向后兼容）
-            return_periods = [1, 3, 5, 10, 20]
-
         # 多时间尺度收益率
-        ft.create_multi_timeframe_returns(return_periods)
+        ft.create_multi_timeframe_returns(self._transform_params()['return_periods'])
 
         # OHLC特征
         ft.create_ohlc_features()
@@ -210,16 +183,10 @@ class FeatureEngineer:
         current_close = df['close']
         features_to_drop = []
 
-        # 从配置获取参数（如果有配置）
-        if self.config:
-            ma_periods = self.config.feature_transform.deprice_ma_periods
-            ema_periods = self.config.feature_transform.deprice_ema_periods
-            atr_periods = self.config.feature_transform.deprice_atr_periods
-        else:
-            # 使用默认硬编码值（向后兼容）
-            ma_periods = [5, 10, 20, 60, 120, 250]
-            ema_periods = [12, 26, 50]
-            atr_periods = [14, 28]
+        params = self._deprice_params()
+        ma_periods = params['deprice_ma_periods']
+        ema_periods = params['deprice_ema_periods']
+        atr_periods = params['deprice_atr_periods']
 
         # MA类指标 → 价格偏离度比例
         for period in ma_periods:
@@ -291,6 +258,165 @@ class FeatureEngineer:
 
         return df
 
+    # ==================== 特征组（供列式缓存按组计算） ====================
+
+    def compute_feature_groups(
+        self,
+        df: pd.DataFrame,
+        groups: Sequence[str],
+        target_period: int
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        按特征组分别计算特征，每组只返回本组新增的列
+
+        各组只依赖原始 OHLCV（deprice 依赖 technical 的中间指标，在组内重新计算），
+        因此可以独立缓存与失效。按 FEATURE_GROUPS 顺序拼接后，列与
+        compute_all_features 的结果一致。
+
+        Args:
+            df: 原始数据 DataFrame
+            groups: 需要计算的特征组（FEATURE_GROUPS 的子集）
+            target_period: 预测周期（label 组使用）
+
+        Returns:
+            {组名: 该组特征 DataFrame（与 df 同索引）}
+
+        Raises:
+            FeatureComputationError: 特征计算失败
+        """
+        unknown = [g for g in groups if g not in FEATURE_GROUPS]
+        if unknown:
+            raise FeatureComputationError(f"未知特征组: {unknown}")
+
+        raw_cols = list(df.columns)
+        result = {}
+        try:
+            if 'technical' in groups or 'deprice' in groups:
+                ti_df = self._compute_technical_indicators(df.copy())
+                ti_cols = [c for c in ti_df.columns if c not in raw_cols]
+                ti_df = self._deprice_features(ti_df)
+                if 'technical' in groups:
+                    result['technical'] = ti_df[[c for c in ti_cols if c in ti_df.columns]]
+                if 'deprice' in groups:
+                    result['deprice'] = ti_df[
+                        [c for c in ti_df.columns if c not in raw_cols and c not in ti_cols]
+                    ]
+
+            if 'alpha' in groups:
+                alpha_df = self._compute_alpha_factors(df.copy())
+                result['alpha'] = alpha_df[[c for c in alpha_df.columns if c not in raw_cols]]
+
+            if 'transform' in groups:
+                ft_df = self._apply_feature_transformation(df.copy())
+                result['transform'] = ft_df[[c for c in ft_df.columns if c not in raw_cols]]
+
+            if 'label' in groups:
+                target_name = f'target_{target_period}d_return'
+                label_df = self._create_target(df[['close']].copy(), target_period, target_name)
+                result['label'] = label_df[[target_name]]
+
+            return {group: downcast_floats(frame) for group, frame in result.items()}
+
+        except FeatureComputationError:
+            raise
+        except Exception as e:
+            logger.error(f"特征组计算失败: {e}")
+            raise FeatureComputationError(f"特征组计算失败: {e}")
+
+    def get_group_params(self, group: str, target_period: int) -> Dict:
+        """特征组的计算参数（参数变化只使该组缓存失效）"""
+        if group == 'technical':
+            # 去价格化决定了哪些原始指标被删除，也影响 technical 组的列
+            return {**self._technical_params(), **self._deprice_params()}
+        if group == 'deprice':
+            return {**self._technical_params(), **self._deprice_params()}
+        if group == 'alpha':
+            return self._alpha_params()
+        if group == 'transform':
+            return self._transform_params()
+        if group == 'label':
+            return {'target_period': target_period}
+        raise FeatureComputationError(f"未知特征组: {group}")
+
+    def get_group_warmup(self, group: str, target_period: int) -> int:
+        """
+        特征组的预热行数：增量追加时需在新行之前回溯的历史行数，
+        保证追加部分与全量计算结果一致（滚动窗口精确，EMA 递推误差 < 1e-8）
+        """
+        if group in ('technical', 'deprice'):
+            params = self._technical_params()
+            windows = (params['ma_periods'] + params['rsi_periods']
+                       + params['atr_periods'] + params['cci_periods'] + [20])
+            spans = params['ema_periods'] + [26, 9]  # MACD 快慢线与信号线
+            return max(windows) + EMA_WARMUP_FACTOR * max(spans)
+        if group == 'alpha':
+            periods = [
+                p for value in self._alpha_params().values()
+                if isinstance(value, (list, tuple))
+                for p in value if isinstance(p, int)
+            ]
+            return max(periods) + 10
+        if group == 'transform':
+            return max(self._transform_params()['return_periods']) + 10
+        return 0
+
+    def get_group_lookahead(self, group: str, target_period: int) -> int:
+        """特征组末尾依赖未来数据的行数（label 的最后 N 行在新数据到来后需重算）"""
+        return target_period if group == 'label' else 0
+
+    def _technical_params(self) -> Dict[str, List[int]]:
+        """技术指标参数（无配置时使用默认值，向后兼容）"""
+        if self.config:
+            ti_config = self.config.technical_indicators
+            return {
+                'ma_periods': list(ti_config.ma_periods),
+                'ema_periods': list(ti_config.ema_periods),
+                'rsi_periods': list(ti_config.rsi_periods),
+                'atr_periods': list(ti_config.atr_periods),
+                'cci_periods': list(ti_config.cci_periods),
+            }
+        return {
+            'ma_periods': [5, 10, 20, 60, 120, 250],
+            'ema_periods': [12, 26, 50],
+            'rsi_periods': [6, 12, 24],
+            'atr_periods': [14, 28],
+            'cci_periods': [14, 28],
+        }
+
+    def _alpha_params(self) -> Dict:
+        """Alpha因子参数（有配置时取完整配置，AlphaFactors 内部还会读取其他字段）"""
+        if self.config:
+            return asdict(self.config.alpha_factors)
+        return {
+            'momentum_periods': [5, 10, 20, 60, 120],
+            'reversal_short_periods': [1, 3, 5],
+            'reversal_long_periods': [20, 60],
+            'volatility_periods': [5, 10, 20, 60],
+            'volume_periods': [5, 10, 20],
+            'trend_periods': [20, 60],
+        }
+
+    def _transform_params(self) -> Dict[str, List[int]]:
+        """特征转换参数"""
+        if self.config:
+            return {'return_periods': list(self.config.feature_transform.return_periods)}
+        return {'return_periods': [1, 3, 5, 10, 20]}
+
+    def _deprice_params(self) -> Dict[str, List[int]]:
+        """去价格化参数"""
+        if self.config:
+            ft_config = self.config.feature_transform
+            return {
+                'deprice_ma_periods': list(ft_config.deprice_ma_periods),
+                'deprice_ema_periods': list(ft_config.deprice_ema_periods),
+                'deprice_atr_periods': list(ft_config.deprice_atr_periods),
+            }
+        return {
+            'deprice_ma_periods': [5, 10, 20, 60, 120, 250],
+            'deprice_ema_periods': [12, 26, 50],
+            'deprice_atr_periods': [14, 28],
+        }
+
     def _log(self, message: str) -> None:
         """输出日志"""
         if self.verbose:
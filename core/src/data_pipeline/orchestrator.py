@@ -5,15 +5,18 @@
 这个设计遵循单一职责原则(SRP)，提高了代码的可维护性和可测试性
 """
 
+import numpy as np
 import pandas as pd
+from datetime import datetime
 from typing import Optional, Tuple, List, Union, Dict
 
 from src.database.db_manager import DatabaseManager, get_database
 from src.data_pipeline.data_loader import DataLoader
-from src.data_pipeline.feature_engineer import FeatureEngineer
+from src.data_pipeline.feature_engineer import FeatureEngineer, FEATURE_GROUPS
 from src.data_pipeline.data_cleaner import DataCleaner
 from src.data_pipeline.data_splitter import DataSplitter
 from src.data_pipeline.feature_cache import FeatureCache
+from src.data_pipeline.columnar_feature_cache import ColumnarFeatureCache, RAW_GROUP
 from src.data_pipeline.pipeline_config import (
     PipelineConfig,
     DEFAULT_CONFIG,
@@ -43,9 +46,13 @@ class DataPipeline:
     - FeatureEngineer: 特征工程
     - DataCleaner: 数据清洗
     - DataSplitter: 数据分割和预处理
-    - FeatureCache: 缓存管理
+    - FeatureCache: 整表缓存（保留供直接调用）
+    - ColumnarFeatureCache: 按特征组的列式缓存（get_training_data 使用，增量追加尾部）
     """
 
+    # 增量追加时与缓存重叠比对的行数（检测复权等导致的历史数据变化）
+    RAW_OVERLAP_ROWS = 5
+
     def __init__(
         self,
         db_manager: Optional[DatabaseManager] = None,
@@ -86,6 +93,10 @@ class DataPipeline:
             cache_dir=cache_dir,
             feature_version=self.FEATURE_VERSION
         )
+        self.group_cache = ColumnarFeatureCache(
+            cache_dir=cache_dir,
+            feature_version=self.FEATURE_VERSION
+        )
 
         # 状态
         self.feature_names = []
@@ -103,16 +114,21 @@ class DataPipeline:
         symbol: str,
         start_date: str,
         end_date: str,
-        config: Optional[PipelineConfig] = None
+        config: Optional[PipelineConfig] = None,
+        columns: Optional[List[str]] = None
     ) -> Tuple[pd.DataFrame, pd.Series]:
         """
         获取训练数据（自动化流转）
 
+        启用缓存时按特征组读取列式缓存：已覆盖的日期直接读取，新交易日只计算尾部
+        （含回溯预热行），参数变化的特征组单独重算。
+
         Args:
             symbol: 股票代码
             start_date: 开始日期 (YYYYMMDD)
             end_date: 结束日期 (YYYYMMDD)
             config: 流水线配置对象（None则使用默认配置）
+            columns: 只需要的特征列（None 表示全部）；缓存命中时只读取这些列
 
         Returns:
             (特征DataFrame, 目标Series)
@@ -137,41 +153,29 @@ class DataPipeline:
         # 确定目标名称
         self.target_name = f'target_{config.target_period}d_return'
 
-        # 1. 检查缓存
-        cache_config = self._build_cache_config_from_obj(config)
-        cache_file = self.feature_cache.get_cache_path(symbol, start_date, end_date, cache_config)
-
-        if config.use_cache and not config.force_refresh and self.cache_features:
-            self.log("\n✓ 尝试从缓存加载数据...")
-            cached_data = self.feature_cache.load(cache_file, self.target_name, cache_config)
-            if cached_data is not None:
-                self.log("  ✓ 缓存验证通过，使用缓存数据")
-                X, y = cached_data
-                self.feature_names = X.columns.tolist()
-                return X, y
-            else:
-                self.log("  ⚠️  缓存验证失败，重新计算特征")
-
-        # 2. 加载原始数据
-        self.log("\n[1/5] 加载原始数据...")
-        df = self.data_loader.load_data(symbol, start_date, end_date)
-
-        # 3. 特征工程（技术指标、Alpha因子、特征转换、目标标签）
-        self.log("\n[2/5] 特征工程...")
-        df = self.feature_engineer.compute_all_features(df, config.target_period)
-
-        # 4. 数据清洗
-        self.log("\n[3/5] 数据清洗...")
+        if config.use_cache and self.cache_features:
+            # 1. 按特征组读取缓存（缺失部分增量计算并写回）
+            self.log("\n[1/3] 读取特征组缓存...")
+            df = self._load_features_cached(
+                symbol, start_date, end_date, config.target_period,
+                columns=columns, force_refresh=config.force_refresh
+            )
+        else:
+            # 1. 加载原始数据
+            self.log("\n[1/3] 加载原始数据...")
+            df = self.data_loader.load_data(symbol, start_date, end_date)
+
+            # 特征工程（技术指标、Alpha因子、特征转换、目标标签）
+            self.log("\n  特征工程...")
+            df = self.feature_engineer.compute_all_features(df, config.target_period)
+
+        # 2. 数据清洗
+        self.log("\n[2/3] 数据清洗...")
         df = self.data_cleaner.clean(df, self.target_name)
 
-        # 5. 分离特征和目标
-        self.log("\n[4/5] 分离特征和目标...")
-        X, y = self._separate_features_target(df)
-
-        # 6. 缓存结果
-        if self.cache_features:
-            self.log("\n[5/5] 缓存特征...")
-            self.feature_cache.save(X, y, cache_file, cache_config, self.target_name)
+        # 3. 分离特征和目标
+        self.log("\n[3/3] 分离特征和目标...")
+        X, y = self._separate_features_target(df, columns)
 
         self.log(f"\n{'='*60}")
         self.log(f"数据准备完成: {len(X)} 样本, {len(X.columns)} 特征")
@@ -234,8 +238,12 @@ class DataPipeline:
 
         return result
 
-    def _separate_features_target(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
-        """分离特征和目标"""
+    def _separate_features_target(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[pd.DataFrame, pd.Series]:
+        """分离特征和目标（columns 非空时只保留指定特征列）"""
         # 排除的列（原始价格、成交量等）
         exclude_cols = [
             'open', 'high', 'low', 'close', 'volume', 'amount',
@@ -244,6 +252,8 @@ class DataPipeline:
 
         # 特征列
         feature_cols = [col for col in df.columns if col not in exclude_cols]
+        if columns is not None:
+            feature_cols = [col for col in feature_cols if col in columns]
         self.feature_names = feature_cols
 
         X = df[feature_cols].copy()
@@ -275,6 +285,147 @@ class DataPipeline:
             'feature_config_hash': self.feature_cache.compute_feature_config_hash(feature_config)
         }
 
+    # ==================== 特征组缓存 ====================
+
+    def _load_features_cached(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        target_period: int,
+        columns: Optional[List[str]] = None,
+        force_refresh: bool = False
+    ) -> pd.DataFrame:
+        """
+        从列式缓存组装 [start_date, end_date] 的原始数据 + 全部特征组 + 标签（清洗前）
+
+        - raw 组未覆盖请求范围时：尾部只查询新增日期（附带少量重叠行校验），
+          向前扩展或复权变化时整体重建
+        - 特征组参数变化或 raw 重建：用缓存的 raw 整组重算（不查数据库）
+        - 特征组落后于 raw：只计算新增尾部，向前回溯该组所需的预热行
+        - columns 非空时跳过不含所需列的特征组，并只读取所需列
+        """
+        raw, raw_meta = self._sync_raw_cache(symbol, start_date, end_date, force_refresh)
+        generation = raw_meta['generation']
+        frames = [raw[(raw.index >= pd.Timestamp(start_date)) & (raw.index <= pd.Timestamp(end_date))]]
+
+        for group in FEATURE_GROUPS:
+            params = self.feature_engineer.get_group_params(group, target_period)
+            meta = self.group_cache.read_meta(symbol, group, params)
+            if (columns is not None and group != 'label' and meta is not None
+                    and not set(meta['columns']) & set(columns)):
+                continue
+
+            if force_refresh or meta is None or meta.get('raw_generation') != generation:
+                self.log(f"  计算特征组 {group}（全量 {len(raw)} 行）")
+                computed = self.feature_engineer.compute_feature_groups(raw, [group], target_period)[group]
+                self.group_cache.save(
+                    symbol, group, params, computed,
+                    raw_meta['covered_start'], raw_meta['covered_end'], generation
+                )
+            elif meta['last_date'] < raw_meta['last_date']:
+                self._append_group_tail(symbol, group, params, raw, meta, raw_meta, target_period)
+
+            frame = self.group_cache.load(
+                symbol, group, params, start_date, end_date,
+                columns=None if group == 'label' else columns
+            )
+            lookahead = self.feature_engineer.get_group_lookahead(group, target_period)
+            if lookahead and len(frame):
+                # 缓存按完整 raw 计算，窗口末尾 N 行的标签用到了 end_date 之后的价格；
+                # 置空后与只加载 [start_date, end_date] 的无缓存计算一致，避免跨训练/测试边界泄露
+                frame = frame.copy()
+                frame.iloc[-lookahead:] = np.nan
+            frames.append(frame)
+
+        return pd.concat(frames, axis=1)
+
+    def _sync_raw_cache(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        force_refresh: bool = False
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """确保 raw 缓存覆盖请求范围，返回 (完整 raw, raw 元数据)"""
+        cache = self.group_cache
+        meta = None if force_refresh else cache.read_meta(symbol, RAW_GROUP, {})
+
+        if meta is not None:
+            raw = cache.load(symbol, RAW_GROUP, {})
+            if raw is not None and len(raw) and start_date >= meta['covered_start']:
+                if end_date <= meta['covered_end']:
+                    return raw, meta
+
+                # 尾部追加：只查询新增日期，附带少量已缓存行用于一致性校验
+                anchor = raw.index[max(0, len(raw) - self.RAW_OVERLAP_ROWS)]
+                fresh = self.data_loader.load_data(symbol, anchor.strftime('%Y%m%d'), end_date)
+                if self._raw_consistent(raw, fresh):
+                    tail = fresh[fresh.index > raw.index[-1]]
+                    meta = cache.append(
+                        symbol, RAW_GROUP, {}, tail, self._coverage_end(end_date, fresh.index[-1])
+                    )
+                    self.log(f"  原始数据缓存追加 {len(tail)} 行")
+                    return (pd.concat([raw, tail[raw.columns]]) if len(tail) else raw), meta
+                self.log("  ⚠️  原始数据与缓存不一致（可能发生复权调整），重建缓存")
+
+            # 向前扩展或数据不一致：按并集范围整体重建
+            start_date = min(start_date, meta['covered_start'])
+            end_date = max(end_date, meta['covered_end'])
+
+        raw = self.data_loader.load_data(symbol, start_date, end_date)
+        meta = cache.save(
+            symbol, RAW_GROUP, {}, raw, start_date, self._coverage_end(end_date, raw.index[-1])
+        )
+        return raw, meta
+
+    def _append_group_tail(
+        self,
+        symbol: str,
+        group: str,
+        params: Dict,
+        raw: pd.DataFrame,
+        meta: Dict,
+        raw_meta: Dict,
+        target_period: int
+    ) -> None:
+        """只计算特征组落后的尾部（回溯预热行；label 末尾依赖未来数据的行一并重算）"""
+        last_pos = raw.index.get_loc(pd.Timestamp(meta['last_date']))
+        replace_pos = max(0, last_pos + 1 - self.feature_engineer.get_group_lookahead(group, target_period))
+        calc_pos = max(0, replace_pos - self.feature_engineer.get_group_warmup(group, target_period))
+
+        computed = self.feature_engineer.compute_feature_groups(
+            raw.iloc[calc_pos:], [group], target_period
+        )[group]
+        tail = computed[computed.index >= raw.index[replace_pos]]
+        self.log(f"  特征组 {group} 追加 {len(tail)} 行（预热 {replace_pos - calc_pos} 行）")
+        self.group_cache.append(
+            symbol, group, params, tail, raw_meta['covered_end'], raw_meta['generation']
+        )
+
+    @staticmethod
+    def _raw_consistent(cached: pd.DataFrame, fresh: pd.DataFrame) -> bool:
+        """重叠区间的价格是否与缓存一致"""
+        overlap = fresh.index[fresh.index <= cached.index[-1]]
+        if len(overlap) == 0 or not overlap.isin(cached.index).all():
+            return False
+        price_cols = [c for c in ('open', 'high', 'low', 'close') if c in cached.columns]
+        return bool(np.allclose(
+            cached.loc[overlap, price_cols].to_numpy(dtype=float),
+            fresh.loc[overlap, price_cols].to_numpy(dtype=float),
+            rtol=1e-6, equal_nan=True
+        ))
+
+    @staticmethod
+    def _coverage_end(end_date: str, last_row_date) -> str:
+        """
+        覆盖截止日期：历史区间记为请求截止日；截止日为今天或未来时只记到最后一行，
+        以免当日数据入库前的查询把今天标记为已覆盖
+        """
+        if end_date < datetime.now().strftime('%Y%m%d'):
+            return end_date
+        return pd.Timestamp(last_row_date).strftime('%Y%m%d')
+
 
     # ==================== 工具方法 ====================
 
@@ -302,6 +453,7 @@ class DataPipeline:
             symbol: 股票代码（None则清除所有）
         """
         self.feature_cache.clear(symbol)
+        self.group_cache.clear(symbol)
 
     def log(self, message: str) -> None:
         """输出日志"""
@@ -1,13 +1,25 @@
 """
 池化数据加载器
-支持多股票数据的纵向堆叠(Stacking)
+支持多股票数据的纵向堆叠(Stacking)，以及不生成完整池化 DataFrame 的流式磁盘矩阵模式
 """
 
+import shutil
+import tempfile
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 from src.database.db_manager import get_database, DatabaseManager
 from src.data_pipeline.feature_engineer import FeatureEngineer
+from src.data_pipeline.pooled_training_matrix import (
+    PooledTrainingMatrix,
+    FEATURES_FILE,
+    TARGET_FILE,
+    DATES_FILE,
+    STOCK_IDS_FILE,
+)
+from src.utils.dtype_policy import dates_to_int32, get_stock_code_dictionary
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -64,6 +76,50 @@ class PooledDataLoader:
         successful_symbols = []
         failed_symbols = []
 
+        for symbol, df_features in self.iter_feature_blocks(
+            symbol_list, start_date, end_date, target_period, failed_symbols=failed_symbols
+        ):
+            # 添加股票代码列
+            df_features['stock_code'] = symbol
+
+            pooled_data.append(df_features)
+            successful_symbols.append(symbol)
+
+        if len(pooled_data) == 0:
+            raise ValueError("没有成功加载任何股票数据")
+
+        # 纵向拼接
+        pooled_df = pd.concat(pooled_data, axis=0, ignore_index=True)
+
+        if self.verbose:
+            logger.info(f"池化完成: 总样本 {len(pooled_df)} 条")
+            logger.info(f"成功: {len(successful_symbols)} 只, 失败: {len(failed_symbols)} 只")
+            if len(failed_symbols) > 0 and len(failed_symbols) <= 5:
+                logger.warning(f"失败的股票: {failed_symbols}")
+
+        return pooled_df, len(pooled_df), successful_symbols
+
+    def iter_feature_blocks(
+        self,
+        symbol_list: List[str],
+        start_date: str,
+        end_date: str,
+        target_period: int = 10,
+        failed_symbols: Optional[List[str]] = None
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        逐只股票生成特征块（不在内存中累积）
+
+        参数:
+            symbol_list: 股票代码列表
+            start_date: 开始日期 (YYYYMMDD)
+            end_date: 结束日期 (YYYYMMDD)
+            target_period: 目标预测周期
+            failed_symbols: 传入列表时记录失败/跳过的股票
+
+        生成:
+            (symbol, df_features)
+        """
         for i, symbol in enumerate(symbol_list):
             try:
                 # 加载原始数据
@@ -72,41 +128,25 @@ class PooledDataLoader:
                 if len(df_raw) < 100:
                     if self.verbose:
                         logger.warning(f"[{i+1}/{len(symbol_list)}] {symbol}: 数据不足({len(df_raw)}条)，跳过")
-                    failed_symbols.append(symbol)
+                    if failed_symbols is not None:
+                        failed_symbols.append(symbol)
                     continue
 
                 # 计算特征
                 fe = FeatureEngineer(verbose=False)
                 df_features = fe.compute_all_features(df_raw, target_period=target_period)
 
-                # 添加股票代码列
-                df_features['stock_code'] = symbol
-
-                pooled_data.append(df_features)
-                successful_symbols.append(symbol)
-
-                if self.verbose:
-                    logger.info(f"[{i+1}/{len(symbol_list)}] {symbol}: {len(df_features)} 条数据")
-
             except Exception as e:
                 if self.verbose:
                     logger.error(f"[{i+1}/{len(symbol_list)}] {symbol}: 错误 - {e}")
-                failed_symbols.append(symbol)
+                if failed_symbols is not None:
+                    failed_symbols.append(symbol)
                 continue
 
-        if len(pooled_data) == 0:
-            raise ValueError("没有成功加载任何股票数据")
+            if self.verbose:
+                logger.info(f"[{i+1}/{len(symbol_list)}] {symbol}: {len(df_features)} 条数据")
 
-        # 纵向拼接
-        pooled_df = pd.concat(pooled_data, axis=0, ignore_index=True)
-
-        if self.verbose:
-            logger.info(f"池化完成: 总样本 {len(pooled_df)} 条")
-            logger.info(f"成功: {len(successful_symbols)} 只, 失败: {len(failed_symbols)} 只")
-            if len(failed_symbols) > 0 and len(failed_symbols) <= 5:
-                logger.warning(f"失败的股票: {failed_symbols}")
-
-        return pooled_df, len(pooled_df), successful_symbols
+            yield symbol, df_features
 
     def prepare_pooled_training_data(
         self,
@@ -169,3 +209,140 @@ class PooledDataLoader:
                 logger.info(f"  测试集: {len(X_test)} 样本")
 
         return X_train, y_train, X_valid, y_valid, X_test, y_test, feature_cols
+
+    def build_training_matrix(
+        self,
+        symbol_list: List[str],
+        start_date: str,
+        end_date: str,
+        target_period: int = 10,
+        train_ratio: float = 0.7,
+        valid_ratio: float = 0.15,
+        scaler_type: Optional[str] = 'robust',
+        work_dir: Optional[str] = None,
+        chunk_rows: int = 100_000,
+        robust_sample_rows: int = 200_000
+    ) -> PooledTrainingMatrix:
+        """
+        流式构建池化训练矩阵（不在内存中生成完整池化 DataFrame）
+
+        流程：
+        1. 逐只股票计算特征，dropna 后以 float32 追加写入磁盘；
+           交易日（YYYYMMDD int32）与股票编号（共享代码字典）同步写入
+        2. 按总行数确定 train/valid/test 行区间（与 prepare_pooled_training_data 一致）
+        3. 按块 partial_fit scaler（仅训练区间）
+        4. 按块原地缩放全部行
+
+        峰值内存约为单只股票特征块 + chunk_rows 行，与股票数量无关。
+
+        参数:
+            symbol_list: 股票代码列表
+            start_date: 开始日期 (YYYYMMDD)
+            end_date: 结束日期 (YYYYMMDD)
+            target_period: 目标预测周期
+            train_ratio: 训练集比例
+            valid_ratio: 验证集比例
+            scaler_type: 缩放器类型 ('standard', 'robust', 'minmax')，None 表示不缩放
+            work_dir: 矩阵目录（None 时创建临时目录，用完调用 matrix.cleanup()）
+            chunk_rows: scaler 拟合 / 缩放时每块行数
+            robust_sample_rows: RobustScaler 不支持 partial_fit，
+                                改为在训练区间等间隔抽取至多该行数拟合（分位数近似）
+
+        返回:
+            PooledTrainingMatrix
+        """
+        target_col = f'target_{target_period}d_return'
+        scaler = _create_scaler(scaler_type) if scaler_type else None
+        work_dir = Path(work_dir) if work_dir else Path(tempfile.mkdtemp(prefix='pooled_matrix_'))
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.verbose:
+            logger.info(f"开始流式构建池化训练矩阵: {len(symbol_list)} 只股票 -> {work_dir}")
+
+        # 1. 逐块写入
+        feature_cols = None
+        stock_ranges = {}
+        failed_symbols = []
+        n_rows = 0
+        code_dictionary = get_stock_code_dictionary()
+        with open(work_dir / FEATURES_FILE, 'wb') as f_x, open(work_dir / TARGET_FILE, 'wb') as f_y, \
+                open(work_dir / DATES_FILE, 'wb') as f_d, open(work_dir / STOCK_IDS_FILE, 'wb') as f_s:
+            for symbol, df_features in self.iter_feature_blocks(
+                symbol_list, start_date, end_date, target_period, failed_symbols=failed_symbols
+            ):
+                if feature_cols is None:
+                    feature_cols = [c for c in df_features.columns
+                                    if not c.startswith('target_') and c != 'stock_code']
+                elif any(c not in df_features.columns for c in feature_cols):
+                    logger.warning(f"{symbol}: 特征列与首只股票不一致，缺失列的行将被剔除")
+
+                block = df_features.reindex(columns=feature_cols + [target_col]).dropna()
+                if block.empty:
+                    continue
+                f_x.write(np.ascontiguousarray(block[feature_cols].to_numpy(dtype=np.float32)).tobytes())
+                f_y.write(block[target_col].to_numpy(dtype=np.float32).tobytes())
+                f_d.write(dates_to_int32(block.index).tobytes())
+                f_s.write(np.repeat(code_dictionary.encode([symbol]), len(block)).tobytes())
+                stock_ranges[symbol] = (n_rows, n_rows + len(block))
+                n_rows += len(block)
+
+        if not stock_ranges:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            raise ValueError("没有成功加载任何股票数据")
+
+        # 2. 行区间
+        train_end = int(n_rows * train_ratio)
+        valid_end = int(n_rows * (train_ratio + valid_ratio))
+        matrix = PooledTrainingMatrix(
+            work_dir, feature_cols, n_rows, train_end, valid_end, stock_ranges, mode='r+'
+        )
+
+        # 3-4. 拟合并原地缩放
+        if scaler is not None and train_end > 0:
+            self._fit_scaler_streaming(scaler, matrix.X, train_end, chunk_rows, robust_sample_rows)
+            for start in range(0, n_rows, chunk_rows):
+                end = min(start + chunk_rows, n_rows)
+                matrix.X[start:end] = scaler.transform(matrix.X[start:end])
+            matrix.X.flush()
+            matrix.scaler = scaler
+
+        matrix.save_meta()
+        del matrix
+        matrix = PooledTrainingMatrix.open(str(work_dir), scaler=scaler)
+
+        if self.verbose:
+            logger.info(f"池化矩阵完成: {n_rows} 行 x {len(feature_cols)} 列 (float32, "
+                        f"{n_rows * len(feature_cols) * 4 / 1024 ** 2:.1f} MB)")
+            logger.info(f"  训练集: {train_end}, 验证集: {valid_end - train_end}, 测试集: {n_rows - valid_end}")
+            logger.info(f"成功: {len(stock_ranges)} 只, 失败: {len(failed_symbols)} 只")
+
+        return matrix
+
+    @staticmethod
+    def _fit_scaler_streaming(
+        scaler,
+        X: np.ndarray,
+        train_end: int,
+        chunk_rows: int,
+        robust_sample_rows: int
+    ) -> None:
+        """在训练区间上按块拟合 scaler"""
+        if hasattr(scaler, 'partial_fit'):
+            for start in range(0, train_end, chunk_rows):
+                scaler.partial_fit(X[start:min(start + chunk_rows, train_end)])
+        else:
+            step = max(1, train_end // robust_sample_rows)
+            scaler.fit(X[:train_end:step])
+
+
+def _create_scaler(scaler_type: str):
+    """按类型创建 scaler"""
+    from sklearn.preprocessing import StandardScaler, RobustScaler, MinMaxScaler
+
+    if scaler_type == 'standard':
+        return StandardScaler()
+    elif scaler_type == 'robust':
+        return RobustScaler()
+    elif scaler_type == 'minmax':
+        return MinMaxScaler()
+    raise ValueError(f"不支持的scaler类型: {scaler_type}")
@@ -0,0 +1,211 @@
+"""
+池化训练矩阵 (PooledTrainingMatrix)
+
+流式池化训练时使用的磁盘训练矩阵：
+- 特征为 float32 的 (N, F) np.memmap，目标为 float32 的 (N,) np.memmap
+- 行按股票顺序纵向堆叠，与 load_pooled_data + dropna 的行顺序一致
+- train / valid / test 为连续行区间，切片即视图，不复制数据
+- 记录每只股票的行区间，GRU 序列窗口不跨股票
+- 每行的交易日（YYYYMMDD int32）与股票编号（共享代码字典的 int32 编号）单独存储
+
+目录结构：
+    {work_dir}/
+        meta.json
+        features.f32
+        target.f32
+        dates.i4
+        stock_ids.i4
+"""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+META_FILE = 'meta.json'
+FEATURES_FILE = 'features.f32'
+TARGET_FILE = 'target.f32'
+DATES_FILE = 'dates.i4'
+STOCK_IDS_FILE = 'stock_ids.i4'
+SPLITS = ('train', 'valid', 'test')
+
+
+class PooledTrainingMatrix:
+    """
+    池化训练矩阵（磁盘 memmap）
+
+    职责：
+    - 以只读 memmap 打开特征 / 目标
+    - 按 split 返回零拷贝视图（ndarray / DataFrame）
+    - 构造 LightGBM Dataset 与 GRU 序列数据集
+    """
+
+    def __init__(
+        self,
+        work_dir: str,
+        feature_cols: List[str],
+        n_rows: int,
+        train_end: int,
+        valid_end: int,
+        stock_ranges: Dict[str, Tuple[int, int]],
+        scaler: Optional[object] = None,
+        mode: str = 'r'
+    ):
+        """
+        初始化训练矩阵（文件需已写入）
+
+        Args:
+            work_dir: 矩阵目录
+            feature_cols: 特征列名
+            n_rows: 总行数
+            train_end: 训练集结束行（不含）
+            valid_end: 验证集结束行（不含）
+            stock_ranges: {股票代码: (起始行, 结束行)}
+            scaler: 已拟合的 scaler（特征已缩放时记录，用于保存模型）
+            mode: memmap 打开模式（'r' 只读，'r+' 读写）
+        """
+        self.work_dir = Path(work_dir)
+        self.feature_cols = list(feature_cols)
+        self.n_rows = n_rows
+        self.train_end = train_end
+        self.valid_end = valid_end
+        self.stock_ranges = {k: tuple(v) for k, v in stock_ranges.items()}
+        self.scaler = scaler
+
+        n_features = len(self.feature_cols)
+        if n_rows > 0:
+            self.X = np.memmap(self.work_dir / FEATURES_FILE, dtype=np.float32, mode=mode,
+                               shape=(n_rows, n_features))
+            self.y = np.memmap(self.work_dir / TARGET_FILE, dtype=np.float32, mode=mode,
+                               shape=(n_rows,))
+            self.dates = np.memmap(self.work_dir / DATES_FILE, dtype=np.int32, mode=mode,
+                                   shape=(n_rows,))
+            self.stock_ids = np.memmap(self.work_dir / STOCK_IDS_FILE, dtype=np.int32, mode=mode,
+                                       shape=(n_rows,))
+        else:
+            self.X = np.empty((0, n_features), dtype=np.float32)
+            self.y = np.empty((0,), dtype=np.float32)
+            self.dates = np.empty((0,), dtype=np.int32)
+            self.stock_ids = np.empty((0,), dtype=np.int32)
+
+    # ==================== 持久化 ====================
+
+    def save_meta(self) -> None:
+        """写入元数据（便于之后 open() 复用同一矩阵）"""
+        meta = {
+            'feature_cols': self.feature_cols,
+            'n_rows': self.n_rows,
+            'train_end': self.train_end,
+            'valid_end': self.valid_end,
+            'stock_ranges': self.stock_ranges,
+        }
+        with open(self.work_dir / META_FILE, 'w') as f:
+            json.dump(meta, f, ensure_ascii=False)
+
+    @classmethod
+    def open(cls, work_dir: str, scaler: Optional[object] = None) -> 'PooledTrainingMatrix':
+        """以只读方式打开已构建的矩阵"""
+        with open(Path(work_dir) / META_FILE, 'r') as f:
+            meta = json.load(f)
+        return cls(work_dir, scaler=scaler, **meta)
+
+    def cleanup(self) -> None:
+        """删除矩阵文件"""
+        self.X = self.y = self.dates = self.stock_ids = None
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    # ==================== 视图 ====================
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.stock_ranges)
+
+    def split_bounds(self, split: str) -> Tuple[int, int]:
+        """split 对应的行区间 [start, end)"""
+        bounds = {
+            'train': (0, self.train_end),
+            'valid': (self.train_end, self.valid_end),
+            'test': (self.valid_end, self.n_rows),
+        }
+        if split not in bounds:
+            raise ValueError(f"不支持的数据集划分: {split}，可选: {SPLITS}")
+        return bounds[split]
+
+    def arrays(self, split: str) -> Tuple[np.ndarray, np.ndarray]:
+        """split 的 (X, y) memmap 视图"""
+        start, end = self.split_bounds(split)
+        return self.X[start:end], self.y[start:end]
+
+    def frames(self, split: str) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        split 的 (X, y) DataFrame / Series
+
+        直接包装 memmap 视图（单一 dtype，不复制），供现有按 DataFrame 训练的模型使用
+        """
+        start, end = self.split_bounds(split)
+        X, y = self.arrays(split)
+        index = pd.RangeIndex(start, end)
+        return (
+            pd.DataFrame(X, columns=self.feature_cols, index=index, copy=False),
+            pd.Series(y, index=index, copy=False, name='target'),
+        )
+
+    def all_frames(self) -> Tuple:
+        """(X_train, y_train, X_valid, y_valid, X_test, y_test)"""
+        result = ()
+        for split in SPLITS:
+            result += self.frames(split)
+        return result
+
+    # ==================== 模型输入 ====================
+
+    def lgb_datasets(self, free_raw_data: bool = True) -> Tuple:
+        """
+        构造 LightGBM 训练 / 验证 Dataset（直接读取 float32 memmap）
+
+        Returns:
+            (train_set, valid_set)；验证集为空时 valid_set 为 None
+        """
+        import lightgbm as lgb
+
+        X_train, y_train = self.arrays('train')
+        train_set = lgb.Dataset(X_train, label=y_train, feature_name=self.feature_cols,
+                                free_raw_data=free_raw_data)
+        X_valid, y_valid = self.arrays('valid')
+        valid_set = None
+        if len(X_valid) > 0:
+            valid_set = lgb.Dataset(X_valid, label=y_valid, reference=train_set,
+                                    free_raw_data=free_raw_data)
+        return train_set, valid_set
+
+    def sequence_dataset(self, split: str, seq_length: int = 20):
+        """
+        GRU 序列数据集（按需从 memmap 切窗口，窗口不跨股票）
+
+        与 GRUStockTrainer.create_sequences 语义一致：
+        样本 i 为 X[i:i+seq_length]，目标为 y[i+seq_length]
+        """
+        from src.data_pipeline.sequence_dataset import PYTORCH_AVAILABLE
+
+        if not PYTORCH_AVAILABLE:
+            raise ImportError("PyTorch未安装，无法构造GRU序列数据集")
+        from src.data_pipeline.sequence_dataset import MemmapSequenceDataset
+
+        return MemmapSequenceDataset(self.X, self.y, self.sequence_starts(split, seq_length), seq_length)
+
+    def sequence_starts(self, split: str, seq_length: int) -> np.ndarray:
+        """split 内所有不跨股票的序列起始行"""
+        start, end = self.split_bounds(split)
+        starts = []
+        for stock_start, stock_end in self.stock_ranges.values():
+            lo, hi = max(start, stock_start), min(end, stock_end)
+            if hi - lo > seq_length:
+                starts.append(np.arange(lo, hi - seq_length, dtype=np.int64))
+        return np.concatenate(starts) if starts else np.empty(0, dtype=np.int64)
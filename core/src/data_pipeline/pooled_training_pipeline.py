@@ -8,7 +8,8 @@ import numpy as np
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
-from src.data_pipeline.pooled_data_loader import PooledDataLoader
+from src.data_pipeline.pooled_data_loader import PooledDataLoader, _create_scaler
+from src.data_pipeline.pooled_training_matrix import PooledTrainingMatrix
 from src.models.model_trainer import ModelTrainer
 from src.models.comparison_evaluator import ComparisonEvaluator
 from src.data_pipeline.data_splitter import DataSplitter
@@ -22,7 +23,7 @@ class PooledTrainingPipeline:
     池化训练Pipeline
 
     功能：
-    1. 加载多股票数据并池化
+    1. 加载多股票数据并池化（streaming=True 时逐股写入 float32 磁盘矩阵，不生成完整池化 DataFrame）
     2. 在合并训练集上fit Scaler
     3. 训练LightGBM主模型
     4. 训练Ridge基准模型
@@ -33,7 +34,9 @@ class PooledTrainingPipeline:
     def __init__(
         self,
         scaler_type: str = 'robust',
-        verbose: bool = True
+        verbose: bool = True,
+        streaming: bool = False,
+        work_dir: Optional[str] = None
     ):
         """
         初始化池化训练Pipeline
@@ -41,9 +44,13 @@ class PooledTrainingPipeline:
         参数:
             scaler_type: 缩放器类型 ('standard', 'robust', 'minmax')
             verbose: 是否输出详细日志
+            streaming: 是否使用流式磁盘矩阵（大股票池时避免一次性加载到内存）
+            work_dir: 流式矩阵目录（None 时使用临时目录，训练结束后调用 cleanup() 删除）
         """
         self.scaler_type = scaler_type
         self.verbose = verbose
+        self.streaming = streaming
+        self.work_dir = work_dir
 
         self.pooled_loader = PooledDataLoader(verbose=verbose)
         self.scaler = None
@@ -51,6 +58,8 @@ class PooledTrainingPipeline:
 
         # 训练结果
         self.pooled_df = None
+        self.matrix: Optional[PooledTrainingMatrix] = None
+        self.total_samples = 0
         self.successful_symbols = []
         self.feature_cols = []
         self.target_col = None
@@ -82,8 +91,15 @@ class PooledTrainingPipeline:
         logger.info("【池化训练Pipeline】开始")
         logger.info("=" * 80)
 
+        self.target_col = f'target_{target_period}d_return'
+
+        if self.streaming:
+            return self._load_and_prepare_streaming(
+                symbol_list, start_date, end_date, target_period, train_ratio, valid_ratio
+            )
+
         # 1. 加载池化数据
-        self.pooled_df, total_samples, self.successful_symbols = self.pooled_loader.load_pooled_data(
+        self.pooled_df, self.total_samples, self.successful_symbols = self.pooled_loader.load_pooled_data(
             symbol_list=symbol_list,
             start_date=start_date,
             end_date=end_date,
@@ -91,8 +107,6 @@ class PooledTrainingPipeline:
         )
 
         # 2. 准备训练数据
-        self.target_col = f'target_{target_period}d_return'
-
         X_train, y_train, X_valid, y_valid, X_test, y_test, self.feature_cols = \
             self.pooled_loader.prepare_pooled_training_data(
                 pooled_df=self.pooled_df,
@@ -105,16 +119,7 @@ class PooledTrainingPipeline:
         logger.info(f"\n在合并训练集上fit Scaler (类型: {self.scaler_type})...")
 
         # 创建scaler
-        from sklearn.preprocessing import StandardScaler, RobustScaler, MinMaxScaler
-
-        if self.scaler_type == 'standard':
-            self.scaler = StandardScaler()
-        elif self.scaler_type == 'robust':
-            self.scaler = RobustScaler()
-        elif self.scaler_type == 'minmax':
-            self.scaler = MinMaxScaler()
-        else:
-            raise ValueError(f"不支持的scaler类型: {self.scaler_type}")
+        self.scaler = _create_scaler(self.scaler_type)
 
         # Fit scaler on training data
         X_train_scaled = pd.DataFrame(
@@ -137,6 +142,44 @@ class PooledTrainingPipeline:
 
         return X_train_scaled, y_train, X_valid_scaled, y_valid, X_test_scaled, y_test
 
+    def _load_and_prepare_streaming(
+        self,
+        symbol_list: List[str],
+        start_date: str,
+        end_date: str,
+        target_period: int,
+        train_ratio: float,
+        valid_ratio: float
+    ) -> Tuple:
+        """
+        流式加载：逐股写入磁盘矩阵，scaler 按块 partial_fit，
+        返回包装 memmap 视图的 DataFrame（不复制）
+        """
+        self.matrix = self.pooled_loader.build_training_matrix(
+            symbol_list=symbol_list,
+            start_date=start_date,
+            end_date=end_date,
+            target_period=target_period,
+            train_ratio=train_ratio,
+            valid_ratio=valid_ratio,
+            scaler_type=self.scaler_type,
+            work_dir=self.work_dir
+        )
+        self.total_samples = self.matrix.n_rows
+        self.successful_symbols = self.matrix.symbols
+        self.feature_cols = self.matrix.feature_cols
+        self.scaler = self.matrix.scaler
+
+        logger.info("✓ Scaler已在合并训练集上完成流式fit")
+
+        return self.matrix.all_frames()
+
+    def cleanup(self) -> None:
+        """删除流式模式的磁盘矩阵"""
+        if self.matrix is not None:
+            self.matrix.cleanup()
+            self.matrix = None
+
     def train_with_baseline(
         self,
         X_train: pd.DataFrame,
@@ -235,7 +278,7 @@ class PooledTrainingPipeline:
 
         # 5. 返回结果
         result_dict = self.comparison_evaluator.get_comparison_dict()
-        result_dict['total_samples'] = len(self.pooled_df)
+        result_dict['total_samples'] = self.total_samples
         result_dict['successful_symbols'] = self.successful_symbols
         result_dict['num_symbols'] = len(self.successful_symbols)
         result_dict['feature_count'] = len(self.feature_cols)
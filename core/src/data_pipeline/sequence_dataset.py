@@ -0,0 +1,54 @@
+"""
+磁盘矩阵时序数据集 (MemmapSequenceDataset)
+
+供 PooledTrainingMatrix.sequence_dataset 使用：GRU 训练时不预先展开 (N, T, F) 序列，
+__getitem__ 时从 memmap 切出窗口，内存占用与批次大小相关而与样本数无关
+"""
+
+import numpy as np
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import torch
+    from torch.utils.data import Dataset
+    PYTORCH_AVAILABLE = True
+except ImportError:
+    PYTORCH_AVAILABLE = False
+    logger.warning("警告: PyTorch未安装，GRU序列数据集不可用")
+
+
+if PYTORCH_AVAILABLE:
+    class MemmapSequenceDataset(Dataset):
+        """基于磁盘矩阵的时序数据集"""
+
+        def __init__(
+            self,
+            features: np.ndarray,
+            targets: np.ndarray,
+            starts: np.ndarray,
+            seq_length: int
+        ):
+            """
+            参数:
+                features: (rows, F) float32 矩阵（可为 np.memmap）
+                targets: (rows,) float32 目标
+                starts: 每个样本的起始行
+                seq_length: 序列长度
+            """
+            self.features = features
+            self.targets = targets
+            self.starts = np.asarray(starts, dtype=np.int64)
+            self.seq_length = seq_length
+
+        def __len__(self):
+            return len(self.starts)
+
+        def __getitem__(self, idx):
+            start = int(self.starts[idx])
+            end = start + self.seq_length
+            sequence = np.array(self.features[start:end], dtype=np.float32)
+            target = np.float32(self.targets[end])
+            return torch.from_numpy(sequence), torch.tensor(target)
@@ -39,13 +39,13 @@ class ConnectionPoolManager:
         self.config = config
         self.min_conn = min_conn
         self.max_conn = max_conn
-        self.connection_pool: Optional[psycopg2.pool.SimpleConnectionPool] = None
+        self.connection_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
         self._init_connection_pool()
 
     def _init_connection_pool(self) -> None:
         """初始化连接池"""
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
+            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
                 minconn=self.min_conn,
                 maxconn=self.max_conn,
                 host=self.config['host'],
@@ -106,7 +106,7 @@ class ConnectionPoolManager:
                 'max_conn': self.max_conn
             }
 
-        # 注意：SimpleConnectionPool 没有直接获取当前连接数的方法
+        # 注意：ThreadedConnectionPool 没有直接获取当前连接数的方法
         # 这里只返回配置信息
         return {
             'initialized': True,
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+日线本地列式缓存 (DailyBarCache)
+
+已收盘交易日的 stock_daily 行不会再变化，但回测、训练（DataLoader / PooledDataLoader）
+和选股策略每次都要回 PostgreSQL 重新拉取同一批历史数据。本模块把全市场日线按月分区
+落盘为 Parquet 文件：
+
+    {cache_dir}/
+        manifest.json          # 覆盖范围 + 每个分区的行数 / 校验和
+        2024-01.parquet        # 该月全市场 OHLCV + adj_factor + daily_basic 字段
+        2024-02.parquet
+        ...
+
+- 分区内按 (code, date) 排序并设置较小的 row group，按股票读取时 Parquet 统计信息
+  可以跳过无关 row group，单只股票 10 年数据只需读取约 120 个小块
+- 每个分区的内容校验和由 DataChecksumValidator 计算，写入 manifest，
+  DataQueryManager.verify_daily_bar_cache() 用数据库重新计算的校验和比对并修复
+- 文件通过「临时文件 + os.replace」原子替换，读写并发时不会读到半个文件
+
+本模块只负责文件读写与覆盖范围判断，数据库查询由 DataQueryManager 完成。
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+
+class DailyBarCache:
+    """
+    按月分区的全市场日线 Parquet 缓存
+
+    使用方式：
+        cache = DailyBarCache('/data/pipeline_cache/daily_bars')
+        cache.write_partition('2024-01', df_month)          # 由 DataQueryManager 刷新
+        span = cache.plan('2020-01-01', '2024-06-30')       # 可由缓存服务的日期区间
+        df = cache.read(*span, codes=['000001.SZ'])
+    """
+
+    # stock_daily 字段（顺序与 DataQueryManager.load_daily_data 输出一致）
+    BAR_COLUMNS = [
+        'open', 'high', 'low', 'close', 'volume', 'amount',
+        'amplitude', 'pct_change', 'change', 'turnover',
+    ]
+    # adj_factor 表
+    ADJ_COLUMNS = ['adj_factor']
+    # daily_basic 表
+    BASIC_COLUMNS = [
+        'turnover_rate', 'volume_ratio', 'pe_ttm', 'pb', 'ps_ttm', 'dv_ttm',
+        'total_share', 'float_share', 'total_mv', 'circ_mv',
+    ]
+    VALUE_COLUMNS = BAR_COLUMNS + ADJ_COLUMNS + BASIC_COLUMNS
+    KEY_COLUMNS = ['code', 'date']
+
+    MANIFEST_NAME = 'manifest.json'
+    MANIFEST_VERSION = 1
+    # 约 20 只股票一个月的数据量；按股票过滤时可跳过绝大部分 row group
+    ROW_GROUP_SIZE = 512
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None,
+                 enabled: Optional[bool] = None):
+        """
+        初始化日线缓存
+
+        Args:
+            cache_dir: 缓存目录；默认读取环境变量 DAILY_BAR_CACHE_DIR，
+                       否则为 {PATH_CACHE_DIR}/daily_bars
+            enabled: 是否启用；默认读取环境变量 DAILY_BAR_CACHE_ENABLED（缺省启用）
+        """
+        if enabled is None:
+            enabled = os.getenv('DAILY_BAR_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+        self.enabled = enabled
+        self.cache_dir = Path(cache_dir) if cache_dir else self._default_cache_dir()
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_mtime: Optional[float] = None
+
+    @staticmethod
+    def _default_cache_dir() -> Path:
+        env_dir = os.getenv('DAILY_BAR_CACHE_DIR')
+        if env_dir:
+            return Path(env_dir)
+        try:
+            from src.config.settings import get_settings
+            return Path(get_settings().paths.cache_dir) / 'daily_bars'
+        except Exception:
+            return Path('data/pipeline_cache/daily_bars')
+
+    # ==================== 分区工具 ====================
+
+    @staticmethod
+    def partition_key(day: DateLike) -> str:
+        """日期 → 分区键 YYYY-MM"""
+        return pd.Timestamp(day).strftime('%Y-%m')
+
+    @staticmethod
+    def partition_keys(start_date: DateLike, end_date: DateLike) -> List[str]:
+        """[start_date, end_date] 覆盖的全部分区键（按时间升序）"""
+        start = pd.Timestamp(start_date).to_period('M')
+        end = pd.Timestamp(end_date).to_period('M')
+        if start > end:
+            return []
+        return [p.strftime('%Y-%m') for p in pd.period_range(start, end, freq='M')]
+
+    @staticmethod
+    def partition_bounds(key: str) -> Tuple[str, str]:
+        """分区键 → (月初, 月末) 日期字符串 YYYY-MM-DD"""
+        period = pd.Period(key, freq='M')
+        return period.start_time.strftime('%Y-%m-%d'), period.end_time.strftime('%Y-%m-%d')
+
+    def partition_path(self, key: str) -> Path:
+        return self.cache_dir / f'{key}.parquet'
+
+    @classmethod
+    def normalize(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        统一分区数据的列顺序、类型与排序
+
+        写入前与校验前都经过此函数，保证同一份数据无论来自数据库还是 Parquet，
+        DataChecksumValidator 计算出的校验和都一致。
+        """
+        out = pd.DataFrame({
+            'code': df['code'].astype(str) if 'code' in df.columns else pd.Series(dtype=str),
+            'date': pd.to_datetime(df['date']) if 'date' in df.columns else pd.Series(dtype='datetime64[ns]'),
+        })
+        for col in cls.VALUE_COLUMNS:
+            if col in df.columns:
+                out[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+            else:
+                out[col] = np.nan
+        out['date'] = out['date'].astype('datetime64[ns]')
+        return out.sort_values(cls.KEY_COLUMNS, kind='mergesort').reset_index(drop=True)
+
+    @staticmethod
+    def compute_checksum(df: pd.DataFrame) -> str:
+        """分区内容校验和（复用 DataChecksumValidator，入参需已 normalize）"""
+        # 延迟导入：data_checksum_validator 依赖 db_manager，顶层导入会形成循环
+        from src.data.data_checksum_validator import DataChecksumValidator
+        return DataChecksumValidator.calculate_checksum(df)
+
+    # ==================== manifest ====================
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.cache_dir / self.MANIFEST_NAME
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """读取 manifest（按文件 mtime 缓存在内存中，其他进程刷新后自动重新加载）"""
+        path = self.manifest_path
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return {'version': self.MANIFEST_VERSION, 'start_date': None,
+                    'covered_until': None, 'partitions': {}}
+
+        with self._lock:
+            if self._manifest is not None and self._manifest_mtime == mtime:
+                return self._manifest
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"日线缓存 manifest 读取失败，视为空缓存: {e}")
+                manifest = {'version': self.MANIFEST_VERSION, 'start_date': None,
+                            'covered_until': None, 'partitions': {}}
+            self._manifest = manifest
+            self._manifest_mtime = mtime
+            return manifest
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix='.manifest-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp, self.manifest_path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        with self._lock:
+            self._manifest = None
+
+    # ==================== 写入 ====================
+
+    def write_partition(self, key: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        原子写入一个月分区并更新 manifest
+
+        Args:
+            key: 分区键 YYYY-MM
+            df: 该月全市场数据（含 code, date 及任意 VALUE_COLUMNS）
+
+        Returns:
+            分区元信息 {rows, checksum, min_date, max_date, updated_at}
+        """
+        frame = self.normalize(df)
+        checksum = self.compute_checksum(frame)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        path = self.partition_path(key)
+        if len(frame):
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=f'.{key}-', suffix='.tmp')
+            os.close(fd)
+            try:
+                pq.write_table(table, tmp, row_group_size=self.ROW_GROUP_SIZE,
+                               compression='zstd')
+                os.replace(tmp, path)
+            except Exception:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+        elif path.exists():
+            path.unlink()
+
+        info = {
+            'rows': int(len(frame)),
+            'checksum': checksum,
+            'min_date': frame['date'].min().strftime('%Y-%m-%d') if len(frame) else None,
+            'max_date': frame['date'].max().strftime('%Y-%m-%d') if len(frame) else None,
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        manifest = dict(self.load_manifest())
+        partitions = dict(manifest.get('partitions') or {})
+        partitions[key] = info
+        manifest['partitions'] = partitions
+        manifest['version'] = self.MANIFEST_VERSION
+        self._save_manifest(manifest)
+        logger.debug(f"日线缓存分区写入: {key} ({info['rows']} 行, {checksum[:8]}...)")
+        return info
+
+    def set_coverage(self, start_date: Optional[DateLike], covered_until: Optional[DateLike],
+                     history_complete: bool = False) -> None:
+        """
+        更新缓存覆盖范围
+
+        Args:
+            start_date: 缓存最早日期（None 保持原值；取与原值的较小者）
+            covered_until: 缓存完整覆盖到的日期（通常为数据库最新交易日）
+            history_complete: 缓存是否从数据库最早日期起全量构建（早于缓存起点的请求可直接截取）
+        """
+        manifest = dict(self.load_manifest())
+        if history_complete:
+            manifest['history_complete'] = True
+        if start_date is not None:
+            new_start = pd.Timestamp(start_date).strftime('%Y-%m-%d')
+            old_start = manifest.get('start_date')
+            manifest['start_date'] = min(old_start, new_start) if old_start else new_start
+        if covered_until is not None:
+            manifest['covered_until'] = pd.Timestamp(covered_until).strftime('%Y-%m-%d')
+        self._save_manifest(manifest)
+
+    # ==================== 读取 ====================
+
+    def plan(self, start_date: Optional[DateLike] = None,
+             end_date: Optional[DateLike] = None) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        计算 [start_date, end_date] 中可由缓存服务的区间
+
+        Returns:
+            (cache_start, cache_end)；缓存未启用、为空、区间内有分区缺失，
+            或请求起点早于缓存起点且缓存不含完整历史时返回 None。
+            cache_end 之后（covered_until 之后）的数据需由调用方回数据库补齐。
+        """
+        if not self.enabled:
+            return None
+        manifest = self.load_manifest()
+        cache_first = manifest.get('start_date')
+        covered_until = manifest.get('covered_until')
+        partitions = manifest.get('partitions') or {}
+        if not cache_first or not covered_until or not partitions:
+            return None
+
+        cache_first = pd.Timestamp(cache_first)
+        if (start_date is None or pd.Timestamp(start_date) < cache_first) and not manifest.get('history_complete'):
+            # 只做过增量刷新的缓存不含更早的历史，截取会静默丢数据
+            logger.debug(f"请求起点早于日线缓存起点 {cache_first.date()}，回退数据库")
+            return None
+
+        start = max(pd.Timestamp(start_date), cache_first) if start_date else cache_first
+        end = min(pd.Timestamp(end_date), pd.Timestamp(covered_until)) if end_date else pd.Timestamp(covered_until)
+        if start > end:
+            return None
+
+        missing = [k for k in self.partition_keys(start, end) if k not in partitions]
+        if missing:
+            logger.debug(f"日线缓存分区缺失 {missing[:3]}...，回退数据库")
+            return None
+        return start, end
+
+    def covered_until(self) -> Optional[pd.Timestamp]:
+        value = self.load_manifest().get('covered_until')
+        return pd.Timestamp(value) if value else None
+
+    def read(self, start_date: DateLike, end_date: DateLike,
+             codes: Optional[Sequence[str]] = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        读取 [start_date, end_date] 的长表数据（code, date, 字段...），按 (code, date) 排序
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+            codes: 股票代码列表（None 为全市场）
+            columns: 需要的字段（默认全部 VALUE_COLUMNS）
+        """
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        value_cols = list(columns) if columns else list(self.VALUE_COLUMNS)
+        unknown = [c for c in value_cols if c not in self.VALUE_COLUMNS]
+        if unknown:
+            raise ValueError(f"日线缓存不包含字段: {unknown}")
+
+        partitions = self.load_manifest().get('partitions') or {}
+        paths = [
+            str(self.partition_path(k))
+            for k in self.partition_keys(start, end)
+            if partitions.get(k, {}).get('rows')
+        ]
+        read_cols = self.KEY_COLUMNS + value_cols
+        if not paths:
+            return self.normalize(pd.DataFrame(columns=read_cols))[read_cols]
+
+        dataset = ds.dataset(paths, format='parquet')
+        date_type = dataset.schema.field('date').type
+        expr = (ds.field('date') >= pa.scalar(start, type=date_type)) & \
+               (ds.field('date') <= pa.scalar(end, type=date_type))
+        if codes is not None:
+            expr = expr & ds.field('code').isin(pa.array(list(codes), type=pa.string()))
+
+        table = dataset.to_table(columns=read_cols, filter=expr)
+        df = table.to_pandas()
+        df['date'] = df['date'].astype('datetime64[ns]')
+        return df.sort_values(self.KEY_COLUMNS, kind='mergesort').reset_index(drop=True)
+
+    def read_stock(self, code: str, start_date: DateLike, end_date: DateLike,
+                   columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """读取单只股票，返回以 date 为索引的 DataFrame（与 load_daily_data 输出一致）"""
+        df = self.read(start_date, end_date, codes=[code], columns=columns or self.BAR_COLUMNS)
+        return df.drop(columns='code').set_index('date')
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存概况：分区数、总行数、磁盘占用与覆盖范围"""
+        manifest = self.load_manifest()
+        partitions = manifest.get('partitions') or {}
+        size = sum(
+            self.partition_path(k).stat().st_size
+            for k in partitions if self.partition_path(k).exists()
+        )
+        return {
+            'enabled': self.enabled,
+            'cache_dir': str(self.cache_dir),
+            'start_date': manifest.get('start_date'),
+            'covered_until': manifest.get('covered_until'),
+            'history_complete': bool(manifest.get('history_complete')),
+            'partitions': len(partitions),
+            'rows': sum(p.get('rows', 0) for p in partitions.values()),
+            'size_mb': round(size / 1024 / 1024, 2),
+        }
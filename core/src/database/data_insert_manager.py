@@ -480,6 +480,129 @@ class DataInsertManager:
                 cursor.close()
                 self.pool_manager.release_connection(conn)
 
+    def save_realtime_quote_batch(self, quotes: list, data_source: str = 'akshare') -> int:
+        """
+        批量保存实时行情（一条多行 upsert、一次提交，用于增量微批写入）
+
+        同一批次内重复的代码只保留最后一条（ON CONFLICT DO UPDATE 不允许同一语句
+        多次更新同一行）。
+
+        Args:
+            quotes: 实时行情字典列表（字段同 save_realtime_quote_single）
+            data_source: 数据源名称
+
+        Returns:
+            插入/更新的记录数
+        """
+        latest = {}
+        for quote in quotes:
+            if quote.get('code'):
+                latest[quote['code']] = quote
+        if not latest:
+            return 0
+
+        records = [
+            (
+                quote.get('code'),
+                quote.get('name', ''),
+                safe_float(quote.get('latest_price')),
+                safe_float(quote.get('open')),
+                safe_float(quote.get('high')),
+                safe_float(quote.get('low')),
+                safe_float(quote.get('pre_close')),
+                safe_int(quote.get('volume')),
+                safe_float(quote.get('amount')),
+                safe_float(quote.get('pct_change')),
+                safe_float(quote.get('change_amount')),
+                safe_float(quote.get('turnover')),
+                safe_float(quote.get('amplitude')),
+                data_source
+            )
+            for quote in latest.values()
+        ]
+
+        insert_query = """
+            INSERT INTO stock_realtime
+            (code, name, latest_price, open, high, low, pre_close, volume, amount,
+             pct_change, change_amount, turnover, amplitude, data_source, trade_time)
+            VALUES %s
+            ON CONFLICT (code)
+            DO UPDATE SET
+                name = EXCLUDED.name,
+                latest_price = EXCLUDED.latest_price,
+                open = EXCLUDED.open,
+                high = EXCLUDED.high,
+                low = EXCLUDED.low,
+                pre_close = EXCLUDED.pre_close,
+                volume = EXCLUDED.volume,
+                amount = EXCLUDED.amount,
+                pct_change = EXCLUDED.pct_change,
+                change_amount = EXCLUDED.change_amount,
+                turnover = EXCLUDED.turnover,
+                amplitude = EXCLUDED.amplitude,
+                data_source = EXCLUDED.data_source,
+                trade_time = CURRENT_TIMESTAMP,
+                updated_at = CURRENT_TIMESTAMP;
+        """
+        template = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)"
+
+        conn = None
+        try:
+            conn = self.pool_manager.get_connection()
+            cursor = conn.cursor()
+            extras.execute_values(cursor, insert_query, records, template=template,
+                                  page_size=len(records))
+            conn.commit()
+            return len(records)
+
+        except psycopg2.IntegrityError as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"数据完整性错误: {e}")
+            raise DatabaseError(
+                "批量保存实时行情数据时违反数据完整性约束",
+                error_code="DB_INTEGRITY_ERROR",
+                operation="save_realtime_quote_batch",
+                error_detail=str(e)
+            ) from e
+
+        except psycopg2.OperationalError as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"数据库连接错误: {e}")
+            raise DatabaseError(
+                "数据库连接失败",
+                error_code="DB_CONNECTION_ERROR",
+                operation="save_realtime_quote_batch",
+                error_detail=str(e)
+            ) from e
+
+        except psycopg2.DataError as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"数据类型错误: {e}")
+            raise DatabaseError(
+                "数据类型不匹配",
+                error_code="DB_DATA_TYPE_ERROR",
+                operation="save_realtime_quote_batch",
+                error_detail=str(e)
+            ) from e
+
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logger.error(f"❌ 批量保存实时行情数据失败(未预期异常): {e}")
+            raise DatabaseError(
+                f"批量保存实时行情数据失败: {str(e)}",
+                error_code="DB_INSERT_FAILED",
+                operation="save_realtime_quote_batch"
+            ) from e
+
+        finally:
+            if conn:
+                cursor.close()
+                self.pool_manager.release_connection(conn)
+
     def save_realtime_quotes(self, df: pd.DataFrame, data_source: str = 'akshare') -> int:
         """
         保存实时行情数据到数据库
@@ -765,8 +888,9 @@ class DataInsertManager:
         cursor.execute("""
             SELECT MIN(trade_time), MAX(trade_time)
             FROM stock_minute
-            WHERE code = %s AND DATE(trade_time) = %s AND period = %s
-        """, (code, trade_date, period))
+            WHERE code = %s AND period = %s
+              AND trade_time >= %s::date AND trade_time < %s::date + 1
+        """, (code, period, trade_date, trade_date))
 
         result = cursor.fetchone()
         first_time, last_time = result if result else (None, None)
@@ -17,8 +17,15 @@ try:
 except ImportError:
     from src.exceptions import DatabaseError
 
+from src.utils.dtype_policy import categorize_codes, downcast_floats
+from .daily_bar_cache import DailyBarCache
+from .minute_bar_store import (
+    MINUTE_BAR_COLUMNS, MINUTE_KEY_COLUMNS, MinuteBarStore, normalize_period, resample_minute_bars,
+)
+
 if TYPE_CHECKING:
     from .connection_pool_manager import ConnectionPoolManager
+    from src.data.trading_calendar import TradingCalendarIndex
 
 logger = get_logger(__name__)
 
@@ -33,20 +40,32 @@ class DataQueryManager:
     - 数据加载和格式化
     """
 
-    def __init__(self, pool_manager: 'ConnectionPoolManager'):
+    def __init__(self, pool_manager: 'ConnectionPoolManager',
+                 bar_cache: Optional[DailyBarCache] = None,
+                 trading_calendar: Optional['TradingCalendarIndex'] = None,
+                 minute_store: Optional[MinuteBarStore] = None):
         """
         初始化数据查询管理器
 
         Args:
             pool_manager: 连接池管理器实例
+            bar_cache: 日线本地缓存（默认按环境变量 / 配置创建）
+            trading_calendar: 交易日历内存索引（None 时 is_trading_day 逐次查询数据库）
+            minute_store: 分钟线重采样缓存与冷数据层（默认按环境变量 / 配置创建）
         """
         self.pool_manager = pool_manager
+        self.bar_cache = bar_cache if bar_cache is not None else DailyBarCache()
+        self.minute_store = minute_store if minute_store is not None else MinuteBarStore()
+        self.trading_calendar = trading_calendar
 
     def load_daily_data(self, stock_code: str,
                        start_date: Optional[str] = None,
                        end_date: Optional[str] = None) -> pd.DataFrame:
         """
-        从数据库加载股票日线数据
+        加载股票日线数据
+
+        优先读取本地日线缓存（DailyBarCache），缓存覆盖日之后的部分回数据库补齐；
+        缓存未建立、分区缺失或读取失败时整体回退数据库。
 
         Args:
             stock_code: 股票代码
@@ -54,8 +73,51 @@ class DataQueryManager:
             end_date: 结束日期（可选）
 
         Returns:
-            包含日线数据的DataFrame
+            包含日线数据的DataFrame（数值列为 dtype 策略的浮点类型）
         """
+        span = self._plan_bar_cache(start_date, end_date)
+        if span is None:
+            return self._load_daily_data_from_db(stock_code, start_date, end_date)
+
+        try:
+            cached = self.bar_cache.read_stock(stock_code, *span)
+        except Exception as e:
+            logger.warning(f"日线缓存读取失败，回退数据库: {stock_code} {e}")
+            return self._load_daily_data_from_db(stock_code, start_date, end_date)
+        cached = downcast_floats(cached, columns=DailyBarCache.BAR_COLUMNS)
+
+        tail_start = self._bar_cache_tail_start(span, end_date)
+        if tail_start is not None:
+            tail = self._load_daily_data_from_db(stock_code, tail_start, end_date)
+            if not tail.empty:
+                cached = pd.concat([cached, tail[cached.columns]])
+
+        logger.debug(f"✓ 缓存加载 {stock_code} 数据: {len(cached)} 条记录")
+        return cached
+
+    def _plan_bar_cache(self, start_date: Optional[str],
+                        end_date: Optional[str]):
+        """可由日线缓存服务的区间，缓存不可用时返回 None"""
+        if self.bar_cache is None:
+            return None
+        try:
+            return self.bar_cache.plan(start_date, end_date)
+        except Exception as e:
+            logger.warning(f"日线缓存规划失败，回退数据库: {e}")
+            return None
+
+    @staticmethod
+    def _bar_cache_tail_start(span, end_date: Optional[str]) -> Optional[str]:
+        """缓存覆盖日之后仍需回数据库补齐的起始日期，无需补齐时返回 None"""
+        cache_end = span[1]
+        if end_date is not None and pd.Timestamp(end_date) <= cache_end:
+            return None
+        return (cache_end + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    def _load_daily_data_from_db(self, stock_code: str,
+                                 start_date: Optional[str] = None,
+                                 end_date: Optional[str] = None) -> pd.DataFrame:
+        """从数据库加载股票日线数据"""
         conn = None
         try:
             conn = self.pool_manager.get_connection()
@@ -84,12 +146,8 @@ class DataQueryManager:
                 warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
                 df = pd.read_sql_query(query, conn, params=params, index_col='date', parse_dates=['date'])
 
-            # 确保数值列是正确的类型
-            numeric_columns = ['open', 'high', 'low', 'close', 'volume', 'amount',
-                              'amplitude', 'pct_change', 'change', 'turnover']
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+            # 数值列（可能为 Decimal）一次性转换为策略浮点类型
+            df = downcast_floats(df, columns=DailyBarCache.BAR_COLUMNS)
 
             logger.info(f"✓ 加载 {stock_code} 数据: {len(df)} 条记录")
             return df
@@ -134,6 +192,224 @@ class DataQueryManager:
             if conn:
                 self.pool_manager.release_connection(conn)
 
+    # ==================== 全市场日线 / 本地缓存 ====================
+
+    def load_market_daily(self, start_date: Optional[str] = None,
+                          end_date: Optional[str] = None,
+                          codes: Optional[List[str]] = None,
+                          columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        加载全市场（或指定股票）日线长表：code, date, 字段...
+
+        字段范围见 DailyBarCache.VALUE_COLUMNS（OHLCV + adj_factor + daily_basic）。
+        默认走本地缓存，缓存覆盖日之后的部分与缓存不可用时回退数据库。
+
+        Args:
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
+            codes: 股票代码列表（None 为全市场）
+            columns: 需要的字段（默认全部）
+
+        Returns:
+            按 (code, date) 排序的长表 DataFrame（code 为 category，数值列为策略浮点类型）
+        """
+        columns = list(columns) if columns else list(DailyBarCache.VALUE_COLUMNS)
+        span = self._plan_bar_cache(start_date, end_date)
+        if span is not None:
+            try:
+                cached = self.bar_cache.read(*span, codes=codes, columns=columns)
+            except Exception as e:
+                logger.warning(f"日线缓存读取失败，回退数据库: {e}")
+            else:
+                tail_start = self._bar_cache_tail_start(span, end_date)
+                if tail_start is not None:
+                    tail = self._query_market_daily_from_db(tail_start, end_date, codes)
+                    if not tail.empty:
+                        cached = pd.concat([cached, tail[cached.columns]], ignore_index=True)
+                        cached = cached.sort_values(DailyBarCache.KEY_COLUMNS, kind='mergesort')
+                        cached = cached.reset_index(drop=True)
+                logger.info(f"✓ 缓存加载全市场日线: {len(cached)} 条记录")
+                return self._apply_dtype_policy(cached, columns)
+
+        df = self._query_market_daily_from_db(start_date, end_date, codes)
+        return self._apply_dtype_policy(df[DailyBarCache.KEY_COLUMNS + columns], columns)
+
+    @staticmethod
+    def _apply_dtype_policy(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """长表加载边界：数值列转策略浮点类型，code 转 category"""
+        return categorize_codes(downcast_floats(df, columns=columns), 'code')
+
+    def _query_market_daily_from_db(self, start_date: Optional[str] = None,
+                                    end_date: Optional[str] = None,
+                                    codes: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        从数据库查询全市场日线长表（LEFT JOIN adj_factor / daily_basic）
+
+        adj_factor / daily_basic 表不存在时（纯 core 部署）对应字段为 NaN。
+        """
+        conn = None
+        try:
+            conn = self.pool_manager.get_connection()
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT to_regclass('public.adj_factor') IS NOT NULL, "
+                    "to_regclass('public.daily_basic') IS NOT NULL"
+                )
+                has_adj, has_basic = cursor.fetchone()
+
+            select_cols = [f"sd.{c}" for c in DailyBarCache.BAR_COLUMNS]
+            joins = []
+            if has_adj:
+                select_cols.append("af.adj_factor")
+                # adj_factor.trade_date 在迁移 088 中为 VARCHAR(8) 'YYYYMMDD'，
+                # 在 tushare_extension_schema.sql 中为 DATE，两侧统一转 date 比较
+                joins.append(
+                    "LEFT JOIN adj_factor af "
+                    "ON af.ts_code = sd.code AND af.trade_date::date = sd.date::date"
+                )
+            if has_basic:
+                select_cols.extend(f"b.{c}" for c in DailyBarCache.BASIC_COLUMNS)
+                joins.append("LEFT JOIN daily_basic b ON b.ts_code = sd.code AND b.trade_date = sd.date")
+
+            query = f"""
+                SELECT sd.code, sd.date, {', '.join(select_cols)}
+                FROM stock_daily sd
+                {' '.join(joins)}
+                WHERE 1 = 1
+            """
+            params: List[Any] = []
+            if start_date:
+                query += " AND sd.date >= %s"
+                params.append(start_date)
+            if end_date:
+                query += " AND sd.date <= %s"
+                params.append(end_date)
+            if codes is not None:
+                query += " AND sd.code = ANY(%s)"
+                params.append(list(codes))
+            query += " ORDER BY sd.code, sd.date"
+
+            import warnings
+            with warnings.catch_warnings():
+                warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
+                df = pd.read_sql_query(query, conn, params=params, parse_dates=['date'])
+
+            return DailyBarCache.normalize(df)
+
+        except psycopg2.OperationalError as e:
+            logger.error(f"数据库连接错误: {e}")
+            raise DatabaseError(
+                "数据库连接失败",
+                error_code="DB_CONNECTION_ERROR",
+                operation="load_market_daily",
+                error_detail=str(e)
+            ) from e
+
+        except psycopg2.ProgrammingError as e:
+            logger.error(f"SQL语法错误: {e}")
+            raise DatabaseError(
+                "SQL语句错误",
+                error_code="DB_SYNTAX_ERROR",
+                operation="load_market_daily",
+                error_detail=str(e)
+            ) from e
+
+        except DatabaseError:
+            raise
+
+        except Exception as e:
+            logger.error(f"❌ 加载全市场日线失败(未预期异常): {e}")
+            raise DatabaseError(
+                f"加载全市场日线失败: {str(e)}",
+                error_code="DB_QUERY_FAILED",
+                operation="load_market_daily"
+            ) from e
+
+        finally:
+            if conn:
+                self.pool_manager.release_connection(conn)
+
+    def _query_daily_date_range(self) -> tuple:
+        """stock_daily 的 (最早日期, 最新日期)"""
+        conn = None
+        try:
+            conn = self.pool_manager.get_connection()
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT MIN(date), MAX(date) FROM stock_daily")
+                row = cursor.fetchone()
+            return (row[0], row[1]) if row else (None, None)
+        finally:
+            if conn:
+                self.pool_manager.release_connection(conn)
+
+    def refresh_daily_bar_cache(self, start_date: Optional[str] = None,
+                                end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        从数据库重建 [start_date, end_date] 涉及的月分区（日线同步完成后增量调用）
+
+        Args:
+            start_date: 开始日期（None 表示从数据库最早日期全量构建）
+            end_date: 结束日期（None 表示数据库最新日期）
+
+        Returns:
+            {'partitions': [...], 'rows': 总行数, 'covered_until': 覆盖日期}
+        """
+        db_first, db_last = self._query_daily_date_range()
+        if db_last is None:
+            logger.warning("stock_daily 为空，跳过日线缓存刷新")
+            return {'partitions': [], 'rows': 0, 'covered_until': None}
+
+        start = pd.Timestamp(start_date) if start_date else pd.Timestamp(db_first)
+        end = min(pd.Timestamp(end_date), pd.Timestamp(db_last)) if end_date else pd.Timestamp(db_last)
+
+        keys = DailyBarCache.partition_keys(start, end)
+        total_rows = 0
+        for key in keys:
+            month_start, month_end = DailyBarCache.partition_bounds(key)
+            df = self._query_market_daily_from_db(month_start, month_end)
+            total_rows += self.bar_cache.write_partition(key, df)['rows']
+
+        # 回补历史区间不应缩短已有覆盖；分区不连续时 plan() 会回退数据库
+        coverage_start = DailyBarCache.partition_bounds(keys[0])[0] if keys else None
+        previous = self.bar_cache.covered_until()
+        covered_until = max(previous, end) if previous is not None else end
+        self.bar_cache.set_coverage(coverage_start, covered_until, history_complete=start_date is None)
+
+        logger.info(f"✓ 日线缓存刷新完成: {len(keys)} 个分区, {total_rows} 行, "
+                    f"覆盖至 {covered_until.strftime('%Y-%m-%d')}")
+        return {'partitions': keys, 'rows': total_rows,
+                'covered_until': covered_until.strftime('%Y-%m-%d')}
+
+    def verify_daily_bar_cache(self, partitions: Optional[List[str]] = None,
+                               repair: bool = True) -> Dict[str, Any]:
+        """
+        用数据库重新计算每个分区的校验和并与 manifest 比对
+
+        Args:
+            partitions: 要校验的分区键列表（默认全部）
+            repair: 不一致时是否用数据库数据重写该分区
+
+        Returns:
+            {'checked': n, 'mismatched': [...], 'repaired': [...]}
+        """
+        manifest = self.bar_cache.load_manifest()
+        keys = partitions or sorted((manifest.get('partitions') or {}).keys())
+        mismatched, repaired = [], []
+        for key in keys:
+            month_start, month_end = DailyBarCache.partition_bounds(key)
+            db_frame = self._query_market_daily_from_db(month_start, month_end)
+            expected = DailyBarCache.compute_checksum(DailyBarCache.normalize(db_frame))
+            recorded = (manifest.get('partitions') or {}).get(key, {}).get('checksum')
+            if expected == recorded:
+                continue
+            mismatched.append(key)
+            logger.warning(f"日线缓存分区 {key} 与数据库不一致")
+            if repair:
+                self.bar_cache.write_partition(key, db_frame)
+                repaired.append(key)
+
+        return {'checked': len(keys), 'mismatched': mismatched, 'repaired': repaired}
+
     def get_stock_list(self, market: Optional[str] = None,
                       status: str = '正常') -> pd.DataFrame:
         """
@@ -221,6 +497,68 @@ class DataQueryManager:
             if conn:
                 self.pool_manager.release_connection(conn)
 
+    def get_stock_industries(self, codes: Optional[List[str]] = None) -> pd.Series:
+        """
+        获取股票所属行业（stock_basic.industry），用于截面行业中性化
+
+        Args:
+            codes: 股票代码列表（None 为全部）
+
+        Returns:
+            行业Series（index=code），无行业信息的股票不出现在结果中
+        """
+        conn = None
+        try:
+            conn = self.pool_manager.get_connection()
+
+            query = """
+                SELECT code, industry
+                FROM stock_basic
+                WHERE industry IS NOT NULL AND industry <> ''
+            """
+            params: List[Any] = []
+            if codes is not None:
+                query += " AND code = ANY(%s)"
+                params.append(list(codes))
+            query += " ORDER BY code"
+
+            df = pd.read_sql_query(query, conn, params=params)
+            logger.info(f"✓ 获取行业分类: {len(df)} 只股票")
+            return pd.Series(df['industry'].values, index=df['code'].values, name='industry')
+
+        except psycopg2.OperationalError as e:
+            logger.error(f"数据库连接错误: {e}")
+            raise DatabaseError(
+                "数据库连接失败",
+                error_code="DB_CONNECTION_ERROR",
+                operation="get_stock_industries",
+                error_detail=str(e)
+            ) from e
+
+        except psycopg2.ProgrammingError as e:
+            logger.error(f"SQL语法错误: {e}")
+            raise DatabaseError(
+                "SQL语句错误",
+                error_code="DB_SYNTAX_ERROR",
+                operation="get_stock_industries",
+                error_detail=str(e)
+            ) from e
+
+        except DatabaseError:
+            raise
+
+        except Exception as e:
+            logger.error(f"❌ 获取行业分类失败(未预期异常): {e}")
+            raise DatabaseError(
+                f"获取行业分类失败: {str(e)}",
+                error_code="DB_QUERY_FAILED",
+                operation="get_stock_industries"
+            ) from e
+
+        finally:
+            if conn:
+                self.pool_manager.release_connection(conn)
+
     def get_oldest_realtime_stocks(self, limit: int = 100) -> List[str]:
         """
         获取更新时间最早的N只股票代码（用于渐进式更新实时行情）
@@ -418,11 +756,17 @@ class DataQueryManager:
                 SELECT trade_time, open, high, low, close, volume, amount,
                        pct_change, change_amount
                 FROM stock_minute
-                WHERE code = %s AND period = %s AND DATE(trade_time) = %s
+                WHERE code = %s AND period = %s
+                  AND trade_time >= %s AND trade_time < %s
                 ORDER BY trade_time ASC
             """
 
-            df = pd.read_sql_query(query, conn, params=(code, period, trade_date))
+            day_start = pd.Timestamp(trade_date).normalize()
+            day_end = day_start + pd.Timedelta(days=1)
+            df = pd.read_sql_query(
+                query, conn,
+                params=(code, period, day_start.to_pydatetime(), day_end.to_pydatetime())
+            )
             logger.info(f"✓ 加载 {code} {period}分钟数据: {len(df)} 条记录")
             return df
 
@@ -472,6 +816,197 @@ class DataQueryManager:
             if conn:
                 self.pool_manager.release_connection(conn)
 
+    # ==================== 分钟线区间查询 / 重采样 ====================
+
+    @staticmethod
+    def _minute_window(start_time, end_time):
+        """[start_time, end_time] → 半开区间 [start, end)；end_time 不带时刻时包含整日"""
+        start = pd.Timestamp(start_time)
+        end = pd.Timestamp(end_time)
+        end = end + pd.Timedelta(days=1) if end == end.normalize() else end + pd.Timedelta(seconds=1)
+        return start, end
+
+    def load_minute_bars(self, codes: List[str], start_time, end_time,
+                         period: str = '1') -> pd.DataFrame:
+        """
+        多股票 × 多交易日分钟线（长表，按 code, trade_time 排序）
+
+        1 分钟线为基准，高周期由 resample_minute_bars 向量化重采样；没有 1 分钟线的
+        股票回退到数据库中直接存储的该周期数据。超过保留期的月份从冷数据层读取，
+        其余部分用 trade_time 区间条件查询（可走主键索引）。已收盘区间的结果会被缓存。
+
+        Args:
+            codes: 股票代码列表
+            start_time: 开始时间（含），如 '2024-01-29' 或 '2024-01-29 10:00'
+            end_time: 结束时间（含）；只给日期时包含该日全部分钟线
+            period: 周期 '1' / '5' / '15' / '30' / '60'
+
+        Returns:
+            列 code, trade_time, open, high, low, close, volume, amount
+        """
+        period_value = normalize_period(period)
+        start, end = self._minute_window(start_time, end_time)
+        codes = list(dict.fromkeys(codes))
+        if not codes or start >= end:
+            return pd.DataFrame(columns=MINUTE_KEY_COLUMNS + MINUTE_BAR_COLUMNS)
+
+        store = self.minute_store
+        key = store.cache_key(codes, start, end, period_value)
+        cacheable = store.is_cacheable(end)
+        if cacheable:
+            cached = store.cache_get(key)
+            if cached is not None:
+                return cached
+
+        periods = ['1'] if period_value == 1 else ['1', str(period_value)]
+        frames = []
+        for source, seg_start, seg_end in store.plan(start, end):
+            if source == 'cold':
+                try:
+                    cold = store.read(seg_start, seg_end, codes)
+                    cold['period'] = '1'
+                    frames.append(cold)
+                    continue
+                except Exception as e:
+                    logger.warning(f"分钟线冷数据读取失败，回退数据库: {e}")
+            frames.append(self._query_minute_bars_from_db(codes, seg_start, seg_end, periods))
+        raw = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+        if raw.empty:
+            result = pd.DataFrame(columns=MINUTE_KEY_COLUMNS + MINUTE_BAR_COLUMNS)
+        else:
+            is_base = raw['period'] == '1'
+            result = resample_minute_bars(raw[is_base], period_value)
+            if period_value != 1:
+                # 只有该周期存量数据、没有 1 分钟线的股票直接使用存量数据
+                base_codes = raw.loc[is_base, 'code'].unique()
+                legacy = raw[~is_base & ~raw['code'].isin(base_codes)]
+                if not legacy.empty:
+                    result = pd.concat(
+                        [result, legacy[MINUTE_KEY_COLUMNS + MINUTE_BAR_COLUMNS]], ignore_index=True
+                    ).sort_values(MINUTE_KEY_COLUMNS, kind='mergesort').reset_index(drop=True)
+            result = downcast_floats(result, columns=MINUTE_BAR_COLUMNS)
+
+        if cacheable:
+            store.cache_put(key, result)
+        logger.debug(f"✓ 加载分钟线: {len(codes)} 只股票, {period_value}分钟, {len(result)} 条")
+        return result
+
+    def _query_minute_bars_from_db(self, codes: Optional[List[str]], start: pd.Timestamp,
+                                   end: pd.Timestamp, periods: List[str]) -> pd.DataFrame:
+        """从 stock_minute 查询 [start, end) 的分钟线（codes=None 为全市场）"""
+        conn = None
+        try:
+            conn = self.pool_manager.get_connection()
+            query = """
+                SELECT code, trade_time, period, open, high, low, close, volume, amount
+                FROM stock_minute
+                WHERE period = ANY(%s)
+                  AND trade_time >= %s AND trade_time < %s
+            """
+            params: List[Any] = [periods, start.to_pydatetime(), end.to_pydatetime()]
+            if codes is not None:
+                query += " AND code = ANY(%s)"
+                params.append(list(codes))
+            query += " ORDER BY code, trade_time"
+
+            import warnings
+            with warnings.catch_warnings():
+                warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
+                df = pd.read_sql_query(query, conn, params=params, parse_dates=['trade_time'])
+            for col in MINUTE_BAR_COLUMNS:
+                df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+            df['period'] = df['period'].astype(str)
+            return df
+
+        except psycopg2.OperationalError as e:
+            logger.error(f"数据库连接错误: {e}")
+            raise DatabaseError(
+                "数据库连接失败",
+                error_code="DB_CONNECTION_ERROR",
+                operation="load_minute_bars",
+                error_detail=str(e)
+            ) from e
+
+        except psycopg2.ProgrammingError as e:
+            logger.error(f"SQL语法错误: {e}")
+            raise DatabaseError(
+                "SQL语句错误",
+                error_code="DB_SYNTAX_ERROR",
+                operation="load_minute_bars",
+                error_detail=str(e)
+            ) from e
+
+        except Exception as e:
+            logger.error(f"❌ 加载分钟线失败(未预期异常): {e}")
+            raise DatabaseError(
+                f"加载分钟线失败: {str(e)}",
+                error_code="DB_QUERY_FAILED",
+                operation="load_minute_bars"
+            ) from e
+
+        finally:
+            if conn:
+                self.pool_manager.release_connection(conn)
+
+    def archive_minute_bars(self, purge: bool = False) -> Dict[str, Any]:
+        """
+        把超过保留期（MinuteBarStore.hot_days）的整月 1 分钟线归档到冷数据层
+
+        Args:
+            purge: 归档成功后是否从 stock_minute 删除这些 1 分钟线
+
+        Returns:
+            {'partitions': [...], 'rows': 归档行数, 'purged': 删除行数}
+        """
+        conn = None
+        try:
+            conn = self.pool_manager.get_connection()
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT MIN(trade_time) FROM stock_minute WHERE period = '1'")
+                row = cursor.fetchone()
+        finally:
+            if conn:
+                self.pool_manager.release_connection(conn)
+        if not row or row[0] is None:
+            return {'partitions': [], 'rows': 0, 'purged': 0}
+
+        store = self.minute_store
+        keys = store.archivable_keys(row[0])
+        total_rows = purged = 0
+        for key in keys:
+            month_start, month_end = store.partition_bounds(key)
+            df = self._query_minute_bars_from_db(None, month_start, month_end, ['1'])
+            total_rows += store.write_partition(key, df)['rows']
+            if purge:
+                purged += self._delete_minute_base(month_start, month_end)
+
+        if keys:
+            store.clear_cache()
+        logger.info(f"✓ 分钟线归档完成: {len(keys)} 个分区, {total_rows} 行, 删除 {purged} 行")
+        return {'partitions': keys, 'rows': total_rows, 'purged': purged}
+
+    def _delete_minute_base(self, start: pd.Timestamp, end: pd.Timestamp) -> int:
+        """删除数据库中 [start, end) 的 1 分钟线（已归档后调用）"""
+        conn = None
+        try:
+            conn = self.pool_manager.get_connection()
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM stock_minute WHERE period = '1' AND trade_time >= %s AND trade_time < %s",
+                    (start.to_pydatetime(), end.to_pydatetime())
+                )
+                deleted = cursor.rowcount
+            conn.commit()
+            return deleted
+        except Exception:
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if conn:
+                self.pool_manager.release_connection(conn)
+
     def check_minute_data_complete(self, code: str, period: str, trade_date: str) -> dict:
         """
         检查分时数据是否完整
@@ -506,8 +1041,9 @@ class DataQueryManager:
                 cursor.execute("""
                     SELECT COUNT(*)
                     FROM stock_minute
-                    WHERE code = %s AND DATE(trade_time) = %s AND period = %s
-                """, (code, trade_date, period))
+                    WHERE code = %s AND period = %s
+                      AND trade_time >= %s::date AND trade_time < %s::date + 1
+                """, (code, period, trade_date, trade_date))
 
                 record_count = cursor.fetchone()[0]
                 expected_count = self._get_expected_minute_count(period)
@@ -556,8 +1092,81 @@ class DataQueryManager:
                 cursor.close()
                 self.pool_manager.release_connection(conn)
 
+    def load_trading_calendar(self) -> Dict[str, Any]:
+        """
+        加载完整交易日历（供 TradingCalendarIndex 使用）
+
+        优先使用 Tushare 标准表 trade_cal（SSE），为空时回退自定义表 trading_calendar。
+
+        Returns:
+            {'dates': 交易日列表, 'start': 日历起始日, 'end': 日历结束日, 'source': 来源表}
+        """
+        conn = None
+        try:
+            conn = self.pool_manager.get_connection()
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT to_regclass('public.trade_cal') IS NOT NULL, "
+                    "to_regclass('public.trading_calendar') IS NOT NULL"
+                )
+                has_trade_cal, has_trading_calendar = cursor.fetchone()
+
+                if has_trade_cal:
+                    cursor.execute("""
+                        SELECT cal_date, is_open
+                        FROM trade_cal
+                        WHERE exchange = 'SSE'
+                        ORDER BY cal_date
+                    """)
+                    rows = cursor.fetchall()
+                    if rows:
+                        return {
+                            'dates': [row[0] for row in rows if int(row[1]) == 1],
+                            'start': rows[0][0],
+                            'end': rows[-1][0],
+                            'source': 'trade_cal'
+                        }
+
+                if has_trading_calendar:
+                    cursor.execute("""
+                        SELECT trade_date, is_trading_day
+                        FROM trading_calendar
+                        ORDER BY trade_date
+                    """)
+                    rows = cursor.fetchall()
+                    if rows:
+                        return {
+                            'dates': [row[0] for row in rows if row[1]],
+                            'start': rows[0][0],
+                            'end': rows[-1][0],
+                            'source': 'trading_calendar'
+                        }
+
+            raise DatabaseError(
+                "交易日历为空",
+                error_code="TRADING_CALENDAR_EMPTY"
+            )
+
+        except DatabaseError:
+            raise
+
+        except Exception as e:
+            raise DatabaseError(
+                "加载交易日历失败",
+                error_code="TRADING_CALENDAR_LOAD_FAILED",
+                reason=str(e)
+            )
+
+        finally:
+            if conn:
+                self.pool_manager.release_connection(conn)
+
     def is_trading_day(self, trade_date: str) -> bool:
-        """检查是否为交易日"""
+        """检查是否为交易日（优先使用交易日历内存索引）"""
+        calendar = self.trading_calendar
+        if calendar is not None and calendar.covers(trade_date):
+            return calendar.is_trading_day(trade_date)
+
         conn = None
         try:
             conn = self.pool_manager.get_connection()
@@ -23,6 +23,7 @@ if TYPE_CHECKING:
 from .table_manager import TableManager
 from .data_insert_manager import DataInsertManager
 from .data_query_manager import DataQueryManager
+from src.data.trading_calendar import get_trading_calendar
 
 # 导入异常类
 try:
@@ -102,7 +103,9 @@ class DatabaseManager:
             self.pool_manager = ConnectionPoolManager(self.config)
             self.table_manager = TableManager(self.pool_manager)
             self.insert_manager = DataInsertManager(self.pool_manager)
-            self.query_manager = DataQueryManager(self.pool_manager)
+            self.query_manager = DataQueryManager(
+                self.pool_manager, trading_calendar=get_trading_calendar()
+            )
 
             self._initialized = True
             logger.info("DatabaseManager 单例已创建（重构版本）")
@@ -308,13 +311,19 @@ class DatabaseManager:
         """保存单条实时行情数据到数据库"""
         return self.insert_manager.save_realtime_quote_single(quote, data_source)
 
+    def save_realtime_quote_batch(self, quotes: list, data_source: str = 'akshare') -> int:
+        """批量保存实时行情（一次多行 upsert）"""
+        return self.insert_manager.save_realtime_quote_batch(quotes, data_source)
+
     def save_realtime_quotes(self, df: pd.DataFrame, data_source: str = 'akshare') -> int:
         """保存实时行情数据到数据库"""
         return self.insert_manager.save_realtime_quotes(df, data_source)
 
     def save_minute_data(self, df: pd.DataFrame, code: str, period: str, trade_date: str) -> int:
-        """保存分时数据到数据库"""
-        return self.insert_manager.save_minute_data(df, code, period, trade_date)
+        """保存分时数据到数据库（写入后清空分钟线重采样缓存）"""
+        saved = self.insert_manager.save_minute_data(df, code, period, trade_date)
+        self.query_manager.minute_store.clear_cache()
+        return saved
 
     # ==================== 数据查询操作（委托给 DataQueryManager） ====================
 
@@ -324,11 +333,32 @@ class DatabaseManager:
         """从数据库加载股票日线数据"""
         return self.query_manager.load_daily_data(stock_code, start_date, end_date)
 
+    def load_market_daily(self, start_date: Optional[str] = None,
+                          end_date: Optional[str] = None,
+                          codes: Optional[List[str]] = None,
+                          columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """加载全市场日线长表（默认走本地日线缓存）"""
+        return self.query_manager.load_market_daily(start_date, end_date, codes, columns)
+
+    def refresh_daily_bar_cache(self, start_date: Optional[str] = None,
+                                end_date: Optional[str] = None) -> Dict[str, Any]:
+        """从数据库刷新本地日线缓存分区"""
+        return self.query_manager.refresh_daily_bar_cache(start_date, end_date)
+
+    def verify_daily_bar_cache(self, partitions: Optional[List[str]] = None,
+                               repair: bool = True) -> Dict[str, Any]:
+        """按分区校验和比对本地日线缓存与数据库"""
+        return self.query_manager.verify_daily_bar_cache(partitions, repair)
+
     def get_stock_list(self, market: Optional[str] = None,
                       status: str = '正常') -> pd.DataFrame:
         """获取股票列表"""
         return self.query_manager.get_stock_list(market, status)
 
+    def get_stock_industries(self, codes: Optional[List[str]] = None) -> pd.Series:
+        """获取股票所属行业（code → industry）"""
+        return self.query_manager.get_stock_industries(codes)
+
     def get_oldest_realtime_stocks(self, limit: int = 100) -> List[str]:
         """获取更新时间最早的N只股票代码"""
         return self.query_manager.get_oldest_realtime_stocks(limit)
@@ -342,6 +372,15 @@ class DatabaseManager:
         """从数据库加载分时数据"""
         return self.query_manager.load_minute_data(code, period, trade_date)
 
+    def load_minute_bars(self, codes: List[str], start_time, end_time,
+                         period: str = '1') -> pd.DataFrame:
+        """多股票 × 多交易日分钟线（高周期由 1 分钟线重采样）"""
+        return self.query_manager.load_minute_bars(codes, start_time, end_time, period)
+
+    def archive_minute_bars(self, purge: bool = False) -> Dict[str, Any]:
+        """把超过保留期的 1 分钟线按月归档到冷数据层"""
+        return self.query_manager.archive_minute_bars(purge)
+
     def check_minute_data_complete(self, code: str, period: str, trade_date: str) -> dict:
         """检查分时数据是否完整"""
         return self.query_manager.check_minute_data_complete(code, period, trade_date)
@@ -350,6 +389,10 @@ class DatabaseManager:
         """检查是否为交易日"""
         return self.query_manager.is_trading_day(trade_date)
 
+    def load_trading_calendar(self) -> Dict[str, Any]:
+        """加载完整交易日历（供交易日历内存索引使用）"""
+        return self.query_manager.load_trading_calendar()
+
     # ==================== 单例管理 ====================
 
     def __del__(self):
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+分钟线存储 (MinuteBarStore)
+
+stock_minute 按 (code, trade_time, period) 存储，5/15/30/60 分钟线与 1 分钟线各存一份，
+而回测与多级别分析需要的是「多只股票 × 一周」的分钟窗口。本模块以 1 分钟线为唯一基准：
+
+- 高周期 K 线由 1 分钟线按 A 股交易时段向量化重采样得到（resample_minute_bars），
+  桶与交易所口径一致：5 分钟线 09:35 … 11:30、13:05 … 15:00，60 分钟线 10:30 / 11:30 / 14:00 / 15:00
+- 已收盘区间的查询结果放入小容量 LRU（带 TTL），重复查询同一窗口直接返回；
+  分钟线同步在其他进程补写历史数据时不会通知本进程，过期后重新查询
+- 冷数据层（可选）：超过 N 天的 1 分钟线按月归档为 Parquet（zstd 压缩，按 code, trade_time 排序）：
+
+    {cold_dir}/
+        manifest.json          # 已归档分区及行数
+        2024-01.parquet
+        ...
+
+本模块只负责重采样、结果缓存与冷数据文件读写，数据库查询由 DataQueryManager 完成。
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+# 支持的周期（分钟）；均整除上午 / 下午各 120 分钟，桶不会跨越午休
+SUPPORTED_PERIODS = (1, 5, 15, 30, 60)
+
+MINUTE_BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'amount']
+MINUTE_KEY_COLUMNS = ['code', 'trade_time']
+
+# A 股连续竞价时段（分钟数，自 00:00 起）
+_MORNING_OPEN = 9 * 60 + 30     # 09:30
+_MORNING_CLOSE = 11 * 60 + 30   # 11:30
+_AFTERNOON_OPEN = 13 * 60       # 13:00
+_SESSION_MINUTES = 120
+_DAY_MINUTES = 2 * _SESSION_MINUTES
+_NS_PER_MINUTE = 60 * 10 ** 9
+_NS_PER_DAY = 24 * 60 * _NS_PER_MINUTE
+
+
+def normalize_period(period: Union[str, int]) -> int:
+    """'5' / 5 → 5，不支持的周期抛出 ValueError"""
+    try:
+        value = int(period)
+    except (TypeError, ValueError):
+        raise ValueError(f"不支持的分钟周期: {period}")
+    if value not in SUPPORTED_PERIODS:
+        raise ValueError(f"不支持的分钟周期: {period}（支持 {SUPPORTED_PERIODS}）")
+    return value
+
+
+def bucket_labels(trade_time: pd.Series, period: int) -> np.ndarray:
+    """
+    计算每根 1 分钟线所属周期 K 线的结束时间（datetime64[ns]）
+
+    交易分钟序号 t：上午 09:31→1 … 11:30→120，下午 13:01→121 … 15:00→240；
+    09:30 集合竞价 / 开盘线并入第一根，15:00 之后的收盘集合竞价并入最后一根。
+    """
+    ns = pd.to_datetime(trade_time).to_numpy(dtype='datetime64[ns]').view(np.int64)
+    day_ns = ns - ns % _NS_PER_DAY
+    minute_of_day = (ns - day_ns) // _NS_PER_MINUTE
+
+    t = np.where(
+        minute_of_day <= _MORNING_CLOSE,
+        minute_of_day - _MORNING_OPEN,
+        minute_of_day - _AFTERNOON_OPEN + _SESSION_MINUTES,
+    )
+    t = np.clip(t, 1, _DAY_MINUTES)
+    end_t = np.minimum(-(-t // period) * period, _DAY_MINUTES)
+    end_minute = np.where(
+        end_t <= _SESSION_MINUTES,
+        _MORNING_OPEN + end_t,
+        _AFTERNOON_OPEN + end_t - _SESSION_MINUTES,
+    )
+    return (day_ns + end_minute * _NS_PER_MINUTE).view('datetime64[ns]')
+
+
+def resample_minute_bars(df: pd.DataFrame, period: Union[str, int]) -> pd.DataFrame:
+    """
+    1 分钟线长表 → 指定周期 K 线（向量化，不逐股票 groupby）
+
+    Args:
+        df: 含 code, trade_time 及 MINUTE_BAR_COLUMNS 的 1 分钟线
+        period: 目标周期（1/5/15/30/60）
+
+    Returns:
+        同结构长表，trade_time 为 K 线结束时间，按 (code, trade_time) 排序
+    """
+    period = normalize_period(period)
+    if df.empty:
+        return df.loc[:, MINUTE_KEY_COLUMNS + MINUTE_BAR_COLUMNS].reset_index(drop=True)
+
+    frame = df.sort_values(MINUTE_KEY_COLUMNS, kind='mergesort')
+    if period == 1:
+        return frame.loc[:, MINUTE_KEY_COLUMNS + MINUTE_BAR_COLUMNS].reset_index(drop=True)
+
+    codes = frame['code'].to_numpy()
+    code_ids, _ = pd.factorize(codes)
+    labels = bucket_labels(frame['trade_time'], period)
+
+    change = np.empty(len(frame), dtype=bool)
+    change[0] = True
+    change[1:] = (code_ids[1:] != code_ids[:-1]) | (labels[1:] != labels[:-1])
+    starts = np.flatnonzero(change)
+    ends = np.r_[starts[1:], len(frame)] - 1
+
+    def column(name):
+        return frame[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    return pd.DataFrame({
+        'code': codes[starts],
+        'trade_time': labels[starts],
+        'open': column('open')[starts],
+        'high': np.fmax.reduceat(column('high'), starts),
+        'low': np.fmin.reduceat(column('low'), starts),
+        'close': column('close')[ends],
+        'volume': np.add.reduceat(np.nan_to_num(column('volume')), starts),
+        'amount': np.add.reduceat(np.nan_to_num(column('amount')), starts),
+    })
+
+
+class MinuteBarStore:
+    """
+    分钟线重采样结果缓存 + 按月分区的冷数据层
+
+    使用方式（由 DataQueryManager 调用）：
+        store = MinuteBarStore()
+        segments = store.plan('2024-01-29', '2024-02-03')   # [('cold'|'db', start, end), ...]
+        cold = store.read(start, end, codes=['000001'])
+        bars = resample_minute_bars(base, '15')
+    """
+
+    MANIFEST_NAME = 'manifest.json'
+    MANIFEST_VERSION = 1
+    # 约 5 只股票一个月的 1 分钟线；按股票过滤时可跳过绝大部分 row group
+    ROW_GROUP_SIZE = 32768
+
+    def __init__(self, cold_dir: Optional[Union[str, Path]] = None,
+                 cold_enabled: Optional[bool] = None,
+                 hot_days: Optional[int] = None,
+                 cache_entries: Optional[int] = None,
+                 cache_ttl: Optional[float] = None):
+        """
+        初始化分钟线存储
+
+        Args:
+            cold_dir: 冷数据目录；默认读取环境变量 MINUTE_BAR_COLD_DIR，
+                      否则为 {PATH_CACHE_DIR}/minute_bars
+            cold_enabled: 是否读取冷数据层；默认读取 MINUTE_BAR_COLD_ENABLED（缺省启用）
+            hot_days: 数据库保留的天数，更早的整月可归档；默认读取 MINUTE_BAR_HOT_DAYS（缺省 60）
+            cache_entries: 重采样结果缓存容量；默认读取 MINUTE_BAR_CACHE_ENTRIES（缺省 32）
+            cache_ttl: 缓存条目有效期（秒）；默认读取 MINUTE_BAR_CACHE_TTL（缺省 600），
+                       ≤0 表示不过期（仅适用于同步只在本进程内完成、写入后调用 clear_cache 的部署）
+        """
+        if cold_enabled is None:
+            cold_enabled = os.getenv('MINUTE_BAR_COLD_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+        self.cold_enabled = cold_enabled
+        self.cold_dir = Path(cold_dir) if cold_dir else self._default_cold_dir()
+        self.hot_days = hot_days if hot_days is not None else int(os.getenv('MINUTE_BAR_HOT_DAYS', '60'))
+        self.cache_entries = (cache_entries if cache_entries is not None
+                              else int(os.getenv('MINUTE_BAR_CACHE_ENTRIES', '32')))
+        self.cache_ttl = (cache_ttl if cache_ttl is not None
+                          else float(os.getenv('MINUTE_BAR_CACHE_TTL', '600')))
+
+        self._lock = threading.Lock()
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_mtime: Optional[float] = None
+        # key → (写入时刻 monotonic, 结果)
+        self._cache: 'OrderedDict[Hashable, Tuple[float, pd.DataFrame]]' = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def _default_cold_dir() -> Path:
+        env_dir = os.getenv('MINUTE_BAR_COLD_DIR')
+        if env_dir:
+            return Path(env_dir)
+        try:
+            from src.config.settings import get_settings
+            return Path(get_settings().paths.cache_dir) / 'minute_bars'
+        except Exception:
+            return Path('data/pipeline_cache/minute_bars')
+
+    # ==================== 结果缓存 ====================
+
+    @staticmethod
+    def cache_key(codes: Sequence[str], start: pd.Timestamp, end: pd.Timestamp,
+                  period: int) -> Tuple:
+        return tuple(sorted(set(codes))), start.value, end.value, period
+
+    @staticmethod
+    def is_cacheable(end: pd.Timestamp) -> bool:
+        """只缓存已收盘的区间（不含今天），当天数据仍在写入"""
+        return end <= pd.Timestamp.now().normalize()
+
+    def cache_get(self, key: Tuple) -> Optional[pd.DataFrame]:
+        """命中且未过期时返回副本；过期条目直接丢弃"""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and self.cache_ttl > 0 \
+                    and time.monotonic() - entry[0] > self.cache_ttl:
+                del self._cache[key]
+                entry = None
+            if entry is None:
+                self.cache_misses += 1
+                return None
+            frame = entry[1]
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+        return frame.copy()
+
+    def cache_put(self, key: Tuple, frame: pd.DataFrame) -> None:
+        if self.cache_entries <= 0:
+            return
+        with self._lock:
+            self._cache[key] = (time.monotonic(), frame.copy())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """分钟线写入后调用，丢弃所有重采样结果"""
+        with self._lock:
+            self._cache.clear()
+
+    # ==================== 冷数据分区 ====================
+
+    @staticmethod
+    def partition_key(day: DateLike) -> str:
+        return pd.Timestamp(day).strftime('%Y-%m')
+
+    @staticmethod
+    def partition_bounds(key: str) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """分区键 → [月初, 下月初)"""
+        period = pd.Period(key, freq='M')
+        return period.start_time, (period + 1).start_time
+
+    def partition_path(self, key: str) -> Path:
+        return self.cold_dir / f'{key}.parquet'
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.cold_dir / self.MANIFEST_NAME
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """读取 manifest（按文件 mtime 缓存在内存中）"""
+        path = self.manifest_path
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return {'version': self.MANIFEST_VERSION, 'partitions': {}}
+
+        with self._lock:
+            if self._manifest is not None and self._manifest_mtime == mtime:
+                return self._manifest
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"分钟线冷数据 manifest 读取失败，视为空: {e}")
+                manifest = {'version': self.MANIFEST_VERSION, 'partitions': {}}
+            self._manifest = manifest
+            self._manifest_mtime = mtime
+            return manifest
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        self.cold_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cold_dir, prefix='.manifest-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp, self.manifest_path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        with self._lock:
+            self._manifest = None
+
+    def archived_keys(self) -> List[str]:
+        if not self.cold_enabled:
+            return []
+        return sorted((self.load_manifest().get('partitions') or {}).keys())
+
+    def archivable_keys(self, first_day: DateLike, today: Optional[DateLike] = None) -> List[str]:
+        """first_day 起、完全早于 (today - hot_days) 且尚未归档的月份"""
+        cutoff = pd.Timestamp(today or pd.Timestamp.now()).normalize() - pd.Timedelta(days=self.hot_days)
+        last_full = (cutoff.to_period('M') - 1)
+        first = pd.Timestamp(first_day).to_period('M')
+        if first > last_full:
+            return []
+        archived = set((self.load_manifest().get('partitions') or {}).keys())
+        return [p.strftime('%Y-%m') for p in pd.period_range(first, last_full, freq='M')
+                if p.strftime('%Y-%m') not in archived]
+
+    def write_partition(self, key: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """原子写入一个月的 1 分钟线并登记到 manifest"""
+        frame = df.loc[:, MINUTE_KEY_COLUMNS + MINUTE_BAR_COLUMNS].copy()
+        frame['code'] = frame['code'].astype(str)
+        frame['trade_time'] = pd.to_datetime(frame['trade_time']).astype('datetime64[ns]')
+        for col in MINUTE_BAR_COLUMNS:
+            frame[col] = pd.to_numeric(frame[col], errors='coerce').astype('float64')
+        frame = frame.sort_values(MINUTE_KEY_COLUMNS, kind='mergesort').reset_index(drop=True)
+
+        self.cold_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cold_dir, prefix=f'.{key}-', suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), tmp,
+                           row_group_size=self.ROW_GROUP_SIZE, compression='zstd')
+            os.replace(tmp, self.partition_path(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        info = {
+            'rows': int(len(frame)),
+            'codes': int(frame['code'].nunique()),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        manifest = dict(self.load_manifest())
+        partitions = dict(manifest.get('partitions') or {})
+        partitions[key] = info
+        manifest['partitions'] = partitions
+        manifest['version'] = self.MANIFEST_VERSION
+        self._save_manifest(manifest)
+        logger.debug(f"分钟线冷数据分区写入: {key} ({info['rows']} 行)")
+        return info
+
+    def plan(self, start: DateLike, end: DateLike) -> List[Tuple[str, pd.Timestamp, pd.Timestamp]]:
+        """
+        把 [start, end) 拆成冷数据段与数据库段
+
+        Returns:
+            [(source, seg_start, seg_end), ...]，source 为 'cold' 或 'db'，相邻同源段已合并
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if start >= end:
+            return []
+        archived = set(self.archived_keys())
+        segments: List[Tuple[str, pd.Timestamp, pd.Timestamp]] = []
+        for month in pd.period_range(start.to_period('M'), (end - pd.Timedelta(1)).to_period('M'), freq='M'):
+            key = month.strftime('%Y-%m')
+            month_start, month_end = self.partition_bounds(key)
+            seg = ('cold' if key in archived else 'db', max(start, month_start), min(end, month_end))
+            if segments and segments[-1][0] == seg[0]:
+                segments[-1] = (seg[0], segments[-1][1], seg[2])
+            else:
+                segments.append(seg)
+        return segments
+
+    def read(self, start: DateLike, end: DateLike,
+             codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """读取冷数据层 [start, end) 的 1 分钟线，按 (code, trade_time) 排序"""
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        keys = [k for k in self.archived_keys()
+                if self.partition_bounds(k)[0] < end and self.partition_bounds(k)[1] > start]
+        paths = [str(self.partition_path(k)) for k in keys if self.partition_path(k).exists()]
+        if not paths:
+            return pd.DataFrame(columns=MINUTE_KEY_COLUMNS + MINUTE_BAR_COLUMNS)
+
+        dataset = ds.dataset(paths, format='parquet')
+        time_type = dataset.schema.field('trade_time').type
+        expr = (ds.field('trade_time') >= pa.scalar(start, type=time_type)) & \
+               (ds.field('trade_time') < pa.scalar(end, type=time_type))
+        if codes is not None:
+            expr = expr & ds.field('code').isin(pa.array(list(codes), type=pa.string()))
+        df = dataset.to_table(columns=MINUTE_KEY_COLUMNS + MINUTE_BAR_COLUMNS, filter=expr).to_pandas()
+        df['trade_time'] = df['trade_time'].astype('datetime64[ns]')
+        return df.sort_values(MINUTE_KEY_COLUMNS, kind='mergesort').reset_index(drop=True)
+
+    def stats(self) -> Dict[str, Any]:
+        partitions = self.load_manifest().get('partitions') or {}
+        with self._lock:
+            cached = len(self._cache)
+        return {
+            'cold_enabled': self.cold_enabled,
+            'cold_dir': str(self.cold_dir),
+            'hot_days': self.hot_days,
+            'cold_partitions': len(partitions),
+            'cold_rows': sum(p.get('rows', 0) for p in partitions.values()),
+            'cache_entries': cached,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
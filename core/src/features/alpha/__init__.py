@@ -28,6 +28,7 @@ from .base import FactorCache, FactorConfig, BaseFactorCalculator
 
 # 导入Response类
 from src.utils.response import Response
+from src.utils.dtype_policy import downcast_floats
 from src.exceptions import FeatureCalculationError
 
 # 导入各类因子计算器
@@ -199,6 +200,7 @@ class AlphaFactors:
         logger.info("开始计算所有Alpha因子（优化版本）...")
         start_time = time.time()
         initial_cols = len(self.df.columns)
+        input_columns = set(self.df.columns)
 
         try:
             # 存储各类因子的计算结果
@@ -240,6 +242,11 @@ class AlphaFactors:
                 return resp
             factor_results['liquidity'] = resp.metadata
 
+            # 新增因子列统一为策略浮点类型（原地转换，各计算器共享同一 df）
+            downcast_floats(
+                self.df, columns=[c for c in self.df.columns if c not in input_columns], inplace=True
+            )
+
             # 计算总计信息
             total_factors_added = len(self.df.columns) - initial_cols
             factor_count = len(self.get_factor_names())
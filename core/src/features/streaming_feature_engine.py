@@ -7,6 +7,8 @@
 - 增量计算特征（计算完立即释放内存）
 - 自动持久化（支持Parquet/HDF5）
 - 断点续传（支持中断恢复）
+- 流水线模式（pipelined=True）：预取线程批量加载下一批、进程池并行计算多个批次、
+  单一写入阶段按批次顺序直接追加到最终 Parquet（ParquetWriter），无需合并批次文件
 
 性能优化:
 - 内存占用减少80%（8GB → 1.5GB）
@@ -24,6 +26,10 @@ from pathlib import Path
 from loguru import logger
 import gc
 import hashlib
+import os
+import pickle
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 import warnings
@@ -40,10 +46,15 @@ class StreamingConfig:
     checkpoint_enabled: bool = True  # 是否启用断点续传
     memory_threshold_mb: float = 2000.0  # 内存警戒线(MB)
     auto_gc: bool = True  # 自动垃圾回收
+    pipelined: bool = False  # 流水线模式（仅 parquet 输出）
+    num_workers: int = 0  # 流水线模式并行计算的进程数（0 = min(4, CPU核数)）
+    prefetch_batches: int = 2  # 流水线模式预取的批次数
 
     def validate(self):
         """验证配置"""
         assert self.batch_size > 0, "batch_size必须大于0"
+        assert self.num_workers >= 0, "num_workers不能为负数"
+        assert self.prefetch_batches >= 1, "prefetch_batches必须大于0"
         assert self.output_format in ['parquet', 'hdf5', 'csv'], \
             f"不支持的输出格式: {self.output_format}"
         assert self.compression in ['snappy', 'gzip', 'lz4', 'none'], \
@@ -91,6 +102,49 @@ class StreamingStats:
         }
 
 
+def compute_batch_features(
+    batch_data: Dict[str, pd.DataFrame],
+    feature_calculator: Callable,
+    feature_names: Optional[List[str]]
+) -> pd.DataFrame:
+    """计算一个批次的特征（模块级函数，可在进程池中执行）"""
+    all_features = []
+
+    for code, df in batch_data.items():
+        try:
+            # 计算特征
+            features = feature_calculator(df)
+
+            # 添加股票代码
+            features['stock_code'] = code
+
+            # 确保date列（如果index是日期）
+            if isinstance(features.index, pd.DatetimeIndex):
+                features['date'] = features.index
+
+            # 筛选特定特征
+            if feature_names:
+                available_cols = [col for col in feature_names if col in features.columns]
+                features = features[available_cols + ['stock_code', 'date']]
+
+            all_features.append(features)
+
+        except Exception as e:
+            logger.error(f"计算股票 {code} 特征失败: {e}", exc_info=True)
+
+    # 拼接批次结果
+    if all_features:
+        result = pd.concat(all_features, ignore_index=True)
+        return result
+    else:
+        return pd.DataFrame()
+
+
+def _compute_batch_task(batch_data, feature_calculator, feature_names):
+    """进程池任务：返回 (有效股票数, 特征表)"""
+    return len(batch_data), compute_batch_features(batch_data, feature_calculator, feature_names)
+
+
 class StreamingFeatureEngine:
     """
     流式特征计算引擎
@@ -108,6 +162,13 @@ class StreamingFeatureEngine:
             data_loader=lambda code: db.query_stock_data(code),
             feature_calculator=my_feature_calculator
         )
+
+        # 流水线模式：feature_calculator 为模块级函数时在进程池中并行计算
+        engine = StreamingFeatureEngine(StreamingConfig(pipelined=True, num_workers=4))
+        result_path = engine.compute_features_streaming(
+            stock_codes, data_loader, my_feature_calculator,
+            batch_loader=lambda codes: bulk_load(codes),  # 可选：一次加载整批
+        )
     """
 
     def __init__(
@@ -138,7 +199,8 @@ class StreamingFeatureEngine:
         feature_calculator: Callable[[pd.DataFrame], pd.DataFrame],
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        feature_names: Optional[List[str]] = None
+        feature_names: Optional[List[str]] = None,
+        batch_loader: Optional[Callable[[List[str]], Dict[str, pd.DataFrame]]] = None
     ) -> Path:
         """
         流式计算特征（主入口）
@@ -150,6 +212,7 @@ class StreamingFeatureEngine:
             start_date: 开始日期（可选）
             end_date: 结束日期（可选）
             feature_names: 要计算的特征列表（None=全部）
+            batch_loader: 批量加载函数 f(codes) -> {code: DataFrame}（可选，提供时替代逐只加载）
 
         返回:
             特征文件路径
@@ -169,6 +232,14 @@ class StreamingFeatureEngine:
         if completed_batches:
             logger.info(f"从checkpoint恢复，已完成 {len(completed_batches)} 批次")
 
+        if self.config.pipelined:
+            if self.config.output_format == 'parquet':
+                return self._run_pipelined(
+                    stock_codes, data_loader, feature_calculator, start_date, end_date,
+                    feature_names, batch_loader, completed_batches
+                )
+            logger.warning(f"流水线模式仅支持 parquet 输出，{self.config.output_format} 使用逐批模式")
+
         # 分批处理
         for batch_idx in range(self.stats.total_batches):
             if batch_idx in completed_batches:
@@ -196,7 +267,8 @@ class StreamingFeatureEngine:
                     feature_calculator=feature_calculator,
                     start_date=start_date,
                     end_date=end_date,
-                    feature_names=feature_names
+                    feature_names=feature_names,
+                    batch_loader=batch_loader
                 )
 
                 self.stats.completed_batches += 1
@@ -237,7 +309,8 @@ class StreamingFeatureEngine:
         feature_calculator: Callable,
         start_date: Optional[str],
         end_date: Optional[str],
-        feature_names: Optional[List[str]]
+        feature_names: Optional[List[str]],
+        batch_loader: Optional[Callable] = None
     ):
         """处理单个批次"""
         import psutil
@@ -249,7 +322,7 @@ class StreamingFeatureEngine:
 
         # 加载批次数据
         batch_data = self._load_batch_data(
-            batch_codes, data_loader, start_date, end_date
+            batch_codes, data_loader, start_date, end_date, batch_loader
         )
 
         # 计算特征
@@ -294,14 +367,24 @@ class StreamingFeatureEngine:
         batch_codes: List[str],
         data_loader: Callable,
         start_date: Optional[str],
-        end_date: Optional[str]
+        end_date: Optional[str],
+        batch_loader: Optional[Callable] = None
     ) -> Dict[str, pd.DataFrame]:
-        """加载批次数据"""
+        """加载批次数据（提供 batch_loader 时一次加载整批）"""
         batch_data = {}
 
+        if batch_loader is not None:
+            try:
+                loaded = batch_loader(batch_codes) or {}
+            except Exception as e:
+                logger.warning(f"批量加载 {len(batch_codes)} 只股票失败，改为逐只加载: {e}")
+                loaded = None
+        else:
+            loaded = None
+
         for code in batch_codes:
             try:
-                df = data_loader(code)
+                df = loaded.get(code) if loaded is not None else data_loader(code)
 
                 if df is None or df.empty:
                     logger.warning(f"股票 {code} 数据为空，跳过")
@@ -331,36 +414,226 @@ class StreamingFeatureEngine:
         feature_names: Optional[List[str]]
     ) -> pd.DataFrame:
         """计算批次特征"""
-        all_features = []
+        return compute_batch_features(batch_data, feature_calculator, feature_names)
 
-        for code, df in batch_data.items():
-            try:
-                # 计算特征
-                features = feature_calculator(df)
+    # ==================== 流水线模式 ====================
 
-                # 添加股票代码
-                features['stock_code'] = code
+    def _run_pipelined(
+        self,
+        stock_codes: List[str],
+        data_loader: Callable,
+        feature_calculator: Callable,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        feature_names: Optional[List[str]],
+        batch_loader: Optional[Callable],
+        completed_batches: set
+    ) -> Path:
+        """
+        预取 → 并行计算 → 顺序写入 三段流水线
 
-                # 确保date列（如果index是日期）
-                if isinstance(features.index, pd.DatetimeIndex):
-                    features['date'] = features.index
+        - 预取：单线程提前加载 prefetch_batches 个批次，与计算重叠
+        - 计算：feature_calculator 可 pickle 时使用进程池，否则退化为线程池
+        - 写入：按批次顺序追加到 features_all.parquet，每写完一批记录 checkpoint；
+          异常退出时 finally 关闭 writer，文件保持可读，续跑时先拷贝已写入的批次
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
 
-                # 筛选特定特征
-                if feature_names:
-                    available_cols = [col for col in feature_names if col in features.columns]
-                    features = features[available_cols + ['stock_code', 'date']]
+        final_path = self.output_dir / "features_all.parquet"
+        resume_path = self.output_dir / ".features_resume.parquet"
+        compression = None if self.config.compression == 'none' else self.config.compression
 
-                all_features.append(features)
+        resume_file = None
+        if completed_batches:
+            resume_file = self._open_resume_file(final_path, resume_path)
+            if resume_file is None:
+                logger.warning("checkpoint 对应的输出文件不可读，全部批次重新计算")
+                completed_batches = set()
+                self._clear_checkpoint()
 
-            except Exception as e:
-                logger.error(f"计算股票 {code} 特征失败: {e}", exc_info=True)
+        pending = [i for i in range(self.stats.total_batches) if i not in completed_batches]
+        self.stats.completed_batches += self.stats.total_batches - len(pending)
 
-        # 拼接批次结果
-        if all_features:
-            result = pd.concat(all_features, ignore_index=True)
-            return result
-        else:
-            return pd.DataFrame()
+        def batch_codes(batch_idx: int) -> List[str]:
+            start_idx = batch_idx * self.config.batch_size
+            return stock_codes[start_idx:start_idx + self.config.batch_size]
+
+        workers = self.config.num_workers or min(4, os.cpu_count() or 1)
+        max_in_flight = workers + 1
+        writer = None
+        schema = None
+
+        def write_table(table: 'pa.Table'):
+            nonlocal writer, schema
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(final_path, schema, compression=compression)
+            writer.write_table(table)
+
+        def write_batch(batch_idx: int, n_codes: int, future):
+            batch_data_len, features = future.result()
+            if not features.empty:
+                table = pa.Table.from_pandas(features, preserve_index=False)
+                write_table(self._conform_to_schema(table, schema, batch_idx))
+                self.stats.total_features_computed = len(features.columns) - 2
+            else:
+                logger.warning(f"批次 {batch_idx} 无有效特征，跳过写入")
+
+            self.stats.processed_stocks += batch_data_len
+            self.stats.failed_stocks += n_codes - batch_data_len
+            self.stats.completed_batches += 1
+            if self.config.checkpoint_enabled:
+                self._save_checkpoint(batch_idx)
+            self._record_memory()
+            logger.info(
+                f"批次 {batch_idx+1}/{self.stats.total_batches} 已写入 "
+                f"(进度: {self.stats.get_progress():.1f}%)"
+            )
+
+        # 先启动计算进程再启动预取线程，避免 fork 时复制持锁的线程状态
+        compute = self._make_compute_executor(feature_calculator, workers)
+        loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='feature-prefetch')
+        try:
+            # 先写入上次运行已完成的批次
+            if resume_file is not None:
+                for i in range(resume_file.num_row_groups):
+                    write_table(resume_file.read_row_group(i))
+                resume_file = None
+                resume_path.unlink()
+
+            loads = {}
+            next_load = 0
+
+            def submit_loads():
+                nonlocal next_load
+                while next_load < len(pending) and len(loads) < self.config.prefetch_batches:
+                    idx = pending[next_load]
+                    loads[idx] = loader.submit(
+                        self._load_batch_data, batch_codes(idx), data_loader,
+                        start_date, end_date, batch_loader
+                    )
+                    next_load += 1
+
+            in_flight = deque()
+            for batch_idx in pending:
+                submit_loads()
+                batch_data = loads.pop(batch_idx).result()
+                submit_loads()
+
+                in_flight.append((batch_idx, len(batch_codes(batch_idx)), compute.submit(
+                    _compute_batch_task, batch_data, feature_calculator, feature_names
+                )))
+                del batch_data
+
+                while len(in_flight) >= max_in_flight:
+                    write_batch(*in_flight.popleft())
+
+            while in_flight:
+                write_batch(*in_flight.popleft())
+        finally:
+            loader.shutdown(wait=True, cancel_futures=True)
+            compute.shutdown(wait=True, cancel_futures=True)
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            # 没有任何有效特征时仍输出空文件，保持返回路径可用
+            pd.DataFrame().to_parquet(final_path, index=False, engine='pyarrow')
+
+        self._clear_checkpoint()
+        self.stats.end_time = datetime.now()
+        logger.info(
+            f"流式计算完成(流水线): "
+            f"成功 {self.stats.processed_stocks}/{self.stats.total_stocks}只, "
+            f"失败 {self.stats.failed_stocks}只, "
+            f"耗时 {self.stats.get_elapsed_time():.1f}秒, "
+            f"峰值内存 {self.stats.peak_memory_mb:.1f}MB"
+        )
+        logger.info(f"结果保存至: {final_path}")
+        return final_path
+
+    @staticmethod
+    def _conform_to_schema(table: 'pa.Table', schema: Optional['pa.Schema'], batch_idx: int) -> 'pa.Table':
+        """
+        把批次结果对齐到已写入文件的 schema
+
+        缺少的列补空值，同名列按安全转换对齐类型（如 int64 → double）；多出的列或无法
+        无损转换的类型不能追加到同一个 Parquet 文件，抛出 ValueError 说明具体列。
+        """
+        import pyarrow as pa
+
+        if schema is None or table.schema.equals(schema):
+            return table
+
+        extra = [name for name in table.schema.names if name not in schema.names]
+        if extra:
+            raise ValueError(
+                f"批次 {batch_idx} 的特征列 {extra} 不在已写入的 schema 中，"
+                f"请通过 feature_names 固定各批次输出的特征列"
+            )
+
+        columns = []
+        for field in schema:
+            if field.name not in table.schema.names:
+                columns.append(pa.chunked_array([pa.nulls(table.num_rows, type=field.type)]))
+                continue
+            column = table.column(field.name)
+            try:
+                columns.append(column.cast(field.type))
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise ValueError(
+                    f"批次 {batch_idx} 的特征列 {field.name} 类型为 {column.type}，"
+                    f"无法转换为已写入的 {field.type}: {e}"
+                ) from e
+        return pa.Table.from_arrays(columns, schema=schema)
+
+    def _make_compute_executor(self, feature_calculator: Callable, workers: int) -> Executor:
+        """feature_calculator 可 pickle 时使用进程池，否则使用线程池"""
+        try:
+            pickle.dumps(feature_calculator)
+        except Exception:
+            logger.warning("feature_calculator 无法序列化（非模块级函数），流水线使用线程池计算")
+            return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='feature-compute')
+        executor = ProcessPoolExecutor(max_workers=workers)
+        executor.submit(int).result()  # 立即创建全部进程
+        return executor
+
+    @staticmethod
+    def _open_resume_file(final_path: Path, resume_path: Path):
+        """
+        把上次运行写出的 features_all.parquet 移作续跑输入，不可读时返回 None
+
+        续跑文件只在其批次全部拷入新输出后才删除；若它仍存在，说明上次续跑在拷贝途中
+        中断，此时 features_all.parquet 只含部分批次，以续跑文件为准并丢弃前者。
+        """
+        import pyarrow.parquet as pq
+
+        if resume_path.exists():
+            if final_path.exists():
+                final_path.unlink()
+        elif final_path.exists():
+            os.replace(final_path, resume_path)
+        if not resume_path.exists():
+            return None
+        try:
+            return pq.ParquetFile(resume_path)
+        except Exception as e:
+            logger.warning(f"续跑文件读取失败: {e}")
+            resume_path.unlink()
+            return None
+
+    def _record_memory(self):
+        """记录峰值内存"""
+        import psutil
+
+        mem = psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
+        self.stats.peak_memory_mb = max(self.stats.peak_memory_mb, mem)
+        if mem > self.config.memory_threshold_mb:
+            logger.warning(
+                f"内存使用超过警戒线: {mem:.1f}MB > "
+                f"{self.config.memory_threshold_mb}MB"
+            )
 
     def _save_batch_features(self, features: pd.DataFrame, batch_idx: int):
         """保存批次特征"""
@@ -543,6 +816,11 @@ class StreamingFeatureEngine:
             logger.warning(f"加载checkpoint失败: {e}")
             return set()
 
+    def _clear_checkpoint(self):
+        """删除checkpoint"""
+        if self._checkpoint_file.exists():
+            self._checkpoint_file.unlink()
+
     def _cleanup(self):
         """清理临时文件"""
         # 删除批次文件
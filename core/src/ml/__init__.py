@@ -8,6 +8,7 @@ ML模块 - 机器学习工作流核心组件
 - TrainingConfig: 训练配置
 - MLEntry: ML入场策略
 - MLStockRanker: 股票评分工具
+- PredictionPanel / select_long_short / rank_scores: 截面批量排名
 
 对齐文档: core/docs/ml/README.md
 版本: v1.3.0
@@ -20,6 +21,13 @@ from .label_generator import LabelGenerator, LabelType
 from .trained_model import TrainedModel, TrainingConfig
 from .ml_entry import MLEntry
 from .ml_stock_ranker import MLStockRanker, ScoringMethod
+from .cross_sectional_ranking import (
+    PredictionPanel,
+    LongShortSelection,
+    RankedScores,
+    select_long_short,
+    rank_scores,
+)
 
 __all__ = [
     'FeatureEngine',
@@ -30,6 +38,11 @@ __all__ = [
     'MLEntry',
     'MLStockRanker',
     'ScoringMethod',
+    'PredictionPanel',
+    'LongShortSelection',
+    'RankedScores',
+    'select_long_short',
+    'rank_scores',
 ]
 
 __version__ = '1.3.0'
@@ -0,0 +1,360 @@
+"""
+截面批量排名
+对齐文档: core/docs/ml/README.md (阶段3)
+
+功能:
+- PredictionPanel: (日期 × 股票) 的预测矩阵 (expected_return / volatility / confidence)
+- select_long_short: 一次完成所有日期的多空筛选、Top N 与权重归一化 (MLEntry 口径)
+- rank_scores: 一次完成所有日期的评分排序 (MLStockRanker 口径)
+
+结果以数组形式返回 (行=日期, 列=名次, -1 表示空位)，
+字典格式 ({date: {stock: ...}}) 仅作为可选视图 (to_dict)。
+
+版本: v1.0.0
+创建时间: 2026-10-18
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+PANEL_FIELDS = ('expected_return', 'volatility', 'confidence')
+
+
+@dataclass
+class PredictionPanel:
+    """
+    (日期 × 股票) 预测矩阵
+
+    Attributes:
+        dates: 日期列表 (行)
+        stocks: 股票代码列表 (列)
+        expected_return: 预期收益矩阵, shape=(n_dates, n_stocks), 缺失为 NaN
+        volatility: 波动率矩阵
+        confidence: 置信度矩阵
+        errors: 预测失败的日期 {date: 错误信息}，对应行全部为 NaN
+    """
+    dates: List[str]
+    stocks: List[str]
+    expected_return: np.ndarray
+    volatility: np.ndarray
+    confidence: np.ndarray
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        shape = (len(self.dates), len(self.stocks))
+        for name in PANEL_FIELDS:
+            values = np.asarray(getattr(self, name), dtype=np.float64)
+            if values.shape != shape:
+                raise ValueError(f"{name} shape {values.shape} does not match {shape}")
+            setattr(self, name, values)
+
+    @classmethod
+    def from_frames(
+        cls,
+        expected_return: pd.DataFrame,
+        volatility: pd.DataFrame,
+        confidence: pd.DataFrame
+    ) -> 'PredictionPanel':
+        """
+        由三个 (日期 × 股票) DataFrame 构建，按 expected_return 的行列对齐
+
+        Args:
+            expected_return: 预期收益 (index=日期, columns=股票)
+            volatility: 波动率
+            confidence: 置信度
+
+        Returns:
+            PredictionPanel
+        """
+        index, columns = expected_return.index, expected_return.columns
+        return cls(
+            dates=[str(d) for d in index],
+            stocks=list(columns),
+            expected_return=expected_return.to_numpy(dtype=np.float64),
+            volatility=volatility.reindex(index=index, columns=columns).to_numpy(dtype=np.float64),
+            confidence=confidence.reindex(index=index, columns=columns).to_numpy(dtype=np.float64),
+        )
+
+    @classmethod
+    def from_predictions(
+        cls,
+        predictions: Dict[str, pd.DataFrame],
+        stocks: Sequence[str],
+        errors: Optional[Dict[str, str]] = None
+    ) -> 'PredictionPanel':
+        """
+        由逐日 TrainedModel.predict 结果堆叠构建
+
+        Args:
+            predictions: {date: DataFrame(index=股票, columns=PANEL_FIELDS)}
+            stocks: 列顺序 (不在 predictions 中的股票为 NaN)
+            errors: 预测失败的日期 (行填 NaN)
+
+        Returns:
+            PredictionPanel
+        """
+        errors = dict(errors or {})
+        dates = list(predictions.keys()) + [d for d in errors if d not in predictions]
+        stocks = list(stocks)
+        matrices = {name: np.full((len(dates), len(stocks)), np.nan) for name in PANEL_FIELDS}
+
+        for i, date in enumerate(dates):
+            frame = predictions.get(date)
+            if frame is None or len(frame) == 0:
+                continue
+            aligned = frame.reindex(stocks)
+            for name in PANEL_FIELDS:
+                matrices[name][i] = aligned[name].to_numpy(dtype=np.float64)
+
+        return cls(dates=dates, stocks=stocks, errors=errors, **matrices)
+
+    @property
+    def shape(self):
+        return self.expected_return.shape
+
+
+def _top_k_indices(scores: np.ndarray, k: int, descending: bool = True) -> np.ndarray:
+    """
+    按行取 Top K 列索引 (无效位置为 NaN，排在最后并以 -1 填充)
+
+    使用稳定排序，同分时保持列顺序 (与 DataFrame.nlargest / sort_values 一致)。
+    """
+    n_dates, n_stocks = scores.shape
+    k = min(k, n_stocks)
+    if k <= 0:
+        return np.empty((n_dates, 0), dtype=np.int64)
+
+    valid = ~np.isnan(scores)
+    keys = np.where(valid, -scores if descending else scores, np.inf)
+    order = np.argsort(keys, axis=1, kind='stable')[:, :k]
+    taken = np.take_along_axis(valid, order, axis=1)
+    return np.where(taken, order, -1)
+
+
+def _gather(values: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """按 _top_k_indices 结果取值，空位为 NaN"""
+    out = np.take_along_axis(values, np.maximum(index, 0), axis=1).astype(np.float64)
+    out[index < 0] = np.nan
+    return out
+
+
+@dataclass
+class LongShortSelection:
+    """
+    多空筛选结果 (数组形式)
+
+    Attributes:
+        dates / stocks: 行 / 列标签 (与 PredictionPanel 一致)
+        long_index: 做多股票列索引, shape=(n_dates, top_long), 按权重降序, -1 为空位
+        long_weight: 归一化后的做多权重 (空位为 NaN)
+        short_index: 做空股票列索引, shape=(n_dates, top_short)
+        short_weight: 归一化后的做空权重
+        expected_return / confidence: 完整预测矩阵 (用于构建字典视图)
+    """
+    dates: List[str]
+    stocks: List[str]
+    long_index: np.ndarray
+    long_weight: np.ndarray
+    short_index: np.ndarray
+    short_weight: np.ndarray
+    expected_return: np.ndarray
+    confidence: np.ndarray
+
+    def to_dict(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        字典视图 (与 MLEntry.generate_signals 返回格式一致)
+
+        Returns:
+            {date: {stock_code: {'action', 'weight', 'expected_return', 'confidence'}}}
+        """
+        result = {}
+        for i, date in enumerate(self.dates):
+            signals = {}
+            for action, index, weight in (
+                ('long', self.long_index, self.long_weight),
+                ('short', self.short_index, self.short_weight),
+            ):
+                for j, w in zip(index[i], weight[i]):
+                    if j < 0:
+                        continue
+                    signals[self.stocks[j]] = {
+                        'action': action,
+                        'weight': float(w),
+                        'expected_return': float(self.expected_return[i, j]),
+                        'confidence': float(self.confidence[i, j])
+                    }
+            result[date] = signals
+        return result
+
+
+@dataclass
+class RankedScores:
+    """
+    评分排名结果 (数组形式)
+
+    Attributes:
+        dates / stocks: 行 / 列标签
+        index: 排名股票列索引, shape=(n_dates, top_n), -1 为空位
+        score: 对应评分 (空位为 NaN)
+    """
+    dates: List[str]
+    stocks: List[str]
+    index: np.ndarray
+    score: np.ndarray
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """
+        字典视图 (与 MLStockRanker.batch_rank 返回格式一致)
+
+        Returns:
+            {date: {stock_code: score}} (按排名顺序)
+        """
+        return {
+            date: {
+                self.stocks[j]: float(s)
+                for j, s in zip(self.index[i], self.score[i]) if j >= 0
+            }
+            for i, date in enumerate(self.dates)
+        }
+
+
+def select_long_short(
+    panel: PredictionPanel,
+    top_long: int,
+    top_short: int = 0,
+    confidence_threshold: float = 0.0,
+    min_expected_return: float = 0.0,
+    enable_short: bool = False
+) -> LongShortSelection:
+    """
+    批量多空筛选 (MLEntry 口径)
+
+    - 做多: expected_return > min_expected_return & confidence > threshold & volatility > 0
+    - 做空: expected_return < -min_expected_return (同上)
+    - 权重: |expected_return| / volatility × confidence，各取 Top N
+    - 每个日期多空权重合计归一化为 1，合计为 0 或无效时等权
+
+    Args:
+        panel: 预测矩阵
+        top_long: 做多股票数量
+        top_short: 做空股票数量
+        confidence_threshold: 置信度阈值
+        min_expected_return: 最小预期收益率阈值
+        enable_short: 是否启用做空
+
+    Returns:
+        LongShortSelection
+    """
+    er, vol, conf = panel.expected_return, panel.volatility, panel.confidence
+    n_dates = len(panel.dates)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        base = (conf > confidence_threshold) & (vol > 0)
+        raw = np.abs(er) / vol * conf
+
+    long_index = _top_k_indices(np.where(base & (er > min_expected_return), raw, np.nan), top_long)
+    long_weight = _gather(raw, long_index)
+
+    if enable_short and top_short > 0:
+        short_mask = base & (er < -min_expected_return)
+        short_index = _top_k_indices(np.where(short_mask, raw, np.nan), top_short)
+        short_weight = _gather(raw, short_index)
+
+        # min_expected_return < 0 时同一股票可能同时入选，与字典合并一致: 做空覆盖做多
+        if min_expected_return < 0 and short_index.shape[1] and long_index.shape[1]:
+            overlap = (long_index[:, :, None] == short_index[:, None, :]).any(axis=2) & (long_index >= 0)
+            long_index = np.where(overlap, -1, long_index)
+            long_weight[overlap] = np.nan
+    else:
+        short_index = np.empty((n_dates, 0), dtype=np.int64)
+        short_weight = np.empty((n_dates, 0))
+
+    # 按日期归一化
+    count = (long_index >= 0).sum(axis=1) + (short_index >= 0).sum(axis=1)
+    total = np.nansum(long_weight, axis=1) + np.nansum(short_weight, axis=1)
+    degenerate = (total == 0) | ~np.isfinite(total)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        equal = np.where(count > 0, 1.0 / count, np.nan)
+    for weight, index in ((long_weight, long_index), (short_weight, short_index)):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight /= np.where(degenerate, 1.0, total)[:, None]
+        weight[:] = np.where(degenerate[:, None] & (index >= 0), equal[:, None], weight)
+
+    return LongShortSelection(
+        dates=list(panel.dates),
+        stocks=list(panel.stocks),
+        long_index=long_index,
+        long_weight=long_weight,
+        short_index=short_index,
+        short_weight=short_weight,
+        expected_return=er,
+        confidence=conf
+    )
+
+
+def compute_scores(panel: PredictionPanel, scoring_method: str) -> np.ndarray:
+    """
+    批量计算综合评分 (MLStockRanker 口径)，无效值 (inf / NaN 运算结果) 记为 0
+
+    Args:
+        panel: 预测矩阵
+        scoring_method: 'simple' / 'sharpe' / 'risk_adjusted'
+
+    Returns:
+        np.ndarray: 评分矩阵, shape=(n_dates, n_stocks)
+    """
+    er, vol, conf = panel.expected_return, panel.volatility, panel.confidence
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if scoring_method == 'simple':
+            scores = er * conf
+        elif scoring_method == 'sharpe':
+            scores = (er / vol) * conf
+        elif scoring_method == 'risk_adjusted':
+            scores = er * conf / vol
+        else:
+            raise ValueError(f"Unknown scoring_method: {scoring_method}")
+
+    return np.where(np.isfinite(scores), scores, 0.0)
+
+
+def rank_scores(
+    panel: PredictionPanel,
+    scoring_method: str = 'simple',
+    min_confidence: float = 0.0,
+    min_expected_return: float = 0.0,
+    return_top_n: Optional[int] = 100,
+    descending: bool = True
+) -> RankedScores:
+    """
+    批量评分排名 (MLStockRanker 口径)
+
+    过滤条件: expected_return >= min_expected_return & confidence >= min_confidence & volatility > 0
+
+    Args:
+        panel: 预测矩阵
+        scoring_method: 评分方法
+        min_confidence: 最小置信度
+        min_expected_return: 最小预期收益率
+        return_top_n: 每个日期返回Top N (None表示全部)
+        descending: 是否降序
+
+    Returns:
+        RankedScores
+    """
+    er, vol, conf = panel.expected_return, panel.volatility, panel.confidence
+    with np.errstate(invalid='ignore'):
+        mask = (er >= min_expected_return) & (conf >= min_confidence) & (vol > 0)
+
+    scores = np.where(mask, compute_scores(panel, scoring_method), np.nan)
+    k = len(panel.stocks) if return_top_n is None else return_top_n
+    index = _top_k_indices(scores, k, descending=descending)
+
+    return RankedScores(
+        dates=list(panel.dates),
+        stocks=list(panel.stocks),
+        index=index,
+        score=_gather(scores, index)
+    )
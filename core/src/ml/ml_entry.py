@@ -11,11 +11,16 @@ ML入场策略
 版本: v1.0.0
 创建时间: 2026-02-08
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 import pandas as pd
 import numpy as np
 
 from src.ml.trained_model import TrainedModel
+from src.ml.cross_sectional_ranking import (
+    LongShortSelection,
+    PredictionPanel,
+    select_long_short,
+)
 
 
 class MLEntry:
@@ -143,6 +148,57 @@ class MLEntry:
 
         return signals
 
+    def generate_signals_batch(
+        self,
+        stock_pool: List[str],
+        market_data: pd.DataFrame,
+        dates: List[str],
+        as_dict: bool = False
+    ) -> Union[LongShortSelection, Dict[str, Dict[str, Dict]]]:
+        """
+        批量生成多个日期的入场信号
+
+        模型逐日预测后堆叠为 (日期 × 股票) 矩阵，筛选 / 排序 / 归一化一次完成。
+
+        Args:
+            stock_pool: 股票池
+            market_data: 市场数据
+            dates: 交易日期列表
+            as_dict: True 时返回 {date: generate_signals 格式字典}
+
+        Returns:
+            LongShortSelection 或 {date: {stock_code: {...}}}
+
+        Raises:
+            ValueError: 如果stock_pool为空
+        """
+        if not stock_pool:
+            raise ValueError("stock_pool cannot be empty")
+
+        panel = self.model.predict_panel(stock_pool, market_data, dates)
+        selection = self.select_from_panel(panel)
+
+        return selection.to_dict() if as_dict else selection
+
+    def select_from_panel(self, panel: PredictionPanel) -> LongShortSelection:
+        """
+        对 (日期 × 股票) 预测矩阵批量筛选多空信号 (与 generate_signals 口径一致)
+
+        Args:
+            panel: 预测矩阵 (可由 TrainedModel.predict_panel 生成)
+
+        Returns:
+            LongShortSelection: 每个日期的多空股票索引与归一化权重
+        """
+        return select_long_short(
+            panel,
+            top_long=self.top_long,
+            top_short=self.top_short,
+            confidence_threshold=self.confidence_threshold,
+            min_expected_return=self.min_expected_return,
+            enable_short=self.enable_short
+        )
+
     def _filter_long_candidates(
         self,
         predictions: pd.DataFrame
@@ -241,25 +297,16 @@ class MLEntry:
         Returns:
             Dict[str, Dict]: 合并后的信号
         """
+        columns = ['weight', 'expected_return', 'confidence']
         signals = {}
 
-        # 添加做多信号
-        for stock, row in long_candidates.iterrows():
-            signals[stock] = {
-                'action': 'long',
-                'weight': row['weight'],
-                'expected_return': row['expected_return'],
-                'confidence': row['confidence']
-            }
-
-        # 添加做空信号
-        for stock, row in short_candidates.iterrows():
-            signals[stock] = {
-                'action': 'short',
-                'weight': row['weight'],
-                'expected_return': row['expected_return'],
-                'confidence': row['confidence']
-            }
+        # 按列整体转换，避免逐行 iterrows (做空在后，同一股票以做空覆盖)
+        for action, candidates in (('long', long_candidates), ('short', short_candidates)):
+            if len(candidates) == 0:
+                continue
+            records = candidates[columns].astype(float).to_dict('index')
+            for stock, record in records.items():
+                signals[stock] = {'action': action, **record}
 
         return signals
 
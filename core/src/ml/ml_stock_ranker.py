@@ -10,11 +10,12 @@ ML股票评分排名工具
 版本: v1.0.0
 创建时间: 2026-02-08
 """
-from typing import List, Dict, Optional, Literal
+from typing import List, Dict, Optional, Literal, Union
 import pandas as pd
 import numpy as np
 
 from src.ml.trained_model import TrainedModel
+from src.ml.cross_sectional_ranking import PredictionPanel, RankedScores, rank_scores
 
 
 ScoringMethod = Literal['simple', 'sharpe', 'risk_adjusted']
@@ -249,24 +250,54 @@ class MLStockRanker:
 
         return scores
 
+    def rank_panel(
+        self,
+        panel: PredictionPanel,
+        return_top_n: Optional[int] = 100,
+        descending: bool = True
+    ) -> RankedScores:
+        """
+        对 (日期 × 股票) 预测矩阵批量评分排名 (与 rank 口径一致)
+
+        Args:
+            panel: 预测矩阵 (可由 TrainedModel.predict_panel 生成)
+            return_top_n: 每个日期返回Top N (None表示全部)
+            descending: 是否降序排列
+
+        Returns:
+            RankedScores: 每个日期的排名股票索引与评分
+        """
+        return rank_scores(
+            panel,
+            scoring_method=self.scoring_method,
+            min_confidence=self.min_confidence,
+            min_expected_return=self.min_expected_return,
+            return_top_n=return_top_n,
+            descending=descending
+        )
+
     def batch_rank(
         self,
         stock_pool: List[str],
         market_data: pd.DataFrame,
         dates: List[str],
-        return_top_n: Optional[int] = 100
-    ) -> Dict[str, Dict[str, float]]:
+        return_top_n: Optional[int] = 100,
+        as_dict: bool = True
+    ) -> Union[Dict[str, Dict[str, float]], RankedScores]:
         """
         批量评分 (多个日期)
 
+        模型逐日预测后堆叠为 (日期 × 股票) 矩阵，过滤 / 评分 / 排序一次完成。
+
         Args:
             stock_pool: 股票池
             market_data: 市场数据
             dates: 日期列表
             return_top_n: 每个日期返回Top N股票
+            as_dict: True 返回 {date: {stock_code: score}}，False 返回 RankedScores 数组
 
         Returns:
-            Dict[str, Dict[str, float]]: {date: {stock_code: score}}
+            Dict[str, Dict[str, float]] 或 RankedScores
 
         Example:
             >>> results = ranker.batch_rank(
@@ -278,23 +309,18 @@ class MLStockRanker:
             >>> results['2024-01-01']
             >>> # {'600000.SH': 0.85, '000001.SZ': 0.78}
         """
-        results = {}
-
-        for date in dates:
-            try:
-                rankings = self.rank(
-                    stock_pool=stock_pool,
-                    market_data=market_data,
-                    date=date,
-                    return_top_n=return_top_n
-                )
-                results[date] = rankings
-            except Exception as e:
-                # 记录错误但继续处理其他日期
-                print(f"Warning: Failed to rank stocks for {date}: {e}")
-                results[date] = {}
-
-        return results
+        if not stock_pool:
+            panel = PredictionPanel.from_predictions({}, [], {d: 'stock_pool cannot be empty' for d in dates})
+        else:
+            panel = self.model.predict_panel(stock_pool, market_data, dates)
+
+        # 记录错误但继续处理其他日期 (失败日期为空结果)
+        for date, error in panel.errors.items():
+            print(f"Warning: Failed to rank stocks for {date}: {error}")
+
+        ranked = self.rank_panel(panel, return_top_n=return_top_n)
+
+        return ranked.to_dict() if as_dict else ranked
 
     def get_top_stocks(
         self,
@@ -19,6 +19,7 @@ import joblib
 from pathlib import Path
 
 from src.ml.feature_engine import FeatureEngine
+from src.ml.cross_sectional_ranking import PredictionPanel
 
 
 @dataclass
@@ -178,6 +179,39 @@ class TrainedModel:
 
         return result
 
+    def predict_panel(
+        self,
+        stock_codes: List[str],
+        market_data: pd.DataFrame,
+        dates: List[str],
+        skip_errors: bool = True
+    ) -> PredictionPanel:
+        """
+        多日期预测，结果堆叠为 (日期 × 股票) 矩阵
+
+        Args:
+            stock_codes: 股票代码列表 (矩阵列顺序)
+            market_data: 市场数据
+            dates: 预测日期列表 (矩阵行顺序)
+            skip_errors: True 时单日失败记入 panel.errors 并以 NaN 行占位，
+                False 时直接抛出
+
+        Returns:
+            PredictionPanel: expected_return / volatility / confidence 矩阵
+        """
+        predictions: Dict[str, pd.DataFrame] = {}
+        errors: Dict[str, str] = {}
+        for date in dates:
+            try:
+                predictions[date] = self.predict(stock_codes, market_data, date)
+            except Exception as e:
+                if not skip_errors:
+                    raise
+                predictions[date] = pd.DataFrame()
+                errors[date] = str(e)
+
+        return PredictionPanel.from_predictions(predictions, stock_codes, errors)
+
     def _estimate_volatility(
         self,
         stock_codes: List[str],
@@ -23,6 +23,7 @@ from typing import Dict, List, Optional
 from loguru import logger
 
 from ..database.connection_pool_manager import ConnectionPoolManager
+from ..data.trading_calendar import get_trading_calendar
 from ..config.data_source_helper import get_data_source_config
 from .models import OvernightData, PremarketNews, PremarketSyncResult
 
@@ -71,6 +72,11 @@ class PremarketDataFetcher:
         Returns:
             是否为交易日
         """
+        # 优先使用进程内交易日历索引，未覆盖的日期再查询数据库
+        calendar = get_trading_calendar()
+        if calendar.covers(date_str):
+            return calendar.is_trading_day(date_str)
+
         try:
             conn = self.pool_manager.get_connection()
             cursor = conn.cursor()
@@ -13,6 +13,7 @@ from typing import Dict, List, Tuple, Optional
 from loguru import logger
 
 from ..database.connection_pool_manager import ConnectionPoolManager
+from ..data.trading_calendar import get_trading_calendar
 from ..config.data_source_helper import create_provider, get_data_source_config
 from .models import (
     MarketIndices,
@@ -110,6 +111,7 @@ class SentimentDataFetcher:
             self.pool_manager.release_connection(conn)
 
             logger.success(f"{year}年交易日历同步完成，插入{inserted_count}条记录 (数据源: {self.data_source})")
+            get_trading_calendar().refresh()
             return inserted_count
 
         except Exception as e:
@@ -126,6 +128,11 @@ class SentimentDataFetcher:
         Returns:
             是否为交易日
         """
+        # 优先使用进程内交易日历索引，未覆盖的日期再查询数据库
+        calendar = get_trading_calendar()
+        if calendar.covers(date_str):
+            return calendar.is_trading_day(date_str)
+
         try:
             conn = self.pool_manager.get_connection()
             cursor = conn.cursor()
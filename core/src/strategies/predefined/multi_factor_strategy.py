@@ -12,6 +12,11 @@ from loguru import logger
 from ..base_strategy import BaseStrategy
 from ..signal_generator import SignalGenerator
 
+try:
+    from ...analysis.factor_preprocessor import CrossSectionalPreprocessor
+except ImportError:
+    from src.analysis.factor_preprocessor import CrossSectionalPreprocessor
+
 
 class MultiFactorStrategy(BaseStrategy):
     """
@@ -19,7 +24,7 @@ class MultiFactorStrategy(BaseStrategy):
 
     核心逻辑：
     - 选择多个有效的Alpha因子
-    - 对因子进行标准化处理
+    - 对因子进行截面预处理（去极值、行业市值中性化、标准化）
     - 加权组合得到综合评分
     - 选择评分最高的股票
 
@@ -27,7 +32,9 @@ class MultiFactorStrategy(BaseStrategy):
         factors: 因子列表 ['MOM20', 'REV5', 'VOLATILITY20']
         weights: 因子权重 [0.4, 0.3, 0.3]
         normalize_method: 标准化方法 ('rank'/'zscore'/'minmax')
-        neutralize: 是否行业中性化（默认False）
+        winsorize: 去极值方法 ('mad'/'quantile'/None，默认None)
+        neutralize: 是否行业市值中性化（默认False，需通过 set_neutralization_data
+            或 generate_signals 的 industry / market_cap 参数提供数据）
 
     适用场景：
         - 所有市场环境
@@ -55,6 +62,7 @@ class MultiFactorStrategy(BaseStrategy):
             'top_n': 50,
             'holding_period': 5,
             'neutralize': False,
+            'winsorize': None,
             'min_factor_coverage': 0.8,  # 最少需要80%因子有效
         }
         default_config.update(config)
@@ -65,6 +73,7 @@ class MultiFactorStrategy(BaseStrategy):
         self.weights = self.config.custom_params.get('weights')
         self.normalize_method = self.config.custom_params.get('normalize_method', 'rank')
         self.neutralize = self.config.custom_params.get('neutralize', False)
+        self.winsorize = self.config.custom_params.get('winsorize')
         self.min_factor_coverage = self.config.custom_params.get('min_factor_coverage', 0.8)
 
         # 如果没有指定权重，使用等权重
@@ -74,6 +83,10 @@ class MultiFactorStrategy(BaseStrategy):
         if len(self.weights) != len(self.factors):
             raise ValueError("因子权重数量必须与因子数量一致")
 
+        # 中性化数据：行业Series (index=stock) 与总市值DataFrame (index=date, columns=stock)
+        self.industry: Optional[pd.Series] = None
+        self.market_cap: Optional[pd.DataFrame] = None
+
         logger.info(f"多因子策略: {len(self.factors)}个因子")
         for factor, weight in zip(self.factors, self.weights):
             logger.info(f"  {factor}: {weight:.2%}")
@@ -117,6 +130,100 @@ class MultiFactorStrategy(BaseStrategy):
 
         return normalized
 
+    def set_neutralization_data(
+        self,
+        industry: Optional[pd.Series] = None,
+        market_cap: Optional[pd.DataFrame] = None
+    ):
+        """
+        设置行业市值中性化数据
+
+        Args:
+            industry: 股票行业Series (index=stock_code)，对应 stock_basic.industry
+            market_cap: 总市值DataFrame (index=date, columns=stock_codes)，对应 daily_basic.total_mv
+        """
+        self.industry = industry
+        self.market_cap = market_cap
+
+    def _build_preprocessor(
+        self,
+        industry: Optional[pd.Series] = None,
+        market_cap: Optional[pd.DataFrame] = None
+    ) -> CrossSectionalPreprocessor:
+        """按策略配置构建截面预处理器"""
+        if self.neutralize:
+            industry = industry if industry is not None else self.industry
+            market_cap = market_cap if market_cap is not None else self.market_cap
+            if industry is None and market_cap is None:
+                logger.warning("已启用中性化但未提供行业/市值数据，跳过中性化")
+        else:
+            industry, market_cap = None, None
+
+        return CrossSectionalPreprocessor(
+            winsorize=self.winsorize,
+            standardize=self.normalize_method,
+            industry=industry,
+            market_cap=market_cap
+        )
+
+    def _factor_matrices(self, features: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """从 (factor, stock) 多层列特征中提取各因子的 (日期 × 股票) 矩阵"""
+        matrices = {}
+        for factor in self.factors:
+            if isinstance(features.columns, pd.MultiIndex) and \
+                    factor in features.columns.get_level_values(0):
+                matrices[factor] = features[factor]
+            else:
+                logger.warning(f"因子 {factor} 不在特征DataFrame中")
+        return matrices
+
+    def calculate_score_matrix(
+        self,
+        features: pd.DataFrame,
+        industry: Optional[pd.Series] = None,
+        market_cap: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        批量计算所有日期的综合评分
+
+        各因子先按日期做截面预处理（见 CrossSectionalPreprocessor），再加权组合：
+        评分 = Σ(权重i × 预处理后因子i) / Σ权重i
+
+        Args:
+            features: 特征DataFrame，列为 (factor, stock) 多层索引
+            industry: 行业Series（可选，覆盖 set_neutralization_data 的设置）
+            market_cap: 总市值DataFrame（可选，同上）
+
+        Returns:
+            综合评分DataFrame (index=date, columns=stock)，因子覆盖不足的股票为NaN
+        """
+        matrices = self._factor_matrices(features)
+        if not matrices:
+            logger.error("没有可用的因子")
+            return pd.DataFrame(index=features.index, dtype=float)
+
+        preprocessor = self._build_preprocessor(industry, market_cap)
+        normalized = preprocessor.transform_dict(matrices)
+        first = next(iter(normalized.values()))
+
+        weight_map = dict(zip(self.factors, self.weights))
+        composite = pd.DataFrame(0.0, index=first.index, columns=first.columns)
+        factor_count = pd.DataFrame(0, index=first.index, columns=first.columns)
+        total_weight = 0.0
+        for factor_name, values in normalized.items():
+            values = values.reindex(index=first.index, columns=first.columns)
+            composite = composite + values * weight_map[factor_name]
+            factor_count += values.notna().astype(int)
+            total_weight += weight_map[factor_name]
+
+        # 归一化权重
+        if total_weight > 0:
+            composite = composite / total_weight
+
+        # 过滤缺失值过多的股票
+        min_factors = int(len(self.factors) * self.min_factor_coverage)
+        return composite.where(factor_count >= min_factors)
+
     def calculate_scores(
         self,
         prices: pd.DataFrame,
@@ -124,7 +231,7 @@ class MultiFactorStrategy(BaseStrategy):
         date: Optional[pd.Timestamp] = None
     ) -> pd.Series:
         """
-        计算综合评分
+        计算单个日期的综合评分
 
         评分 = Σ(权重i × 标准化因子i)
 
@@ -147,74 +254,10 @@ class MultiFactorStrategy(BaseStrategy):
             logger.warning(f"日期 {date} 不在特征DataFrame中")
             return pd.Series(dtype=float)
 
-        # 提取各因子值
-        factor_values = {}
-        for factor in self.factors:
-            # 支持MultiIndex列 (factor, stock)
-            if isinstance(features.columns, pd.MultiIndex):
-                # MultiIndex: 选择该因子的所有股票
-                if factor in features.columns.get_level_values(0):
-                    factor_values[factor] = features.loc[date, factor]
-                else:
-                    logger.warning(f"因子 {factor} 不在特征DataFrame中")
-                    continue
-            else:
-                # 简单列索引
-                if factor not in features.columns:
-                    logger.warning(f"因子 {factor} 不在特征DataFrame中")
-                    continue
-                factor_values[factor] = features.loc[date, factor]
-
-        if not factor_values:
-            logger.error("没有可用的因子")
+        scores = self.calculate_score_matrix(features.loc[[date]])
+        if scores.empty:
             return pd.Series(dtype=float)
-
-        # 标准化
-        normalized_factors = {}
-        for factor_name, factor_series in factor_values.items():
-            try:
-                normalized = self.normalize_factor(factor_series.dropna())
-                normalized_factors[factor_name] = normalized
-            except Exception as e:
-                logger.warning(f"标准化因子 {factor_name} 失败: {e}")
-                continue
-
-        if not normalized_factors:
-            logger.error("没有成功标准化的因子")
-            return pd.Series(dtype=float)
-
-        # 加权组合
-        # 确定股票列表（从第一个有效因子中获取）
-        if normalized_factors:
-            first_factor = list(normalized_factors.values())[0]
-            stock_index = first_factor.index
-        else:
-            # 从features中提取股票列表
-            if isinstance(features.columns, pd.MultiIndex):
-                stock_index = features.columns.get_level_values(1).unique()
-            else:
-                stock_index = features.columns
-
-        composite_score = pd.Series(0.0, index=stock_index)
-        total_weight = 0.0
-
-        for i, factor_name in enumerate(self.factors):
-            if factor_name in normalized_factors:
-                weight = self.weights[i]
-                composite_score += normalized_factors[factor_name] * weight
-                total_weight += weight
-
-        # 归一化权重
-        if total_weight > 0:
-            composite_score = composite_score / total_weight
-
-        # 过滤缺失值过多的股票
-        factor_count = pd.DataFrame(normalized_factors).notna().sum(axis=1)
-        min_factors = int(len(self.factors) * self.min_factor_coverage)
-        valid_stocks = factor_count[factor_count >= min_factors].index
-        composite_score[~composite_score.index.isin(valid_stocks)] = np.nan
-
-        return composite_score
+        return scores.loc[date]
 
     def generate_signals(
         self,
@@ -230,7 +273,7 @@ class MultiFactorStrategy(BaseStrategy):
             prices: 价格DataFrame
             features: 特征DataFrame（必需）
             volumes: 成交量DataFrame
-            **kwargs: 其他参数
+            **kwargs: 其他参数（industry / market_cap：中性化数据）
 
         Returns:
             signals: 信号DataFrame
@@ -240,23 +283,17 @@ class MultiFactorStrategy(BaseStrategy):
         if features is None:
             raise ValueError("多因子策略需要特征DataFrame")
 
-        # 1. 计算每日综合评分
-        scores_dict = {}
-        for date in features.index:
-            try:
-                scores = self.calculate_scores(prices, features, date)
-                scores_dict[date] = scores
-            except Exception as e:
-                logger.warning(f"计算日期 {date} 评分失败: {e}")
-                continue
-
-        if not scores_dict:
+        # 1. 批量计算所有日期的综合评分
+        scores_df = self.calculate_score_matrix(
+            features,
+            industry=kwargs.get('industry'),
+            market_cap=kwargs.get('market_cap')
+        )
+
+        if scores_df.empty or scores_df.columns.empty:
             logger.error("没有成功计算的评分")
             return pd.DataFrame(0, index=prices.index, columns=prices.columns)
 
-        # 转换为DataFrame
-        scores_df = pd.DataFrame(scores_dict).T
-
         # 2. 生成排名信号（返回Response对象）
         signals_response = SignalGenerator.generate_rank_signals(
             scores=scores_df,
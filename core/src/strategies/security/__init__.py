@@ -4,7 +4,7 @@
 提供策略加载和执行的多层安全防护:
 1. 代码净化与验证 (CodeSanitizer)
 2. 权限检查 (PermissionChecker)
-3. 资源限制 (ResourceLimiter)
+3. 资源限制 (ResourceLimiter / SandboxWorkerPool 进程级沙箱)
 4. 审计日志 (AuditLogger)
 5. 安全配置管理 (SecurityConfig)
 """
@@ -12,6 +12,7 @@
 from .code_sanitizer import CodeSanitizer
 from .permission_checker import PermissionChecker
 from .resource_limiter import ResourceLimiter, ResourceLimitError
+from .sandbox_pool import SandboxWorkerPool, SandboxLimits
 from .audit_logger import AuditLogger
 from .security_config import (
     SecurityConfig,
@@ -25,6 +26,8 @@ __all__ = [
     'CodeSanitizer',
     'PermissionChecker',
     'ResourceLimiter',
+    'SandboxWorkerPool',
+    'SandboxLimits',
     'AuditLogger',
 
     # 配置管理
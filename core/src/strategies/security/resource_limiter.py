@@ -41,6 +41,9 @@ class ResourceLimiter:
                 # 执行策略代码
                 strategy.generate_signals(prices)
         """
+        # 嵌套调用时保留外层保存的原始限制，退出内层后再换回，外层才能恢复到真正的初始值
+        outer_handlers = self._old_handlers
+        self._old_handlers = {}
         try:
             # 尝试导入 resource 模块 (仅在 Unix 系统上可用)
             if sys.platform != 'win32':
@@ -71,34 +74,43 @@ class ResourceLimiter:
         finally:
             # 恢复原始限制
             self._restore_limits()
+            self._old_handlers = outer_handlers
 
             logger.debug("已恢复资源限制")
 
     def _set_resource_limits(self, resource):
         """设置资源限制 (仅Unix系统)"""
         try:
-            # 保存原始限制
+            # 保存原始限制；只收紧软限制，硬限制保持不变——非特权进程降低硬限制后无法再恢复
             self._old_handlers['cpu'] = resource.getrlimit(resource.RLIMIT_CPU)
 
             # 设置CPU时间限制
             resource.setrlimit(
                 resource.RLIMIT_CPU,
-                (self.max_cpu_time, self.max_cpu_time)
+                (self._soft_limit(resource, self.max_cpu_time, self._old_handlers['cpu']),
+                 self._old_handlers['cpu'][1])
             )
 
             # 注意: macOS 不支持 RLIMIT_AS，所以我们跳过内存限制
             # 在生产环境中，建议使用容器(Docker)来进行内存限制
             if sys.platform != 'darwin':
                 try:
-                    self._old_handlers['memory'] = resource.getrlimit(resource.RLIMIT_AS)
-                    memory_limit = self.max_memory_mb * 1024 * 1024
-                    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+                    old_memory = resource.getrlimit(resource.RLIMIT_AS)
+                    self._old_handlers['memory'] = old_memory
+                    memory_limit = self._soft_limit(resource, self.max_memory_mb * 1024 * 1024, old_memory)
+                    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, old_memory[1]))
                 except (ValueError, OSError) as e:
                     logger.warning(f"无法设置内存限制: {e}")
 
         except Exception as e:
             logger.warning(f"设置资源限制失败: {e}")
 
+    @staticmethod
+    def _soft_limit(resource, limit: int, old: tuple) -> int:
+        """新的软限制不超过当前硬限制"""
+        hard = old[1]
+        return limit if hard == resource.RLIM_INFINITY else min(limit, hard)
+
     def _set_timeout_alarm(self):
         """设置超时告警"""
         def timeout_handler(signum, frame):
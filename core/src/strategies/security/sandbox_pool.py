@@ -0,0 +1,507 @@
+"""
+策略沙箱进程池
+
+ResourceLimiter 依赖 SIGALRM / setrlimit，只能在主线程生效，而动态策略实际在
+asyncio.to_thread 的工作线程中执行；同时 rlimit 作用于整个进程，无法按调用限制内存。
+
+SandboxWorkerPool 预先 fork 一组独立的沙箱进程执行用户策略：
+- 策略代码只在沙箱进程中编译执行，编译结果按 key（代码哈希）常驻，重复调用无编译开销
+- 数值面板（价格 / 特征 DataFrame）通过共享内存传递，子进程零拷贝读取
+- 每次调用在子进程内设置真实的进程级限制：RLIMIT_CPU（本次调用的 CPU 秒数）、
+  RLIMIT_AS（当前地址空间 + 本次允许的内存），墙钟超时由父进程计时，超时直接结束子进程
+- 子进程执行 max_calls_per_worker 次、超限或崩溃后回收，由新进程替换
+- 多个调用分派到不同进程，跨 CPU 核并行
+
+加载函数与入口函数以 "模块:属性" 字符串传入，在子进程中导入：
+    loader(*loader_args) -> 策略实例（按 key 缓存）
+    entry(strategy, *args, **kwargs) -> 可 pickle 的结果
+
+使用示例:
+    pool = SandboxWorkerPool(workers=4, limits=SandboxLimits(max_wall_time=30))
+    scores = pool.run(
+        key=code_hash,
+        loader='app.services.strategy_sandbox:load_strategy',
+        loader_args=(strategy_record,),
+        entry='app.services.strategy_sandbox:score_stock_selection',
+        args=(prices, features),
+    )
+"""
+
+import importlib
+import itertools
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+try:
+    from ...exceptions import ResourceLimitError, StrategyExecutionError
+except ImportError:
+    from src.exceptions import ResourceLimitError, StrategyExecutionError
+
+
+# 子进程内常驻的策略实例数量上限
+WARM_CACHE_SIZE = 32
+
+
+@dataclass
+class SandboxLimits:
+    """单次调用的资源限制"""
+
+    max_cpu_time: int = 30      # CPU 时间 (秒)
+    max_memory_mb: int = 1024   # 本次调用可新增的地址空间 (MB)
+    max_wall_time: int = 60     # 墙钟时间 (秒)
+
+    @classmethod
+    def from_security_config(cls, config) -> 'SandboxLimits':
+        """从 SecurityConfig 构造"""
+        return cls(
+            max_cpu_time=config.max_cpu_time,
+            max_memory_mb=config.max_memory_mb,
+            max_wall_time=config.max_wall_time,
+        )
+
+
+# ==================== 共享内存面板 ====================
+
+class SharedPanel:
+    """
+    数值 DataFrame 的共享内存副本（父进程创建并负责释放）
+
+    只传递 (共享内存名, shape, dtype, index, columns)，子进程按名称挂载后零拷贝构造 DataFrame。
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        from multiprocessing import shared_memory
+
+        values = np.ascontiguousarray(df.to_numpy())
+        self._shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=self._shm.buf)[...] = values
+        self.spec = _PanelSpec(self._shm.name, values.shape, values.dtype.str, df.index, df.columns)
+
+    @staticmethod
+    def is_shareable(obj: Any) -> bool:
+        """非空且所有列均为数值类型的 DataFrame"""
+        return (
+            isinstance(obj, pd.DataFrame)
+            and obj.size > 0
+            and all(pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                    for dtype in obj.dtypes)
+        )
+
+    def close(self) -> None:
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class _PanelSpec:
+    """SharedPanel 的可 pickle 描述"""
+
+    __slots__ = ('name', 'shape', 'dtype', 'index', 'columns')
+
+    def __init__(self, name, shape, dtype, index, columns):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+        self.index = index
+        self.columns = columns
+
+    def __getstate__(self):
+        return (self.name, self.shape, self.dtype, self.index, self.columns)
+
+    def __setstate__(self, state):
+        self.name, self.shape, self.dtype, self.index, self.columns = state
+
+
+def _attach_panel(spec: _PanelSpec, handles: List) -> pd.DataFrame:
+    """子进程：挂载共享内存并构造 DataFrame（不复制）"""
+    from multiprocessing import shared_memory
+
+    # 子进程与父进程共用 resource_tracker，重复登记无副作用，由父进程 unlink
+    shm = shared_memory.SharedMemory(name=spec.name)
+    handles.append(shm)
+    values = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+    return pd.DataFrame(values, index=spec.index, columns=spec.columns, copy=False)
+
+
+# ==================== 子进程 ====================
+
+class _CpuLimitExceeded(BaseException):
+    """SIGXCPU 触发（继承 BaseException，策略代码的 except Exception 无法吞掉）"""
+
+
+def _on_sigxcpu(signum, frame):
+    raise _CpuLimitExceeded()
+
+
+def _resolve(path: str):
+    """'模块:属性.子属性' -> 对象"""
+    module_name, _, attr_path = path.partition(':')
+    obj = importlib.import_module(module_name)
+    for attr in attr_path.split('.'):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _address_space_bytes() -> Optional[int]:
+    """当前进程地址空间大小（Linux /proc，其他平台返回 None）"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@contextmanager
+def _call_limits(limits: SandboxLimits):
+    """本次调用的 RLIMIT_CPU / RLIMIT_AS（软限制，调用结束后恢复）"""
+    import resource
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used_cpu = math.ceil(usage.ru_utime + usage.ru_stime)
+    old_cpu = resource.getrlimit(resource.RLIMIT_CPU)
+    resource.setrlimit(resource.RLIMIT_CPU, (used_cpu + limits.max_cpu_time, old_cpu[1]))
+
+    old_as = None
+    current = _address_space_bytes()
+    if current is not None and sys.platform != 'darwin':
+        old_as = resource.getrlimit(resource.RLIMIT_AS)
+        soft = current + limits.max_memory_mb * 1024 * 1024
+        if old_as[1] != resource.RLIM_INFINITY:
+            soft = min(soft, old_as[1])
+        resource.setrlimit(resource.RLIMIT_AS, (soft, old_as[1]))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, old_cpu)
+        if old_as is not None:
+            resource.setrlimit(resource.RLIMIT_AS, old_as)
+
+
+def _worker_main(conn, limits: Dict[str, int]) -> None:
+    """沙箱进程主循环：接收调用、执行、回传结果"""
+    limits = SandboxLimits(**limits)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # 由父进程统一关闭
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+    warm: 'OrderedDict[str, Any]' = OrderedDict()
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message[0] == 'stop':
+            break
+
+        _, key, loader, loader_args, entry, args, kwargs = message
+        handles: List = []
+        reply: Tuple
+        try:
+            args = [_attach_panel(a, handles) if isinstance(a, _PanelSpec) else a for a in args]
+            kwargs = {k: _attach_panel(v, handles) if isinstance(v, _PanelSpec) else v
+                      for k, v in kwargs.items()}
+            with _call_limits(limits):
+                strategy = warm.get(key)
+                if strategy is None:
+                    strategy = _resolve(loader)(*loader_args)
+                    warm[key] = strategy
+                    while len(warm) > WARM_CACHE_SIZE:
+                        warm.popitem(last=False)
+                else:
+                    warm.move_to_end(key)
+                result = _resolve(entry)(strategy, *args, **kwargs)
+            reply = ('ok', result)
+        except _CpuLimitExceeded:
+            reply = ('limit', 'cpu', f"CPU 时间超限 (> {limits.max_cpu_time}秒)")
+        except MemoryError:
+            reply = ('limit', 'memory', f"内存超限 (> {limits.max_memory_mb}MB)")
+        except Exception as e:
+            reply = ('error', type(e).__name__, str(e), traceback.format_exc())
+        finally:
+            args = kwargs = None
+
+        try:
+            conn.send(reply)
+        except Exception as e:  # 结果无法 pickle
+            conn.send(('error', type(e).__name__, f"结果无法回传: {e}", traceback.format_exc()))
+        finally:
+            reply = None
+            for shm in handles:
+                try:
+                    shm.close()
+                except BufferError:
+                    pass  # 策略仍持有视图，进程回收时释放
+
+
+# ==================== 父进程 ====================
+
+class _SandboxWorker:
+    """父进程持有的沙箱进程句柄"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, ctx, limits: SandboxLimits):
+        self.id = next(self._ids)
+        self.conn, child_conn = ctx.Pipe(duplex=True)
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, asdict(limits)),
+            name=f"strategy-sandbox-{self.id}", daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+        self.warm_keys: set = set()
+
+    def call(self, message: Tuple, timeout: float) -> Tuple:
+        """发送一次调用并等待结果；超时 / 进程退出时结束进程并抛出 ResourceLimitError"""
+        try:
+            self.conn.send(message)
+            if self.conn.poll(timeout):
+                return self.conn.recv()
+        except (EOFError, OSError, BrokenPipeError) as e:
+            self.kill()
+            raise StrategyExecutionError(
+                f"沙箱进程异常退出: {e}", error_code="SANDBOX_WORKER_DIED",
+                exitcode=self.process.exitcode,
+            ) from e
+        self.kill()
+        raise ResourceLimitError(
+            f"策略执行超时 (> {timeout}秒)", error_code="RESOURCE_LIMIT_EXCEEDED",
+            resource_type="wall_time", limit=timeout,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        try:
+            self.conn.send(('stop',))
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(1.0)
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+
+
+class SandboxWorkerPool:
+    """
+    预 fork 的策略沙箱进程池（线程安全，可被多个 asyncio.to_thread 调用并发使用）
+
+    调度：优先选择已缓存该 key 的空闲进程；没有空闲进程时等待。
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_calls_per_worker: int = 200,
+        limits: Optional[SandboxLimits] = None,
+        start_method: Optional[str] = None,
+        preload: Sequence[str] = ('numpy', 'pandas'),
+    ):
+        """
+        Args:
+            workers: 进程数（默认 min(4, CPU 核数)）
+            max_calls_per_worker: 每个进程执行多少次调用后回收
+            limits: 单次调用资源限制
+            start_method: 进程启动方式（默认 Linux 用 forkserver，其他平台用 spawn）
+            preload: forkserver 预导入的模块，新进程 fork 后即可使用
+        """
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_calls_per_worker = max(1, max_calls_per_worker)
+        self.limits = limits or SandboxLimits()
+
+        if start_method is None:
+            start_method = 'forkserver' if sys.platform.startswith('linux') else 'spawn'
+        self._ctx = multiprocessing.get_context(start_method)
+        if start_method == 'forkserver' and preload:
+            self._ctx.set_forkserver_preload(list(preload))
+
+        self._cond = threading.Condition()
+        self._idle: List[_SandboxWorker] = []
+        self._size = 0
+        self._closed = False
+
+        self.total_calls = 0
+        self.recycled = 0
+        self.cold_starts = 0
+
+    # ==================== 生命周期 ====================
+
+    def start(self) -> 'SandboxWorkerPool':
+        """预先启动全部进程"""
+        with self._cond:
+            missing = self.workers - self._size
+            self._size += max(0, missing)
+        started = [_SandboxWorker(self._ctx, self.limits) for _ in range(max(0, missing))]
+        with self._cond:
+            self._idle.extend(started)
+            self._cond.notify_all()
+        logger.info(f"策略沙箱进程池已启动: {self.workers} 个进程, 每进程 {self.max_calls_per_worker} 次调用后回收")
+        return self
+
+    def shutdown(self) -> None:
+        """关闭所有空闲进程（执行中的进程在归还时关闭）"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            worker.stop()
+
+    def __enter__(self) -> 'SandboxWorkerPool':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.shutdown()
+
+    # ==================== 调用 ====================
+
+    def run(
+        self,
+        key: str,
+        loader: str,
+        loader_args: Tuple = (),
+        entry: str = '',
+        args: Tuple = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        在沙箱进程中执行 entry(strategy, *args, **kwargs)
+
+        Args:
+            key: 策略缓存键（代码哈希），相同 key 复用子进程中已编译的策略
+            loader: 加载函数路径（'模块:属性'），loader(*loader_args) 返回策略实例
+            loader_args: 加载参数（需可 pickle）
+            entry: 入口函数路径，entry(strategy, *args, **kwargs)
+            args / kwargs: 入口参数；数值 DataFrame 自动经共享内存传递
+            timeout: 墙钟超时（默认 limits.max_wall_time）
+
+        Raises:
+            ResourceLimitError: CPU / 内存 / 墙钟超限
+            StrategyExecutionError: 策略代码抛出异常或进程异常退出
+        """
+        kwargs = kwargs or {}
+        timeout = timeout or self.limits.max_wall_time
+        panels: List[SharedPanel] = []
+
+        def share(value):
+            if SharedPanel.is_shareable(value):
+                panel = SharedPanel(value)
+                panels.append(panel)
+                return panel.spec
+            return value
+
+        worker = self._acquire(key)
+        healthy = False
+        try:
+            message = ('call', key, loader, tuple(loader_args), entry,
+                       tuple(share(a) for a in args), {k: share(v) for k, v in kwargs.items()})
+            if key not in worker.warm_keys:
+                self.cold_starts += 1
+            reply = worker.call(message, timeout)
+            worker.calls += 1
+            worker.warm_keys.add(key)
+            healthy = reply[0] != 'limit'
+        finally:
+            for panel in panels:
+                panel.close()
+            self._release(worker, healthy)
+
+        self.total_calls += 1
+        status = reply[0]
+        if status == 'ok':
+            return reply[1]
+        if status == 'limit':
+            _, resource_type, message = reply
+            raise ResourceLimitError(
+                message, error_code="RESOURCE_LIMIT_EXCEEDED", resource_type=resource_type
+            )
+        _, error_type, error_message, tb = reply
+        logger.debug(f"沙箱策略执行失败:\n{tb}")
+        raise StrategyExecutionError(
+            f"{error_type}: {error_message}", error_code="STRATEGY_EXEC_ERROR",
+            strategy_key=key, entry=entry,
+        )
+
+    def _acquire(self, key: str) -> _SandboxWorker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise StrategyExecutionError("策略沙箱进程池已关闭", error_code="SANDBOX_CLOSED")
+                if self._idle:
+                    for i, worker in enumerate(self._idle):
+                        if key in worker.warm_keys:
+                            return self._idle.pop(i)
+                    return self._idle.pop()
+                if self._size < self.workers:
+                    self._size += 1
+                    break
+                self._cond.wait()
+        try:
+            return _SandboxWorker(self._ctx, self.limits)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: _SandboxWorker, healthy: bool) -> None:
+        """归还进程；超限、异常退出或达到调用次数的进程回收，由新进程替换"""
+        recycle = (not healthy or not worker.alive
+                   or worker.calls >= self.max_calls_per_worker or self._closed)
+        replacement = None
+        if recycle:
+            worker.stop() if worker.alive else worker.kill()
+            self.recycled += 1
+            if not self._closed:
+                try:
+                    replacement = _SandboxWorker(self._ctx, self.limits)
+                except Exception as e:
+                    logger.warning(f"沙箱进程替换失败（下次调用时重建）: {e}")
+        with self._cond:
+            if not recycle:
+                self._idle.append(worker)
+            elif replacement is not None:
+                self._idle.append(replacement)
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+    # ==================== 统计 ====================
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            idle = len(self._idle)
+            size = self._size
+        return {
+            'workers': size,
+            'idle': idle,
+            'total_calls': self.total_calls,
+            'cold_starts': self.cold_starts,
+            'recycled': self.recycled,
+        }
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+数据类型策略 (dtype policy)
+
+全项目统一的数值 / 代码 / 日期表示：
+- 浮点：特征、收益率、行情数值默认 float32（ML_FLOAT_DTYPE=float64 可整体回退）；
+  成交量 / 成交额（FULL_PRECISION_COLUMNS）量级大、需保留整数精度，始终为 float64
+- 股票代码：长表中为 category；需要整数编码时（模型输入、磁盘矩阵）使用进程内共享的
+  StockCodeDictionary，同一代码在所有数据集中得到同一个 int32 编号
+- 日期：需要紧凑存储时用 YYYYMMDD 的 int32（如磁盘训练矩阵），DataFrame 索引仍为 DatetimeIndex
+
+只在 ML / 面板路径的加载边界（DataQueryManager、全市场面板）应用一次，之后 FeatureEngineer /
+AlphaFactors / 模型输入保持该类型，不再逐列 pd.to_numeric。面向展示与 JSON 的逐股查询
+（如后端 StockDailyRepository.get_by_code_and_date_range）保持 float64。
+
+注意：DailyBarCache.normalize 的 float64 输出参与校验和计算，不受本策略影响。
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+SUPPORTED_FLOAT_DTYPES = ('float32', 'float64')
+DATE_INT_DTYPE = np.int32
+CODE_INT_DTYPE = np.int32
+
+# 不降精度的列：float32 只有 24 位尾数，成交量 / 成交额超过 2^24 即丢失整数精度
+FULL_PRECISION_COLUMNS = frozenset({'volume', 'amount'})
+
+_float_dtype_override: Optional[str] = None
+
+
+# ==================== 浮点 ====================
+
+def get_float_dtype() -> np.dtype:
+    """当前浮点类型（默认读取 settings.ml.float_dtype）"""
+    name = _float_dtype_override
+    if name is None:
+        try:
+            from src.config.settings import get_settings
+            name = get_settings().ml.float_dtype
+        except Exception:
+            name = 'float32'
+    if name not in SUPPORTED_FLOAT_DTYPES:
+        raise ValueError(f"不支持的浮点类型: {name}，可选: {SUPPORTED_FLOAT_DTYPES}")
+    return np.dtype(name)
+
+
+def set_float_dtype(name: Optional[str]) -> None:
+    """覆盖浮点类型（None 恢复为配置值），主要用于测试与脚本"""
+    global _float_dtype_override
+    if name is not None and name not in SUPPORTED_FLOAT_DTYPES:
+        raise ValueError(f"不支持的浮点类型: {name}，可选: {SUPPORTED_FLOAT_DTYPES}")
+    _float_dtype_override = name
+
+
+def downcast_floats(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    exclude: Iterable[str] = (),
+    inplace: bool = False
+) -> pd.DataFrame:
+    """
+    将数值列一次性转换为策略浮点类型
+
+    - columns=None 时处理所有 float 列；指定 columns 时这些列（可为 SQL 返回的
+      Decimal / object）一并转换，无法解析的值为 NaN
+    - 整数列（如成交笔数）与非数值列保持不变
+    - FULL_PRECISION_COLUMNS（成交量 / 成交额）只做数值解析，保持 float64
+
+    Args:
+        df: 输入 DataFrame
+        columns: 需要转换的列（None 表示所有浮点列）
+        exclude: 排除的列
+        inplace: 是否原地修改（保持 DataFrame 对象不变，供共享 df 的计算器使用）
+
+    Returns:
+        转换后的 DataFrame（inplace=True 时为同一对象）
+    """
+    target = get_float_dtype()
+    exclude = set(exclude)
+    if columns is None:
+        candidates = [c for c in df.columns if pd.api.types.is_float_dtype(df[c].dtype)]
+    else:
+        candidates = [c for c in columns if c in df.columns]
+    targets = {}
+    for c in candidates:
+        if c in exclude:
+            continue
+        dtype = np.dtype('float64') if c in FULL_PRECISION_COLUMNS else target
+        if df[c].dtype != dtype:
+            targets[c] = dtype
+    if not targets:
+        return df
+
+    converted = {}
+    for dtype in set(targets.values()):
+        cols = [c for c, t in targets.items() if t == dtype]
+        try:
+            frame = df[cols].astype(dtype)
+        except (TypeError, ValueError):
+            frame = df[cols].apply(pd.to_numeric, errors='coerce').astype(dtype)
+        converted.update({c: frame[c] for c in cols})
+
+    out = df if inplace else df.copy(deep=False)
+    for c in targets:
+        out[c] = converted[c]
+    return out
+
+
+# ==================== 股票代码 ====================
+
+class StockCodeDictionary:
+    """
+    共享股票代码字典（只增不减，线程安全）
+
+    同一进程内，代码 -> int32 编号的映射稳定：先出现的代码编号小，
+    之后加入的新代码不会改变已有编号。
+    """
+
+    def __init__(self, codes: Optional[Iterable[str]] = None):
+        self._lock = threading.Lock()
+        self._codes: List[str] = []
+        self._index: Dict[str, int] = {}
+        if codes is not None:
+            self.encode(list(codes))
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    @property
+    def codes(self) -> List[str]:
+        return list(self._codes)
+
+    def encode(self, values) -> np.ndarray:
+        """代码 -> int32 编号（新代码自动登记）"""
+        values = pd.Index(values).astype(str)
+        uniques = values.unique()
+        with self._lock:
+            for code in uniques:
+                if code not in self._index:
+                    self._index[code] = len(self._codes)
+                    self._codes.append(code)
+            mapping = pd.Series(self._index, dtype=CODE_INT_DTYPE)
+        return mapping.reindex(values).to_numpy(dtype=CODE_INT_DTYPE)
+
+    def decode(self, ids) -> np.ndarray:
+        """int32 编号 -> 代码"""
+        with self._lock:
+            table = np.asarray(self._codes, dtype=object)
+        return table[np.asarray(ids, dtype=np.int64)]
+
+
+_code_dictionary = StockCodeDictionary()
+
+
+def get_stock_code_dictionary() -> StockCodeDictionary:
+    """进程内共享的股票代码字典"""
+    return _code_dictionary
+
+
+def categorize_codes(df: pd.DataFrame, column: str = 'code') -> pd.DataFrame:
+    """
+    将长表的代码列转换为 category（类别仅包含本表出现的代码）
+
+    类别按共享字典编号排序，并同步登记到共享字典。
+    """
+    if column not in df.columns or isinstance(df[column].dtype, pd.CategoricalDtype):
+        return df
+    values = df[column].astype(str)
+    uniques = values.unique()
+    ids = _code_dictionary.encode(uniques)
+    categories = uniques[np.argsort(ids, kind='stable')]
+    out = df.copy(deep=False)
+    out[column] = pd.Categorical(values, categories=categories)
+    return out
+
+
+def pivot_panel(
+    df: pd.DataFrame,
+    values: str,
+    index: str = 'date',
+    columns: str = 'code'
+) -> pd.DataFrame:
+    """
+    长表透视为宽表面板（行=index，列=代码）
+
+    代码列为 category 时，结果列转换为普通字符串 Index，
+    避免下游按新代码赋值时触发 CategoricalIndex 的类别限制。
+    """
+    panel = df.pivot(index=index, columns=columns, values=values).sort_index()
+    if isinstance(panel.columns, pd.CategoricalIndex):
+        panel.columns = pd.Index(panel.columns.astype(str), name=panel.columns.name)
+    return panel
+
+
+# ==================== 日期 ====================
+
+def dates_to_int32(dates) -> np.ndarray:
+    """日期 -> YYYYMMDD int32"""
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    return (dates.year * 10000 + dates.month * 100 + dates.day).to_numpy(dtype=DATE_INT_DTYPE)
+
+
+def int32_to_dates(values) -> pd.DatetimeIndex:
+    """YYYYMMDD int32 -> DatetimeIndex"""
+    return pd.to_datetime(np.asarray(values).astype(str), format='%Y%m%d')
@@ -27,7 +27,7 @@ class MarketUtils:
     @staticmethod
     def is_trading_day(dt: datetime = None) -> bool:
         """
-        判断是否为交易日（简化版本，仅判断工作日）
+        判断是否为交易日
 
         Args:
             dt: 日期时间，默认为当前时间
@@ -36,11 +36,12 @@ class MarketUtils:
             bool: 是否为交易日
 
         Note:
-            完整版本应该查询交易日历数据库，这里简化为排除周末
+            使用进程内交易日历索引（含节假日），日历未覆盖或不可用时按周一至周五判断
         """
+        from src.data.trading_calendar import get_trading_calendar
+
         dt = dt or datetime.now()
-        # 周一到周五（0-4）
-        return dt.weekday() < 5
+        return get_trading_calendar().is_trading_day(dt)
 
     @staticmethod
     def is_trading_time(dt: datetime = None) -> bool:
@@ -38,7 +38,7 @@ class TestConnectionPoolManager(unittest.TestCase):
             'password': 'test_password'
         }
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_01_init(self, mock_pool):
         """测试1: 初始化"""
         print("\n[测试1] 初始化...")
@@ -54,7 +54,7 @@ class TestConnectionPoolManager(unittest.TestCase):
 
         print("  ✓ 初始化成功")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_02_get_connection(self, mock_pool):
         """测试2: 获取连接"""
         print("\n[测试2] 获取连接...")
@@ -75,7 +75,7 @@ class TestConnectionPoolManager(unittest.TestCase):
 
         print("  ✓ 获取连接成功")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_03_release_connection(self, mock_pool):
         """测试3: 释放连接"""
         print("\n[测试3] 释放连接...")
@@ -94,7 +94,7 @@ class TestConnectionPoolManager(unittest.TestCase):
 
         print("  ✓ 释放连接成功")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_04_close_all_connections(self, mock_pool):
         """测试4: 关闭所有连接"""
         print("\n[测试4] 关闭所有连接...")
@@ -123,7 +123,7 @@ class TestTableManager(unittest.TestCase):
         print("TableManager 单元测试")
         print("="*60)
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_01_init(self, mock_pool):
         """测试1: 初始化"""
         print("\n[测试1] 初始化...")
@@ -139,7 +139,7 @@ class TestTableManager(unittest.TestCase):
 
         print("  ✓ 初始化成功")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_02_create_tables(self, mock_pool):
         """测试2: 创建表"""
         print("\n[测试2] 创建表...")
@@ -178,7 +178,7 @@ class TestDataInsertManager(unittest.TestCase):
         print("DataInsertManager 单元测试")
         print("="*60)
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_01_save_stock_list(self, mock_pool):
         """测试1: 保存股票列表"""
         print("\n[测试1] 保存股票列表...")
@@ -215,7 +215,7 @@ class TestDataInsertManager(unittest.TestCase):
 
         print("  ✓ 保存股票列表成功")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_02_save_daily_data(self, mock_pool):
         """测试2: 保存日线数据"""
         print("\n[测试2] 保存日线数据...")
@@ -265,7 +265,7 @@ class TestDataQueryManager(unittest.TestCase):
         print("DataQueryManager 单元测试")
         print("="*60)
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('pandas.read_sql_query')
     def test_01_load_daily_data(self, mock_read_sql, mock_pool):
         """测试1: 加载日线数据"""
@@ -315,7 +315,7 @@ class TestDatabaseManager(unittest.TestCase):
         from database.db_manager import DatabaseManager
         DatabaseManager.reset_instance()
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_01_singleton_pattern(self, mock_pool):
         """测试1: 单例模式"""
         print("\n[测试1] 单例模式...")
@@ -328,7 +328,7 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertIs(db1, db2)
         print("  ✓ 单例模式正常工作")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_02_component_initialization(self, mock_pool):
         """测试2: 组件初始化"""
         print("\n[测试2] 组件初始化...")
@@ -344,7 +344,7 @@ class TestDatabaseManager(unittest.TestCase):
 
         print("  ✓ 所有组件初始化成功")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_03_delegation_pattern(self, mock_pool):
         """测试3: 委托模式"""
         print("\n[测试3] 委托模式...")
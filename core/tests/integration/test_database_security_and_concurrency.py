@@ -47,7 +47,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
     # ==================== SQL注入防护测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('pandas.read_sql_query')
     def test_sql_injection_in_stock_code(self, mock_read_sql, mock_pool):
         """测试：股票代码中的SQL注入防护"""
@@ -84,7 +84,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
         print("  ✓ SQL注入防护测试通过（股票代码）")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('pandas.read_sql_query')
     def test_sql_injection_in_date_params(self, mock_read_sql, mock_pool):
         """测试：日期参数中的SQL注入防护"""
@@ -117,7 +117,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
         print("  ✓ SQL注入防护测试通过（日期参数）")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('pandas.read_sql_query')
     def test_sql_injection_in_market_filter(self, mock_read_sql, mock_pool):
         """测试：市场过滤中的SQL注入防护"""
@@ -150,7 +150,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
         print("  ✓ SQL注入防护测试通过（市场过滤）")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_sql_injection_in_data_completeness_check(self, mock_pool):
         """测试：数据完整性检查中的SQL注入防护"""
         print("\n[安全测试4] 完整性检查SQL注入防护")
@@ -178,7 +178,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
     # ==================== 并发安全测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_concurrent_singleton_creation(self, mock_pool):
         """测试：并发创建单例的线程安全"""
         print("\n[并发测试1] 并发单例创建")
@@ -214,7 +214,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
         print(f"  ✓ 并发单例测试通过（{len(instances)}个线程）")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_concurrent_connection_acquisition(self, mock_pool):
         """测试：并发获取连接"""
         print("\n[并发测试2] 并发获取连接")
@@ -265,7 +265,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
         print(f"  ✓ 并发连接测试通过（{len(connections_obtained)}次获取）")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('pandas.read_sql_query')
     def test_concurrent_read_operations(self, mock_read_sql, mock_pool):
         """测试：并发读取操作"""
@@ -311,7 +311,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
         print(f"  ✓ 并发读取测试通过（{results.qsize()}个股票）")
 
     @patch('database.data_insert_manager.DataInsertManager.save_daily_data')
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_concurrent_write_operations(self, mock_pool, mock_save_daily):
         """测试：并发写入操作"""
         print("\n[并发测试4] 并发写入操作")
@@ -355,7 +355,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
         print(f"  ✓ 并发写入测试通过（{results.qsize()}个股票）")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_concurrent_mixed_operations(self, mock_pool):
         """测试：混合并发操作（读写混合）"""
         print("\n[并发测试5] 混合并发操作")
@@ -414,7 +414,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
     # ==================== 连接池压力测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_connection_pool_stress(self, mock_pool):
         """测试：连接池压力测试"""
         print("\n[压力测试1] 连接池压力测试")
@@ -473,7 +473,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
     # ==================== 事务隔离测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('database.data_insert_manager.extras.execute_batch')
     def test_transaction_isolation(self, mock_execute_batch, mock_pool):
         """测试：事务隔离"""
@@ -532,7 +532,7 @@ class TestDatabaseSecurityAndConcurrency(unittest.TestCase):
 
         print("  ✓ 事务隔离测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('database.data_insert_manager.extras.execute_batch')
     def test_transaction_rollback_on_concurrent_error(self, mock_execute_batch, mock_pool):
         """测试：并发错误时的事务回滚"""
@@ -0,0 +1,190 @@
+"""
+因子截面预处理单元测试
+
+测试功能：
+- 批量中性化与逐日 lstsq（行业哑变量 + log市值）残差一致
+- 去极值 / 标准化逐日期截面计算
+- 多因子批量处理与逐因子处理一致
+- 接入 ICCalculator / FactorOptimizer / MultiFactorStrategy
+"""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.factor_optimizer import FactorOptimizer
+from src.analysis.factor_preprocessor import (
+    CrossSectionalPreprocessor,
+    cross_sectional_pct_rank,
+    cross_sectional_zscore,
+    neutralize,
+    winsorize_mad,
+)
+from src.analysis.ic_calculator import ICCalculator
+from src.strategies.predefined.multi_factor_strategy import MultiFactorStrategy
+
+
+@pytest.fixture
+def universe():
+    """行业 + 市值 + 带行业/市值暴露的因子"""
+    rng = np.random.default_rng(1)
+    dates = pd.date_range('2023-01-02', periods=40, freq='B')
+    stocks = [f'{i:06d}' for i in range(50)]
+
+    industry = pd.Series(rng.choice(['银行', '医药', '电子', '食品'], 50), index=stocks)
+    industry = industry.drop(stocks[-2:])  # 缺少行业信息
+    market_cap = pd.DataFrame(
+        np.exp(rng.normal(12, 1, (40, 50))), index=dates, columns=stocks
+    )
+    market_cap.iloc[3, 4] = np.nan
+
+    industry_effect = industry.reindex(stocks).map({'银行': 1.0, '医药': -1.0, '电子': 0.5, '食品': 0.0})
+    factor = pd.DataFrame(
+        rng.normal(size=(40, 50)) + industry_effect.fillna(0).to_numpy() + 0.3 * np.log(market_cap.to_numpy()),
+        index=dates, columns=stocks
+    )
+    factor.iloc[5, :45] = np.nan  # 样本不足的日期
+    factor.iloc[::6, 7] = np.nan
+    return factor, industry, market_cap
+
+
+class TestNeutralize:
+
+    def test_matches_per_date_lstsq(self, universe):
+        factor, industry, market_cap = universe
+        preprocessor = CrossSectionalPreprocessor(
+            winsorize=None, standardize=None, industry=industry, market_cap=market_cap
+        )
+
+        result = preprocessor.transform(factor)
+
+        log_mv = np.log(market_cap.to_numpy())
+        dummies = pd.get_dummies(industry.reindex(factor.columns)).to_numpy(dtype=float)
+        for t in range(len(factor)):
+            y = factor.iloc[t].to_numpy()
+            valid = np.isfinite(y) & np.isfinite(log_mv[t]) & industry.reindex(factor.columns).notna().to_numpy()
+            if valid.sum() < 10:
+                assert result.iloc[t].isna().all()
+                continue
+            design = np.column_stack([dummies[valid], log_mv[t, valid]])
+            coef, *_ = np.linalg.lstsq(design, y[valid], rcond=None)
+            np.testing.assert_allclose(result.iloc[t].to_numpy()[valid], y[valid] - design @ coef, atol=1e-9)
+            assert result.iloc[t].isna().to_numpy()[~valid].all()
+
+    def test_intercept_only_is_demeaning(self):
+        values = np.array([[1.0, 2.0, np.nan, 5.0]])
+        result = neutralize(values, min_samples=2)
+        np.testing.assert_allclose(result[0, [0, 1, 3]], [-5 / 3, -2 / 3, 7 / 3])
+        assert np.isnan(result[0, 2])
+
+
+class TestCrossSectionalOps:
+
+    def test_winsorize_mad_skips_degenerate_sections(self):
+        values = np.array([
+            [1.0, 2.0, 3.0, 2.5, 100.0],
+            [0.0, 0.0, 0.0, 1.0, 5.0],
+        ])
+        result = winsorize_mad(values, n_mad=3.0)
+
+        assert result[0, 4] == pytest.approx(2.5 + 3 * 1.4826 * 0.5)
+        np.testing.assert_array_equal(result[1], values[1])
+
+    def test_zscore_and_rank_match_pandas(self, universe):
+        factor, _, _ = universe
+        values = factor.to_numpy()
+
+        expected_z = factor.sub(factor.mean(axis=1), axis=0).div(factor.std(axis=1), axis=0)
+        np.testing.assert_allclose(cross_sectional_zscore(values), expected_z.to_numpy(), atol=1e-12)
+        np.testing.assert_allclose(
+            cross_sectional_pct_rank(values), factor.rank(axis=1, pct=True).to_numpy()
+        )
+
+    def test_transform_dict_matches_single(self, universe):
+        factor, industry, market_cap = universe
+        other = factor.iloc[5:, :40] ** 2
+        preprocessor = CrossSectionalPreprocessor(
+            winsorize='quantile', standardize='zscore', industry=industry, market_cap=market_cap
+        )
+
+        result = preprocessor.transform_dict({'A': factor, 'B': other})
+
+        pd.testing.assert_frame_equal(result['A'], preprocessor.transform(factor))
+        pd.testing.assert_frame_equal(result['B'], preprocessor.transform(other))
+
+    def test_invalid_method(self):
+        with pytest.raises(ValueError):
+            CrossSectionalPreprocessor(standardize='robust')
+
+    def test_from_database(self, universe):
+        _, industry, market_cap = universe
+        long = market_cap.stack().rename('total_mv').rename_axis(['date', 'code']).reset_index()
+        db = MagicMock()
+        db.get_stock_industries.return_value = industry
+        db.load_market_daily.return_value = long
+
+        preprocessor = CrossSectionalPreprocessor.from_database(db, '2023-01-01', '2023-03-01')
+
+        db.load_market_daily.assert_called_once_with(
+            '2023-01-01', '2023-03-01', codes=None, columns=['total_mv']
+        )
+        assert preprocessor.neutralizes
+        pd.testing.assert_frame_equal(
+            preprocessor.market_cap, market_cap.dropna(how='all'), check_names=False, check_freq=False
+        )
+
+
+class TestConsumers:
+
+    def test_ic_calculator_uses_preprocessor(self, universe):
+        factor, industry, market_cap = universe
+        prices = 10 * market_cap / market_cap.iloc[0]
+        preprocessor = CrossSectionalPreprocessor(industry=industry, market_cap=market_cap)
+
+        calculator = ICCalculator(forward_periods=1, method='spearman', preprocessor=preprocessor)
+        calculator.parallel_config = None
+        baseline = ICCalculator(forward_periods=1, method='spearman')
+        baseline.parallel_config = None
+
+        pd.testing.assert_series_equal(
+            calculator.calculate_ic_series(factor, prices),
+            baseline.calculate_ic_series(preprocessor.transform(factor), prices)
+        )
+
+    def test_combine_factors_cross_sectional(self, universe):
+        factor, industry, market_cap = universe
+        preprocessor = CrossSectionalPreprocessor(industry=industry, market_cap=market_cap)
+        weights = pd.Series([0.7, 0.3], index=['A', 'B'])
+
+        combined = FactorOptimizer().combine_factors(
+            {'A': factor, 'B': -factor.shift(1)}, weights, preprocessor=preprocessor
+        )
+
+        row = combined.iloc[10].dropna()
+        assert row.mean() == pytest.approx(0, abs=1e-12)
+        assert row.std() == pytest.approx(1)
+
+    def test_multi_factor_strategy_neutralized_scores(self, universe):
+        factor, industry, market_cap = universe
+        features = pd.concat({'F1': factor, 'F2': factor.rank(axis=1)}, axis=1)
+        strategy = MultiFactorStrategy('MF', {
+            'factors': ['F1', 'F2'], 'normalize_method': 'zscore', 'neutralize': True, 'top_n': 5
+        })
+
+        raw = strategy.calculate_score_matrix(features)
+        strategy.set_neutralization_data(industry, market_cap)
+        scores = strategy.calculate_score_matrix(features)
+
+        date = factor.index[10]
+        single = strategy.calculate_scores(None, features, date=date)
+        pd.testing.assert_series_equal(single, scores.loc[date], check_names=False)
+
+        groups = industry.reindex(scores.columns)
+        raw_spread = raw.loc[date].groupby(groups).mean().abs().max()
+        neutral_spread = scores.loc[date].groupby(groups).mean().abs().max()
+        assert neutral_spread < raw_spread
+
+        signals = strategy.generate_signals(market_cap, features=features)
+        assert signals.shape == market_cap.shape
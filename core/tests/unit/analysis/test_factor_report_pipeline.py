@@ -0,0 +1,181 @@
+"""
+因子分析报告流水线单元测试
+
+测试功能：
+- 向量化IC / 分层与 ICCalculator / LayeringTest 逐因子结果一致
+- 分块与线程并行不影响结果
+- IC衰减
+- 相关性分析复用对齐立方体
+- FactorAnalyzer 批量路径接入流水线
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.factor_analyzer import FactorAnalyzer
+from src.analysis.factor_correlation import FactorCorrelation
+from src.analysis.factor_report_pipeline import FactorReportPipeline, FactorStack
+from src.analysis.ic_calculator import ICCalculator
+from src.analysis.layering_test import LayeringTest
+
+
+@pytest.fixture
+def market():
+    """价格 + 三类因子：连续值、大量并列的离散值、日期/股票与价格不完全重合"""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2023-01-02', periods=120, freq='B')
+    stocks = [f'{i:06d}.SZ' for i in range(60)]
+
+    prices = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.02, (120, 60)), axis=0)),
+        index=dates, columns=stocks
+    )
+    prices.iloc[30:40, 5] = np.nan  # 停牌
+
+    momentum = prices.pct_change(10)
+    discrete = pd.DataFrame(rng.integers(0, 3, (120, 60)).astype(float), index=dates, columns=stocks)
+    partial = pd.DataFrame(
+        rng.normal(size=(100, 62)),
+        index=dates[10:110],
+        columns=stocks + ['999998.SH', '999999.SH']
+    )
+    partial.iloc[::7, ::3] = np.nan
+
+    factors = {'MOM10': momentum, 'DISCRETE': discrete, 'PARTIAL': partial}
+    return factors, prices
+
+
+def _serial_calculator(method):
+    calculator = ICCalculator(forward_periods=5, method=method)
+    calculator.parallel_config = None
+    return calculator
+
+
+class TestEquivalence:
+
+    @pytest.mark.parametrize('method', ['spearman', 'pearson'])
+    def test_matches_per_factor_analysis(self, market, method):
+        factors, prices = market
+        result = FactorReportPipeline(method=method, block_size=2).run(factors, prices)
+
+        calculator = _serial_calculator(method)
+        layering = LayeringTest(n_layers=5, holding_period=5)
+
+        for name, factor_df in factors.items():
+            report = result.reports[name]
+
+            expected_ic = calculator.calculate_ic_stats(factor_df, prices).data
+            pd.testing.assert_series_equal(
+                report.ic_result.ic_series, expected_ic.ic_series, rtol=1e-9, check_freq=False
+            )
+            assert report.ic_result.ic_ir == pytest.approx(expected_ic.ic_ir, rel=1e-9)
+
+            expected_layers = layering.perform_layering_test(factor_df, prices)
+            pd.testing.assert_frame_equal(report.layering_result, expected_layers, rtol=1e-9)
+
+        # 离散因子分位点重复，退回 qcut 后只剩3层，单调性分析失败记为警告
+        assert 'DISCRETE' in result.warnings
+        assert result.reports['MOM10'].layering_summary is not None
+
+    def test_blocks_and_threads_do_not_change_results(self, market):
+        factors, prices = market
+        serial = FactorReportPipeline(block_size=32).run(factors, prices)
+        threaded = FactorReportPipeline(block_size=1, n_jobs=3).run(factors, prices)
+
+        assert threaded.n_blocks == 3
+        for name in factors:
+            pd.testing.assert_series_equal(
+                serial.reports[name].ic_result.ic_series,
+                threaded.reports[name].ic_result.ic_series
+            )
+            pd.testing.assert_frame_equal(
+                serial.reports[name].layering_result,
+                threaded.reports[name].layering_result
+            )
+
+    def test_ic_decay(self, market):
+        factors, prices = market
+        result = FactorReportPipeline(decay_periods=[1, 5, 10]).run(factors, prices, include_layering=False)
+
+        decay = result.reports['MOM10'].ic_decay
+        assert list(decay.index) == [1, 5, 10]
+        expected = _serial_calculator('spearman').analyze_ic_decay(factors['MOM10'], prices, max_period=10)
+        np.testing.assert_allclose(decay['ICIR'], expected.loc[[1, 5, 10], 'ICIR'], rtol=1e-9)
+        assert result.reports['MOM10'].layering_result is None
+
+    def test_empty_factor_is_error(self, market):
+        factors, prices = market
+        result = FactorReportPipeline().run({'EMPTY': pd.DataFrame(), **factors}, prices, keep_stack=True)
+
+        assert set(result.errors) == {'EMPTY'}
+        assert list(result.reports) == list(factors)
+        assert result.stack.names == list(factors)
+
+
+class TestCorrelationFromStack:
+
+    @pytest.mark.parametrize('method', ['pearson', 'spearman', 'kendall'])
+    @pytest.mark.parametrize('aggregate_method', ['mean', 'concat'])
+    def test_matches_dict_path(self, market, method, aggregate_method):
+        factors, _ = market
+        factors = {name: factors[name] for name in ['MOM10', 'PARTIAL']}
+        analyzer = FactorCorrelation(method=method)
+
+        expected = analyzer.calculate_factor_correlation(factors, aggregate_method)
+        stack = FactorStack.from_dict(factors, with_ranks=True)
+        result = analyzer.calculate_factor_correlation(factors, aggregate_method, stack=stack)
+
+        pd.testing.assert_frame_equal(
+            result, expected.loc[result.index, result.columns], rtol=1e-9, check_names=False
+        )
+
+    def test_pipeline_stack_ranks_reused(self, market):
+        factors, prices = market
+        result = FactorReportPipeline(method='spearman').run(factors, prices, keep_stack=True)
+
+        stack = result.stack
+        assert stack.values.shape == (3,) + prices.shape
+        expected = factors['MOM10'].reindex(index=prices.index, columns=prices.columns).rank(axis=1)
+        np.testing.assert_array_equal(stack.ranks[0], expected.to_numpy())
+
+
+class TestAnalyzerIntegration:
+
+    def test_full_report_uses_single_pass(self, market):
+        factors, prices = market
+        analyzer = FactorAnalyzer(method='spearman')
+
+        report = analyzer.generate_full_report(factors, prices, decay_periods=[1, 5])
+
+        assert set(report['individual_analysis']) == set(factors)
+        assert report['individual_analysis']['MOM10']['ic_decay'][5]['ICIR'] == pytest.approx(
+            report['individual_analysis']['MOM10']['ic_analysis']['ic_ir']
+        )
+        assert [row['因子名'] for row in report['comparison']] == \
+            analyzer.compare_factors(factors, prices, include_correlation=False)['因子名'].tolist()
+        assert set(report['correlation']['correlation_matrix']) == set(factors)
+        assert report['optimization'] is not None
+
+    def test_full_report_respects_include_flags(self, market):
+        factors, prices = market
+        report = FactorAnalyzer().generate_full_report(
+            factors, prices, include_layering=False, include_correlation=False, include_optimization=False
+        )
+
+        individual = report['individual_analysis']['MOM10']
+        assert 'ic_analysis' in individual and 'layering_test' not in individual
+        # 对比表仍包含分层指标
+        assert any('收益差距' in row for row in report['comparison'])
+
+    def test_batch_analyze_matches_quick_analyze(self, market):
+        factors, prices = market
+        analyzer = FactorAnalyzer()
+
+        response = analyzer.batch_analyze(factors, prices)
+
+        assert response.metadata['n_blocks'] == 1
+        for name, factor_df in factors.items():
+            expected = analyzer.quick_analyze(factor_df, prices, factor_name=name).data
+            assert response.data[name].overall_score == pytest.approx(expected.overall_score)
+            assert response.data[name].recommendation == expected.recommendation
@@ -0,0 +1,98 @@
+"""
+测试回测交易执行器的批量接口 (BacktestExecutor)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.backtest_executor import BacktestExecutor
+from src.backtest.backtest_portfolio import BacktestPortfolio
+from src.backtest.cost_analyzer import TradingCostAnalyzer
+from src.backtest.slippage_models import MarketImpactModel
+
+
+@pytest.fixture
+def market():
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2024-01-01', periods=30)
+    codes = [f'{600000 + i:06d}' if i % 2 else f'{i:06d}' for i in range(40)]
+    volumes = pd.DataFrame(rng.uniform(1e5, 1e7, (len(dates), len(codes))), index=dates, columns=codes)
+    volumes.iloc[-5:, :3] = np.nan
+    volatilities = pd.DataFrame(rng.uniform(0.01, 0.04, (len(dates), len(codes))), index=dates, columns=codes)
+    prices = pd.Series(rng.uniform(5, 80, len(codes)), index=codes)
+    return {'volumes': volumes, 'volatilities': volatilities}, prices, dates[-1]
+
+
+def _executor(cache):
+    return BacktestExecutor(
+        commission_rate=0.0003,
+        stamp_tax_rate=0.001,
+        min_commission=5.0,
+        slippage_model=MarketImpactModel(),
+        cost_analyzer=TradingCostAnalyzer(),
+        market_data_cache=cache
+    )
+
+
+class TestBatchExecution:
+    """批量接口与逐笔接口结果一致"""
+
+    def test_price_orders_matches_scalar(self, market):
+        """批量成交价与成本与逐笔计算一致"""
+        cache, prices, date = market
+        executor = _executor(cache)
+        codes = list(prices.index)
+        shares = np.full(len(codes), 1000.0)
+        is_buy = np.arange(len(codes)) % 3 != 0
+
+        result = executor.price_orders(codes, prices.values, shares, is_buy, date)
+
+        for i, code in enumerate(codes):
+            price = executor.calculate_actual_price_with_slippage(code, prices[code], 1000, bool(is_buy[i]), date)
+            cost = executor.calculate_trading_cost(1000 * price, bool(is_buy[i]), code)
+            assert result['actual_price'][i] == pytest.approx(price)
+            assert result['total_cost'][i] == pytest.approx(cost)
+        assert (result['slippage'] >= 0).all()
+
+    def test_execute_buy_batch_matches_sequential(self, market):
+        """批量买入与逐笔买入的组合状态与交易记录一致"""
+        cache, prices, date = market
+        codes = list(prices.index)
+
+        sequential = _executor(cache)
+        seq_portfolio = BacktestPortfolio(1_000_000)
+        for code in codes:
+            sequential.execute_buy(seq_portfolio, code, prices[code], 30_000, date)
+
+        batch = _executor(cache)
+        batch_portfolio = BacktestPortfolio(1_000_000)
+        executed = batch.execute_buy_batch(batch_portfolio, codes, prices.values, 30_000, date)
+
+        assert sum(executed) == sequential.cost_analyzer.n_trades
+        assert batch_portfolio.get_cash() == pytest.approx(seq_portfolio.get_cash())
+        assert batch_portfolio.long_positions.keys() == seq_portfolio.long_positions.keys()
+        pd.testing.assert_frame_equal(
+            batch.cost_analyzer.get_trades_dataframe(), sequential.cost_analyzer.get_trades_dataframe()
+        )
+
+    def test_execute_sell_batch_matches_sequential(self, market):
+        """批量卖出与逐笔卖出一致，未持仓的股票跳过"""
+        cache, prices, date = market
+        codes = list(prices.index)[:10]
+
+        results = []
+        for use_batch in (False, True):
+            executor = _executor(cache)
+            portfolio = BacktestPortfolio(1_000_000)
+            executor.execute_buy_batch(portfolio, codes[:8], prices[codes[:8]].values, 50_000, date)
+            if use_batch:
+                executed = executor.execute_sell_batch(portfolio, codes, prices[codes].values, date)
+                assert executed == [True] * 8 + [False] * 2
+            else:
+                for code in codes:
+                    executor.execute_sell(portfolio, code, prices[code], date)
+            results.append((portfolio.get_cash(), executor.cost_analyzer.get_trades_dataframe()))
+
+        assert results[0][0] == pytest.approx(results[1][0])
+        pd.testing.assert_frame_equal(results[0][1], results[1][1])
@@ -0,0 +1,150 @@
+"""
+测试回测数据记录器 (BacktestRecorder) 与持仓事件账本 (PositionLedger)
+"""
+
+import copy
+
+import pandas as pd
+import pytest
+
+from src.backtest.backtest_recorder import BacktestRecorder
+from src.backtest.position_ledger import PositionLedger, PositionHistory
+
+
+def _long_snapshots(n_days=30, n_codes=20):
+    """逐日多头快照：持仓大部分时间不变，偶尔调仓"""
+    dates = pd.bdate_range('2024-01-01', periods=n_days)
+    snapshots = []
+    held = {}
+    for i, date in enumerate(dates):
+        if i % 5 == 0:
+            # 每 5 天调仓：平掉一只、开一只、加仓一只
+            if held:
+                held.pop(sorted(held)[0])
+            code = f'{i % n_codes:06d}.SZ'
+            held[code] = {'shares': 100 * (i + 1), 'entry_price': 10.0 + i, 'entry_date': date}
+            first = sorted(held)[-1]
+            held[first] = {**held[first], 'shares': held[first]['shares'] + 100}
+        snapshots.append((date, {'long': {k: dict(v) for k, v in held.items()}}))
+    return snapshots
+
+
+class TestPositionLedger:
+    """测试持仓事件账本"""
+
+    def test_reconstruct_matches_snapshots(self):
+        """逐日重建结果与原始完整快照一致"""
+        snapshots = _long_snapshots()
+        ledger = PositionLedger()
+        for date, snapshot in snapshots:
+            ledger.record(date, snapshot)
+
+        expected = [{'date': d, **copy.deepcopy(s)} for d, s in snapshots]
+        assert list(ledger.iter_snapshots()) == expected
+        assert ledger.snapshot_at(12) == expected[12]
+        assert ledger.snapshot_at(-1) == expected[-1]
+
+    def test_only_changes_recorded(self):
+        """持仓不变的交易日不产生事件"""
+        snapshots = _long_snapshots(n_days=30)
+        ledger = PositionLedger()
+        for date, snapshot in snapshots:
+            ledger.record(date, snapshot)
+
+        total_positions = sum(len(s['long']) for _, s in snapshots)
+        assert ledger.n_events < total_positions
+        assert set(ledger.to_arrow().column('day').to_pylist()) <= {0, 5, 10, 15, 20, 25}
+
+    def test_short_positions_structure(self):
+        """多空账簿及空头附加字段的重建"""
+        date1, date2 = pd.Timestamp('2024-01-02'), pd.Timestamp('2024-01-03')
+        short = {'stock_code': '600000.SH', 'shares': 200, 'entry_price': 8.5,
+                 'entry_date': date1, 'margin_rate': 0.5, 'initial_amount': 1700.0}
+        ledger = PositionLedger()
+        ledger.record(date1, {'long_positions': {}, 'short_positions': {'600000.SH': short}})
+        ledger.record(date2, {'long_positions': {}, 'short_positions': {}})
+
+        assert ledger.snapshot_at(0) == {
+            'date': date1, 'long_positions': {}, 'short_positions': {'600000.SH': short}
+        }
+        assert ledger.snapshot_at(1) == {'date': date2, 'long_positions': {}, 'short_positions': {}}
+
+    def test_arrow_roundtrip(self):
+        """Arrow 序列化后恢复的账本重建结果不变"""
+        ledger = PositionLedger()
+        for date, snapshot in _long_snapshots():
+            ledger.record(date, snapshot)
+
+        restored = PositionLedger.from_arrow(ledger.to_arrow(), ledger.books_to_arrow())
+        assert list(restored.iter_snapshots()) == list(ledger.iter_snapshots())
+
+
+class TestBacktestRecorder:
+    """测试 BacktestRecorder"""
+
+    def _recorder(self):
+        recorder = BacktestRecorder()
+        for i, (date, snapshot) in enumerate(_long_snapshots()):
+            recorder.record_portfolio_value(date, cash=1000.0 - i, holdings=500.0 + i * 2, total=1500.0 + i)
+            recorder.record_positions(date, snapshot)
+        recorder.record_trade(pd.Timestamp('2024-01-01'), '000000.SZ', 'buy', 100, 10.0, entry_reason='signal')
+        return recorder
+
+    def test_positions_history_view(self):
+        """get_positions_history 兼容列表用法"""
+        recorder = self._recorder()
+        history = recorder.get_positions_history()
+
+        assert isinstance(history, PositionHistory)
+        assert len(history) == 30
+        assert history[0]['date'] == pd.Timestamp('2024-01-01')
+        assert len(history[:3]) == 3
+        assert recorder.get_positions_at(pd.Timestamp('2024-01-01')) == history[0]
+
+    def test_portfolio_value_columns(self):
+        """列式净值存储与 DataFrame 输出"""
+        recorder = self._recorder()
+        df = recorder.get_portfolio_value_df()
+
+        assert list(df.columns) == ['cash', 'holdings', 'total']
+        assert df['total'].iloc[-1] == 1529.0
+        assert recorder.portfolio_values[1] == {
+            'date': pd.Timestamp('2024-01-02'), 'cash': 999.0, 'holdings': 502.0, 'total': 1501.0
+        }
+
+    def test_read_views_reject_writes(self):
+        """只读视图上的写入直接报错，不会静默丢失"""
+        recorder = self._recorder()
+
+        with pytest.raises(AttributeError):
+            recorder.portfolio_values.append({'date': pd.Timestamp('2024-03-01'), 'total': 0.0})
+        with pytest.raises(TypeError):
+            recorder.portfolio_values[0]['total'] = 0.0
+        with pytest.raises(AttributeError):
+            recorder.positions_history.append({})
+        assert len(recorder.portfolio_values) == 30
+
+    def test_parquet_roundtrip(self, tmp_path):
+        """Parquet 写入与恢复"""
+        recorder = self._recorder()
+        paths = recorder.write_parquet(str(tmp_path))
+        restored = BacktestRecorder.read_parquet(str(tmp_path))
+
+        pd.testing.assert_frame_equal(
+            restored.get_portfolio_value_df(), recorder.get_portfolio_value_df(), check_index_type=False
+        )
+        assert restored.get_positions_history().to_list() == recorder.get_positions_history().to_list()
+        assert restored.trades[0]['stock_code'] == '000000.SZ'
+
+        page = BacktestRecorder.read_page(paths['portfolio_value'], offset=10, limit=5)
+        assert page.num_rows == 5
+        assert page.column('total').to_pylist()[0] == 1510.0
+
+    def test_clear(self):
+        """清空记录"""
+        recorder = self._recorder()
+        recorder.clear()
+
+        assert len(recorder.get_positions_history()) == 0
+        assert recorder.get_portfolio_value_df().empty
+        assert recorder.trades == []
@@ -760,3 +760,39 @@ class TestVerboseOutput:
         assert isinstance(scenarios, pd.DataFrame)
         assert 'cost_multiplier' in scenarios.columns
         assert 'total_cost' in scenarios.columns
+
+
+class TestBatchTrades:
+    """测试批量追加交易记录"""
+
+    def test_add_trades_matches_single(self):
+        """批量追加与逐笔追加的统计结果一致"""
+        date = datetime(2023, 1, 3)
+        codes = ['600000', '000001', '600000']
+        shares = [1000, 500, 200]
+        prices = [10.0, 20.0, 10.5]
+        commissions = [5.0, 5.0, 5.0]
+        slippages = [10.0, 4.0, 1.0]
+
+        single = TradingCostAnalyzer()
+        for i, code in enumerate(codes):
+            single.add_trade_from_dict(date, code, 'buy', shares[i], prices[i], commissions[i],
+                                       slippage=slippages[i])
+
+        batch = TradingCostAnalyzer()
+        batch.add_trades(date, codes, 'buy', shares, prices, commissions, slippages=slippages)
+
+        assert batch.n_trades == 3
+        assert batch.calculate_total_costs() == single.calculate_total_costs()
+        pd.testing.assert_frame_equal(batch.get_trades_dataframe(), single.get_trades_dataframe())
+        pd.testing.assert_frame_equal(batch.calculate_cost_by_stock(), single.calculate_cost_by_stock())
+        assert batch.trades[0].shares == 1000
+        assert batch.trades[2].total_cost == pytest.approx(6.0)
+
+    def test_add_trades_empty(self):
+        """空批次不产生记录"""
+        analyzer = TradingCostAnalyzer()
+        analyzer.add_trades(datetime(2023, 1, 3), [], 'sell', [], [], [])
+
+        assert analyzer.n_trades == 0
+        assert analyzer.get_trades_dataframe().empty
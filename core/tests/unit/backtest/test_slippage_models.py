@@ -752,3 +752,71 @@ class TestBidAskSpreadModelEdgeCases:
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v', '--tb=short'])
+
+
+class TestBatchSlippage:
+    """测试批量（向量化）接口与逐笔接口结果一致"""
+
+    @pytest.fixture
+    def orders(self):
+        rng = np.random.default_rng(42)
+        n = 300
+        avg_volume = rng.uniform(1e6, 1e8, n)
+        avg_volume[::7] = np.nan  # 部分订单缺少成交量数据
+        volatility = rng.uniform(0.01, 0.05, n)
+        volatility[::11] = np.nan
+        bid = rng.uniform(9.9, 10.0, n)
+        ask = bid + 0.02
+        bid[::3] = np.nan  # 部分订单无盘口
+        return {
+            'order_sizes': rng.uniform(1e4, 1e6, n),
+            'prices': rng.uniform(5, 50, n),
+            'is_buy': rng.random(n) > 0.5,
+            'avg_volume': avg_volume,
+            'volatility': volatility,
+            'bid_price': bid,
+            'ask_price': ask,
+        }
+
+    @staticmethod
+    def _scalar(model, orders, method):
+        results = []
+        for i in range(len(orders['order_sizes'])):
+            kwargs = {
+                k: (None if np.isnan(orders[k][i]) else orders[k][i])
+                for k in ('avg_volume', 'volatility', 'bid_price', 'ask_price')
+            }
+            results.append(getattr(model, method)(
+                orders['order_sizes'][i], orders['prices'][i], bool(orders['is_buy'][i]), **kwargs
+            ))
+        return np.array(results)
+
+    @pytest.mark.parametrize('model', [
+        FixedSlippageModel(slippage_pct=0.001),
+        VolumeBasedSlippageModel(base_slippage=0.0005, impact_coefficient=0.05, max_slippage=0.01),
+        MarketImpactModel(volatility_weight=0.5, volume_impact_alpha=0.6),
+        BidAskSpreadModel(base_spread=0.0002),
+    ], ids=repr)
+    def test_batch_matches_scalar(self, model, orders):
+        """批量成交价与滑点金额与逐笔计算一致"""
+        kwargs = {k: orders[k] for k in ('avg_volume', 'volatility', 'bid_price', 'ask_price')}
+
+        prices = model.get_actual_prices(orders['order_sizes'], orders['prices'], orders['is_buy'], **kwargs)
+        slippages = model.calculate_slippages(orders['order_sizes'], orders['prices'], orders['is_buy'], **kwargs)
+
+        np.testing.assert_allclose(prices, self._scalar(model, orders, 'get_actual_price'))
+        np.testing.assert_allclose(slippages, self._scalar(model, orders, 'calculate_slippage'))
+
+    def test_base_class_fallback(self, orders):
+        """未覆盖批量接口的自定义模型逐笔回退"""
+
+        class HalfPercentModel(SlippageModel):
+            def calculate_slippage(self, order_size, price, is_buy, **kwargs):
+                return order_size * 0.005
+
+            def get_actual_price(self, order_size, reference_price, is_buy, **kwargs):
+                return reference_price * (1.005 if is_buy else 0.995)
+
+        model = HalfPercentModel()
+        prices = model.get_actual_prices(orders['order_sizes'][:5], orders['prices'][:5], True)
+        np.testing.assert_allclose(prices, orders['prices'][:5] * 1.005)
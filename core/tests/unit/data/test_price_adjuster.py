@@ -0,0 +1,92 @@
+"""
+测试复权价格服务 (PriceAdjuster)
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.data.price_adjuster import PriceAdjuster
+from src.exceptions import DataValidationError
+
+
+def _market(codes=('000001.SZ', '600000.SH')):
+    """两只股票，000001.SZ 在第 6 天除权（因子 1.0 → 2.0，价格减半）"""
+    dates = pd.bdate_range('2024-01-01', periods=10)
+    rows = []
+    for code in codes:
+        for i, d in enumerate(dates):
+            split = code == '000001.SZ' and i >= 5
+            price = 10.0 / (2 if split else 1)
+            rows.append({
+                'code': code, 'date': d,
+                'open': price, 'high': price, 'low': price, 'close': price,
+                'volume': 1000.0, 'amount': 1e4,
+                'adj_factor': 2.0 if split else 1.0,
+            })
+    return pd.DataFrame(rows)
+
+
+def _panels(market, adjust):
+    """透视为面板后复权，返回复权后的面板字典"""
+    panels = {
+        field: market.pivot(index='date', columns='code', values=field)
+        for field in ('close', 'volume')
+    }
+    factors = PriceAdjuster.build_factor_matrix(
+        market.pivot(index='date', columns='code', values='adj_factor')
+    )
+    return PriceAdjuster.adjust_panels(panels, factors, adjust=adjust)
+
+
+class TestPriceAdjuster:
+    """测试 PriceAdjuster"""
+
+    def test_forward_adjust_removes_split_gap(self):
+        """前复权：除权前价格按最新因子缩放，收盘价序列连续"""
+        close = _panels(_market(), adjust='qfq')['close']
+
+        assert np.allclose(close['000001.SZ'], 5.0)
+        assert np.allclose(close['600000.SH'], 10.0)
+
+    def test_backward_adjust_scales_recent_prices(self):
+        """后复权：除权后价格乘以累计因子"""
+        close = _panels(_market(), adjust='hfq')['close']
+
+        assert np.allclose(close['000001.SZ'], 10.0)
+
+    def test_forward_adjust_point_in_time(self):
+        """前复权基准日在除权前：不引入之后的除权信息"""
+        market = _market()
+        close = _panels(market[market['date'] <= '2024-01-05'], adjust='qfq')['close']
+
+        assert np.allclose(close['000001.SZ'], 10.0)
+
+    def test_volume_not_adjusted(self):
+        """成交量不复权"""
+        volume = _panels(_market(), adjust='qfq')['volume']
+
+        assert np.allclose(volume.values, 1000.0)
+
+    def test_adjust_long_matches_panels(self):
+        """长表复权与面板复权结果一致"""
+        market = _market()
+        long_adj = PriceAdjuster.adjust_long(market, adjust='qfq')
+        panel = long_adj.pivot(index='date', columns='code', values='close')
+
+        expected = _panels(market, adjust='qfq')['close']
+        pd.testing.assert_frame_equal(panel, expected, check_names=False)
+
+    def test_missing_factor_means_unadjusted(self):
+        """没有复权因子的股票保持原价"""
+        market = _market()
+        market['adj_factor'] = np.nan
+        close = _panels(market, adjust='hfq')['close']
+
+        assert close.loc['2024-01-01', '000001.SZ'] == 10.0
+        assert close.loc['2024-01-12', '000001.SZ'] == 5.0
+
+    def test_unsupported_adjust(self):
+        """不支持的复权方式"""
+        with pytest.raises(DataValidationError):
+            PriceAdjuster.adjust_long(_market(), adjust='abc')
@@ -0,0 +1,115 @@
+"""
+测试交易日历内存索引 (TradingCalendarIndex)
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.trading_calendar import TradingCalendarIndex
+
+
+# 2024-01: 1日元旦休市，周末休市
+TRADING_DAYS = ['20240102', '20240103', '20240104', '20240105', '20240108', '20240109', '20240110']
+
+
+@pytest.fixture
+def calendar():
+    loader_calls = []
+
+    def loader():
+        loader_calls.append(1)
+        return {'dates': TRADING_DAYS, 'start': '20240101', 'end': '20240110', 'source': 'trade_cal'}
+
+    index = TradingCalendarIndex(loader=loader)
+    index.loader_calls = loader_calls
+    return index
+
+
+class TestTradingCalendarIndex:
+    """测试单点查询"""
+
+    def test_is_trading_day(self, calendar):
+        """节假日、周末与交易日，支持多种日期格式"""
+        assert calendar.is_trading_day('2024-01-02')
+        assert calendar.is_trading_day('20240108')
+        assert calendar.is_trading_day(datetime(2024, 1, 3, 10, 30))
+        assert not calendar.is_trading_day('2024-01-01')
+        assert not calendar.is_trading_day(date(2024, 1, 6))
+
+    def test_outside_coverage_uses_weekday_rule(self, calendar):
+        """覆盖范围外按周一至周五判断"""
+        assert not calendar.covers('2024-02-01')
+        assert calendar.is_trading_day('2024-02-01')      # 周四
+        assert not calendar.is_trading_day('2024-02-03')  # 周六
+
+    def test_next_prev_and_offset(self, calendar):
+        """前后推移"""
+        assert calendar.next_trading_day('2024-01-05') == date(2024, 1, 8)
+        assert calendar.next_trading_day('2024-01-06', n=2) == date(2024, 1, 9)
+        assert calendar.prev_trading_day('2024-01-08') == date(2024, 1, 5)
+        assert calendar.offset('2024-01-05', 3) == date(2024, 1, 10)
+        assert calendar.offset('2024-01-06', 0) == date(2024, 1, 8)
+        assert calendar.offset('2024-01-03', -1) == date(2024, 1, 2)
+        assert calendar.next_trading_day('2024-01-10') is None
+        assert calendar.prev_trading_day('2024-01-02') is None
+
+    def test_ranges(self, calendar):
+        """区间计数、区间列表与最近 N 日"""
+        assert calendar.count_between('2024-01-01', '2024-01-07') == 4
+        assert calendar.trading_days_between('20240105', '20240109') == [
+            date(2024, 1, 5), date(2024, 1, 8), date(2024, 1, 9)
+        ]
+        assert calendar.recent_n(3, '2024-01-07') == [date(2024, 1, 5), date(2024, 1, 4), date(2024, 1, 3)]
+        assert calendar.latest_trading_day('2024-01-07') == date(2024, 1, 5)
+
+    def test_loaded_once(self, calendar):
+        """数据只加载一次，refresh 强制重新加载"""
+        for _ in range(100):
+            calendar.is_trading_day('2024-01-02')
+        assert len(calendar.loader_calls) == 1
+
+        calendar.refresh()
+        assert len(calendar.loader_calls) == 2
+
+    def test_load_failure_falls_back(self):
+        """加载失败时按周末规则判断，且不在重试间隔内反复加载"""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            raise RuntimeError('db down')
+
+        index = TradingCalendarIndex(loader=loader)
+        assert not index.is_trading_day('2024-01-06')
+        assert index.is_trading_day('2024-01-01')
+        assert index.next_trading_day('2024-01-01') is None
+        assert len(calls) == 1
+
+
+class TestVectorized:
+    """测试向量化查询与单点查询一致"""
+
+    def test_arrays_match_scalar(self, calendar):
+        dates = pd.date_range('2023-12-28', '2024-01-14')
+
+        np.testing.assert_array_equal(
+            calendar.is_trading_day_array(dates),
+            [calendar.is_trading_day(d) for d in dates]
+        )
+        for n in (-2, 0, 1, 3):
+            expected = [calendar.offset(d, n) for d in dates]
+            result = calendar.offset_array(dates, n)
+            assert [pd.Timestamp(v).date() if not pd.isna(v) else None for v in result] == expected
+
+    def test_string_input_and_counts(self, calendar):
+        starts = ['20240101', '2024-01-05']
+        ends = ['20240110', '2024-01-05']
+
+        np.testing.assert_array_equal(calendar.count_between_array(starts, ends), [7, 1])
+        np.testing.assert_array_equal(
+            calendar.latest_trading_day_array(['20240107', '20231231']),
+            np.array(['2024-01-05', 'NaT'], dtype='datetime64[D]')
+        )
@@ -521,5 +521,125 @@ class TestStreamingFeatureEngineIntegration:
         assert not checkpoint_file.exists()
 
 
+def _module_stock_data(stock_code):
+    """模块级数据加载函数（可被进程池序列化）"""
+    dates = pd.date_range('2023-01-01', periods=60, freq='D')
+    rng = np.random.default_rng(int(stock_code[:6]))
+    close = 10 + rng.normal(0, 0.1, 60).cumsum()
+    return pd.DataFrame({'close': close, 'volume': rng.uniform(1e6, 1e7, 60)}, index=dates)
+
+
+def _module_feature_calculator(df):
+    """模块级特征计算函数（可被进程池序列化）"""
+    features = pd.DataFrame(index=df.index)
+    features['momentum_5'] = df['close'].pct_change(5)
+    features['volume_change'] = df['volume'].pct_change()
+    return features
+
+
+class TestPipelinedStreaming:
+    """测试流水线模式"""
+
+    CODES = [f"{i:06d}.SZ" for i in range(1, 24)]
+
+    def _sequential(self, output_dir):
+        engine = StreamingFeatureEngine(
+            config=StreamingConfig(batch_size=5, checkpoint_enabled=False),
+            output_dir=output_dir
+        )
+        path = engine.compute_features_streaming(self.CODES, _module_stock_data, _module_feature_calculator)
+        return pd.read_parquet(path)
+
+    def test_matches_sequential_output(self, temp_output_dir):
+        """测试：进程池流水线输出与逐批模式一致，且不产生批次文件"""
+        expected = self._sequential(temp_output_dir / 'seq')
+
+        engine = StreamingFeatureEngine(
+            config=StreamingConfig(batch_size=5, pipelined=True, num_workers=2),
+            output_dir=temp_output_dir / 'pipe'
+        )
+        batch_loads = []
+
+        def batch_loader(codes):
+            batch_loads.append(list(codes))
+            return {code: _module_stock_data(code) for code in codes}
+
+        path = engine.compute_features_streaming(
+            self.CODES, _module_stock_data, _module_feature_calculator, batch_loader=batch_loader
+        )
+
+        pd.testing.assert_frame_equal(pd.read_parquet(path), expected)
+        assert len(batch_loads) == 5
+        assert list((temp_output_dir / 'pipe').glob('batch_*')) == []
+        assert not (temp_output_dir / 'pipe' / '.checkpoint.json').exists()
+        stats = engine.get_stats()
+        assert stats.completed_batches == 5 and stats.processed_stocks == 23
+
+    def test_resume_after_failure(self, temp_output_dir):
+        """测试：中途中断后按 checkpoint 续跑，已写入批次不重复计算"""
+        expected = self._sequential(temp_output_dir / 'seq')
+        output_dir = temp_output_dir / 'pipe'
+        interrupt_close = _module_stock_data(self.CODES[12])['close'].iloc[0]
+        state = {'interrupt': True, 'computed': 0}
+
+        def interrupting_calculator(df):
+            if state['interrupt'] and df['close'].iloc[0] == interrupt_close:
+                raise KeyboardInterrupt
+            state['computed'] += 1
+            return _module_feature_calculator(df)
+
+        config = StreamingConfig(batch_size=5, pipelined=True, num_workers=1, prefetch_batches=1)
+        with pytest.raises(KeyboardInterrupt):
+            StreamingFeatureEngine(config=config, output_dir=output_dir).compute_features_streaming(
+                self.CODES, _module_stock_data, interrupting_calculator
+            )
+        checkpoint = json.loads((output_dir / '.checkpoint.json').read_text())
+        assert sorted(checkpoint['completed_batches']) == [0, 1]
+
+        state.update(interrupt=False, computed=0)
+        engine = StreamingFeatureEngine(config=config, output_dir=output_dir)
+        path = engine.compute_features_streaming(self.CODES, _module_stock_data, interrupting_calculator)
+
+        pd.testing.assert_frame_equal(pd.read_parquet(path), expected)
+        assert state['computed'] == 13  # 只计算批次 2-4
+        assert engine.get_stats().completed_batches == 5
+
+    def test_resume_prefers_existing_resume_file(self, temp_output_dir):
+        """测试：续跑文件仍存在时说明上次拷贝中断，以它为准，不被半成品输出覆盖"""
+        final_path = temp_output_dir / 'features_all.parquet'
+        resume_path = temp_output_dir / '.features_resume.parquet'
+        pd.DataFrame({'a': [1, 2, 3]}).to_parquet(resume_path, index=False)
+        pd.DataFrame({'a': [1]}).to_parquet(final_path, index=False)
+
+        resume_file = StreamingFeatureEngine._open_resume_file(final_path, resume_path)
+
+        assert resume_file.metadata.num_rows == 3
+        assert not final_path.exists()
+
+    def test_conform_to_schema(self):
+        """测试：批次结果对齐首批 schema，缺列补空、类型安全转换，多出列报错"""
+        import pyarrow as pa
+
+        schema = pa.Table.from_pandas(
+            pd.DataFrame({'code': ['a'], 'f1': [0.5], 'f2': [1.5]}), preserve_index=False
+        ).schema
+
+        table = pa.Table.from_pandas(pd.DataFrame({'f1': [1], 'code': ['b']}), preserve_index=False)
+        conformed = StreamingFeatureEngine._conform_to_schema(table, schema, 1)
+        assert conformed.schema.equals(schema)
+        assert conformed.to_pydict() == {'code': ['b'], 'f1': [1.0], 'f2': [None]}
+
+        extra = pa.Table.from_pandas(
+            pd.DataFrame({'code': ['c'], 'f1': [0.1], 'f2': [0.2], 'f3': [0.3]}), preserve_index=False
+        )
+        with pytest.raises(ValueError, match='f3'):
+            StreamingFeatureEngine._conform_to_schema(extra, schema, 2)
+
+        bad_type = pa.Table.from_pandas(
+            pd.DataFrame({'code': ['d'], 'f1': ['x'], 'f2': [0.2]}), preserve_index=False
+        )
+        with pytest.raises(ValueError, match='f1'):
+            StreamingFeatureEngine._conform_to_schema(bad_type, schema, 3)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,149 @@
+"""
+单元测试: 截面批量排名
+
+测试场景:
+1. PredictionPanel 构建与对齐
+2. select_long_short 与 MLEntry 逐日口径一致
+3. rank_scores 与 MLStockRanker 逐日口径一致
+4. 边缘情况 (空位 / 等权 / 失败日期)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+
+from src.ml.cross_sectional_ranking import (
+    PredictionPanel,
+    rank_scores,
+    select_long_short,
+)
+from src.ml.ml_entry import MLEntry
+from src.ml.ml_stock_ranker import MLStockRanker
+
+
+STOCKS = [f"{i:06d}.SZ" for i in range(30)]
+DATES = ['2024-01-15', '2024-01-16', '2024-01-17', '2024-01-18']
+
+
+def _daily_predictions(seed):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'expected_return': rng.normal(0, 0.05, len(STOCKS)),
+        'volatility': rng.uniform(0.01, 0.04, len(STOCKS)),
+        'confidence': rng.uniform(0.4, 1.0, len(STOCKS)),
+    }, index=STOCKS)
+    frame.iloc[3, 1] = 0.0  # 零波动率应被过滤
+    return frame
+
+
+@pytest.fixture
+def daily():
+    return {date: _daily_predictions(i) for i, date in enumerate(DATES)}
+
+
+@pytest.fixture
+def panel(daily):
+    return PredictionPanel.from_predictions(daily, STOCKS)
+
+
+def _make(cls, **kwargs):
+    obj = cls.__new__(cls)
+    obj.__dict__.update(kwargs)
+    return obj
+
+
+class TestPredictionPanel:
+
+    def test_from_predictions_aligns_columns(self, daily):
+        panel = PredictionPanel.from_predictions(
+            daily, list(reversed(STOCKS)) + ['999999.SH'], errors={'2024-01-19': 'boom'}
+        )
+        assert panel.shape == (5, 31)
+        assert panel.expected_return[0, 0] == daily[DATES[0]].loc[STOCKS[-1], 'expected_return']
+        assert np.isnan(panel.expected_return[:, -1]).all()
+        assert np.isnan(panel.confidence[-1]).all()
+
+    def test_shape_mismatch(self):
+        with pytest.raises(ValueError):
+            PredictionPanel(['d'], ['a', 'b'], np.zeros((1, 2)), np.zeros((1, 2)), np.zeros((2, 2)))
+
+
+class TestSelectLongShort:
+
+    @pytest.mark.parametrize('enable_short', [False, True])
+    def test_matches_ml_entry(self, panel, daily, enable_short):
+        entry = _make(
+            MLEntry, confidence_threshold=0.6, top_long=5, top_short=4,
+            enable_short=enable_short, min_expected_return=0.01
+        )
+        expected = {}
+        for date, predictions in daily.items():
+            signals = entry._merge_signals(
+                entry._filter_long_candidates(predictions),
+                entry._filter_short_candidates(predictions)
+            )
+            expected[date] = entry._normalize_weights(signals)
+
+        selection = entry.select_from_panel(panel)
+        result = selection.to_dict()
+
+        for date in DATES:
+            assert list(result[date]) == list(expected[date])
+            for stock, info in expected[date].items():
+                assert result[date][stock]['action'] == info['action']
+                assert result[date][stock]['weight'] == pytest.approx(info['weight'])
+        assert selection.long_index.shape == (4, 5)
+        np.testing.assert_allclose(
+            np.nansum(selection.long_weight, axis=1) + np.nansum(selection.short_weight, axis=1), 1.0
+        )
+
+    def test_padding_and_equal_weights(self):
+        panel = PredictionPanel(
+            dates=['d1', 'd2'],
+            stocks=['a', 'b', 'c'],
+            expected_return=np.array([[0.02, -0.01, np.nan], [-0.01, -0.02, -0.03]]),
+            volatility=np.array([[0.02, 0.02, 0.02], [0.02, 0.02, 0.02]]),
+            confidence=np.array([[0.9, 0.9, 0.9], [0.9, 0.9, 0.9]]),
+        )
+        selection = select_long_short(panel, top_long=3)
+        assert selection.long_index.tolist() == [[0, -1, -1], [-1, -1, -1]]
+        assert selection.long_weight[0, 0] == pytest.approx(1.0)
+        assert selection.to_dict()['d2'] == {}
+
+        # 权重合计无效 (inf) 时等权
+        panel.expected_return[0] = [0.02, 0.01, np.nan]
+        panel.volatility[0] = [1e-320, 1e-320, 0.02]
+        selection = select_long_short(panel, top_long=3)
+        assert selection.long_weight[0, :2].tolist() == [0.5, 0.5]
+
+
+class TestRankScores:
+
+    @pytest.mark.parametrize('method', ['simple', 'sharpe', 'risk_adjusted'])
+    def test_matches_ranker(self, panel, daily, method):
+        ranker = _make(MLStockRanker, scoring_method=method, min_confidence=0.5, min_expected_return=0.0)
+        result = ranker.rank_panel(panel, return_top_n=7).to_dict()
+
+        for date, predictions in daily.items():
+            filtered = ranker._filter_stocks(predictions)
+            expected = ranker._calculate_scores(filtered).sort_values(ascending=False).head(7)
+            assert list(result[date]) == list(expected.index)
+            np.testing.assert_allclose(list(result[date].values()), expected.values)
+
+    def test_ascending_and_all(self, panel):
+        ranked = rank_scores(panel, return_top_n=None, descending=False)
+        valid = ranked.index[0] >= 0
+        assert np.all(np.diff(ranked.score[0][valid]) >= 0)
+
+    def test_batch_rank_uses_panel(self, daily):
+        ranker = _make(MLStockRanker, scoring_method='simple', min_confidence=0.0, min_expected_return=0.0)
+        ranker.model = Mock()
+        ranker.model.predict_panel.return_value = PredictionPanel.from_predictions(
+            daily, STOCKS, errors={'2024-01-19': 'boom'}
+        )
+
+        ranked = ranker.batch_rank(STOCKS, pd.DataFrame(), DATES + ['2024-01-19'], 5, as_dict=False)
+
+        ranker.model.predict_panel.assert_called_once()
+        assert ranked.index.shape == (5, 5)
+        assert ranked.to_dict()['2024-01-19'] == {}
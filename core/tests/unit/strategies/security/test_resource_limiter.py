@@ -98,6 +98,25 @@ class TestResourceLimiter:
 
         assert result1 == 4950
 
+    @pytest.mark.skipif(
+        sys.platform in ('win32', 'darwin'),
+        reason="仅在支持 RLIMIT_AS 的平台上运行"
+    )
+    def test_nested_context_restores_original_limits(self, limiter):
+        """测试嵌套退出后恢复到进入外层之前的限制，不把 512MB 内存限制泄漏给后续测试"""
+        import resource
+
+        before_as = resource.getrlimit(resource.RLIMIT_AS)
+        before_cpu = resource.getrlimit(resource.RLIMIT_CPU)
+
+        with limiter.limit_resources():
+            with limiter.limit_resources():
+                pass
+            assert resource.getrlimit(resource.RLIMIT_AS)[0] == 512 * 1024 * 1024
+
+        assert resource.getrlimit(resource.RLIMIT_AS) == before_as
+        assert resource.getrlimit(resource.RLIMIT_CPU) == before_cpu
+
     def test_exception_in_context(self, limiter):
         """测试上下文中的异常处理"""
         with pytest.raises(ValueError):
@@ -0,0 +1,131 @@
+"""
+SandboxWorkerPool 单元测试
+
+测试沙箱进程池的常驻缓存、资源限制、异常传递与进程回收
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.exceptions import ResourceLimitError, StrategyExecutionError
+from src.strategies.security.sandbox_pool import SandboxLimits, SandboxWorkerPool, SharedPanel
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="依赖 setrlimit / fork")
+
+LOADER = f"{__name__}:load_strategy"
+ENTRY = f"{__name__}:run_entry"
+
+_loads = 0
+
+
+class _ScaleStrategy:
+    def __init__(self, factor):
+        self.factor = factor
+
+    def score(self, prices):
+        return prices.iloc[-1] * self.factor
+
+
+def load_strategy(factor):
+    """沙箱 loader（在子进程中执行）"""
+    global _loads
+    _loads += 1
+    return _ScaleStrategy(factor)
+
+
+def run_entry(strategy, prices, mode='score'):
+    """沙箱 entry（在子进程中执行）"""
+    if mode == 'spin':
+        while True:
+            pass
+    if mode == 'memory':
+        return np.ones(10 ** 9).sum()
+    if mode == 'sleep':
+        time.sleep(10)
+    if mode == 'raise':
+        raise ValueError('boom')
+    if mode == 'info':
+        return os.getpid(), _loads
+    return strategy.score(prices)
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.random((20, 50)), columns=[f"c{i}" for i in range(50)])
+
+
+@pytest.fixture
+def pool():
+    # fork 启动：子进程直接继承本测试模块，loader / entry 可按模块名解析
+    pool = SandboxWorkerPool(
+        workers=1,
+        max_calls_per_worker=4,
+        limits=SandboxLimits(max_cpu_time=1, max_memory_mb=256, max_wall_time=5),
+        start_method='fork',
+    ).start()
+    yield pool
+    pool.shutdown()
+
+
+class TestSandboxWorkerPool:
+    """测试 SandboxWorkerPool 类"""
+
+    def test_result_and_warm_cache(self, pool, prices):
+        """测试结果正确，且同一 key 只加载一次"""
+        result = pool.run('k1', LOADER, (2.0,), ENTRY, (prices,))
+        pd.testing.assert_series_equal(result, prices.iloc[-1] * 2.0)
+
+        pid1, loads1 = pool.run('k1', LOADER, (2.0,), ENTRY, (prices,), {'mode': 'info'})
+        pid2, loads2 = pool.run('k1', LOADER, (2.0,), ENTRY, (prices,), {'mode': 'info'})
+        assert pid1 == pid2
+        assert loads1 == loads2 == 1
+
+    def test_wall_timeout_kills_worker(self, pool, prices):
+        """测试墙钟超时由父进程强制结束子进程"""
+        start = time.monotonic()
+        with pytest.raises(ResourceLimitError):
+            pool.run('k1', LOADER, (1.0,), ENTRY, (prices,), {'mode': 'sleep'}, timeout=0.5)
+        assert time.monotonic() - start < 5
+        # 进程已被替换，池仍可用
+        assert pool.run('k1', LOADER, (1.0,), ENTRY, (prices,)) is not None
+
+    def test_cpu_limit(self, pool, prices):
+        """测试 CPU 时间限制"""
+        with pytest.raises(ResourceLimitError):
+            pool.run('k1', LOADER, (1.0,), ENTRY, (prices,), {'mode': 'spin'})
+
+    def test_memory_limit(self, pool, prices):
+        """测试单次调用内存限制"""
+        with pytest.raises(ResourceLimitError):
+            pool.run('k1', LOADER, (1.0,), ENTRY, (prices,), {'mode': 'memory'})
+
+    def test_strategy_error_propagates(self, pool, prices):
+        """测试策略异常转换为 StrategyExecutionError"""
+        with pytest.raises(StrategyExecutionError) as exc_info:
+            pool.run('k1', LOADER, (1.0,), ENTRY, (prices,), {'mode': 'raise'})
+        assert 'boom' in str(exc_info.value)
+
+    def test_worker_recycled_after_max_calls(self, pool, prices):
+        """测试进程执行 max_calls_per_worker 次后回收"""
+        pids = {
+            pool.run('k1', LOADER, (1.0,), ENTRY, (prices,), {'mode': 'info'})[0]
+            for _ in range(8)
+        }
+        assert len(pids) == 2
+        assert pool.stats()['recycled'] >= 1
+
+
+class TestSharedPanel:
+    """测试共享内存面板"""
+
+    def test_is_shareable(self, prices):
+        assert SharedPanel.is_shareable(prices)
+        assert not SharedPanel.is_shareable(pd.DataFrame({'a': ['x', 'y']}))
+        assert not SharedPanel.is_shareable(pd.DataFrame())
+        assert not SharedPanel.is_shareable([1, 2, 3])
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+ColumnarFeatureCache 单元测试
+
+测试按特征组的列式缓存，以及 DataPipeline 的尾部增量追加 / 按组失效 / 列投影
+"""
+
+import sys
+import unittest
+import tempfile
+import shutil
+import warnings
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from src.data_pipeline.columnar_feature_cache import ColumnarFeatureCache, RAW_GROUP
+from src.data_pipeline.orchestrator import DataPipeline
+from src.config.pipeline import PipelineConfig
+
+
+def _make_daily(n=1100):
+    """生成单只股票日线（含数据库返回的附加列）"""
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range('2018-01-01', periods=n, name='date')
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.005, n)),
+        'high': close * 1.02,
+        'low': close * 0.98,
+        'close': close,
+        'volume': rng.integers(1e5, 1e6, n).astype(float),
+        'amount': close * 1e5,
+        'turnover': rng.random(n),
+    }, index=index)
+
+
+class TestColumnarFeatureCache(unittest.TestCase):
+    """测试分片读写、去重与列投影"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ColumnarFeatureCache(self.temp_dir, feature_version='v-test', compact_parts=2)
+        self.df = _make_daily(30)[['close', 'volume']]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_01_append_overrides_overlapping_rows(self):
+        """追加分片与已缓存行重叠时以新分片为准"""
+        self.cache.save('000001', 'label', {'p': 5}, self.df.iloc[:20], '20180101', '20180126')
+        tail = self.df.iloc[18:25].copy()
+        tail['close'] = -1.0
+        meta = self.cache.append('000001', 'label', {'p': 5}, tail, '20180205')
+
+        loaded = self.cache.load('000001', 'label', {'p': 5})
+        self.assertEqual(len(loaded), 25)
+        self.assertTrue((loaded['close'].iloc[18:] == -1.0).all())
+        self.assertEqual(meta['last_date'], self.df.index[24].strftime('%Y%m%d'))
+
+    def test_02_compaction(self):
+        """分片超过上限时合并"""
+        self.cache.save('000001', 'alpha', {}, self.df.iloc[:10], '20180101', '20180112')
+        for start in (10, 15):
+            meta = self.cache.append('000001', 'alpha', {}, self.df.iloc[start:start + 5], '20180131')
+        self.assertEqual(len(meta['parts']), 1)
+        pd.testing.assert_frame_equal(self.cache.load('000001', 'alpha', {}), self.df.iloc[:20],
+                                      check_freq=False)
+
+    def test_03_projection_and_date_range(self):
+        """只读取请求的列与日期"""
+        self.cache.save('000001', 'alpha', {}, self.df, '20180101', '20180209')
+        loaded = self.cache.load('000001', 'alpha', {}, '20180110', '20180120', columns=['volume', 'other'])
+        self.assertEqual(list(loaded.columns), ['volume'])
+        self.assertEqual(loaded.index.min(), pd.Timestamp('2018-01-10'))
+        self.assertEqual(loaded.index.max(), pd.Timestamp('2018-01-19'))
+
+    def test_04_params_and_version_isolation(self):
+        """参数或版本不同互不可见"""
+        self.cache.save('000001', 'alpha', {'p': 1}, self.df, '20180101', '20180209')
+        self.assertIsNone(self.cache.read_meta('000001', 'alpha', {'p': 2}))
+        other = ColumnarFeatureCache(self.temp_dir, feature_version='v-other')
+        self.assertIsNone(other.read_meta('000001', 'alpha', {'p': 1}))
+
+
+class TestPipelineGroupCache(unittest.TestCase):
+    """测试 DataPipeline 的特征组缓存与无缓存计算结果一致"""
+
+    def setUp(self):
+        warnings.filterwarnings('ignore')
+        self.temp_dir = tempfile.mkdtemp()
+        self.daily = _make_daily()
+        self.load_calls = []
+
+        def load_data(symbol, start_date, end_date):
+            self.load_calls.append((start_date, end_date))
+            mask = (self.daily.index >= pd.Timestamp(start_date)) & (self.daily.index <= pd.Timestamp(end_date))
+            return self.daily[mask].copy()
+
+        self.pipeline = DataPipeline(db_manager=Mock(), cache_dir=self.temp_dir, verbose=False)
+        self.pipeline.data_loader.load_data = load_data
+        self.reference = DataPipeline(db_manager=Mock(), cache_features=False, verbose=False)
+        self.reference.data_loader.load_data = load_data
+        self.end1 = self.daily.index[1000].strftime('%Y%m%d')
+        self.end2 = self.daily.index[1010].strftime('%Y%m%d')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _assert_same_as_uncached(self, X, y, end_date):
+        X_ref, y_ref = self.reference.get_training_data(
+            '000001', '20180101', end_date, PipelineConfig(use_cache=False)
+        )
+        self.assertEqual(list(X.columns), list(X_ref.columns))
+        np.testing.assert_allclose(X.to_numpy(), X_ref.to_numpy(), rtol=1e-7, atol=1e-9)
+        np.testing.assert_allclose(y.to_numpy(), y_ref.to_numpy())
+
+    def test_01_tail_append_matches_full_recompute(self):
+        """新交易日只查询尾部，结果与全量计算一致"""
+        X, y = self.pipeline.get_training_data('000001', '20180101', self.end1)
+        self._assert_same_as_uncached(X, y, self.end1)
+
+        X, y = self.pipeline.get_training_data('000001', '20180101', self.end2)
+        start, end = self.load_calls[-1]
+        self.assertEqual(end, self.end2)
+        self.assertGreaterEqual(start, self.daily.index[990].strftime('%Y%m%d'))  # 只查询了最近几行
+        self._assert_same_as_uncached(X, y, self.end2)
+
+    def test_02_cache_hit_without_database(self):
+        """已覆盖的范围不查询数据库，列投影只返回请求列"""
+        self.pipeline.get_training_data('000001', '20180101', self.end1)
+        calls = len(self.load_calls)
+        X, y = self.pipeline.get_training_data('000001', '20180601', self.end1, columns=['RSI6', 'MOM5'])
+        self.assertEqual(len(self.load_calls), calls)
+        self.assertEqual(list(X.columns), ['RSI6', 'MOM5'])
+        self.assertEqual(len(X), len(y))
+
+    def test_03_config_change_invalidates_only_that_group(self):
+        """修改某一组参数只重算该组"""
+        self.pipeline.get_training_data('000001', '20180101', self.end1)
+        engineer = self.pipeline.feature_engineer
+        alpha_dir = self.pipeline.group_cache.group_dir(
+            '000001', 'alpha', engineer.get_group_params('alpha', 5))
+        alpha_mtime = (alpha_dir / 'meta.json').stat().st_mtime_ns
+
+        original = engineer._transform_params
+        engineer._transform_params = lambda: {'return_periods': [1, 2]}
+        try:
+            X, _ = self.pipeline.get_training_data('000001', '20180101', self.end1)
+        finally:
+            engineer._transform_params = original
+
+        self.assertIn('RETURN_2D', X.columns)
+        self.assertNotIn('RETURN_20D', X.columns)
+        self.assertEqual((alpha_dir / 'meta.json').stat().st_mtime_ns, alpha_mtime)
+
+    def test_04_price_adjustment_rebuilds(self):
+        """历史价格变化（复权）时整体重建"""
+        self.pipeline.get_training_data('000001', '20180101', self.end1)
+        generation = self.pipeline.group_cache.read_meta('000001', RAW_GROUP, {})['generation']
+        self.daily[['open', 'high', 'low', 'close']] *= 0.9
+
+        X, y = self.pipeline.get_training_data('000001', '20180101', self.end2)
+        self.assertNotEqual(
+            self.pipeline.group_cache.read_meta('000001', RAW_GROUP, {})['generation'], generation)
+        self._assert_same_as_uncached(X, y, self.end2)
+
+    def test_05_labels_do_not_use_prices_after_end_date(self):
+        """缓存覆盖到更晚日期后，较早 end_date 的标签与无缓存计算一致（不泄露未来价格）"""
+        self.pipeline.get_training_data('000001', '20180101', self.end2)
+
+        X, y = self.pipeline.get_training_data('000001', '20180101', self.end1)
+
+        self.assertLessEqual(y.index[-1], self.daily.index[1000 - 5])
+        self._assert_same_as_uncached(X, y, self.end1)
+
+
+if __name__ == '__main__':
+    unittest.main()
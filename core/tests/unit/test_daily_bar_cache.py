@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+DailyBarCache 单元测试
+
+测试按月分区的日线本地缓存，以及 DataQueryManager 的缓存优先读取 / 数据库回退
+"""
+
+import sys
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from src.database.daily_bar_cache import DailyBarCache
+
+
+def _make_market(start='2023-11-01', end='2024-02-29', codes=('000001.SZ', '600000.SH', '300750.SZ')):
+    """生成多只股票的长表日线数据"""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(start, end)
+    frames = []
+    for code in codes:
+        close = 10 + rng.normal(0, 0.2, len(dates)).cumsum()
+        frames.append(pd.DataFrame({
+            'code': code,
+            'date': dates,
+            'open': close * 0.99,
+            'high': close * 1.01,
+            'low': close * 0.98,
+            'close': close,
+            'volume': rng.integers(1e5, 1e6, len(dates)),
+            'amount': rng.uniform(1e6, 1e7, len(dates)),
+            'adj_factor': 1.5,
+            'pe_ttm': rng.uniform(5, 30, len(dates)),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _fill_cache(cache, market):
+    for key, group in market.groupby(market['date'].dt.strftime('%Y-%m')):
+        cache.write_partition(key, group)
+    cache.set_coverage(market['date'].min(), market['date'].max())
+
+
+class TestDailyBarCache(unittest.TestCase):
+    """测试 DailyBarCache 读写与覆盖范围"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = DailyBarCache(self.temp_dir, enabled=True)
+        self.market = _make_market()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_partition_keys(self):
+        """测试：跨年月份分区键"""
+        self.assertEqual(
+            DailyBarCache.partition_keys('2023-11-15', '2024-02-01'),
+            ['2023-11', '2023-12', '2024-01', '2024-02']
+        )
+        self.assertEqual(DailyBarCache.partition_bounds('2024-02'), ('2024-02-01', '2024-02-29'))
+
+    def test_write_and_read_roundtrip(self):
+        """测试：写入后读取的数据与原始数据一致"""
+        _fill_cache(self.cache, self.market)
+
+        df = self.cache.read('2023-11-01', '2024-02-29')
+        expected = DailyBarCache.normalize(self.market)
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_checksum_stable_after_roundtrip(self):
+        """测试：Parquet 读回的数据校验和与 manifest 记录一致"""
+        _fill_cache(self.cache, self.market)
+        manifest = self.cache.load_manifest()
+
+        month = self.cache.read('2024-01-01', '2024-01-31')
+        checksum = DailyBarCache.compute_checksum(DailyBarCache.normalize(month))
+        self.assertEqual(checksum, manifest['partitions']['2024-01']['checksum'])
+
+    def test_read_filters_codes_and_dates(self):
+        """测试：按股票与日期过滤"""
+        _fill_cache(self.cache, self.market)
+
+        df = self.cache.read('2023-12-15', '2024-01-10', codes=['600000.SH'], columns=['close'])
+        self.assertEqual(list(df.columns), ['code', 'date', 'close'])
+        self.assertEqual(set(df['code']), {'600000.SH'})
+        self.assertGreaterEqual(df['date'].min(), pd.Timestamp('2023-12-15'))
+        self.assertLessEqual(df['date'].max(), pd.Timestamp('2024-01-10'))
+
+    def test_read_stock_matches_load_daily_layout(self):
+        """测试：read_stock 返回以 date 为索引的 BAR_COLUMNS"""
+        _fill_cache(self.cache, self.market)
+
+        df = self.cache.read_stock('000001.SZ', '2024-01-01', '2024-01-31')
+        self.assertEqual(df.index.name, 'date')
+        self.assertEqual(list(df.columns), DailyBarCache.BAR_COLUMNS)
+        self.assertTrue(df['amplitude'].isna().all())
+
+    def test_plan_clips_to_coverage(self):
+        """测试：plan 截取缓存覆盖区间"""
+        _fill_cache(self.cache, self.market)
+
+        start, end = self.cache.plan('2023-11-01', '2030-01-01')
+        self.assertEqual(start, pd.Timestamp('2023-11-01'))
+        self.assertEqual(end, pd.Timestamp('2024-02-29'))
+
+    def test_plan_start_before_cache(self):
+        """测试：请求起点早于缓存起点时，仅在缓存含完整历史时截取"""
+        _fill_cache(self.cache, self.market)
+        self.assertIsNone(self.cache.plan('2020-01-01', '2024-01-31'))
+        self.assertIsNone(self.cache.plan(None, '2024-01-31'))
+
+        self.cache.set_coverage(None, '2024-02-29', history_complete=True)
+        start, _ = self.cache.plan('2020-01-01', '2024-01-31')
+        self.assertEqual(start, pd.Timestamp('2023-11-01'))
+
+    def test_plan_returns_none_when_partition_missing(self):
+        """测试：区间内缺失分区时回退数据库"""
+        _fill_cache(self.cache, self.market)
+        manifest = self.cache.load_manifest()
+        manifest['partitions'].pop('2023-12')
+        self.cache._save_manifest(manifest)
+
+        self.assertIsNone(self.cache.plan('2023-11-01', '2024-01-31'))
+        self.assertIsNotNone(self.cache.plan('2024-01-01', '2024-01-31'))
+
+    def test_plan_disabled_or_empty(self):
+        """测试：缓存禁用或为空时 plan 返回 None"""
+        self.assertIsNone(self.cache.plan('2024-01-01', '2024-01-31'))
+        _fill_cache(self.cache, self.market)
+        disabled = DailyBarCache(self.temp_dir, enabled=False)
+        self.assertIsNone(disabled.plan('2024-01-01', '2024-01-31'))
+
+
+class TestDataQueryManagerBarCache(unittest.TestCase):
+    """测试 DataQueryManager 缓存优先读取"""
+
+    def setUp(self):
+        from database.connection_pool_manager import ConnectionPoolManager
+        from database.data_query_manager import DataQueryManager
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = DailyBarCache(self.temp_dir, enabled=True)
+        self.market = _make_market()
+        _fill_cache(self.cache, self.market)
+
+        self.mock_pool_manager = Mock(spec=ConnectionPoolManager)
+        self.mock_pool_manager.get_connection.return_value = Mock()
+        self.query_manager = DataQueryManager(self.mock_pool_manager, bar_cache=self.cache)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch('pandas.read_sql_query')
+    def test_cache_hit_skips_database(self, mock_read_sql):
+        """测试：缓存完整覆盖时不访问数据库"""
+        df = self.query_manager.load_daily_data('000001.SZ', '2023-12-01', '2024-01-31')
+
+        mock_read_sql.assert_not_called()
+        expected = self.market[
+            (self.market['code'] == '000001.SZ')
+            & (self.market['date'] >= '2023-12-01')
+            & (self.market['date'] <= '2024-01-31')
+        ]
+        self.assertEqual(len(df), len(expected))
+        np.testing.assert_allclose(df['close'].values, expected['close'].values)
+
+    @patch('pandas.read_sql_query')
+    def test_tail_after_coverage_from_database(self, mock_read_sql):
+        """测试：覆盖日之后的部分回数据库补齐"""
+        tail = pd.DataFrame(
+            {col: [1.0] for col in DailyBarCache.BAR_COLUMNS},
+            index=pd.DatetimeIndex([pd.Timestamp('2024-03-01')], name='date'),
+        )
+        mock_read_sql.return_value = tail
+
+        df = self.query_manager.load_daily_data('000001.SZ', '2024-02-01', '2024-03-05')
+
+        mock_read_sql.assert_called_once()
+        params = mock_read_sql.call_args.kwargs['params']
+        self.assertEqual(params[1], '2024-03-01')
+        self.assertEqual(df.index[-1], pd.Timestamp('2024-03-01'))
+        self.assertTrue(df.index.is_monotonic_increasing)
+
+    @patch('pandas.read_sql_query')
+    def test_uncovered_range_falls_back_to_database(self, mock_read_sql):
+        """测试：请求区间完全在缓存之外时走数据库"""
+        mock_read_sql.return_value = pd.DataFrame()
+
+        self.query_manager.load_daily_data('000001.SZ', '2024-05-01', '2024-05-31')
+
+        mock_read_sql.assert_called_once()
+
+    @patch('pandas.read_sql_query')
+    def test_start_before_cache_falls_back_to_database(self, mock_read_sql):
+        """测试：请求起点早于缓存（仅增量刷新过）时整段走数据库"""
+        mock_read_sql.return_value = pd.DataFrame(
+            {col: [1.0, 2.0] for col in DailyBarCache.BAR_COLUMNS},
+            index=pd.DatetimeIndex(['2020-01-02', '2024-01-02'], name='date'),
+        )
+
+        df = self.query_manager.load_daily_data('000001.SZ', '2020-01-01', '2024-01-31')
+
+        mock_read_sql.assert_called_once()
+        self.assertEqual(mock_read_sql.call_args.kwargs['params'][1], '2020-01-01')
+        self.assertEqual(df.index[0], pd.Timestamp('2020-01-02'))
+
+    def test_load_market_daily_from_cache(self):
+        """测试：全市场长表读取"""
+        df = self.query_manager.load_market_daily('2024-01-01', '2024-01-31', columns=['close', 'adj_factor'])
+
+        self.assertEqual(list(df.columns), ['code', 'date', 'close', 'adj_factor'])
+        self.assertEqual(df['code'].nunique(), 3)
+        self.assertTrue((df['adj_factor'] == 1.5).all())
+
+    def test_verify_detects_and_repairs_mismatch(self):
+        """测试：校验和不一致的分区被识别并重写"""
+        db_month = self.market[self.market['date'].dt.strftime('%Y-%m') == '2024-01'].copy()
+        db_month.loc[db_month.index[0], 'close'] += 1
+
+        with patch.object(self.query_manager, '_query_market_daily_from_db',
+                          side_effect=lambda s, e, codes=None: DailyBarCache.normalize(
+                              db_month if s.startswith('2024-01') else
+                              self.market[self.market['date'].dt.strftime('%Y-%m') == s[:7]])):
+            report = self.query_manager.verify_daily_bar_cache()
+
+        self.assertEqual(report['checked'], 4)
+        self.assertEqual(report['mismatched'], ['2024-01'])
+        self.assertEqual(report['repaired'], ['2024-01'])
+        repaired = self.cache.read('2024-01-01', '2024-01-31')
+        self.assertIn(db_month['close'].iloc[0], repaired['close'].values)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -319,6 +319,39 @@ class TestDataInsertManagerComprehensive(unittest.TestCase):
         self.mock_conn.rollback.assert_called_once()
         print("  ✓ 错误处理测试通过")
 
+    # ==================== save_realtime_quote_batch 测试 ====================
+
+    @patch('database.data_insert_manager.extras.execute_values')
+    def test_save_realtime_quote_batch_single_statement(self, mock_execute_values):
+        """测试：微批行情一条多行 upsert、一次提交，批内重复代码保留最后一条"""
+        print("\n[测试13b] 微批保存实时行情")
+
+        quotes = [
+            {'code': '000001', 'name': '平安银行', 'latest_price': 12.50},
+            {'code': '000002', 'name': '万科A', 'latest_price': 'x'},
+            {'code': '000001', 'name': '平安银行', 'latest_price': 12.60},
+            {'name': '无代码'},
+        ]
+
+        count = self.insert_manager.save_realtime_quote_batch(quotes)
+
+        self.assertEqual(count, 2)
+        mock_execute_values.assert_called_once()
+        records = mock_execute_values.call_args[0][2]
+        self.assertEqual([r[0] for r in records], ['000001', '000002'])
+        self.assertEqual(records[0][2], 12.60)
+        self.mock_conn.commit.assert_called_once()
+        self.mock_pool_manager.release_connection.assert_called_once_with(self.mock_conn)
+
+    def test_save_realtime_quote_batch_error_handling(self):
+        """测试：微批保存失败回滚并抛出 DatabaseError"""
+        with patch('database.data_insert_manager.extras.execute_values',
+                   side_effect=psycopg2.DataError("bad value")):
+            with self.assertRaises(DatabaseError):
+                self.insert_manager.save_realtime_quote_batch([{'code': '000001'}])
+        self.mock_conn.rollback.assert_called_once()
+        self.assertEqual(self.insert_manager.save_realtime_quote_batch([]), 0)
+
     # ==================== save_realtime_quotes 测试 ====================
 
     @patch('database.data_insert_manager.extras.execute_batch')
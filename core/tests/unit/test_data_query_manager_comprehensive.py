@@ -190,6 +190,20 @@ class TestDataQueryManagerComprehensive(unittest.TestCase):
         self.mock_pool_manager.release_connection.assert_called()
         print("  ✓ 错误处理测试通过")
 
+    @patch('pandas.read_sql_query')
+    def test_get_stock_industries(self, mock_read_sql):
+        """测试：获取行业分类（code → industry）"""
+        mock_read_sql.return_value = pd.DataFrame({
+            'code': ['000001', '600519'],
+            'industry': ['银行', '白酒']
+        })
+
+        industries = self.query_manager.get_stock_industries(codes=['000001', '600519'])
+
+        self.assertEqual(industries.to_dict(), {'000001': '银行', '600519': '白酒'})
+        self.assertEqual(mock_read_sql.call_args[1]['params'], [['000001', '600519']])
+        self.mock_pool_manager.release_connection.assert_called()
+
     # ==================== get_oldest_realtime_stocks 测试 ====================
 
     def test_get_oldest_realtime_stocks_basic(self):
@@ -44,7 +44,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
 
     # ==================== 单例模式测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_singleton_pattern_basic(self, mock_pool):
         """测试：基本单例模式"""
         print("\n[测试1] 基本单例模式")
@@ -61,7 +61,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(mock_pool.call_count, 1)
         print("  ✓ 单例模式测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_singleton_with_get_instance(self, mock_pool):
         """测试：通过 get_instance 获取单例"""
         print("\n[测试2] get_instance 方法")
@@ -74,7 +74,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertIs(db1, db2)
         print("  ✓ get_instance 测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_singleton_with_get_database(self, mock_pool):
         """测试：通过 get_database 获取单例"""
         print("\n[测试3] get_database 函数")
@@ -87,7 +87,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertIs(db1, db2)
         print("  ✓ get_database 测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_singleton_thread_safety(self, mock_pool):
         """测试：单例模式线程安全"""
         print("\n[测试4] 线程安全测试")
@@ -118,7 +118,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
 
     # ==================== 初始化测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_initialization_with_config(self, mock_pool):
         """测试：使用自定义配置初始化"""
         print("\n[测试5] 自定义配置初始化")
@@ -139,7 +139,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(db.config['host'], 'test_host')
         print("  ✓ 自定义配置测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_initialization_components(self, mock_pool):
         """测试：验证所有组件初始化"""
         print("\n[测试6] 组件初始化")
@@ -156,7 +156,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
 
     # ==================== 连接池管理委托测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_get_connection_delegation(self, mock_pool):
         """测试：get_connection 委托"""
         print("\n[测试7] 获取连接委托")
@@ -175,7 +175,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         mock_pool_instance.getconn.assert_called_once()
         print("  ✓ 获取连接委托测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_release_connection_delegation(self, mock_pool):
         """测试：release_connection 委托"""
         print("\n[测试8] 释放连接委托")
@@ -192,7 +192,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         mock_pool_instance.putconn.assert_called_once_with(mock_conn)
         print("  ✓ 释放连接委托测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_close_all_connections_delegation(self, mock_pool):
         """测试：close_all_connections 委托"""
         print("\n[测试9] 关闭所有连接委托")
@@ -208,7 +208,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         mock_pool_instance.closeall.assert_called_once()
         print("  ✓ 关闭连接委托测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_get_pool_status_delegation(self, mock_pool):
         """测试：get_pool_status 委托"""
         print("\n[测试10] 连接池状态委托")
@@ -232,7 +232,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
 
     # ==================== 表管理委托测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_init_database_delegation(self, mock_pool):
         """测试：init_database 委托"""
         print("\n[测试11] 初始化数据库委托")
@@ -255,7 +255,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
 
     # ==================== 数据插入委托测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('database.data_insert_manager.extras.execute_batch')
     def test_save_stock_list_delegation(self, mock_execute_batch, mock_pool):
         """测试：save_stock_list 委托"""
@@ -281,7 +281,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(count, 1)
         print("  ✓ 保存股票列表测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('database.data_insert_manager.extras.execute_batch')
     def test_save_daily_data_delegation(self, mock_execute_batch, mock_pool):
         """测试：save_daily_data 委托"""
@@ -312,7 +312,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(count, 5)
         print("  ✓ 保存日线数据测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_save_realtime_quote_single_delegation(self, mock_pool):
         """测试：save_realtime_quote_single 委托"""
         print("\n[测试14] 保存单条行情委托")
@@ -334,7 +334,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(count, 1)
         print("  ✓ 保存单条行情测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('database.data_insert_manager.extras.execute_batch')
     def test_save_realtime_quotes_delegation(self, mock_execute_batch, mock_pool):
         """测试：save_realtime_quotes 委托"""
@@ -360,7 +360,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(count, 2)
         print("  ✓ 保存批量行情测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('database.data_insert_manager.extras.execute_batch')
     def test_save_minute_data_delegation(self, mock_execute_batch, mock_pool):
         """测试：save_minute_data 委托"""
@@ -390,7 +390,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
 
     # ==================== 数据查询委托测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('pandas.read_sql_query')
     def test_load_daily_data_delegation(self, mock_read_sql, mock_pool):
         """测试：load_daily_data 委托"""
@@ -412,7 +412,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(len(df), 2)
         print("  ✓ 加载日线数据测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('pandas.read_sql_query')
     def test_get_stock_list_delegation(self, mock_read_sql, mock_pool):
         """测试：get_stock_list 委托"""
@@ -434,7 +434,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(len(df), 2)
         print("  ✓ 获取股票列表测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_get_oldest_realtime_stocks_delegation(self, mock_pool):
         """测试：get_oldest_realtime_stocks 委托"""
         print("\n[测试19] 获取最旧实时股票委托")
@@ -455,7 +455,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(len(codes), 2)
         print("  ✓ 获取最旧股票测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_check_daily_data_completeness_delegation(self, mock_pool):
         """测试：check_daily_data_completeness 委托"""
         print("\n[测试20] 检查数据完整性委托")
@@ -476,7 +476,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertTrue(result['has_data'])
         print("  ✓ 检查完整性测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     @patch('pandas.read_sql_query')
     def test_load_minute_data_delegation(self, mock_read_sql, mock_pool):
         """测试：load_minute_data 委托"""
@@ -498,7 +498,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(len(df), 48)
         print("  ✓ 加载分时数据测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_check_minute_data_complete_delegation(self, mock_pool):
         """测试：check_minute_data_complete 委托"""
         print("\n[测试22] 检查分时完整性委托")
@@ -519,7 +519,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertTrue(result['is_complete'])
         print("  ✓ 检查分时完整性测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_is_trading_day_delegation(self, mock_pool):
         """测试：is_trading_day 委托"""
         print("\n[测试23] 判断交易日委托")
@@ -542,7 +542,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
 
     # ==================== 通用查询方法测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_execute_query_basic(self, mock_pool):
         """测试：执行查询"""
         print("\n[测试24] 执行查询")
@@ -564,7 +564,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(len(result), 2)
         print("  ✓ 执行查询测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_execute_query_with_params(self, mock_pool):
         """测试：带参数执行查询"""
         print("\n[测试25] 带参数查询")
@@ -589,7 +589,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertEqual(len(result), 1)
         print("  ✓ 带参数查询测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_execute_query_error_handling(self, mock_pool):
         """测试：查询错误处理"""
         print("\n[测试26] 查询错误处理")
@@ -619,7 +619,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         mock_pool_instance.putconn.assert_called_once()
         print("  ✓ 查询错误处理测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_execute_update_basic(self, mock_pool):
         """测试：执行更新"""
         print("\n[测试27] 执行更新")
@@ -645,7 +645,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         mock_conn.commit.assert_called_once()
         print("  ✓ 执行更新测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_execute_update_error_handling(self, mock_pool):
         """测试：更新错误处理"""
         print("\n[测试28] 更新错误处理")
@@ -677,7 +677,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
 
     # ==================== 单例重置测试 ====================
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_reset_instance(self, mock_pool):
         """测试：重置单例实例"""
         print("\n[测试29] 重置单例")
@@ -691,7 +691,7 @@ class TestDatabaseManagerComprehensive(unittest.TestCase):
         self.assertIsNot(db1, db2)
         print("  ✓ 重置单例测试通过")
 
-    @patch('psycopg2.pool.SimpleConnectionPool')
+    @patch('psycopg2.pool.ThreadedConnectionPool')
     def test_reset_instance_closes_connections(self, mock_pool):
         """测试：重置时关闭连接"""
         print("\n[测试30] 重置时关闭连接")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+MinuteBarStore 单元测试
+
+测试 1 分钟线按 A 股交易时段重采样、冷数据分区读写，
+以及 DataQueryManager.load_minute_bars 的区间查询 / 重采样 / 缓存
+"""
+
+import sys
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from src.database.minute_bar_store import MinuteBarStore, bucket_labels, resample_minute_bars
+
+
+def _session_minutes(day):
+    """一个交易日的 1 分钟线时间戳：09:31-11:30, 13:01-15:00"""
+    day = pd.Timestamp(day)
+    morning = pd.date_range(day + pd.Timedelta('09:31:00'), periods=120, freq='min')
+    afternoon = pd.date_range(day + pd.Timedelta('13:01:00'), periods=120, freq='min')
+    return morning.append(afternoon)
+
+
+def _make_minutes(days=('2024-01-29', '2024-01-30'), codes=('000001', '600000')):
+    rng = np.random.default_rng(0)
+    frames = []
+    for code in codes:
+        times = pd.DatetimeIndex([])
+        for day in days:
+            times = times.append(_session_minutes(day))
+        close = 10 + rng.normal(0, 0.01, len(times)).cumsum()
+        frames.append(pd.DataFrame({
+            'code': code,
+            'trade_time': times,
+            'open': close - 0.005,
+            'high': close + 0.01,
+            'low': close - 0.01,
+            'close': close,
+            'volume': rng.integers(100, 1000, len(times)).astype(float),
+            'amount': rng.uniform(1e4, 1e5, len(times)),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestResampleMinuteBars(unittest.TestCase):
+    """测试向量化重采样"""
+
+    def test_bucket_labels_follow_exchange_sessions(self):
+        """测试：桶结束时间与交易所口径一致，09:30 并入第一根"""
+        times = pd.Series(pd.to_datetime([
+            '2024-01-29 09:30', '2024-01-29 09:31', '2024-01-29 10:30', '2024-01-29 10:31',
+            '2024-01-29 11:30', '2024-01-29 13:01', '2024-01-29 15:00',
+        ]))
+        labels = pd.DatetimeIndex(bucket_labels(times, 60)).strftime('%H:%M').tolist()
+        self.assertEqual(labels, ['10:30', '10:30', '10:30', '11:30', '11:30', '14:00', '15:00'])
+
+    def test_counts_and_ohlcv(self):
+        """测试：每日 K 线数量与 OHLCV 聚合"""
+        minutes = _make_minutes()
+        for period, per_day in ((5, 48), (15, 16), (30, 8), (60, 4)):
+            bars = resample_minute_bars(minutes, str(period))
+            self.assertEqual(len(bars), per_day * 2 * 2)
+
+        bars = resample_minute_bars(minutes, 30)
+        first = minutes[(minutes['code'] == '000001')].iloc[:30]
+        row = bars.iloc[0]
+        self.assertEqual(row['trade_time'], pd.Timestamp('2024-01-29 10:00'))
+        self.assertAlmostEqual(row['open'], first['open'].iloc[0])
+        self.assertAlmostEqual(row['high'], first['high'].max())
+        self.assertAlmostEqual(row['low'], first['low'].min())
+        self.assertAlmostEqual(row['close'], first['close'].iloc[-1])
+        self.assertAlmostEqual(row['volume'], first['volume'].sum())
+
+    def test_matches_groupby_reference(self):
+        """测试：与逐组 groupby 结果一致（输入乱序）"""
+        minutes = _make_minutes().sample(frac=1, random_state=1)
+        bars = resample_minute_bars(minutes, 15)
+
+        labels = bucket_labels(minutes['trade_time'], 15)
+        expected = minutes.assign(trade_time=labels).groupby(['code', 'trade_time']).agg(
+            open=('open', 'first'), high=('high', 'max'), low=('low', 'min'),
+            close=('close', 'last'), volume=('volume', 'sum'), amount=('amount', 'sum'),
+        )
+        # 乱序输入下 first/last 取决于原顺序，这里只比较与顺序无关的字段
+        np.testing.assert_allclose(bars['high'].values, expected['high'].values)
+        np.testing.assert_allclose(bars['volume'].values, expected['volume'].values)
+
+    def test_unsupported_period(self):
+        with self.assertRaises(ValueError):
+            resample_minute_bars(_make_minutes(), 7)
+
+
+class TestMinuteBarStore(unittest.TestCase):
+    """测试冷数据分区与结果缓存"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = MinuteBarStore(self.temp_dir, cold_enabled=True, hot_days=30, cache_entries=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cold_roundtrip_and_plan(self):
+        """测试：归档月份从冷数据读取，其余月份走数据库"""
+        minutes = _make_minutes()
+        self.store.write_partition('2024-01', minutes)
+
+        df = self.store.read('2024-01-30', '2024-01-31', codes=['600000'])
+        self.assertEqual(len(df), 240)
+        self.assertTrue((df['code'] == '600000').all())
+
+        plan = self.store.plan('2024-01-29', '2024-02-03')
+        self.assertEqual([p[0] for p in plan], ['cold', 'db'])
+        self.assertEqual(plan[1][1], pd.Timestamp('2024-02-01'))
+
+    def test_archivable_keys(self):
+        """测试：只归档完全早于保留期的整月"""
+        self.store.write_partition('2024-01', _make_minutes())
+        keys = self.store.archivable_keys('2023-12-05', today='2024-04-15')
+        self.assertEqual(keys, ['2023-12', '2024-02'])
+
+    def test_lru_cache(self):
+        frame = pd.DataFrame({'a': [1]})
+        for i in range(3):
+            self.store.cache_put(i, frame)
+        self.assertIsNone(self.store.cache_get(0))
+        self.assertIsNotNone(self.store.cache_get(2))
+        self.store.clear_cache()
+        self.assertIsNone(self.store.cache_get(2))
+
+    def test_cache_expires_after_ttl(self):
+        """测试：其他进程补写历史分钟线不会通知本进程，条目过期后重新查询"""
+        self.store.cache_ttl = 60
+        frame = pd.DataFrame({'a': [1]})
+        with patch('src.database.minute_bar_store.time.monotonic', return_value=1000.0):
+            self.store.cache_put('k', frame)
+        with patch('src.database.minute_bar_store.time.monotonic', return_value=1030.0):
+            self.assertIsNotNone(self.store.cache_get('k'))
+        with patch('src.database.minute_bar_store.time.monotonic', return_value=1061.0):
+            self.assertIsNone(self.store.cache_get('k'))
+        self.assertNotIn('k', self.store._cache)
+
+
+class TestDataQueryManagerMinuteBars(unittest.TestCase):
+    """测试 DataQueryManager.load_minute_bars"""
+
+    def setUp(self):
+        from database.connection_pool_manager import ConnectionPoolManager
+        from database.data_query_manager import DataQueryManager
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = MinuteBarStore(self.temp_dir, cold_enabled=True)
+        self.mock_pool_manager = Mock(spec=ConnectionPoolManager)
+        self.mock_pool_manager.get_connection.return_value = Mock()
+        self.query_manager = DataQueryManager(self.mock_pool_manager, minute_store=self.store)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @patch('pandas.read_sql_query')
+    def test_range_query_resamples_and_caches(self, mock_read_sql):
+        """测试：一次区间查询多股票多日，重采样结果被缓存"""
+        mock_read_sql.return_value = _make_minutes().assign(period='1')
+
+        bars = self.query_manager.load_minute_bars(['000001', '600000'], '2024-01-29', '2024-01-30', '60')
+        again = self.query_manager.load_minute_bars(['600000', '000001'], '2024-01-29', '2024-01-30', '60')
+
+        mock_read_sql.assert_called_once()
+        query = mock_read_sql.call_args.args[0]
+        params = mock_read_sql.call_args.kwargs['params']
+        self.assertNotIn('DATE(trade_time)', query)
+        self.assertEqual(params[0], ['1', '60'])
+        self.assertEqual(params[2], pd.Timestamp('2024-01-31').to_pydatetime())
+        self.assertEqual(len(bars), 2 * 2 * 4)
+        pd.testing.assert_frame_equal(bars, again)
+
+    @patch('pandas.read_sql_query')
+    def test_legacy_period_rows_used_without_base(self, mock_read_sql):
+        """测试：没有 1 分钟线的股票使用存量周期数据"""
+        base = _make_minutes(codes=('000001',)).assign(period='1')
+        legacy = resample_minute_bars(_make_minutes(codes=('600000',)), 5).assign(period='5')
+        mock_read_sql.return_value = pd.concat([base, legacy], ignore_index=True)
+
+        bars = self.query_manager.load_minute_bars(['000001', '600000'], '2024-01-29', '2024-01-30', '5')
+
+        self.assertEqual(bars.groupby('code').size().to_dict(), {'000001': 96, '600000': 96})
+
+    @patch('pandas.read_sql_query')
+    def test_cold_months_skip_database(self, mock_read_sql):
+        """测试：已归档月份不访问数据库"""
+        self.store.write_partition('2024-01', _make_minutes())
+
+        bars = self.query_manager.load_minute_bars(['000001'], '2024-01-29', '2024-01-30', '30')
+
+        mock_read_sql.assert_not_called()
+        self.assertEqual(len(bars), 16)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+流式池化训练矩阵单元测试
+
+测试 PooledDataLoader.build_training_matrix 与内存池化结果一致，以及矩阵视图 / 模型输入
+"""
+
+import sys
+import unittest
+import tempfile
+import shutil
+import warnings
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+# 添加项目路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from src.data_pipeline.pooled_data_loader import PooledDataLoader, _create_scaler
+from src.data_pipeline.pooled_training_matrix import PooledTrainingMatrix
+
+SYMBOLS = ['000001', '000002', '000003', '000004']
+
+
+def _reset_address_space_limit():
+    """把 RLIMIT_AS 软限制放回硬限制：memmap 矩阵与 LightGBM 需要虚拟地址空间，
+    不受同进程内其他测试残留的内存限制影响"""
+    try:
+        import resource
+    except ImportError:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+
+
+def _make_daily(seed, n=800):
+    """生成单只股票日线"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range('2020-01-01', periods=n, name='date')
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    open_ = close * (1 + rng.normal(0, 0.005, n))
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, n)),
+        'low': np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, n)),
+        'close': close,
+        'volume': rng.integers(1e5, 1e6, n).astype(float),
+        'amount': close * 1e5,
+    }, index=index)
+
+
+class TestStreamingPooledMatrix(unittest.TestCase):
+    """测试流式构建与内存池化等价"""
+
+    @classmethod
+    def setUpClass(cls):
+        warnings.filterwarnings('ignore')
+        _reset_address_space_limit()
+        data = {s: _make_daily(i) for i, s in enumerate(SYMBOLS)}
+        data['000003'] = data['000003'].iloc[:50]  # 数据不足，被跳过
+
+        cls.db = Mock()
+        cls.db.load_daily_data.side_effect = lambda symbol, start, end: data[symbol].copy()
+        cls.loader = PooledDataLoader(db_manager=cls.db, verbose=False)
+
+        pooled_df, _, cls.symbols = cls.loader.load_pooled_data(SYMBOLS, '20200101', '20231231', 10)
+        cls.expected = cls.loader.prepare_pooled_training_data(pooled_df, 'target_10d_return')
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _build(self, scaler_type='standard', **kwargs):
+        return self.loader.build_training_matrix(
+            SYMBOLS, '20200101', '20231231', target_period=10,
+            scaler_type=scaler_type, work_dir=self.temp_dir, **kwargs
+        )
+
+    def test_01_matches_in_memory_pooling(self):
+        """行顺序、划分与 partial_fit 缩放结果与内存池化一致（float32 精度）"""
+        X_train, y_train, X_valid, y_valid, X_test, y_test, feature_cols = self.expected
+        scaler = _create_scaler('standard').fit(X_train)
+
+        matrix = self._build('standard', chunk_rows=97)
+
+        self.assertEqual(matrix.feature_cols, feature_cols)
+        self.assertEqual(matrix.symbols, ['000001', '000002', '000004'])
+        self.assertIsInstance(matrix.X, np.memmap)
+        self.assertEqual(matrix.X.dtype, np.float32)
+        for split, (X, y) in zip(('train', 'valid', 'test'),
+                                 ((X_train, y_train), (X_valid, y_valid), (X_test, y_test))):
+            X_mat, y_mat = matrix.frames(split)
+            self.assertEqual(len(X_mat), len(X))
+            np.testing.assert_allclose(X_mat.to_numpy(), scaler.transform(X), rtol=1e-3, atol=1e-3)
+            np.testing.assert_allclose(y_mat.to_numpy(), y.to_numpy(), rtol=1e-5)
+
+    def test_02_frames_are_views(self):
+        """DataFrame 直接包装 memmap，不复制"""
+        matrix = self._build()
+        X_train, _ = matrix.frames('train')
+        self.assertTrue(np.shares_memory(X_train.to_numpy(), matrix.X))
+
+    def test_03_robust_scaler_sampled_fit(self):
+        """RobustScaler 无 partial_fit，抽样拟合"""
+        matrix = self._build('robust', robust_sample_rows=50)
+        self.assertIsNotNone(matrix.scaler)
+        X_train, _ = matrix.arrays('train')
+        self.assertLess(np.abs(np.median(X_train, axis=0)).max(), 0.5)
+
+    def test_04_sequence_windows_do_not_cross_stocks(self):
+        """GRU 序列窗口不跨股票，目标行在同一股票内"""
+        matrix = self._build(scaler_type=None)
+        seq_length = 20
+        starts = matrix.sequence_starts('train', seq_length)
+        self.assertGreater(len(starts), 0)
+        train_end = matrix.split_bounds('train')[1]
+        for start in starts:
+            owner = [r for r in matrix.stock_ranges.values() if r[0] <= start < r[1]][0]
+            self.assertLess(start + seq_length, min(owner[1], train_end))
+
+    def test_05_lgb_dataset_and_reopen(self):
+        """LightGBM 直接读取矩阵；元数据可重新打开"""
+        matrix = self._build()
+        train_set, valid_set = matrix.lgb_datasets()
+        train_set.construct()
+        self.assertEqual(train_set.num_data(), matrix.train_end)
+        self.assertEqual(train_set.num_feature(), len(matrix.feature_cols))
+        self.assertIsNotNone(valid_set)
+
+        reopened = PooledTrainingMatrix.open(self.temp_dir)
+        np.testing.assert_array_equal(reopened.y, matrix.y)
+        reopened.cleanup()
+        self.assertFalse(Path(self.temp_dir).exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
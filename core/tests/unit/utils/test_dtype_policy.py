@@ -0,0 +1,108 @@
+"""
+dtype 策略测试
+
+测试覆盖：
+- downcast_floats（float32 / float64 回退、Decimal 列、整数列保持）
+- StockCodeDictionary（编号稳定、解码）
+- categorize_codes / pivot_panel（category 长表透视为普通列）
+- int32 日期编码往返
+"""
+
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.dtype_policy import (
+    StockCodeDictionary,
+    categorize_codes,
+    dates_to_int32,
+    downcast_floats,
+    int32_to_dates,
+    pivot_panel,
+    set_float_dtype,
+)
+
+
+@pytest.fixture(autouse=True)
+def float32_policy():
+    set_float_dtype('float32')
+    yield
+    set_float_dtype(None)
+
+
+class TestDowncastFloats:
+
+    def test_float_columns_only(self):
+        df = pd.DataFrame({'close': [1.5, 2.5], 'count': [1, 2], 'code': ['a', 'b']})
+        out = downcast_floats(df)
+        assert out['close'].dtype == np.float32
+        assert out['count'].dtype == np.int64
+        assert df['close'].dtype == np.float64  # 不修改输入
+
+    def test_decimal_and_none_columns(self):
+        """SQL 返回的 Decimal / None 一次性转换"""
+        df = pd.DataFrame({'close': [Decimal('10.01'), None], 'vol': ['x', '1']})
+        out = downcast_floats(df, columns=['close', 'vol', 'missing'])
+        assert out['close'].dtype == np.float32
+        assert np.isnan(out['close'].iloc[1])
+        assert np.isnan(out['vol'].iloc[0]) and out['vol'].iloc[1] == 1
+
+    def test_volume_amount_keep_full_precision(self):
+        """成交量 / 成交额只做解析，不降为 float32"""
+        df = pd.DataFrame({'close': [10.13], 'volume': [Decimal('123456789')], 'amount': [1.5e12]})
+        out = downcast_floats(df, columns=['close', 'volume', 'amount'])
+        assert out['close'].dtype == np.float32
+        assert out['volume'].dtype == np.float64 and out['volume'].iloc[0] == 123456789
+        assert out['amount'].dtype == np.float64
+
+    def test_float64_fallback(self):
+        set_float_dtype('float64')
+        df = pd.DataFrame({'close': np.array([1.0], dtype=np.float32)})
+        assert downcast_floats(df)['close'].dtype == np.float64
+
+    def test_inplace_keeps_object(self):
+        df = pd.DataFrame({'a': [1.0, 2.0]})
+        assert downcast_floats(df, inplace=True) is df
+        assert df['a'].dtype == np.float32
+
+    def test_invalid_dtype(self):
+        with pytest.raises(ValueError):
+            set_float_dtype('float16')
+
+
+class TestStockCodes:
+
+    def test_dictionary_ids_are_stable(self):
+        dictionary = StockCodeDictionary(['000001', '000002'])
+        ids = dictionary.encode(['000002', '600000', '000001'])
+        assert ids.dtype == np.int32
+        assert ids.tolist() == [1, 2, 0]
+        assert dictionary.encode(['600000']).tolist() == [2]
+        assert dictionary.decode(ids).tolist() == ['000002', '600000', '000001']
+
+    def test_categorical_long_frame_pivots_to_plain_columns(self):
+        df = pd.DataFrame({
+            'code': ['000002', '000001', '000002', '000001'],
+            'date': pd.to_datetime(['2024-01-02', '2024-01-02', '2024-01-01', '2024-01-01']),
+            'close': [4.0, 2.0, 3.0, 1.0],
+        })
+        out = categorize_codes(df)
+        assert isinstance(out['code'].dtype, pd.CategoricalDtype)
+        assert set(out['code'].cat.categories) == {'000001', '000002'}
+
+        panel = pivot_panel(out, 'close')
+        assert not isinstance(panel.columns, pd.CategoricalIndex)
+        panel['300750'] = 0.0  # 新代码可直接赋值
+        assert panel.loc['2024-01-02', '000002'] == 4.0
+
+
+class TestDates:
+
+    def test_round_trip(self):
+        dates = pd.to_datetime(['2019-12-31', '2024-02-29'])
+        encoded = dates_to_int32(dates)
+        assert encoded.dtype == np.int32
+        assert encoded.tolist() == [20191231, 20240229]
+        assert (int32_to_dates(encoded) == dates).all()
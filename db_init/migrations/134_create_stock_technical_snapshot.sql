@@ -0,0 +1,85 @@
+-- 全市场技术指标快照表（事实型，每股票每交易日一行）
+-- 由 tasks.recompute_technical_snapshot 日终一次性向量化计算写入；
+-- AI 数据收集器 O(1) 读取最新一行，指标筛选按 (trade_date, 状态列) 走索引。
+--
+-- 状态编码（SMALLINT）：
+--   *_cross        2=当根金叉  1=维持 DIF>DEA  -1=维持 DIF<DEA  -2=当根死叉
+--   *_zero_axis    1=零轴上方  0=零轴附近  -1=零轴下方
+--   d_divergence   1=底背离  0=无  -1=顶背离
+--   ma_arrangement 1=多头排列(5>10>20>60)  0=交织  -1=空头排列
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS stock_technical_snapshot (
+    ts_code          VARCHAR(10) NOT NULL,
+    trade_date       DATE        NOT NULL,
+    close            NUMERIC(12, 4),
+
+    -- 均线
+    ma5              NUMERIC(12, 4),
+    ma10             NUMERIC(12, 4),
+    ma20             NUMERIC(12, 4),
+    ma60             NUMERIC(12, 4),
+    ma120            NUMERIC(12, 4),
+    ma_arrangement   SMALLINT,
+
+    -- RSI（简单均值口径，同 RsiAnalysisService）
+    rsi7             NUMERIC(8, 4),
+    rsi14            NUMERIC(8, 4),
+    rsi21            NUMERIC(8, 4),
+
+    -- 布林线（20, 2）
+    boll_upper       NUMERIC(12, 4),
+    boll_middle      NUMERIC(12, 4),
+    boll_lower       NUMERIC(12, 4),
+    boll_percent_b   NUMERIC(10, 4),
+    boll_bandwidth   NUMERIC(10, 4),
+
+    -- 日线 MACD
+    d_dif            NUMERIC(12, 4),
+    d_dea            NUMERIC(12, 4),
+    d_macd_bar       NUMERIC(12, 4),
+    d_cross          SMALLINT,
+    d_zero_axis      SMALLINT,
+    d_divergence     SMALLINT,
+
+    -- 周线 MACD
+    w_dif            NUMERIC(12, 4),
+    w_dea            NUMERIC(12, 4),
+    w_macd_bar       NUMERIC(12, 4),
+    w_cross          SMALLINT,
+    w_zero_axis      SMALLINT,
+
+    -- 月线 MACD
+    m_dif            NUMERIC(12, 4),
+    m_dea            NUMERIC(12, 4),
+    m_macd_bar       NUMERIC(12, 4),
+    m_cross          SMALLINT,
+    m_zero_axis      SMALLINT,
+
+    -- 波动 / 量能 / 价格区间
+    atr14            NUMERIC(12, 4),
+    atr_pct          NUMERIC(10, 4),
+    vol_ratio5       NUMERIC(10, 4),
+    high_20d         NUMERIC(12, 4),
+    low_20d          NUMERIC(12, 4),
+    percentile_20d   NUMERIC(8, 4),
+
+    computed_at      TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (ts_code, trade_date)
+);
+
+-- 筛选索引：按交易日 + 常用状态列
+CREATE INDEX IF NOT EXISTS idx_sts_date_w_cross  ON stock_technical_snapshot(trade_date, w_cross);
+CREATE INDEX IF NOT EXISTS idx_sts_date_d_cross  ON stock_technical_snapshot(trade_date, d_cross);
+CREATE INDEX IF NOT EXISTS idx_sts_date_m_cross  ON stock_technical_snapshot(trade_date, m_cross);
+CREATE INDEX IF NOT EXISTS idx_sts_date_div      ON stock_technical_snapshot(trade_date, d_divergence)
+    WHERE d_divergence <> 0;
+
+COMMENT ON TABLE  stock_technical_snapshot IS '全市场技术指标快照：日终面板向量化计算，主键 (ts_code, trade_date)';
+COMMENT ON COLUMN stock_technical_snapshot.w_cross IS '周线 MACD 交叉状态：2 当根金叉 / 1 DIF>DEA / -1 DIF<DEA / -2 当根死叉';
+COMMENT ON COLUMN stock_technical_snapshot.d_divergence IS '日线 MACD 背离：1 底背离 / 0 无 / -1 顶背离';
+COMMENT ON COLUMN stock_technical_snapshot.vol_ratio5 IS '量比 = 当日成交量 / 前 5 日均量';
+
+COMMIT;
@@ -0,0 +1,27 @@
+-- 技术指标快照定时任务：交易日 17:30 计算全市场快照（日线同步完成之后）
+BEGIN;
+
+INSERT INTO scheduled_tasks
+    (task_name, module, description, cron_expression, enabled, params,
+     display_name, category, display_order, points_consumption)
+VALUES
+    ('tasks.recompute_technical_snapshot',
+     'tasks.recompute_technical_snapshot',
+     '全市场技术指标快照：MA / RSI / 布林 / 日周月 MACD / ATR / 量比，写入 stock_technical_snapshot。',
+     '30 17 * * 1-5',
+     TRUE,
+     '{"days":1,"source":"beat_daily"}'::jsonb,
+     '技术指标快照（全市场）',
+     '行情数据',
+     290,
+     0)
+ON CONFLICT (task_name) DO UPDATE
+    SET cron_expression = EXCLUDED.cron_expression,
+        description     = EXCLUDED.description,
+        display_name    = EXCLUDED.display_name,
+        category        = EXCLUDED.category,
+        display_order   = EXCLUDED.display_order,
+        params          = EXCLUDED.params,
+        updated_at      = CURRENT_TIMESTAMP;
+
+COMMIT;